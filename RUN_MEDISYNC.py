@@ -36,12 +36,6 @@ def check_dependencies():
         'subprocess': 'Procesos (incluido con Python)'
     }
     
-    optional_modules = {
-        'tkcalendar': 'Calendario avanzado - pip install tkcalendar',
-        'reportlab': 'Generación de PDFs - pip install reportlab',
-        'pillow': 'Procesamiento de imágenes - pip install pillow'
-    }
-    
     missing_required = []
     
     # Verificar módulos requeridos
@@ -53,14 +47,14 @@ def check_dependencies():
             print(f"❌ {module}: {description}")
             missing_required.append(module)
     
-    # Verificar módulos opcionales
+    # Verificar capacidades opcionales (sin importarlas; ver optional_deps)
+    from optional_deps import registry
     print("\n📦 Módulos opcionales:")
-    for module, description in optional_modules.items():
-        try:
-            importlib.import_module(module)
-            print(f"✅ {module}: {description}")
-        except ImportError:
-            print(f"⚠️  {module}: {description}")
+    for capability in registry.capabilities.values():
+        if registry.available(capability.name):
+            print(f"✅ {capability.name}: {capability.description}")
+        else:
+            print(f"⚠️  {capability.name}: {capability.description} - {capability.install_hint}")
     
     return len(missing_required) == 0
 
@@ -138,16 +132,20 @@ def run_medisync():
     return True
 
 def install_dependencies():
-    """Instalar dependencias opcionales"""
-    print("\n📦 ¿Desea instalar las dependencias opcionales? (y/n): ", end="")
+    """Instalar dependencias opcionales (sólo las que faltan, y sólo si el usuario acepta)"""
+    from optional_deps import registry
+    optional_packages = sorted({package for capability in registry.missing() if capability.workstation
+                                for package in capability.packages})
+    if not optional_packages:
+        return
+    
+    print(f"\n📦 ¿Desea instalar las dependencias opcionales ({', '.join(optional_packages)})? (y/n): ", end="")
     
     try:
         response = input().lower().strip()
         if response in ['y', 'yes', 's', 'si']:
             print("\n📦 Instalando dependencias opcionales...")
             
-            optional_packages = ['tkcalendar', 'reportlab', 'pillow']
-            
             for package in optional_packages:
                 try:
                     print(f"Instalando {package}...")
@@ -158,6 +156,7 @@ def install_dependencies():
                 except Exception as e:
                     print(f"❌ Error: {e}")
             
+            registry.refresh()
             print("✅ Instalación de dependencias completada")
         else:
             print("⏭️  Saltando instalación de dependencias opcionales")
@@ -0,0 +1,658 @@
+"""
+Cliente del servicio HTTP de MEDISYNC (medisync_api.py)
+Con MEDISYNC_API_URL, MEDISYNC.py usa RemoteDatabaseManager en lugar de
+DatabaseManager: mismos métodos y mismos resultados, pero cada operación es
+una petición JSON al servicio, que es el único que abre la base de datos.
+
+Las vistas que piden ``get_connection()`` reciben una RemoteConnection que
+envía sus consultas al servicio. Sólo se admiten lecturas: el servicio
+rechaza cualquier escritura (las escrituras van por los métodos de
+RemoteDatabaseManager). Los errores de SQLite llegan con su misma clase.
+
+Sólo biblioteca estándar: http.client con una conexión keep-alive por hilo.
+"""
+import base64
+import http.client
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import date, datetime
+from decimal import Decimal
+
+import change_events
+import medical_search
+from database_manager import AppointmentQuery, User
+
+DEFAULT_TIMEOUT = 30.0
+# Segundos durante los que se reutilizan las versiones de tabla leídas del servicio
+VERSIONS_MAX_AGE = 1.0
+ALL_APPOINTMENTS_PAGE = 1000
+
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+
+class ApiError(Exception):
+    """Respuesta de error del servicio (``status`` 0: no se pudo conectar)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_default(value):
+    # Mismas conversiones que los adaptadores por defecto de sqlite3
+    if isinstance(value, datetime):
+        return value.isoformat(' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$bytes': base64.b64encode(bytes(value)).decode('ascii')}
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo no admitido en la API: {type(value).__name__}")
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and set(value) == {'$bytes'}:
+        return base64.b64decode(value['$bytes'])
+    return value
+
+
+def _sql_error(error):
+    """ApiError de /sql -> excepción de sqlite3 de la misma clase que en el servicio"""
+    if error.status == 0:
+        return sqlite3.OperationalError(error.message)
+    name, _, message = error.message.partition(': ')
+    cls = getattr(sqlite3, name, None)
+    if isinstance(cls, type) and issubclass(cls, sqlite3.Error):
+        return cls(message)
+    return sqlite3.DatabaseError(error.message)
+
+
+class ApiClient:
+    """Peticiones JSON al servicio con el token de la sesión"""
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT):
+        parts = urllib.parse.urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"URL del servicio no válida: {base_url!r}")
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.token = None
+        self._https = parts.scheme == 'https'
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip('/')
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            connection_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+            conn = self._local.conn = connection_class(self._host, self._port, timeout=self.timeout)
+            self._local.used = False
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def request(self, method, path, body=None, query=None):
+        if query:
+            query = {key: value for key, value in query.items() if value is not None}
+            if query:
+                path += '?' + urllib.parse.urlencode(query)
+        payload = json.dumps(body, default=_json_default).encode('utf-8') if body is not None else None
+        headers = {'Accept': 'application/json'}
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+
+        for attempt in range(2):
+            conn = self._connection()
+            reused = self._local.used
+            try:
+                conn.request(method, self._prefix + path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                self._local.used = True
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                # El servicio cerró una conexión keep-alive inactiva: reintentar una vez con otra
+                self._drop_connection()
+                if not reused or attempt:
+                    raise ApiError(0, f"Servicio no disponible: {e}")
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                raise ApiError(0, f"Servicio no disponible: {e}")
+
+        try:
+            result = json.loads(data) if data else None
+        except ValueError:
+            raise ApiError(response.status, f"Respuesta no válida del servicio (HTTP {response.status})")
+        if response.status >= 400:
+            detail = result.get('detail') if isinstance(result, dict) else None
+            raise ApiError(response.status, detail if isinstance(detail, str) else json.dumps(detail))
+        return result
+
+
+class RemoteRow:
+    """Fila de RemoteCursor con acceso por posición y por nombre, como sqlite3.Row"""
+
+    __slots__ = ('_index', '_values')
+
+    def __init__(self, index, values):
+        self._index = index
+        self._values = values
+
+    def keys(self):
+        return list(self._index.names)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key.lower()]
+            except KeyError:
+                raise IndexError("No item with that key")
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, RemoteRow):
+            return self._index.names == other._index.names and self._values == other._values
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self._index.names, tuple(self._values)))
+
+    def __repr__(self):
+        return f"<RemoteRow {dict(zip(self._index.names, self._values))}>"
+
+
+class _ColumnIndex(dict):
+    """Columna (en minúsculas) -> posición, compartido por las filas de un resultado"""
+
+    def __init__(self, names):
+        super().__init__()
+        self.names = tuple(names)
+        for position, name in reversed(list(enumerate(self.names))):
+            self[name.lower()] = position
+
+
+class RemoteCursor:
+    """Cursor cuyas sentencias ejecuta el servicio (interfaz de sqlite3.Cursor)"""
+
+    arraysize = 1
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.row_factory = connection.row_factory
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._rows = []
+        self._position = 0
+        self._index = None
+
+    def execute(self, sql, parameters=()):
+        self._load(self.connection._execute(sql, parameters))
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        raise sqlite3.NotSupportedError("executemany no está disponible en modo cliente (sólo lectura)")
+
+    def executescript(self, sql_script):
+        raise sqlite3.NotSupportedError("executescript no está disponible en modo cliente")
+
+    def _load(self, result):
+        columns = result['columnas']
+        self.description = tuple((name, None, None, None, None, None, None) for name in columns) or None
+        self._index = _ColumnIndex(columns)
+        self._rows = result['filas']
+        self._position = 0
+
+    def _make_row(self, values):
+        values = [_decode_value(value) for value in values]
+        if self.row_factory is sqlite3.Row:
+            return RemoteRow(self._index, values)
+        if self.row_factory is None:
+            return tuple(values)
+        return self.row_factory(self, tuple(values))
+
+    def fetchone(self):
+        if self._position >= len(self._rows):
+            return None
+        self._position += 1
+        return self._make_row(self._rows[self._position - 1])
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return [self._make_row(values) for values in rows]
+
+    def fetchall(self):
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return [self._make_row(values) for values in rows]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._rows = []
+
+
+class RemoteConnection:
+    """Conexión de una vista en modo cliente (interfaz de sqlite3.Connection)
+
+    Sólo lectura: cada consulta es una petición independiente, sin
+    transacciones en el servicio; ``commit()`` y ``rollback()`` no hacen nada.
+    """
+
+    in_transaction = False
+
+    def __init__(self, api, row_factory=None):
+        self.api = api
+        self.row_factory = row_factory
+        self._closed = False
+
+    def cursor(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return RemoteCursor(self)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        raise sqlite3.NotSupportedError("executescript no está disponible en modo cliente")
+
+    def _execute(self, sql, parameters):
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        if isinstance(parameters, tuple):
+            parameters = list(parameters)
+        try:
+            return self.api.request('POST', '/sql', {'sql': sql, 'params': parameters})
+        except ApiError as e:
+            raise _sql_error(e)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class RemoteTableVersions:
+    """Versiones por tabla del servicio (escrituras de todas las estaciones)
+
+    Misma interfaz que TableVersions para TabManager; las versiones se piden
+    al servicio como mucho una vez por ``max_age`` segundos, salvo tras una
+    escritura propia (``expire()``).
+    """
+
+    def __init__(self, api, max_age=VERSIONS_MAX_AGE):
+        self.api = api
+        self.max_age = max_age
+        self._versions = {}
+        self._fetched = None
+        self._lock = threading.Lock()
+
+    def expire(self):
+        with self._lock:
+            self._fetched = None
+
+    def touch(self, *tables):
+        self.expire()
+
+    def _current(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._fetched is None or now - self._fetched > self.max_age:
+                try:
+                    self._versions = self.api.request('GET', '/versiones')
+                except ApiError as e:
+                    # Sin servicio se conservan las últimas versiones conocidas
+                    print(f"Error leyendo versiones de tablas: {e}")
+                self._fetched = now
+            return self._versions
+
+    def snapshot(self, tables=None):
+        versions = self._current()
+        if tables is None:
+            return dict(versions)
+        return {table: versions.get(table, 0) for table in tables}
+
+    def changed(self, snapshot):
+        versions = self._current()
+        return {table for table, version in snapshot.items() if versions.get(table, 0) != version}
+
+
+class RemoteDatabaseManager:
+    """DatabaseManager de una estación en modo cliente
+
+    Mismos métodos y resultados que DatabaseManager (los que usa la
+    interfaz), resueltos por el servicio HTTP. Ante un error se informa y se
+    devuelve el mismo valor por defecto que DatabaseManager.
+    """
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT):
+        self.api = ApiClient(base_url, timeout)
+        self.db_path = self.api.base_url
+        self.table_versions = RemoteTableVersions(self.api)
+        # Sin instrumentación local: las consultas se miden en el servicio
+        self.query_stats = None
+
+    @classmethod
+    def shared(cls, db_path=None, **kwargs):
+        """Cliente único por proceso para MEDISYNC_API_URL (``db_path`` se ignora)"""
+        base_url = os.environ['MEDISYNC_API_URL']
+        with _shared_lock:
+            manager = _shared_clients.get(base_url)
+            if manager is None:
+                manager = _shared_clients[base_url] = cls(base_url, **kwargs)
+            return manager
+
+    def _call(self, description, default, method, path, body=None, query=None):
+        try:
+            return self.api.request(method, path, body, query)
+        except ApiError as e:
+            print(f"Error {description}: {e}")
+            return default
+
+    def _write(self, description, default, method, path, body=None):
+        result = self._call(description, default, method, path, body)
+        self.table_versions.expire()
+        return result
+
+    # ------------------------------------------------------------------
+    # Conexiones (consultas propias de las vistas, sólo lectura)
+    # ------------------------------------------------------------------
+    def get_connection(self):
+        return RemoteConnection(self.api, sqlite3.Row)
+
+    def get_simple_connection(self):
+        return RemoteConnection(self.api, None)
+
+    @contextmanager
+    def connection(self, row_factory=sqlite3.Row):
+        conn = RemoteConnection(self.api, row_factory)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_schema_version(self):
+        health = self._call("consultando el servicio", {}, 'GET', '/salud')
+        return health.get('esquema', 0)
+
+    def explain_query(self, sql, params=None):
+        """Los planes de ejecución sólo están disponibles en el servicio"""
+        return None
+
+    # ------------------------------------------------------------------
+    # Registro de cambios (el servicio filtra los de cada paciente)
+    # ------------------------------------------------------------------
+    def get_changes_since(self, last_id, limit=change_events.BATCH_SIZE):
+        return self._call("leyendo registro de cambios", [], 'GET', '/cambios',
+                          query={'despues': int(last_id or 0), 'limite': limit})
+
+    def get_last_change_id(self):
+        return self._call("leyendo registro de cambios", {'id': 0}, 'GET', '/cambios/ultimo')['id']
+
+    def prune_changes(self, keep_hours=change_events.KEEP_HOURS):
+        """El servicio depura el registro al arrancar"""
+        return 0
+
+    # ------------------------------------------------------------------
+    # Usuarios
+    # ------------------------------------------------------------------
+    def authenticate_user(self, email, password):
+        try:
+            result = self.api.request('POST', '/sesiones', {'email': email, 'password': password})
+        except ApiError as e:
+            if e.status != 401:
+                print(f"Error en autenticación: {e}")
+            return None
+        self.api.token = result['token']
+        self.table_versions.expire()
+        return User(**result['usuario'])
+
+    def logout(self):
+        if self.api.token:
+            self._call("cerrando sesión", None, 'DELETE', '/sesiones')
+            self.api.token = None
+
+    def get_user_by_id(self, user_id):
+        data = self._call("obteniendo usuario", None, 'GET', f"/usuarios/{int(user_id)}")
+        return User(**data) if data else None
+
+    def save_user(self, user_id, user_data, profile_data=None):
+        body = {'usuario': user_data, 'perfil': profile_data}
+        if user_id is None:
+            result = self._write("guardando usuario", None, 'POST', '/usuarios', body)
+            return result['id'] if result else None
+        result = self._write("guardando usuario", None, 'PUT', f"/usuarios/{int(user_id)}", body)
+        return user_id if result else None
+
+    def change_password(self, user_id, new_password, current_password=None):
+        return self._write("cambiando contraseña", None, 'PUT', f"/usuarios/{int(user_id)}/password",
+                           {'nueva': new_password, 'actual': current_password}) is not None
+
+    def set_user_active(self, user_id, active):
+        return self._write("cambiando estado de usuario", None, 'PUT', f"/usuarios/{int(user_id)}/activo",
+                           {'activo': bool(active)}) is not None
+
+    def delete_user(self, user_id):
+        return self._write("eliminando usuario", None, 'DELETE', f"/usuarios/{int(user_id)}") is not None
+
+    def get_all_patients(self):
+        return self._call("obteniendo pacientes", [], 'GET', '/pacientes')
+
+    def get_all_doctors(self):
+        return self._call("obteniendo doctores", [], 'GET', '/doctores')
+
+    def get_medical_insurances(self):
+        return self._call("obteniendo seguros", [], 'GET', '/seguros')
+
+    # ------------------------------------------------------------------
+    # Citas
+    # ------------------------------------------------------------------
+    def get_appointments_page(self, query=None, after=None, limit=100):
+        params = asdict(query or AppointmentQuery())
+        params['limite'] = limit
+        if after is not None:
+            params['despues_fecha'], params['despues_id'] = after
+        page = self._call("obteniendo página de citas", None, 'GET', '/citas', query=params)
+        if page is None:
+            return [], None
+        next_cursor = page['siguiente']
+        return page['citas'], tuple(next_cursor) if next_cursor else None
+
+    def count_appointments(self, query=None, limit=None):
+        params = asdict(query or AppointmentQuery())
+        if limit is not None:
+            params['limite'] = limit
+        result = self._call("contando citas", {'total': 0}, 'GET', '/citas/total', query=params)
+        return result['total']
+
+    def get_all_appointments(self):
+        appointments, after = [], None
+        while True:
+            rows, after = self.get_appointments_page(after=after, limit=ALL_APPOINTMENTS_PAGE)
+            appointments.extend(rows)
+            if after is None:
+                return appointments
+
+    def get_appointment_row(self, appointment_id, query=None):
+        try:
+            return self.api.request('GET', f"/citas/{int(appointment_id)}/fila",
+                                    query=asdict(query or AppointmentQuery()))
+        except ApiError as e:
+            if e.status != 404:
+                print(f"Error obteniendo fila de cita: {e}")
+            return None
+
+    def get_appointment_by_id(self, appointment_id):
+        try:
+            return self.api.request('GET', f"/citas/{int(appointment_id)}")
+        except ApiError as e:
+            if e.status != 404:
+                print(f"Error obteniendo cita: {e}")
+            return None
+
+    def create_appointment(self, appointment_data):
+        result = self._write("creando cita", None, 'POST', '/citas', appointment_data)
+        return result['id'] if result else None
+
+    def update_appointment(self, appointment_id, appointment_data):
+        return self._write("actualizando cita", None, 'PUT', f"/citas/{int(appointment_id)}",
+                           appointment_data) is not None
+
+    def update_appointment_status(self, appointment_id, new_status, notes=None):
+        return self._write("actualizando estado de cita", None, 'PUT', f"/citas/{int(appointment_id)}/estado",
+                           {'estado': new_status, 'notas': notes}) is not None
+
+    def update_appointment_notes(self, appointment_id, notes):
+        return self._write("guardando notas de cita", None, 'PUT', f"/citas/{int(appointment_id)}/notas",
+                           {'notas': notes}) is not None
+
+    def reschedule_appointment(self, appointment_id, fecha_hora, motivo=None, notas=None):
+        if isinstance(fecha_hora, datetime):
+            fecha_hora = fecha_hora.isoformat(' ')
+        return self._write("reprogramando cita", None, 'PUT', f"/citas/{int(appointment_id)}/fecha",
+                           {'fecha_hora': fecha_hora, 'motivo': motivo, 'notas': notas}) is not None
+
+    def cancel_appointment_with_reason(self, appointment_id, reason):
+        return self._write("cancelando cita con motivo", None, 'POST',
+                           f"/citas/{int(appointment_id)}/cancelacion", {'motivo': reason}) is not None
+
+    def delete_appointment(self, appointment_id):
+        return self._write("eliminando cita", None, 'DELETE', f"/citas/{int(appointment_id)}") is not None
+
+    def find_appointment_conflicts(self, doctor_id, fecha_hora, duracion_minutos=None, exclude_id=None):
+        """Como en DatabaseManager, un error se lanza (ApiError): nunca cuenta como sin conflicto"""
+        if isinstance(fecha_hora, datetime):
+            fecha_hora = fecha_hora.isoformat(' ')
+        result = self.api.request('GET', '/citas/conflictos',
+                                  query={'doctor_id': doctor_id, 'fecha_hora': fecha_hora,
+                                         'duracion': duracion_minutos, 'excluir': exclude_id})
+        return result['citas']
+
+    def get_available_slots(self, doctor_id, fecha):
+        if isinstance(fecha, date):
+            fecha = fecha.isoformat()
+        result = self._call("calculando disponibilidad", {'horas': []}, 'GET',
+                            f"/doctores/{int(doctor_id)}/horas-libres", query={'fecha': fecha})
+        return result['horas']
+
+    def save_doctor_schedule(self, doctor_id, ranges):
+        return self._write("guardando horarios", None, 'PUT', f"/doctores/{int(doctor_id)}/horario",
+                           {'horario': [list(item) for item in ranges]}) is not None
+
+    # ------------------------------------------------------------------
+    # Facturas
+    # ------------------------------------------------------------------
+    def get_all_invoices(self):
+        return self._call("obteniendo facturas", [], 'GET', '/facturas')
+
+    def get_pending_invoices(self):
+        return self._call("obteniendo facturas pendientes", [], 'GET', '/facturas', query={'estado': 'pendiente'})
+
+    def create_invoice(self, invoice_data):
+        record = self.create_invoice_record(invoice_data)
+        return record['id'] if record else None
+
+    def create_invoice_record(self, invoice_data):
+        return self._write("creando factura", None, 'POST', '/facturas', invoice_data)
+
+    def add_invoice_service(self, invoice_id, servicio, cantidad, precio_unitario):
+        return self._write("añadiendo servicio a factura", None, 'POST', f"/facturas/{int(invoice_id)}/servicios",
+                           {'servicio': servicio, 'cantidad': cantidad,
+                            'precio_unitario': precio_unitario}) is not None
+
+    def allocate_invoice_numbers(self, count=1):
+        result = self._call("reservando números de factura", {'numeros': []}, 'POST', '/facturas/numeros',
+                            {'cantidad': count})
+        return result['numeros']
+
+    def pay_invoice(self, invoice_id, payment_data):
+        return self._write("pagando factura", None, 'POST', f"/facturas/{int(invoice_id)}/pago",
+                           payment_data) is not None
+
+    # ------------------------------------------------------------------
+    # Reportes, paneles e historial
+    # ------------------------------------------------------------------
+    def get_monthly_income(self, year, month):
+        return self._call("obteniendo ingresos", {'total_ingresos': 0, 'total_facturas': 0},
+                          'GET', '/reportes/ingresos', query={'anio': year, 'mes': month})
+
+    def get_system_counters(self):
+        return self._call("leyendo contadores de paneles", {}, 'GET', '/paneles/sistema')
+
+    def get_doctor_counters(self, doctor_id):
+        return self._call("leyendo contadores de paneles", {}, 'GET', '/paneles/doctor',
+                          query={'doctor_id': doctor_id})
+
+    def get_secretaria_counters(self):
+        return self._call("leyendo contadores de paneles", {}, 'GET', '/paneles/secretaria')
+
+    def search_medical_history(self, text, source='historial_medico', paciente_id=None,
+                               doctor_id=None, limit=medical_search.DEFAULT_LIMIT):
+        return self._call("buscando en historiales", [], 'GET', '/historial/busqueda',
+                          query={'texto': text, 'fuente': source, 'paciente_id': paciente_id,
+                                 'doctor_id': doctor_id, 'limite': limit})
+
+    def save_medical_record(self, record_data, record_id=None, source='historial_medico'):
+        if record_id is None:
+            result = self._write("guardando historial médico", None, 'POST', f"/historial/{source}", record_data)
+        else:
+            result = self._write("guardando historial médico", None, 'PUT',
+                                 f"/historial/{source}/{int(record_id)}", record_data)
+        return result['id'] if result else None
+
+    def medical_search_clause(self, text, source='historial_medico', alias='hm', by_patient=False):
+        """Filtro de texto por relevancia para consultas propias (comprueba FTS5 en el servicio)"""
+        conn = self.get_simple_connection()
+        try:
+            return medical_search.search_clause(conn.cursor(), text, source, alias, by_patient=by_patient)
+        except sqlite3.Error as e:
+            print(f"Error preparando búsqueda en historiales: {e}")
+            return None
+        finally:
+            conn.close()
@@ -0,0 +1,321 @@
+"""
+Motor de conflictos de horario para MEDISYNC
+Índice de intervalos por doctor y día para detectar solapamientos de citas
+"""
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from change_events import CHANGE_LOG_TABLE, last_change_id
+
+DEFAULT_DURATION_MINUTES = 30
+DAY_MINUTES = 24 * 60
+# Cambios del registro aplicados por lectura; con más pendientes se descarta todo el índice
+REFRESH_BATCH = 500
+
+# Estados que ya no ocupan el horario del doctor
+INACTIVE_STATES = ('cancelada', 'completada')
+
+
+def parse_appointment_datetime(value) -> Optional[datetime]:
+    """Convertir fecha_hora de la base de datos (ISO, con 'T' o espacio) a datetime"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def parse_day(value) -> Optional[date]:
+    """Aceptar fechas 'DD/MM/YYYY', 'YYYY-MM-DD' o date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or '').strip()
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class _DayIntervals:
+    """Intervalos [inicio, fin) de un doctor en un día, ordenados por inicio (minutos)"""
+
+    __slots__ = ('items', 'max_duration', 'loaded_at')
+
+    def __init__(self):
+        self.items: List[Tuple[int, int, int]] = []  # (inicio, fin, cita_id)
+        self.max_duration = 0
+        self.loaded_at = time.monotonic()
+
+    def add(self, start, end, cita_id):
+        insort(self.items, (start, end, cita_id))
+        self.max_duration = max(self.max_duration, end - start)
+
+    def remove(self, cita_id):
+        self.items = [item for item in self.items if item[2] != cita_id]
+
+    def overlapping(self, start, end, exclude_id=None):
+        """Citas que se solapan con [start, end)
+
+        Sólo pueden solaparse las que empiezan antes de ``end`` y como mucho
+        ``max_duration`` minutos antes de ``start``: búsqueda binaria más un
+        recorrido acotado a esa ventana.
+        """
+        conflicts = []
+        idx = bisect_left(self.items, (end, -1, -1))
+        lower_bound = start - self.max_duration
+        while idx > 0:
+            idx -= 1
+            item_start, item_end, cita_id = self.items[idx]
+            if item_start < lower_bound:
+                break
+            if item_end > start and cita_id != exclude_id:
+                conflicts.append(cita_id)
+        return conflicts
+
+
+class AppointmentScheduler:
+    """Índice de intervalos por (doctor, día) con carga perezosa y mantenimiento incremental
+
+    Cada día se carga una sola vez desde ``citas`` (índice doctor_id, fecha) y
+    después se actualiza con ``appointment_changed`` / ``appointment_deleted``
+    desde las escrituras de DatabaseManager. Antes de cada consulta,
+    ``refresh`` lee registro_cambios y descarta los días de las citas
+    escritas por otra vía (SQL propio de una vista, otra conexión u otro
+    proceso). Los días en caché se recargan además tras ``ttl`` segundos.
+
+    Para confirmar una reserva, ``find_conflicts_in_db`` consulta la tabla
+    directamente en lugar del índice.
+    """
+
+    def __init__(self, db_manager, ttl=300.0):
+        self.db_manager = db_manager
+        self.ttl = ttl
+        self._days: Dict[Tuple[int, str], _DayIntervals] = {}
+        self._location: Dict[int, Tuple[int, str]] = {}
+        self._listeners = []
+        self._lock = threading.RLock()
+        # Último id de registro_cambios aplicado (None: aún no leído)
+        self._last_change: Optional[int] = None
+
+    def add_listener(self, callback):
+        """Registrar ``callback(doctor_id, fecha_iso)``, llamado cuando cambia un día"""
+        self._listeners.append(callback)
+
+    def _notify(self, key):
+        for callback in self._listeners:
+            try:
+                callback(*key)
+            except Exception as e:
+                print(f"Error notificando cambio de horario: {e}")
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _interval(dt, duracion):
+        start = dt.hour * 60 + dt.minute
+        return start, start + int(duracion or DEFAULT_DURATION_MINUTES)
+
+    def _load_day(self, doctor_id, day):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+            SELECT id, fecha_hora, duracion_minutos, estado
+            FROM citas
+            WHERE doctor_id = ? AND fecha = ?
+            ''', (doctor_id, day))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+        intervals = _DayIntervals()
+        for cita_id, fecha_hora, duracion, estado in rows:
+            dt = parse_appointment_datetime(fecha_hora)
+            if dt is None or (estado or '').lower() in INACTIVE_STATES:
+                continue
+            intervals.add(*self._interval(dt, duracion), cita_id)
+            self._location[cita_id] = (doctor_id, day)
+        return intervals
+
+    def _get_day(self, doctor_id, day):
+        key = (int(doctor_id), day)
+        intervals = self._days.get(key)
+        if intervals is None or (time.monotonic() - intervals.loaded_at) > self.ttl:
+            if intervals is not None:
+                for _, _, cita_id in intervals.items:
+                    self._location.pop(cita_id, None)
+            intervals = self._load_day(key[0], day)
+            self._days[key] = intervals
+        return intervals
+
+    def refresh(self):
+        """Descartar los días con citas escritas desde la última lectura del registro"""
+        with self._lock:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            try:
+                if self._last_change is None:
+                    # Primera lectura: el índice está vacío, basta con saber desde dónde seguir
+                    self._last_change = last_change_id(cursor)
+                    return
+                cursor.execute(f'''
+                SELECT id, entidad, registro_id FROM {CHANGE_LOG_TABLE}
+                WHERE id > ? ORDER BY id LIMIT ?
+                ''', (self._last_change, REFRESH_BATCH + 1))
+                rows = cursor.fetchall()
+                if not rows:
+                    return
+                if len(rows) > REFRESH_BATCH or rows[0][0] != self._last_change + 1:
+                    # Demasiados cambios o registro ya depurado: no se sabe qué días tocaron
+                    self._last_change = last_change_id(cursor)
+                    self._discard(list(self._days))
+                    return
+                self._last_change = rows[-1][0]
+                ids = sorted({row[2] for row in rows if row[1] == 'cita'})
+                if not ids:
+                    return
+                keys = {self._location[cita_id] for cita_id in ids if cita_id in self._location}
+                cursor.execute(f"SELECT doctor_id, fecha FROM citas WHERE id IN ({', '.join('?' * len(ids))})",
+                               ids)
+                keys.update((int(doctor_id), fecha) for doctor_id, fecha in cursor.fetchall()
+                            if doctor_id is not None and fecha)
+                self._discard(keys)
+            except sqlite3.OperationalError as e:
+                # Base sin registro de cambios (anterior a la migración): sólo queda el ttl
+                print(f"Error leyendo registro de cambios de citas: {e}")
+            finally:
+                cursor.close()
+                conn.close()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def find_conflicts(self, doctor_id, start, duracion_minutos=None, exclude_id=None):
+        """IDs de citas activas del doctor que se solapan con [start, start + duración)"""
+        start = parse_appointment_datetime(start)
+        if start is None or doctor_id in (None, ''):
+            return []
+        begin, end = self._interval(start, duracion_minutos)
+        with self._lock:
+            self.refresh()
+            day = start.date()
+            conflicts = self._get_day(doctor_id, day.isoformat()).overlapping(begin, end, exclude_id)
+            # Citas del día anterior que terminan pasada la medianoche
+            previous = self._get_day(doctor_id, (day - timedelta(days=1)).isoformat())
+            conflicts += previous.overlapping(begin + DAY_MINUTES, end + DAY_MINUTES, exclude_id)
+            if end > DAY_MINUTES:
+                # La cita cruza la medianoche: revisar el comienzo del día siguiente
+                next_day = (day + timedelta(days=1)).isoformat()
+                conflicts += self._get_day(doctor_id, next_day).overlapping(0, end - DAY_MINUTES, exclude_id)
+            return conflicts
+
+    def has_conflict(self, doctor_id, start, duracion_minutos=None, exclude_id=None):
+        return bool(self.find_conflicts(doctor_id, start, duracion_minutos, exclude_id))
+
+    def find_conflicts_in_db(self, doctor_id, start, duracion_minutos=None, exclude_id=None):
+        """Como ``find_conflicts`` pero leyendo ``citas`` (índice doctor_id, fecha_hora)
+
+        Para confirmar una reserva: no depende de la caché del índice. Se
+        leen las citas del doctor desde el día anterior (las que terminan
+        pasada la medianoche) hasta el día en que termina la propuesta.
+        """
+        start = parse_appointment_datetime(start)
+        if start is None or doctor_id in (None, ''):
+            return []
+        exclude_id = int(exclude_id) if exclude_id not in (None, '') else None
+        begin = start.replace(second=0, microsecond=0)
+        end = begin + timedelta(minutes=int(duracion_minutos or DEFAULT_DURATION_MINUTES))
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            # Límites sólo con la fecha: fecha_hora puede llevar 'T' o espacio
+            cursor.execute('''
+            SELECT id, fecha_hora, duracion_minutos, estado
+            FROM citas
+            WHERE doctor_id = ? AND fecha_hora >= ? AND fecha_hora < ?
+            ''', (doctor_id, (begin.date() - timedelta(days=1)).isoformat(),
+                  (end.date() + timedelta(days=1)).isoformat()))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+        conflicts = []
+        for cita_id, fecha_hora, duracion, estado in rows:
+            dt = parse_appointment_datetime(fecha_hora)
+            if dt is None or cita_id == exclude_id or (estado or '').lower() in INACTIVE_STATES:
+                continue
+            dt = dt.replace(second=0, microsecond=0)
+            if dt < end and dt + timedelta(minutes=int(duracion or DEFAULT_DURATION_MINUTES)) > begin:
+                conflicts.append(cita_id)
+        return conflicts
+
+    def busy_intervals(self, doctor_id, day):
+        """Intervalos ocupados [(inicio, fin)] en minutos del día, ordenados
+
+        Empieza por el final de las citas del día anterior que cruzan la medianoche.
+        """
+        with self._lock:
+            self.refresh()
+            previous = (parse_day(day) - timedelta(days=1)).isoformat()
+            carried = [(0, e - DAY_MINUTES) for _, e, _ in self._get_day(doctor_id, previous).items
+                       if e > DAY_MINUTES]
+            return carried + [(s, e) for s, e, _ in self._get_day(doctor_id, day).items]
+
+    # ------------------------------------------------------------------
+    # Mantenimiento incremental
+    # ------------------------------------------------------------------
+    def _forget(self, cita_id):
+        key = self._location.pop(cita_id, None)
+        if key is not None:
+            if key in self._days:
+                self._days[key].remove(cita_id)
+            self._notify(key)
+
+    def appointment_deleted(self, cita_id):
+        with self._lock:
+            self._forget(cita_id)
+
+    def appointment_changed(self, cita_id, doctor_id, fecha_hora, duracion_minutos=None, estado=None):
+        """Mover la cita a su nuevo intervalo tras crearla o modificarla"""
+        with self._lock:
+            self._forget(cita_id)
+            dt = parse_appointment_datetime(fecha_hora)
+            if dt is None or doctor_id is None or (estado or '').lower() in INACTIVE_STATES:
+                return
+            key = (int(doctor_id), dt.date().isoformat())
+            self._notify(key)
+            intervals = self._days.get(key)
+            if intervals is None:
+                # Día aún no cargado: se leerá completo de la base de datos cuando se consulte
+                return
+            intervals.add(*self._interval(dt, duracion_minutos), cita_id)
+            self._location[cita_id] = key
+
+    def _discard(self, keys):
+        for key in keys:
+            intervals = self._days.pop(key, None)
+            if intervals is not None:
+                for _, _, cita_id in intervals.items:
+                    self._location.pop(cita_id, None)
+            # Aunque el día no estuviera cargado, los huecos libres de ese día pueden estar en caché
+            self._notify(key)
+
+    def invalidate(self, doctor_id=None, day=None):
+        """Descartar días en caché (todos, los de un doctor o uno concreto)"""
+        with self._lock:
+            self._discard([key for key in self._days
+                           if (doctor_id is None or key[0] == int(doctor_id)) and (day is None or key[1] == day)])
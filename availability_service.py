@@ -0,0 +1,192 @@
+"""
+Servicio de disponibilidad de doctores para MEDISYNC
+Calcula los huecos libres a partir del horario semanal y las citas existentes
+"""
+import threading
+import time
+import unicodedata
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Tuple
+
+from appointment_scheduler import parse_day
+
+SLOT_MINUTES = 30
+# Tablas de las que sale el horario semanal
+SCHEDULE_TABLES = ('doctor_schedules', 'doctores')
+DEFAULT_WORKING_HOURS = ('08:00', '17:00')
+
+DIAS_SEMANA = ['lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo']
+
+
+def _normalize_day_name(name):
+    text = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode()
+    return text.strip().lower()
+
+
+def _to_minutes(value):
+    """'HH:MM' o 'HH:MM:SS' -> minutos desde medianoche"""
+    parts = str(value).strip().split(':')
+    return int(parts[0]) * 60 + int(parts[1])
+
+
+def _format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class AvailabilityService:
+    """Huecos libres por doctor y día, memorizados e invalidados por cambios de citas
+
+    El horario semanal sale de ``doctor_schedules`` (guardado desde el perfil
+    del doctor); si no hay, de ``doctores.horario_inicio/horario_fin``. Se
+    vuelve a leer cuando cambian esas tablas en este proceso (versiones de
+    TableVersions) y, para las escrituras de otros procesos, tras ``ttl``
+    segundos. Lo ocupado sale del índice de intervalos de AppointmentScheduler.
+    """
+
+    def __init__(self, db_manager, slot_minutes=SLOT_MINUTES, ttl=300.0):
+        self.db_manager = db_manager
+        self.slot_minutes = slot_minutes
+        self.ttl = ttl
+        self._slots: Dict[Tuple[int, str], Tuple[float, List[str]]] = {}
+        # doctor_id -> (cargado en, versiones de SCHEDULE_TABLES, {día_semana: [(inicio, fin)]})
+        self._weekly: Dict[int, Tuple[float, Dict[str, int], Dict[int, List[Tuple[int, int]]]]] = {}
+        self._lock = threading.RLock()
+        # Aumenta con cada invalidación: un cálculo que empezó antes no se guarda
+        self._generation = 0
+        db_manager.scheduler.add_listener(self.invalidate_day)
+
+    # ------------------------------------------------------------------
+    # Horario semanal
+    # ------------------------------------------------------------------
+    def _load_weekly_schedule(self, doctor_id):
+        """{día_semana (0=lunes): [(inicio, fin)]} en minutos"""
+        weekly = {}
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            try:
+                cursor.execute('''
+                SELECT dia_semana, hora_inicio, hora_fin
+                FROM doctor_schedules WHERE doctor_id = ? AND activo = 1
+                ''', (doctor_id,))
+                for dia, inicio, fin in cursor.fetchall():
+                    name = _normalize_day_name(dia)
+                    if name in DIAS_SEMANA and inicio and fin:
+                        weekly.setdefault(DIAS_SEMANA.index(name), []).append(
+                            (_to_minutes(inicio), _to_minutes(fin))
+                        )
+            except Exception:
+                # Bases sin la migración 12 no tienen doctor_schedules
+                weekly = {}
+
+            if not weekly:
+                cursor.execute("SELECT horario_inicio, horario_fin FROM doctores WHERE id = ?", (doctor_id,))
+                row = cursor.fetchone()
+                inicio, fin = (row[0], row[1]) if row and row[0] and row[1] else DEFAULT_WORKING_HOURS
+                hours = [(_to_minutes(inicio), _to_minutes(fin))]
+                weekly = {weekday: list(hours) for weekday in range(7)}
+        finally:
+            cursor.close()
+            conn.close()
+
+        for ranges in weekly.values():
+            ranges.sort()
+        return weekly
+
+    def weekly_schedule(self, doctor_id):
+        """Horario semanal memorizado; si cambió, se descartan también los huecos del doctor"""
+        doctor_id = int(doctor_id)
+        versions = self.db_manager.table_versions
+        with self._lock:
+            cached = self._weekly.get(doctor_id)
+            if (cached is not None and time.monotonic() - cached[0] <= self.ttl
+                    and not versions.changed(cached[1])):
+                return cached[2]
+            snapshot = versions.snapshot(SCHEDULE_TABLES)
+            weekly = self._load_weekly_schedule(doctor_id)
+            if cached is not None and cached[2] != weekly:
+                self._generation += 1
+                for key in [k for k in self._slots if k[0] == doctor_id]:
+                    del self._slots[key]
+            self._weekly[doctor_id] = (time.monotonic(), snapshot, weekly)
+            return weekly
+
+    # ------------------------------------------------------------------
+    # Huecos libres
+    # ------------------------------------------------------------------
+    def _compute_slots(self, doctor_id, day):
+        ranges = self.weekly_schedule(doctor_id).get(day.weekday(), [])
+        busy = self.db_manager.scheduler.busy_intervals(doctor_id, day.isoformat())
+        slots = []
+        for start, end in ranges:
+            t = start
+            while t + self.slot_minutes <= end:
+                slot_end = t + self.slot_minutes
+                if not any(b_start < slot_end and b_end > t for b_start, b_end in busy):
+                    slots.append(_format_minutes(t))
+                t += self.slot_minutes
+        return slots
+
+    def free_slots(self, doctor_id, day) -> List[str]:
+        """Horas 'HH:MM' libres del doctor en un día (sin las ya pasadas si es hoy)"""
+        day = parse_day(day)
+        if day is None or doctor_id in (None, ''):
+            return []
+        key = (int(doctor_id), day.isoformat())
+        # Citas escritas por otra vía: el índice avisa (invalidate_day) de los días que cambiaron
+        self.db_manager.scheduler.refresh()
+        # Y un horario semanal nuevo descarta los huecos calculados con el anterior
+        self.weekly_schedule(key[0])
+        with self._lock:
+            cached = self._slots.get(key)
+            generation = self._generation
+        if cached is None or (time.monotonic() - cached[0]) > self.ttl:
+            # Fuera del candado: busy_intervals toma el del índice de citas, que al
+            # guardar una cita llama a invalidate_day con el suyo tomado
+            cached = (time.monotonic(), self._compute_slots(key[0], day))
+            with self._lock:
+                if generation == self._generation:
+                    self._slots[key] = cached
+        slots = cached[1]
+
+        if day == date.today():
+            now = datetime.now().strftime('%H:%M')
+            slots = [slot for slot in slots if slot > now]
+        return list(slots)
+
+    def availability(self, doctor_id, start_day, end_day) -> Dict[str, List[str]]:
+        """{fecha ISO: [horas libres]} para un rango de días inclusivo"""
+        start, end = parse_day(start_day), parse_day(end_day)
+        result = {}
+        if start is None or end is None:
+            return result
+        day = start
+        while day <= end:
+            result[day.isoformat()] = self.free_slots(doctor_id, day)
+            day += timedelta(days=1)
+        return result
+
+    # ------------------------------------------------------------------
+    # Invalidación
+    # ------------------------------------------------------------------
+    def invalidate_day(self, doctor_id, day):
+        """Llamado por el índice de citas cuando cambia una cita de ese día"""
+        with self._lock:
+            self._generation += 1
+            self._slots.pop((int(doctor_id), day), None)
+
+    def invalidate_doctor(self, doctor_id):
+        """Descartar horario semanal y huecos de un doctor (p. ej. al cambiar su horario)"""
+        doctor_id = int(doctor_id)
+        with self._lock:
+            self._generation += 1
+            self._weekly.pop(doctor_id, None)
+            for key in [k for k in self._slots if k[0] == doctor_id]:
+                del self._slots[key]
+
+    def invalidate_all(self):
+        """Descartar horarios y huecos de todos los doctores (escrituras fuera de DatabaseManager)"""
+        with self._lock:
+            self._generation += 1
+            self._weekly.clear()
+            self._slots.clear()
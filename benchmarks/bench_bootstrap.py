@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque de DatabaseManager
+Compara el coste de construir el gestor y de numerar una factura antes
+(inicialización completa en cada construcción) y después (arranque único
+con huella de esquema y gestor compartido).
+
+Uso:
+    python benchmarks/bench_bootstrap.py [--repeat 50]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database_manager
+from database_manager import DatabaseManager
+from invoice_sequence import yearly_invoice_numbers
+
+
+def measure(func, repeat):
+    """Mediana y p95 en milisegundos"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='medisync_boot_')
+    db_path = os.path.join(workdir, 'bench.db')
+    try:
+        DatabaseManager(db_path).pool.close()
+
+        def construct_before():
+            # Comportamiento anterior: tablas, migraciones y usuarios en cada construcción
+            db = DatabaseManager(db_path, bootstrap=False)
+            db.bootstrap(force=True)
+            db.pool.close()
+
+        def construct_new_process():
+            # Primer gestor de un proceso nuevo: sólo se compara la huella guardada
+            database_manager._bootstrapped_paths.clear()
+            DatabaseManager(db_path).pool.close()
+
+        def construct_same_process():
+            DatabaseManager(db_path).pool.close()
+
+        def invoice_before():
+            db = DatabaseManager(db_path, bootstrap=False)
+            db.bootstrap(force=True)
+            conn = db.get_connection()
+            yearly_invoice_numbers.allocate_now(conn)
+            conn.close()
+            db.pool.close()
+
+        def invoice_after():
+            conn = DatabaseManager.shared(db_path).get_connection()
+            yearly_invoice_numbers.allocate_now(conn)
+            conn.close()
+
+        rows = [
+            ("Construcción (antes)", construct_before),
+            ("Construcción, proceso nuevo (huella)", construct_new_process),
+            ("Construcción, mismo proceso", construct_same_process),
+            ("Número de factura (antes)", invoice_before),
+            ("Número de factura (gestor compartido)", invoice_after),
+        ]
+        print(f"{'caso':<40}{'mediana ms':>12}{'p95 ms':>10}")
+        print("-" * 62)
+        for label, func in rows:
+            median, p95 = measure(func, args.repeat)
+            print(f"{label:<40}{median:>12.3f}{p95:>10.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concurrencia de DatabaseManager
+Rendimiento (operaciones/s) con cargas mixtas lectura/escritura de 1 a 16 hilos
+para cada modo de concurrencia ('serialized', 'shared', 'wal').
+
+Uso:
+    python benchmarks/bench_concurrency.py [--duration 2] [--write-ratio 0.2]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_manager import DatabaseManager
+from db_concurrency import CONCURRENCY_MODES
+
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def seed_database(db, appointments=2000):
+    """Crear pacientes, un doctor y citas de prueba"""
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM usuarios WHERE tipo_usuario = 'doctor' LIMIT 1")
+    doctor_id = cursor.fetchone()[0]
+    cursor.execute("SELECT id FROM usuarios WHERE tipo_usuario = 'paciente' LIMIT 1")
+    paciente_id = cursor.fetchone()[0]
+    rows = [
+        (paciente_id, doctor_id, f"2025-{(i % 12) + 1:02d}-{(i % 28) + 1:02d} {8 + i % 9:02d}:00:00",
+         f"Consulta {i}", 'programada')
+        for i in range(appointments)
+    ]
+    cursor.executemany(
+        "INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo, estado) VALUES (?, ?, ?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return appointments
+
+
+def run_workload(db, threads, duration, write_ratio, max_id):
+    """Ejecutar la carga mixta y devolver (lecturas, escrituras, errores)"""
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    counts_lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(seed):
+        rnd = random.Random(seed)
+        reads = writes = errors = 0
+        while time.perf_counter() < stop_at:
+            appointment_id = rnd.randint(1, max_id)
+            if rnd.random() < write_ratio:
+                estado = rnd.choice(('programada', 'confirmada', 'completada'))
+                if db.update_appointment_status(appointment_id, estado):
+                    writes += 1
+                else:
+                    errors += 1
+            else:
+                if rnd.random() < 0.5:
+                    db.get_appointment_by_id(appointment_id)
+                else:
+                    db.authenticate_user('admin@medisync.com', 'admin123')
+                reads += 1
+        with counts_lock:
+            counts['reads'] += reads
+            counts['writes'] += writes
+            counts['errors'] += errors
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=2.0, help="segundos por medición")
+    parser.add_argument('--write-ratio', type=float, default=0.2, help="proporción de escrituras")
+    parser.add_argument('--modes', nargs='+', default=list(CONCURRENCY_MODES), choices=CONCURRENCY_MODES)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='medisync_bench_')
+    try:
+        print(f"{'modo':<12}{'hilos':>6}{'ops/s':>12}{'lecturas':>10}{'escrituras':>12}{'errores':>9}")
+        print("-" * 61)
+        for mode in args.modes:
+            db_path = os.path.join(workdir, f'bench_{mode}.db')
+            db = DatabaseManager(db_path, concurrency=mode)
+            max_id = seed_database(db)
+            for threads in THREAD_COUNTS:
+                counts = run_workload(db, threads, args.duration, args.write_ratio, max_id)
+                total = counts['reads'] + counts['writes']
+                print(f"{mode:<12}{threads:>6}{total / args.duration:>12.0f}"
+                      f"{counts['reads']:>10}{counts['writes']:>12}{counts['errors']:>9}")
+            db.pool.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
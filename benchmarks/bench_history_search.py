@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda en historial médico: LIKE '%x%' frente a FTS5
+Genera una base temporal con N registros de historial_medico, crea el
+índice FTS5 (medical_search.ensure_fts) y mide varias búsquedas típicas
+por ambos caminos, sobre todos los pacientes y sobre uno solo.
+
+Uso:
+    python benchmarks/bench_history_search.py [--records 1000000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import medical_search
+from database_manager import SCHEMA_TABLES
+
+DIAGNOSTICOS = [
+    "Diabetes mellitus tipo 2", "Hipertensión arterial", "Gastritis crónica", "Migraña sin aura",
+    "Asma bronquial", "Faringitis aguda", "Lumbalgia mecánica", "Ansiedad generalizada",
+    "Hipotiroidismo", "Dermatitis atópica", "Otitis media", "Bronquitis aguda",
+    "Anemia ferropénica", "Insuficiencia venosa", "Artrosis de rodilla", "Conjuntivitis alérgica",
+]
+TRATAMIENTOS = [
+    "Metformina 850 mg cada 12 horas", "Losartán 50 mg diario", "Omeprazol 20 mg en ayunas",
+    "Paracetamol 1 g si dolor", "Salbutamol inhalado a demanda", "Reposo relativo y fisioterapia",
+    "Dieta hiposódica y ejercicio", "Levotiroxina 50 mcg", "Hidratación cutánea diaria",
+]
+OBSERVACIONES = [
+    "Paciente estable, control en 3 meses", "Se solicita analítica completa", "Refiere mejoría parcial",
+    "Antecedentes familiares de diabétes", "Revisar adherencia al tratamiento", "Sin alergias conocidas",
+]
+# (término, descripción)
+QUERIES = [
+    ("diabetes", "palabra frecuente"),
+    ("diabétes", "con acento"),
+    ("hipotiro", "prefijo"),
+    ("dolor rodilla", "dos palabras"),
+    ("omeprazol", "medicamento"),
+]
+
+
+def create_database(db_path, records, patients, seed=42):
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    for ddl in SCHEMA_TABLES:
+        conn.execute(ddl)
+    conn.execute("CREATE INDEX idx_historial_medico_paciente_fecha ON historial_medico(paciente_id, fecha_consulta)")
+
+    def rows():
+        for i in range(records):
+            yield (
+                rnd.randint(1, patients), rnd.randint(1, 50),
+                f"20{rnd.randint(15, 25):02d}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                rnd.choice(DIAGNOSTICOS), rnd.choice(TRATAMIENTOS), rnd.choice(OBSERVACIONES),
+                "Dolor en " + rnd.choice(["rodilla", "cabeza", "espalda", "abdomen"]),
+            )
+
+    conn.executemany('''
+    INSERT INTO historial_medico (paciente_id, doctor_id, fecha_consulta, diagnostico,
+                                  tratamiento, observaciones, motivo_consulta)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows())
+    conn.commit()
+    return conn
+
+
+def like_search(conn, text, paciente_id=None, limit=100):
+    """Búsqueda anterior: LIKE '%palabra%' en diagnóstico, tratamiento y observaciones"""
+    where, params = [], []
+    for term in medical_search.search_terms(text):
+        pattern = f"%{term}%"
+        where.append("(diagnostico LIKE ? OR tratamiento LIKE ? OR observaciones LIKE ? OR motivo_consulta LIKE ?)")
+        params.extend([pattern] * 4)
+    if paciente_id is not None:
+        where.append("paciente_id = ?")
+        params.append(paciente_id)
+    params.append(limit)
+    return conn.execute(f'''
+    SELECT id FROM historial_medico WHERE {" AND ".join(where)}
+    ORDER BY fecha_consulta DESC LIMIT ?
+    ''', params).fetchall()
+
+
+def like_count(conn, text):
+    where, params = [], []
+    for term in medical_search.search_terms(text):
+        where.append("(diagnostico LIKE ? OR tratamiento LIKE ? OR observaciones LIKE ? OR motivo_consulta LIKE ?)")
+        params.extend([f"%{term}%"] * 4)
+    return conn.execute(f"SELECT COUNT(*) FROM historial_medico WHERE {' AND '.join(where)}", params).fetchone()[0]
+
+
+def fts_count(conn, text):
+    return conn.execute("SELECT COUNT(*) FROM historial_medico_fts WHERE historial_medico_fts MATCH ?",
+                        (medical_search.match_expression(text),)).fetchone()[0]
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--patients', type=int, default=20_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='medisync_fts_')
+    try:
+        db_path = os.path.join(workdir, 'bench.db')
+        start = time.perf_counter()
+        conn = create_database(db_path, args.records, args.patients)
+        print(f"📄 {args.records:,} registros generados en {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        medical_search.ensure_fts(conn.cursor())
+        conn.commit()
+        print(f"🔎 Índice FTS5 construido en {time.perf_counter() - start:.1f}s "
+              f"(base: {os.path.getsize(db_path) / 1e6:.0f} MB)")
+        cursor = conn.cursor()
+
+        print(f"\n{'búsqueda':<30}{'coincid. LIKE':>14}{'coincid. FTS':>14}"
+              f"{'LIKE ms':>10}{'FTS ms':>10}{'x':>8}")
+        print("-" * 86)
+        for text, label in QUERIES:
+            like_ms = measure(lambda: like_search(conn, text), args.repeat)
+            fts_ms = measure(lambda: medical_search.search(cursor, text), args.repeat)
+            print(f"{text + ' (' + label + ')':<30}{like_count(conn, text):>14,}{fts_count(conn, text):>14,}"
+                  f"{like_ms:>10.1f}{fts_ms:>10.1f}{like_ms / fts_ms:>8.1f}")
+
+        patient = random.Random(1).randint(1, args.patients)
+        # Con paciente, search() filtra sus pocos registros con LIKE sin acentos
+        print(f"\nHistorial de un paciente (id {patient}):")
+        for text, label in QUERIES[:3]:
+            like_ms = measure(lambda: like_search(conn, text, patient), args.repeat)
+            fts_ms = measure(lambda: medical_search.search(cursor, text, paciente_id=patient), args.repeat)
+            print(f"  {text:<28}LIKE {like_ms:8.2f} ms   search() {fts_ms:8.2f} ms")
+        conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
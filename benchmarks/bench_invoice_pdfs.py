@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark de PDFs de facturas: facturas por minuto del servicio por lotes
+Renderiza las facturas de una copia de la base (repetidas hasta --invoices)
+en el proceso actual y con un pool de --workers procesos, y compara con el
+objetivo de facturas por minuto. También mide una reimpresión sin cambios
+servida por la caché de documentos. Los PDFs se escriben en un directorio
+temporal que se borra al terminar.
+
+Uso:
+    python benchmarks/bench_invoice_pdfs.py [--invoices 200] [--workers 4] [--target 300]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_ROOT)
+
+from database_manager import DatabaseManager
+from document_cache import DocumentCache
+from invoice_pdf_service import InvoicePDFService
+
+
+def all_invoice_ids(db):
+    conn = db.get_connection()
+    try:
+        return [row[0] for row in conn.execute("SELECT id FROM facturas ORDER BY id").fetchall()]
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--invoices', type=int, default=200, help="facturas a renderizar por medición")
+    parser.add_argument('--workers', type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument('--target', type=float, default=300.0, help="objetivo de facturas por minuto")
+    parser.add_argument('--db', default=os.path.join(REPO_ROOT, 'database', 'medisync.db'),
+                        help="base de origen (se copia; nunca se modifica)")
+    args = parser.parse_args()
+
+    if not InvoicePDFService.available():
+        print("❌ reportlab no está instalado: pip install reportlab")
+        sys.exit(1)
+
+    workdir = tempfile.mkdtemp(prefix='medisync_pdfs_')
+    try:
+        db_path = os.path.join(workdir, 'medisync.db')
+        shutil.copy(args.db, db_path)
+        db = DatabaseManager.shared(db_path)
+        ids = all_invoice_ids(db)
+        if not ids:
+            print("❌ La base no tiene facturas")
+            sys.exit(1)
+
+        # Las mismas facturas en directorios distintos: cada repetición escribe su propio PDF
+        rounds = -(-args.invoices // len(ids))
+        print(f"🧾 {args.invoices} facturas ({len(ids)} distintas), {os.cpu_count()} CPU")
+
+        inline = InvoicePDFService(db, output_dir=os.path.join(workdir, 'inline'), workers=1)
+        pooled = InvoicePDFService(db, output_dir=os.path.join(workdir, 'pool'), workers=args.workers)
+        try:
+            inline.render_invoice(ids[0])  # calentamiento: importar reportlab y preparar estilos
+            best = 0.0
+            for service, label in ((inline, "en proceso"), (pooled, f"pool de {args.workers}")):
+                total, elapsed = 0, 0.0
+                for i in range(rounds):
+                    service.output_dir = os.path.join(workdir, label.replace(' ', '_'), str(i))
+                    batch = ids[:args.invoices - total]
+                    result = service.render_batch(batch)
+                    total += len(result.written)
+                    elapsed += result.elapsed
+                    if total >= args.invoices:
+                        break
+                per_minute = total / elapsed * 60 if elapsed else 0.0
+                best = max(best, per_minute)
+                print(f"   {label:<16} {total:5d} PDFs  {elapsed:7.2f} s  {per_minute:8.0f} /min")
+
+            # Reimpresión sin cambios: con la caché de documentos es buscar el archivo
+            cached = InvoicePDFService(db, output_dir=os.path.join(workdir, 'cache'), workers=1,
+                                       cache=DocumentCache(db))
+            cached.render_batch(ids)
+            result = cached.render_batch(ids)
+            print(f"   {'reimpresión':<16} {result.cached:5d} de caché {result.elapsed * 1000:5.1f} ms "
+                  f"{result.per_minute:8.0f} /min")
+        finally:
+            pooled.shutdown()
+
+        if best < args.target:
+            print(f"❌ {best:.0f} facturas/min < objetivo {args.target:.0f}")
+            sys.exit(1)
+        print(f"✅ {best:.0f} facturas/min (objetivo {args.target:.0f})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark de reportes: GROUP BY sobre citas/facturas frente a tablas de hechos
+Genera varios años de citas y facturas en una base temporal, aplica las
+migraciones (que construyen las tablas rollup_*) y mide los resúmenes de
+los reportes de ingresos, citas y financiero por ambos caminos. También
+mide el coste por INSERT que añaden los triggers.
+
+Uso:
+    python benchmarks/bench_reports.py [--years 5] [--appointments 500000] [--invoices 300000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import report_rollups
+import schema_migrations
+from database_manager import SCHEMA_TABLES
+
+ESTADOS_CITA = ('pendiente', 'confirmada', 'completada', 'completada', 'cancelada')
+ESTADOS_FACTURA = ('pendiente', 'pagada', 'pagada', 'pagada', 'vencido')
+METODOS = ('Efectivo', 'Tarjeta', 'Transferencia')
+MOTIVOS = ('Control', 'Dolor abdominal', 'Fiebre', 'Chequeo anual', 'Seguimiento')
+
+
+def create_database(db_path, years, appointments, invoices, seed=7):
+    rnd = random.Random(seed)
+    first_day = date.today().replace(month=1, day=1) - timedelta(days=365 * (years - 1))
+    days = (date.today() - first_day).days + 1
+
+    def day():
+        return first_day + timedelta(days=rnd.randrange(days))
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    for ddl in SCHEMA_TABLES:
+        conn.execute(ddl)
+    conn.executemany(
+        "INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo, estado, tarifa_consulta) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        ((rnd.randint(1, 20000), rnd.randint(1, 40), f"{day()} {rnd.randint(8, 17):02d}:00:00",
+          rnd.choice(MOTIVOS), rnd.choice(ESTADOS_CITA), 1500.0) for _ in range(appointments))
+    )
+
+    def invoice(i):
+        created = day()
+        estado = rnd.choice(ESTADOS_FACTURA)
+        paid = f"{created + timedelta(days=rnd.randint(0, 20))} 10:00:00" if estado == 'pagada' else None
+        return (f"B-{i}", rnd.randint(1, 20000), rnd.randint(1, 40), "Consulta médica",
+                round(rnd.uniform(500, 5000), 2), estado, created.isoformat(),
+                (created + timedelta(days=30)).isoformat(), paid, rnd.choice(METODOS) if paid else None)
+
+    conn.executemany(
+        "INSERT INTO facturas (numero_factura, paciente_id, doctor_id, concepto, monto, estado, "
+        "fecha_creacion, fecha_vencimiento, fecha_pago, metodo_pago) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (invoice(i) for i in range(invoices))
+    )
+    conn.commit()
+    return conn, first_day
+
+
+def raw_reports(cursor, start, end):
+    """Consultas anteriores: agrupan las filas de citas y facturas en cada reporte"""
+    s, e = start.isoformat(), f"{end.isoformat()}T23:59:59"
+    cursor.execute("SELECT SUM(monto), COUNT(*) FROM facturas "
+                   "WHERE fecha_creacion BETWEEN ? AND ? AND estado IN ('pagada', 'pago_parcial')", (s, e))
+    cursor.fetchall()
+    cursor.execute("SELECT COUNT(*), SUM(CASE WHEN estado = 'completada' THEN 1 ELSE 0 END), "
+                   "SUM(CASE WHEN estado = 'cancelada' THEN 1 ELSE 0 END) FROM citas "
+                   "WHERE fecha_hora BETWEEN ? AND ?", (s, e))
+    cursor.fetchall()
+    cursor.execute("SELECT estado, COUNT(*) FROM citas WHERE fecha_hora BETWEEN ? AND ? GROUP BY estado", (s, e))
+    cursor.fetchall()
+    cursor.execute("SELECT doctor_id, COUNT(*) FROM citas WHERE fecha_hora BETWEEN ? AND ? "
+                   "GROUP BY doctor_id ORDER BY 2 DESC LIMIT 10", (s, e))
+    cursor.fetchall()
+    cursor.execute("SELECT SUM(monto), COUNT(*) FROM facturas WHERE estado = 'pagada' "
+                   "AND fecha_pago BETWEEN ? AND ?", (s, e))
+    cursor.fetchall()
+    cursor.execute("SELECT SUM(monto), COUNT(*) FROM facturas WHERE estado = 'pendiente' "
+                   "AND fecha_creacion BETWEEN ? AND ?", (s, e))
+    cursor.fetchall()
+
+
+def rollup_reports(cursor, start, end):
+    report_rollups.income_totals(cursor, start, end, ('pagada', 'pago_parcial'))
+    report_rollups.appointments_totals(cursor, start, end)
+    report_rollups.appointments_by_state(cursor, start, end)
+    report_rollups.appointments_by_doctor(cursor, start, end, limit=10)
+    report_rollups.financial_summary(cursor, start, end)
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--appointments', type=int, default=500_000)
+    parser.add_argument('--invoices', type=int, default=300_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='medisync_reports_')
+    try:
+        db_path = os.path.join(workdir, 'bench.db')
+        started = time.perf_counter()
+        conn, first_day = create_database(db_path, args.years, args.appointments, args.invoices)
+        print(f"📄 {args.appointments:,} citas y {args.invoices:,} facturas en {args.years} años "
+              f"({time.perf_counter() - started:.1f}s)")
+
+        started = time.perf_counter()
+        schema_migrations.migrate(conn)
+        print(f"🧮 Migraciones y tablas de hechos en {time.perf_counter() - started:.1f}s")
+        cursor = conn.cursor()
+
+        today = date.today()
+        ranges = [
+            ("Un mes", today.replace(day=1), today),
+            ("Un año", today.replace(month=1, day=1), today),
+            (f"{args.years} años", first_day, today),
+            ("Rango irregular", first_day + timedelta(days=17), today - timedelta(days=45)),
+        ]
+        print(f"\n{'rango':<20}{'GROUP BY ms':>14}{'hechos ms':>12}{'x':>8}")
+        print("-" * 54)
+        for label, start, end in ranges:
+            raw_ms = measure(lambda: raw_reports(cursor, start, end), args.repeat)
+            rollup_ms = measure(lambda: rollup_reports(cursor, start, end), args.repeat)
+            print(f"{label:<20}{raw_ms:>14.1f}{rollup_ms:>12.2f}{raw_ms / rollup_ms:>8.0f}")
+
+        failures = {table: count for table, count in report_rollups.verify(cursor).items() if count}
+        print(f"\n{'❌ ' + str(failures) if failures else '✅ Tablas de hechos coherentes'}")
+
+        # Coste de los triggers por escritura
+        rows = [(1, 1, f"{today} 09:00:00", "Control", 'pendiente', 1500.0)] * 5000
+        started = time.perf_counter()
+        for row in rows:
+            cursor.execute("INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo, estado, "
+                           "tarifa_consulta) VALUES (?, ?, ?, ?, ?, ?)", row)
+        conn.commit()
+        elapsed = (time.perf_counter() - started) / len(rows) * 1e6
+        print(f"✍️  INSERT de cita con triggers de contadores: {elapsed:.0f} µs")
+        conn.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque: tiempo hasta la ventana de login de MEDISYNC
+Cada medición es un intérprete nuevo que importa MEDISYNC, abre la base de
+datos (copia temporal) y construye la ventana de login sin entrar en
+mainloop. Sin pantalla (sin $DISPLAY) se mide hasta la base de datos lista.
+Falla (código 1) si la mediana supera el presupuesto o si al arrancar ya se
+cargaron dependencias pesadas o módulos de vistas que deberían ser perezosos.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 7] [--budget-ms 1500] [--source DIR]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 1500.0
+
+# Módulos que no deben estar cargados al llegar al login
+LAZY_PREFIXES = ('reportlab', 'tkcalendar', 'babel', 'PIL', 'qrcode', 'medisync_views.')
+
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+import MEDISYNC
+imported = time.perf_counter()
+shared = getattr(MEDISYNC.DBManager, 'shared', None)
+db = shared('database/medisync.db') if shared else MEDISYNC.DBManager('database/medisync.db')
+db_ready = time.perf_counter()
+result = {'import_ms': (imported - started) * 1000, 'db_ms': (db_ready - imported) * 1000,
+          'login_ms': None, 'display': True}
+import tkinter as tk
+try:
+    tk.Tk.mainloop = lambda self, n=0: None
+    app = MEDISYNC.MedisyncApp()
+    app.root.update_idletasks()
+    result['login_ms'] = (time.perf_counter() - db_ready) * 1000
+    app.root.destroy()
+except tk.TclError:
+    result['display'] = False
+result['total_ms'] = (time.perf_counter() - started) * 1000
+result['lazy_loaded'] = sorted(name for name in sys.modules if name.startswith(LAZY_PREFIXES))
+print(json.dumps(result))
+"""
+
+
+def run_once(source, workdir):
+    env = dict(os.environ, PYTHONPATH=source)
+    code = f"LAZY_PREFIXES = {LAZY_PREFIXES!r}\n{CHILD}"
+    proc = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=env,
+                          capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or proc.stdout.strip())
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(source=REPO_ROOT, runs=7, db_source=None):
+    """Resultados de ``runs`` arranques (más uno de calentamiento) sobre una copia de la base"""
+    workdir = tempfile.mkdtemp(prefix='medisync_startup_')
+    try:
+        # Copia de la base: el arranque puede migrar y no debe tocar la del repositorio
+        os.makedirs(os.path.join(workdir, 'database'))
+        db_source = db_source or os.path.join(source, 'database', 'medisync.db')
+        if os.path.exists(db_source):
+            shutil.copy(db_source, os.path.join(workdir, 'database', 'medisync.db'))
+
+        run_once(source, workdir)  # calentamiento: .pyc y migraciones de la copia
+        return [run_once(source, workdir) for _ in range(runs)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def median(results, key):
+    values = [r[key] for r in results if r[key] is not None]
+    return statistics.median(values) if values else None
+
+
+def check(results, budget_ms):
+    """Fallos de una medición: mediana fuera del presupuesto o módulos perezosos ya cargados"""
+    failures = []
+    total = median(results, 'total_ms')
+    if total > budget_ms:
+        failures.append(f"arranque {total:.1f} ms > {budget_ms:.0f} ms")
+    loaded = sorted({name for r in results for name in r['lazy_loaded']})
+    if loaded:
+        failures.append(f"módulos cargados antes de usarlos: {', '.join(loaded)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="presupuesto para la mediana del tiempo total hasta el login")
+    parser.add_argument('--source', default=REPO_ROOT,
+                        help="árbol de MEDISYNC a medir (p. ej. un checkout anterior para comparar)")
+    args = parser.parse_args()
+
+    results = measure(args.source, args.runs)
+
+    print(f"🚀 Arranque de MEDISYNC ({args.runs} procesos, mediana)")
+    print(f"   import MEDISYNC:   {median(results, 'import_ms'):8.1f} ms")
+    print(f"   base de datos:     {median(results, 'db_ms'):8.1f} ms")
+    if results[0]['display']:
+        print(f"   ventana de login:  {median(results, 'login_ms'):8.1f} ms")
+    else:
+        print("   ventana de login:       -    (sin pantalla)")
+    print(f"   total:             {median(results, 'total_ms'):8.1f} ms  (presupuesto {args.budget_ms:.0f} ms)")
+
+    failures = check(results, args.budget_ms)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ Dentro del presupuesto; reportlab, tkcalendar y las vistas siguen sin cargar")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de los caminos críticos de MEDISYNC
+Genera una clínica sintética (synthetic_clinic.py) en un directorio temporal
+o usa una copia de --db, y mide con DatabaseManager: inicio de sesión,
+contadores de paneles, filtrado de citas, conflictos de horario, creación
+de facturas, datos de reportes y PDF de una factura. Cada benchmark se
+calienta y se repite --rounds veces; se informa mínimo, mediana, media,
+desviación y operaciones por segundo.
+
+--json guarda los resultados con el commit, la máquina y el conjunto de
+datos; --compare lee un JSON anterior y termina con error si alguna mediana
+empeoró más de --threshold (0.25 = 25 %).
+
+Uso:
+    python benchmarks/bench_suite.py [--doctors 20] [--patients 5000] [--years 2] [--rounds 30]
+    python benchmarks/bench_suite.py --json base.json
+    python benchmarks/bench_suite.py --compare base.json [--threshold 0.25] [-k citas]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_ROOT)
+
+import dashboard_stats
+import report_rollups
+import synthetic_clinic
+from database_manager import DEFAULT_USERS, AppointmentQuery, DatabaseManager
+from invoice_pdf_service import InvoicePDFService
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Benchmark:
+    """Un camino crítico: ``func(ctx)`` es una operación medida"""
+    name: str
+    group: str
+    func: Callable
+    rounds: Optional[int] = None
+    warmup: int = 2
+    requires: Optional[Callable] = None
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(group, rounds=None, warmup=2, requires=None):
+    """Registrar una función como benchmark (el nombre es el de la función)"""
+    def register(func):
+        BENCHMARKS.append(Benchmark(func.__name__, group, func, rounds, warmup, requires))
+        return func
+    return register
+
+
+@dataclass
+class Context:
+    """Base de pruebas y datos de referencia compartidos por los benchmarks"""
+    db: DatabaseManager
+    workdir: str
+    today: date
+    doctor_ids: List[int]
+    patient_ids: List[int]
+    invoice_ids: List[int]
+    rnd: random.Random = field(default_factory=lambda: random.Random(7))
+    pdf_service: Optional[InvoicePDFService] = None
+
+    def doctor(self):
+        return self.rnd.choice(self.doctor_ids)
+
+    def patient(self):
+        return self.rnd.choice(self.patient_ids)
+
+    def year_range(self):
+        return self.today - timedelta(days=365), self.today
+
+
+def load_context(db, workdir):
+    """Fecha de referencia (último día con consultas) e ids para elegir al azar"""
+    conn = db.get_simple_connection()
+    try:
+        today = conn.execute("SELECT MAX(DATE(fecha_hora)) FROM citas WHERE estado = 'completada'").fetchone()[0]
+        doctors = [row[0] for row in conn.execute("SELECT id FROM doctores ORDER BY id")]
+        patients = [row[0] for row in conn.execute("SELECT id FROM pacientes ORDER BY id")]
+        invoices = [row[0] for row in conn.execute("SELECT id FROM facturas ORDER BY id DESC LIMIT 500")]
+    finally:
+        conn.close()
+    return Context(db, workdir, date.fromisoformat(today) if today else date.today(),
+                   doctors, patients, invoices)
+
+
+def _read(ctx, reader, *args):
+    conn = ctx.db.get_connection()
+    cursor = conn.cursor()
+    try:
+        return reader(cursor, *args)
+    finally:
+        cursor.close()
+        conn.close()
+
+
+# ----------------------------------------------------------------------
+# Caminos críticos
+# ----------------------------------------------------------------------
+ADMIN = DEFAULT_USERS[0]
+
+
+@benchmark('login')
+def login_admin(ctx):
+    assert ctx.db.authenticate_user(ADMIN['email'], ADMIN['password']) is not None
+
+
+@benchmark('login')
+def login_wrong_password(ctx):
+    assert ctx.db.authenticate_user(ADMIN['email'], 'incorrecta') is None
+
+
+@benchmark('paneles')
+def dashboard_admin(ctx):
+    _read(ctx, dashboard_stats.system_stats, ctx.today)
+
+
+@benchmark('paneles')
+def dashboard_doctor(ctx):
+    _read(ctx, dashboard_stats.doctor_stats, ctx.doctor(), ctx.today)
+
+
+@benchmark('paneles')
+def dashboard_secretaria(ctx):
+    _read(ctx, dashboard_stats.secretaria_stats, ctx.today)
+
+
+@benchmark('citas')
+def appointments_first_page(ctx):
+    ctx.db.get_appointments_page(AppointmentQuery(), limit=100)
+
+
+@benchmark('citas')
+def appointments_by_state_month(ctx):
+    query = AppointmentQuery(estado='completada', fecha_desde=ctx.today.replace(day=1).isoformat(),
+                             fecha_hasta=ctx.today.isoformat())
+    ctx.db.get_appointments_page(query, limit=100)
+    ctx.db.count_appointments(query, limit=2000)
+
+
+@benchmark('citas')
+def appointments_by_doctor(ctx):
+    ctx.db.get_appointments_page(AppointmentQuery(doctor_id=ctx.doctor()), limit=100)
+
+
+@benchmark('citas')
+def appointments_by_patient(ctx):
+    ctx.db.get_appointments_page(AppointmentQuery(paciente_id=ctx.patient()), limit=100)
+
+
+@benchmark('citas')
+def appointments_text_search(ctx):
+    ctx.db.get_appointments_page(AppointmentQuery(texto='Seguimiento'), limit=100)
+
+
+@benchmark('horarios')
+def conflict_check(ctx):
+    day = ctx.today - timedelta(days=ctx.rnd.randrange(60))
+    ctx.db.find_appointment_conflicts(ctx.doctor(), f"{day.isoformat()} 10:00", 30)
+
+
+@benchmark('horarios')
+def available_slots(ctx):
+    day = ctx.today + timedelta(days=ctx.rnd.randrange(1, 30))
+    ctx.db.get_available_slots(ctx.doctor(), day.isoformat())
+
+
+@benchmark('facturas')
+def invoice_create(ctx):
+    created = ctx.today
+    invoice_id = ctx.db.create_invoice({
+        'paciente_id': ctx.patient(),
+        'doctor_id': ctx.doctor(),
+        'concepto': 'Consulta de benchmark',
+        'monto': 1500.0,
+        'fecha_creacion': created.isoformat(),
+        'fecha_vencimiento': (created + timedelta(days=30)).isoformat(),
+    })
+    assert invoice_id is not None
+
+
+@benchmark('reportes')
+def report_income(ctx):
+    start, end = ctx.year_range()
+    _read(ctx, report_rollups.income_totals, start, end, ('pagada', 'pago_parcial'))
+    _read(ctx, report_rollups.income_by_day, start, end, ('pagada', 'pago_parcial'))
+
+
+@benchmark('reportes')
+def report_appointments(ctx):
+    start, end = ctx.year_range()
+    _read(ctx, report_rollups.appointments_totals, start, end)
+    _read(ctx, report_rollups.appointments_by_state, start, end)
+    _read(ctx, report_rollups.appointments_by_doctor, start, end)
+
+
+@benchmark('reportes')
+def report_financial(ctx):
+    start, end = ctx.year_range()
+    _read(ctx, report_rollups.financial_summary, start, end)
+
+
+@benchmark('pdf', rounds=10, warmup=1, requires=InvoicePDFService.available)
+def invoice_pdf(ctx):
+    if ctx.pdf_service is None:
+        ctx.pdf_service = InvoicePDFService(ctx.db, output_dir=os.path.join(ctx.workdir, 'pdf'), workers=1)
+    assert ctx.pdf_service.render_invoice(ctx.rnd.choice(ctx.invoice_ids)) is not None
+
+
+# ----------------------------------------------------------------------
+# Medición y resultados
+# ----------------------------------------------------------------------
+def measure(bench, ctx, rounds):
+    """Tiempos de ``rounds`` ejecuciones tras el calentamiento; devuelve las estadísticas en ms"""
+    for _ in range(bench.warmup):
+        bench.func(ctx)
+    timings = []
+    for _ in range(bench.rounds or rounds):
+        started = time.perf_counter()
+        bench.func(ctx)
+        timings.append((time.perf_counter() - started) * 1000)
+    mean = statistics.mean(timings)
+    return {
+        'group': bench.group,
+        'rounds': len(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'mean': mean,
+        'median': statistics.median(timings),
+        'stddev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'ops': 1000 / mean if mean else 0.0,
+    }
+
+
+def git_commit():
+    """(commit, hay cambios sin confirmar) del árbol actual, o (None, None) fuera de git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(dirty)
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'sistema': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, previous, threshold):
+    """Benchmarks cuya mediana empeoró más de ``threshold``: [(nombre, antes, ahora, cambio)]"""
+    regressions = []
+    old = previous.get('benchmarks', {})
+    print(f"\n📊 Comparación con {(previous.get('commit') or '?')[:10]} (umbral {threshold:.0%})")
+    for name, stats in results.items():
+        if name not in old:
+            print(f"   {name:<30} (nuevo)")
+            continue
+        before, now = old[name]['median'], stats['median']
+        change = (now - before) / before if before else 0.0
+        mark = '❌' if change > threshold else '✅' if change < -threshold else '  '
+        print(f"   {name:<30} {before:9.3f} → {now:9.3f} ms  {change:+7.1%} {mark}")
+        if change > threshold:
+            regressions.append((name, before, now, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', help="base existente (se copia; por defecto se genera una sintética)")
+    parser.add_argument('--doctors', type=int, default=20)
+    parser.add_argument('--patients', type=int, default=5000)
+    parser.add_argument('--years', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--rounds', type=int, default=30, help="repeticiones por benchmark")
+    parser.add_argument('-k', dest='filter', help="sólo benchmarks cuyo nombre o grupo contenga este texto")
+    parser.add_argument('--json', help="guardar los resultados en este archivo")
+    parser.add_argument('--compare', help="resultados anteriores (JSON) con los que comparar")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="empeoramiento relativo de la mediana que cuenta como regresión")
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ No se pudo leer {args.compare}: {e}")
+            sys.exit(1)
+
+    selected = [bench for bench in BENCHMARKS
+                if not args.filter or args.filter in bench.name or args.filter in bench.group]
+    workdir = tempfile.mkdtemp(prefix='medisync_suite_')
+    try:
+        db_path = os.path.join(workdir, 'medisync.db')
+        if args.db:
+            shutil.copy(args.db, db_path)
+            dataset = {'origen': os.path.abspath(args.db)}
+        else:
+            print(f"🏥 Generando clínica sintética: {args.doctors} doctores, {args.patients} pacientes, "
+                  f"{args.years} años...")
+            dataset = synthetic_clinic.generate(db_path, args.doctors, args.patients, args.years, args.seed)
+            print(f"   {dataset['citas']:,} citas, {dataset['facturas']:,} facturas, "
+                  f"{dataset['historial_medico']:,} historiales en {dataset['segundos']} s")
+
+        db = DatabaseManager.shared(db_path)
+        ctx = load_context(db, workdir)
+        print(f"⏱️  {len(selected)} benchmarks, {args.rounds} rondas, fecha de referencia {ctx.today}\n")
+        print(f"   {'benchmark':<30} {'mín':>9} {'mediana':>9} {'media':>9} {'desv':>8} {'ops/s':>9}")
+
+        results: Dict[str, dict] = {}
+        try:
+            for bench in selected:
+                if bench.requires is not None and not bench.requires():
+                    print(f"   {bench.name:<30} omitido (dependencia opcional no instalada)")
+                    continue
+                stats = measure(bench, ctx, args.rounds)
+                results[bench.name] = stats
+                print(f"   {bench.name:<30} {stats['min']:9.3f} {stats['median']:9.3f} {stats['mean']:9.3f} "
+                      f"{stats['stddev']:8.3f} {stats['ops']:9.0f}")
+        finally:
+            if ctx.pdf_service is not None:
+                ctx.pdf_service.shutdown()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    commit, dirty = git_commit()
+    report = {
+        'version': RESULTS_VERSION,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'cambios_sin_confirmar': dirty,
+        'maquina': machine_info(),
+        'datos': dataset,
+        'rondas': args.rounds,
+        'unidad': 'ms',
+        'benchmarks': results,
+    }
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {args.json}")
+
+    if previous is not None:
+        # El tiempo de generación no describe los datos
+        same_data = ({k: v for k, v in (previous.get('datos') or {}).items() if k != 'segundos'}
+                     == {k: v for k, v in dataset.items() if k != 'segundos'})
+        if not same_data:
+            print("⚠️ Los datos de la comparación no coinciden con los de esta ejecución")
+        regressions = compare(results, previous, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regresiones por encima del {args.threshold:.0%}")
+            sys.exit(1)
+        print("✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
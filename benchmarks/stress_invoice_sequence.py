@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Prueba de estrés de la numeración de facturas
+Varios procesos crean facturas a la vez (asignación en la transacción del
+INSERT, reservas por lotes y transacciones abortadas) y al final se verifica
+que los números de cada clave son 1..N sin duplicados ni huecos.
+
+Uso:
+    python benchmarks/stress_invoice_sequence.py [--processes 8] [--invoices 200]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_concurrency import BUSY_TIMEOUT_MS, configure_connection
+from invoice_sequence import InvoiceNumberAllocator, ensure_sequence_table
+
+ALLOCATORS = (
+    InvoiceNumberAllocator('FAC', 'year'),
+    InvoiceNumberAllocator('FAC', 'day'),
+)
+
+
+def create_database(db_path):
+    conn = sqlite3.connect(db_path)
+    configure_connection(conn, 'wal')
+    conn.execute('''
+    CREATE TABLE facturas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero_factura VARCHAR(50) UNIQUE NOT NULL,
+        proceso INTEGER NOT NULL
+    )
+    ''')
+    ensure_sequence_table(conn.cursor())
+    conn.commit()
+    conn.close()
+
+
+def worker(db_path, worker_id, invoices, abort_ratio, block_ratio):
+    """Crear facturas; devuelve (creadas, abortadas)"""
+    rnd = random.Random(worker_id)
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    configure_connection(conn, 'wal')
+    created = aborted = 0
+    while created < invoices:
+        allocator = rnd.choice(ALLOCATORS)
+        cursor = conn.cursor()
+        try:
+            if rnd.random() < block_ratio:
+                numbers = allocator.reserve_block(cursor, min(rnd.randint(2, 10), invoices - created))
+            else:
+                numbers = [allocator.allocate(cursor)]
+            cursor.executemany(
+                "INSERT INTO facturas (numero_factura, proceso) VALUES (?, ?)",
+                [(numero, worker_id) for numero in numbers]
+            )
+            if rnd.random() < abort_ratio:
+                # El número vuelve al contador con el ROLLBACK
+                conn.rollback()
+                aborted += 1
+            else:
+                conn.commit()
+                created += len(numbers)
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            print(f"⚠️ Proceso {worker_id}: {e}")
+        finally:
+            cursor.close()
+    conn.close()
+    return created, aborted
+
+
+def verify(db_path):
+    """Devolver (total, errores) comprobando secuencias 1..N por clave"""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT numero_factura FROM facturas").fetchall()
+    counters = dict(conn.execute("SELECT clave, ultimo FROM secuencias_factura").fetchall())
+    conn.close()
+
+    by_key = defaultdict(list)
+    for (numero,) in rows:
+        key, sequence = re.match(r'^(.*)-(\d+)$', numero).groups()
+        by_key[key].append(int(sequence))
+
+    errors = []
+    for key, sequences in by_key.items():
+        sequences.sort()
+        duplicates = len(sequences) - len(set(sequences))
+        missing = set(range(1, len(sequences) + 1)) - set(sequences)
+        if duplicates:
+            errors.append(f"{key}: {duplicates} números duplicados")
+        if missing:
+            errors.append(f"{key}: faltan {len(missing)} números (p. ej. {sorted(missing)[:5]})")
+        if counters.get(key) != len(sequences):
+            errors.append(f"{key}: contador en {counters.get(key)} con {len(sequences)} facturas")
+    return len(rows), by_key, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--invoices', type=int, default=200, help="facturas por proceso")
+    parser.add_argument('--abort-ratio', type=float, default=0.1, help="proporción de transacciones abortadas")
+    parser.add_argument('--block-ratio', type=float, default=0.2, help="proporción de reservas por lotes")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='medisync_seq_')
+    try:
+        db_path = os.path.join(workdir, 'stress.db')
+        create_database(db_path)
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.starmap(worker, [
+                (db_path, i, args.invoices, args.abort_ratio, args.block_ratio)
+                for i in range(args.processes)
+            ])
+        elapsed = time.perf_counter() - start
+
+        total, by_key, errors = verify(db_path)
+        aborted = sum(r[1] for r in results)
+        print(f"📄 {total} facturas de {args.processes} procesos en {elapsed:.2f}s "
+              f"({total / elapsed:.0f}/s, {aborted} transacciones abortadas)")
+        for key, sequences in sorted(by_key.items()):
+            print(f"   {key}: 1..{max(sequences)}")
+        if errors:
+            for error in errors:
+                print(f"❌ {error}")
+            return 1
+        print("✅ Sin duplicados ni huecos")
+        return 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
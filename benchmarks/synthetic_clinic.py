@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Generador determinista de una clínica sintética para benchmarks
+Crea una base con el esquema de la aplicación (SCHEMA_TABLES, seguros por
+defecto y las columnas de facturación de la base instalada), la llena con --doctors doctores, --patients pacientes y --years
+años de citas, facturas e historial médico hasta --end, y aplica las
+migraciones (índices, contadores, tablas de hechos, FTS). La misma semilla
+y los mismos parámetros producen siempre la misma base.
+
+Distribuciones:
+- Citas en días laborables, bloques de 30 min de 08:00 a 17:00, sin
+  solapes por doctor; la carga diaria varía por día de la semana y mes.
+- Pocos pacientes concentran muchas visitas (pesos de Pareto).
+- Citas pasadas: completadas, canceladas o no asistidas; las de los 30
+  días posteriores a --end quedan pendientes o confirmadas.
+- Facturas para casi todas las citas completadas, con importes log-normales
+  alrededor de la tarifa del doctor y días de cobro exponenciales.
+- Historial médico para la mayoría de las consultas completadas.
+
+Los usuarios por defecto (admin@medisync.com / admin123...) se crean con sus
+contraseñas; el resto usa SYNTHETIC_PASSWORD.
+
+Uso:
+    python benchmarks/synthetic_clinic.py salida.db [--doctors 20] [--patients 5000] [--years 2] [--seed 7]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import schema_migrations
+from database_manager import DEFAULT_INSURANCE_SQL, DEFAULT_USERS, SCHEMA_TABLES
+
+DEFAULT_END = date(2025, 7, 31)
+SYNTHETIC_PASSWORD = 'medisync123'
+PAID_STATE = 'pagada'  # el estado que escribe DatabaseManager.pay_invoice
+SLOT_MINUTES = 30
+SLOTS = [f"{8 + i // 2:02d}:{30 * (i % 2):02d}" for i in range(18)]  # 08:00 ... 16:30
+FUTURE_DAYS = 30
+
+NOMBRES = ('Ana', 'Carlos', 'María', 'José', 'Luis', 'Carmen', 'Juan', 'Rosa', 'Pedro', 'Laura',
+           'Miguel', 'Elena', 'Jorge', 'Lucía', 'Rafael', 'Isabel', 'Manuel', 'Patricia', 'Andrés',
+           'Sofía', 'Ramón', 'Teresa', 'Francisco', 'Gabriela', 'Héctor', 'Daniela', 'Víctor', 'Paola')
+APELLIDOS = ('García', 'Rodríguez', 'Martínez', 'Pérez', 'Gómez', 'Sánchez', 'Díaz', 'Reyes',
+             'Cruz', 'Morales', 'Jiménez', 'Ramírez', 'Torres', 'Flores', 'Núñez', 'Peña',
+             'Castillo', 'Ortiz', 'Mejía', 'Batista', 'Herrera', 'Medina', 'Guzmán', 'Almonte')
+# (especialidad, tarifa base)
+ESPECIALIDADES = (('Medicina General', 1500), ('Pediatría', 2000), ('Ginecología', 2500),
+                  ('Cardiología', 3500), ('Dermatología', 2500), ('Traumatología', 3000),
+                  ('Endocrinología', 3000), ('Neurología', 4000))
+MOTIVOS = (('Consulta general', 30), ('Control de rutina', 20), ('Seguimiento', 15),
+           ('Dolor abdominal', 6), ('Fiebre', 6), ('Chequeo anual', 8), ('Resultados de análisis', 8),
+           ('Dolor de cabeza', 4), ('Tos persistente', 3))
+# (diagnóstico, tratamiento, medicamentos)
+DIAGNOSTICOS = (('Hipertensión arterial leve', 'Dieta baja en sodio, ejercicio regular', 'Losartán 50 mg'),
+                ('Infección respiratoria alta', 'Reposo e hidratación', 'Amoxicilina 500 mg'),
+                ('Gastritis', 'Dieta blanda, evitar irritantes', 'Omeprazol 20 mg'),
+                ('Diabetes tipo 2 controlada', 'Control glucémico mensual', 'Metformina 850 mg'),
+                ('Migraña', 'Evitar desencadenantes', 'Ibuprofeno 400 mg'),
+                ('Dermatitis de contacto', 'Evitar alérgeno', 'Hidrocortisona crema'),
+                ('Lumbalgia mecánica', 'Fisioterapia', 'Diclofenaco 50 mg'),
+                ('Paciente sano', 'Ninguno', ''))
+SINTOMAS = ('Dolor', 'Fiebre', 'Cansancio', 'Mareos', 'Tos', 'Náuseas', 'Ninguno')
+TIPOS_SANGRE = (('O+', 45), ('A+', 30), ('B+', 10), ('AB+', 3), ('O-', 6), ('A-', 4), ('B-', 1), ('AB-', 1))
+METODOS_PAGO = (('Efectivo', 45), ('Tarjeta', 35), ('Transferencia', 20))
+# Seguros por defecto de DEFAULT_INSURANCE_SQL: id -> (nombre, % de descuento, peso)
+SEGUROS = {1: ('ARS Senasa', 15.0, 30), 2: ('ARS Humano', 20.0, 20), 3: ('Universal', 10.0, 10),
+           4: ('Sin Seguro', 0.0, 40)}
+# Columnas de facturas que escribe billing_system_final y que el esquema base no crea
+# (las mismas que tiene la base instalada)
+BILLING_COLUMNS = (('cita_id', 'INTEGER'), ('monto_original', 'REAL'), ('monto_descuento', 'REAL DEFAULT 0'),
+                   ('notas', 'TEXT'), ('seguro_aplicado', 'TEXT'), ('descuento_seguro', 'REAL DEFAULT 0'),
+                   ('moneda', "TEXT DEFAULT 'RD$'"), ('tipo_consulta', 'TEXT'))
+# Carga relativa por día de la semana (lunes = 0) y por mes
+WEEKDAY_LOAD = (1.2, 1.0, 1.0, 1.0, 0.9)
+MONTH_LOAD = (1.1, 1.0, 1.0, 1.0, 1.0, 0.95, 0.9, 0.8, 1.0, 1.05, 1.05, 0.75)
+
+
+def _weights(pairs):
+    values = [value for value, _ in pairs]
+    weights = [weight for _, weight in pairs]
+    return values, weights
+
+
+def password_hash(password):
+    # Mismo hash que DatabaseManager.hash_password
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def create_schema(conn):
+    """Tablas base y seguros por defecto (como DatabaseManager.create_tables) más las columnas de facturación"""
+    for ddl in SCHEMA_TABLES:
+        conn.execute(ddl)
+    conn.execute(DEFAULT_INSURANCE_SQL)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(facturas)")}
+    for column, definition in BILLING_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE facturas ADD COLUMN {column} {definition}")
+
+
+def _insert_users(conn, rnd, doctors, secretarias, patients):
+    """Usuarios por defecto y sintéticos
+
+    Devuelve (doctores [(id, especialidad, tarifa)], {paciente_id: seguro_medico_id}).
+    """
+    synthetic_hash = password_hash(SYNTHETIC_PASSWORD)
+    rows = []
+    for user in DEFAULT_USERS:
+        rows.append((user['nombre'], user['apellido'], user['email'], user['telefono'],
+                     user['tipo_usuario'], password_hash(user['password'])))
+    for tipo, count in (('doctor', doctors), ('secretaria', secretarias), ('paciente', patients)):
+        for n in range(1, count + 1):
+            nombre = rnd.choice(NOMBRES)
+            if tipo == 'doctor':
+                nombre = f"Dr. {nombre}"
+            rows.append((nombre, rnd.choice(APELLIDOS), f"{tipo}{n}@clinica.test",
+                         f"809{rnd.randrange(10 ** 7):07d}", tipo, synthetic_hash))
+    conn.executemany(
+        "INSERT INTO usuarios (nombre, apellido, email, telefono, tipo_usuario, password_hash) "
+        "VALUES (?, ?, ?, ?, ?, ?)", rows
+    )
+
+    by_type = {}
+    for user_id, tipo in conn.execute("SELECT id, tipo_usuario FROM usuarios ORDER BY id"):
+        by_type.setdefault(tipo, []).append(user_id)
+
+    doctor_rows = []
+    for doctor_id in by_type.get('doctor', []):
+        especialidad, tarifa = rnd.choice(ESPECIALIDADES)
+        doctor_rows.append((doctor_id, especialidad, f"CED-{doctor_id:06d}", tarifa))
+    conn.executemany(
+        "INSERT INTO doctores (id, especialidad, cedula_profesional, tarifa_consulta) VALUES (?, ?, ?, ?)",
+        doctor_rows
+    )
+
+    blood, blood_weights = _weights(TIPOS_SANGRE)
+    insurers = list(SEGUROS)
+    insurer_weights = [SEGUROS[seguro][2] for seguro in insurers]
+    patient_rows = []
+    for patient_id in by_type.get('paciente', []):
+        seguro = rnd.choices(insurers, insurer_weights)[0]
+        patient_rows.append((patient_id, f"EXP-{patient_id:06d}", rnd.choices(blood, blood_weights)[0],
+                             seguro, int(seguro != 4)))
+    conn.executemany(
+        "INSERT INTO pacientes (id, numero_expediente, tipo_sangre, seguro_medico_id, tiene_seguro) "
+        "VALUES (?, ?, ?, ?, ?)", patient_rows
+    )
+    return [(row[0], row[1], row[3]) for row in doctor_rows], {row[0]: row[3] for row in patient_rows}
+
+
+def _patient_picker(rnd, patient_ids):
+    """Elegir pacientes con pesos de Pareto: unos pocos (crónicos) vienen muy a menudo"""
+    cumulative, total = [], 0.0
+    for _ in patient_ids:
+        total += min(rnd.paretovariate(1.6), 12.0)
+        cumulative.append(total)
+    return lambda: rnd.choices(patient_ids, cum_weights=cumulative)[0]
+
+
+def _working_days(start, end):
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+def _appointments(rnd, doctors, pick_patient, start, end, daily_load):
+    """Citas por doctor y día laborable, sin solapes; devuelve las filas en orden de fecha"""
+    motivos, motivo_weights = _weights(MOTIVOS)
+    rows = []
+    for day in _working_days(start, end + timedelta(days=FUTURE_DAYS)):
+        expected = daily_load * WEEKDAY_LOAD[day.weekday()] * MONTH_LOAD[day.month - 1]
+        future = day > end
+        for doctor_id, _, tarifa in doctors:
+            count = min(len(SLOTS), max(0, round(rnd.gauss(expected, expected * 0.25))))
+            if future:
+                # Agenda futura todavía a medio llenar
+                count = round(count * max(0.1, 1 - (day - end).days / FUTURE_DAYS))
+            for slot in sorted(rnd.sample(SLOTS, count)):
+                if future:
+                    estado = 'confirmada' if rnd.random() < 0.4 else 'pendiente'
+                else:
+                    roll = rnd.random()
+                    estado = 'completada' if roll < 0.78 else 'cancelada' if roll < 0.90 else 'no_asistio'
+                # Reservada entre 1 y 21 días antes (fecha fija: la base no depende del reloj)
+                booked = f"{(day - timedelta(days=rnd.randint(1, 21))).isoformat()} 09:00:00"
+                rows.append((pick_patient(), doctor_id, f"{day.isoformat()} {slot}:00",
+                             rnd.choices(motivos, motivo_weights)[0], estado, SLOT_MINUTES, float(tarifa),
+                             booked, booked))
+    return rows
+
+
+def _invoices(rnd, completed, especialidades, seguros, end):
+    """Facturas de las citas completadas; importes log-normales y cobro con retraso exponencial"""
+    metodos, metodo_weights = _weights(METODOS_PAGO)
+    numbers = {}
+    rows = []
+    for cita_id, paciente_id, doctor_id, fecha_hora, tarifa in completed:
+        if rnd.random() >= 0.92:
+            continue
+        created = date.fromisoformat(fecha_hora[:10])
+        year = created.year
+        numbers[year] = numbers.get(year, 0) + 1
+        original = max(100.0, round(tarifa * rnd.lognormvariate(0, 0.25) / 50) * 50)
+        seguro, porcentaje, _ = SEGUROS[seguros[paciente_id]]
+        descuento = round(original * porcentaje / 100, 2)
+        due = created + timedelta(days=30)
+        paid_on = created + timedelta(days=min(60, int(rnd.expovariate(1 / 5))))
+        if rnd.random() < 0.88 and paid_on <= end:
+            estado, fecha_pago = PAID_STATE, f"{paid_on.isoformat()} 10:00:00"
+            metodo = rnd.choices(metodos, metodo_weights)[0]
+        else:
+            estado, fecha_pago, metodo = ('vencido' if due < end else 'pendiente'), None, None
+        rows.append((f"FAC-{year}-{numbers[year]:04d}", paciente_id, doctor_id, cita_id,
+                     f"Consulta de {especialidades[doctor_id]}", original, descuento, original - descuento,
+                     estado, created.isoformat(), due.isoformat(), fecha_pago, metodo,
+                     seguro, porcentaje, 'consulta_general'))
+    return rows
+
+
+def _history(rnd, completed):
+    """Historial médico para la mayoría de las consultas completadas"""
+    rows = []
+    for _, paciente_id, doctor_id, fecha_hora, _ in completed:
+        if rnd.random() >= 0.6:
+            continue
+        diagnostico, tratamiento, medicamentos = rnd.choice(DIAGNOSTICOS)
+        consulta = date.fromisoformat(fecha_hora[:10])
+        proxima = (consulta + timedelta(days=rnd.choice((30, 60, 90)))).isoformat() if rnd.random() < 0.3 else None
+        written = f"{consulta.isoformat()} 18:00:00"
+        rows.append((paciente_id, doctor_id, consulta.isoformat(), 'Consulta General',
+                     rnd.choice([m for m, _ in MOTIVOS]), rnd.choice(SINTOMAS), diagnostico,
+                     tratamiento, medicamentos, proxima, written, written))
+    return rows
+
+
+def generate(db_path, doctors=20, patients=5000, years=2, seed=7, end=DEFAULT_END, daily_load=10.0,
+             secretarias=None):
+    """Crear y llenar ``db_path`` (no debe existir); devuelve un resumen con los conteos"""
+    if os.path.exists(db_path):
+        raise FileExistsError(f"La base ya existe: {db_path}")
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    rnd = random.Random(seed)
+    start = end.replace(day=1) - timedelta(days=365 * years)
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        create_schema(conn)
+        doctor_rows, seguros = _insert_users(conn, rnd, doctors, secretarias or max(1, doctors // 5),
+                                                 patients)
+        registered = f"{start.isoformat()} 08:00:00"
+        conn.execute("UPDATE usuarios SET fecha_creacion = ?, fecha_actualizacion = ?", (registered, registered))
+        pick_patient = _patient_picker(rnd, list(seguros))
+
+        citas = _appointments(rnd, doctor_rows, pick_patient, start, end, daily_load)
+        conn.executemany(
+            "INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo, estado, duracion_minutos, "
+            "tarifa_consulta, fecha_creacion, fecha_actualizacion) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", citas
+        )
+        # Las citas se insertan en orden en una tabla vacía: su id es la posición + 1
+        completed = [(cita_id, row[0], row[1], row[2], row[6])
+                     for cita_id, row in enumerate(citas, start=1) if row[4] == 'completada']
+        del citas
+
+        especialidades = {doctor_id: especialidad for doctor_id, especialidad, _ in doctor_rows}
+        conn.executemany(
+            "INSERT INTO facturas (numero_factura, paciente_id, doctor_id, cita_id, concepto, monto_original, "
+            "monto_descuento, monto, estado, fecha_creacion, fecha_vencimiento, fecha_pago, metodo_pago, "
+            "seguro_aplicado, descuento_seguro, tipo_consulta) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _invoices(rnd, completed, especialidades, seguros, end)
+        )
+        conn.executemany(
+            "INSERT INTO historial_medico (paciente_id, doctor_id, fecha_consulta, tipo_consulta, "
+            "motivo_consulta, sintomas, diagnostico, tratamiento, medicamentos, proxima_cita, "
+            "fecha_creacion, fecha_modificacion) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _history(rnd, completed)
+        )
+        conn.commit()
+
+        # Índices, contadores, tablas de hechos y FTS se construyen una vez sobre los datos cargados
+        schema_migrations.migrate(conn)
+        conn.execute("PRAGMA optimize")
+
+        summary = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                   for table in ('usuarios', 'doctores', 'pacientes', 'citas', 'facturas', 'historial_medico')}
+    finally:
+        conn.close()
+
+    summary.update({
+        'seed': seed,
+        'years': years,
+        'desde': start.isoformat(),
+        'hasta': end.isoformat(),
+        'daily_load': daily_load,
+        'segundos': round(time.perf_counter() - started, 2),
+    })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output', help="ruta de la base a crear (no debe existir)")
+    parser.add_argument('--doctors', type=int, default=20)
+    parser.add_argument('--patients', type=int, default=5000)
+    parser.add_argument('--years', type=int, default=2, help="años de historia hasta --end")
+    parser.add_argument('--daily-load', type=float, default=10.0, help="citas por doctor y día laborable")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--end', type=date.fromisoformat, default=DEFAULT_END,
+                        help="último día con citas atendidas (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    try:
+        summary = generate(args.output, args.doctors, args.patients, args.years, args.seed,
+                           args.end, args.daily_load)
+    except FileExistsError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"✅ {args.output} generada en {summary['segundos']} s ({summary['desde']} → {summary['hasta']})")
+    for table in ('usuarios', 'doctores', 'pacientes', 'citas', 'facturas', 'historial_medico'):
+        print(f"   {table:<18} {summary[table]:>9,}")
+    print(f"   contraseña de los usuarios sintéticos: {SYNTHETIC_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
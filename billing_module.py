@@ -16,17 +16,10 @@ from typing import List, Optional, Dict, Any
 import hashlib
 import json
 
-# Importar reportlab para PDFs (instalar si no existe)
-try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    PDF_AVAILABLE = True
-except ImportError:
+# ReportLab: sólo se comprueba que exista; no se importa hasta generar un PDF
+from optional_deps import PDF_AVAILABLE
+if not PDF_AVAILABLE:
     print("⚠️ ReportLab no disponible. Instalar con: pip install reportlab")
-    PDF_AVAILABLE = False
 
 # Importar el database manager del sistema principal
 try:
@@ -40,6 +33,13 @@ except ImportError:
         print("⚠️ Database Manager no encontrado")
         DATABASE_MANAGER_AVAILABLE = False
 
+from invoice_sequence import InvoiceNumberError, allocate_invoice_number, yearly_invoice_numbers
+
+def get_database_manager():
+    """Gestor de base de datos compartido por todo el proceso"""
+    shared = getattr(DatabaseManager, 'shared', None)
+    return shared() if shared else DatabaseManager()
+
 @dataclass
 class Invoice:
     """Clase de datos para facturas"""
@@ -75,56 +75,29 @@ class Patient:
 class InvoiceNumberGenerator:
     """Generador de números de factura únicos"""
     
+    # Formato: FAC-2025-NNNN (la misma secuencia anual que el resto de MEDISYNC)
+    allocator = yearly_invoice_numbers
+    
     @staticmethod
-    def generate() -> str:
-        """Generar número de factura con formato: FAC-YYYY-NNNN"""
-        try:
-            year = datetime.now().year
-            month = datetime.now().month
-            day = datetime.now().day
-            
-            # Formato: FAC-2025-0725-NNNN
-            base_number = f"FAC-{year}-{month:02d}{day:02d}"
-            
-            # Buscar el último número del día
-            if DATABASE_MANAGER_AVAILABLE:
-                db_manager = DatabaseManager()
-                conn = db_manager.get_connection()
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    SELECT numero_factura FROM facturas 
-                    WHERE numero_factura LIKE ? 
-                    ORDER BY numero_factura DESC LIMIT 1
-                """, (f"{base_number}-%",))
-                
-                result = cursor.fetchone()
-                
-                if result:
-                    # Extraer el número secuencial
-                    last_number = result[0]
-                    sequence = int(last_number.split('-')[-1]) + 1
-                else:
-                    sequence = 1
-                
-                cursor.close()
-                conn.close()
-            else:
-                # Fallback: usar timestamp
-                sequence = int(datetime.now().strftime("%H%M"))
-            
-            return f"{base_number}-{sequence:04d}"
-            
-        except Exception as e:
-            print(f"Error generando número de factura: {e}")
-            # Fallback: usar timestamp completo
-            return f"FAC-{datetime.now().strftime('%Y-%m%d-%H%M%S')}"
+    def generate(cursor=None) -> str:
+        """Generar número de factura con formato: FAC-YYYY-NNNN
+        
+        Con ``cursor`` el número se asigna en la transacción del llamador y
+        queda confirmado junto con el INSERT de la factura. Si no se puede
+        reservar se lanza ``InvoiceNumberError``.
+        """
+        if cursor is not None:
+            return InvoiceNumberGenerator.allocator.allocate(cursor)
+        
+        if not DATABASE_MANAGER_AVAILABLE:
+            raise InvoiceNumberError("No hay base de datos para asignar el número de factura")
+        return allocate_invoice_number(get_database_manager())
 
 class BillingDatabase:
     """Gestor de base de datos específico para facturación"""
     
     def __init__(self):
-        self.db_manager = DatabaseManager() if DATABASE_MANAGER_AVAILABLE else None
+        self.db_manager = get_database_manager() if DATABASE_MANAGER_AVAILABLE else None
         self.init_billing_tables()
     
     def init_billing_tables(self):
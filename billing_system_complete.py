@@ -24,43 +24,15 @@ import threading
 import hashlib
 import json
 import os
-import subprocess
-import sys
 
-# Verificar e instalar dependencias para PDF
-def check_and_install_dependencies():
-    """Verificar e instalar dependencias necesarias"""
-    dependencies = {
-        'reportlab': 'reportlab',
-        'qrcode': 'qrcode[pil]',
-        'PIL': 'pillow'
-    }
-    
-    missing = []
-    for module, package in dependencies.items():
-        try:
-            if module == 'PIL':
-                import PIL
-            else:
-                __import__(module)
-            print(f"✅ {module} disponible")
-        except ImportError:
-            missing.append(package)
-            print(f"⚠️ {module} no disponible")
-    
-    if missing:
-        print(f"📦 Instalando dependencias faltantes: {', '.join(missing)}")
-        for package in missing:
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-                print(f"✅ {package} instalado exitosamente")
-            except subprocess.CalledProcessError:
-                print(f"❌ Error instalando {package}")
-    
-    return len(missing) == 0
+from invoice_sequence import yearly_invoice_numbers
+from optional_deps import registry as capabilities
 
-# Verificar dependencias al inicio
-PDF_AVAILABLE = check_and_install_dependencies()
+# Dependencias para PDF: se comprueban sin instalar nada (ver optional_deps)
+PDF_AVAILABLE = capabilities.available('pdf') and capabilities.available('qr')
+for capability in capabilities.missing():
+    if capability.name in ('pdf', 'qr'):
+        print(f"⚠️ {capability.description} no disponible - instalar con: {capability.install_hint}")
 
 # Importaciones para PDF (con manejo de errores)
 try:
@@ -320,7 +292,7 @@ class DatabaseManager:
                 return False, "Cita no encontrada"
             
             # Generar número de factura
-            numero_factura = self.generate_invoice_number()
+            numero_factura = self.generate_invoice_number(cursor)
             
             # Calcular totales
             subtotal = sum(float(servicio.get('precio', 0)) * int(servicio.get('cantidad', 1)) 
@@ -360,37 +332,19 @@ class DatabaseManager:
         finally:
             conn.close()
     
-    def generate_invoice_number(self):
-        """Generar número único de factura"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def generate_invoice_number(self, cursor=None):
+        """Generar número de factura FAC-YYYY-NNNN
+
+        Con ``cursor`` el número se asigna en la transacción del INSERT de la
+        factura; sin él se reserva y confirma en una conexión propia.
+        """
+        if cursor is not None:
+            return yearly_invoice_numbers.allocate(cursor)
         
+        # Sin número no hay factura: el error llega al llamador
+        conn = self.get_connection()
         try:
-            # Obtener último número
-            cursor.execute('SELECT numero_factura FROM facturas ORDER BY id DESC LIMIT 1')
-            result = cursor.fetchone()
-            
-            if result:
-                last_number = result[0]
-                # Extraer el número (asumiendo formato FAC-YYYY-XXXX)
-                try:
-                    parts = last_number.split('-')
-                    if len(parts) == 3 and parts[0] == 'FAC':
-                        number = int(parts[2]) + 1
-                    else:
-                        number = 1
-                except:
-                    number = 1
-            else:
-                number = 1
-            
-            # Formato: FAC-YYYY-XXXX
-            year = datetime.now().strftime('%Y')
-            return f"FAC-{year}-{number:04d}"
-            
-        except Exception as e:
-            print(f"Error generando número de factura: {e}")
-            return f"FAC-{datetime.now().strftime('%Y')}-0001"
+            return yearly_invoice_numbers.allocate_now(conn)[0]
         finally:
             conn.close()
     
@@ -989,9 +943,6 @@ class CompleteBillingSystem:
         
         messagebox.showinfo("Ayuda del Sistema", help_text)
 
-
-print("✅ CompleteBillingSystem - Interfaz principal inicializada")
-
     # ========== PESTAÑA 1: FACTURACIÓN DESDE CITAS ==========
     
     def create_appointments_tab(self):
@@ -1381,9 +1332,6 @@ print("✅ CompleteBillingSystem - Interfaz principal inicializada")
                     font=('Arial', 12, 'bold' if i == 3 else 'normal'),
                     bg='#d4edda', fg=color).pack(side='right')
 
-
-print("✅ Pestaña de Facturación desde Citas creada")
-
     # ========== MÉTODOS DE FUNCIONALIDAD PARA CITAS ==========
     
     def load_completed_appointments(self):
@@ -1641,9 +1589,6 @@ print("✅ Pestaña de Facturación desde Citas creada")
         self.update_invoice_display()
         self.update_status(f"✅ Servicio agregado: {service['nombre']}", '#27ae60')
 
-
-print("✅ Métodos de funcionalidad para citas implementados")
-
     def add_service_manual(self):
         """Agregar servicio manualmente"""
         if not self.current_appointment:
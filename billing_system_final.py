@@ -24,44 +24,28 @@ import json
 import subprocess
 import sys
 
-# Instalar dependencias automáticamente
-def install_dependencies():
-    """Instalar dependencias necesarias para PDFs"""
-    try:
-        import reportlab
-        import qrcode
-        from PIL import Image
-        print("✅ Dependencias para PDF disponibles")
-        return True
-    except ImportError:
-        print("📦 Instalando dependencias para PDFs...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "reportlab", "qrcode[pil]", "pillow"])
-            print("✅ Dependencias instaladas exitosamente")
-            return True
-        except:
-            print("⚠️ No se pudieron instalar dependencias - PDFs no disponibles")
-            return False
+from database_manager import DatabaseManager as SharedDatabaseManager
+from invoice_pdf_service import DEFAULT_CLINIC_CONFIG, PDF_DIRECTORY, InvoiceRenderer
+from invoice_sequence import allocate_invoice_number, yearly_invoice_numbers
+from optional_deps import registry as capabilities
 
-# Verificar e instalar dependencias
-PDF_AVAILABLE = install_dependencies()
-
-if PDF_AVAILABLE:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image as RLImage
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-    import qrcode
-    from PIL import Image
+# Dependencias para PDFs: se comprueban sin instalar nada (ver optional_deps)
+PDF_AVAILABLE = capabilities.available('pdf')
+for capability in capabilities.missing():
+    if capability.name in ('pdf', 'qr'):
+        print(f"⚠️ {capability.description} no disponible - instalar con: {capability.install_hint}")
 
 class PDFGenerator:
-    """Generador de PDFs para facturas médicas"""
+    """Generador de PDFs para facturas médicas
+    
+    Usa el InvoiceRenderer de invoice_pdf_service: estilos y encabezado se
+    preparan una vez y cada PDF se escribe de forma atómica.
+    """
     
     def __init__(self):
-        self.pdf_directory = "facturas_pdf"
+        self.pdf_directory = PDF_DIRECTORY
         self.ensure_pdf_directory()
+        self._renderer = None
         
     def ensure_pdf_directory(self):
         """Crear directorio de PDFs si no existe"""
@@ -75,151 +59,9 @@ class PDFGenerator:
             return False
         
         try:
-            # Crear documento PDF
-            doc = SimpleDocTemplate(output_path, pagesize=A4)
-            story = []
-            styles = getSampleStyleSheet()
-            
-            # Estilos personalizados
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                textColor=colors.darkblue
-            )
-            
-            header_style = ParagraphStyle(
-                'Header',
-                parent=styles['Normal'],
-                fontSize=12,
-                spaceAfter=12,
-                alignment=TA_LEFT
-            )
-            
-            # Header de la clínica
-            story.append(Paragraph("🏥 " + clinic_config.get('nombre', 'MEDISYNC CLINIC'), title_style))
-            story.append(Paragraph(f"📍 {clinic_config.get('direccion', 'Dirección no disponible')}", header_style))
-            story.append(Paragraph(f"📞 {clinic_config.get('telefono', 'Teléfono no disponible')}", header_style))
-            story.append(Paragraph(f"✉️ {clinic_config.get('email', 'Email no disponible')}", header_style))
-            story.append(Spacer(1, 20))
-            
-            # Título de factura
-            story.append(Paragraph(f"FACTURA MÉDICA", title_style))
-            story.append(Paragraph(f"No. {invoice_data.get('numero_factura', 'N/A')}", header_style))
-            story.append(Spacer(1, 20))
-            
-            # Información del paciente y doctor
-            info_data = [
-                ['👤 PACIENTE:', invoice_data.get('paciente_nombre', 'N/A')],
-                ['👨‍⚕️ DOCTOR:', invoice_data.get('doctor_nombre', 'N/A')],
-                ['📅 FECHA:', invoice_data.get('fecha_creacion', datetime.now().strftime('%d/%m/%Y'))],
-                ['🛡️ SEGURO:', invoice_data.get('seguro_aplicado', 'Sin seguro')],
-                ['💭 CONCEPTO:', invoice_data.get('concepto', 'Consulta médica')]
-            ]
-            
-            info_table = Table(info_data, colWidths=[2*inch, 4*inch])
-            info_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-            
-            story.append(info_table)
-            story.append(Spacer(1, 30))
-            
-            # Servicios (si están disponibles)
-            if 'servicios' in invoice_data and invoice_data['servicios']:
-                story.append(Paragraph("SERVICIOS PRESTADOS", styles['Heading2']))
-                
-                servicios_data = [['Servicio', 'Cantidad', 'Precio Unitario', 'Total']]
-                for servicio in invoice_data['servicios']:
-                    servicios_data.append([
-                        servicio.get('nombre', 'Servicio'),
-                        str(servicio.get('cantidad', 1)),
-                        f"₡{servicio.get('precio', 0):,.2f}",
-                        f"₡{servicio.get('precio', 0) * servicio.get('cantidad', 1):,.2f}"
-                    ])
-                
-                servicios_table = Table(servicios_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-                servicios_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                
-                story.append(servicios_table)
-                story.append(Spacer(1, 20))
-            
-            # Totales
-            totales_data = []
-            
-            if invoice_data.get('monto_original'):
-                totales_data.append(['Subtotal:', f"₡{float(invoice_data.get('monto_original', 0)):,.2f}"])
-            
-            if invoice_data.get('monto_descuento', 0) > 0:
-                totales_data.append(['Descuento:', f"-₡{float(invoice_data.get('monto_descuento', 0)):,.2f}"])
-            
-            totales_data.append(['TOTAL A PAGAR:', f"₡{float(invoice_data.get('monto', 0)):,.2f}"])
-            
-            # Información de pago si existe
-            if invoice_data.get('monto_pagado'):
-                totales_data.append(['Monto Recibido:', f"₡{float(invoice_data.get('monto_pagado', 0)):,.2f}"])
-                
-                cambio = float(invoice_data.get('monto_pagado', 0)) - float(invoice_data.get('monto', 0))
-                if cambio > 0:
-                    totales_data.append(['Cambio:', f"₡{cambio:,.2f}"])
-                elif cambio < 0:
-                    totales_data.append(['Faltante:', f"₡{abs(cambio):,.2f}"])
-            
-            totales_table = Table(totales_data, colWidths=[4*inch, 2*inch])
-            totales_table.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-                ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, -1), (-1, -1), 14),
-                ('TEXTCOLOR', (0, -1), (-1, -1), colors.darkgreen),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('LINEBELOW', (0, -2), (-1, -2), 1, colors.black),
-            ]))
-            
-            story.append(totales_table)
-            story.append(Spacer(1, 30))
-            
-            # Pie de página
-            story.append(Paragraph("Gracias por confiar en nuestros servicios médicos", styles['Normal']))
-            story.append(Paragraph(f"Generado el {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", styles['Normal']))
-            
-            # Generar código QR si está disponible
-            try:
-                qr_text = f"Factura: {invoice_data.get('numero_factura', 'N/A')} - Total: ₡{float(invoice_data.get('monto', 0)):,.2f}"
-                qr = qrcode.QRCode(version=1, box_size=3, border=2)
-                qr.add_data(qr_text)
-                qr.make(fit=True)
-                
-                qr_img = qr.make_image(fill_color="black", back_color="white")
-                qr_path = "temp_qr.png"
-                qr_img.save(qr_path)
-                
-                story.append(Spacer(1, 20))
-                story.append(RLImage(qr_path, width=1.5*inch, height=1.5*inch))
-                
-                # Limpiar archivo temporal
-                if os.path.exists(qr_path):
-                    os.remove(qr_path)
-                    
-            except Exception as e:
-                print(f"⚠️ No se pudo generar código QR: {e}")
-            
-            # Construir PDF
-            doc.build(story)
+            if self._renderer is None or self._renderer.clinic_config != dict(DEFAULT_CLINIC_CONFIG, **clinic_config):
+                self._renderer = InvoiceRenderer(clinic_config)
+            self._renderer.render(invoice_data, output_path)
             return True
             
         except Exception as e:
@@ -228,16 +70,21 @@ class PDFGenerator:
 
 
 class DatabaseManager:
-    """Gestor de base de datos integrado"""
+    """Consultas de facturación sobre la capa de datos de MEDISYNC
     
-    def __init__(self, db_path="database/medisync.db"):
-        self.db_path = db_path
+    Usa el pool, el candado y las versiones de tabla del DatabaseManager
+    principal (``data_layer``); sin él, el compartido del proceso para
+    ``db_path``. Así una factura creada aquí la ven al instante las
+    pestañas de la ventana principal.
+    """
+    
+    def __init__(self, db_path="database/medisync.db", data_layer=None):
+        self.data_layer = data_layer or SharedDatabaseManager.shared(db_path)
+        self.db_path = self.data_layer.db_path
     
     def get_connection(self):
-        """Obtener conexión a la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Obtener conexión del pool (close() la devuelve al pool)"""
+        return self.data_layer.get_connection()
     
     def get_completed_appointments(self, days_back=30):
         """Obtener citas completadas sin facturar"""
@@ -316,17 +163,14 @@ class DatabaseManager:
     
     def create_invoice_from_appointment(self, cita_id, servicios, observaciones="", monto_pagado=0, metodo_pago="efectivo"):
         """Crear factura desde cita con información de pago"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        appointment = self.get_appointment_details(cita_id)
+        if not appointment:
+            return False, "Cita no encontrada", None
         
+        return self._insert_invoice(appointment, cita_id, servicios, observaciones, monto_pagado, metodo_pago)
+    
+    def _insert_invoice(self, appointment, cita_id, servicios, observaciones, monto_pagado, metodo_pago):
         try:
-            appointment = self.get_appointment_details(cita_id)
-            if not appointment:
-                return False, "Cita no encontrada", None
-            
-            # Generar número de factura
-            numero_factura = self.generate_invoice_number()
-            
             # Calcular totales
             subtotal = sum(float(s.get('precio', 0)) * int(s.get('cantidad', 1)) for s in servicios)
             
@@ -356,40 +200,30 @@ class DatabaseManager:
                 estado = 'pendiente'
                 fecha_pago = None
             
-            # Crear factura usando el esquema correcto
-            cursor.execute('''
-            INSERT INTO facturas (
-                numero_factura, paciente_id, doctor_id, cita_id,
-                concepto, monto_original, monto_descuento, monto,
-                estado, fecha_creacion, fecha_vencimiento, fecha_pago,
-                metodo_pago, notas, seguro_aplicado, descuento_seguro,
-                tipo_consulta, moneda
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                numero_factura,
-                appointment['paciente_id'],
-                appointment['doctor_id'],
-                cita_id,
-                concepto,
-                subtotal,
-                descuento,
-                total,
-                estado,
-                fecha_actual,
-                fecha_vencimiento,
-                fecha_pago,
-                metodo_pago if monto_pagado > 0 else None,
-                f"Generada desde sistema integrado. Servicios: {len(servicios)}. Pagado: ₡{monto_pagado:,.2f}. {observaciones}",
-                appointment.get('seguro_nombre', 'Sin seguro'),
-                porcentaje_descuento,
-                appointment.get('especialidad', 'Consulta General'),
-                'CRC'
-            ))
-            
-            # Obtener ID de la factura creada
-            factura_id = cursor.lastrowid
-            
-            conn.commit()
+            # Crear factura usando el esquema correcto (el número se asigna en la misma transacción)
+            record = self.data_layer.create_invoice_record({
+                'paciente_id': appointment['paciente_id'],
+                'doctor_id': appointment['doctor_id'],
+                'cita_id': cita_id,
+                'concepto': concepto,
+                'monto_original': subtotal,
+                'monto_descuento': descuento,
+                'monto': total,
+                'estado': estado,
+                'fecha_creacion': fecha_actual,
+                'fecha_vencimiento': fecha_vencimiento,
+                'fecha_pago': fecha_pago,
+                'metodo_pago': metodo_pago if monto_pagado > 0 else None,
+                'notas': f"Generada desde sistema integrado. Servicios: {len(servicios)}. Pagado: ₡{monto_pagado:,.2f}. {observaciones}",
+                'seguro_aplicado': appointment.get('seguro_nombre', 'Sin seguro'),
+                'descuento_seguro': porcentaje_descuento,
+                'tipo_consulta': appointment.get('especialidad', 'Consulta General'),
+                'moneda': 'CRC'
+            })
+            if record is None:
+                return False, "Error creando factura: no se pudo guardar", None
+            factura_id = record['id']
+            numero_factura = record['numero_factura']
             
             # Crear objeto con datos completos para PDF
             invoice_data = {
@@ -412,25 +246,19 @@ class DatabaseManager:
             return True, f"Factura {numero_factura} creada exitosamente", invoice_data
             
         except Exception as e:
-            conn.rollback()
             return False, f"Error creando factura: {str(e)}", None
-        finally:
-            conn.close()
     
-    def generate_invoice_number(self):
-        """Generar número de factura"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('SELECT COUNT(*) FROM facturas')
-            count = cursor.fetchone()[0]
-            year = datetime.now().strftime('%Y')
-            return f"FAC-{year}-{count + 1:04d}"
-        except:
-            return f"FAC-{datetime.now().strftime('%Y')}-0001"
-        finally:
-            conn.close()
+    def generate_invoice_number(self, cursor=None):
+        """Generar número de factura FAC-YYYY-NNNN
+
+        Con ``cursor`` el número se asigna en la transacción del INSERT de la
+        factura; sin él se reserva y confirma con la capa de datos. Si no se
+        puede reservar se lanza ``InvoiceNumberError``.
+        """
+        if cursor is not None:
+            return yearly_invoice_numbers.allocate(cursor)
+        
+        return allocate_invoice_number(self.data_layer)
     
     def get_medical_services(self):
         """Obtener servicios médicos"""
@@ -445,10 +273,18 @@ class DatabaseManager:
 
 
 class BillingSystemComplete:
-    """Sistema de facturación completo e integrado con PDFs y pagos"""
+    """Sistema de facturación completo e integrado con PDFs y pagos
     
-    def __init__(self):
-        self.db_manager = DatabaseManager()
+    Por sí solo abre su propia ventana (``run()``). Desde MEDISYNC se abre
+    como Toplevel de la ventana principal (``master``) sobre su mismo
+    DatabaseManager (``data_layer``); ``on_invoice_created(invoice_data)``
+    avisa a la ventana principal de cada factura nueva.
+    """
+    
+    def __init__(self, data_layer=None, master=None, on_invoice_created=None):
+        self.db_manager = DatabaseManager(data_layer=data_layer)
+        self.master = master
+        self.on_invoice_created = on_invoice_created
         self.pdf_generator = PDFGenerator() if PDF_AVAILABLE else None
         self.current_appointment = None
         self.selected_services = []
@@ -475,14 +311,16 @@ class BillingSystemComplete:
         
     def create_interface(self):
         """Crear interfaz principal mejorada"""
-        self.root = tk.Tk()
+        self.root = tk.Toplevel(self.master) if self.master is not None else tk.Tk()
         self.root.title("🏥 MEDISYNC - SISTEMA DE FACTURACIÓN AVANZADO")
         self.root.geometry("1800x1100")
         self.root.configure(bg='#f8f9fa')
         
         # Configurar estilo moderno
-        style = ttk.Style()
-        style.theme_use('clam')
+        style = ttk.Style(self.root)
+        if self.master is None:
+            # Embebido no se cambia el tema: es global y alteraría la ventana principal
+            style.theme_use('clam')
         style.configure('Modern.Treeview', 
                        background='white',
                        foreground='black',
@@ -1396,6 +1234,12 @@ class BillingSystemComplete:
                 self.load_appointments()
                 self.update_status("✅ Factura generada exitosamente")
                 
+                if self.on_invoice_created is not None:
+                    try:
+                        self.on_invoice_created(invoice_data)
+                    except Exception as e:
+                        print(f"Error notificando factura nueva: {e}")
+                
             else:
                 messagebox.showerror("Error", f"❌ {message}")
                 self.update_status("❌ Error generando factura")
@@ -1767,6 +1611,16 @@ Descuento: {self.current_appointment.get('porcentaje_descuento', 0):.0f}%"""
         
         self.update_status("🧹 Factura limpiada")
     
+    def show(self):
+        """Mostrar la ventana (creándola la primera vez) y traerla al frente"""
+        if self.root is None or not self.root.winfo_exists():
+            self.create_interface()
+        else:
+            self.root.deiconify()
+            self.root.lift()
+        self.root.focus_force()
+        return self.root
+    
     def run(self):
         """Ejecutar sistema"""
         root = self.create_interface()
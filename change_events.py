@@ -0,0 +1,430 @@
+"""
+Avisos de cambios de MEDISYNC (citas, facturas y pacientes)
+Triggers en citas, facturas y usuarios anotan cada alta, modificación o
+baja en registro_cambios, venga de donde venga la escritura: un método de
+DatabaseManager, el SQL propio de una vista, billing_system_final en otro
+proceso u otra estación a través del servicio HTTP.
+
+ChangeFeed lee el registro en segundo plano y publica cada cambio en un
+ChangeBus dentro del proceso. Las vistas se suscriben por tema y
+actualizan sólo las filas afectadas en lugar de recargar la tabla entera;
+TabManager deja de recargar las pestañas que ya se actualizaron solas.
+
+Temas (``entidad.acción``):
+    cita.creada       cita.actualizada      cita.eliminada
+    factura.creada    factura.pagada        factura.actualizada    factura.eliminada
+    paciente.registrado    paciente.actualizado    paciente.eliminado
+    <entidad>.recarga      se perdieron avisos (demasiados a la vez): recargar todo
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+CHANGE_LOG_TABLE = 'registro_cambios'
+TRIGGER_PREFIX = 'cambios'
+
+# Cambios leídos por consulta; con más pendientes se publica una recarga por entidad
+BATCH_SIZE = 500
+# Horas que se conservan en el registro (basta con cubrir a las estaciones abiertas)
+KEEP_HOURS = 24
+# Cada cuánto se comprueban escrituras propias (en memoria) y cada cuánto se lee el registro
+CHECK_INTERVAL_MS = 100
+POLL_INTERVAL_MS = 1000
+
+PAID_STATES = ('pagada', 'pagado')
+
+
+@dataclass(frozen=True)
+class Entity:
+    """Tabla cuyas escrituras se anotan en el registro
+
+    ``where`` limita las filas que cuentan (sólo pacientes en usuarios) y
+    ``columns`` los UPDATE que cuentan; ``order`` es la columna por la que se
+    ordenan sus listados (si cambia, la fila se mueve de sitio).
+    """
+    name: str
+    table: str
+    actions: Tuple[str, str, str]
+    patient: str
+    related: Optional[str] = None
+    status: Optional[str] = None
+    order: Optional[str] = None
+    where: Optional[str] = None
+    columns: Tuple[str, ...] = ()
+    ignore: Tuple[str, ...] = ()
+
+
+ENTITIES = (
+    # citas.fecha la mantiene un trigger a partir de fecha_hora: ese UPDATE no es un cambio nuevo
+    Entity('cita', 'citas', ('creada', 'actualizada', 'eliminada'), patient='paciente_id',
+           status='estado', order='fecha_hora', ignore=('fecha',)),
+    Entity('factura', 'facturas', ('creada', 'actualizada', 'eliminada'), patient='paciente_id',
+           related='cita_id', status='estado', order='fecha_creacion'),
+    # Sólo los datos visibles: el último acceso o la contraseña no son cambios del paciente
+    Entity('paciente', 'usuarios', ('registrado', 'actualizado', 'eliminado'), patient='id',
+           where="tipo_usuario = 'paciente'",
+           columns=('nombre', 'apellido', 'email', 'telefono', 'direccion', 'fecha_nacimiento',
+                    'tipo_usuario', 'activo')),
+)
+
+ENTITY_TABLES = {entity.name: entity.table for entity in ENTITIES}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Un cambio del registro (``id`` 0: aviso de recarga, no viene del registro)"""
+    id: int
+    entity: str
+    action: str
+    record_id: Optional[int] = None
+    patient_id: Optional[int] = None
+    related_id: Optional[int] = None
+    status: Optional[str] = None
+    previous_status: Optional[str] = None
+    moved: bool = False
+    date: Optional[str] = None
+
+    @property
+    def topic(self):
+        return f"{self.entity}.{self.action}"
+
+    @property
+    def table(self):
+        return ENTITY_TABLES.get(self.entity)
+
+    @classmethod
+    def from_row(cls, row):
+        """ChangeEvent desde una fila de ``read_changes`` (dict)"""
+        return cls(row['id'], row['entidad'], row['accion'], row['registro_id'], row['paciente_id'],
+                   row['relacionado_id'], row['estado'], row['estado_anterior'],
+                   bool(row['movida']), row['fecha'])
+
+
+# ----------------------------------------------------------------------
+# Registro en la base de datos
+# ----------------------------------------------------------------------
+def _table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def _row_values(entity, row, existing):
+    def column(name):
+        return f"{row}.{name}" if name and name in existing else 'NULL'
+    return column(entity.patient), column(entity.related), column(entity.status)
+
+
+def ensure_change_log(cursor):
+    """Crear registro_cambios y los triggers que lo alimentan"""
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entidad TEXT NOT NULL,
+        accion TEXT NOT NULL,
+        registro_id INTEGER NOT NULL,
+        paciente_id INTEGER,
+        relacionado_id INTEGER,
+        estado TEXT,
+        estado_anterior TEXT,
+        movida INTEGER NOT NULL DEFAULT 0,
+        fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    insert = (f"INSERT INTO {CHANGE_LOG_TABLE} (entidad, accion, registro_id, paciente_id, relacionado_id, "
+              f"estado, estado_anterior, movida)")
+    for entity in ENTITIES:
+        existing = _table_columns(cursor, entity.table)
+        if not existing:
+            continue
+        created, updated, deleted = entity.actions
+        columns = [col for col in (entity.columns or existing) if col in existing and col not in entity.ignore]
+
+        patient, related, status = _row_values(entity, 'NEW', existing)
+        when = f"WHEN NEW.{entity.where}" if entity.where else ""
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{TRIGGER_PREFIX}_{entity.table}_insert
+        AFTER INSERT ON {entity.table} {when}
+        BEGIN
+            {insert} VALUES ('{entity.name}', '{created}', NEW.id, {patient}, {related}, {status}, NULL, 0);
+        END
+        ''')
+
+        action = f"'{updated}'"
+        previous = f"OLD.{entity.status}" if entity.status in existing else 'NULL'
+        if entity.name == 'factura' and entity.status in existing:
+            paid = ", ".join(f"'{state}'" for state in PAID_STATES)
+            action = (f"CASE WHEN NEW.{entity.status} IN ({paid}) AND COALESCE(OLD.{entity.status}, '') "
+                      f"NOT IN ({paid}) THEN 'pagada' ELSE '{updated}' END")
+        moved = f"OLD.{entity.order} IS NOT NEW.{entity.order}" if entity.order in existing else '0'
+        when = f"WHEN NEW.{entity.where} OR OLD.{entity.where}" if entity.where else ""
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{TRIGGER_PREFIX}_{entity.table}_update
+        AFTER UPDATE OF {', '.join(columns)} ON {entity.table} {when}
+        BEGIN
+            {insert} VALUES ('{entity.name}', {action}, NEW.id, {patient}, {related}, {status}, {previous}, {moved});
+        END
+        ''')
+
+        patient, related, status = _row_values(entity, 'OLD', existing)
+        when = f"WHEN OLD.{entity.where}" if entity.where else ""
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_{TRIGGER_PREFIX}_{entity.table}_delete
+        AFTER DELETE ON {entity.table} {when}
+        BEGIN
+            {insert} VALUES ('{entity.name}', '{deleted}', OLD.id, {patient}, {related}, {status}, NULL, 0);
+        END
+        ''')
+
+
+def read_changes(cursor, last_id, limit=BATCH_SIZE, patient_id=None):
+    """Cambios con id mayor que ``last_id``, en orden (dicts con las columnas del registro)
+
+    Con ``patient_id`` sólo los de ese paciente (sesiones de pacientes en el servicio).
+    """
+    where, params = "id > ?", [last_id or 0]
+    if patient_id is not None:
+        where += " AND paciente_id = ?"
+        params.append(patient_id)
+    cursor.execute(f'''
+    SELECT id, entidad, accion, registro_id, paciente_id, relacionado_id,
+           estado, estado_anterior, movida, fecha
+    FROM {CHANGE_LOG_TABLE}
+    WHERE {where}
+    ORDER BY id
+    LIMIT ?
+    ''', (*params, limit))
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def last_change_id(cursor):
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {CHANGE_LOG_TABLE}")
+    return cursor.fetchone()[0]
+
+
+def prune_change_log(cursor, keep_hours=KEEP_HOURS):
+    """Borrar los cambios de más de ``keep_hours`` horas; devuelve cuántos se borraron"""
+    cursor.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE fecha < datetime('now', ?)",
+                   (f"-{int(keep_hours)} hours",))
+    return cursor.rowcount
+
+
+# ----------------------------------------------------------------------
+# Publicación dentro del proceso
+# ----------------------------------------------------------------------
+def _alive(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except Exception:
+        return False
+
+
+class Subscription:
+    """Suscripción a un tema: exacto ('cita.creada'), de una entidad ('cita.*') o '*'"""
+
+    __slots__ = ('pattern', 'callback', 'widget', 'active')
+
+    def __init__(self, pattern, callback, widget=None):
+        self.pattern = pattern
+        self.callback = callback
+        self.widget = widget
+        self.active = True
+
+    def matches(self, topic):
+        if self.pattern == '*' or self.pattern == topic:
+            return True
+        return self.pattern.endswith('.*') and topic.startswith(self.pattern[:-1])
+
+
+class ChangeBus:
+    """Publicación/suscripción de cambios dentro del proceso
+
+    ``subscribe(tema, callback, widget=...)`` devuelve la suscripción; con
+    ``widget`` termina sola cuando el widget se destruye. ``publish`` entrega
+    el aviso en el hilo que lo llama: ChangeFeed publica siempre desde el
+    hilo de Tk, así los callbacks pueden tocar widgets.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, pattern: str, callback: Callable, widget=None) -> Subscription:
+        subscription = Subscription(pattern, callback, widget)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.active = False
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def publish(self, event: ChangeEvent):
+        """Entregar ``event`` a las suscripciones de su tema, en orden de alta"""
+        self.published += 1
+        topic = event.topic
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.matches(topic)]
+        for subscription in subscriptions:
+            if not subscription.active:
+                continue
+            if subscription.widget is not None and not _alive(subscription.widget):
+                self.unsubscribe(subscription)
+                continue
+            try:
+                subscription.callback(event)
+            except Exception as e:
+                print(f"Error procesando aviso {topic}: {e}")
+                if subscription.widget is not None and not _alive(subscription.widget):
+                    self.unsubscribe(subscription)
+
+    def handled_within(self, topic, widget):
+        """¿Alguna suscripción viva dentro de ``widget`` atiende este tema?"""
+        prefix = str(widget) + '.'
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        return any(s.widget is not None and str(s.widget).startswith(prefix) and s.matches(topic)
+                   and _alive(s.widget) for s in subscriptions)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+
+bus = ChangeBus()
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class ChangeFeed:
+    """Lee registro_cambios y publica los cambios nuevos en un ChangeBus
+
+    Cada ``POLL_INTERVAL_MS`` (MEDISYNC_CHANGES_POLL_MS) se lee el registro
+    para ver las escrituras de otros procesos; las de este proceso se
+    detectan antes, cada ``CHECK_INTERVAL_MS``, comparando en memoria las
+    versiones de tabla locales. La lectura corre en ``tasks``
+    (BackgroundTasks) y los avisos se publican en el hilo de Tk. Las tablas
+    de cada cambio se marcan en ``table_versions``, así TabManager sabe qué
+    pestañas quedaron obsoletas aunque la escritura fuera de otro proceso.
+    """
+
+    def __init__(self, db_manager, root, bus=bus, tasks=None, poll_interval_ms=None,
+                 batch_size=BATCH_SIZE):
+        self.db = db_manager
+        self.root = root
+        self.bus = bus
+        self.tasks = tasks
+        self.poll_interval = (poll_interval_ms or _env_int('MEDISYNC_CHANGES_POLL_MS', POLL_INTERVAL_MS)) / 1000
+        self.batch_size = batch_size
+        self.versions = getattr(db_manager, 'table_versions', None)
+        # Sólo las versiones locales (triggers TEMP de este proceso) se comparan sin coste
+        self._local_versions = self.versions if hasattr(self.versions, 'install') else None
+        self.last_id = None
+        self.running = False
+        self.stats = {'lecturas': 0, 'avisos': 0, 'recargas': 0}
+        self._seen = {}
+        self._last_read = 0.0
+        self._reading = False
+        self._job = None
+
+    def start(self):
+        """Empezar a leer; los cambios anteriores al arranque no se publican"""
+        if self.running:
+            return self
+        self.running = True
+        if self.tasks is not None:
+            self.tasks.submit(self.db.prune_changes, key='change-feed-prune')
+        self._schedule()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def poll_now(self):
+        """Leer el registro en cuanto termine la lectura en curso (p. ej. tras guardar)"""
+        self._last_read = 0.0
+        self._check()
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _schedule(self):
+        try:
+            self._job = self.root.after(CHECK_INTERVAL_MS, self._check)
+        except Exception:
+            # La ventana ya no existe
+            self.stop()
+
+    def _local_writes(self):
+        if self._local_versions is None:
+            return False
+        current = self._local_versions.snapshot(ENTITY_TABLES.values())
+        changed = current != self._seen
+        self._seen = current
+        return changed
+
+    def _check(self):
+        self._job = None
+        if not self.running:
+            return
+        if not self._reading and (self._local_writes()
+                                  or time.monotonic() - self._last_read >= self.poll_interval):
+            self._reading = True
+            self._last_read = time.monotonic()
+            if self.tasks is not None:
+                self.tasks.submit(self._read, self.last_id, on_done=self._deliver,
+                                  on_error=self._read_failed, key='change-feed')
+            else:
+                try:
+                    self._deliver(self._read(self.last_id))
+                except Exception as e:
+                    self._read_failed(e)
+        self._schedule()
+
+    def _read(self, last_id):
+        """(cambios, último id, ¿desbordado?) -- corre en segundo plano"""
+        if last_id is None:
+            return [], self.db.get_last_change_id(), False
+        rows = self.db.get_changes_since(last_id, self.batch_size + 1)
+        if len(rows) > self.batch_size:
+            return [], self.db.get_last_change_id(), True
+        return [ChangeEvent.from_row(row) for row in rows], (rows[-1]['id'] if rows else last_id), False
+
+    def _read_failed(self, error):
+        self._reading = False
+        print(f"Error leyendo registro de cambios: {error}")
+
+    def _deliver(self, result):
+        self._reading = False
+        events, last_id, overflow = result
+        if last_id is not None:
+            self.last_id = max(self.last_id or 0, last_id)
+        self.stats['lecturas'] += 1
+        if overflow:
+            self.stats['recargas'] += 1
+            events = [ChangeEvent(0, entity, 'recarga') for entity in ENTITY_TABLES]
+        if not events:
+            return
+        if self.versions is not None:
+            self.versions.touch(*{event.table for event in events})
+            # Lo marcado aquí no es una escritura nueva de este proceso
+            self._local_writes()
+        for event in events:
+            self.stats['avisos'] += 1
+            self.bus.publish(event)
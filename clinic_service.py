@@ -0,0 +1,571 @@
+"""
+Servicio de MEDISYNC sin interfaz gráfica
+Citas, pacientes, facturas y reportes sobre un DatabaseManager, con sesiones
+por token, para el servicio HTTP (medisync_api.py). El proceso del servicio
+es el único que abre la base: las escrituras se serializan con el candado
+de DatabaseManager (un solo escritor) y las lecturas van en paralelo por el
+pool de conexiones (WAL).
+
+Las vistas de la aplicación que todavía ejecutan su propio SQL pueden leer
+con ``execute_sql``: una sentencia por petición, en una conexión con un
+autorizador de SQLite que sólo deja leer (nunca escribir, adjuntar bases ni
+abrir transacciones), que devuelve NULL en las columnas de contraseñas y
+que niega las tablas que el rol no ve (el doctor, facturación; la
+secretaria, historiales). Las escrituras van por los métodos tipados. Sólo
+el personal (admin, doctor, secretaria) puede usarlo.
+
+Todos los métodos reciben y devuelven datos JSON (dict, list, str, números)
+y señalan los errores con ServiceError(estado HTTP, mensaje).
+"""
+import base64
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Any, Dict
+
+import change_events
+import dashboard_stats
+import medical_search
+import report_rollups
+from database_manager import AppointmentQuery
+
+SESSION_TTL = 12 * 3600
+STAFF_ROLES = ('admin', 'doctor', 'secretaria')
+MAX_PAGE_SIZE = 1000
+
+# Acciones de SQLite permitidas en el SQL de las vistas (sólo lectura)
+READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION,
+                sqlite3.SQLITE_RECURSIVE, sqlite3.SQLITE_PRAGMA}
+# PRAGMA de consulta del esquema que pueden usar las vistas (el resto cambian la conexión o escriben)
+READ_PRAGMAS = {'table_info', 'table_xinfo', 'index_list', 'index_info', 'index_xinfo',
+                'foreign_key_list', 'schema_version', 'user_version'}
+# Columnas que las vistas nunca reciben (se leen como NULL)
+HIDDEN_COLUMNS = {('usuarios', 'password'), ('usuarios', 'password_hash')}
+# Tablas que cada rol no puede leer con execute_sql (las mismas que le niegan los métodos tipados):
+# el doctor no ve facturación ni sus contadores; la secretaria no ve historiales ni sus índices FTS
+ROLE_DENIED_TABLES = {
+    'doctor': frozenset({'facturas', 'facturas_detalle', 'servicios_factura'}
+                        | {counter.table for counter in dashboard_stats.COUNTERS + report_rollups.ROLLUPS
+                           if counter.source == 'facturas'}),
+    'secretaria': frozenset(medical_search.SOURCES),
+}
+
+# Datos que cada usuario puede cambiar de su propio perfil (el resto, sólo administración)
+OWN_PROFILE_COLUMNS = {'nombre', 'apellido', 'email', 'telefono', 'direccion', 'fecha_nacimiento',
+                       'especialidad', 'cedula_profesional'}
+
+INCOME_STATES = ('pagada', 'pago_parcial')
+PENDING_STATES = ('pendiente',)
+
+
+class ServiceError(Exception):
+    """Error para el cliente: ``status`` es el código HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def read_only_authorizer(action, arg1, arg2, db_name, trigger):
+    """Autorizador de SQLite para ``execute_sql``: lecturas sí, escrituras no"""
+    if action not in READ_ACTIONS:
+        return sqlite3.SQLITE_DENY
+    if action == sqlite3.SQLITE_PRAGMA and ((arg1 or '').lower() not in READ_PRAGMAS
+                                            or (arg1.lower().endswith('_version') and arg2 is not None)):
+        return sqlite3.SQLITE_DENY
+    if action == sqlite3.SQLITE_READ and ((arg1 or '').lower(), (arg2 or '').lower()) in HIDDEN_COLUMNS:
+        return sqlite3.SQLITE_IGNORE
+    return sqlite3.SQLITE_OK
+
+
+def _denied_table(table, denied):
+    # Los índices FTS5 (``{tabla}_fts`` y sus tablas internas) cuentan como su tabla
+    return table in denied or any(table.startswith(f"{name}_fts") for name in denied)
+
+
+def role_authorizer(role):
+    """Autorizador de ``execute_sql`` para ``role``: sólo lectura y sin ROLE_DENIED_TABLES[role]
+
+    SQLite avisa SQLITE_READ por cada tabla leída, también sin columnas
+    (``SELECT COUNT(*)``), así que negar la lectura rechaza toda la sentencia.
+    """
+    denied = ROLE_DENIED_TABLES.get(role, frozenset())
+
+    def authorizer(action, arg1, arg2, db_name, trigger):
+        if action == sqlite3.SQLITE_READ and _denied_table((arg1 or '').lower(), denied):
+            return sqlite3.SQLITE_DENY
+        return read_only_authorizer(action, arg1, arg2, db_name, trigger)
+
+    return authorizer
+
+
+def encode_value(value):
+    """Valor de SQLite a JSON (los BLOB van en base64)"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$bytes': base64.b64encode(bytes(value)).decode('ascii')}
+    return value
+
+
+def decode_value(value):
+    """Parámetros JSON a valores de SQLite (inverso de encode_value)"""
+    if isinstance(value, dict):
+        if set(value) == {'$bytes'}:
+            return base64.b64decode(value['$bytes'])
+        return {key: decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+def _json(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+@dataclass
+class Session:
+    """Usuario autenticado detrás de un token"""
+    token: str
+    user: Any
+    created: float
+    last_used: float
+
+    @property
+    def role(self):
+        return self.user.tipo_usuario
+
+
+class SessionStore:
+    """Tokens de sesión en memoria con caducidad por inactividad"""
+
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._sessions: Dict[str, Session] = {}
+        self._lock = threading.Lock()
+
+    def create(self, user):
+        now = time.monotonic()
+        session = Session(secrets.token_urlsafe(32), user, now, now)
+        with self._lock:
+            self._sessions[session.token] = session
+        return session
+
+    def get(self, token):
+        if not token:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            if now - session.last_used > self.ttl:
+                del self._sessions[token]
+                return None
+            session.last_used = now
+            return session
+
+    def revoke(self, token):
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+
+class ClinicService:
+    """Operaciones del servicio sobre un DatabaseManager
+
+    El servicio HTTP sólo traduce rutas a estos métodos; ``session(token)``
+    valida el token y ``require(sesión, roles...)`` el permiso.
+    """
+
+    def __init__(self, db_manager, session_ttl=SESSION_TTL):
+        self.db = db_manager
+        self.sessions = SessionStore(session_ttl)
+        self.db.prune_changes()
+
+    # ------------------------------------------------------------------
+    # Sesiones
+    # ------------------------------------------------------------------
+    def login(self, email, password):
+        user = self.db.authenticate_user(email, password)
+        if user is None:
+            raise ServiceError(401, "Credenciales incorrectas")
+        session = self.sessions.create(user)
+        return {'token': session.token, 'usuario': asdict(user)}
+
+    def logout(self, token):
+        self.sessions.revoke(token)
+        return {'ok': True}
+
+    def session(self, token):
+        session = self.sessions.get(token)
+        if session is None:
+            raise ServiceError(401, "Sesión no válida o caducada")
+        return session
+
+    @staticmethod
+    def require(session, *roles):
+        if roles and session.role not in roles:
+            raise ServiceError(403, "Operación no permitida para este usuario")
+
+    @staticmethod
+    def _own_patient(session, paciente_id=None):
+        # Un paciente sólo ve sus propios datos
+        return session.user.id if session.role == 'paciente' else paciente_id
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+    def health(self):
+        return {'estado': 'ok', 'esquema': self.db.get_schema_version()}
+
+    def versions(self, session):
+        """Versiones por tabla: los clientes refrescan sus pantallas cuando cambian"""
+        return self.db.table_versions.snapshot()
+
+    def changes(self, session, after=0, limit=change_events.BATCH_SIZE):
+        """Cambios del registro posteriores a ``after`` (un paciente sólo recibe los suyos)"""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        patient_id = session.user.id if session.role == 'paciente' else None
+        return self.db.get_changes_since(int(after), limit, patient_id)
+
+    def last_change(self, session):
+        return {'id': self.db.get_last_change_id()}
+
+    # ------------------------------------------------------------------
+    # Usuarios, pacientes y doctores
+    # ------------------------------------------------------------------
+    def user(self, session, user_id):
+        if session.role == 'paciente' and user_id != session.user.id:
+            raise ServiceError(403, "Operación no permitida para este usuario")
+        user = self.db.get_user_by_id(user_id)
+        if user is None:
+            raise ServiceError(404, "Usuario no encontrado")
+        return asdict(user)
+
+    def _require_self_or_admin(self, session, user_id):
+        if session.role != 'admin' and user_id != session.user.id:
+            raise ServiceError(403, "Operación no permitida para este usuario")
+
+    def create_user(self, session, data):
+        self.require(session, 'admin')
+        user_id = self.db.save_user(None, data.get('usuario') or {}, data.get('perfil'))
+        if user_id is None:
+            raise ServiceError(400, "No se pudo crear el usuario")
+        return {'id': user_id}
+
+    def update_user(self, session, user_id, data):
+        """Administración: cualquier dato; cada usuario: los de su propio perfil"""
+        self._require_self_or_admin(session, user_id)
+        user_data, profile = data.get('usuario') or {}, data.get('perfil')
+        if session.role != 'admin':
+            user_data = {key: value for key, value in user_data.items() if key in OWN_PROFILE_COLUMNS}
+            profile = {key: value for key, value in (profile or {}).items()
+                       if key in OWN_PROFILE_COLUMNS} if profile is not None else None
+        if self.db.save_user(user_id, user_data, profile) is None:
+            raise ServiceError(404, "Usuario no encontrado o datos no válidos")
+        return {'ok': True}
+
+    def change_password(self, session, user_id, new_password, current_password=None):
+        """Cada usuario con su contraseña actual; administración sin ella"""
+        self._require_self_or_admin(session, user_id)
+        if session.role != 'admin' and current_password is None:
+            raise ServiceError(400, "Falta la contraseña actual")
+        if not new_password or not self.db.change_password(user_id, new_password, current_password):
+            raise ServiceError(400, "Contraseña actual incorrecta o usuario no encontrado")
+        return {'ok': True}
+
+    def set_user_active(self, session, user_id, active):
+        self.require(session, 'admin')
+        if not self.db.set_user_active(user_id, active):
+            raise ServiceError(404, "Usuario no encontrado")
+        return {'ok': True}
+
+    def delete_user(self, session, user_id):
+        self.require(session, 'admin')
+        if not self.db.delete_user(user_id):
+            raise ServiceError(404, "Usuario no encontrado")
+        return {'ok': True}
+
+    def patients(self, session):
+        self.require(session, *STAFF_ROLES)
+        return self.db.get_all_patients()
+
+    def doctors(self, session):
+        return self.db.get_all_doctors()
+
+    def insurances(self, session):
+        return self.db.get_medical_insurances()
+
+    # ------------------------------------------------------------------
+    # Citas
+    # ------------------------------------------------------------------
+    def _appointment_query(self, session, filters):
+        return AppointmentQuery(
+            texto=filters.get('texto') or "",
+            estado=filters.get('estado'),
+            fecha_desde=filters.get('fecha_desde'),
+            fecha_hasta=filters.get('fecha_hasta'),
+            doctor_id=filters.get('doctor_id'),
+            paciente_id=self._own_patient(session, filters.get('paciente_id')),
+        )
+
+    def appointments(self, session, filters, after=None, limit=100):
+        """Una página de citas; ``siguiente`` es el cursor de la próxima (o None)"""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        try:
+            query = self._appointment_query(session, filters)
+            query.build()
+        except ValueError as e:
+            raise ServiceError(400, f"Filtro no válido: {e}")
+        rows, next_cursor = self.db.get_appointments_page(query, after=tuple(after) if after else None,
+                                                          limit=limit)
+        return {'citas': rows, 'siguiente': _json(next_cursor)}
+
+    def count_appointments(self, session, filters, limit=None):
+        try:
+            return {'total': self.db.count_appointments(self._appointment_query(session, filters), limit)}
+        except ValueError as e:
+            raise ServiceError(400, f"Filtro no válido: {e}")
+
+    def appointment_row(self, session, appointment_id, filters):
+        """Una cita con la forma de ``appointments`` si cumple los filtros (404 si no)"""
+        try:
+            query = self._appointment_query(session, filters)
+            query.build()
+        except ValueError as e:
+            raise ServiceError(400, f"Filtro no válido: {e}")
+        row = self.db.get_appointment_row(appointment_id, query)
+        if row is None:
+            raise ServiceError(404, "Cita no encontrada")
+        return row
+
+    def appointment(self, session, appointment_id):
+        appointment = self.db.get_appointment_by_id(appointment_id)
+        if appointment is None or (session.role == 'paciente'
+                                   and appointment['paciente_id'] != session.user.id):
+            raise ServiceError(404, "Cita no encontrada")
+        return appointment
+
+    def create_appointment(self, session, data):
+        self.require(session, *STAFF_ROLES)
+        appointment_id = self.db.create_appointment(data)
+        if appointment_id is None:
+            raise ServiceError(400, "No se pudo crear la cita")
+        return {'id': appointment_id}
+
+    def update_appointment(self, session, appointment_id, data):
+        self.require(session, *STAFF_ROLES)
+        if not self.db.update_appointment(appointment_id, data):
+            raise ServiceError(404, "Cita no encontrada o datos no válidos")
+        return {'ok': True}
+
+    def _require_own_appointment(self, session, appointment_id):
+        """Personal: cualquier cita; paciente: sólo las suyas"""
+        if session.role == 'paciente':
+            self.appointment(session, appointment_id)
+        else:
+            self.require(session, *STAFF_ROLES)
+
+    def set_appointment_status(self, session, appointment_id, status, notes=None):
+        self.require(session, *STAFF_ROLES)
+        if not self.db.update_appointment_status(appointment_id, status, notes):
+            raise ServiceError(404, "Cita no encontrada o estado no válido")
+        return {'ok': True}
+
+    def set_appointment_notes(self, session, appointment_id, notes):
+        self.require(session, *STAFF_ROLES)
+        if not self.db.update_appointment_notes(appointment_id, notes):
+            raise ServiceError(404, "Cita no encontrada")
+        return {'ok': True}
+
+    def reschedule_appointment(self, session, appointment_id, data):
+        self._require_own_appointment(session, appointment_id)
+        if not data.get('fecha_hora') or not self.db.reschedule_appointment(
+                appointment_id, data['fecha_hora'], data.get('motivo'), data.get('notas')):
+            raise ServiceError(404, "Cita no encontrada o fecha no válida")
+        return {'ok': True}
+
+    def cancel_appointment(self, session, appointment_id, reason):
+        self._require_own_appointment(session, appointment_id)
+        if not self.db.cancel_appointment_with_reason(appointment_id, reason):
+            raise ServiceError(404, "Cita no encontrada")
+        return {'ok': True}
+
+    def delete_appointment(self, session, appointment_id):
+        self.require(session, 'admin', 'secretaria')
+        if not self.db.delete_appointment(appointment_id):
+            raise ServiceError(404, "Cita no encontrada")
+        return {'ok': True}
+
+    def appointment_conflicts(self, session, doctor_id, fecha_hora, duracion=None, exclude_id=None):
+        return {'citas': self.db.find_appointment_conflicts(doctor_id, fecha_hora, duracion, exclude_id)}
+
+    def free_slots(self, session, doctor_id, fecha):
+        return {'horas': self.db.get_available_slots(doctor_id, fecha)}
+
+    def save_doctor_schedule(self, session, doctor_id, ranges):
+        """Horario semanal [(día, inicio, fin)] de un doctor (él mismo o administración)"""
+        self._require_self_or_admin(session, doctor_id)
+        try:
+            ranges = [(str(dia), str(inicio), str(fin)) for dia, inicio, fin in ranges]
+        except (TypeError, ValueError):
+            raise ServiceError(400, "Horario no válido")
+        if not self.db.save_doctor_schedule(doctor_id, ranges):
+            raise ServiceError(400, "No se pudo guardar el horario")
+        return {'ok': True}
+
+    # ------------------------------------------------------------------
+    # Facturas
+    # ------------------------------------------------------------------
+    def invoices(self, session, estado=None):
+        if session.role == 'doctor':
+            raise ServiceError(403, "Operación no permitida para este usuario")
+        invoices = self.db.get_pending_invoices() if estado == 'pendiente' else self.db.get_all_invoices()
+        if estado and estado != 'pendiente':
+            invoices = [invoice for invoice in invoices if invoice.get('estado') == estado]
+        if session.role == 'paciente':
+            invoices = [invoice for invoice in invoices if invoice.get('paciente_id') == session.user.id]
+        return invoices
+
+    def create_invoice(self, session, data):
+        """Factura con sus líneas (``detalles``); devuelve id y número asignado"""
+        self.require(session, 'admin', 'secretaria')
+        record = self.db.create_invoice_record(data)
+        if record is None:
+            raise ServiceError(400, "No se pudo crear la factura")
+        return record
+
+    def add_invoice_service(self, session, invoice_id, data):
+        self.require(session, 'admin', 'secretaria')
+        try:
+            quantity, price = int(data.get('cantidad') or 1), float(data['precio_unitario'])
+        except (KeyError, TypeError, ValueError):
+            raise ServiceError(400, "Cantidad o precio no válidos")
+        if not self.db.add_invoice_service(invoice_id, data.get('servicio'), quantity, price):
+            raise ServiceError(404, "Factura no encontrada")
+        return {'ok': True}
+
+    def allocate_invoice_numbers(self, session, count=1):
+        """Números de factura confirmados de antemano (p. ej. para imprimir el PDF antes de guardar)"""
+        self.require(session, 'admin', 'secretaria')
+        numbers = self.db.allocate_invoice_numbers(max(1, min(int(count), MAX_PAGE_SIZE)))
+        if not numbers:
+            raise ServiceError(500, "No se pudieron reservar números de factura")
+        return {'numeros': numbers}
+
+    def pay_invoice(self, session, invoice_id, data):
+        self.require(session, 'admin', 'secretaria')
+        if not self.db.pay_invoice(invoice_id, data):
+            raise ServiceError(400, "No se pudo registrar el pago")
+        return {'ok': True}
+
+    # ------------------------------------------------------------------
+    # Reportes y paneles
+    # ------------------------------------------------------------------
+    def monthly_income(self, session, year, month):
+        self.require(session, 'admin', 'secretaria')
+        return self.db.get_monthly_income(year, month)
+
+    def report_summary(self, session, start, end):
+        """Resumen de un periodo desde los acumulados diarios (report_rollups)"""
+        self.require(session, 'admin', 'secretaria')
+        try:
+            start, end = date.fromisoformat(start), date.fromisoformat(end)
+        except (TypeError, ValueError):
+            raise ServiceError(400, "Fechas no válidas (AAAA-MM-DD)")
+        with self.db.lock.read():
+            conn = self.db.get_simple_connection()
+            cursor = conn.cursor()
+            try:
+                return {
+                    'desde': start.isoformat(),
+                    'hasta': end.isoformat(),
+                    'finanzas': report_rollups.financial_summary(cursor, start, end, INCOME_STATES, PENDING_STATES),
+                    'citas': dict(zip(('total', 'completadas', 'canceladas'),
+                                      report_rollups.appointments_totals(cursor, start, end))),
+                    'citas_por_estado': dict(report_rollups.appointments_by_state(cursor, start, end)),
+                    'citas_por_doctor': [
+                        dict(zip(('doctor_id', 'nombre', 'citas', 'monto', 'facturas'), row))
+                        for row in report_rollups.appointments_by_doctor(cursor, start, end)
+                    ],
+                    'ingresos_por_dia': [
+                        dict(zip(('fecha', 'monto', 'facturas'), row))
+                        for row in report_rollups.income_by_day(cursor, start, end, INCOME_STATES)
+                    ],
+                }
+            except sqlite3.Error as e:
+                print(f"Error generando resumen de reportes: {e}")
+                raise ServiceError(500, "No se pudo generar el resumen")
+            finally:
+                cursor.close()
+                conn.close()
+
+    def counters(self, session, panel, doctor_id=None):
+        if panel == 'sistema':
+            self.require(session, 'admin')
+            return self.db.get_system_counters()
+        if panel == 'secretaria':
+            self.require(session, 'admin', 'secretaria')
+            return self.db.get_secretaria_counters()
+        if panel == 'doctor':
+            if session.role != 'admin' and (session.role != 'doctor' or doctor_id != session.user.id):
+                raise ServiceError(403, "Operación no permitida para este usuario")
+            return self.db.get_doctor_counters(doctor_id)
+        raise ServiceError(404, "Panel desconocido")
+
+    def search_history(self, session, text, source='historial_medico', paciente_id=None,
+                       doctor_id=None, limit=50):
+        if session.role == 'secretaria':
+            raise ServiceError(403, "Operación no permitida para este usuario")
+        if source not in ('historial_medico', 'historiales_medicos'):
+            raise ServiceError(400, "Fuente de historial desconocida")
+        return self.db.search_medical_history(text, source, self._own_patient(session, paciente_id),
+                                              doctor_id, max(1, min(int(limit), MAX_PAGE_SIZE)))
+
+    def save_medical_record(self, session, data, record_id=None, source='historial_medico'):
+        self.require(session, 'admin', 'doctor')
+        if source not in ('historial_medico', 'historiales_medicos'):
+            raise ServiceError(400, "Fuente de historial desconocida")
+        record_id = self.db.save_medical_record(data, record_id, source)
+        if record_id is None:
+            raise ServiceError(400, "No se pudo guardar el registro médico")
+        return {'id': record_id}
+
+    # ------------------------------------------------------------------
+    # SQL de las vistas (sólo lectura)
+    # ------------------------------------------------------------------
+    def execute_sql(self, session, sql, params=None):
+        """Ejecutar una consulta de una vista; devuelve columnas y filas
+
+        El autorizador rechaza al preparar cualquier sentencia que no sea de
+        lectura, así que no se abre ninguna transacción ni se toma el
+        candado de escritura.
+        """
+        self.require(session, *STAFF_ROLES)
+        params = decode_value(params) if params is not None else ()
+        with self.db.lock.read():
+            conn = self.db.get_simple_connection()
+            conn.set_authorizer(role_authorizer(session.role))
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql, params)
+                columns = [column[0] for column in cursor.description] if cursor.description else []
+                rows = [[encode_value(value) for value in row] for row in cursor.fetchall()] if columns else []
+                return {'columnas': columns, 'filas': rows}
+            except sqlite3.DatabaseError as e:
+                if str(e) == 'not authorized' or str(e).endswith(' is prohibited'):
+                    raise ServiceError(403, "DatabaseError: sólo se permiten consultas de lectura "
+                                            "de las tablas permitidas para este usuario")
+                raise ServiceError(400, f"{type(e).__name__}: {e}")
+            except (sqlite3.Error, ValueError, TypeError) as e:
+                raise ServiceError(400, f"{type(e).__name__}: {e}")
+            finally:
+                cursor.close()
+                conn.set_authorizer(None)
+                conn.close()
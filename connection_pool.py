@@ -0,0 +1,302 @@
+"""
+Pool de conexiones SQLite para MEDISYNC
+Conexiones reutilizables por hilo, con verificación de salud y estadísticas
+"""
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Optional, Dict, Any
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """No se pudo obtener una conexión del pool dentro del tiempo límite"""
+
+
+class PooledConnection:
+    """Envoltura de sqlite3.Connection que vuelve al pool al llamar close()
+
+    Se comporta como una conexión normal (cursor, execute, commit, rollback,
+    row_factory, ...), por lo que el código existente que hace
+    ``conn = db.get_connection()`` ... ``conn.close()`` no necesita cambios.
+    """
+
+    __slots__ = ('_pool', '_conn', '_slot', '__weakref__')
+
+    def __init__(self, pool, conn, slot):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_slot', slot)
+
+    @property
+    def raw_connection(self):
+        """Conexión sqlite3 subyacente (None si ya fue devuelta)"""
+        return self._conn
+
+    def _require_conn(self):
+        conn = self._conn
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return conn
+
+    def __getattr__(self, name):
+        if name in PooledConnection.__slots__:
+            raise AttributeError(name)
+        return getattr(self._require_conn(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._require_conn(), name, value)
+
+    def __enter__(self):
+        self._require_conn().__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._require_conn().__exit__(exc_type, exc, tb)
+
+    def close(self):
+        """Devolver la conexión al pool en lugar de cerrarla"""
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, '_conn', None)
+        self._pool._release(conn, self._slot)
+
+    def __del__(self):
+        # Conexiones olvidadas sin close() también vuelven al pool
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class _ThreadSlot:
+    """Conexiones libres de un hilo; al morir el hilo se cierran
+
+    Sólo su hilo saca y devuelve conexiones, pero ``close_idle()`` puede
+    vaciarla desde otro hilo: ``lock`` protege la lista.
+    """
+
+    def __init__(self, pool):
+        self.idle = []  # [(conn, last_used)]
+        self.lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _close_idle, self.idle, self.lock, pool._semaphore)
+
+    def pop(self):
+        with self.lock:
+            return self.idle.pop() if self.idle else None
+
+    def push(self, conn, limit):
+        """Guardar ``conn`` como libre; False si el hilo ya tiene ``limit``"""
+        with self.lock:
+            if len(self.idle) >= limit:
+                return False
+            self.idle.append((conn, time.monotonic()))
+            return True
+
+
+def _close_idle(idle, lock, semaphore):
+    """Cerrar conexiones libres de un hilo (terminado o no) y liberar sus cupos"""
+    with lock:
+        closing = list(idle)
+        del idle[:]
+    for conn, _ in closing:
+        try:
+            conn.close()
+        except Exception:
+            pass
+        semaphore.release()
+
+
+class ConnectionPool:
+    """Pool acotado de conexiones SQLite reutilizables por hilo
+
+    - Cada hilo guarda hasta ``max_idle_per_thread`` conexiones libres.
+    - ``max_connections`` limita el total de conexiones abiertas; si se
+      alcanza, ``checkout`` espera hasta ``timeout`` segundos.
+    - Las conexiones inactivas más de ``health_check_interval`` segundos se
+      verifican con ``SELECT 1`` antes de entregarlas.
+    - ``factory`` es la clase de conexión de ``sqlite3.connect`` (p. ej.
+      query_stats.InstrumentedConnection para medir las consultas).
+    """
+
+    def __init__(self, db_path, max_connections=16, max_idle_per_thread=2,
+                 timeout=30.0, health_check_interval=30.0,
+                 on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 factory=sqlite3.Connection):
+        self.db_path = db_path
+        self.max_connections = max_connections
+        self.max_idle_per_thread = max_idle_per_thread
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.on_connect = on_connect
+        self.factory = factory
+        self._semaphore = threading.BoundedSemaphore(max_connections)
+        self._local = threading.local()
+        self._slots = weakref.WeakSet()  # un _ThreadSlot por hilo vivo
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # Estadísticas
+    # ------------------------------------------------------------------
+    def reset_stats(self):
+        """Reiniciar contadores"""
+        with self._stats_lock:
+            self._stats = {
+                'checkouts': 0,
+                'reused': 0,
+                'created': 0,
+                'discarded': 0,
+                'health_check_failures': 0,
+                'waits': 0,
+                'wait_time_total': 0.0,
+                'wait_time_max': 0.0,
+                'in_use': 0,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """Copia de los contadores del pool"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['wait_time_avg'] = (stats['wait_time_total'] / stats['waits']) if stats['waits'] else 0.0
+        return stats
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida de conexiones
+    # ------------------------------------------------------------------
+    def _thread_slot(self):
+        slot = getattr(self._local, 'slot', None)
+        if slot is None:
+            slot = _ThreadSlot(self)
+            self._local.slot = slot
+            with self._stats_lock:
+                self._slots.add(slot)
+        return slot
+
+    def _new_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               factory=self.factory)
+        if self.on_connect:
+            self.on_connect(conn)
+        self._count('created')
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._semaphore.release()
+        self._count('discarded')
+
+    def _is_healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _acquire_slot(self):
+        """Reservar cupo para una conexión nueva, midiendo la espera"""
+        if self._semaphore.acquire(blocking=False):
+            return
+        started = time.perf_counter()
+        acquired = self._semaphore.acquire(timeout=self.timeout)
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self._stats['waits'] += 1
+            self._stats['wait_time_total'] += waited
+            self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+        if not acquired:
+            raise PoolTimeoutError(
+                f"No hay conexiones disponibles tras {self.timeout:.1f}s "
+                f"(máximo {self.max_connections})"
+            )
+
+    def checkout(self, row_factory=sqlite3.Row) -> PooledConnection:
+        """Obtener una conexión del pool (devolver con ``close()``)"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("El pool de conexiones está cerrado")
+
+        slot = self._thread_slot()
+        conn = None
+        while True:
+            entry = slot.pop()
+            if entry is None:
+                break
+            candidate, last_used = entry
+            if (time.monotonic() - last_used) > self.health_check_interval \
+                    and not self._is_healthy(candidate):
+                self._count('health_check_failures')
+                self._discard(candidate)
+                continue
+            conn = candidate
+            self._count('reused')
+            break
+
+        if conn is None:
+            self._acquire_slot()
+            try:
+                conn = self._new_connection()
+            except Exception:
+                self._semaphore.release()
+                raise
+
+        conn.row_factory = row_factory
+        with self._stats_lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+        return PooledConnection(self, conn, slot)
+
+    def _release(self, conn, slot):
+        """Devolver una conexión al pool del hilo que la libera"""
+        self._count('in_use', -1)
+        try:
+            if conn.in_transaction:
+                # Una transacción abierta no debe filtrarse al siguiente usuario
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        current = self._thread_slot() if not self._closed else None
+        if current is None or not current.push(conn, self.max_idle_per_thread):
+            self._discard(conn)
+            return
+        if self._closed:
+            # close() se ejecutó mientras se devolvía: no dejarla abierta
+            self.close_idle()
+
+    @contextmanager
+    def connection(self, row_factory=sqlite3.Row):
+        """Context manager explícito de préstamo y devolución
+
+        Ejemplo::
+
+            with pool.connection() as conn:
+                conn.execute("SELECT ...")
+        """
+        conn = self.checkout(row_factory=row_factory)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close_idle(self):
+        """Cerrar las conexiones libres de todos los hilos (las prestadas no se tocan)"""
+        with self._stats_lock:
+            slots = list(self._slots)
+        for slot in slots:
+            _close_idle(slot.idle, slot.lock, self._semaphore)
+
+    def close(self):
+        """Cerrar el pool; las conexiones prestadas se cierran al devolverse"""
+        self._closed = True
+        self.close_idle()
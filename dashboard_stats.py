@@ -0,0 +1,303 @@
+"""
+Contadores materializados para los paneles de MEDISYNC
+Tablas estadisticas_* mantenidas por triggers en cada cambio de citas y
+facturas, de modo que los paneles leen unas pocas filas sea cual sea el
+tamaño del historial. ``verify`` compara con los datos reales y
+``rebuild`` las recalcula desde cero.
+
+Uso:
+    python dashboard_stats.py [ruta_db]              # verificar contadores
+    python dashboard_stats.py --rebuild [ruta_db]    # recalcular desde cero
+"""
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class Counter:
+    """Tabla de contadores agrupados sobre una tabla origen
+
+    ``keys`` y ``sums`` son pares (columna, expresión SQL) donde ``{row}``
+    es la fila origen (NEW/OLD en los triggers). La primera suma es el
+    número de filas: cuando llega a 0 la fila de contadores se borra.
+    """
+    table: str
+    source: str
+    keys: Tuple[Tuple[str, str], ...]
+    sums: Tuple[Tuple[str, str], ...]
+    condition: str = "1"
+    indexes: Tuple[Tuple[str, ...], ...] = ()
+
+    def source_columns(self):
+        """Columnas de la tabla origen que afectan a los contadores"""
+        expressions = [expr for _, expr in self.keys + self.sums] + [self.condition]
+        return sorted({col for expr in expressions for col in re.findall(r"\{row\}\.(\w+)", expr)})
+
+
+_CITA_FECHA = ('fecha', "COALESCE(DATE({row}.fecha_hora), '')")
+_CITA_DOCTOR = ('doctor_id', "COALESCE({row}.doctor_id, 0)")
+_CITA_ESTADO = ('estado', "COALESCE({row}.estado, '')")
+_CITA_SUMS = (('citas', "1"), ('importe', "COALESCE({row}.tarifa_consulta, 0)"))
+_FACTURA_ESTADO = ('estado', "COALESCE({row}.estado, '')")
+_FACTURA_SUMS = (('facturas', "1"), ('monto', "COALESCE({row}.monto, 0)"))
+
+COUNTERS: List[Counter] = [
+    # Citas e importe por día, doctor y estado
+    Counter('estadisticas_citas_dia', 'citas',
+            keys=(_CITA_FECHA, _CITA_DOCTOR, _CITA_ESTADO), sums=_CITA_SUMS,
+            indexes=(('doctor_id', 'estado', 'fecha'),)),
+    # Totales históricos por doctor y estado
+    Counter('estadisticas_citas_doctor', 'citas',
+            keys=(_CITA_DOCTOR, _CITA_ESTADO), sums=_CITA_SUMS,
+            indexes=(('estado',),)),
+    # Pacientes distintos de cada doctor (una fila por pareja)
+    Counter('estadisticas_doctor_pacientes', 'citas',
+            keys=(_CITA_DOCTOR, ('paciente_id', "COALESCE({row}.paciente_id, 0)")),
+            sums=(('citas', "1"),)),
+    # Facturas por estado
+    Counter('estadisticas_facturas_estado', 'facturas',
+            keys=(_FACTURA_ESTADO,), sums=_FACTURA_SUMS),
+    # Facturas cobradas por mes de pago
+    Counter('estadisticas_facturas_mes', 'facturas',
+            keys=(('mes', "COALESCE(strftime('%Y-%m', {row}.fecha_pago), '')"), _FACTURA_ESTADO),
+            sums=_FACTURA_SUMS, condition="{row}.fecha_pago IS NOT NULL"),
+]
+
+
+# ----------------------------------------------------------------------
+# Esquema
+# ----------------------------------------------------------------------
+def _table_exists(cursor, table):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+
+def _active_counters(cursor, counters=None):
+    """Contadores cuya tabla origen existe"""
+    return [counter for counter in (counters or COUNTERS) if _table_exists(cursor, counter.source)]
+
+
+def _create_table(cursor, counter):
+    keys = ", ".join(f"{col} NOT NULL" for col, _ in counter.keys)
+    sums = ", ".join(f"{col} NOT NULL DEFAULT 0" for col, _ in counter.sums)
+    primary_key = ", ".join(col for col, _ in counter.keys)
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {counter.table} (
+        {keys},
+        {sums},
+        PRIMARY KEY ({primary_key})
+    ) WITHOUT ROWID
+    ''')
+    for columns in counter.indexes:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{counter.table}_{'_'.join(columns)} "
+                       f"ON {counter.table}({', '.join(columns)})")
+
+
+def _apply_sql(counter, row, sign):
+    """Sentencias que suman (sign '+') o restan (sign '-') la fila ``row`` a los contadores"""
+    key_columns = [col for col, _ in counter.keys]
+    key_values = [expr.format(row=row) for _, expr in counter.keys]
+    sum_columns = [col for col, _ in counter.sums]
+    sum_values = [f"{sign}({expr.format(row=row)})" for _, expr in counter.sums]
+    updates = ", ".join(f"{col} = {col} + excluded.{col}" for col in sum_columns)
+    statements = [
+        f"INSERT INTO {counter.table} ({', '.join(key_columns + sum_columns)}) "
+        f"SELECT {', '.join(key_values + sum_values)} WHERE {counter.condition.format(row=row)} "
+        f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {updates};"
+    ]
+    if sign == '-':
+        match = " AND ".join(f"{col} = {value}" for col, value in zip(key_columns, key_values))
+        statements.append(f"DELETE FROM {counter.table} WHERE {match} AND {sum_columns[0]} <= 0;")
+    return statements
+
+
+def _create_triggers(cursor, source, counters, prefix):
+    """Triggers de INSERT/DELETE/UPDATE de ``source`` (se recrean para reflejar los contadores)"""
+    add = [sql for counter in counters for sql in _apply_sql(counter, 'NEW', '+')]
+    remove = [sql for counter in counters for sql in _apply_sql(counter, 'OLD', '-')]
+    columns = sorted({col for counter in counters for col in counter.source_columns()})
+    bodies = {
+        'insert': ("AFTER INSERT", add),
+        'delete': ("AFTER DELETE", remove),
+        # Sólo cuando cambian columnas contadas (no notas, motivo, etc.)
+        'update': (f"AFTER UPDATE OF {', '.join(columns)}", remove + add),
+    }
+    for event, (timing, statements) in bodies.items():
+        name = f"trg_{prefix}_{source}_{event}"
+        body = "\n            ".join(statements)
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f'''
+        CREATE TRIGGER {name} {timing} ON {source}
+        BEGIN
+            {body}
+        END
+        ''')
+
+
+def ensure_stats(cursor, counters=None, prefix='estadisticas'):
+    """Crear tablas de contadores y triggers (idempotente, no recalcula)
+
+    Cada conjunto de contadores (``prefix``) tiene sus propios triggers por
+    tabla origen, así otros módulos pueden añadir los suyos sin tocar estos.
+    """
+    counters = _active_counters(cursor, counters)
+    by_source = {}
+    for counter in counters:
+        _create_table(cursor, counter)
+        by_source.setdefault(counter.source, []).append(counter)
+    for source, source_counters in by_source.items():
+        _create_triggers(cursor, source, source_counters, prefix)
+    return [counter.table for counter in counters]
+
+
+# ----------------------------------------------------------------------
+# Consistencia
+# ----------------------------------------------------------------------
+def _expected_sql(counter, rounded=False):
+    """SELECT que calcula los contadores desde la tabla origen"""
+    keys = [expr.format(row=counter.source) for _, expr in counter.keys]
+    sums = [f"SUM({expr.format(row=counter.source)})" for _, expr in counter.sums]
+    if rounded:
+        sums = sums[:1] + [f"ROUND({value}, 2)" for value in sums[1:]]
+    return (f"SELECT {', '.join(keys + sums)} FROM {counter.source} "
+            f"WHERE {counter.condition.format(row=counter.source)} GROUP BY {', '.join(keys)}")
+
+
+def rebuild(cursor, counters=None):
+    """Recalcular todos los contadores desde las tablas origen"""
+    for counter in _active_counters(cursor, counters):
+        columns = [col for col, _ in counter.keys + counter.sums]
+        cursor.execute(f"DELETE FROM {counter.table}")
+        cursor.execute(f"INSERT INTO {counter.table} ({', '.join(columns)}) {_expected_sql(counter)}")
+
+
+def verify(cursor, counters=None) -> Dict[str, int]:
+    """Filas de contadores que no coinciden con los datos reales, por tabla
+
+    Un diccionario sin valores distintos de cero indica contadores correctos.
+    Los importes se comparan redondeados a 2 decimales.
+    """
+    mismatches = {}
+    for counter in _active_counters(cursor, counters):
+        stored_sums = [col for col, _ in counter.sums]
+        stored_sums = stored_sums[:1] + [f"ROUND({col}, 2)" for col in stored_sums[1:]]
+        stored = f"SELECT {', '.join([col for col, _ in counter.keys] + stored_sums)} FROM {counter.table}"
+        expected = _expected_sql(counter, rounded=True)
+        cursor.execute(f'''
+        SELECT (SELECT COUNT(*) FROM ({stored} EXCEPT {expected}))
+             + (SELECT COUNT(*) FROM ({expected} EXCEPT {stored}))
+        ''')
+        mismatches[counter.table] = cursor.fetchone()[0]
+    return mismatches
+
+
+# ----------------------------------------------------------------------
+# Lecturas para los paneles
+# ----------------------------------------------------------------------
+def _month_range(day):
+    month = day.strftime('%Y-%m')
+    return month, f"{month}-01", f"{month}-31"
+
+
+def _scalar(cursor, sql, params=()):
+    cursor.execute(sql, params)
+    row = cursor.fetchone()
+    return (row[0] if row else None) or 0
+
+
+def system_stats(cursor, today: Optional[date] = None):
+    """Citas de hoy, facturas pendientes e ingresos del mes (facturas pagadas)"""
+    today = today or date.today()
+    month, _, _ = _month_range(today)
+    return {
+        'appointments_today': _scalar(cursor, "SELECT SUM(citas) FROM estadisticas_citas_dia WHERE fecha = ?",
+                                      (today.isoformat(),)),
+        'pending_invoices': _scalar(cursor, "SELECT facturas FROM estadisticas_facturas_estado "
+                                            "WHERE estado = 'pendiente'"),
+        'monthly_income': _scalar(cursor, "SELECT monto FROM estadisticas_facturas_mes "
+                                          "WHERE mes = ? AND estado = 'pagado'", (month,)),
+    }
+
+
+def doctor_stats(cursor, doctor_id, today: Optional[date] = None):
+    """Citas de hoy, pacientes, consultas e ingresos (citas completadas) de un doctor"""
+    today = today or date.today()
+    _, first_day, last_day = _month_range(today)
+    cursor.execute('''
+    SELECT COALESCE(SUM(citas), 0), COALESCE(SUM(importe), 0) FROM estadisticas_citas_dia
+    WHERE doctor_id = ? AND estado = 'completada' AND fecha BETWEEN ? AND ?
+    ''', (doctor_id, first_day, last_day))
+    consultations_month, monthly_income = cursor.fetchone()
+    cursor.execute('''
+    SELECT COALESCE(SUM(citas), 0), COALESCE(SUM(importe), 0) FROM estadisticas_citas_doctor
+    WHERE doctor_id = ? AND estado = 'completada'
+    ''', (doctor_id,))
+    total_consultations, total_income = cursor.fetchone()
+    return {
+        'appointments_today': _scalar(cursor, "SELECT SUM(citas) FROM estadisticas_citas_dia "
+                                              "WHERE fecha = ? AND doctor_id = ?",
+                                      (today.isoformat(), doctor_id)),
+        'total_patients': _scalar(cursor, "SELECT COUNT(*) FROM estadisticas_doctor_pacientes "
+                                          "WHERE doctor_id = ?", (doctor_id,)),
+        'monthly_income': monthly_income,
+        'consultations_month': consultations_month,
+        'total_consultations': total_consultations,
+        'total_income': total_income,
+    }
+
+
+def secretaria_stats(cursor, today: Optional[date] = None):
+    """Citas de hoy, citas programadas y facturas pendientes"""
+    today = today or date.today()
+    return {
+        'appointments_today': _scalar(cursor, "SELECT SUM(citas) FROM estadisticas_citas_dia WHERE fecha = ?",
+                                      (today.isoformat(),)),
+        'pending_appointments': _scalar(cursor, "SELECT SUM(citas) FROM estadisticas_citas_doctor "
+                                                "WHERE estado = 'programada'"),
+        'pending_invoices': _scalar(cursor, "SELECT facturas FROM estadisticas_facturas_estado "
+                                            "WHERE estado = 'pendiente'"),
+    }
+
+
+def monthly_income(cursor, year, month, estado='pagada'):
+    """(importe, número de facturas) cobradas en un mes"""
+    cursor.execute('''
+    SELECT COALESCE(SUM(monto), 0), COALESCE(SUM(facturas), 0) FROM estadisticas_facturas_mes
+    WHERE mes = ? AND estado = ?
+    ''', (f"{year}-{month:02d}", estado))
+    return cursor.fetchone()
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    repair = '--rebuild' in argv
+    if repair:
+        argv.remove('--rebuild')
+    db_path = argv[0] if argv else 'database/medisync.db'
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        if repair:
+            cursor.execute("BEGIN IMMEDIATE")
+            ensure_stats(cursor)
+            rebuild(cursor)
+            conn.commit()
+            print("✅ Contadores recalculados")
+        failures = {table: count for table, count in verify(cursor).items() if count}
+        for table, count in failures.items():
+            print(f"❌ {table}: {count} filas no coinciden (usar --rebuild)")
+        if failures:
+            return 1
+        print("✅ Contadores de paneles coherentes con citas y facturas")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,24 @@ Gestor completo de base de datos con todas las funcionalidades
 import sqlite3
 import hashlib
 import os
-import threading
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 import json
+import threading
+
+from connection_pool import ConnectionPool
+from db_concurrency import DatabaseLock, DEFAULT_CONCURRENCY, configure_connection
+from incremental_search import like_escape
+import schema_migrations
+from appointment_scheduler import AppointmentScheduler, parse_day
+from availability_service import AvailabilityService
+from invoice_sequence import yearly_invoice_numbers
+import medical_search
+import dashboard_stats
+import change_events
+from table_versions import TableVersions
+import query_stats
 
 @dataclass
 class User:
@@ -61,242 +74,551 @@ class Factura:
     fecha_pago: datetime = None
     metodo_pago: str = None
 
+@dataclass
+class AppointmentQuery:
+    """Filtros estructurados para consultar citas página a página
+
+    ``fecha_desde`` y ``fecha_hasta`` son fechas 'YYYY-MM-DD' inclusivas.
+    Las páginas se recorren por clave (fecha_hora, id) en orden descendente.
+    """
+    texto: str = ""
+    estado: Optional[str] = None
+    fecha_desde: Optional[str] = None
+    fecha_hasta: Optional[str] = None
+    doctor_id: Optional[int] = None
+    paciente_id: Optional[int] = None
+    
+    def _where(self):
+        """Condiciones WHERE y parámetros comunes a páginas y conteo"""
+        where = []
+        params = []
+        
+        if self.doctor_id is not None:
+            where.append("c.doctor_id = ?")
+            params.append(self.doctor_id)
+        if self.paciente_id is not None:
+            where.append("c.paciente_id = ?")
+            params.append(self.paciente_id)
+        if self.estado:
+            where.append("c.estado = ?")
+            params.append(self.estado)
+        # Rango sobre fecha_hora (texto ISO) para recorrer el mismo índice que el orden
+        if self.fecha_desde:
+            where.append("c.fecha_hora >= ?")
+            params.append(self.fecha_desde)
+        if self.fecha_hasta:
+            next_day = date.fromisoformat(self.fecha_hasta) + timedelta(days=1)
+            where.append("c.fecha_hora < ?")
+            params.append(next_day.isoformat())
+        texto = (self.texto or "").strip()
+        if texto:
+            pattern = f"%{like_escape(texto)}%"
+            where.append("""(
+                up.nombre || ' ' || up.apellido LIKE ? ESCAPE '\\'
+                OR ud.nombre || ' ' || ud.apellido LIKE ? ESCAPE '\\'
+                OR c.motivo LIKE ? ESCAPE '\\'
+                OR CAST(c.id AS TEXT) LIKE ? ESCAPE '\\'
+            )""")
+            params.extend([pattern, pattern, pattern, pattern])
+        return where, params
+    
+    def build(self, after=None, limit=100):
+        """Construir (sql, params) de una página; ``after`` = (fecha_hora, id) de la última fila vista"""
+        where, params = self._where()
+        if after is not None:
+            where.append("(c.fecha_hora, c.id) < (?, ?)")
+            params.extend(after)
+        
+        sql = self._select(where) + " ORDER BY c.fecha_hora DESC, c.id DESC LIMIT ?"
+        params.append(limit)
+        return sql, params
+    
+    def build_row(self, appointment_id):
+        """Construir (sql, params) de una cita con la forma de las páginas, sólo si cumple los filtros"""
+        where, params = self._where()
+        where.append("c.id = ?")
+        params.append(appointment_id)
+        return self._select(where), params
+    
+    @staticmethod
+    def _select(where):
+        sql = """
+        SELECT c.*, 
+               up.nombre || ' ' || up.apellido as paciente_nombre,
+               ud.nombre || ' ' || ud.apellido as doctor_nombre,
+               COALESCE(doc.especialidad, 'N/A') as especialidad
+        FROM citas c
+        JOIN usuarios up ON c.paciente_id = up.id
+        JOIN usuarios ud ON c.doctor_id = ud.id
+        LEFT JOIN doctores doc ON ud.id = doc.id
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql
+    
+    def build_count(self, limit=None):
+        """Construir (sql, params) del total de citas que cumplen los filtros
+        
+        Con ``limit`` se cuentan como mucho ``limit`` citas: el coste no crece con la tabla.
+        """
+        where, params = self._where()
+        sql = """
+        FROM citas c
+        JOIN usuarios up ON c.paciente_id = up.id
+        JOIN usuarios ud ON c.doctor_id = ud.id
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if limit is None:
+            return "SELECT COUNT(*) " + sql, params
+        return f"SELECT COUNT(*) FROM (SELECT 1 {sql} LIMIT ?)", params + [int(limit)]
+
+# ----------------------------------------------------------------------
+# Esquema base y datos iniciales (su huella decide si hay que re-inicializar)
+# ----------------------------------------------------------------------
+SCHEMA_TABLES = (
+    # Tabla usuarios
+    '''
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT NOT NULL,
+        apellido TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        telefono TEXT,
+        direccion TEXT,
+        fecha_nacimiento DATE,
+        tipo_usuario TEXT NOT NULL,
+        password_hash TEXT NOT NULL,
+        activo BOOLEAN DEFAULT 1,
+        fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # Tabla pacientes
+    '''
+    CREATE TABLE IF NOT EXISTS pacientes (
+        id INTEGER PRIMARY KEY,
+        numero_expediente TEXT UNIQUE,
+        tipo_sangre TEXT,
+        alergias TEXT,
+        contacto_emergencia TEXT,
+        telefono_emergencia TEXT,
+        seguro_medico TEXT,
+        seguro_medico_id INTEGER DEFAULT 4,
+        tiene_seguro BOOLEAN DEFAULT 0,
+        FOREIGN KEY (id) REFERENCES usuarios(id)
+    )
+    ''',
+    # Tabla doctores
+    '''
+    CREATE TABLE IF NOT EXISTS doctores (
+        id INTEGER PRIMARY KEY,
+        especialidad TEXT,
+        cedula_profesional TEXT UNIQUE,
+        acepta_seguros BOOLEAN DEFAULT 1,
+        tarifa_consulta DECIMAL(10,2) DEFAULT 500.00,
+        horario_inicio TIME DEFAULT '08:00',
+        horario_fin TIME DEFAULT '17:00',
+        FOREIGN KEY (id) REFERENCES usuarios(id)
+    )
+    ''',
+    # Tabla citas (estructura existente)
+    '''
+    CREATE TABLE IF NOT EXISTS citas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        paciente_id INTEGER NOT NULL,
+        doctor_id INTEGER NOT NULL,
+        fecha_hora TIMESTAMP,
+        motivo TEXT,
+        estado VARCHAR(20) DEFAULT 'programada',
+        notas TEXT,
+        duracion_minutos INTEGER DEFAULT 30,
+        fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        tarifa_consulta REAL,
+        seguro_aplicable BOOLEAN DEFAULT 0,
+        FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
+        FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
+    )
+    ''',
+    # Tabla historiales médicos
+    '''
+    CREATE TABLE IF NOT EXISTS historiales_medicos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        paciente_id INTEGER NOT NULL,
+        doctor_id INTEGER NOT NULL,
+        fecha_consulta DATE NOT NULL,
+        diagnostico TEXT NOT NULL,
+        tratamiento TEXT,
+        medicamentos TEXT,
+        observaciones TEXT,
+        estado TEXT DEFAULT 'activo',
+        fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
+        FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
+    )
+    ''',
+    # Tabla facturas
+    '''
+    CREATE TABLE IF NOT EXISTS facturas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        numero_factura TEXT UNIQUE NOT NULL,
+        paciente_id INTEGER NOT NULL,
+        doctor_id INTEGER,
+        concepto TEXT NOT NULL,
+        monto DECIMAL(10,2) NOT NULL,
+        estado TEXT DEFAULT 'pendiente',
+        fecha_creacion DATE NOT NULL,
+        fecha_vencimiento DATE NOT NULL,
+        fecha_pago DATETIME,
+        metodo_pago TEXT,
+        FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
+        FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
+    )
+    ''',
+    # Tabla seguros médicos
+    '''
+    CREATE TABLE IF NOT EXISTS seguros_medicos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nombre TEXT UNIQUE NOT NULL,
+        descuento_porcentaje DECIMAL(5,2) DEFAULT 0,
+        descripcion TEXT,
+        activo BOOLEAN DEFAULT 1
+    )
+    ''',
+    # Tabla historial_medico (nueva estructura mejorada)
+    '''
+    CREATE TABLE IF NOT EXISTS historial_medico (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        paciente_id INTEGER NOT NULL,
+        doctor_id INTEGER NOT NULL,
+        fecha_consulta DATE NOT NULL,
+        tipo_consulta TEXT DEFAULT 'Consulta General',
+        motivo_consulta TEXT,
+        sintomas TEXT,
+        diagnostico TEXT,
+        tratamiento TEXT,
+        medicamentos TEXT,
+        observaciones TEXT,
+        proxima_cita DATE,
+        estado TEXT DEFAULT 'Completada',
+        fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        fecha_modificacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
+        FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
+    )
+    ''',
+    # Huella del último arranque completo (ver DatabaseManager.bootstrap)
+    '''
+    CREATE TABLE IF NOT EXISTS schema_bootstrap (
+        clave TEXT PRIMARY KEY,
+        valor TEXT NOT NULL
+    )
+    ''',
+)
+
+# Seguros por defecto
+DEFAULT_INSURANCE_SQL = '''
+INSERT OR IGNORE INTO seguros_medicos (id, nombre, descuento_porcentaje, descripcion, activo)
+VALUES 
+    (1, 'ARS Senasa', 15.0, 'Seguro Nacional de Salud', 1),
+    (2, 'ARS Humano', 20.0, 'Seguro Privado ARS Humano', 1),
+    (3, 'Universal', 10.0, 'Seguro Universal', 1),
+    (4, 'Sin Seguro', 0.0, 'Sin cobertura de seguro médico', 1)
+'''
+
+DEFAULT_USERS = [
+    {
+        'nombre': 'Admin',
+        'apellido': 'Sistema',
+        'email': 'admin@medisync.com',
+        'telefono': '8095551234',
+        'tipo_usuario': 'admin',
+        'password': 'admin123'
+    },
+    {
+        'nombre': 'Dr. Carlos',
+        'apellido': 'Rodríguez',
+        'email': 'carlos@medisync.com',
+        'telefono': '8095555678',
+        'tipo_usuario': 'doctor',
+        'password': 'doctor123'
+    },
+    {
+        'nombre': 'María',
+        'apellido': 'López',
+        'email': 'maria@medisync.com',
+        'telefono': '8095559999',
+        'tipo_usuario': 'secretaria',
+        'password': 'secretaria123'
+    },
+    {
+        'nombre': 'Pedro',
+        'apellido': 'Ramírez',
+        'email': 'pedro@medisync.com',
+        'telefono': '8095557777',
+        'tipo_usuario': 'paciente',
+        'password': 'paciente123'
+    }
+]
+
+# ----------------------------------------------------------------------
+# Columnas que pueden escribir las vistas y el servicio (van tal cual en el SQL)
+# ----------------------------------------------------------------------
+USER_COLUMNS = ('nombre', 'apellido', 'email', 'telefono', 'direccion', 'fecha_nacimiento',
+                'tipo_usuario', 'activo')
+# Fila propia de cada tipo de usuario: tabla y columnas
+PROFILE_TABLES = {
+    'doctor': ('doctores', ('especialidad', 'cedula_profesional', 'horario_inicio', 'horario_fin',
+                            'consultorio', 'tarifa_consulta', 'acepta_seguros')),
+    'paciente': ('pacientes', ('numero_expediente', 'tipo_sangre', 'alergias', 'contacto_emergencia',
+                               'telefono_emergencia', 'seguro_medico', 'seguro_medico_id', 'tiene_seguro',
+                               'numero_seguro', 'porcentaje_cobertura')),
+}
+INVOICE_COLUMNS = ('numero_factura', 'paciente_id', 'doctor_id', 'cita_id', 'concepto', 'monto', 'estado',
+                   'fecha_creacion', 'fecha_vencimiento', 'fecha_pago', 'metodo_pago', 'referencia_pago',
+                   'notas', 'seguro_aplicado', 'descuento_seguro', 'monto_original', 'monto_descuento',
+                   'moneda', 'tipo_consulta')
+MEDICAL_RECORD_COLUMNS = {
+    'historial_medico': ('paciente_id', 'doctor_id', 'fecha_consulta', 'tipo_consulta', 'motivo_consulta',
+                         'sintomas', 'diagnostico', 'tratamiento', 'medicamentos', 'observaciones',
+                         'proxima_cita', 'estado'),
+    'historiales_medicos': ('paciente_id', 'doctor_id', 'cita_id', 'fecha_consulta', 'diagnostico',
+                            'tratamiento', 'medicamentos', 'observaciones', 'adjuntos', 'estado'),
+}
+
+def _pick(data, columns):
+    """Valores de ``data`` para las columnas permitidas (en el orden de ``columns``)"""
+    return {column: data[column] for column in columns if column in data}
+
+
+def schema_fingerprint():
+    """Huella del esquema que espera este código (tablas, datos iniciales y migraciones)"""
+    payload = json.dumps({
+        'tables': SCHEMA_TABLES,
+        'insurance': DEFAULT_INSURANCE_SQL,
+        'users': DEFAULT_USERS,
+        'migrations': [m.version for m in schema_migrations.MIGRATIONS],
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+# Bases de datos ya inicializadas en este proceso y gestores compartidos (por ruta absoluta)
+_bootstrapped_paths = set()
+_shared_managers = {}
+_bootstrap_lock = threading.Lock()
+_shared_lock = threading.Lock()
+
+
 class DatabaseManager:
     """Gestor completo de base de datos para MEDISYNC"""
     
-    def __init__(self, db_path='database/medisync.db'):
+    def __init__(self, db_path='database/medisync.db', pool_size=32,
+                 concurrency=DEFAULT_CONCURRENCY, bootstrap=True):
         self.db_path = db_path
-        self.lock = threading.Lock()
+        self.concurrency = concurrency
+        self.lock = DatabaseLock(concurrency)
+        self.table_versions = TableVersions()
+        # Tiempos de cada sentencia del pool (panel de rendimiento y registro de consultas lentas)
+        self.query_stats = query_stats.monitor
         self.ensure_database_exists()
-        self.create_tables()
-        self.create_default_users()
+        self.pool = ConnectionPool(
+            db_path, max_connections=pool_size,
+            on_connect=self._configure_connection,
+            factory=query_stats.InstrumentedConnection
+        )
+        self.scheduler = AppointmentScheduler(self)
+        self.availability = AvailabilityService(self)
+        if bootstrap:
+            self.bootstrap()
+    
+    @classmethod
+    def shared(cls, db_path='database/medisync.db', **kwargs):
+        """Gestor único por base de datos para todo el proceso
+        
+        Comparte pool, índice de citas y cachés entre ventanas y módulos en
+        lugar de crear un DatabaseManager (y su inicialización) por llamada.
+        """
+        key = os.path.abspath(db_path)
+        with _shared_lock:
+            manager = _shared_managers.get(key)
+            if manager is None:
+                manager = cls(db_path, **kwargs)
+                _shared_managers[key] = manager
+            return manager
+    
+    # ------------------------------------------------------------------
+    # Inicialización del esquema
+    # ------------------------------------------------------------------
+    def bootstrap(self, force=False):
+        """Crear tablas, migrar y sembrar usuarios sólo si hace falta
+        
+        Se omite si esta base ya se inicializó en el proceso o si la huella
+        guardada en ``schema_bootstrap`` coincide con la del código y el
+        esquema no ha cambiado desde entonces (PRAGMA schema_version).
+        Devuelve True si se ejecutó la inicialización completa.
+        """
+        key = os.path.abspath(self.db_path)
+        with _bootstrap_lock:
+            if not force:
+                if key in _bootstrapped_paths:
+                    return False
+                if self.bootstrap_is_current():
+                    _bootstrapped_paths.add(key)
+                    return False
+            ok = self.create_tables()
+            ok = self.run_migrations() is not None and ok
+            ok = self.create_default_users() and ok
+            if ok:
+                # Con algún paso fallido no se guarda la huella: se reintenta al próximo arranque
+                self._store_bootstrap_fingerprint()
+            # Las conexiones abiertas antes de crear las tablas no tienen triggers de versiones
+            self.pool.close_idle()
+            _bootstrapped_paths.add(key)
+            return True
+    
+    def _read_bootstrap_state(self, cursor):
+        cursor.execute("SELECT clave, valor FROM schema_bootstrap")
+        stored = {row[0]: row[1] for row in cursor.fetchall()}
+        cursor.execute("PRAGMA schema_version")
+        return stored, str(cursor.fetchone()[0])
+    
+    def bootstrap_is_current(self):
+        """¿Coinciden la huella guardada y el esquema actual con los del código?"""
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            try:
+                stored, schema_cookie = self._read_bootstrap_state(cursor)
+                return (stored.get('fingerprint') == schema_fingerprint()
+                        and stored.get('schema_version') == schema_cookie)
+            except sqlite3.Error:
+                # Base nueva o anterior a schema_bootstrap
+                return False
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def _store_bootstrap_fingerprint(self):
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            try:
+                _, schema_cookie = self._read_bootstrap_state(cursor)
+                cursor.executemany(
+                    "INSERT OR REPLACE INTO schema_bootstrap (clave, valor) VALUES (?, ?)",
+                    [('fingerprint', schema_fingerprint()), ('schema_version', schema_cookie),
+                     ('fecha', datetime.now().isoformat())]
+                )
+                conn.commit()
+            except Exception as e:
+                print(f"Error guardando huella del esquema: {e}")
+                conn.rollback()
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def _configure_connection(self, conn):
+        """PRAGMAs de concurrencia y triggers de versiones para cada conexión nueva"""
+        configure_connection(conn, self.concurrency)
+        try:
+            self.table_versions.install(conn)
+        except sqlite3.Error as e:
+            print(f"Error instalando triggers de versiones: {e}")
     
     def ensure_database_exists(self):
         """Asegurar que la base de datos y el directorio existan"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
     def get_connection(self):
-        """Obtener conexión a la base de datos con row_factory"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Obtener conexión del pool con row_factory (close() la devuelve al pool)"""
+        return self.pool.checkout(row_factory=sqlite3.Row)
     
     def get_simple_connection(self):
-        """Obtener conexión simple sin row_factory"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Obtener conexión del pool sin row_factory"""
+        return self.pool.checkout(row_factory=None)
+    
+    def connection(self, row_factory=sqlite3.Row):
+        """Context manager de préstamo/devolución de una conexión del pool"""
+        return self.pool.connection(row_factory=row_factory)
+    
+    def get_pool_stats(self):
+        """Contadores del pool (préstamos, reutilizadas, tiempo de espera...)"""
+        return self.pool.stats()
+    
+    def explain_query(self, sql, params=None):
+        """Plan de ejecución (EXPLAIN QUERY PLAN) de una sentencia registrada, o None si no aplica"""
+        with self.lock.read():
+            conn = self.get_connection()
+            try:
+                return schema_migrations.explain(conn, sql, query_stats.explain_parameters(sql, params))
+            except Exception as e:
+                print(f"Error obteniendo plan de consulta: {e}")
+                return None
+            finally:
+                conn.close()
     
     def create_tables(self):
         """Crear todas las tablas necesarias"""
-        with self.lock:
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
             try:
-                # Tabla usuarios
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS usuarios (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT NOT NULL,
-                    apellido TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    telefono TEXT,
-                    direccion TEXT,
-                    fecha_nacimiento DATE,
-                    tipo_usuario TEXT NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    activo BOOLEAN DEFAULT 1,
-                    fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                ''')
-                
-                # Tabla pacientes
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS pacientes (
-                    id INTEGER PRIMARY KEY,
-                    numero_expediente TEXT UNIQUE,
-                    tipo_sangre TEXT,
-                    alergias TEXT,
-                    contacto_emergencia TEXT,
-                    telefono_emergencia TEXT,
-                    seguro_medico TEXT,
-                    seguro_medico_id INTEGER DEFAULT 4,
-                    tiene_seguro BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (id) REFERENCES usuarios(id)
-                )
-                ''')
-                
-                # Tabla doctores
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS doctores (
-                    id INTEGER PRIMARY KEY,
-                    especialidad TEXT,
-                    cedula_profesional TEXT UNIQUE,
-                    acepta_seguros BOOLEAN DEFAULT 1,
-                    tarifa_consulta DECIMAL(10,2) DEFAULT 500.00,
-                    horario_inicio TIME DEFAULT '08:00',
-                    horario_fin TIME DEFAULT '17:00',
-                    FOREIGN KEY (id) REFERENCES usuarios(id)
-                )
-                ''')
-                
-                # Tabla citas (estructura existente)
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS citas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    paciente_id INTEGER NOT NULL,
-                    doctor_id INTEGER NOT NULL,
-                    fecha_hora TIMESTAMP,
-                    motivo TEXT,
-                    estado VARCHAR(20) DEFAULT 'programada',
-                    notas TEXT,
-                    duracion_minutos INTEGER DEFAULT 30,
-                    fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    tarifa_consulta REAL,
-                    seguro_aplicable BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
-                    FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
-                )
-                ''')
-                
-                # Tabla historiales médicos
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS historiales_medicos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    paciente_id INTEGER NOT NULL,
-                    doctor_id INTEGER NOT NULL,
-                    fecha_consulta DATE NOT NULL,
-                    diagnostico TEXT NOT NULL,
-                    tratamiento TEXT,
-                    medicamentos TEXT,
-                    observaciones TEXT,
-                    estado TEXT DEFAULT 'activo',
-                    fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
-                    FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
-                )
-                ''')
-                
-                # Tabla facturas
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS facturas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    numero_factura TEXT UNIQUE NOT NULL,
-                    paciente_id INTEGER NOT NULL,
-                    doctor_id INTEGER,
-                    concepto TEXT NOT NULL,
-                    monto DECIMAL(10,2) NOT NULL,
-                    estado TEXT DEFAULT 'pendiente',
-                    fecha_creacion DATE NOT NULL,
-                    fecha_vencimiento DATE NOT NULL,
-                    fecha_pago DATETIME,
-                    metodo_pago TEXT,
-                    FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
-                    FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
-                )
-                ''')
-                
-                # Tabla seguros médicos
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS seguros_medicos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    nombre TEXT UNIQUE NOT NULL,
-                    descuento_porcentaje DECIMAL(5,2) DEFAULT 0,
-                    descripcion TEXT,
-                    activo BOOLEAN DEFAULT 1
-                )
-                ''')
-                
-                # Tabla historial_medico (nueva estructura mejorada)
-                cursor.execute('''
-                CREATE TABLE IF NOT EXISTS historial_medico (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    paciente_id INTEGER NOT NULL,
-                    doctor_id INTEGER NOT NULL,
-                    fecha_consulta DATE NOT NULL,
-                    tipo_consulta TEXT DEFAULT 'Consulta General',
-                    motivo_consulta TEXT,
-                    sintomas TEXT,
-                    diagnostico TEXT,
-                    tratamiento TEXT,
-                    medicamentos TEXT,
-                    observaciones TEXT,
-                    proxima_cita DATE,
-                    estado TEXT DEFAULT 'Completada',
-                    fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    fecha_modificacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (paciente_id) REFERENCES usuarios(id),
-                    FOREIGN KEY (doctor_id) REFERENCES usuarios(id)
-                )
-                ''')
+                for ddl in SCHEMA_TABLES:
+                    cursor.execute(ddl)
                 
                 # Insertar seguros por defecto
-                cursor.execute('''
-                INSERT OR IGNORE INTO seguros_medicos (id, nombre, descuento_porcentaje, descripcion, activo)
-                VALUES 
-                    (1, 'ARS Senasa', 15.0, 'Seguro Nacional de Salud', 1),
-                    (2, 'ARS Humano', 20.0, 'Seguro Privado ARS Humano', 1),
-                    (3, 'Universal', 10.0, 'Seguro Universal', 1),
-                    (4, 'Sin Seguro', 0.0, 'Sin cobertura de seguro médico', 1)
-                ''')
+                cursor.execute(DEFAULT_INSURANCE_SQL)
                 
                 conn.commit()
+                return True
                 
             except Exception as e:
                 print(f"Error creando tablas: {e}")
                 conn.rollback()
+                return False
             finally:
                 cursor.close()
                 conn.close()
     
+    def run_migrations(self):
+        """Aplicar migraciones de esquema pendientes (índices, columnas derivadas)
+        
+        Devuelve las versiones aplicadas, o None si alguna falló.
+        """
+        with self.lock.write():
+            conn = self.get_connection()
+            try:
+                return schema_migrations.migrate(conn)
+            except Exception as e:
+                print(f"Error aplicando migraciones: {e}")
+                return None
+            finally:
+                conn.close()
+    
+    def get_schema_version(self):
+        """Versión de esquema aplicada"""
+        with self.lock.read():
+            conn = self.get_connection()
+            try:
+                return schema_migrations.current_version(conn)
+            finally:
+                conn.close()
+    
     def hash_password(self, password):
         """Hash de contraseña usando SHA256"""
         return hashlib.sha256(password.encode()).hexdigest()
     
     def create_default_users(self):
         """Crear usuarios por defecto del sistema"""
-        with self.lock:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            try:
-                default_users = [
-                    {
-                        'nombre': 'Admin',
-                        'apellido': 'Sistema',
-                        'email': 'admin@medisync.com',
-                        'telefono': '8095551234',
-                        'tipo_usuario': 'admin',
-                        'password': 'admin123'
-                    },
-                    {
-                        'nombre': 'Dr. Carlos',
-                        'apellido': 'Rodríguez',
-                        'email': 'carlos@medisync.com',
-                        'telefono': '8095555678',
-                        'tipo_usuario': 'doctor',
-                        'password': 'doctor123'
-                    },
-                    {
-                        'nombre': 'María',
-                        'apellido': 'López',
-                        'email': 'maria@medisync.com',
-                        'telefono': '8095559999',
-                        'tipo_usuario': 'secretaria',
-                        'password': 'secretaria123'
-                    },
-                    {
-                        'nombre': 'Pedro',
-                        'apellido': 'Ramírez',
-                        'email': 'pedro@medisync.com',
-                        'telefono': '8095557777',
-                        'tipo_usuario': 'paciente',
-                        'password': 'paciente123'
-                    }
-                ]
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
                 
-                for user_data in default_users:
+                for user_data in DEFAULT_USERS:
                     # Verificar si el usuario ya existe
                     cursor.execute("SELECT COUNT(*) FROM usuarios WHERE email = ?", (user_data['email'],))
                     if cursor.fetchone()[0] == 0:
@@ -324,17 +646,19 @@ class DatabaseManager:
                             ''', (user_id, f'EXP-{user_id:03d}', 4, 0))
                 
                 conn.commit()
+                return True
                 
             except Exception as e:
                 print(f"Error creando usuarios por defecto: {e}")
                 conn.rollback()
+                return False
             finally:
                 cursor.close()
                 conn.close()
     
     def authenticate_user(self, email, password):
         """Autenticar usuario"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -368,7 +692,7 @@ class DatabaseManager:
     
     def get_all_users(self, tipo_usuario=None):
         """Obtener todos los usuarios"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -410,7 +734,7 @@ class DatabaseManager:
     
     def get_all_patients(self):
         """Obtener todos los pacientes"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -438,7 +762,7 @@ class DatabaseManager:
     
     def get_all_doctors(self):
         """Obtener todos los doctores"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -465,7 +789,7 @@ class DatabaseManager:
     
     def get_all_appointments(self):
         """Obtener todas las citas"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -491,9 +815,200 @@ class DatabaseManager:
                 cursor.close()
                 conn.close()
     
+    def get_appointments_page(self, query=None, after=None, limit=100):
+        """Obtener una página de citas filtradas (paginación por clave)
+        
+        Devuelve (citas, siguiente_cursor); el cursor es None en la última página.
+        """
+        query = query or AppointmentQuery()
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                sql, params = query.build(after=after, limit=limit)
+                cursor.execute(sql, params)
+                rows = [dict(row) for row in cursor.fetchall()]
+                next_cursor = None
+                if len(rows) == limit:
+                    next_cursor = (rows[-1]['fecha_hora'], rows[-1]['id'])
+                return rows, next_cursor
+                
+            except Exception as e:
+                print(f"Error obteniendo página de citas: {e}")
+                return [], None
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def count_appointments(self, query=None, limit=None):
+        """Contar las citas que cumplen los filtros de ``query`` (hasta ``limit`` si se indica)"""
+        query = query or AppointmentQuery()
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                sql, params = query.build_count(limit)
+                cursor.execute(sql, params)
+                return cursor.fetchone()[0]
+                
+            except Exception as e:
+                print(f"Error contando citas: {e}")
+                return 0
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def get_appointment_row(self, appointment_id, query=None):
+        """Fila de una cita como en get_appointments_page, o None si no existe o ya no cumple ``query``"""
+        query = query or AppointmentQuery()
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                sql, params = query.build_row(appointment_id)
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+                return dict(row) if row else None
+                
+            except Exception as e:
+                print(f"Error obteniendo fila de cita: {e}")
+                return None
+            finally:
+                cursor.close()
+                conn.close()
+    
+    # ------------------------------------------------------------------
+    # Registro de cambios (avisos a las ventanas abiertas)
+    # ------------------------------------------------------------------
+    def get_changes_since(self, last_id, limit=change_events.BATCH_SIZE, patient_id=None):
+        """Cambios de citas, facturas y pacientes registrados después de ``last_id``"""
+        with self.lock.read():
+            conn = self.get_simple_connection()
+            cursor = conn.cursor()
+            
+            try:
+                return change_events.read_changes(cursor, last_id, limit, patient_id)
+                
+            except Exception as e:
+                print(f"Error leyendo registro de cambios: {e}")
+                return []
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def get_last_change_id(self):
+        """Id del último cambio registrado (0 si no hay ninguno)"""
+        with self.lock.read():
+            conn = self.get_simple_connection()
+            cursor = conn.cursor()
+            
+            try:
+                return change_events.last_change_id(cursor)
+                
+            except Exception as e:
+                print(f"Error leyendo registro de cambios: {e}")
+                return 0
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def prune_changes(self, keep_hours=change_events.KEEP_HOURS):
+        """Borrar del registro los cambios antiguos; devuelve cuántos se borraron"""
+        with self.lock.write():
+            conn = self.get_simple_connection()
+            cursor = conn.cursor()
+            
+            try:
+                deleted = change_events.prune_change_log(cursor, keep_hours)
+                conn.commit()
+                return deleted
+                
+            except Exception as e:
+                print(f"Error depurando registro de cambios: {e}")
+                conn.rollback()
+                return 0
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def search_medical_history(self, text, source='historial_medico', paciente_id=None,
+                               doctor_id=None, limit=medical_search.DEFAULT_LIMIT):
+        """Buscar en historiales médicos por relevancia (FTS5, sin distinguir acentos)
+        
+        ``source`` es 'historial_medico' o 'historiales_medicos'; se puede
+        limitar a un paciente o a los registros de un doctor.
+        """
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                return medical_search.search(cursor, text, source, paciente_id, doctor_id, limit)
+                
+            except Exception as e:
+                print(f"Error buscando en historiales: {e}")
+                return []
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def medical_search_clause(self, text, source='historial_medico', alias='hm', by_patient=False):
+        """Filtro de texto por relevancia para consultas propias sobre un historial (o None)"""
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                return medical_search.search_clause(cursor, text, source, alias, by_patient=by_patient)
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def save_medical_record(self, record_data, record_id=None, source='historial_medico'):
+        """Crear (``record_id`` None) o actualizar un registro de historial_medico o historiales_medicos
+        
+        Devuelve el id del registro o None.
+        """
+        if source not in MEDICAL_RECORD_COLUMNS:
+            print(f"Error guardando historial médico: fuente desconocida {source}")
+            return None
+        values = _pick(record_data, MEDICAL_RECORD_COLUMNS[source])
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                if record_id is None:
+                    cursor.execute(f'''
+                    INSERT INTO {source} ({', '.join(values)})
+                    VALUES ({', '.join('?' * len(values))})
+                    ''', list(values.values()))
+                    record_id = cursor.lastrowid
+                else:
+                    assignments = ", ".join(f"{column} = ?" for column in values)
+                    cursor.execute(f"UPDATE {source} SET {assignments} WHERE id = ?",
+                                   (*values.values(), record_id))
+                    if cursor.rowcount == 0:
+                        conn.rollback()
+                        return None
+                        
+                conn.commit()
+                return record_id
+                
+            except Exception as e:
+                print(f"Error guardando historial médico: {e}")
+                conn.rollback()
+                return None
+            finally:
+                cursor.close()
+                conn.close()
+    
     def get_all_invoices(self):
         """Obtener todas las facturas"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -519,7 +1034,7 @@ class DatabaseManager:
     
     def get_pending_invoices(self):
         """Obtener facturas pendientes"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -546,7 +1061,7 @@ class DatabaseManager:
     
     def create_appointment(self, appointment_data):
         """Crear nueva cita"""
-        with self.lock:
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -554,33 +1069,113 @@ class DatabaseManager:
                 # Crear fecha_hora si viene por separado
                 if 'fecha_cita' in appointment_data and 'hora_cita' in appointment_data:
                     fecha_hora = f"{appointment_data['fecha_cita']} {appointment_data['hora_cita']}"
+                elif 'fecha' in appointment_data and 'hora' in appointment_data:
+                    # Formulario de administración: fecha DD/MM/YYYY
+                    day = parse_day(appointment_data['fecha'])
+                    fecha_hora = f"{day.isoformat()} {appointment_data['hora']}" if day else ''
                 else:
                     fecha_hora = appointment_data.get('fecha_hora', '')
                 
-                cursor.execute('''
-                INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo, estado, notas)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
+                columns = ['paciente_id', 'doctor_id', 'fecha_hora', 'motivo', 'estado', 'notas']
+                values = [
                     appointment_data['paciente_id'], appointment_data['doctor_id'],
                     fecha_hora, appointment_data.get('motivo', ''),
                     appointment_data.get('estado', 'pendiente'),
                     appointment_data.get('observaciones', '')
-                ))
+                ]
+                
+                # Duración sólo si se indicó (si no, queda el valor por defecto de la tabla)
+                duracion = appointment_data.get('duracion_minutos', appointment_data.get('duracion'))
+                if duracion:
+                    columns.append('duracion_minutos')
+                    values.append(int(duracion))
+                
+                cursor.execute(f'''
+                INSERT INTO citas ({', '.join(columns)})
+                VALUES ({', '.join('?' * len(columns))})
+                ''', values)
+                appointment_id = cursor.lastrowid
                 
                 conn.commit()
-                return cursor.lastrowid
                 
             except Exception as e:
                 print(f"Error creando cita: {e}")
                 conn.rollback()
                 return None
+            else:
+                # Ya guardada: un fallo del índice no debe anularla
+                self._sync_schedule(cursor, appointment_id)
+                return appointment_id
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def _sync_schedule(self, cursor, appointment_id):
+        """Actualizar el índice de horarios con el estado actual de una cita (ya guardada)
+        
+        Si falla se descarta el índice entero: se vuelve a leer de la base al consultarlo.
+        """
+        try:
+            cursor.execute('''
+            SELECT doctor_id, fecha_hora, duracion_minutos, estado FROM citas WHERE id = ?
+            ''', (appointment_id,))
+            row = cursor.fetchone()
+            if row is None:
+                self.scheduler.appointment_deleted(appointment_id)
+            else:
+                self.scheduler.appointment_changed(appointment_id, *row)
+        except Exception as e:
+            print(f"Error actualizando índice de horarios: {e}")
+            self.scheduler.invalidate()
+    
+    def find_appointment_conflicts(self, doctor_id, fecha_hora, duracion_minutos=None, exclude_id=None):
+        """IDs de citas activas del doctor que se solapan con el intervalo propuesto
+
+        Se consulta la tabla (no la caché del índice): es la comprobación previa a
+        guardar una reserva. Los errores llegan al llamador; tratarlos como "sin
+        conflicto" dejaría pasar una doble reserva.
+        """
+        with self.lock.read():
+            return self.scheduler.find_conflicts_in_db(doctor_id, fecha_hora, duracion_minutos, exclude_id)
+    
+    def get_available_slots(self, doctor_id, fecha):
+        """Horas libres 'HH:MM' de un doctor en una fecha (memorizadas por día)"""
+        try:
+            return self.availability.free_slots(doctor_id, fecha)
+        except Exception as e:
+            print(f"Error calculando disponibilidad: {e}")
+            return []
+    
+    def save_doctor_schedule(self, doctor_id, ranges):
+        """Reemplazar el horario semanal de un doctor por ``ranges`` [(día, hora_inicio, hora_fin)]"""
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("DELETE FROM doctor_schedules WHERE doctor_id = ?", (doctor_id,))
+                cursor.executemany('''
+                INSERT INTO doctor_schedules (doctor_id, dia_semana, hora_inicio, hora_fin, activo)
+                VALUES (?, ?, ?, ?, 1)
+                ''', [(doctor_id, dia, inicio, fin) for dia, inicio, fin in ranges])
+                
+                conn.commit()
+                
+            except Exception as e:
+                print(f"Error guardando horarios: {e}")
+                conn.rollback()
+                return False
+            else:
+                # El horario semanal cambió: recalcular disponibilidad del doctor
+                self.availability.invalidate_doctor(doctor_id)
+                return True
             finally:
                 cursor.close()
                 conn.close()
     
     def get_appointment_by_id(self, appointment_id):
         """Obtener cita por ID"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -620,7 +1215,7 @@ class DatabaseManager:
     
     def update_appointment(self, appointment_id, appointment_data):
         """Actualizar cita existente"""
-        with self.lock:
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -641,41 +1236,67 @@ class DatabaseManager:
                 ))
                 
                 conn.commit()
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
                 
             except Exception as e:
                 print(f"Error actualizando cita: {e}")
                 conn.rollback()
                 return False
+            else:
+                self._sync_schedule(cursor, appointment_id)
+                return updated
             finally:
                 cursor.close()
                 conn.close()
     
-    def update_appointment_status(self, appointment_id, new_status):
-        """Actualizar solo el estado de la cita"""
-        with self.lock:
+    def _update_appointment_columns(self, appointment_id, values, description):
+        """UPDATE de algunas columnas de una cita (nombres fijos del llamador) y sincronizar el índice"""
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
             try:
-                cursor.execute('''
-                UPDATE citas SET estado = ? WHERE id = ?
-                ''', (new_status, appointment_id))
-                
+                assignments = ", ".join(f"{column} = ?" for column in values)
+                cursor.execute(f"UPDATE citas SET {assignments} WHERE id = ?",
+                               (*values.values(), appointment_id))
+            
                 conn.commit()
-                return cursor.rowcount > 0
-                
+                updated = cursor.rowcount > 0
+            
             except Exception as e:
-                print(f"Error actualizando estado de cita: {e}")
+                print(f"Error {description}: {e}")
                 conn.rollback()
                 return False
+            else:
+                self._sync_schedule(cursor, appointment_id)
+                return updated
             finally:
                 cursor.close()
                 conn.close()
-
+    
+    def update_appointment_status(self, appointment_id, new_status, notes=None):
+        """Actualizar el estado de la cita (y sus notas, si se indican)"""
+        values = {'estado': new_status}
+        if notes:
+            values['notas'] = notes
+        return self._update_appointment_columns(appointment_id, values, "actualizando estado de cita")
+    
+    def update_appointment_notes(self, appointment_id, notes):
+        """Guardar las notas de una cita"""
+        return self._update_appointment_columns(appointment_id, {'notas': notes}, "guardando notas de cita")
+    
+    def reschedule_appointment(self, appointment_id, fecha_hora, motivo=None, notas=None):
+        """Cambiar fecha y hora de una cita (y motivo/notas si se indican)"""
+        values = {'fecha_hora': fecha_hora}
+        if motivo is not None:
+            values['motivo'] = motivo
+        if notas is not None:
+            values['notas'] = notas
+        return self._update_appointment_columns(appointment_id, values, "reprogramando cita")
+    
     def cancel_appointment_with_reason(self, appointment_id, reason):
         """Cancelar cita con motivo específico"""
-        with self.lock:
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -693,38 +1314,44 @@ class DatabaseManager:
                 ''', (reason, reason, appointment_id))
                 
                 conn.commit()
-                return cursor.rowcount > 0
+                updated = cursor.rowcount > 0
                 
             except Exception as e:
                 print(f"Error cancelando cita con motivo: {e}")
                 conn.rollback()
                 return False
+            else:
+                self._sync_schedule(cursor, appointment_id)
+                return updated
             finally:
                 cursor.close()
                 conn.close()
     
     def delete_appointment(self, appointment_id):
         """Eliminar cita"""
-        with self.lock:
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
             try:
                 cursor.execute('DELETE FROM citas WHERE id = ?', (appointment_id,))
                 conn.commit()
-                return cursor.rowcount > 0
+                deleted = cursor.rowcount > 0
                 
             except Exception as e:
                 print(f"Error eliminando cita: {e}")
                 conn.rollback()
                 return False
+            else:
+                self._sync_schedule(cursor, appointment_id)
+                return deleted
             finally:
                 cursor.close()
                 conn.close()
     
     def get_all_patients(self):
         """Obtener todos los pacientes para combobox"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -755,7 +1382,7 @@ class DatabaseManager:
     
     def get_all_doctors(self):
         """Obtener todos los doctores para combobox"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -785,25 +1412,42 @@ class DatabaseManager:
                 conn.close()
     
     def create_invoice(self, invoice_data):
-        """Crear nueva factura"""
-        with self.lock:
+        """Crear nueva factura (devuelve su id)"""
+        record = self.create_invoice_record(invoice_data)
+        return record['id'] if record else None
+    
+    def create_invoice_record(self, invoice_data):
+        """Crear factura con sus líneas; devuelve {'id', 'numero_factura'} o None
+        
+        ``invoice_data`` admite INVOICE_COLUMNS y ``detalles``: líneas
+        {servicio, precio, cantidad} para facturas_detalle (si la tabla existe).
+        """
+        values = _pick(invoice_data, INVOICE_COLUMNS)
+        values['estado'] = values.get('estado') or 'pendiente'
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
             try:
-                cursor.execute('''
-                INSERT INTO facturas (numero_factura, paciente_id, doctor_id, concepto,
-                                    monto, estado, fecha_creacion, fecha_vencimiento)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    invoice_data['numero_factura'], invoice_data['paciente_id'],
-                    invoice_data.get('doctor_id'), invoice_data['concepto'],
-                    invoice_data['monto'], invoice_data.get('estado', 'pendiente'),
-                    invoice_data['fecha_creacion'], invoice_data['fecha_vencimiento']
-                ))
+                # Sin número explícito: asignarlo en la misma transacción del INSERT
+                if not values.get('numero_factura'):
+                    values['numero_factura'] = yearly_invoice_numbers.allocate(cursor)
+                cursor.execute(f'''
+                INSERT INTO facturas ({', '.join(values)})
+                VALUES ({', '.join('?' * len(values))})
+                ''', list(values.values()))
+                invoice_id = cursor.lastrowid
                 
+                details = invoice_data.get('detalles') or []
+                if details and self._table_exists(cursor, 'facturas_detalle'):
+                    cursor.executemany('''
+                    INSERT INTO facturas_detalle (factura_id, servicio, precio, cantidad)
+                    VALUES (?, ?, ?, ?)
+                    ''', [(invoice_id, detail['servicio'], detail.get('precio') or 0, detail.get('cantidad') or 1)
+                          for detail in details])
+                          
                 conn.commit()
-                return cursor.lastrowid
+                return {'id': invoice_id, 'numero_factura': values['numero_factura']}
                 
             except Exception as e:
                 print(f"Error creando factura: {e}")
@@ -813,9 +1457,27 @@ class DatabaseManager:
                 cursor.close()
                 conn.close()
     
+    @staticmethod
+    def _table_exists(cursor, table):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+        return cursor.fetchone() is not None
+    
+    def allocate_invoice_numbers(self, count=1, allocator=None):
+        """Reservar ``count`` números de factura consecutivos (facturación por lotes)"""
+        allocator = allocator or yearly_invoice_numbers
+        with self.lock.write():
+            conn = self.get_connection()
+            try:
+                return allocator.allocate_now(conn, count)
+            except Exception as e:
+                print(f"Error reservando números de factura: {e}")
+                return []
+            finally:
+                conn.close()
+    
     def pay_invoice(self, invoice_id, payment_data):
         """Marcar factura como pagada"""
-        with self.lock:
+        with self.lock.write():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -836,9 +1498,39 @@ class DatabaseManager:
                 cursor.close()
                 conn.close()
     
+    def add_invoice_service(self, invoice_id, servicio, cantidad, precio_unitario):
+        """Añadir un servicio a una factura existente y sumarlo a su monto
+        
+        La línea se guarda en servicios_factura si la tabla existe; el monto se
+        actualiza siempre.
+        """
+        total = cantidad * precio_unitario
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                if self._table_exists(cursor, 'servicios_factura'):
+                    cursor.execute('''
+                    INSERT INTO servicios_factura (factura_id, servicio_nombre, cantidad, precio_unitario, precio_total)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''', (invoice_id, servicio, cantidad, precio_unitario, total))
+                cursor.execute("UPDATE facturas SET monto = monto + ? WHERE id = ?", (total, invoice_id))
+                
+                conn.commit()
+                return cursor.rowcount > 0
+                
+            except Exception as e:
+                print(f"Error añadiendo servicio a factura: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cursor.close()
+                conn.close()
+    
     def get_user_by_id(self, user_id):
         """Obtener usuario por ID"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -869,9 +1561,134 @@ class DatabaseManager:
                 cursor.close()
                 conn.close()
     
+    def save_user(self, user_id, user_data, profile_data=None):
+        """Crear (``user_id`` None) o actualizar un usuario y su fila de doctores/pacientes
+        
+        ``user_data`` admite USER_COLUMNS y ``password`` (se guarda su hash);
+        ``profile_data`` las columnas de PROFILE_TABLES según el tipo de usuario.
+        Devuelve el id del usuario o None.
+        """
+        values = _pick(user_data, USER_COLUMNS)
+        if user_data.get('password'):
+            values['password_hash'] = self.hash_password(user_data['password'])
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                if user_id is None:
+                    cursor.execute(f'''
+                    INSERT INTO usuarios ({', '.join(values)})
+                    VALUES ({', '.join('?' * len(values))})
+                    ''', list(values.values()))
+                    user_id = cursor.lastrowid
+                else:
+                    assignments = "".join(f"{column} = ?, " for column in values)
+                    cursor.execute(f'''
+                    UPDATE usuarios SET {assignments}fecha_actualizacion = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    ''', (*values.values(), user_id))
+                    if cursor.rowcount == 0:
+                        conn.rollback()
+                        return None
+                        
+                if profile_data is not None:
+                    cursor.execute("SELECT tipo_usuario FROM usuarios WHERE id = ?", (user_id,))
+                    table, columns = PROFILE_TABLES.get(cursor.fetchone()[0], (None, ()))
+                    profile = _pick(profile_data, columns)
+                    if table and profile:
+                        updates = ", ".join(f"{column} = excluded.{column}" for column in profile)
+                        cursor.execute(f'''
+                        INSERT INTO {table} (id, {', '.join(profile)})
+                        VALUES (?, {', '.join('?' * len(profile))})
+                        ON CONFLICT(id) DO UPDATE SET {updates}
+                        ''', (user_id, *profile.values()))
+                    elif table:
+                        cursor.execute(f"INSERT OR IGNORE INTO {table} (id) VALUES (?)", (user_id,))
+                        
+                conn.commit()
+                return user_id
+                
+            except Exception as e:
+                print(f"Error guardando usuario: {e}")
+                conn.rollback()
+                return None
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def change_password(self, user_id, new_password, current_password=None):
+        """Cambiar la contraseña; con ``current_password`` sólo si la actual coincide"""
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                if current_password is not None:
+                    cursor.execute("SELECT password_hash FROM usuarios WHERE id = ?", (user_id,))
+                    row = cursor.fetchone()
+                    if row is None or row[0] != self.hash_password(current_password):
+                        return False
+                        
+                cursor.execute('''
+                UPDATE usuarios SET password_hash = ?, fecha_actualizacion = CURRENT_TIMESTAMP
+                WHERE id = ?
+                ''', (self.hash_password(new_password), user_id))
+                
+                conn.commit()
+                return cursor.rowcount > 0
+                
+            except Exception as e:
+                print(f"Error cambiando contraseña: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def set_user_active(self, user_id, active):
+        """Activar o desactivar un usuario"""
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                cursor.execute("UPDATE usuarios SET activo = ? WHERE id = ?", (1 if active else 0, user_id))
+                conn.commit()
+                return cursor.rowcount > 0
+                
+            except Exception as e:
+                print(f"Error cambiando estado de usuario: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def delete_user(self, user_id):
+        """Eliminar un usuario y su fila de doctores/pacientes (sus citas se conservan)"""
+        with self.lock.write():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                for table, _ in PROFILE_TABLES.values():
+                    cursor.execute(f"DELETE FROM {table} WHERE id = ?", (user_id,))
+                cursor.execute("DELETE FROM usuarios WHERE id = ?", (user_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+                
+            except Exception as e:
+                print(f"Error eliminando usuario: {e}")
+                conn.rollback()
+                return False
+            finally:
+                cursor.close()
+                conn.close()
+    
     def get_medical_insurances(self):
         """Obtener seguros médicos"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
@@ -892,23 +1709,15 @@ class DatabaseManager:
     
     def get_monthly_income(self, year, month):
         """Obtener ingresos mensuales"""
-        with self.lock:
+        with self.lock.read():
             conn = self.get_connection()
             cursor = conn.cursor()
             
             try:
-                cursor.execute('''
-                SELECT SUM(monto) as total_ingresos, COUNT(*) as total_facturas
-                FROM facturas
-                WHERE estado = 'pagada' 
-                AND strftime('%Y', fecha_pago) = ? 
-                AND strftime('%m', fecha_pago) = ?
-                ''', (str(year), f"{month:02d}"))
-                
-                result = cursor.fetchone()
+                total_ingresos, total_facturas = dashboard_stats.monthly_income(cursor, year, month)
                 return {
-                    'total_ingresos': result['total_ingresos'] or 0,
-                    'total_facturas': result['total_facturas'] or 0
+                    'total_ingresos': total_ingresos or 0,
+                    'total_facturas': total_facturas or 0
                 }
                 
             except Exception as e:
@@ -917,6 +1726,63 @@ class DatabaseManager:
             finally:
                 cursor.close()
                 conn.close()
+    
+    # ------------------------------------------------------------------
+    # Contadores de paneles (tablas estadisticas_*)
+    # ------------------------------------------------------------------
+    def _read_dashboard_stats(self, reader, *args):
+        with self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                return reader(cursor, *args)
+                
+            except Exception as e:
+                print(f"Error leyendo contadores de paneles: {e}")
+                return {}
+            finally:
+                cursor.close()
+                conn.close()
+    
+    def get_system_counters(self):
+        """Citas de hoy, facturas pendientes e ingresos del mes"""
+        return self._read_dashboard_stats(dashboard_stats.system_stats)
+    
+    def get_doctor_counters(self, doctor_id):
+        """Citas de hoy, pacientes, consultas e ingresos de un doctor"""
+        return self._read_dashboard_stats(dashboard_stats.doctor_stats, doctor_id)
+    
+    def get_secretaria_counters(self):
+        """Citas de hoy, citas programadas y facturas pendientes"""
+        return self._read_dashboard_stats(dashboard_stats.secretaria_stats)
+    
+    def verify_dashboard_stats(self, repair=False):
+        """Comparar los contadores con citas y facturas; con ``repair`` recalcularlos
+        
+        Devuelve {tabla: filas distintas} antes de reparar (None si falla).
+        """
+        with self.lock.write() if repair else self.lock.read():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            try:
+                mismatches = dashboard_stats.verify(cursor)
+                if repair and any(mismatches.values()):
+                    cursor.execute("BEGIN IMMEDIATE")
+                    dashboard_stats.rebuild(cursor)
+                    conn.commit()
+                    print("✅ Contadores de paneles recalculados")
+                return mismatches
+                
+            except Exception as e:
+                print(f"Error verificando contadores de paneles: {e}")
+                if conn.in_transaction:
+                    conn.rollback()
+                return None
+            finally:
+                cursor.close()
+                conn.close()
 
 # Función auxiliar para obtener doctores disponibles (compatible con versión anterior)
 def get_available_doctors_global(db_manager):
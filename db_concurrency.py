@@ -0,0 +1,136 @@
+"""
+Control de concurrencia para la base de datos SQLite de MEDISYNC
+Modos de bloqueo lector/escritor y PRAGMAs de rendimiento (WAL)
+"""
+import threading
+from contextlib import contextmanager
+
+# Modos soportados por DatabaseManager(concurrency=...)
+#   'serialized' -> un único candado para lecturas y escrituras (comportamiento original)
+#   'shared'     -> lecturas en paralelo, escrituras exclusivas (diario rollback)
+#   'wal'        -> WAL: lecturas sin candado, sólo las escrituras se serializan
+CONCURRENCY_MODES = ('serialized', 'shared', 'wal')
+DEFAULT_CONCURRENCY = 'wal'
+
+BUSY_TIMEOUT_MS = 5000
+
+# PRAGMAs aplicados a cada conexión nueva en modo WAL
+WAL_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', BUSY_TIMEOUT_MS),
+    ('cache_size', -16000),          # ~16 MB de caché de páginas
+    ('mmap_size', 268435456),        # 256 MB mapeados en memoria
+    ('temp_store', 'MEMORY'),
+)
+
+DEFAULT_PRAGMAS = (
+    ('busy_timeout', BUSY_TIMEOUT_MS),
+)
+
+
+def configure_connection(conn, mode=DEFAULT_CONCURRENCY):
+    """Aplicar los PRAGMAs del modo de concurrencia a una conexión nueva"""
+    pragmas = WAL_PRAGMAS if mode == 'wal' else DEFAULT_PRAGMAS
+    for name, value in pragmas:
+        conn.execute(f"PRAGMA {name}={value}").fetchall()
+
+
+class ReadWriteLock:
+    """Candado lector/escritor con preferencia de escritores
+
+    Varios lectores pueden entrar a la vez; un escritor espera a que salgan
+    y bloquea lectores nuevos mientras espera, para no quedar relegado.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+
+class DatabaseLock:
+    """Candado de DatabaseManager con secciones de lectura y escritura
+
+    ``with lock.read():`` y ``with lock.write():`` se comportan según el
+    modo. ``with lock:`` sigue funcionando y equivale a una escritura.
+    """
+
+    def __init__(self, mode=DEFAULT_CONCURRENCY):
+        if mode not in CONCURRENCY_MODES:
+            raise ValueError(f"Modo de concurrencia desconocido: {mode!r} "
+                             f"(opciones: {', '.join(CONCURRENCY_MODES)})")
+        self.mode = mode
+        self._mutex = threading.Lock()
+        self._rwlock = ReadWriteLock() if mode == 'shared' else None
+
+    @contextmanager
+    def read(self):
+        """Sección de sólo lectura"""
+        if self.mode == 'wal':
+            # WAL da a cada lector una instantánea consistente: no hace falta candado
+            yield
+        elif self.mode == 'shared':
+            self._rwlock.acquire_read()
+            try:
+                yield
+            finally:
+                self._rwlock.release_read()
+        else:
+            with self._mutex:
+                yield
+
+    @contextmanager
+    def write(self):
+        """Sección de escritura (siempre serializada dentro del proceso)"""
+        if self.mode == 'shared':
+            self._rwlock.acquire_write()
+            try:
+                yield
+            finally:
+                self._rwlock.release_write()
+        else:
+            with self._mutex:
+                yield
+
+    def __enter__(self):
+        if self._rwlock is not None:
+            self._rwlock.acquire_write()
+        else:
+            self._mutex.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._rwlock is not None:
+            self._rwlock.release_write()
+        else:
+            self._mutex.release()
+        return False
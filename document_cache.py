@@ -0,0 +1,417 @@
+"""
+Caché de documentos PDF de MEDISYNC (facturas, historiales y reportes)
+Cada documento se identifica por el hash de las filas con las que se armó
+más la versión de su plantilla: reimprimir sin cambios en los datos es
+buscar el archivo en el índice. El índice (documentos_cache) guarda la
+ruta, el tamaño y el último uso; al superar el tope de tamaño o de
+documentos se borran primero los invalidados y después los menos usados.
+
+Triggers en facturas, facturas_detalle, historiales y usuarios marcan como
+invalidados los documentos que dependen de la fila modificada, aunque la
+escritura venga de otro proceso (p. ej. billing_system_final por separado).
+
+Uso:
+    python document_cache.py [ruta_db]            # estado de la caché
+    python document_cache.py --prune [ruta_db]   # aplicar la política de desalojo
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from db_concurrency import DatabaseLock, configure_connection
+
+CACHE_TABLE = 'documentos_cache'
+SOURCES_TABLE = 'documentos_cache_fuentes'
+TRIGGER_PREFIX = 'doccache'
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 5000
+SQL_BATCH = 500
+
+
+@dataclass(frozen=True)
+class Watch:
+    """Tabla cuyas escrituras invalidan documentos
+
+    ``source`` es la tabla registrada como fuente del documento y ``key`` la
+    columna de ``table`` con el id de esa fuente (``factura_id`` en los
+    servicios de una factura). ``columns`` limita los UPDATE que cuentan.
+    """
+    table: str
+    source: str
+    key: str = 'id'
+    operations: Tuple[str, ...] = ('UPDATE', 'DELETE')
+    columns: Tuple[str, ...] = ()
+
+
+WATCHES = (
+    Watch('facturas', 'facturas'),
+    Watch('facturas_detalle', 'facturas', key='factura_id', operations=('INSERT', 'UPDATE', 'DELETE')),
+    Watch('historiales_medicos', 'historiales_medicos'),
+    Watch('historial_medico', 'historial_medico'),
+    # Sólo los datos que salen impresos: el último acceso o la contraseña no cuentan
+    Watch('usuarios', 'usuarios',
+          columns=('nombre', 'apellido', 'email', 'telefono', 'fecha_nacimiento', 'activo')),
+)
+
+
+def _table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def ensure_document_cache(cursor):
+    """Crear el índice de documentos y los triggers de invalidación"""
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (
+        clave TEXT PRIMARY KEY,
+        tipo TEXT NOT NULL,
+        ruta TEXT NOT NULL UNIQUE,
+        tamano INTEGER NOT NULL DEFAULT 0,
+        creado TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ultimo_uso TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        usos INTEGER NOT NULL DEFAULT 0,
+        invalidado INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    cursor.execute(f'''
+    CREATE TABLE IF NOT EXISTS {SOURCES_TABLE} (
+        clave TEXT NOT NULL,
+        tabla TEXT NOT NULL,
+        registro_id INTEGER NOT NULL,
+        PRIMARY KEY (clave, tabla, registro_id)
+    )
+    ''')
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{SOURCES_TABLE}_registro "
+                   f"ON {SOURCES_TABLE}(tabla, registro_id)")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{CACHE_TABLE}_desalojo "
+                   f"ON {CACHE_TABLE}(invalidado, ultimo_uso)")
+    for watch in WATCHES:
+        existing = _table_columns(cursor, watch.table)
+        if watch.key not in existing:
+            continue
+        columns = [col for col in watch.columns if col in existing]
+        for operation in watch.operations:
+            row = 'NEW' if operation == 'INSERT' else 'OLD'
+            event = operation
+            if operation == 'UPDATE' and columns:
+                event = f"UPDATE OF {', '.join(columns)}"
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{TRIGGER_PREFIX}_{watch.table}_{operation.lower()}
+            AFTER {event} ON {watch.table}
+            BEGIN
+                UPDATE {CACHE_TABLE} SET invalidado = 1
+                WHERE invalidado = 0 AND clave IN (
+                    SELECT clave FROM {SOURCES_TABLE}
+                    WHERE tabla = '{watch.source}' AND registro_id = {row}.{watch.key}
+                );
+            END
+            ''')
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, sqlite3.Row):
+        return dict(value)
+    return str(value)
+
+
+def document_key(kind, template_version, data):
+    """Hash de los datos de un documento y de la versión de su plantilla"""
+    payload = json.dumps({'tipo': kind, 'plantilla': template_version, 'datos': data},
+                         sort_keys=True, default=_json_default, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def safe_filename(text):
+    """Texto apto para un nombre de archivo (sin acentos ni separadores)"""
+    replacements = str.maketrans('áéíóúÁÉÍÓÚñÑüÜ', 'aeiouAEIOUnNuU')
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', str(text).translate(replacements)).strip('_') or 'documento'
+
+
+def default_index_path():
+    """Índice de la estación en modo cliente (junto a la caché de capacidades)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'medisync', 'documentos.db')
+
+
+class LocalIndex:
+    """Capa de datos mínima (candado y conexiones) para un índice en SQLite propio
+
+    En modo cliente los PDFs quedan en el disco de la estación y la base del
+    servicio sólo acepta lecturas: el índice vive en un archivo local. Sin
+    las tablas de datos no hay triggers de invalidación; el hash de la clave
+    ya cambia con los datos y el desalojo LRU borra las versiones viejas.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_index_path()
+        self.lock = DatabaseLock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = self.get_connection()
+        try:
+            ensure_document_cache(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        configure_connection(conn)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+
+class DocumentCache:
+    """Índice de PDFs generados, con desalojo LRU por tamaño y cantidad
+
+    - ``lookup(clave)`` devuelve la ruta si el documento sigue vigente y en
+      disco (y actualiza su último uso), o None.
+    - ``writing(tipo, clave, ruta, fuentes)`` es un contexto que entrega un
+      temporal junto a ``ruta``; al salir sin error lo renombra, lo
+      registra y aplica el tope. ``fuentes`` son pares (tabla, id) cuyas
+      escrituras invalidan el documento.
+    - ``store(...)``/``store_many(...)`` registran archivos ya escritos
+      (p. ej. por el pool de procesos de invoice_pdf_service).
+    """
+
+    def __init__(self, data_layer, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES):
+        self.data_layer = data_layer
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def lookup(self, key) -> Optional[str]:
+        """Ruta del documento ``key`` si está vigente, o None"""
+        return self.lookup_many([key]).get(key)
+
+    def lookup_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Rutas de los documentos vigentes entre ``keys`` (una sola transacción)"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        stale: List[Tuple[str, str, int]] = []
+        with self.data_layer.lock.write():
+            conn = self.data_layer.get_connection()
+            cursor = conn.cursor()
+            try:
+                for offset in range(0, len(keys), SQL_BATCH):
+                    chunk = keys[offset:offset + SQL_BATCH]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor.execute(f"""
+                        SELECT clave, ruta, tamano, invalidado FROM {CACHE_TABLE}
+                        WHERE clave IN ({placeholders})
+                    """, chunk)
+                    for key, path, size, invalidated in cursor.fetchall():
+                        if invalidated or not self._intact(path, size):
+                            # Invalidado o borrado/modificado fuera de MEDISYNC: se vuelve a generar
+                            stale.append((key, path, invalidated))
+                        else:
+                            found[key] = path
+                if stale:
+                    cursor.executemany(f"DELETE FROM {SOURCES_TABLE} WHERE clave = ?", [(row[0],) for row in stale])
+                    cursor.executemany(f"DELETE FROM {CACHE_TABLE} WHERE clave = ?", [(row[0],) for row in stale])
+                if found:
+                    cursor.executemany(f"""
+                        UPDATE {CACHE_TABLE} SET ultimo_uso = CURRENT_TIMESTAMP, usos = usos + 1
+                        WHERE clave = ?
+                    """, [(key,) for key in found])
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Error consultando caché de documentos: {e}")
+                return {}
+            finally:
+                cursor.close()
+                conn.close()
+        self._remove_files(path for _, path, invalidated in stale if invalidated)
+        self.stats['hits'] += len(found)
+        self.stats['misses'] += len(keys) - len(found)
+        return found
+
+    @staticmethod
+    def _intact(path, size):
+        try:
+            return os.path.getsize(path) == size
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    @contextmanager
+    def writing(self, kind, key, path, sources: Iterable[Tuple[str, int]] = ()):
+        """Escribir un documento en un temporal y publicarlo en ``path`` al terminar"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.documento_', suffix='.pdf.tmp')
+        os.close(fd)
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.store(kind, key, path, sources)
+
+    def store(self, kind, key, path, sources: Iterable[Tuple[str, int]] = ()):
+        """Registrar ``path`` como el documento ``key`` y aplicar el tope"""
+        return self.store_many([(kind, key, path, sources)]) == 1
+
+    def store_many(self, documents) -> int:
+        """Registrar varios ``(tipo, clave, ruta, fuentes)`` en una transacción"""
+        rows = []
+        for kind, key, path, sources in documents:
+            try:
+                size = os.path.getsize(path)
+            except OSError as e:
+                print(f"Error registrando documento en caché: {e}")
+                continue
+            sources = {(table, int(record_id)) for table, record_id in sources if record_id is not None}
+            rows.append((kind, key, path, size, sorted(sources)))
+        if not rows:
+            return 0
+        with self.data_layer.lock.write():
+            conn = self.data_layer.get_connection()
+            cursor = conn.cursor()
+            try:
+                for kind, key, path, size, sources in rows:
+                    # La ruta es única: una versión nueva del mismo documento reemplaza a la anterior
+                    cursor.execute(f"DELETE FROM {SOURCES_TABLE} WHERE clave IN "
+                                   f"(SELECT clave FROM {CACHE_TABLE} WHERE ruta = ? OR clave = ?)", (path, key))
+                    cursor.execute(f"DELETE FROM {CACHE_TABLE} WHERE ruta = ? OR clave = ?", (path, key))
+                    cursor.execute(f"""
+                        INSERT INTO {CACHE_TABLE} (clave, tipo, ruta, tamano) VALUES (?, ?, ?, ?)
+                    """, (key, kind, path, size))
+                    cursor.executemany(f"INSERT INTO {SOURCES_TABLE} (clave, tabla, registro_id) VALUES (?, ?, ?)",
+                                       [(key, table, record_id) for table, record_id in sources])
+                evicted = self._evict(cursor)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Error registrando documento en caché: {e}")
+                return 0
+            finally:
+                cursor.close()
+                conn.close()
+        self._remove_files(evicted)
+        self.stats['stores'] += len(rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Desalojo
+    # ------------------------------------------------------------------
+    def _evict(self, cursor) -> List[str]:
+        """Quitar del índice lo que sobra; devuelve las rutas a borrar tras el COMMIT"""
+        cursor.execute(f"SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM {CACHE_TABLE}")
+        count, total = cursor.fetchone()
+        cursor.execute(f"SELECT clave, ruta, tamano, invalidado FROM {CACHE_TABLE} WHERE invalidado = 1")
+        victims = cursor.fetchall()
+        count -= len(victims)
+        total -= sum(row[2] for row in victims)
+        if count > self.max_entries or total > self.max_bytes:
+            cursor.execute(f"""
+                SELECT clave, ruta, tamano, invalidado FROM {CACHE_TABLE}
+                WHERE invalidado = 0 ORDER BY ultimo_uso, creado
+            """)
+            for row in cursor:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                victims.append(row)
+                count -= 1
+                total -= row[2]
+        if not victims:
+            return []
+        cursor.executemany(f"DELETE FROM {SOURCES_TABLE} WHERE clave = ?", [(row[0],) for row in victims])
+        cursor.executemany(f"DELETE FROM {CACHE_TABLE} WHERE clave = ?", [(row[0],) for row in victims])
+        self.stats['evictions'] += len(victims)
+        return [row[1] for row in victims]
+
+    @staticmethod
+    def _remove_files(paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error borrando documento desalojado {path}: {e}")
+
+    def prune(self):
+        """Aplicar la política de desalojo ahora; devuelve cuántos documentos se quitaron"""
+        with self.data_layer.lock.write():
+            conn = self.data_layer.get_connection()
+            cursor = conn.cursor()
+            try:
+                evicted = self._evict(cursor)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"Error depurando caché de documentos: {e}")
+                return 0
+            finally:
+                cursor.close()
+                conn.close()
+        self._remove_files(evicted)
+        return len(evicted)
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Documentos y bytes por tipo (y cuántos están invalidados)"""
+        with self.data_layer.lock.read():
+            conn = self.data_layer.get_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"""
+                    SELECT tipo, COUNT(*), COALESCE(SUM(tamano), 0), COALESCE(SUM(invalidado), 0)
+                    FROM {CACHE_TABLE} GROUP BY tipo ORDER BY tipo
+                """)
+                return {row[0]: {'documentos': row[1], 'bytes': row[2], 'invalidados': row[3]}
+                        for row in cursor.fetchall()}
+            except Exception as e:
+                print(f"Error leyendo caché de documentos: {e}")
+                return {}
+            finally:
+                cursor.close()
+                conn.close()
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    prune = '--prune' in argv
+    if prune:
+        argv.remove('--prune')
+    db_path = argv[0] if argv else "database/medisync.db"
+
+    from database_manager import DatabaseManager
+    cache = DocumentCache(DatabaseManager.shared(db_path))
+    if prune:
+        print(f"🧹 {cache.prune()} documentos desalojados")
+    summary = cache.summary()
+    if not summary:
+        print("📭 Caché de documentos vacía")
+    for kind, info in summary.items():
+        print(f"📄 {kind:<12} {info['documentos']:5d} documentos  {info['bytes'] / 1024:10.1f} KB  "
+              f"{info['invalidados']} invalidados")
+
+
+if __name__ == "__main__":
+    main()
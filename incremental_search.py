@@ -0,0 +1,179 @@
+"""
+Búsqueda incremental para MEDISYNC
+Espera a que el usuario deje de escribir, cancela las consultas superadas y,
+cuando el término nuevo extiende a uno ya consultado, filtra en memoria ese
+resultado en lugar de volver a SQLite
+"""
+import string
+from collections import OrderedDict
+
+DEBOUNCE_MS = 250
+# Resultados más grandes no se guardan para refinar: se muestran paginados
+MAX_NARROW_ROWS = 2000
+MAX_CACHED_TERMS = 32
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+# ----------------------------------------------------------------------
+# Coincidencias (mismas reglas en SQL y en memoria)
+# ----------------------------------------------------------------------
+def like_fold(text):
+    """Minúsculas sólo en ASCII, igual que compara LIKE en SQLite"""
+    return (text or "").translate(_ASCII_LOWER)
+
+
+def like_escape(term):
+    """Escapar comodines de LIKE (usar con ESCAPE '\\')"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def name_prefix_filter(term, nombre='nombre', apellido='apellido', email='email'):
+    """(sql, params) de búsqueda por prefijo de nombre, apellido, email o nombre completo
+
+    Cada rama empieza por una columna con índice NOCASE, así SQLite puede
+    resolverla con rangos de índice (MULTI-INDEX OR) en lugar de recorrer la tabla.
+    """
+    prefix = like_escape(term) + '%'
+    conditions = [f"{nombre} LIKE ? ESCAPE '\\'", f"{apellido} LIKE ? ESCAPE '\\'",
+                  f"{email} LIKE ? ESCAPE '\\'"]
+    params = [prefix, prefix, prefix]
+    if ' ' in term:
+        conditions.append(f"({nombre} LIKE ? ESCAPE '\\' AND ({nombre} || ' ' || {apellido}) LIKE ? ESCAPE '\\')")
+        params.extend([like_escape(term.split(' ', 1)[0]) + '%', prefix])
+    return "(" + " OR ".join(conditions) + ")", params
+
+
+def name_prefix_matches(term, nombre, apellido, email):
+    """Equivalente en memoria de ``name_prefix_filter`` (``term`` ya normalizado)"""
+    nombre, apellido = like_fold(nombre), like_fold(apellido)
+    return (nombre.startswith(term) or apellido.startswith(term)
+            or like_fold(email).startswith(term)
+            or (' ' in term and f"{nombre} {apellido}".startswith(term)))
+
+
+def contains_matches(term, *values):
+    """Equivalente en memoria de ``col LIKE '%term%'`` sobre varias columnas (NULL no coincide)"""
+    return any(term in like_fold(str(value)) for value in values if value is not None)
+
+
+# ----------------------------------------------------------------------
+# Buscador
+# ----------------------------------------------------------------------
+class IncrementalSearch:
+    """Búsqueda mientras se escribe, con espera, cancelación y refinamiento
+
+    ``fetch(término, límite, ámbito)`` corre en segundo plano y devuelve las
+    filas. ``matches(fila, término)`` debe reproducir en memoria el filtro
+    SQL. ``on_results(término, filas)`` se llama en el hilo de Tk; ``filas``
+    es None si el término está vacío o el resultado es demasiado grande
+    para refinarlo (el llamador muestra entonces su vista paginada).
+
+    ``ámbito`` resume los demás filtros (tipo, estado, doctor...); si cambia,
+    los resultados guardados dejan de valer.
+    """
+
+    def __init__(self, widget, tasks, fetch, matches, on_results, key,
+                 delay=DEBOUNCE_MS, max_rows=MAX_NARROW_ROWS, busy=None):
+        self.widget = widget
+        self.tasks = tasks
+        self.fetch = fetch
+        self.matches = matches
+        self.on_results = on_results
+        self.key = key
+        self.delay = delay
+        self.max_rows = max_rows
+        self.busy = busy
+        self.scope = None
+        self._results = OrderedDict()
+        self._after_id = None
+        self.queries = 0
+        self.narrowed = 0
+
+    @staticmethod
+    def normalize(term):
+        return like_fold((term or "").strip())
+
+    def on_input(self, term, scope=None, event=None):
+        """Entrada de un manejador de eventos: teclas con espera, lo demás al momento"""
+        # event.type es un tkinter.EventType; se compara por nombre para no importar tkinter
+        if getattr(getattr(event, 'type', None), 'name', None) == 'KeyRelease':
+            self.schedule(term, scope)
+        else:
+            self.run(term, scope)
+
+    def schedule(self, term, scope=None):
+        """Buscar cuando el usuario deje de escribir ``delay`` ms"""
+        self._cancel_timer()
+        self._after_id = self.widget.after(self.delay, lambda: self.run(term, scope))
+
+    def run(self, term, scope=None):
+        """Buscar ya (botón Buscar, cambio de filtros)"""
+        self._cancel_timer()
+        if scope != self.scope:
+            self.reset()
+            self.scope = scope
+        term = self.normalize(term)
+        if not term:
+            self.tasks.cancel(self.key)
+            self.on_results(term, None)
+            return
+
+        base = self._cached_prefix(term)
+        if base is not None:
+            # Término que extiende a otro ya consultado: filtrar sin ir a la base
+            self.tasks.cancel(self.key)
+            rows = [row for row in base if self.matches(row, term)]
+            self.narrowed += 1
+            self._remember(term, rows)
+            self.on_results(term, rows)
+            return
+
+        def done(rows, scope=scope):
+            if scope != self.scope:
+                return
+            if len(rows) > self.max_rows:
+                self.on_results(term, None)
+            else:
+                self._remember(term, rows)
+                self.on_results(term, rows)
+
+        self.queries += 1
+        self.tasks.submit(self.fetch, term, self.max_rows + 1, scope,
+                          on_done=done, key=self.key, busy=self.busy)
+
+    def reset(self):
+        """Olvidar resultados (datos modificados o filtros distintos)"""
+        self._results.clear()
+
+    def cancel(self):
+        self._cancel_timer()
+        self.tasks.cancel(self.key)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _cancel_timer(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _cached_prefix(self, term):
+        """Resultado guardado del término más largo que es prefijo de ``term``"""
+        best = None
+        for cached in self._results:
+            if term.startswith(cached) and (best is None or len(cached) > len(best)):
+                best = cached
+        if best is None:
+            return None
+        self._results.move_to_end(best)
+        return self._results[best]
+
+    def _remember(self, term, rows):
+        self._results[term] = rows
+        self._results.move_to_end(term)
+        while len(self._results) > MAX_CACHED_TERMS:
+            self._results.popitem(last=False)
@@ -0,0 +1,512 @@
+"""
+Servicio de PDFs de facturas de MEDISYNC
+Renderiza facturas sueltas o por lotes ("reimprimir todas las de marzo").
+Cada proceso prepara una sola vez la hoja de estilos, los TableStyle, las
+fuentes y el encabezado de la clínica; los lotes se reparten en un pool de
+procesos y la base se consulta sólo en el proceso principal, una vez por
+lote. Cada PDF se escribe en un temporal y se renombra (os.replace), así
+que en facturas_pdf/ nunca queda un archivo a medio escribir. Con la caché
+de documentos, una factura sin cambios desde su último PDF no se renderiza.
+"""
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional
+
+from document_cache import document_key
+from optional_deps import registry as capabilities
+
+PDF_DIRECTORY = "facturas_pdf"
+DOCUMENT_KIND = 'factura'
+# Subir al cambiar el diseño del PDF: invalida todas las facturas en caché
+TEMPLATE_VERSION = 1
+CHUNK_SIZE = 8
+MAX_WORKERS = 8
+SQL_BATCH = 500
+
+DEFAULT_CLINIC_CONFIG = {
+    'nombre': 'MEDISYNC - Centro Médico',
+    'direccion': 'Avenida Central, San José, Costa Rica',
+    'telefono': '+506 2000-0000',
+    'email': 'info@medisync.cr'
+}
+
+
+def invoice_filename(numero_factura):
+    """Nombre estable del PDF de una factura (una reimpresión reemplaza al anterior)"""
+    safe = re.sub(r'[^A-Za-z0-9_-]+', '_', str(numero_factura or 'sin_numero')).strip('_')
+    return f"Factura_{safe}.pdf"
+
+
+class InvoiceRenderer:
+    """Arma el PDF de una factura con estilos y encabezado preparados una vez"""
+
+    def __init__(self, clinic_config=None):
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+
+        self.clinic_config = dict(DEFAULT_CLINIC_CONFIG, **(clinic_config or {}))
+        self._doc_class = SimpleDocTemplate
+        self._table = Table
+        self._paragraph = Paragraph
+        self._spacer = Spacer
+        self._image = Image
+        self._pagesize = A4
+        self._inch = inch
+
+        # Métricas de las fuentes usadas: se cargan aquí y no en la primera factura
+        for font in ('Helvetica', 'Helvetica-Bold'):
+            pdfmetrics.getFont(font)
+
+        self.styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self.styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.darkblue
+        )
+        self.header_style = ParagraphStyle(
+            'Header',
+            parent=self.styles['Normal'],
+            fontSize=12,
+            spaceAfter=12,
+            alignment=TA_LEFT
+        )
+        self.info_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ])
+        self.services_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+        self.totals_table_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, -1), (-1, -1), 14),
+            ('TEXTCOLOR', (0, -1), (-1, -1), colors.darkgreen),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('LINEBELOW', (0, -2), (-1, -2), 1, colors.black),
+        ])
+        self._header = self._build_header()
+        self._invoice_title = Paragraph("FACTURA MÉDICA", self.title_style)
+        self._services_title = Paragraph("SERVICIOS PRESTADOS", self.styles['Heading2'])
+        self._thanks = Paragraph("Gracias por confiar en nuestros servicios médicos", self.styles['Normal'])
+
+        self._qrcode = None
+        if capabilities.available('qr'):
+            import qrcode
+            self._qrcode = qrcode
+
+    def _build_header(self):
+        clinic = self.clinic_config
+        return [
+            self._paragraph("🏥 " + clinic.get('nombre', 'MEDISYNC CLINIC'), self.title_style),
+            self._paragraph(f"📍 {clinic.get('direccion', 'Dirección no disponible')}", self.header_style),
+            self._paragraph(f"📞 {clinic.get('telefono', 'Teléfono no disponible')}", self.header_style),
+            self._paragraph(f"✉️ {clinic.get('email', 'Email no disponible')}", self.header_style),
+            self._spacer(1, 20),
+        ]
+
+    def _qr_image(self, invoice_data):
+        qr_text = f"Factura: {invoice_data.get('numero_factura', 'N/A')} - Total: ₡{float(invoice_data.get('monto', 0)):,.2f}"
+        qr = self._qrcode.QRCode(version=1, box_size=3, border=2)
+        qr.add_data(qr_text)
+        qr.make(fit=True)
+        # En memoria: varios procesos no compiten por un mismo archivo temporal
+        buffer = io.BytesIO()
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+        buffer.seek(0)
+        return self._image(buffer, width=1.5*self._inch, height=1.5*self._inch)
+
+    def story(self, invoice_data):
+        """Flowables de una factura (el encabezado de la clínica se reutiliza)"""
+        inch = self._inch
+        Paragraph, Spacer, Table = self._paragraph, self._spacer, self._table
+        story = list(self._header)
+
+        story.append(self._invoice_title)
+        story.append(Paragraph(f"No. {invoice_data.get('numero_factura', 'N/A')}", self.header_style))
+        story.append(Spacer(1, 20))
+
+        info_data = [
+            ['👤 PACIENTE:', invoice_data.get('paciente_nombre') or 'N/A'],
+            ['👨‍⚕️ DOCTOR:', invoice_data.get('doctor_nombre') or 'N/A'],
+            ['📅 FECHA:', invoice_data.get('fecha_creacion') or datetime.now().strftime('%d/%m/%Y')],
+            ['🛡️ SEGURO:', invoice_data.get('seguro_aplicado') or 'Sin seguro'],
+            ['💭 CONCEPTO:', invoice_data.get('concepto') or 'Consulta médica']
+        ]
+        info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+        info_table.setStyle(self.info_table_style)
+        story.append(info_table)
+        story.append(Spacer(1, 30))
+
+        if invoice_data.get('servicios'):
+            story.append(self._services_title)
+            servicios_data = [['Servicio', 'Cantidad', 'Precio Unitario', 'Total']]
+            for servicio in invoice_data['servicios']:
+                precio = float(servicio.get('precio', 0))
+                cantidad = servicio.get('cantidad', 1)
+                servicios_data.append([
+                    servicio.get('nombre', 'Servicio'),
+                    str(cantidad),
+                    f"₡{precio:,.2f}",
+                    f"₡{precio * cantidad:,.2f}"
+                ])
+            servicios_table = Table(servicios_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
+            servicios_table.setStyle(self.services_table_style)
+            story.append(servicios_table)
+            story.append(Spacer(1, 20))
+
+        totales_data = []
+        if invoice_data.get('monto_original'):
+            totales_data.append(['Subtotal:', f"₡{float(invoice_data.get('monto_original', 0)):,.2f}"])
+        if float(invoice_data.get('monto_descuento') or 0) > 0:
+            totales_data.append(['Descuento:', f"-₡{float(invoice_data.get('monto_descuento', 0)):,.2f}"])
+        totales_data.append(['TOTAL A PAGAR:', f"₡{float(invoice_data.get('monto', 0)):,.2f}"])
+
+        if invoice_data.get('monto_pagado'):
+            totales_data.append(['Monto Recibido:', f"₡{float(invoice_data.get('monto_pagado', 0)):,.2f}"])
+            cambio = float(invoice_data.get('monto_pagado', 0)) - float(invoice_data.get('monto', 0))
+            if cambio > 0:
+                totales_data.append(['Cambio:', f"₡{cambio:,.2f}"])
+            elif cambio < 0:
+                totales_data.append(['Faltante:', f"₡{abs(cambio):,.2f}"])
+
+        totales_table = Table(totales_data, colWidths=[4*inch, 2*inch])
+        totales_table.setStyle(self.totals_table_style)
+        story.append(totales_table)
+        story.append(Spacer(1, 30))
+
+        story.append(self._thanks)
+        story.append(Paragraph(f"Generado el {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", self.styles['Normal']))
+
+        if self._qrcode is not None:
+            try:
+                story.append(Spacer(1, 20))
+                story.append(self._qr_image(invoice_data))
+            except Exception as e:
+                print(f"⚠️ No se pudo generar código QR: {e}")
+        return story
+
+    def render(self, invoice_data, output_path):
+        """Escribir el PDF de forma atómica en ``output_path``"""
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.factura_', suffix='.pdf.tmp')
+        os.close(fd)
+        try:
+            doc = self._doc_class(tmp_path, pagesize=self._pagesize)
+            doc.build(self.story(invoice_data))
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return output_path
+
+
+# ----------------------------------------------------------------------
+# Procesos del pool: un renderer por configuración de clínica y proceso
+# ----------------------------------------------------------------------
+_worker_renderers: Dict[tuple, InvoiceRenderer] = {}
+
+
+def _clinic_key(clinic_config):
+    return tuple(sorted((clinic_config or {}).items()))
+
+
+def _renderer_for(clinic_config):
+    key = _clinic_key(clinic_config)
+    renderer = _worker_renderers.get(key)
+    if renderer is None:
+        renderer = _worker_renderers[key] = InvoiceRenderer(clinic_config)
+    return renderer
+
+
+def _warm_worker():
+    # Importa reportlab y prepara estilos al arrancar el proceso, no con la primera factura
+    _renderer_for(None)
+
+
+def _render_chunk(clinic_config, jobs):
+    renderer = _renderer_for(clinic_config)
+    results = []
+    for invoice_data, output_path in jobs:
+        try:
+            results.append((invoice_data['id'], renderer.render(invoice_data, output_path), None))
+        except Exception as e:
+            results.append((invoice_data['id'], None, str(e)))
+    return results
+
+
+@dataclass
+class BatchResult:
+    """Resultado de un lote: rutas escritas y errores por ID de factura"""
+    total: int = 0
+    written: Dict[int, str] = field(default_factory=dict)
+    failed: Dict[int, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    cancelled: bool = False
+    cached: int = 0
+
+    @property
+    def per_minute(self):
+        return len(self.written) / self.elapsed * 60 if self.elapsed else 0.0
+
+
+class InvoicePDFService:
+    """PDFs de facturas leídas de la base de MEDISYNC
+
+    ``render_invoice(id)`` genera una en este proceso; ``render_batch(ids,
+    progress=...)`` reparte un lote en un pool de procesos (``spawn``: los
+    hijos no heredan Tk ni los hilos de la app) que se crea la primera vez
+    y se reutiliza hasta ``shutdown()``. ``progress(hechas, total)`` se
+    llama en el hilo que ejecuta el lote.
+
+    Con ``cache`` (document_cache.DocumentCache) una factura cuyos datos no
+    cambiaron desde el último PDF no se vuelve a renderizar.
+    """
+
+    def __init__(self, data_layer, output_dir=PDF_DIRECTORY, clinic_config=None,
+                 workers=None, chunk_size=CHUNK_SIZE, cache=None):
+        self.data_layer = data_layer
+        self.cache = cache
+        self.output_dir = output_dir
+        self.clinic_config = dict(DEFAULT_CLINIC_CONFIG, **(clinic_config or {}))
+        self.workers = workers or min(os.cpu_count() or 1, MAX_WORKERS)
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._renderer: Optional[InvoiceRenderer] = None
+
+    @staticmethod
+    def available():
+        return capabilities.available('pdf')
+
+    # ------------------------------------------------------------------
+    # Datos
+    # ------------------------------------------------------------------
+    def invoice_ids_for_month(self, year, month):
+        """IDs de las facturas creadas en un mes"""
+        start = date(year, month, 1)
+        end = date(year + (month == 12), month % 12 + 1, 1)
+        with self.data_layer.lock.read():
+            conn = self.data_layer.get_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    SELECT id FROM facturas
+                    WHERE fecha_creacion >= ? AND fecha_creacion < ?
+                    ORDER BY fecha_creacion, id
+                """, (start.isoformat(), end.isoformat()))
+                return [row[0] for row in cursor.fetchall()]
+            except Exception as e:
+                print(f"Error obteniendo facturas del mes: {e}")
+                return []
+            finally:
+                cursor.close()
+                conn.close()
+
+    def load_invoices(self, invoice_ids) -> List[dict]:
+        """Datos para el PDF de cada factura (con sus servicios), en el orden pedido"""
+        invoice_ids = list(invoice_ids)
+        invoices: Dict[int, dict] = {}
+        with self.data_layer.lock.read():
+            conn = self.data_layer.get_connection()
+            cursor = conn.cursor()
+            try:
+                # facturas_detalle no existe en bases creadas sólo con el esquema base
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'facturas_detalle'")
+                has_details = cursor.fetchone() is not None
+                for offset in range(0, len(invoice_ids), SQL_BATCH):
+                    chunk = invoice_ids[offset:offset + SQL_BATCH]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    cursor.execute(f"""
+                        SELECT f.id, f.numero_factura, f.concepto, f.monto, f.monto_original,
+                               f.monto_descuento, f.estado, f.fecha_creacion, f.seguro_aplicado,
+                               p.nombre || ' ' || p.apellido AS paciente_nombre,
+                               d.nombre || ' ' || d.apellido AS doctor_nombre
+                        FROM facturas f
+                        LEFT JOIN usuarios p ON f.paciente_id = p.id
+                        LEFT JOIN usuarios d ON f.doctor_id = d.id
+                        WHERE f.id IN ({placeholders})
+                    """, chunk)
+                    for row in cursor.fetchall():
+                        invoice = dict(row)
+                        invoice['servicios'] = []
+                        invoices[invoice['id']] = invoice
+                    if not has_details:
+                        continue
+                    cursor.execute(f"""
+                        SELECT factura_id, servicio, precio, cantidad
+                        FROM facturas_detalle
+                        WHERE factura_id IN ({placeholders})
+                        ORDER BY id
+                    """, chunk)
+                    for row in cursor.fetchall():
+                        invoices[row[0]]['servicios'].append(
+                            {'nombre': row[1], 'precio': row[2], 'cantidad': row[3] or 1}
+                        )
+            except Exception as e:
+                print(f"Error cargando facturas para PDF: {e}")
+            finally:
+                cursor.close()
+                conn.close()
+        return [invoices[invoice_id] for invoice_id in invoice_ids if invoice_id in invoices]
+
+    def output_path(self, invoice_data):
+        return os.path.join(self.output_dir, invoice_filename(invoice_data.get('numero_factura')))
+
+    # ------------------------------------------------------------------
+    # Render
+    # ------------------------------------------------------------------
+    def renderer(self):
+        """Renderer de este proceso (estilos preparados la primera vez)"""
+        if self._renderer is None or self._renderer.clinic_config != self.clinic_config:
+            self._renderer = InvoiceRenderer(self.clinic_config)
+        return self._renderer
+
+    def document_key(self, invoice_data):
+        """Clave de caché: datos de la factura, clínica y versión de la plantilla"""
+        return document_key(DOCUMENT_KIND, TEMPLATE_VERSION,
+                            {'factura': invoice_data, 'clinica': self.clinic_config})
+
+    def render_invoice(self, invoice_id, output_path=None):
+        """PDF de una factura (de la caché o generado en este proceso); devuelve la ruta o None"""
+        invoices = self.load_invoices([invoice_id])
+        if not invoices:
+            return None
+        invoice = invoices[0]
+        if self.cache is None or output_path is not None:
+            return self.renderer().render(invoice, output_path or self.output_path(invoice))
+        key = self.document_key(invoice)
+        path = self.cache.lookup(key)
+        if path is None:
+            path = self.renderer().render(invoice, self.output_path(invoice))
+            self.cache.store(DOCUMENT_KIND, key, path, [('facturas', invoice['id'])])
+        return path
+
+    def render_batch(self, invoice_ids, progress: Optional[Callable] = None,
+                     cancel: Optional[threading.Event] = None) -> BatchResult:
+        """Generar los PDFs de ``invoice_ids`` en paralelo"""
+        started = time.perf_counter()
+        invoice_ids = list(dict.fromkeys(invoice_ids))
+        invoices = self.load_invoices(invoice_ids)
+        result = BatchResult(total=len(invoices))
+        missing = set(invoice_ids) - {invoice['id'] for invoice in invoices}
+        for invoice_id in missing:
+            result.failed[invoice_id] = "Factura no encontrada"
+        os.makedirs(self.output_dir, exist_ok=True)
+        keys = {}
+        if self.cache is not None:
+            # Reimpresión sin cambios: el PDF ya está en disco
+            keys = {invoice['id']: self.document_key(invoice) for invoice in invoices}
+            hits = self.cache.lookup_many(keys.values())
+            for invoice_id, key in keys.items():
+                if key in hits:
+                    result.written[invoice_id] = hits[key]
+            result.cached = len(result.written)
+            invoices = [invoice for invoice in invoices if invoice['id'] not in result.written]
+            if result.cached and progress is not None:
+                progress(result.cached, result.total)
+        jobs = [(invoice, self.output_path(invoice)) for invoice in invoices]
+
+        def collect(chunk_results):
+            rendered = []
+            for invoice_id, path, error in chunk_results:
+                if error is None:
+                    result.written[invoice_id] = path
+                    if invoice_id in keys:
+                        rendered.append((DOCUMENT_KIND, keys[invoice_id], path, [('facturas', invoice_id)]))
+                else:
+                    result.failed[invoice_id] = error
+            if rendered:
+                self.cache.store_many(rendered)
+            if progress is not None:
+                progress(len(result.written) + len(result.failed) - len(missing), result.total)
+
+        if self.workers <= 1 or len(jobs) <= self.chunk_size:
+            # Lote pequeño o un solo núcleo: arrancar procesos cuesta más que renderizar aquí
+            renderer = self.renderer()
+            for invoice, path in jobs:
+                if cancel is not None and cancel.is_set():
+                    result.cancelled = True
+                    break
+                try:
+                    collect([(invoice['id'], renderer.render(invoice, path), None)])
+                except Exception as e:
+                    collect([(invoice['id'], None, str(e))])
+        else:
+            executor = self._get_executor()
+            broken = False
+            futures = {}
+            for offset in range(0, len(jobs), self.chunk_size):
+                if cancel is not None and cancel.is_set():
+                    result.cancelled = True
+                    break
+                chunk = jobs[offset:offset + self.chunk_size]
+                futures[executor.submit(_render_chunk, self.clinic_config, chunk)] = chunk
+            for future in as_completed(futures):
+                if cancel is not None and cancel.is_set() and not result.cancelled:
+                    result.cancelled = True
+                    for pending in futures:
+                        pending.cancel()
+                if future.cancelled():
+                    continue
+                try:
+                    collect(future.result())
+                except Exception as e:
+                    # El proceso murió o no pudo arrancar: todo el bloque cuenta como fallido
+                    print(f"Error en proceso de PDFs: {e}")
+                    collect([(invoice['id'], None, str(e)) for invoice, _ in futures[future]])
+                    if isinstance(e, BrokenProcessPool):
+                        broken = True
+            if broken:
+                # Un pool roto no acepta más trabajo: el próximo lote crea otro
+                self.shutdown()
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def shutdown(self):
+        """Cerrar el pool de procesos (se vuelve a crear si hace falta)"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
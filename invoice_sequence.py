@@ -0,0 +1,153 @@
+"""
+Secuencia de números de factura para MEDISYNC
+Contador por prefijo en la tabla secuencias_factura, incrementado dentro de
+la misma transacción que el INSERT de la factura
+"""
+from datetime import datetime
+from typing import List, Optional
+
+DEFAULT_PREFIX = 'FAC'
+DEFAULT_WIDTH = 4
+
+# Periodos de numeración: la clave del contador cambia con cada periodo
+#   'year' -> FAC-2025-0001
+#   'day'  -> FAC-2025-0725-0001
+#   None   -> FAC-0001 (secuencia continua)
+PERIOD_FORMATS = {
+    'year': '%Y',
+    'day': '%Y-%m%d',
+    None: None,
+}
+
+
+class InvoiceNumberError(RuntimeError):
+    """No se pudo reservar un número de factura (nunca se inventa uno)"""
+
+
+def ensure_sequence_table(cursor):
+    """Crear la tabla de contadores si no existe"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS secuencias_factura (
+        clave TEXT PRIMARY KEY,
+        ultimo INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+
+
+class InvoiceNumberAllocator:
+    """Asignador atómico de números de factura ``{prefijo}-{periodo}-{NNNN}``
+
+    ``allocate(cursor)`` y ``reserve_block(cursor, n)`` trabajan dentro de la
+    transacción del llamador: si no hay una abierta se abre con
+    ``BEGIN IMMEDIATE``, de modo que el contador queda bloqueado hasta el
+    COMMIT del INSERT de la factura. Dos cajas no pueden obtener el mismo
+    número y un ROLLBACK devuelve el número (no quedan huecos).
+
+    La primera vez que se usa una clave el contador se inicializa con el
+    mayor número con ese formato que ya exista en ``facturas``.
+    """
+
+    def __init__(self, prefix=DEFAULT_PREFIX, period='year', width=DEFAULT_WIDTH):
+        if period not in PERIOD_FORMATS:
+            raise ValueError(f"Periodo de numeración desconocido: {period!r} "
+                             f"(opciones: 'year', 'day', None)")
+        self.prefix = prefix
+        self.period = period
+        self.width = width
+
+    def key_for(self, when: Optional[datetime] = None) -> str:
+        """Clave del contador (y prefijo del número) para una fecha"""
+        fmt = PERIOD_FORMATS[self.period]
+        if fmt is None:
+            return self.prefix
+        return f"{self.prefix}-{(when or datetime.now()).strftime(fmt)}"
+
+    def format(self, key, sequence) -> str:
+        return f"{key}-{sequence:0{self.width}d}"
+
+    # ------------------------------------------------------------------
+    # Asignación
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _begin(cursor):
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
+    @staticmethod
+    def _seed(cursor, key):
+        """Inicializar el contador desde las facturas existentes (sólo la primera vez)"""
+        cursor.execute("SELECT 1 FROM secuencias_factura WHERE clave = ?", (key,))
+        if cursor.fetchone():
+            return
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'facturas'")
+        if cursor.fetchone():
+            # Sólo números exactamente "{clave}-<dígitos>"
+            start = len(key) + 2
+            cursor.execute('''
+            INSERT OR IGNORE INTO secuencias_factura (clave, ultimo)
+            SELECT ?, COALESCE(MAX(CAST(SUBSTR(numero_factura, ?) AS INTEGER)), 0)
+            FROM facturas
+            WHERE numero_factura LIKE ? ESCAPE '\\'
+              AND LENGTH(numero_factura) >= ?
+              AND SUBSTR(numero_factura, ?) NOT GLOB '*[^0-9]*'
+            ''', (key, start, key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '-%',
+                  start, start))
+        else:
+            cursor.execute("INSERT OR IGNORE INTO secuencias_factura (clave, ultimo) VALUES (?, 0)", (key,))
+
+    def reserve_block(self, cursor, count, when=None) -> List[str]:
+        """Reservar ``count`` números consecutivos en la transacción del cursor"""
+        if count < 1:
+            return []
+        key = self.key_for(when)
+        self._begin(cursor)
+        ensure_sequence_table(cursor)
+        self._seed(cursor, key)
+        cursor.execute(
+            "UPDATE secuencias_factura SET ultimo = ultimo + ? WHERE clave = ?",
+            (count, key)
+        )
+        cursor.execute("SELECT ultimo FROM secuencias_factura WHERE clave = ?", (key,))
+        last = cursor.fetchone()[0]
+        return [self.format(key, n) for n in range(last - count + 1, last + 1)]
+
+    def allocate(self, cursor, when=None) -> str:
+        """Siguiente número, en la transacción del cursor (confirmar junto con la factura)"""
+        return self.reserve_block(cursor, 1, when)[0]
+
+    # ------------------------------------------------------------------
+    # Uso independiente (sin INSERT en la misma transacción)
+    # ------------------------------------------------------------------
+    def allocate_now(self, conn, count=1, when=None) -> List[str]:
+        """Reservar y confirmar ``count`` números en su propia transacción
+
+        Para quien necesita el número antes de tener la factura (vista
+        previa, lotes): los números reservados así no se devuelven.
+        """
+        cursor = conn.cursor()
+        try:
+            numbers = self.reserve_block(cursor, count, when)
+            conn.commit()
+            return numbers
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+# Numeración estándar de facturas: FAC-YYYY-NNNN
+yearly_invoice_numbers = InvoiceNumberAllocator(DEFAULT_PREFIX, 'year')
+
+
+def allocate_invoice_number(db_manager) -> str:
+    """Un número confirmado con ``db_manager.allocate_invoice_numbers``
+
+    Los gestores devuelven ``[]`` si falla la reserva; aquí se convierte en
+    ``InvoiceNumberError`` para que la factura no se emita con un número
+    improvisado que podría repetirse.
+    """
+    numbers = db_manager.allocate_invoice_numbers(1)
+    if not numbers:
+        raise InvoiceNumberError("No se pudo asignar el número de factura")
+    return numbers[0]
@@ -0,0 +1,234 @@
+"""
+Búsqueda de texto en historiales médicos para MEDISYNC
+Índices FTS5 (contenido externo, sincronizados por triggers) sobre
+historial_medico e historiales_medicos, con tokenizador sin acentos y
+resultados ordenados por relevancia (bm25). Si SQLite no tiene FTS5 se
+recurre a LIKE.
+"""
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from incremental_search import like_escape
+
+# unicode61 sin diacríticos: "diabetes", "Diabetes" y "diabétes" son el mismo término
+TOKENIZER = "unicode61 remove_diacritics 2"
+# Índices de prefijo para búsquedas mientras se escribe ("diab*")
+PREFIX_INDEX = "2 3 4"
+DEFAULT_LIMIT = 100
+# Vocales acentuadas del español para la búsqueda con LIKE (LIKE ya ignora mayúsculas ASCII)
+_ACCENT_FOLD = (("á", "a"), ("é", "e"), ("í", "i"), ("ó", "o"), ("ú", "u"), ("ü", "u"), ("ñ", "n"),
+                ("Á", "A"), ("É", "E"), ("Í", "I"), ("Ó", "O"), ("Ú", "U"), ("Ü", "U"), ("Ñ", "N"))
+
+
+@dataclass
+class FtsSource:
+    """Tabla de historial indexada: columnas y peso de cada una en el ranking"""
+    table: str
+    columns: Tuple[str, ...]
+    weights: Tuple[float, ...]
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_fts"
+
+
+SOURCES: Dict[str, FtsSource] = {
+    'historial_medico': FtsSource(
+        'historial_medico',
+        ('diagnostico', 'tratamiento', 'observaciones', 'medicamentos', 'motivo_consulta', 'sintomas'),
+        (10.0, 4.0, 1.0, 3.0, 2.0, 2.0)
+    ),
+    'historiales_medicos': FtsSource(
+        'historiales_medicos',
+        ('diagnostico', 'tratamiento', 'observaciones', 'medicamentos'),
+        (10.0, 4.0, 1.0, 3.0)
+    ),
+}
+
+
+@dataclass
+class SearchClause:
+    """Fragmentos SQL para filtrar y ordenar por relevancia una consulta sobre ``alias``"""
+    join: str
+    where: str
+    params: List
+    order_by: str
+
+
+# ----------------------------------------------------------------------
+# Esquema
+# ----------------------------------------------------------------------
+def fts5_available(cursor):
+    cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+    return bool(cursor.fetchone()[0])
+
+
+def fts_exists(cursor, source):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (source.fts_table,))
+    return cursor.fetchone() is not None
+
+
+def ensure_fts(cursor, sources=None):
+    """Crear tablas FTS5 y triggers de sincronización; devuelve las tablas indexadas ahora
+
+    Idempotente. Las tablas nuevas se llenan con 'rebuild' desde su tabla origen.
+    """
+    if not fts5_available(cursor):
+        print("⚠️ SQLite sin FTS5: la búsqueda en historiales usará LIKE")
+        return []
+
+    created = []
+    for source in (sources or SOURCES.values()):
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (source.table,))
+        if cursor.fetchone() is None:
+            continue
+        is_new = not fts_exists(cursor, source)
+        columns = ", ".join(source.columns)
+        new_values = ", ".join(f"new.{col}" for col in source.columns)
+        old_values = ", ".join(f"old.{col}" for col in source.columns)
+        fts = source.fts_table
+
+        cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {columns},
+            content='{source.table}', content_rowid='id',
+            tokenize="{TOKENIZER}", prefix='{PREFIX_INDEX}'
+        )
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {source.table}
+        BEGIN
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {source.table}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+        ''')
+        # Sólo cuando cambia texto indexado (no al cambiar estado o fechas)
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF id, {columns} ON {source.table}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        ''')
+        if is_new:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            created.append(fts)
+    return created
+
+
+# ----------------------------------------------------------------------
+# Consultas
+# ----------------------------------------------------------------------
+def search_terms(text):
+    """Palabras de la búsqueda (sin la sintaxis de FTS5)"""
+    return re.findall(r"\w+", text or "")
+
+
+def fold_accents(text):
+    """Quitar acentos como el tokenizador (``diabétes`` -> ``diabetes``)"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _fold_sql(expression):
+    """``expression`` sin acentos en SQL (REPLACE anidados)"""
+    for accented, plain in _ACCENT_FOLD:
+        expression = f"REPLACE({expression}, '{accented}', '{plain}')"
+    return expression
+
+
+def match_expression(text):
+    """Expresión MATCH: todas las palabras, cada una como prefijo ("diab"* "tipo"*)"""
+    terms = search_terms(text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_clause(cursor, text, source='historial_medico', alias='hm', use_fts=None,
+                  by_patient=False) -> Optional[SearchClause]:
+    """Filtro y orden por relevancia para ``FROM {tabla} {alias}``; None si no hay palabras
+
+    Con FTS5 ordena por bm25. ``by_patient`` indica que la consulta ya filtra
+    por ``{alias}.paciente_id``: esos pocos registros se filtran con LIKE sin
+    acentos, porque MATCH leería la lista completa de cada término del índice
+    aunque sólo haga falta comprobar unas decenas de filas. Sin FTS5 también
+    se usa LIKE; en ambos casos el orden es por fecha.
+    """
+    source = SOURCES[source]
+    terms = search_terms(text)
+    if not terms:
+        return None
+    if use_fts is None:
+        use_fts = not by_patient and fts_exists(cursor, source)
+
+    if use_fts:
+        fts = source.fts_table
+        weights = ", ".join(str(weight) for weight in source.weights)
+        return SearchClause(
+            join=f"JOIN {fts} ON {fts}.rowid = {alias}.id",
+            where=f"{fts} MATCH ?",
+            params=[match_expression(text)],
+            order_by=f"bm25({fts}, {weights}), {alias}.fecha_consulta DESC",
+        )
+
+    conditions, params = [], []
+    for term in terms:
+        pattern = f"%{like_escape(fold_accents(term))}%"
+        conditions.append("(" + " OR ".join(f"{_fold_sql(f'{alias}.{col}')} LIKE ? ESCAPE '\\'"
+                                            for col in source.columns) + ")")
+        params.extend([pattern] * len(source.columns))
+    return SearchClause(join="", where=" AND ".join(conditions), params=params,
+                        order_by=f"{alias}.fecha_consulta DESC")
+
+
+def search(cursor, text, source='historial_medico', paciente_id=None, doctor_id=None,
+           limit=DEFAULT_LIMIT) -> List[Dict]:
+    """Registros de historial que contienen todas las palabras, los más relevantes primero
+
+    Cada fila trae id, paciente_id, doctor_id, fecha_consulta, diagnostico,
+    tratamiento, observaciones, paciente_nombre, doctor_nombre y fragmento
+    (texto con las coincidencias entre [ ]).
+    """
+    clause = search_clause(cursor, text, source, by_patient=paciente_id is not None)
+    if clause is None:
+        return []
+    fts_source = SOURCES[source]
+    if clause.join:
+        fragment = f"snippet({fts_source.fts_table}, -1, '[', ']', '…', 12)"
+    else:
+        fragment = "hm.diagnostico"
+
+    where = [clause.where]
+    params = list(clause.params)
+    if paciente_id is not None:
+        where.append("hm.paciente_id = ?")
+        params.append(paciente_id)
+    if doctor_id is not None:
+        where.append("hm.doctor_id = ?")
+        params.append(doctor_id)
+    params.append(limit)
+
+    cursor.execute(f'''
+    SELECT hm.id, hm.paciente_id, hm.doctor_id, hm.fecha_consulta,
+           hm.diagnostico, hm.tratamiento, hm.observaciones,
+           p.nombre || ' ' || p.apellido as paciente_nombre,
+           d.nombre || ' ' || d.apellido as doctor_nombre,
+           {fragment} as fragmento
+    FROM {fts_source.table} hm
+    {clause.join}
+    LEFT JOIN usuarios p ON p.id = hm.paciente_id
+    LEFT JOIN usuarios d ON d.id = hm.doctor_id
+    WHERE {" AND ".join(where)}
+    ORDER BY {clause.order_by}
+    LIMIT ?
+    ''', params)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
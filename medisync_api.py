@@ -0,0 +1,271 @@
+"""
+Servicio HTTP de MEDISYNC para clínicas con varias estaciones de trabajo
+Un único proceso abre la base de datos y atiende a todas las estaciones con
+una API JSON: citas, pacientes, facturas, reportes y paneles (ver
+clinic_service). Las estaciones ejecutan MEDISYNC.py en modo cliente y ya
+no comparten el archivo SQLite ni sus bloqueos.
+
+Las rutas son funciones síncronas: FastAPI las ejecuta en su pool de hilos,
+así las consultas SQLite no bloquean el bucle asíncrono del servidor.
+Debe ejecutarse con un solo proceso (un único escritor de la base).
+
+Uso:
+    pip install "fastapi>=0.103" "uvicorn>=0.23"        (extra opcional "api")
+    python medisync_api.py [--db database/medisync.db] [--host 127.0.0.1] [--port 8765]
+
+En cada estación:
+    MEDISYNC_API_URL=http://servidor:8765 python MEDISYNC.py
+
+Sin TLS ni más autenticación que el usuario de MEDISYNC: escuchar sólo en la
+red local de la clínica (--host 0.0.0.0) o detrás de un proxy con HTTPS.
+"""
+import argparse
+import sys
+from typing import Any, List, Optional
+
+from clinic_service import ClinicService, ServiceError
+from optional_deps import registry
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+def create_app(service: ClinicService):
+    """Aplicación FastAPI sobre ``service`` (fastapi se importa aquí: es opcional)"""
+    from fastapi import Body, Depends, FastAPI, Header, Request
+    from fastapi.responses import JSONResponse
+    from pydantic import BaseModel
+
+    class LoginRequest(BaseModel):
+        email: str
+        password: str
+
+    class SqlRequest(BaseModel):
+        sql: str
+        params: Any = None
+
+    app = FastAPI(title="MEDISYNC", version="1.0.0",
+                  description="API de citas, pacientes, facturas y reportes de MEDISYNC")
+
+    @app.exception_handler(ServiceError)
+    def service_error(request: Request, exc: ServiceError):
+        return JSONResponse(status_code=exc.status, content={'detail': exc.message})
+
+    def token(authorization: Optional[str] = Header(None)):
+        scheme, _, value = (authorization or '').partition(' ')
+        return value.strip() if scheme.lower() == 'bearer' else ''
+
+    def session(value: str = Depends(token)):
+        return service.session(value)
+
+    # Sesiones y estado
+    @app.get("/salud")
+    def health():
+        return service.health()
+
+    @app.post("/sesiones")
+    def login(data: LoginRequest):
+        return service.login(data.email, data.password)
+
+    @app.delete("/sesiones")
+    def logout(value: str = Depends(token)):
+        return service.logout(value)
+
+    @app.get("/versiones")
+    def versions(s=Depends(session)):
+        return service.versions(s)
+
+    @app.get("/cambios")
+    def changes(despues: int = 0, limite: int = 500, s=Depends(session)):
+        return service.changes(s, despues, limite)
+
+    @app.get("/cambios/ultimo")
+    def last_change(s=Depends(session)):
+        return service.last_change(s)
+
+    # Usuarios, pacientes, doctores y seguros
+    @app.get("/usuarios/{user_id}")
+    def user(user_id: int, s=Depends(session)):
+        return service.user(s, user_id)
+
+    @app.post("/usuarios")
+    def create_user(data: dict = Body(...), s=Depends(session)):
+        return service.create_user(s, data)
+
+    @app.put("/usuarios/{user_id}")
+    def update_user(user_id: int, data: dict = Body(...), s=Depends(session)):
+        return service.update_user(s, user_id, data)
+
+    @app.put("/usuarios/{user_id}/password")
+    def change_password(user_id: int, nueva: str = Body(..., embed=True),
+                        actual: Optional[str] = Body(None, embed=True), s=Depends(session)):
+        return service.change_password(s, user_id, nueva, actual)
+
+    @app.put("/usuarios/{user_id}/activo")
+    def set_user_active(user_id: int, activo: bool = Body(..., embed=True), s=Depends(session)):
+        return service.set_user_active(s, user_id, activo)
+
+    @app.delete("/usuarios/{user_id}")
+    def delete_user(user_id: int, s=Depends(session)):
+        return service.delete_user(s, user_id)
+
+    @app.get("/pacientes")
+    def patients(s=Depends(session)):
+        return service.patients(s)
+
+    @app.get("/doctores")
+    def doctors(s=Depends(session)):
+        return service.doctors(s)
+
+    @app.get("/doctores/{doctor_id}/horas-libres")
+    def free_slots(doctor_id: int, fecha: str, s=Depends(session)):
+        return service.free_slots(s, doctor_id, fecha)
+
+    @app.put("/doctores/{doctor_id}/horario")
+    def save_doctor_schedule(doctor_id: int, horario: List[List[str]] = Body(..., embed=True),
+                             s=Depends(session)):
+        return service.save_doctor_schedule(s, doctor_id, horario)
+
+    @app.get("/seguros")
+    def insurances(s=Depends(session)):
+        return service.insurances(s)
+
+    # Citas
+    def appointment_filters(texto: str = "", estado: Optional[str] = None,
+                            fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                            doctor_id: Optional[int] = None, paciente_id: Optional[int] = None):
+        return {'texto': texto, 'estado': estado, 'fecha_desde': fecha_desde, 'fecha_hasta': fecha_hasta,
+                'doctor_id': doctor_id, 'paciente_id': paciente_id}
+
+    @app.get("/citas")
+    def appointments(filters=Depends(appointment_filters), despues_fecha: Optional[str] = None,
+                     despues_id: Optional[int] = None, limite: int = 100, s=Depends(session)):
+        after = (despues_fecha, despues_id) if despues_fecha is not None and despues_id is not None else None
+        return service.appointments(s, filters, after, limite)
+
+    @app.get("/citas/total")
+    def count_appointments(filters=Depends(appointment_filters), limite: Optional[int] = None,
+                           s=Depends(session)):
+        return service.count_appointments(s, filters, limite)
+
+    @app.get("/citas/conflictos")
+    def appointment_conflicts(doctor_id: int, fecha_hora: str, duracion: Optional[int] = None,
+                              excluir: Optional[int] = None, s=Depends(session)):
+        return service.appointment_conflicts(s, doctor_id, fecha_hora, duracion, excluir)
+
+    @app.get("/citas/{appointment_id}/fila")
+    def appointment_row(appointment_id: int, filters=Depends(appointment_filters), s=Depends(session)):
+        return service.appointment_row(s, appointment_id, filters)
+
+    @app.get("/citas/{appointment_id}")
+    def appointment(appointment_id: int, s=Depends(session)):
+        return service.appointment(s, appointment_id)
+
+    @app.post("/citas")
+    def create_appointment(data: dict = Body(...), s=Depends(session)):
+        return service.create_appointment(s, data)
+
+    @app.put("/citas/{appointment_id}")
+    def update_appointment(appointment_id: int, data: dict = Body(...), s=Depends(session)):
+        return service.update_appointment(s, appointment_id, data)
+
+    @app.put("/citas/{appointment_id}/estado")
+    def set_appointment_status(appointment_id: int, estado: str = Body(..., embed=True),
+                               notas: Optional[str] = Body(None, embed=True), s=Depends(session)):
+        return service.set_appointment_status(s, appointment_id, estado, notas)
+
+    @app.put("/citas/{appointment_id}/notas")
+    def set_appointment_notes(appointment_id: int, notas: str = Body(..., embed=True), s=Depends(session)):
+        return service.set_appointment_notes(s, appointment_id, notas)
+
+    @app.put("/citas/{appointment_id}/fecha")
+    def reschedule_appointment(appointment_id: int, data: dict = Body(...), s=Depends(session)):
+        return service.reschedule_appointment(s, appointment_id, data)
+
+    @app.post("/citas/{appointment_id}/cancelacion")
+    def cancel_appointment(appointment_id: int, motivo: str = Body(..., embed=True), s=Depends(session)):
+        return service.cancel_appointment(s, appointment_id, motivo)
+
+    @app.delete("/citas/{appointment_id}")
+    def delete_appointment(appointment_id: int, s=Depends(session)):
+        return service.delete_appointment(s, appointment_id)
+
+    # Facturas
+    @app.get("/facturas")
+    def invoices(estado: Optional[str] = None, s=Depends(session)):
+        return service.invoices(s, estado)
+
+    @app.post("/facturas")
+    def create_invoice(data: dict = Body(...), s=Depends(session)):
+        return service.create_invoice(s, data)
+
+    @app.post("/facturas/numeros")
+    def allocate_invoice_numbers(cantidad: int = Body(1, embed=True), s=Depends(session)):
+        return service.allocate_invoice_numbers(s, cantidad)
+
+    @app.post("/facturas/{invoice_id}/servicios")
+    def add_invoice_service(invoice_id: int, data: dict = Body(...), s=Depends(session)):
+        return service.add_invoice_service(s, invoice_id, data)
+
+    @app.post("/facturas/{invoice_id}/pago")
+    def pay_invoice(invoice_id: int, data: dict = Body(...), s=Depends(session)):
+        return service.pay_invoice(s, invoice_id, data)
+
+    # Reportes, paneles e historial
+    @app.get("/reportes/ingresos")
+    def monthly_income(anio: int, mes: int, s=Depends(session)):
+        return service.monthly_income(s, anio, mes)
+
+    @app.get("/reportes/resumen")
+    def report_summary(desde: str, hasta: str, s=Depends(session)):
+        return service.report_summary(s, desde, hasta)
+
+    @app.get("/paneles/{panel}")
+    def counters(panel: str, doctor_id: Optional[int] = None, s=Depends(session)):
+        return service.counters(s, panel, doctor_id)
+
+    @app.get("/historial/busqueda")
+    def search_history(texto: str, fuente: str = 'historial_medico', paciente_id: Optional[int] = None,
+                       doctor_id: Optional[int] = None, limite: int = 50, s=Depends(session)):
+        return service.search_history(s, texto, fuente, paciente_id, doctor_id, limite)
+
+    @app.post("/historial/{fuente}")
+    def create_medical_record(fuente: str, data: dict = Body(...), s=Depends(session)):
+        return service.save_medical_record(s, data, None, fuente)
+
+    @app.put("/historial/{fuente}/{record_id}")
+    def update_medical_record(fuente: str, record_id: int, data: dict = Body(...), s=Depends(session)):
+        return service.save_medical_record(s, data, record_id, fuente)
+
+    # Consultas de lectura de las vistas que aún no usan la API (cliente Tk)
+    @app.post("/sql")
+    def execute_sql(data: SqlRequest, s=Depends(session)):
+        return service.execute_sql(s, data.sql, data.params)
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default='database/medisync.db', help="base de datos SQLite")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f"interfaz de escucha (por defecto {DEFAULT_HOST}; 0.0.0.0 para la red local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    if not registry.available('api'):
+        print(f"❌ {registry.message('api')}")
+        return 1
+
+    import uvicorn
+    from database_manager import DatabaseManager
+
+    service = ClinicService(DatabaseManager.shared(args.db))
+    print(f"🏥 Servicio MEDISYNC en http://{args.host}:{args.port} (base: {args.db})")
+    uvicorn.run(create_app(service), host=args.host, port=args.port, workers=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Vistas de MEDISYNC cargadas bajo demanda
+MedisyncApp (MEDISYNC.py) sólo define el login, la ventana principal y los
+menús. El resto de sus métodos vive en los módulos de este paquete (uno por
+rol, más reportes, facturación, historial médico, rendimiento y utilidades
+compartidas) y se importa la primera vez que se pide uno de ellos
+"""
+import importlib
+import threading
+
+# Módulo -> clase con sus métodos
+VIEW_CLASSES = {
+    'admin': 'AdminViews',
+    'billing': 'BillingViews',
+    'reports': 'ReportViews',
+    'doctor': 'DoctorViews',
+    'secretaria': 'SecretariaViews',
+    'paciente': 'PacienteViews',
+    'medical_history': 'MedicalHistoryViews',
+    'support': 'SupportViews',
+    'performance': 'PerformanceViews',
+}
+
+VIEW_METHODS = {
+    'admin': (
+        'create_dashboard_tab', 'create_users_tab', 'load_users_data', 'create_appointments_tab',
+        'get_doctors_list', 'load_appointments_data', 'appointments_source',
+        'get_appointment_search', 'show_appointment_results', 'on_appointment_changed',
+        'format_appointment_row',
+        'clear_appointment_filters', 'build_appointment_query', 'get_filtered_appointments',
+        'filter_appointments', 'show_selected_appointment_details',
+        'on_appointment_double_click_admin', 'show_appointment_details',
+        'clear_appointment_details', 'save_appointment', 'edit_appointment_from_details',
+        'generate_appointment_pdf', 'copy_appointment_to_clipboard', 'email_appointment_details',
+        'complete_appointment', 'start_appointment', 'update_appointment_status',
+        'create_medical_history_tab', 'ensure_test_patients', 'create_sample_medical_records',
+        'open_user_management', 'load_users_list', 'watch_patient_changes', 'on_patient_changed',
+        'user_filters', 'users_query', 'get_user_search',
+        'show_user_results', 'format_user_row', 'load_user_stats', 'on_user_select',
+        'update_actions_scroll', 'enable_action_buttons', 'disable_action_buttons',
+        'show_default_info', 'load_selected_user_info', 'update_user_info_display', 'search_users',
+        'filter_users', 'clear_user_search', 'refresh_user_list', 'add_new_user',
+        'edit_selected_user', 'open_user_form', 'open_calendar', 'on_user_type_change',
+        'create_doctor_specific_fields', 'create_patient_specific_fields', 'save_user',
+        'validate_unique_email', 'generate_expediente_number', 'hash_password',
+        'change_user_password', 'activate_user', 'deactivate_user', 'view_user_details',
+        'send_user_email', 'view_access_history', 'delete_user', 'request_appointment',
+        'view_my_history', 'view_my_bills', 'update_my_profile', 'request_new_appointment',
+        'set_appointment_hour', 'find_and_set_hour_entry', 'get_billing_summary',
+        'get_patient_health_summary'
+    ),
+    'billing': (
+        'auto_launch_billing_system', 'manual_launch_billing_system', 'open_integrated_billing_system',
+        'on_integrated_invoice_created', 'init_integrated_billing_system',
+        'create_integrated_billing_content',
+        'create_modern_billing_calculations_panel', 'create_billing_calculations_panel',
+        'create_integrated_services_content', 'create_integrated_reports_content',
+        'create_billing_status_bar', 'load_integrated_billing_data',
+        'load_appointments_for_billing', 'on_billing_appointment_invoiced',
+        'query_appointments_for_billing',
+        'select_appointment_card', 'load_services_for_billing', 'create_service_card',
+        'add_service_from_card', 'update_selected_services_display', 'create_selected_service_card',
+        'remove_service_by_index', 'filter_services', 'filter_appointments_billing',
+        'on_appointment_select_for_billing', 'update_invoice_services_display',
+        'edit_service_in_invoice', 'apply_discount', 'calculate_change',
+        'generate_invoice_pdf_integrated', 'generate_simple_pdf', 'save_invoice_integrated',
+        'update_status', 'load_services_management', 'add_new_service', 'edit_selected_service',
+        'delete_selected_service', 'get_billing_statistics_integrated',
+        'generate_daily_report_integrated', 'generate_monthly_report_integrated',
+        'generate_pending_report_integrated', 'generate_services_report_integrated',
+        'create_billing_main_tab', 'create_billing_stats_panel',
+        'create_complete_billing_interface', 'create_advanced_billing_tab',
+        'load_existing_invoices', 'format_billing_invoice', 'on_invoice_changed',
+        'query_existing_invoices', 'create_invoice_form',
+        'load_pending_appointments', 'load_default_services', 'on_appointment_select_billing',
+        'get_doctor_billing_info', 'get_patient_insurance_info', 'load_doctor_services',
+        'update_doctor_info_panel', 'update_insurance_info_panel', 'update_doctor_panel_info',
+        'update_modern_insurance_info', 'add_service_to_invoice', 'calculate_totals',
+        'generate_unique_invoice_number', 'create_invoice_from_appointment', 'clear_invoice_form',
+        'remove_service_from_invoice', 'edit_service_price', 'generate_invoice_pdf',
+        'open_payment_window', 'create_payment_window', 'create_invoice_in_database',
+        'generate_final_invoice_pdf', 'process_payment_window',
+        'create_existing_invoice_payment_window', 'view_invoice_details_billing',
+        'reprint_invoice_pdf', 'get_invoice_pdf_service', 'reprint_invoices_batch',
+        'export_billing_report_pdf',
+        'create_payments_tab', 'create_billing_config_tab', 'load_billing_data_integrated',
+        'update_billing_statistics', 'update_pending_appointments', 'quick_invoice',
+        'generate_billing_report', 'search_invoice', 'refresh_billing_data',
+        'bill_selected_appointment', 'load_billing_data'
+    ),
+    'reports': (
+        'create_reports_tab', 'create_stats_display', 'create_report_filters',
+        'generate_income_report', 'generate_pending_invoices_report', 'generate_users_report',
+        'generate_appointments_report', 'generate_financial_report', 'generate_services_report',
+        'show_report_dialog', 'calculate_date_range', 'select_date_calendar', 'show_report_preview',
+        'generate_report_content', 'create_report_header', 'create_report_summary',
+        'create_income_report_content', 'create_appointments_report_content',
+        'create_users_report_content', 'create_pending_invoices_content',
+        'create_financial_report_content', 'create_services_report_content', 'create_report_footer',
+        'get_report_summary_data', 'generate_pdf_from_preview', 'build_report_pdf',
+        'generate_excel_from_preview',
+        'get_report_data_for_pdf', 'generate_report_file',
+        'apply_report_filters', 'export_all_reports_pdf', 'export_to_excel', 'email_reports',
+        'show_executive_dashboard', 'refresh_all_data', 'configure_reports',
+        'manage_report_templates'
+    ),
+    'doctor': (
+        'create_doctor_dashboard', 'create_doctor_stats_card', 'create_appointment_card',
+        'create_doctor_appointments', 'on_appointment_double_click',
+        'create_appointment_context_menu', 'show_context_menu', 'update_context_menu_state',
+        'context_view_details', 'context_complete_appointment', 'context_cancel_appointment',
+        'context_confirm_appointment', 'context_start_appointment',
+        'show_appointment_details_window', 'print_appointment_details', 'create_doctor_patients',
+        'create_patient_context_menu', 'show_patient_context_menu', 'context_view_patient_profile',
+        'context_view_medical_history', 'context_schedule_appointment', 'filter_patients',
+        'refresh_patients', 'show_patient_stats', 'create_medical_records', 'create_doctor_profile',
+        'get_doctor_stats', 'get_doctor_upcoming_appointments', 'filter_doctor_appointments',
+        'search_appointments_by_patient', 'refresh_appointments', 'schedule_new_appointment',
+        'show_appointment_stats', 'load_doctor_patients', 'doctor_patients_query',
+        'get_doctor_patient_search', 'show_doctor_patient_results', 'format_doctor_patient_row',
+        'load_medical_patients', 'complete_appointment_doctor_view', 'add_appointment_notes',
+        'search_patients', 'view_patient_profile', 'view_medical_history', 'schedule_appointment',
+        'load_patient_medical_records', 'search_medical_records',
+        'schedule_appointment_for_patient', 'view_patient_medical_history',
+        'create_medical_record_for_patient', 'edit_medical_record_detail',
+        'print_medical_record_detail', 'edit_doctor_profile', 'change_password',
+        'configure_schedule', 'save_appointment_notes_db', 'save_medical_record_db',
+        'update_doctor_profile_db', 'update_doctor_password_db', 'verify_doctor_password',
+        'save_doctor_schedule_db', 'get_doctor_schedule_db', 'create_appointment_db',
+        'get_patient_full_info', 'search_patients_for_doctor', 'format_datetime_for_display',
+        'format_date_for_display', 'calculate_age', 'validate_email', 'validate_phone'
+    ),
+    'secretaria': (
+        'create_secretaria_dashboard', 'create_secretaria_appointments',
+        'create_secretaria_patients', 'create_secretaria_billing', 'get_billing_summary_secretaria',
+        'load_secretaria_billing_data', 'create_new_invoice_secretaria',
+        'process_payment_secretaria', 'express_invoice', 'search_patient_billing',
+        'generate_daily_report', 'refresh_billing_secretaria', 'bill_appointment_secretaria',
+        'filter_invoices_secretaria', 'view_invoice_details', 'create_secretaria_reports',
+        'get_secretaria_stats', 'get_today_appointments', 'generate_invoice_quick',
+        'manage_waiting_list', 'create_new_appointment', 'show_appointment_calendar',
+        'load_appointment_doctors', 'load_secretaria_appointments', 'call_patient',
+        'generate_appointment_invoice', 'register_new_patient', 'import_patients',
+        'export_patients', 'search_patients_secretaria', 'clear_patient_search',
+        'load_secretaria_patients', 'get_secretaria_quick_stats'
+    ),
+    'paciente': (
+        'create_patient_dashboard', 'create_patient_appointments', 'create_tooltip',
+        'on_patient_appointment_select', 'show_appointment_context_menu',
+        'create_patient_medical_history', 'load_patient_doctors', 'clear_history_filters',
+        'on_history_select', 'check_empty_history', 'show_tooltip', 'hide_tooltip',
+        'show_detailed_stats', 'get_detailed_health_stats', 'analyze_health_trends',
+        'refresh_history', 'generate_summary_report', 'show_health_charts',
+        'configure_health_alerts', 'export_single_record_pdf', 'print_single_record',
+        'email_single_record', 'copy_record_to_clipboard', 'create_patient_settings',
+        'save_patient_settings', 'change_patient_password', 'open_patient_schedule_dialog',
+        'update_patient_appointments_list', 'refresh_patient_appointments',
+        'load_patient_appointments', 'get_appointment_status_info', 'format_appointment_time',
+        'get_patient_appointment_summary', 'view_my_appointment_details', 'edit_my_appointment',
+        'cancel_my_appointment', 'create_no_data_placeholder', 'create_history_card',
+        'view_history_detail_card', 'load_patient_medical_history', 'format_medical_history_row',
+        'filter_medical_history', 'create_patient_billing', 'create_billing_status_cards',
+        'create_status_card', 'get_billing_statistics', 'load_patient_billing_data',
+        'refresh_patient_billing', 'download_patient_invoice', 'view_payment_history',
+        'request_account_statement', 'billing_inquiry', 'view_billing_detail_simple',
+        'filter_patient_invoices', 'view_patient_invoice_details', 'create_patient_profile',
+        'get_patient_stats', 'view_history_detail', 'print_my_history', 'export_history_pdf',
+        'email_my_history', 'get_patient_upcoming_appointments', 'get_patient_reminders',
+        'get_patient_billing_summary', 'get_patient_profile_data', 'get_patient_personal_stats',
+        'filter_patient_billing', 'clear_billing_filters', 'view_billing_detail',
+        'download_billing_pdf', 'email_my_billing', 'show_billing_summary',
+        'view_history_detail_simple'
+    ),
+    'medical_history': (
+        'load_patients_for_medical_history', 'search_patients_medical', 'on_patient_select_medical',
+        'show_patient_info_medical', 'show_default_medical_info',
+        'load_medical_records_for_patient', 'on_medical_record_select', 'add_medical_record',
+        'open_medical_record_form', 'save_medical_record', 'create_medical_record',
+        'view_medical_record_detail', 'show_medical_record_details', 'edit_medical_record',
+        'print_medical_record', 'get_patient_from_medical_record',
+        'open_medical_history_print_window', 'load_patient_records_for_print', 'toggle_all_records',
+        'update_medical_history_preview', 'generate_medical_history_content',
+        'generate_medical_history_pdf', 'show_medical_history_pdf',
+        'create_medical_note_from_appointment'
+    ),
+    'support': (
+        'create_modern_stats_card', 'create_stats_card', 'get_system_stats',
+        'new_appointment_window', 'select_date', 'edit_appointment_window', 'update_appointment',
+        'change_appointment_status', 'cancel_appointment_with_reason',
+        'refresh_appointment_details', 'log_appointment_change', 'darken_color', 'get_patient_info',
+        'show_missing_capability', 'open_document', 'get_document_cache',
+        'new_appointment_quick', 'new_patient_quick', 'process_payment_quick',
+        'daily_report',
+        'load_doctor_appointments', 'on_appointment_select', 'show_appointment_details_doctor_view',
+        'print_appointment', 'view_appointment_details', 'complete_appointment_from_details',
+        'cancel_appointment_from_details', 'add_appointment_notes_from_details',
+        'apply_appointment_filters', 'load_filtered_appointments', 'edit_appointment',
+        'confirm_appointment', 'cancel_appointment', 'select_date_enhanced',
+        'clear_appointment_form', 'setup_form_validation', 'save_appointment_enhanced',
+        'check_appointment_conflict', 'update_available_hours', 'get_doctor_schedule',
+        'show_more_hours', 'update_appointment_status_db', 'get_appointment_id_from_selection'
+    ),
+    'performance': (
+        'show_performance_panel', 'load_performance_data', 'explain_selected_query',
+        'clear_performance_data', 'show_selected_profile', 'toggle_profiling',
+    ),
+}
+
+_MODULE_BY_METHOD = {name: module for module, names in VIEW_METHODS.items() for name in names}
+_load_lock = threading.RLock()
+_loaded = set()
+
+
+def load_views(cls, module_name):
+    """Importar un módulo de vistas y copiar sus métodos a ``cls``
+
+    Después de copiarlos son atributos normales de la clase: los accesos
+    siguientes no pasan por ``LazyViews.__getattr__``.
+    """
+    with _load_lock:
+        key = (cls, module_name)
+        if key in _loaded:
+            return
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        views = getattr(module, VIEW_CLASSES[module_name])
+        for name, value in vars(views).items():
+            if not name.startswith('__') and name not in cls.__dict__:
+                setattr(cls, name, value)
+        _loaded.add(key)
+
+
+def load_all_views(cls):
+    """Cargar todos los módulos (p. ej. para comprobar el índice)"""
+    for module_name in VIEW_METHODS:
+        load_views(cls, module_name)
+
+
+def check_index():
+    """Diferencias entre VIEW_METHODS y los métodos definidos en cada módulo
+
+    Devuelve {módulo: (faltan en el índice, sobran en el índice)} sólo para
+    los módulos que no coinciden.
+    """
+    problems = {}
+    for module_name, names in VIEW_METHODS.items():
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        views = getattr(module, VIEW_CLASSES[module_name])
+        defined = {name for name, value in vars(views).items()
+                   if callable(value) and not name.startswith('__')}
+        missing, extra = defined - set(names), set(names) - defined
+        if missing or extra:
+            problems[module_name] = (sorted(missing), sorted(extra))
+    return problems
+
+
+class LazyViews:
+    """Base de MedisyncApp que resuelve los métodos de vistas al primer uso"""
+
+    def __getattr__(self, name):
+        # Sólo se llama cuando el atributo no existe en la instancia ni en la clase
+        module_name = _MODULE_BY_METHOD.get(name)
+        if module_name is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        load_views(type(self), module_name)
+        return object.__getattribute__(self, name)
@@ -0,0 +1,2776 @@
+"""
+Vistas del doctor de MEDISYNC
+Dashboard, citas, pacientes, historiales y perfil del doctor
+Métodos de MedisyncApp que se importan la primera vez que se usan
+(ver medisync_views)
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+
+from virtual_tree import ListSource, QuerySource, VirtualTreeview
+from incremental_search import IncrementalSearch, name_prefix_filter, name_prefix_matches
+
+
+class DoctorViews:
+    """Métodos de MedisyncApp: dashboard, citas, pacientes, historiales y perfil del doctor"""
+    
+    def create_doctor_dashboard(self, parent):
+        """Dashboard específico para doctores con diseño mejorado"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header personalizado con gradiente visual
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=80, relief='solid', bd=1)
+        header_frame.pack(fill='x', pady=(0, 25))
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=25, pady=15)
+        
+        # Lado izquierdo - Saludo y avatar
+        left_header = tk.Frame(header_content, bg='#1E3A8A')
+        left_header.pack(side='left', fill='both', expand=True)
+        
+        # Avatar del doctor
+        avatar_frame = tk.Frame(left_header, bg='#0B5394', width=50, height=50)
+        avatar_frame.pack(side='left', padx=(0, 15))
+        avatar_frame.pack_propagate(False)
+        tk.Label(avatar_frame, text="👨‍⚕️", font=('Arial', 24), bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Saludo y información
+        greeting_frame = tk.Frame(left_header, bg='#1E3A8A')
+        greeting_frame.pack(side='left', fill='both', expand=True)
+        
+        # Saludo dinámico según hora
+        current_hour = datetime.now().hour
+        if current_hour < 12:
+            greeting = "Buenos días"
+        elif current_hour < 18:
+            greeting = "Buenas tardes"
+        else:
+            greeting = "Buenas noches"
+        
+        tk.Label(greeting_frame, text=f"{greeting}, Dr. {self.current_user.nombre}", 
+                font=('Arial', 18, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='w')
+        tk.Label(greeting_frame, text="Bienvenido a tu panel médico", 
+                font=('Arial', 11), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='w')
+        
+        # Lado derecho - Fecha y hora
+        right_header = tk.Frame(header_content, bg='#1E3A8A')
+        right_header.pack(side='right')
+        
+        current_date = datetime.now().strftime('%d de %B, %Y')
+        current_time = datetime.now().strftime('%H:%M')
+        
+        tk.Label(right_header, text=current_date, 
+                font=('Arial', 12, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='e')
+        tk.Label(right_header, text=current_time, 
+                font=('Arial', 10), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='e')
+        
+        # Contenedor principal para las tarjetas
+        cards_container = tk.Frame(main_frame, bg='#F8FAFC')
+        cards_container.pack(fill='both', expand=True)
+        
+        # Fila superior - Estadísticas principales
+        stats_row = tk.Frame(cards_container, bg='#F8FAFC')
+        stats_row.pack(fill='x', pady=(0, 20))
+        
+        try:
+            doctor_stats = self.get_doctor_stats()
+            
+            # Tarjetas de estadísticas con diseño moderno
+            stats_cards = [
+                {
+                    'title': 'Citas Hoy',
+                    'value': str(doctor_stats.get('appointments_today', 0)),
+                    'icon': '📅',
+                    'color': '#3B82F6',
+                    'bg_color': '#EFF6FF'
+                },
+                {
+                    'title': 'Total Pacientes',
+                    'value': str(doctor_stats.get('total_patients', 0)),
+                    'icon': '🤒',
+                    'color': '#10B981',
+                    'bg_color': '#ECFDF5'
+                },
+                {
+                    'title': 'Ingresos del Mes',
+                    'value': f"RD$ {doctor_stats.get('monthly_income', 0):,.2f}",
+                    'icon': '💰',
+                    'color': '#F59E0B',
+                    'bg_color': '#FFFBEB'
+                },
+                {
+                    'title': 'Consultas del Mes',
+                    'value': str(doctor_stats.get('consultations_month', 0)),
+                    'icon': '⭐',
+                    'color': '#8B5CF6',
+                    'bg_color': '#F3E8FF'
+                }
+            ]
+            
+            for i, card in enumerate(stats_cards):
+                self.create_doctor_stats_card(stats_row, card, i)
+                
+        except Exception as e:
+            error_label = tk.Label(stats_row, text=f"Error cargando estadísticas: {str(e)}", 
+                                 fg='#EF4444', bg='#F8FAFC', font=('Arial', 10))
+            error_label.pack(pady=10)
+        
+        # Fila inferior - Contenido dinámico
+        content_row = tk.Frame(cards_container, bg='#F8FAFC')
+        content_row.pack(fill='both', expand=True)
+        
+        # Panel izquierdo - Próximas citas
+        left_panel = tk.Frame(content_row, bg='#F8FAFC')
+        left_panel.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        
+        appointments_card = tk.Frame(left_panel, bg='white', relief='solid', bd=1)
+        appointments_card.pack(fill='both', expand=True)
+        
+        # Header de la tarjeta de citas
+        appointments_header = tk.Frame(appointments_card, bg='#F8FAFC', height=50)
+        appointments_header.pack(fill='x')
+        appointments_header.pack_propagate(False)
+        
+        tk.Label(appointments_header, text="🕐 Próximas Citas", 
+                font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#1F2937').pack(side='left', padx=20, pady=15)
+        
+        # Botón de ver todas
+        tk.Button(appointments_header, text="Ver todas →", bg='#3B82F6', fg='white',
+                 font=('Arial', 9, 'bold'), relief='flat', padx=15, pady=5,
+                 command=lambda: self.switch_doctor_tab("Mis Citas")).pack(side='right', padx=20, pady=15)
+        
+        # Lista de citas
+        appointments_content = tk.Frame(appointments_card, bg='white')
+        appointments_content.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        try:
+            upcoming_appointments = self.get_doctor_upcoming_appointments()
+            
+            if upcoming_appointments:
+                for i, apt in enumerate(upcoming_appointments[:4]):  # Mostrar solo 4
+                    self.create_appointment_card(appointments_content, apt, i)
+            else:
+                no_appointments_frame = tk.Frame(appointments_content, bg='white', height=100)
+                no_appointments_frame.pack(fill='x', pady=20)
+                no_appointments_frame.pack_propagate(False)
+                
+                tk.Label(no_appointments_frame, text="📅", font=('Arial', 30), 
+                        bg='white', fg='#9CA3AF').pack()
+                tk.Label(no_appointments_frame, text="No hay citas programadas", 
+                        font=('Arial', 12), bg='white', fg='#6B7280').pack()
+                
+        except Exception as e:
+            error_frame = tk.Frame(appointments_content, bg='white')
+            error_frame.pack(fill='x', pady=20)
+            tk.Label(error_frame, text=f"Error cargando citas: {str(e)}", 
+                    fg='#EF4444', bg='white', font=('Arial', 10)).pack()
+        
+        # Panel derecho - Acciones rápidas y resumen
+        right_panel = tk.Frame(content_row, bg='#F8FAFC')
+        right_panel.pack(side='right', fill='both', expand=True, padx=(10, 0))
+        
+        # Tarjeta de acciones rápidas
+        quick_actions_card = tk.Frame(right_panel, bg='white', relief='solid', bd=1, height=250)
+        quick_actions_card.pack(fill='x', pady=(0, 15))
+        quick_actions_card.pack_propagate(False)
+        
+        # Header de acciones rápidas
+        actions_header = tk.Frame(quick_actions_card, bg='#F8FAFC', height=50)
+        actions_header.pack(fill='x')
+        actions_header.pack_propagate(False)
+        
+        tk.Label(actions_header, text="🚀 Acciones Rápidas", 
+                font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#1F2937').pack(padx=20, pady=15)
+        
+        # Botones de acciones rápidas
+        actions_content = tk.Frame(quick_actions_card, bg='white')
+        actions_content.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        quick_actions = [
+            ("📋 Nuevo Historial", self.create_medical_record, '#10B981'),
+            ("👁️ Ver Pacientes", lambda: self.switch_doctor_tab("Mis Pacientes"), '#3B82F6'),
+            ("📅 Gestionar Citas", lambda: self.switch_doctor_tab("Mis Citas"), '#8B5CF6'),
+            ("⚙️ Configurar Perfil", lambda: self.switch_doctor_tab("Mi Perfil"), '#6B7280')
+        ]
+        
+        for i, (text, command, color) in enumerate(quick_actions):
+            btn = tk.Button(actions_content, text=text, bg=color, fg='white',
+                           font=('Arial', 10, 'bold'), relief='flat', 
+                           padx=15, pady=8, cursor='hand2', command=command)
+            btn.pack(fill='x', pady=3)
+            
+            # Efecto hover
+            def on_enter(e, btn=btn, original_color=color):
+                btn.configure(bg=self.darken_color(original_color))
+            def on_leave(e, btn=btn, original_color=color):
+                btn.configure(bg=original_color)
+            
+            btn.bind("<Enter>", on_enter)
+            btn.bind("<Leave>", on_leave)
+        
+        # Tarjeta de resumen del día
+        summary_card = tk.Frame(right_panel, bg='white', relief='solid', bd=1)
+        summary_card.pack(fill='both', expand=True)
+        
+        # Header del resumen
+        summary_header = tk.Frame(summary_card, bg='#F8FAFC', height=50)
+        summary_header.pack(fill='x')
+        summary_header.pack_propagate(False)
+        
+        tk.Label(summary_header, text="📊 Resumen del Día", 
+                font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#1F2937').pack(padx=20, pady=15)
+        
+        # Contenido del resumen
+        summary_content = tk.Frame(summary_card, bg='white')
+        summary_content.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+        
+        try:
+            # Información del resumen
+            today = datetime.now().strftime('%Y-%m-%d')
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Citas completadas hoy
+            cursor.execute("""
+                SELECT COUNT(*) FROM citas 
+                WHERE doctor_id = ? AND fecha = ? AND estado = 'completada'
+            """, (self.current_user.id, today))
+            completed_today = cursor.fetchone()[0]
+            
+            # Próxima cita
+            cursor.execute("""
+                SELECT MIN(fecha_hora) FROM citas 
+                WHERE doctor_id = ? AND fecha_hora > datetime('now') AND estado = 'programada'
+            """, (self.current_user.id,))
+            next_appointment = cursor.fetchone()[0]
+            
+            cursor.close()
+            conn.close()
+            
+            # Mostrar resumen
+            summary_items = [
+                ("Citas completadas hoy:", str(completed_today)),
+                ("Estado:", "Activo"),
+                ("Próxima cita:", "Hoy" if next_appointment and next_appointment.startswith(today) else "Mañana" if next_appointment else "Sin citas")
+            ]
+            
+            for label, value in summary_items:
+                item_frame = tk.Frame(summary_content, bg='white')
+                item_frame.pack(fill='x', pady=5)
+                
+                tk.Label(item_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151').pack(side='left')
+                tk.Label(item_frame, text=value, font=('Arial', 10), 
+                        bg='white', fg='#6B7280').pack(side='right')
+        
+        except Exception as e:
+            tk.Label(summary_content, text=f"Error cargando resumen: {str(e)}", 
+                    fg='#EF4444', bg='white', font=('Arial', 9)).pack(pady=10)
+    
+    def create_doctor_stats_card(self, parent, card_data, index):
+        """Crear tarjeta de estadística moderna"""
+        card_frame = tk.Frame(parent, bg=card_data['bg_color'], relief='solid', bd=1)
+        card_frame.pack(side='left', fill='both', expand=True, padx=5 if index > 0 else (0, 5))
+        
+        # Contenido de la tarjeta
+        content_frame = tk.Frame(card_frame, bg=card_data['bg_color'])
+        content_frame.pack(fill='both', expand=True, padx=20, pady=15)
+        
+        # Fila superior - Ícono y valor
+        top_row = tk.Frame(content_frame, bg=card_data['bg_color'])
+        top_row.pack(fill='x')
+        
+        # Ícono
+        icon_frame = tk.Frame(top_row, bg=card_data['color'], width=40, height=40)
+        icon_frame.pack(side='left')
+        icon_frame.pack_propagate(False)
+        
+        tk.Label(icon_frame, text=card_data['icon'], font=('Arial', 20), 
+                bg=card_data['color'], fg='white').pack(expand=True)
+        
+        # Valor
+        value_frame = tk.Frame(top_row, bg=card_data['bg_color'])
+        value_frame.pack(side='right', fill='both', expand=True)
+        
+        tk.Label(value_frame, text=card_data['value'], 
+                font=('Arial', 18, 'bold'), bg=card_data['bg_color'], 
+                fg=card_data['color']).pack(anchor='e')
+        
+        # Título
+        tk.Label(content_frame, text=card_data['title'], 
+                font=('Arial', 11, 'bold'), bg=card_data['bg_color'], 
+                fg='#374151').pack(anchor='w', pady=(10, 0))
+    
+    def create_appointment_card(self, parent, appointment, index):
+        """Crear tarjeta de cita individual"""
+        card_frame = tk.Frame(parent, bg='#F9FAFB', relief='solid', bd=1)
+        card_frame.pack(fill='x', pady=3)
+        
+        content_frame = tk.Frame(card_frame, bg='#F9FAFB')
+        content_frame.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        # Fila superior - Hora y paciente
+        top_row = tk.Frame(content_frame, bg='#F9FAFB')
+        top_row.pack(fill='x')
+        
+        # Hora
+        try:
+            dt = datetime.fromisoformat(appointment['fecha_hora'])
+            hora = dt.strftime('%H:%M')
+        except:
+            hora = appointment.get('fecha_hora_formatted', 'N/A')
+        
+        hora_label = tk.Label(top_row, text=hora, font=('Arial', 12, 'bold'), 
+                             bg='#3B82F6', fg='white', padx=8, pady=2)
+        hora_label.pack(side='left')
+        
+        # Paciente
+        paciente_label = tk.Label(top_row, text=appointment.get('paciente_nombre', 'N/A'), 
+                                 font=('Arial', 11, 'bold'), bg='#F9FAFB', fg='#1F2937')
+        paciente_label.pack(side='left', padx=(10, 0))
+        
+        # Estado
+        estado_color = '#10B981' if appointment.get('estado') == 'programada' else '#6B7280'
+        estado_label = tk.Label(top_row, text="●", font=('Arial', 12), 
+                               bg='#F9FAFB', fg=estado_color)
+        estado_label.pack(side='right')
+        
+        # Motivo
+        motivo_text = appointment.get('motivo', 'Consulta general')
+        if len(motivo_text) > 40:
+            motivo_text = motivo_text[:40] + "..."
+        
+        motivo_label = tk.Label(content_frame, text=motivo_text, 
+                               font=('Arial', 10), bg='#F9FAFB', fg='#6B7280')
+        motivo_label.pack(anchor='w', pady=(5, 0))
+    
+    def create_doctor_appointments(self, parent):
+        """Gestión moderna de citas para doctores con diseño mejorado"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header principal con diseño moderno
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=100, relief='solid', bd=1)
+        header_frame.pack(fill='x', pady=(0, 25))
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=25, pady=15)
+        
+        # Lado izquierdo - Título e icono
+        left_header = tk.Frame(header_content, bg='#1E3A8A')
+        left_header.pack(side='left', fill='both', expand=True)
+        
+        # Icono de citas
+        icon_frame = tk.Frame(left_header, bg='#16A085', width=60, height=60)
+        icon_frame.pack(side='left', padx=(0, 15))
+        icon_frame.pack_propagate(False)
+        tk.Label(icon_frame, text="📅", font=('Arial', 30), bg='#16A085', fg='white').pack(expand=True)
+        
+        # Título y descripción
+        title_frame = tk.Frame(left_header, bg='#1E3A8A')
+        title_frame.pack(side='left', fill='both', expand=True)
+        
+        tk.Label(title_frame, text="Gestión de Mis Citas", 
+                font=('Arial', 20, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='w')
+        tk.Label(title_frame, text="Administra y controla todas tus citas médicas", 
+                font=('Arial', 12), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='w')
+        
+        # Lado derecho - Estadísticas rápidas
+        right_header = tk.Frame(header_content, bg='#1E3A8A')
+        right_header.pack(side='right')
+        
+        try:
+            # Obtener estadísticas de citas
+            today = datetime.now().strftime('%Y-%m-%d')
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Citas de hoy
+            cursor.execute("""
+                SELECT COUNT(*) FROM citas 
+                WHERE doctor_id = ? AND fecha = ? AND estado = 'programada'
+            """, (self.current_user.id, today))
+            citas_hoy = cursor.fetchone()[0]
+            
+            # Citas pendientes
+            cursor.execute("""
+                SELECT COUNT(*) FROM citas 
+                WHERE doctor_id = ? AND fecha_hora > datetime('now') AND estado = 'programada'
+            """, (self.current_user.id,))
+            citas_pendientes = cursor.fetchone()[0]
+            
+            cursor.close()
+            conn.close()
+            
+            # Mostrar estadísticas
+            stats_frame = tk.Frame(right_header, bg='#0B5394', padx=20, pady=10)
+            stats_frame.pack()
+            
+            tk.Label(stats_frame, text=f"Hoy: {citas_hoy}", 
+                    font=('Arial', 14, 'bold'), bg='#0B5394', fg='white').pack()
+            tk.Label(stats_frame, text=f"Pendientes: {citas_pendientes}", 
+                    font=('Arial', 12), bg='#0B5394', fg='#CBD5E1').pack()
+            
+        except Exception as e:
+            tk.Label(right_header, text="Error estadísticas", 
+                    font=('Arial', 10), bg='#1E3A8A', fg='#EF4444').pack()
+        
+        # Panel de filtros y acciones
+        controls_panel = tk.Frame(main_frame, bg='white', relief='solid', bd=1, height=80)
+        controls_panel.pack(fill='x', pady=(0, 15))
+        controls_panel.pack_propagate(False)
+        
+        controls_content = tk.Frame(controls_panel, bg='white')
+        controls_content.pack(expand=True, fill='both', padx=20, pady=15)
+        
+        # Filtros avanzados
+        filters_frame = tk.Frame(controls_content, bg='white')
+        filters_frame.pack(side='left', fill='both', expand=True)
+        
+        tk.Label(filters_frame, text="🔍 Filtrar citas:", font=('Arial', 12, 'bold'), 
+                bg='white', fg='#1F2937').pack(side='left', padx=(0, 10))
+        
+        # Filtro por período
+        self.appointment_filter = ttk.Combobox(filters_frame, 
+                                             values=['Todas', 'Hoy', 'Mañana', 'Esta Semana', 'Este Mes'], 
+                                             state='readonly', width=12, font=('Arial', 10))
+        self.appointment_filter.set('Hoy')
+        self.appointment_filter.pack(side='left', padx=5)
+        self.appointment_filter.bind('<<ComboboxSelected>>', self.filter_doctor_appointments)
+        
+        # Filtro por estado
+        tk.Label(filters_frame, text="Estado:", font=('Arial', 10), 
+                bg='white', fg='#6B7280').pack(side='left', padx=(15, 5))
+        
+        self.status_filter = ttk.Combobox(filters_frame, 
+                                        values=['Todos', 'Programada', 'Completada', 'Cancelada'], 
+                                        state='readonly', width=10, font=('Arial', 10))
+        self.status_filter.set('Todos')
+        self.status_filter.pack(side='left', padx=5)
+        self.status_filter.bind('<<ComboboxSelected>>', self.filter_doctor_appointments)
+        
+        # Búsqueda por paciente
+        tk.Label(filters_frame, text="Paciente:", font=('Arial', 10), 
+                bg='white', fg='#6B7280').pack(side='left', padx=(15, 5))
+        
+        self.patient_search = tk.Entry(filters_frame, font=('Arial', 10), width=15,
+                                     relief='solid', bd=1)
+        self.patient_search.pack(side='left', padx=5)
+        self.patient_search.bind('<KeyRelease>', self.search_appointments_by_patient)
+        
+        # Botones de acción rápida
+        actions_frame = tk.Frame(controls_content, bg='white')
+        actions_frame.pack(side='right')
+        
+        quick_actions = [
+            ("🔄 Actualizar", self.refresh_appointments, '#3B82F6'),
+            ("📅 Nueva Cita", self.schedule_new_appointment, '#10B981'),
+            ("📊 Estadísticas", self.show_appointment_stats, '#8B5CF6')
+        ]
+        
+        for text, command, color in quick_actions:
+            btn = tk.Button(actions_frame, text=text, bg=color, fg='white',
+                           font=('Arial', 9, 'bold'), relief='flat', 
+                           padx=12, pady=6, cursor='hand2', command=command)
+            btn.pack(side='left', padx=3)
+        
+        # Contenedor principal para las citas
+        content_container = tk.Frame(main_frame, bg='#F8FAFC')
+        content_container.pack(fill='both', expand=True)
+        
+        # Panel principal - Lista de citas a pantalla completa
+        main_panel = tk.Frame(content_container, bg='#F8FAFC')
+        main_panel.pack(fill='both', expand=True)
+        
+        # Título del panel
+        list_title_frame = tk.Frame(main_panel, bg='white', height=40, relief='solid', bd=1)
+        list_title_frame.pack(fill='x', pady=(0, 5))
+        list_title_frame.pack_propagate(False)
+        
+        tk.Label(list_title_frame, text="📋 Lista de Citas - Clic derecho para acciones | Doble clic para detalles", 
+                font=('Arial', 14, 'bold'), bg='white', fg='#1F2937').pack(side='left', padx=15, pady=12)
+        
+        # Contenedor de la tabla con diseño moderno
+        table_container = tk.Frame(main_panel, bg='white', relief='solid', bd=1)
+        table_container.pack(fill='both', expand=True)
+        
+        # Tabla de citas con columnas mejoradas
+        columns = ('ID', 'Fecha/Hora', 'Paciente', 'Motivo', 'Estado', 'Duración', 'Tipo')
+        self.doctor_appointments_tree = ttk.Treeview(table_container, columns=columns, show='headings', height=15)
+        
+        # Configurar headers con mejor diseño
+        column_configs = {
+            'ID': 60,
+            'Fecha/Hora': 140,
+            'Paciente': 200,
+            'Motivo': 250,
+            'Estado': 120,
+            'Duración': 100,
+            'Tipo': 130
+        }
+        
+        for col in columns:
+            self.doctor_appointments_tree.heading(col, text=col, anchor='center')
+            self.doctor_appointments_tree.column(col, width=column_configs.get(col, 100), anchor='center')
+        
+        # Scrollbars con mejor diseño
+        scrollbar_y = ttk.Scrollbar(table_container, orient="vertical", command=self.doctor_appointments_tree.yview)
+        scrollbar_x = ttk.Scrollbar(table_container, orient="horizontal", command=self.doctor_appointments_tree.xview)
+        self.doctor_appointments_tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        
+        # Layout con grid
+        self.doctor_appointments_tree.grid(row=0, column=0, sticky='nsew')
+        scrollbar_y.grid(row=0, column=1, sticky='ns')
+        scrollbar_x.grid(row=1, column=0, sticky='ew')
+        
+        table_container.grid_rowconfigure(0, weight=1)
+        table_container.grid_columnconfigure(0, weight=1)
+        
+
+        
+
+        
+
+        
+        # Crear menú contextual para clic derecho
+        self.create_appointment_context_menu()
+        
+        # Bind para selección, doble clic y clic derecho
+        self.doctor_appointments_tree.bind('<<TreeviewSelect>>', self.on_appointment_select)
+        self.doctor_appointments_tree.bind('<Double-1>', self.on_appointment_double_click)
+        self.doctor_appointments_tree.bind('<Button-3>', self.show_context_menu)  # Clic derecho
+        
+        # Cargar datos iniciales
+        self.load_doctor_appointments()
+    
+    def on_appointment_double_click(self, event):
+        """Manejar doble clic para mostrar detalles completos"""
+        try:
+            # Verificar que el árbol de citas del doctor existe (solo mostrar error si es contexto de doctor)
+            # Verificar que el árbol de citas del doctor existe (solo mostrar error si es contexto de doctor)
+            if not hasattr(self, 'doctor_appointments_tree') or not self.doctor_appointments_tree:
+                # Solo mostrar error si estamos en contexto de doctor
+                if hasattr(self, 'current_user') and self.current_user and hasattr(self.current_user, 'tipo_usuario') and self.current_user.tipo_usuario == 'doctor':
+                    print("Error: doctor_appointments_tree no está disponible en contexto de doctor")
+                return
+                
+            selection = self.doctor_appointments_tree.selection()
+            if not selection:
+                return
+            
+            item = selection[0]
+            values = self.doctor_appointments_tree.item(item, 'values')
+            
+            if not values:
+                return
+            
+            # Obtener ID de la cita
+            cita_id = values[0]
+            self.show_appointment_details_window(cita_id)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando detalles: {str(e)}")
+    
+    def create_appointment_context_menu(self):
+        """Crear menú contextual para las citas"""
+        self.appointment_context_menu = tk.Menu(self.root, tearoff=0)
+        
+        # Agregar opciones al menú con iconos y colores
+        self.appointment_context_menu.add_command(
+            label="👁️ Ver Detalles", 
+            command=self.context_view_details,
+            font=('Arial', 10)
+        )
+        self.appointment_context_menu.add_separator()
+        
+        self.appointment_context_menu.add_command(
+            label="🟡 Iniciar Cita", 
+            command=self.context_start_appointment,
+            font=('Arial', 10)
+        )
+        self.appointment_context_menu.add_command(
+            label="🔵 Confirmar Cita", 
+            command=self.context_confirm_appointment,
+            font=('Arial', 10)
+        )
+        self.appointment_context_menu.add_command(
+            label="✅ Completar Cita", 
+            command=self.context_complete_appointment,
+            font=('Arial', 10)
+        )
+        self.appointment_context_menu.add_separator()
+        
+        self.appointment_context_menu.add_command(
+            label="❌ Cancelar Cita", 
+            command=self.context_cancel_appointment,
+            font=('Arial', 10)
+        )
+    
+    def show_context_menu(self, event):
+        """Mostrar menú contextual en la posición del clic derecho"""
+        try:
+            # Identificar la fila donde se hizo clic derecho
+            item = self.doctor_appointments_tree.identify_row(event.y)
+            if not item:
+                return
+            
+            # Forzar la selección de la fila
+            self.doctor_appointments_tree.selection_set(item)
+            self.doctor_appointments_tree.focus(item)
+            
+            # Mostrar el menú en la posición del cursor
+            self.appointment_context_menu.post(event.x_root, event.y_root)
+                    
+        except Exception as e:
+            print(f"Error mostrando menú contextual: {e}")
+            messagebox.showerror("Error", f"Error mostrando menú: {str(e)}")
+    
+    def update_context_menu_state(self, estado):
+        """Actualizar el estado de las opciones del menú según el estado de la cita"""
+        try:
+            # Índices de las opciones en el menú
+            # 0: Ver Detalles, 1: Separador, 2: Iniciar, 3: Confirmar, 4: Completar, 5: Separador, 6: Cancelar
+            
+            # Siempre habilitar "Ver Detalles"
+            self.appointment_context_menu.entryconfig(0, state='normal')
+            
+            if estado == 'programada':
+                # Cita programada: se puede iniciar, confirmar o cancelar
+                self.appointment_context_menu.entryconfig(2, state='normal')   # Iniciar
+                self.appointment_context_menu.entryconfig(3, state='normal')   # Confirmar
+                self.appointment_context_menu.entryconfig(4, state='disabled') # Completar
+                self.appointment_context_menu.entryconfig(6, state='normal')   # Cancelar
+                
+            elif estado == 'confirmada':
+                # Cita confirmada: se puede iniciar, completar o cancelar
+                self.appointment_context_menu.entryconfig(2, state='normal')   # Iniciar
+                self.appointment_context_menu.entryconfig(3, state='disabled') # Confirmar
+                self.appointment_context_menu.entryconfig(4, state='normal')   # Completar
+                self.appointment_context_menu.entryconfig(6, state='normal')   # Cancelar
+                
+            elif estado == 'en_curso':
+                # Cita en curso: solo se puede completar
+                self.appointment_context_menu.entryconfig(2, state='disabled') # Iniciar
+                self.appointment_context_menu.entryconfig(3, state='disabled') # Confirmar
+                self.appointment_context_menu.entryconfig(4, state='normal')   # Completar
+                self.appointment_context_menu.entryconfig(6, state='disabled') # Cancelar
+                
+            else:  # completada, cancelada
+                # Cita terminada: solo ver detalles
+                self.appointment_context_menu.entryconfig(2, state='disabled') # Iniciar
+                self.appointment_context_menu.entryconfig(3, state='disabled') # Confirmar
+                self.appointment_context_menu.entryconfig(4, state='disabled') # Completar
+                self.appointment_context_menu.entryconfig(6, state='disabled') # Cancelar
+                
+        except Exception as e:
+            print(f"Error actualizando menú contextual: {e}")
+    
+    # Métodos para manejar las acciones del menú contextual
+    def context_view_details(self):
+        """Ver detalles desde menú contextual"""
+        try:
+            selection = self.doctor_appointments_tree.selection()
+            if selection:
+                item = selection[0]
+                values = self.doctor_appointments_tree.item(item, 'values')
+                if values:
+                    cita_id = values[0]
+                    self.show_appointment_details_window(cita_id)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando detalles: {str(e)}")
+    
+    def context_complete_appointment(self):
+        """Completar cita desde menú contextual"""
+        try:
+            selection = self.doctor_appointments_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay cita seleccionada")
+                return
+                
+            item = selection[0]
+            values = self.doctor_appointments_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos de la cita")
+                return
+                
+            appointment_id = values[0]
+            
+            # Confirmar acción
+            result = messagebox.askyesno("Confirmar", 
+                                       f"¿Completar la cita con {values[2]}?")
+            if result:
+                # Completar la cita
+                self.change_appointment_status(appointment_id, 'completada')
+                messagebox.showinfo("Éxito", "Cita completada exitosamente")
+                # Recargar la lista
+                self.load_filtered_appointments()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error completando cita: {str(e)}")
+    
+    def context_cancel_appointment(self):
+        """Cancelar cita desde menú contextual"""
+        try:
+            selection = self.doctor_appointments_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay cita seleccionada")
+                return
+                
+            item = selection[0]
+            values = self.doctor_appointments_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos de la cita")
+                return
+                
+            appointment_id = values[0]
+            
+            # Confirmar acción
+            result = messagebox.askyesno("Confirmar", 
+                                       f"¿Cancelar la cita con {values[2]}?")
+            if result:
+                # Cancelar la cita
+                self.change_appointment_status(appointment_id, 'cancelada')
+                messagebox.showinfo("Éxito", "Cita cancelada exitosamente")
+                # Recargar la lista
+                self.load_filtered_appointments()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error cancelando cita: {str(e)}")
+    
+    def context_confirm_appointment(self):
+        """Confirmar cita desde menú contextual"""
+        try:
+            selection = self.doctor_appointments_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay cita seleccionada")
+                return
+                
+            item = selection[0]
+            values = self.doctor_appointments_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos de la cita")
+                return
+                
+            appointment_id = values[0]
+            
+            # Confirmar acción
+            result = messagebox.askyesno("Confirmar", 
+                                       f"¿Confirmar la cita con {values[2]}?")
+            if result:
+                # Confirmar la cita
+                self.change_appointment_status(appointment_id, 'confirmada')
+                messagebox.showinfo("Éxito", "Cita confirmada exitosamente")
+                # Recargar la lista
+                self.load_filtered_appointments()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error confirmando cita: {str(e)}")
+    
+    def context_start_appointment(self):
+        """Iniciar cita desde menú contextual"""
+        try:
+            selection = self.doctor_appointments_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay cita seleccionada")
+                return
+                
+            item = selection[0]
+            values = self.doctor_appointments_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos de la cita")
+                return
+                
+            appointment_id = values[0]
+            
+            # Confirmar acción
+            result = messagebox.askyesno("Confirmar", 
+                                       f"¿Iniciar la cita con {values[2]}?")
+            if result:
+                # Iniciar la cita
+                self.change_appointment_status(appointment_id, 'en_curso')
+                messagebox.showinfo("Éxito", "Cita iniciada exitosamente")
+                # Recargar la lista
+                self.load_filtered_appointments()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error iniciando cita: {str(e)}")
+    
+    def show_appointment_details_window(self, cita_id):
+        """Mostrar ventana emergente con detalles completos de la cita"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Obtener datos completos de la cita
+            query = """
+                SELECT 
+                    c.id, c.fecha_hora, c.motivo, c.estado, c.duracion_minutos,
+                    c.notas, c.tarifa_consulta, c.seguro_aplicable,
+                    u.nombre, u.apellido, u.email, u.telefono,
+                    u.fecha_nacimiento, u.direccion
+                FROM citas c
+                JOIN usuarios u ON c.paciente_id = u.id
+                WHERE c.id = ? AND c.doctor_id = ?
+            """
+            
+            cursor.execute(query, (cita_id, self.current_user.id))
+            cita_data = cursor.fetchone()
+            
+            if not cita_data:
+                messagebox.showerror("Error", "Cita no encontrada")
+                return
+            
+            # Crear ventana de detalles
+            details_window = tk.Toplevel(self.root)
+            details_window.title("Detalles de la Cita Médica")
+            details_window.geometry("600x500")
+            details_window.configure(bg='white')
+            details_window.transient(self.root)
+            details_window.grab_set()
+            
+            # Header de la ventana
+            header_frame = tk.Frame(details_window, bg='#1E3A8A', height=80)
+            header_frame.pack(fill='x')
+            header_frame.pack_propagate(False)
+            
+            header_content = tk.Frame(header_frame, bg='#1E3A8A')
+            header_content.pack(expand=True, fill='both', padx=20, pady=15)
+            
+            tk.Label(header_content, text="📋 DETALLES DE LA CITA MÉDICA", 
+                    font=('Arial', 16, 'bold'), bg='#1E3A8A', fg='white').pack()
+            
+            # Contenido principal
+            main_content = tk.Frame(details_window, bg='white')
+            main_content.pack(fill='both', expand=True, padx=20, pady=20)
+            
+            # Crear notebook para organizar la información
+            notebook = ttk.Notebook(main_content)
+            notebook.pack(fill='both', expand=True)
+            
+            # Pestaña 1: Información del Paciente
+            patient_frame = ttk.Frame(notebook)
+            notebook.add(patient_frame, text="👤 Paciente")
+            
+            # Información del paciente
+            patient_info_frame = tk.Frame(patient_frame, bg='white', padx=20, pady=15)
+            patient_info_frame.pack(fill='both', expand=True)
+            
+            paciente_nombre = f"{cita_data[8]} {cita_data[9]}"
+            
+            # Header del paciente
+            patient_header = tk.Frame(patient_info_frame, bg='#F3F4F6', padx=15, pady=10)
+            patient_header.pack(fill='x', pady=(0, 15))
+            
+            tk.Label(patient_header, text=paciente_nombre, 
+                    font=('Arial', 18, 'bold'), bg='#F3F4F6', fg='#059669').pack()
+            
+            # Datos del paciente
+            patient_data = [
+                ("📧 Email:", cita_data[10] or "No especificado"),
+                ("📞 Teléfono:", cita_data[11] or "No especificado"),
+                ("🎂 Fecha de Nacimiento:", cita_data[12] or "No especificada"),
+                ("🏠 Dirección:", cita_data[13] or "No especificada")
+            ]
+            
+            for label, value in patient_data:
+                info_frame = tk.Frame(patient_info_frame, bg='white')
+                info_frame.pack(fill='x', pady=5)
+                
+                tk.Label(info_frame, text=label, font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(side='left')
+                tk.Label(info_frame, text=value, font=('Arial', 11), 
+                        bg='white', fg='#6B7280').pack(side='left', padx=(10, 0))
+            
+            # Pestaña 2: Detalles de la Cita
+            appointment_frame = ttk.Frame(notebook)
+            notebook.add(appointment_frame, text="📅 Cita")
+            
+            # Información de la cita
+            cita_info_frame = tk.Frame(appointment_frame, bg='white', padx=20, pady=15)
+            cita_info_frame.pack(fill='both', expand=True)
+            
+            # Formatear fecha
+            try:
+                dt = datetime.fromisoformat(cita_data[1])
+                fecha_formateada = dt.strftime('%d de %B de %Y a las %H:%M')
+            except:
+                fecha_formateada = cita_data[1]
+            
+            # Determinar tipo de cita
+            motivo = cita_data[2] or "Sin especificar"
+            tipo_cita = "Urgencia" if any(palabra in motivo.lower() for palabra in ['urgencia', 'emergencia']) else \
+                       "Control" if any(palabra in motivo.lower() for palabra in ['control', 'seguimiento']) else \
+                       "Consulta Regular"
+            
+            # Datos de la cita
+            cita_info = [
+                ("🕐 Fecha y Hora:", fecha_formateada),
+                ("🏥 Motivo:", motivo),
+                ("⏱️ Duración:", f"{cita_data[4] or 30} minutos"),
+                ("🔄 Estado:", cita_data[3].capitalize()),
+                ("🚨 Tipo:", tipo_cita),
+                ("💰 Tarifa:", f"RD$ {cita_data[6]:,.2f}" if cita_data[6] else "No definida"),
+                ("🏥 Seguro:", "Sí" if cita_data[7] else "No")
+            ]
+            
+            for label, value in cita_info:
+                info_frame = tk.Frame(cita_info_frame, bg='white')
+                info_frame.pack(fill='x', pady=5)
+                
+                tk.Label(info_frame, text=label, font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(side='left')
+                tk.Label(info_frame, text=value, font=('Arial', 11), 
+                        bg='white', fg='#6B7280').pack(side='left', padx=(10, 0))
+            
+            # Pestaña 3: Notas
+            notes_frame = ttk.Frame(notebook)
+            notebook.add(notes_frame, text="📝 Notas")
+            
+            notes_content = tk.Frame(notes_frame, bg='white', padx=20, pady=15)
+            notes_content.pack(fill='both', expand=True)
+            
+            tk.Label(notes_content, text="📝 Notas Médicas:", 
+                    font=('Arial', 12, 'bold'), bg='white', fg='#374151').pack(anchor='w', pady=(0, 10))
+            
+            # Área de texto para notas
+            notes_text = tk.Text(notes_content, height=10, font=('Arial', 10), 
+                               bg='#F9FAFB', wrap='word', relief='solid', bd=1)
+            notes_text.pack(fill='both', expand=True)
+            
+            if cita_data[5]:
+                notes_text.insert('1.0', cita_data[5])
+            else:
+                notes_text.insert('1.0', "No hay notas médicas registradas para esta cita.")
+            
+            notes_text.config(state='disabled')
+            
+            # Botones de acción en la ventana
+            buttons_frame = tk.Frame(details_window, bg='white')
+            buttons_frame.pack(fill='x', padx=20, pady=(0, 20))
+            
+            tk.Button(buttons_frame, text="🖨️ Imprimir", bg='#6B7280', fg='white',
+                     font=('Arial', 10, 'bold'), padx=20, pady=8,
+                     command=lambda: self.print_appointment_details(cita_data)).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="❌ Cerrar", bg='#EF4444', fg='white',
+                     font=('Arial', 10, 'bold'), padx=20, pady=8,
+                     command=details_window.destroy).pack(side='right', padx=5)
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando detalles: {str(e)}")
+    
+    def print_appointment_details(self, cita_data):
+        """Función placeholder para imprimir detalles"""
+        messagebox.showinfo("Imprimir", "Función de impresión en desarrollo")
+    
+    def create_doctor_patients(self, parent):
+        """Gestión moderna de pacientes para doctores con diseño mejorado"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header principal con diseño moderno
+        header_frame = tk.Frame(main_frame, bg='#059669', height=100, relief='solid', bd=1)
+        header_frame.pack(fill='x', pady=(0, 25))
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#059669')
+        header_content.pack(expand=True, fill='both', padx=25, pady=15)
+        
+        # Lado izquierdo - Título e icono
+        left_header = tk.Frame(header_content, bg='#059669')
+        left_header.pack(side='left', fill='both', expand=True)
+        
+        # Icono de pacientes
+        icon_frame = tk.Frame(left_header, bg='#047857', width=60, height=60)
+        icon_frame.pack(side='left', padx=(0, 15))
+        icon_frame.pack_propagate(False)
+        tk.Label(icon_frame, text="🤒", font=('Arial', 30), bg='#047857', fg='white').pack(expand=True)
+        
+        # Título y descripción
+        title_frame = tk.Frame(left_header, bg='#059669')
+        title_frame.pack(side='left', fill='both', expand=True)
+        
+        tk.Label(title_frame, text="Mis Pacientes", 
+                font=('Arial', 20, 'bold'), bg='#059669', fg='white').pack(anchor='w')
+        tk.Label(title_frame, text="Gestiona la información de tus pacientes", 
+                font=('Arial', 12), bg='#059669', fg='#D1FAE5').pack(anchor='w')
+        
+        # Lado derecho - Estadísticas rápidas
+        right_header = tk.Frame(header_content, bg='#059669')
+        right_header.pack(side='right')
+        
+        try:
+            # Obtener estadísticas de pacientes
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Total de pacientes del doctor
+            cursor.execute("""
+                SELECT COUNT(DISTINCT c.paciente_id) 
+                FROM citas c 
+                WHERE c.doctor_id = ?
+            """, (self.current_user.id,))
+            total_pacientes = cursor.fetchone()[0]
+            
+            # Pacientes atendidos este mes
+            cursor.execute("""
+                SELECT COUNT(DISTINCT c.paciente_id) 
+                FROM citas c 
+                WHERE c.doctor_id = ? AND strftime('%Y-%m', c.fecha_hora) = strftime('%Y-%m', 'now')
+            """, (self.current_user.id,))
+            pacientes_mes = cursor.fetchone()[0]
+            
+            cursor.close()
+            conn.close()
+            
+            # Mostrar estadísticas
+            stats_frame = tk.Frame(right_header, bg='#047857', padx=20, pady=10)
+            stats_frame.pack()
+            
+            tk.Label(stats_frame, text=f"Total: {total_pacientes}", 
+                    font=('Arial', 14, 'bold'), bg='#047857', fg='white').pack()
+            tk.Label(stats_frame, text=f"Este mes: {pacientes_mes}", 
+                    font=('Arial', 12), bg='#047857', fg='#D1FAE5').pack()
+            
+        except Exception as e:
+            tk.Label(right_header, text="Error estadísticas", 
+                    font=('Arial', 10), bg='#059669', fg='#EF4444').pack()
+        
+        # Panel de filtros y búsqueda
+        controls_panel = tk.Frame(main_frame, bg='white', relief='solid', bd=1, height=80)
+        controls_panel.pack(fill='x', pady=(0, 15))
+        controls_panel.pack_propagate(False)
+        
+        controls_content = tk.Frame(controls_panel, bg='white')
+        controls_content.pack(expand=True, fill='both', padx=20, pady=15)
+        
+        # Filtros y búsqueda
+        filters_frame = tk.Frame(controls_content, bg='white')
+        filters_frame.pack(side='left', fill='both', expand=True)
+        
+        tk.Label(filters_frame, text="🔍 Buscar paciente:", font=('Arial', 12, 'bold'), 
+                bg='white', fg='#1F2937').pack(side='left', padx=(0, 10))
+        
+        # Campo de búsqueda
+        self.patient_search_entry = tk.Entry(filters_frame, font=('Arial', 11), width=25,
+                                           relief='solid', bd=1)
+        self.patient_search_entry.pack(side='left', padx=5)
+        self.patient_search_entry.bind('<KeyRelease>', self.search_patients)
+        
+        # Filtro por estado
+        tk.Label(filters_frame, text="Estado:", font=('Arial', 10), 
+                bg='white', fg='#6B7280').pack(side='left', padx=(15, 5))
+        
+        self.patient_status_filter = ttk.Combobox(filters_frame, 
+                                                values=['Todos', 'Activo', 'Inactivo'], 
+                                                state='readonly', width=10, font=('Arial', 10))
+        self.patient_status_filter.set('Todos')
+        self.patient_status_filter.pack(side='left', padx=5)
+        self.patient_status_filter.bind('<<ComboboxSelected>>', self.filter_patients)
+        
+        # Botones de acción rápida
+        actions_frame = tk.Frame(controls_content, bg='white')
+        actions_frame.pack(side='right')
+        
+        quick_actions = [
+            ("🔄 Actualizar", self.refresh_patients, '#3B82F6'),
+            ("📊 Estadísticas", self.show_patient_stats, '#8B5CF6')
+        ]
+        
+        for text, command, color in quick_actions:
+            btn = tk.Button(actions_frame, text=text, bg=color, fg='white',
+                           font=('Arial', 9, 'bold'), relief='flat', 
+                           padx=12, pady=6, cursor='hand2', command=command)
+            btn.pack(side='left', padx=3)
+        
+        # Contenedor principal para la tabla
+        content_container = tk.Frame(main_frame, bg='#F8FAFC')
+        content_container.pack(fill='both', expand=True)
+        
+        # Título del panel
+        list_title_frame = tk.Frame(content_container, bg='white', height=40, relief='solid', bd=1)
+        list_title_frame.pack(fill='x', pady=(0, 5))
+        list_title_frame.pack_propagate(False)
+        
+        tk.Label(list_title_frame, text="📋 Lista de Pacientes - Clic derecho para acciones", 
+                font=('Arial', 14, 'bold'), bg='white', fg='#1F2937').pack(side='left', padx=15, pady=12)
+        
+        # Contenedor de la tabla con diseño moderno
+        table_container = tk.Frame(content_container, bg='white', relief='solid', bd=1)
+        table_container.pack(fill='both', expand=True)
+        
+        # Tabla de pacientes con columnas mejoradas
+        columns = ('ID', 'Nombre', 'Apellido', 'Email', 'Teléfono', 'Última Consulta', 'Estado')
+        self.doctor_patients_tree = VirtualTreeview(table_container, columns=columns, show='headings', height=15,
+                                                    formatter=self.format_doctor_patient_row,
+                                                    tasks=self.get_background_tasks())
+        
+        # Configurar headers con mejor diseño
+        column_configs = {
+            'ID': 50,
+            'Nombre': 150,
+            'Apellido': 150,
+            'Email': 200,
+            'Teléfono': 120,
+            'Última Consulta': 150,
+            'Estado': 100
+        }
+        
+        for col in columns:
+            self.doctor_patients_tree.heading(col, text=col, anchor='center')
+            self.doctor_patients_tree.column(col, width=column_configs.get(col, 100), anchor='center')
+        
+        # Scrollbars con mejor diseño
+        scrollbar_y = ttk.Scrollbar(table_container, orient="vertical", command=self.doctor_patients_tree.yview)
+        scrollbar_x = ttk.Scrollbar(table_container, orient="horizontal", command=self.doctor_patients_tree.xview)
+        self.doctor_patients_tree.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        
+        # Layout con grid
+        self.doctor_patients_tree.grid(row=0, column=0, sticky='nsew')
+        scrollbar_y.grid(row=0, column=1, sticky='ns')
+        scrollbar_x.grid(row=1, column=0, sticky='ew')
+        
+        table_container.grid_rowconfigure(0, weight=1)
+        table_container.grid_columnconfigure(0, weight=1)
+        
+        # Panel de acciones para el paciente seleccionado
+        actions_panel = tk.Frame(main_frame, bg='white', relief='solid', bd=1, height=60)
+        actions_panel.pack(fill='x', pady=(15, 0))
+        actions_panel.pack_propagate(False)
+        
+        actions_content = tk.Frame(actions_panel, bg='white')
+        actions_content.pack(expand=True, fill='both', padx=20, pady=10)
+        
+        tk.Label(actions_content, text="⚡ Acciones:", font=('Arial', 12, 'bold'), 
+                bg='white', fg='#1F2937').pack(side='left', padx=(0, 15))
+        
+        # Botones de acción principales
+        action_buttons = [
+            ("👤 Ver Perfil", self.view_patient_profile, '#3B82F6'),
+            ("📋 Ver Historial", self.view_medical_history, '#10B981'),
+            ("📅 Nueva Cita", self.schedule_appointment, '#8B5CF6')
+        ]
+        
+        for text, command, color in action_buttons:
+            btn = tk.Button(actions_content, text=text, bg=color, fg='white',
+                           font=('Arial', 10, 'bold'), relief='flat', 
+                           padx=15, pady=8, cursor='hand2', command=command)
+            btn.pack(side='left', padx=5)
+            
+            # Efecto hover
+            def on_enter(e, btn=btn, original_color=color):
+                btn.configure(bg=self.darken_color(original_color))
+            def on_leave(e, btn=btn, original_color=color):
+                btn.configure(bg=original_color)
+            
+            btn.bind("<Enter>", on_enter)
+            btn.bind("<Leave>", on_leave)
+        
+        # Crear menú contextual para pacientes
+        self.create_patient_context_menu()
+        
+        # Bind para menú contextual
+        self.doctor_patients_tree.bind('<Button-3>', self.show_patient_context_menu)
+        
+        # Cargar datos iniciales
+        self.load_doctor_patients()
+    
+    def create_patient_context_menu(self):
+        """Crear menú contextual para pacientes"""
+        self.patient_context_menu = tk.Menu(self.root, tearoff=0)
+        
+        # Opciones del menú
+        self.patient_context_menu.add_command(
+            label="👤 Ver Perfil Completo", 
+            command=self.context_view_patient_profile,
+            font=('Arial', 10)
+        )
+        self.patient_context_menu.add_separator()
+        
+        self.patient_context_menu.add_command(
+            label="📋 Ver Historial Médico", 
+            command=self.context_view_medical_history,
+            font=('Arial', 10)
+        )
+        self.patient_context_menu.add_command(
+            label="📅 Programar Nueva Cita", 
+            command=self.context_schedule_appointment,
+            font=('Arial', 10)
+        )
+    
+    def show_patient_context_menu(self, event):
+        """Mostrar menú contextual en la posición del clic derecho"""
+        try:
+            # Identificar la fila donde se hizo clic derecho
+            item = self.doctor_patients_tree.identify_row(event.y)
+            if not item:
+                return
+            
+            # Forzar la selección de la fila
+            self.doctor_patients_tree.selection_set(item)
+            self.doctor_patients_tree.focus(item)
+            
+            # Mostrar el menú en la posición del cursor
+            self.patient_context_menu.post(event.x_root, event.y_root)
+                    
+        except Exception as e:
+            print(f"Error mostrando menú contextual de pacientes: {e}")
+            messagebox.showerror("Error", f"Error mostrando menú: {str(e)}")
+    
+    def context_view_patient_profile(self):
+        """Ver perfil del paciente desde menú contextual"""
+        try:
+            selection = self.doctor_patients_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay paciente seleccionado")
+                return
+                
+            item = selection[0]
+            values = self.doctor_patients_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos del paciente")
+                return
+                
+            # Llamar al método de ver perfil
+            self.view_patient_profile()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando perfil: {str(e)}")
+    
+    def context_view_medical_history(self):
+        """Ver historial médico desde menú contextual"""
+        try:
+            selection = self.doctor_patients_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay paciente seleccionado")
+                return
+                
+            item = selection[0]
+            values = self.doctor_patients_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos del paciente")
+                return
+                
+            # Llamar al método de ver historial
+            self.view_medical_history()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando historial: {str(e)}")
+    
+    def context_schedule_appointment(self):
+        """Programar cita desde menú contextual"""
+        try:
+            selection = self.doctor_patients_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "No hay paciente seleccionado")
+                return
+                
+            item = selection[0]
+            values = self.doctor_patients_tree.item(item, 'values')
+            if not values:
+                messagebox.showwarning("Advertencia", "Error obteniendo datos del paciente")
+                return
+                
+            # Llamar al método de programar cita
+            self.schedule_appointment()
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error programando cita: {str(e)}")
+    
+    def filter_patients(self, event=None):
+        """Filtrar pacientes por estado"""
+        try:
+            self.load_doctor_patients()
+        except Exception as e:
+            print(f"Error filtrando pacientes: {e}")
+    
+    def refresh_patients(self):
+        """Actualizar lista de pacientes"""
+        try:
+            self.load_doctor_patients()
+            messagebox.showinfo("Actualizado", "Lista de pacientes actualizada")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error actualizando pacientes: {str(e)}")
+    
+    def show_patient_stats(self):
+        """Mostrar estadísticas de pacientes"""
+        try:
+            messagebox.showinfo("Estadísticas", "Función de estadísticas en desarrollo")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando estadísticas: {str(e)}")
+    
+    def create_medical_records(self, parent):
+        """Gestión de historiales médicos"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header
+        header_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        tk.Label(header_frame, text="Historiales Médicos", 
+                font=('Arial', 16, 'bold'), bg='#F8FAFC').pack(side='left')
+        
+        tk.Button(header_frame, text="➕ Nuevo Historial", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), command=self.create_medical_record).pack(side='right')
+        
+        # Panel dividido
+        paned_window = ttk.PanedWindow(main_frame, orient='horizontal')
+        paned_window.pack(fill='both', expand=True)
+        
+        # Panel izquierdo - Lista de pacientes
+        left_frame = ttk.Frame(paned_window)
+        paned_window.add(left_frame, weight=1)
+        
+        tk.Label(left_frame, text="Seleccionar Paciente", font=('Arial', 12, 'bold')).pack(pady=5)
+        
+        # Lista de pacientes
+        self.medical_patients_listbox = tk.Listbox(left_frame, font=('Arial', 10))
+        self.medical_patients_listbox.pack(fill='both', expand=True, padx=5, pady=5)
+        self.medical_patients_listbox.bind('<<ListboxSelect>>', self.load_patient_medical_records)
+        
+        # Panel derecho - Historiales
+        right_frame = ttk.Frame(paned_window)
+        paned_window.add(right_frame, weight=2)
+        
+        tk.Label(right_frame, text="Historiales Médicos", font=('Arial', 12, 'bold')).pack(pady=5)
+        
+        # Búsqueda por diagnóstico/tratamiento en todos los pacientes del doctor
+        records_search_frame = tk.Frame(right_frame)
+        records_search_frame.pack(fill='x', padx=5, pady=(0, 5))
+        
+        tk.Label(records_search_frame, text="🔍 Buscar en historiales:", font=('Arial', 10)).pack(side='left')
+        self.medical_records_search_var = tk.StringVar()
+        records_search_entry = tk.Entry(records_search_frame, textvariable=self.medical_records_search_var,
+                                        font=('Arial', 10))
+        records_search_entry.pack(side='left', fill='x', expand=True, padx=5)
+        records_search_entry.bind('<Return>', self.search_medical_records)
+        tk.Button(records_search_frame, text="Buscar", bg='#0B5394', fg='white',
+                 command=self.search_medical_records).pack(side='left')
+        
+        # Frame contenedor para tabla con scrollbars
+        table_container = tk.Frame(right_frame)
+        table_container.pack(fill='both', expand=True, padx=5)
+        
+        # Tabla de historiales
+        columns = ('Fecha', 'Paciente', 'Diagnóstico', 'Tratamiento', 'Notas')
+        self.medical_records_tree = ttk.Treeview(table_container, columns=columns, show='headings', height=12)
+        
+        for col in columns:
+            self.medical_records_tree.heading(col, text=col)
+            if col == 'Fecha':
+                self.medical_records_tree.column(col, width=100)
+            else:
+                self.medical_records_tree.column(col, width=150)
+        
+        # Scrollbars para historiales
+        records_scrollbar_y = ttk.Scrollbar(table_container, orient="vertical", command=self.medical_records_tree.yview)
+        records_scrollbar_x = ttk.Scrollbar(table_container, orient="horizontal", command=self.medical_records_tree.xview)
+        self.medical_records_tree.configure(yscrollcommand=records_scrollbar_y.set, xscrollcommand=records_scrollbar_x.set)
+        
+        # Layout con grid para mejor control
+        self.medical_records_tree.grid(row=0, column=0, sticky='nsew')
+        records_scrollbar_y.grid(row=0, column=1, sticky='ns')
+        records_scrollbar_x.grid(row=1, column=0, sticky='ew')
+        
+        # Configurar expansión
+        table_container.grid_rowconfigure(0, weight=1)
+        table_container.grid_columnconfigure(0, weight=1)
+        
+        # Botones para historiales
+        records_actions_frame = tk.Frame(right_frame)
+        records_actions_frame.pack(fill='x', pady=5)
+        
+        tk.Button(records_actions_frame, text="👁️ Ver Detalle", bg='#0B5394', fg='white',
+                 command=self.view_medical_record_detail).pack(side='left', padx=5)
+        tk.Button(records_actions_frame, text="✏️ Editar", bg='#0B5394', fg='white',
+                 command=self.edit_medical_record).pack(side='left', padx=5)
+        tk.Button(records_actions_frame, text="🖨️ Imprimir", bg='#0B5394', fg='white',
+                 command=self.print_medical_record).pack(side='left', padx=5)
+        
+        # Cargar pacientes
+        self.load_medical_patients()
+    
+    def create_doctor_profile(self, parent):
+        """Perfil del doctor"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Título
+        tk.Label(main_frame, text="Mi Perfil Profesional", 
+                font=('Arial', 18, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(0, 20))
+        
+        # Frame principal del perfil
+        profile_main_frame = tk.Frame(main_frame, bg='white', relief='solid', bd=1)
+        profile_main_frame.pack(fill='both', expand=True, padx=20, pady=10)
+        
+        # Panel izquierdo - Información personal
+        left_panel = tk.Frame(profile_main_frame, bg='white')
+        left_panel.pack(side='left', fill='both', expand=True, padx=20, pady=20)
+        
+        # Avatar y datos básicos
+        avatar_frame = tk.Frame(left_panel, bg='#0B5394', width=100, height=100)
+        avatar_frame.pack(pady=(0, 20))
+        avatar_frame.pack_propagate(False)
+        tk.Label(avatar_frame, text="👨‍⚕️", font=('Arial', 50), bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Información personal
+        info_fields = [
+            ("Nombre:", f"{self.current_user.nombre} {self.current_user.apellido}"),
+            ("Email:", self.current_user.email),
+            ("Teléfono:", self.current_user.telefono),
+            ("Especialidad:", getattr(self.current_user, 'especialidad', 'Medicina General')),
+            ("Cédula Profesional:", getattr(self.current_user, 'cedula_profesional', 'No especificada'))
+        ]
+        
+        for label, value in info_fields:
+            field_frame = tk.Frame(left_panel, bg='white')
+            field_frame.pack(fill='x', pady=5)
+            
+            tk.Label(field_frame, text=label, font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#1E3A8A').pack(side='left')
+            tk.Label(field_frame, text=value, font=('Arial', 11), 
+                    bg='white', fg='#64748B').pack(side='left', padx=(10, 0))
+        
+        # Panel derecho - Configuraciones
+        right_panel = tk.Frame(profile_main_frame, bg='#F8FAFC')
+        right_panel.pack(side='right', fill='both', expand=True, padx=20, pady=20)
+        
+        # Configuraciones
+        config_frame = tk.LabelFrame(right_panel, text="Configuraciones", 
+                                   font=('Arial', 12, 'bold'), padx=15, pady=10)
+        config_frame.pack(fill='x', pady=(0, 20))
+        
+        tk.Button(config_frame, text="🔧 Editar Perfil", bg='#0B5394', fg='white',
+                 font=('Arial', 10), command=self.edit_doctor_profile).pack(fill='x', pady=5)
+        tk.Button(config_frame, text="🔑 Cambiar Contraseña", bg='#0B5394', fg='white',
+                 font=('Arial', 10), command=self.change_password).pack(fill='x', pady=5)
+        tk.Button(config_frame, text="⏰ Configurar Horarios", bg='#0B5394', fg='white',
+                 font=('Arial', 10), command=self.configure_schedule).pack(fill='x', pady=5)
+        
+        # Estadísticas profesionales
+        stats_frame = tk.LabelFrame(right_panel, text="Estadísticas", 
+                                  font=('Arial', 12, 'bold'), padx=15, pady=10)
+        stats_frame.pack(fill='both', expand=True)
+        
+        try:
+            doctor_stats = self.get_doctor_stats()
+            
+            stats_text = f"""
+📅 Total de Consultas: {doctor_stats.get('total_consultations', 0)}
+🤒 Pacientes Atendidos: {doctor_stats.get('total_patients', 0)}
+💰 Ingresos Totales: RD$ {doctor_stats.get('total_income', 0):,.2f}
+⭐ Promedio Mensual: {doctor_stats.get('avg_monthly', 0)} consultas
+📊 Este Mes: {doctor_stats.get('consultations_month', 0)} consultas
+            """
+            
+            tk.Label(stats_frame, text=stats_text, font=('Arial', 10), 
+                    justify='left', bg='#F8FAFC').pack(pady=10)
+                    
+        except Exception as e:
+            tk.Label(stats_frame, text=f"Error cargando estadísticas: {str(e)}", 
+                    fg='red', bg='#F8FAFC').pack(pady=10)
+    
+    # Funciones para obtener datos
+    def get_doctor_stats(self):
+        """Obtener estadísticas específicas del doctor"""
+        try:
+            # Contadores materializados: pocas filas sin importar el tamaño del historial
+            stats = dict(self.db_manager.get_doctor_counters(self.current_user.id))
+            
+            # Promedio mensual (aproximado)
+            if stats.get('total_consultations', 0) > 0:
+                stats['avg_monthly'] = stats['total_consultations'] // 12
+            else:
+                stats['avg_monthly'] = 0
+            
+            return stats
+            
+        except Exception as e:
+            print(f"Error obteniendo estadísticas del doctor: {e}")
+            return {}
+    
+    def get_doctor_upcoming_appointments(self):
+        """Obtener próximas citas del doctor"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            doctor_id = self.current_user.id
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            cursor.execute("""
+                SELECT c.*, u.nombre || ' ' || u.apellido as paciente_nombre
+                FROM citas c
+                JOIN usuarios u ON c.paciente_id = u.id
+                WHERE c.doctor_id = ? AND c.fecha_hora > ? AND c.estado = 'programada'
+                ORDER BY c.fecha_hora ASC
+            """, (doctor_id, now))
+            
+            appointments = []
+            for row in cursor.fetchall():
+                apt = dict(zip([col[0] for col in cursor.description], row))
+                # Formatear fecha/hora
+                try:
+                    dt = datetime.fromisoformat(apt['fecha_hora'])
+                    apt['fecha_hora_formatted'] = dt.strftime('%d/%m/%Y %H:%M')
+                except:
+                    apt['fecha_hora_formatted'] = apt['fecha_hora']
+                appointments.append(apt)
+            
+            cursor.close()
+            conn.close()
+            return appointments
+            
+        except Exception as e:
+            print(f"Error obteniendo próximas citas: {e}")
+            return []
+    
+    def filter_doctor_appointments(self, event=None):
+        """Filtrar citas según criterios seleccionados"""
+        self.load_filtered_appointments()
+    
+    def search_appointments_by_patient(self, event=None):
+        """Buscar citas por nombre de paciente"""
+        self.apply_appointment_filters()
+    
+    def refresh_appointments(self):
+        """Actualizar lista de citas"""
+        self.load_doctor_appointments()
+        messagebox.showinfo("Actualizado", "Lista de citas actualizada correctamente")
+    
+    def schedule_new_appointment(self):
+        """Programar nueva cita - placeholder"""
+        messagebox.showinfo("Función", "Función de nueva cita - implementar según necesidades")
+    
+    def show_appointment_stats(self):
+        """Mostrar estadísticas de citas"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Estadísticas básicas
+            stats_queries = {
+                'total': "SELECT COUNT(*) FROM citas WHERE doctor_id = ?",
+                'programadas': "SELECT COUNT(*) FROM citas WHERE doctor_id = ? AND estado = 'programada'",
+                'completadas': "SELECT COUNT(*) FROM citas WHERE doctor_id = ? AND estado = 'completada'",
+                'canceladas': "SELECT COUNT(*) FROM citas WHERE doctor_id = ? AND estado = 'cancelada'",
+                'hoy': "SELECT COUNT(*) FROM citas WHERE doctor_id = ? AND fecha = DATE('now')",
+                'semana': "SELECT COUNT(*) FROM citas WHERE doctor_id = ? AND fecha BETWEEN DATE('now', 'weekday 0', '-7 days') AND DATE('now', 'weekday 0')"
+            }
+            
+            stats = {}
+            for key, query in stats_queries.items():
+                cursor.execute(query, (self.current_user.id,))
+                stats[key] = cursor.fetchone()[0]
+            
+            cursor.close()
+            conn.close()
+            
+            # Mostrar estadísticas en ventana
+            stats_window = tk.Toplevel(self.root)
+            stats_window.title("Estadísticas de Citas")
+            stats_window.geometry("400x300")
+            stats_window.configure(bg='white')
+            
+            # Título
+            tk.Label(stats_window, text="📊 Estadísticas de Citas", 
+                    font=('Arial', 16, 'bold'), bg='white', fg='#1F2937').pack(pady=20)
+            
+            # Estadísticas
+            stats_frame = tk.Frame(stats_window, bg='white')
+            stats_frame.pack(fill='both', expand=True, padx=30)
+            
+            stats_labels = [
+                ("Total de Citas:", stats['total'], '#3B82F6'),
+                ("Programadas:", stats['programadas'], '#10B981'),
+                ("Completadas:", stats['completadas'], '#059669'),
+                ("Canceladas:", stats['canceladas'], '#EF4444'),
+                ("Citas Hoy:", stats['hoy'], '#F59E0B'),
+                ("Esta Semana:", stats['semana'], '#8B5CF6')
+            ]
+            
+            for label, value, color in stats_labels:
+                stat_frame = tk.Frame(stats_frame, bg='white')
+                stat_frame.pack(fill='x', pady=5)
+                
+                tk.Label(stat_frame, text=label, font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(side='left')
+                tk.Label(stat_frame, text=str(value), font=('Arial', 11, 'bold'), 
+                        bg='white', fg=color).pack(side='right')
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error obteniendo estadísticas: {str(e)}")
+    
+    def load_doctor_patients(self):
+        """Cargar pacientes del doctor"""
+        try:
+            self.get_doctor_patient_search().reset()
+            sql, params = self.doctor_patients_query(self.current_user.id)
+            self.doctor_patients_tree.set_source(QuerySource(self.db_manager, sql, params))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error cargando pacientes: {str(e)}")
+    
+    def doctor_patients_query(self, doctor_id, search_term=""):
+        """(sql, params) de los pacientes con citas del doctor, con su última consulta"""
+        search_filter = ""
+        params = [doctor_id]
+        if search_term:
+            # Prefijo de nombre, apellido o email (usa los índices NOCASE)
+            search_sql, search_params = name_prefix_filter(search_term, 'u.nombre', 'u.apellido', 'u.email')
+            search_filter = f"AND {search_sql}"
+            params.extend(search_params)
+        
+        sql = f"""
+            SELECT u.id, u.nombre, u.apellido, u.email, u.telefono,
+                   MAX(c.fecha_hora) as ultima_consulta,
+                   CASE WHEN u.activo THEN 'Activo' ELSE 'Inactivo' END as estado
+            FROM usuarios u
+            JOIN citas c ON u.id = c.paciente_id
+            WHERE c.doctor_id = ? AND u.tipo_usuario = 'paciente'
+              {search_filter}
+            GROUP BY u.id, u.nombre, u.apellido, u.email, u.telefono, u.activo
+            ORDER BY MAX(c.fecha_hora) DESC, u.id DESC
+        """
+        return sql, params
+    
+    def get_doctor_patient_search(self):
+        """Búsqueda incremental de la tabla de pacientes del doctor"""
+        search = getattr(self, 'doctor_patient_search', None)
+        if search is None or search.widget is not self.doctor_patients_tree:
+            self.doctor_patient_search = search = IncrementalSearch(
+                self.doctor_patients_tree, self.get_background_tasks(),
+                fetch=lambda term, limit, doctor_id: QuerySource(
+                    self.db_manager, *self.doctor_patients_query(doctor_id, term)).fetch_page(0, limit),
+                matches=lambda row, term: name_prefix_matches(term, row[1], row[2], row[3]),
+                on_results=self.show_doctor_patient_results,
+                key='doctor-patients-search', busy=self.doctor_patients_tree
+            )
+        return search
+    
+    def show_doctor_patient_results(self, term, rows):
+        """Mostrar el resultado de la búsqueda de pacientes del doctor"""
+        if rows is not None:
+            self.doctor_patients_tree.set_source(ListSource(rows))
+        else:
+            sql, params = self.doctor_patients_query(self.get_doctor_patient_search().scope, term)
+            self.doctor_patients_tree.set_source(QuerySource(self.db_manager, sql, params))
+    
+    def format_doctor_patient_row(self, row, index):
+        """Valores de una fila de la tabla de pacientes del doctor"""
+        # Formatear última consulta
+        ultima_consulta = row[5]
+        if ultima_consulta:
+            try:
+                dt = datetime.fromisoformat(ultima_consulta)
+                ultima_consulta_formatted = dt.strftime('%d/%m/%Y')
+            except:
+                ultima_consulta_formatted = ultima_consulta
+        else:
+            ultima_consulta_formatted = 'Nunca'
+        
+        return (row[0], row[1], row[2], row[3], row[4], ultima_consulta_formatted, row[6]), ()
+    
+    def load_medical_patients(self):
+        """Cargar pacientes para historiales médicos"""
+        try:
+            # Limpiar listbox
+            self.medical_patients_listbox.delete(0, tk.END)
+            
+            doctor_id = self.current_user.id
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT DISTINCT u.id, u.nombre || ' ' || u.apellido as nombre_completo
+                FROM usuarios u
+                JOIN citas c ON u.id = c.paciente_id
+                WHERE c.doctor_id = ? AND u.tipo_usuario = 'paciente'
+                ORDER BY nombre_completo
+            """, (doctor_id,))
+            
+            for row in cursor.fetchall():
+                self.medical_patients_listbox.insert(tk.END, f"{row[1]} (ID: {row[0]})")
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error cargando pacientes: {str(e)}")
+    
+    def complete_appointment_doctor_view(self):
+        """Marcar cita como completada - Vista de doctor"""
+        try:
+            appointment_id = self.get_appointment_id_from_selection()
+            if not appointment_id:
+                messagebox.showwarning("Advertencia", "Seleccione una cita para completar")
+                return
+            
+            # Obtener información de la cita
+            selection = self.doctor_appointments_tree.selection()
+            item = self.doctor_appointments_tree.item(selection[0])
+            paciente_nombre = item['values'][1]
+            estado = item['values'][3]
+            
+            if estado != 'programada':
+                messagebox.showwarning("Advertencia", "Solo se pueden completar citas programadas")
+                return
+            
+            # Confirmar acción
+            response = messagebox.askyesno("Confirmar", 
+                                         f"¿Confirma que la cita con {paciente_nombre} fue completada?")
+            
+            if response:
+                # Actualizar en base de datos
+                if self.update_appointment_status_db(appointment_id, 'completada'):
+                    messagebox.showinfo("Éxito", "Cita marcada como completada")
+                    self.load_doctor_appointments()  # Recargar datos
+                else:
+                    messagebox.showerror("Error", "No se pudo actualizar la cita")
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error completando cita: {str(e)}")
+    
+    def add_appointment_notes(self):
+        """Agregar notas a la cita seleccionada"""
+        try:
+            appointment_id = self.get_appointment_id_from_selection()
+            if not appointment_id:
+                messagebox.showwarning("Advertencia", "Seleccione una cita para agregar notas")
+                return
+            
+            # Obtener información de la cita
+            selection = self.doctor_appointments_tree.selection()
+            item = self.doctor_appointments_tree.item(selection[0])
+            paciente_nombre = item['values'][1]
+            fecha_hora = item['values'][0]
+            
+            # Ventana para notas
+            notes_window = tk.Toplevel(self.root)
+            notes_window.title("Agregar Notas")
+            notes_window.geometry("500x400")
+            notes_window.configure(bg='#F8FAFC')
+            notes_window.resizable(True, True)
+            notes_window.transient(self.root)
+            notes_window.grab_set()
+            
+            # Frame principal
+            main_frame = tk.Frame(notes_window, bg='#F8FAFC', padx=20, pady=20)
+            main_frame.pack(fill='both', expand=True)
+            
+            # Título
+            tk.Label(main_frame, text=f"📝 Notas - {paciente_nombre}", 
+                    font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(0, 10))
+            
+            tk.Label(main_frame, text=f"Cita: {fecha_hora}", 
+                    font=('Arial', 10), bg='#F8FAFC', fg='#6B7280').pack(pady=(0, 15))
+            
+            # Área de notas
+            tk.Label(main_frame, text="Notas de la consulta:", 
+                    font=('Arial', 11, 'bold'), bg='#F8FAFC').pack(anchor='w')
+            
+            notes_text = tk.Text(main_frame, height=15, width=60, font=('Arial', 10),
+                                wrap=tk.WORD, padx=10, pady=10)
+            notes_text.pack(pady=5, fill='both', expand=True)
+            
+            # Scrollbar
+            scrollbar = ttk.Scrollbar(notes_text, orient="vertical", command=notes_text.yview)
+            notes_text.configure(yscrollcommand=scrollbar.set)
+            
+            # Botones
+            buttons_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=15)
+            
+            def save_notes():
+                notes_content = notes_text.get("1.0", tk.END).strip()
+                if notes_content:
+                    # Guardar notas en base de datos
+                    if self.save_appointment_notes_db(appointment_id, notes_content):
+                        messagebox.showinfo("Éxito", "Notas guardadas correctamente")
+                        notes_window.destroy()
+                    else:
+                        messagebox.showerror("Error", "No se pudieron guardar las notas")
+                else:
+                    messagebox.showwarning("Advertencia", "Debe escribir alguna nota")
+            
+            tk.Button(buttons_frame, text="💾 Guardar Notas", bg='#059669', fg='white',
+                     font=('Arial', 10, 'bold'), command=save_notes).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="Cerrar", bg='#6B7280', fg='white',
+                     font=('Arial', 10, 'bold'), command=notes_window.destroy).pack(side='right', padx=5)
+            
+            # Enfocar en el área de texto
+            notes_text.focus_set()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error agregando notas: {str(e)}")
+    
+    def search_patients(self, event=None):
+        """Buscar pacientes del doctor"""
+        self.get_doctor_patient_search().on_input(self.patient_search_entry.get(), self.current_user.id, event)
+    
+    def view_patient_profile(self):
+        """Ver perfil completo del paciente seleccionado"""
+        try:
+            selection = self.doctor_patients_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "Seleccione un paciente para ver su perfil")
+                return
+            
+            # Obtener información del paciente
+            item = self.doctor_patients_tree.item(selection[0])
+            patient_id = item['values'][0]  # ID está en índice 0
+            nombre = item['values'][1]      # Nombre está en índice 1
+            apellido = item['values'][2]    # Apellido está en índice 2
+            email = item['values'][3]       # Email está en índice 3
+            
+            # Buscar información completa del paciente por ID (más confiable)
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT u.*, p.numero_expediente, p.contacto_emergencia, p.telefono_emergencia,
+                       s.nombre as seguro_nombre
+                FROM usuarios u
+                LEFT JOIN pacientes p ON u.id = p.id
+                LEFT JOIN seguros_medicos s ON p.seguro_medico_id = s.id
+                WHERE u.id = ?
+            """, (patient_id,))
+            
+            patient_data = cursor.fetchone()
+            
+            if not patient_data:
+                messagebox.showerror("Error", "No se encontró información del paciente")
+                return
+            
+            # Crear ventana de perfil
+            profile_window = tk.Toplevel(self.root)
+            profile_window.title(f"Perfil - {nombre} {apellido}")
+            profile_window.geometry("600x500")
+            profile_window.configure(bg='#F8FAFC')
+            profile_window.resizable(True, True)
+            
+            # Frame principal con scroll
+            canvas = tk.Canvas(profile_window, bg='#F8FAFC')
+            scrollbar = ttk.Scrollbar(profile_window, orient="vertical", command=canvas.yview)
+            scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+            
+            scrollable_frame.bind(
+                "<Configure>",
+                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            )
+            
+            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+            canvas.configure(yscrollcommand=scrollbar.set)
+            
+            # Layout
+            canvas.pack(side="left", fill="both", expand=True, padx=20, pady=20)
+            scrollbar.pack(side="right", fill="y")
+            
+            # Contenido del perfil
+            # Header
+            header_frame = tk.Frame(scrollable_frame, bg='#1E3A8A', height=80)
+            header_frame.pack(fill='x', pady=(0, 20))
+            header_frame.pack_propagate(False)
+            
+            tk.Label(header_frame, text="👤", font=('Arial', 30), bg='#1E3A8A', fg='white').pack(side='left', padx=20, pady=20)
+            
+            info_frame = tk.Frame(header_frame, bg='#1E3A8A')
+            info_frame.pack(side='left', fill='both', expand=True, pady=20)
+            
+            tk.Label(info_frame, text=f"{nombre} {apellido}", 
+                    font=('Arial', 16, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='w')
+            tk.Label(info_frame, text=f"Expediente: {patient_data[7] if len(patient_data) > 7 else 'N/A'}", 
+                    font=('Arial', 10), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='w')
+            
+            # Información personal
+            personal_frame = tk.LabelFrame(scrollable_frame, text="📋 Información Personal", 
+                                         font=('Arial', 12, 'bold'), bg='white', padx=15, pady=15)
+            personal_frame.pack(fill='x', pady=(0, 15))
+            
+            personal_data = [
+                ("Email:", patient_data[3]),
+                ("Teléfono:", patient_data[4]),
+                ("Fecha de Nacimiento:", patient_data[10] if len(patient_data) > 10 else 'N/A'),
+                ("Dirección:", patient_data[11] if len(patient_data) > 11 else 'N/A')
+            ]
+            
+            for label, value in personal_data:
+                field_frame = tk.Frame(personal_frame, bg='white')
+                field_frame.pack(fill='x', pady=3)
+                
+                tk.Label(field_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151', width=20, anchor='w').pack(side='left')
+                tk.Label(field_frame, text=value or 'N/A', font=('Arial', 10), 
+                        bg='white', fg='#1F2937').pack(side='left', padx=(10, 0))
+            
+            # Contacto de emergencia
+            emergency_frame = tk.LabelFrame(scrollable_frame, text="🚨 Contacto de Emergencia", 
+                                          font=('Arial', 12, 'bold'), bg='white', padx=15, pady=15)
+            emergency_frame.pack(fill='x', pady=(0, 15))
+            
+            emergency_data = [
+                ("Contacto:", patient_data[8] if len(patient_data) > 8 else 'N/A'),
+                ("Teléfono:", patient_data[9] if len(patient_data) > 9 else 'N/A')
+            ]
+            
+            for label, value in emergency_data:
+                field_frame = tk.Frame(emergency_frame, bg='white')
+                field_frame.pack(fill='x', pady=3)
+                
+                tk.Label(field_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151', width=20, anchor='w').pack(side='left')
+                tk.Label(field_frame, text=value or 'N/A', font=('Arial', 10), 
+                        bg='white', fg='#1F2937').pack(side='left', padx=(10, 0))
+            
+            # Seguro médico
+            insurance_frame = tk.LabelFrame(scrollable_frame, text="🏥 Seguro Médico", 
+                                          font=('Arial', 12, 'bold'), bg='white', padx=15, pady=15)
+            insurance_frame.pack(fill='x', pady=(0, 15))
+            
+            seguro_nombre = patient_data[12] if len(patient_data) > 12 and patient_data[12] else 'Sin seguro'
+            tk.Label(insurance_frame, text=f"Seguro: {seguro_nombre}", 
+                    font=('Arial', 11), bg='white').pack(anchor='w')
+            
+            # Botones
+            buttons_frame = tk.Frame(scrollable_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=15)
+            
+            tk.Button(buttons_frame, text="📋 Ver Historial", bg='#0B5394', fg='white',
+                     font=('Arial', 10, 'bold'), command=lambda: self.view_patient_medical_history(patient_data[0])).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="📅 Nueva Cita", bg='#059669', fg='white',
+                     font=('Arial', 10, 'bold'), command=lambda: self.schedule_appointment_for_patient(patient_data[0])).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="Cerrar", bg='#6B7280', fg='white',
+                     font=('Arial', 10, 'bold'), command=profile_window.destroy).pack(side='right', padx=5)
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando perfil: {str(e)}")
+    
+    def view_medical_history(self):
+        """Ver historial médico del paciente seleccionado"""
+        try:
+            selection = self.doctor_patients_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "Seleccione un paciente para ver su historial")
+                return
+            
+            # Obtener información del paciente
+            item = self.doctor_patients_tree.item(selection[0])
+            patient_id = item['values'][0]  # ID está en índice 0
+            nombre = item['values'][1]      # Nombre está en índice 1
+            apellido = item['values'][2]    # Apellido está en índice 2
+            
+            # Buscar directamente por ID (más confiable)
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Verificar que el paciente existe
+            cursor.execute("SELECT id, nombre, apellido FROM usuarios WHERE id = ?", (patient_id,))
+            patient_result = cursor.fetchone()
+            
+            if not patient_result:
+                messagebox.showerror("Error", "No se encontró el paciente")
+                return
+            
+            # El patient_id ya está disponible desde la selección
+            
+            # Obtener historial médico
+            cursor.execute("""
+                SELECT fecha_consulta, diagnostico, tratamiento, observaciones, medicamentos
+                FROM historiales_medicos 
+                WHERE paciente_id = ? 
+                ORDER BY fecha_consulta DESC
+            """, (patient_id,))
+            
+            medical_records = cursor.fetchall()
+            
+            # Crear ventana de historial
+            history_window = tk.Toplevel(self.root)
+            history_window.title(f"Historial Médico - {nombre} {apellido}")
+            history_window.geometry("800x600")
+            history_window.configure(bg='#F8FAFC')
+            history_window.resizable(True, True)
+            
+            # Frame principal
+            main_frame = tk.Frame(history_window, bg='#F8FAFC', padx=20, pady=20)
+            main_frame.pack(fill='both', expand=True)
+            
+            # Título
+            title_label = tk.Label(main_frame, text=f"📋 Historial Médico - {nombre} {apellido}", 
+                                 font=('Arial', 16, 'bold'), bg='#F8FAFC', fg='#1E3A8A')
+            title_label.pack(pady=(0, 20))
+            
+            # Frame para la tabla con scrollbars
+            table_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            table_frame.pack(fill='both', expand=True)
+            
+            # Tabla de historial
+            columns = ('Fecha', 'Diagnóstico', 'Tratamiento', 'Notas')
+            history_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+            
+            for col in columns:
+                history_tree.heading(col, text=col)
+                if col == 'Fecha':
+                    history_tree.column(col, width=100)
+                elif col == 'Diagnóstico':
+                    history_tree.column(col, width=200)
+                else:
+                    history_tree.column(col, width=250)
+            
+            # Scrollbars
+            v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=history_tree.yview)
+            h_scrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=history_tree.xview)
+            history_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+            
+            # Grid layout dentro del table_frame
+            history_tree.grid(row=0, column=0, sticky='nsew')
+            v_scrollbar.grid(row=0, column=1, sticky='ns')
+            h_scrollbar.grid(row=1, column=0, sticky='ew')
+            
+            # Configurar expansión del table_frame
+            table_frame.grid_rowconfigure(0, weight=1)
+            table_frame.grid_columnconfigure(0, weight=1)
+            
+            # Cargar datos
+            for record in medical_records:
+                fecha = record[0]
+                try:
+                    dt = datetime.fromisoformat(fecha)
+                    fecha_formatted = dt.strftime('%d/%m/%Y')
+                except:
+                    fecha_formatted = fecha
+                
+                history_tree.insert('', 'end', values=(
+                    fecha_formatted, record[1], record[2], record[3]
+                ))
+            
+            if not medical_records:
+                no_records_label = tk.Label(main_frame, text="No hay registros médicos para este paciente", 
+                        font=('Arial', 12), fg='#6B7280', bg='#F8FAFC')
+                no_records_label.pack(pady=20)
+            
+            # Botones
+            buttons_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=15)
+            
+            tk.Button(buttons_frame, text="➕ Nuevo Registro", bg='#059669', fg='white',
+                     font=('Arial', 10, 'bold'), 
+                     command=lambda: self.create_medical_record_for_patient(patient_id, nombre, apellido, history_window)).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="Cerrar", bg='#6B7280', fg='white',
+                     font=('Arial', 10, 'bold'), command=history_window.destroy).pack(side='right', padx=5)
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando historial: {str(e)}")
+    
+    def schedule_appointment(self):
+        """Programar nueva cita desde el panel de pacientes"""
+        try:
+            selection = self.doctor_patients_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "Seleccione un paciente para programar una cita")
+                return
+            
+            # Obtener información del paciente
+            item = self.doctor_patients_tree.item(selection[0])
+            patient_id = item['values'][0]  # ID está en índice 0
+            nombre = item['values'][1]      # Nombre está en índice 1
+            apellido = item['values'][2]    # Apellido está en índice 2
+            
+            # Verificar que el paciente existe
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT id, nombre, apellido FROM usuarios WHERE id = ?", (patient_id,))
+            patient_result = cursor.fetchone()
+            
+            if not patient_result:
+                messagebox.showerror("Error", "No se encontró el paciente")
+                return
+            
+            # El patient_id ya está disponible desde la selección
+            cursor.close()
+            conn.close()
+            
+            # Abrir ventana de programación de cita
+            self.schedule_appointment_for_patient(patient_id, f"{nombre} {apellido}")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error programando cita: {str(e)}")
+    
+    def load_patient_medical_records(self, event=None):
+        """Cargar historiales médicos del paciente seleccionado"""
+        try:
+            selection = self.medical_patients_listbox.curselection()
+            if not selection:
+                return
+            
+            # Obtener ID del paciente desde el texto seleccionado
+            selected_text = self.medical_patients_listbox.get(selection[0])
+            # Extraer ID del formato "Nombre Apellido (ID: 123)"
+            import re
+            match = re.search(r'\(ID: (\d+)\)', selected_text)
+            if not match:
+                return
+            
+            patient_id = int(match.group(1))
+            
+            # Limpiar tabla de historiales
+            for item in self.medical_records_tree.get_children():
+                self.medical_records_tree.delete(item)
+            
+            # Obtener historiales
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT fecha_consulta, diagnostico, tratamiento, observaciones
+                FROM historiales_medicos 
+                WHERE paciente_id = ? 
+                ORDER BY fecha_consulta DESC
+            """, (patient_id,))
+            
+            records = cursor.fetchall()
+            
+            patient_name = selected_text[:match.start()].strip()
+            for record in records:
+                fecha = record[0]
+                try:
+                    dt = datetime.fromisoformat(fecha)
+                    fecha_formatted = dt.strftime('%d/%m/%Y')
+                except:
+                    fecha_formatted = fecha
+                
+                self.medical_records_tree.insert('', 'end', values=(
+                    fecha_formatted, patient_name, record[1], record[2], record[3]
+                ))
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error cargando historiales: {str(e)}")
+    
+    def search_medical_records(self, event=None):
+        """Buscar un diagnóstico o tratamiento en los historiales de los pacientes del doctor"""
+        text = self.medical_records_search_var.get().strip()
+        if not text:
+            self.load_patient_medical_records()
+            return
+        
+        def show_results(records):
+            # Limpiar tabla de historiales
+            for item in self.medical_records_tree.get_children():
+                self.medical_records_tree.delete(item)
+            
+            # Ya vienen ordenados por relevancia
+            for record in records:
+                fecha = record['fecha_consulta']
+                try:
+                    fecha_formatted = datetime.fromisoformat(fecha).strftime('%d/%m/%Y')
+                except:
+                    fecha_formatted = fecha
+                
+                self.medical_records_tree.insert('', 'end', values=(
+                    fecha_formatted, record['paciente_nombre'], record['diagnostico'],
+                    record['tratamiento'], record['fragmento']
+                ))
+        
+        self.get_background_tasks().submit(
+            self.db_manager.search_medical_history, text, 'historiales_medicos', None, self.current_user.id,
+            on_done=show_results,
+            on_error=lambda e: messagebox.showerror("Error", f"Error buscando historiales: {str(e)}"),
+            key='medical-records-search', busy=self.medical_records_tree
+        )
+    
+    # Funciones para crear citas y historiales desde otras ventanas
+    def schedule_appointment_for_patient(self, patient_id, patient_name=None):
+        """Programar cita para un paciente específico"""
+        try:
+            # Crear ventana de programación de cita
+            appointment_window = tk.Toplevel(self.root)
+            appointment_window.title(f"Nueva Cita - {patient_name or 'Paciente'}")
+            appointment_window.geometry("450x500")
+            appointment_window.configure(bg='#F8FAFC')
+            appointment_window.resizable(False, False)
+            appointment_window.transient(self.root)
+            appointment_window.grab_set()
+            
+            # Frame principal
+            main_frame = tk.Frame(appointment_window, bg='#F8FAFC', padx=20, pady=20)
+            main_frame.pack(fill='both', expand=True)
+            
+            # Título
+            tk.Label(main_frame, text=f"📅 Nueva Cita", 
+                    font=('Arial', 16, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(0, 10))
+            
+            if patient_name:
+                tk.Label(main_frame, text=f"Paciente: {patient_name}", 
+                        font=('Arial', 12), bg='#F8FAFC', fg='#6B7280').pack(pady=(0, 20))
+            
+            # Formulario
+            form_frame = tk.Frame(main_frame, bg='white', relief='solid', bd=1, padx=20, pady=20)
+            form_frame.pack(fill='both', expand=True)
+            
+            # Fecha
+            date_frame = tk.Frame(form_frame, bg='white')
+            date_frame.pack(fill='x', pady=5)
+            
+            tk.Label(date_frame, text="Fecha:", font=('Arial', 11, 'bold'), bg='white').pack(anchor='w')
+            date_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+            date_entry = tk.Entry(date_frame, textvariable=date_var, font=('Arial', 10))
+            date_entry.pack(fill='x', pady=5)
+            
+            # Hora
+            time_frame = tk.Frame(form_frame, bg='white')
+            time_frame.pack(fill='x', pady=5)
+            
+            tk.Label(time_frame, text="Hora:", font=('Arial', 11, 'bold'), bg='white').pack(anchor='w')
+            time_var = tk.StringVar(value="09:00")
+            time_entry = tk.Entry(time_frame, textvariable=time_var, font=('Arial', 10))
+            time_entry.pack(fill='x', pady=5)
+            
+            # Duración
+            duration_frame = tk.Frame(form_frame, bg='white')
+            duration_frame.pack(fill='x', pady=5)
+            
+            tk.Label(duration_frame, text="Duración (minutos):", font=('Arial', 11, 'bold'), bg='white').pack(anchor='w')
+            duration_var = tk.StringVar(value="30")
+            duration_entry = tk.Entry(duration_frame, textvariable=duration_var, font=('Arial', 10))
+            duration_entry.pack(fill='x', pady=5)
+            
+            # Motivo
+            motivo_frame = tk.Frame(form_frame, bg='white')
+            motivo_frame.pack(fill='x', pady=5)
+            
+            tk.Label(motivo_frame, text="Motivo de la consulta:", font=('Arial', 11, 'bold'), bg='white').pack(anchor='w')
+            motivo_text = tk.Text(motivo_frame, height=5, font=('Arial', 10), wrap=tk.WORD)
+            motivo_text.pack(fill='x', pady=5)
+            
+            # Botones
+            buttons_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=15)
+            
+            def save_appointment():
+                try:
+                    fecha = date_var.get()
+                    hora = time_var.get()
+                    duracion = duration_var.get()
+                    motivo = motivo_text.get("1.0", tk.END).strip()
+                    
+                    if not fecha or not hora:
+                        messagebox.showwarning("Advertencia", "Fecha y hora son obligatorios")
+                        return
+                    
+                    if not motivo:
+                        messagebox.showwarning("Advertencia", "El motivo es obligatorio")
+                        return
+                    
+                    # Validar duración
+                    try:
+                        duracion_int = int(duracion)
+                        if duracion_int <= 0:
+                            raise ValueError()
+                    except ValueError:
+                        messagebox.showwarning("Advertencia", "La duración debe ser un número positivo")
+                        return
+                    
+                    # Combinar fecha y hora
+                    fecha_hora = f"{fecha} {hora}:00"
+                    
+                    # Crear datos de la cita
+                    appointment_data = {
+                        'paciente_id': patient_id,
+                        'doctor_id': self.current_user.id,
+                        'fecha_hora': fecha_hora,
+                        'motivo': motivo,
+                        'duracion_minutos': duracion_int
+                    }
+                    
+                    # Guardar en base de datos
+                    appointment_id = self.create_appointment_db(appointment_data)
+                    if appointment_id:
+                        messagebox.showinfo("Éxito", "Cita programada correctamente")
+                        appointment_window.destroy()
+                        # Recargar citas si estamos en esa pestaña
+                        if hasattr(self, 'active_doctor_tab') and self.active_doctor_tab.get() == "Mis Citas":
+                            self.load_doctor_appointments()
+                    else:
+                        messagebox.showerror("Error", "No se pudo programar la cita")
+                    
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error programando cita: {str(e)}")
+            
+            tk.Button(buttons_frame, text="📅 Programar Cita", bg='#059669', fg='white',
+                     font=('Arial', 11, 'bold'), command=save_appointment).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="Cancelar", bg='#6B7280', fg='white',
+                     font=('Arial', 11, 'bold'), command=appointment_window.destroy).pack(side='right', padx=5)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error programando cita: {str(e)}")
+    
+    def view_patient_medical_history(self, patient_id):
+        """Ver historial médico completo de un paciente"""
+        try:
+            # Obtener información del paciente
+            patient_info = self.get_patient_full_info(patient_id)
+            if not patient_info:
+                messagebox.showerror("Error", "No se encontró información del paciente")
+                return
+            
+            patient_name = f"{patient_info['nombre']} {patient_info['apellido']}"
+            
+            # Crear ventana de historial
+            history_window = tk.Toplevel(self.root)
+            history_window.title(f"Historial Médico - {patient_name}")
+            history_window.geometry("900x600")
+            history_window.configure(bg='#F8FAFC')
+            history_window.resizable(True, True)
+            
+            # Frame principal
+            main_frame = tk.Frame(history_window, bg='#F8FAFC', padx=20, pady=20)
+            main_frame.pack(fill='both', expand=True)
+            
+            # Título
+            title_label = tk.Label(main_frame, text=f"📋 Historial Médico Completo", 
+                                 font=('Arial', 16, 'bold'), bg='#F8FAFC', fg='#1E3A8A')
+            title_label.pack(pady=(0, 10))
+            
+            tk.Label(main_frame, text=f"Paciente: {patient_name}", 
+                    font=('Arial', 12), bg='#F8FAFC', fg='#6B7280').pack(pady=(0, 20))
+            
+            # Frame para la tabla con scrollbars
+            table_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            table_frame.pack(fill='both', expand=True)
+            
+            # Tabla de historial
+            columns = ('Fecha', 'Diagnóstico', 'Tratamiento', 'Medicamentos', 'Notas')
+            history_tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
+            
+            for col in columns:
+                history_tree.heading(col, text=col)
+                if col == 'Fecha':
+                    history_tree.column(col, width=100)
+                elif col == 'Diagnóstico':
+                    history_tree.column(col, width=200)
+                else:
+                    history_tree.column(col, width=150)
+            
+            # Scrollbars
+            v_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=history_tree.yview)
+            h_scrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=history_tree.xview)
+            history_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+            
+            # Grid layout dentro del table_frame
+            history_tree.grid(row=0, column=0, sticky='nsew')
+            v_scrollbar.grid(row=0, column=1, sticky='ns')
+            h_scrollbar.grid(row=1, column=0, sticky='ew')
+            
+            # Configurar expansión del table_frame
+            table_frame.grid_rowconfigure(0, weight=1)
+            table_frame.grid_columnconfigure(0, weight=1)
+            
+            # Cargar datos del historial
+            try:
+                conn = self.db_manager.get_connection()
+                cursor = conn.cursor()
+                
+                cursor.execute("""
+                    SELECT fecha_consulta, diagnostico, tratamiento, medicamentos, observaciones
+                    FROM historiales_medicos 
+                    WHERE paciente_id = ? 
+                    ORDER BY fecha_consulta DESC
+                """, (patient_id,))
+                
+                medical_records = cursor.fetchall()
+                
+                for record in medical_records:
+                    fecha = self.format_date_for_display(record[0])
+                    
+                    history_tree.insert('', 'end', values=(
+                        fecha, record[1], record[2], record[3] or 'N/A', record[4] or 'N/A'
+                    ))
+                
+                cursor.close()
+                conn.close()
+                
+                if not medical_records:
+                    no_records_label = tk.Label(main_frame, text="No hay registros médicos para este paciente", 
+                            font=('Arial', 12), fg='#6B7280', bg='#F8FAFC')
+                    no_records_label.pack(pady=20)
+                
+            except Exception as e:
+                error_label = tk.Label(main_frame, text=f"Error cargando historial: {str(e)}", 
+                        font=('Arial', 12), fg='#EF4444', bg='#F8FAFC')
+                error_label.pack(pady=20)
+            
+            # Botones
+            buttons_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=15)
+            
+            tk.Button(buttons_frame, text="➕ Nuevo Registro", bg='#059669', fg='white',
+                     font=('Arial', 10, 'bold'), 
+                     command=lambda: self.create_medical_record_for_patient(patient_id, patient_info['nombre'], patient_info['apellido'], history_window)).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="Cerrar", bg='#6B7280', fg='white',
+                     font=('Arial', 10, 'bold'), command=history_window.destroy).pack(side='right', padx=5)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error viendo historial: {str(e)}")
+    
+    def create_medical_record_for_patient(self, patient_id, nombre, apellido, parent_window):
+        """Crear historial médico para un paciente específico"""
+        try:
+            patient_name = f"{nombre} {apellido}"
+            
+            # Crear ventana de nuevo historial
+            record_window = tk.Toplevel(parent_window)
+            record_window.title("Nuevo Historial Médico")
+            record_window.geometry("600x500")
+            record_window.configure(bg='#F8FAFC')
+            record_window.resizable(True, True)
+            record_window.transient(parent_window)
+            record_window.grab_set()
+            
+            # Frame principal
+            main_frame = tk.Frame(record_window, bg='#F8FAFC', padx=20, pady=20)
+            main_frame.pack(fill='both', expand=True)
+            
+            # Título
+            title_label = tk.Label(main_frame, text=f"📋 Nuevo Historial - {patient_name}", 
+                                 font=('Arial', 16, 'bold'), bg='#F8FAFC', fg='#1E3A8A')
+            title_label.pack(pady=(0, 20))
+            
+            # Formulario
+            form_frame = tk.Frame(main_frame, bg='white', relief='solid', bd=1, padx=20, pady=20)
+            form_frame.pack(fill='both', expand=True)
+            
+            # Fecha de consulta
+            date_frame = tk.Frame(form_frame, bg='white')
+            date_frame.pack(fill='x', pady=(0, 10))
+            
+            tk.Label(date_frame, text="Fecha de Consulta:", font=('Arial', 11, 'bold'), 
+                    bg='white').pack(side='left')
+            
+            date_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+            date_entry = tk.Entry(date_frame, textvariable=date_var, font=('Arial', 10), width=12)
+            date_entry.pack(side='left', padx=(10, 0))
+            
+            # Diagnóstico
+            diag_frame = tk.Frame(form_frame, bg='white')
+            diag_frame.pack(fill='x', pady=(0, 10))
+            
+            tk.Label(diag_frame, text="Diagnóstico:", font=('Arial', 11, 'bold'), 
+                    bg='white').pack(anchor='w')
+            
+            diag_text = tk.Text(diag_frame, height=3, width=60, font=('Arial', 10), wrap=tk.WORD)
+            diag_text.pack(fill='x', pady=5)
+            
+            # Tratamiento
+            treat_frame = tk.Frame(form_frame, bg='white')
+            treat_frame.pack(fill='x', pady=(0, 10))
+            
+            tk.Label(treat_frame, text="Tratamiento:", font=('Arial', 11, 'bold'), 
+                    bg='white').pack(anchor='w')
+            
+            treat_text = tk.Text(treat_frame, height=3, width=60, font=('Arial', 10), wrap=tk.WORD)
+            treat_text.pack(fill='x', pady=5)
+            
+            # Medicamentos
+            med_frame = tk.Frame(form_frame, bg='white')
+            med_frame.pack(fill='x', pady=(0, 10))
+            
+            tk.Label(med_frame, text="Medicamentos:", font=('Arial', 11, 'bold'), 
+                    bg='white').pack(anchor='w')
+            
+            med_text = tk.Text(med_frame, height=3, width=60, font=('Arial', 10), wrap=tk.WORD)
+            med_text.pack(fill='x', pady=5)
+            
+            # Notas adicionales
+            notes_frame = tk.Frame(form_frame, bg='white')
+            notes_frame.pack(fill='both', expand=True, pady=(0, 10))
+            
+            tk.Label(notes_frame, text="Notas Adicionales:", font=('Arial', 11, 'bold'), 
+                    bg='white').pack(anchor='w')
+            
+            notes_text = tk.Text(notes_frame, height=5, width=60, font=('Arial', 10), wrap=tk.WORD)
+            notes_text.pack(fill='both', expand=True, pady=5)
+            
+            # Botones
+            buttons_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=15)
+            
+            def save_record():
+                try:
+                    fecha = date_var.get()
+                    diagnostico = diag_text.get("1.0", tk.END).strip()
+                    tratamiento = treat_text.get("1.0", tk.END).strip()
+                    medicamentos = med_text.get("1.0", tk.END).strip()
+                    notas = notes_text.get("1.0", tk.END).strip()
+                    
+                    if not diagnostico:
+                        messagebox.showwarning("Advertencia", "El diagnóstico es obligatorio")
+                        return
+                    
+                    # Guardar en base de datos
+                    if self.save_medical_record_db(patient_id, self.current_user.id, fecha, 
+                                                 diagnostico, tratamiento, medicamentos, notas):
+                        messagebox.showinfo("Éxito", "Historial médico guardado correctamente")
+                        record_window.destroy()
+                        
+                        # Cerrar y reabrir la ventana de historial para actualizar
+                        parent_window.destroy()
+                        self.view_patient_medical_history(patient_id)
+                    else:
+                        messagebox.showerror("Error", "No se pudo guardar el historial médico")
+                    
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error guardando historial: {str(e)}")
+            
+            tk.Button(buttons_frame, text="💾 Guardar Historial", bg='#059669', fg='white',
+                     font=('Arial', 10, 'bold'), command=save_record).pack(side='left', padx=5)
+            
+            tk.Button(buttons_frame, text="Cancelar", bg='#6B7280', fg='white',
+                     font=('Arial', 10, 'bold'), command=record_window.destroy).pack(side='right', padx=5)
+            
+            # Enfocar en diagnóstico
+            diag_text.focus_set()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error creando historial: {str(e)}")
+    
+    def edit_medical_record_detail(self, parent_window):
+        """Editar historial médico desde ventana de detalles"""
+        try:
+            messagebox.showinfo("Editar", "Función de edición desde detalles - En desarrollo\n\n"
+                                         "Esta función permitirá editar historiales médicos existentes.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error editando: {str(e)}")
+    
+    def print_medical_record_detail(self):
+        """Imprimir historial médico desde ventana de detalles"""
+        try:
+            messagebox.showinfo("Imprimir", "Función de impresión desde detalles - En desarrollo\n\n"
+                                           "Esta función permitirá generar PDFs de los historiales médicos.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error imprimiendo: {str(e)}")
+    
+    def edit_doctor_profile(self): 
+        messagebox.showinfo("Acción", "Editar perfil de doctor - En desarrollo")
+    
+    def change_password(self): 
+        messagebox.showinfo("Acción", "Cambiar contraseña - En desarrollo")
+    
+    def configure_schedule(self): 
+        messagebox.showinfo("Acción", "Configurar horarios - En desarrollo")
+    
+    def save_appointment_notes_db(self, appointment_id, notes):
+        """Guardar notas de cita en base de datos"""
+        return self.db_manager.update_appointment_notes(appointment_id, notes)
+    
+    def save_medical_record_db(self, patient_id, doctor_id, fecha, diagnostico, tratamiento, medicamentos, notas):
+        """Guardar historial médico en base de datos"""
+        return self.db_manager.save_medical_record({
+            'paciente_id': patient_id,
+            'doctor_id': doctor_id,
+            'fecha_consulta': fecha,
+            'diagnostico': diagnostico,
+            'tratamiento': tratamiento,
+            'medicamentos': medicamentos,
+            'observaciones': notas
+        }, source='historiales_medicos') is not None
+    
+    def update_doctor_profile_db(self, doctor_id, profile_data):
+        """Actualizar perfil de doctor en base de datos"""
+        user_data = {key: profile_data[key] for key in ('nombre', 'apellido', 'email', 'telefono')}
+        doctor_data = {key: profile_data[key] for key in ('especialidad', 'cedula_profesional')}
+        return self.db_manager.save_user(doctor_id, user_data, doctor_data) is not None
+    
+    def update_doctor_password_db(self, doctor_id, new_password, current_password=None):
+        """Actualizar contraseña de doctor (se guarda su hash); con la actual sólo si coincide"""
+        return self.db_manager.change_password(doctor_id, new_password, current_password)
+    
+    def verify_doctor_password(self, doctor_id, current_password):
+        """Verificar contraseña actual del doctor"""
+        doctor = self.db_manager.get_user_by_id(doctor_id)
+        if not doctor:
+            return False
+        return self.db_manager.authenticate_user(doctor.email, current_password) is not None
+    
+    def save_doctor_schedule_db(self, doctor_id, schedule_data):
+        """Guardar horarios de doctor en base de datos"""
+        ranges = [(dia, config['inicio'].get(), config['fin'].get())
+                  for dia, config in schedule_data.items() if config['active'].get()]
+        return self.db_manager.save_doctor_schedule(doctor_id, ranges)
+    
+    def get_doctor_schedule_db(self, doctor_id):
+        """Obtener horarios de doctor desde base de datos"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT dia_semana, hora_inicio, hora_fin, activo
+                FROM doctor_schedules WHERE doctor_id = ? AND activo = 1
+            """, (doctor_id,))
+            
+            schedule = {}
+            for row in cursor.fetchall():
+                schedule[row[0]] = {
+                    'hora_inicio': row[1],
+                    'hora_fin': row[2],
+                    'activo': bool(row[3])
+                }
+            
+            cursor.close()
+            conn.close()
+            return schedule
+            
+        except Exception as e:
+            print(f"Error obteniendo horarios: {e}")
+            return {}
+    
+    def create_appointment_db(self, appointment_data):
+        """Crear nueva cita en base de datos (por DatabaseManager: mantiene el índice de horarios)"""
+        return self.db_manager.create_appointment({
+            'paciente_id': appointment_data['paciente_id'],
+            'doctor_id': appointment_data['doctor_id'],
+            'fecha_hora': appointment_data['fecha_hora'],
+            'motivo': appointment_data['motivo'],
+            'estado': 'programada',
+            'duracion_minutos': appointment_data.get('duracion_minutos', 30),
+        })
+    
+    def get_patient_full_info(self, patient_id):
+        """Obtener información completa del paciente"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT u.*, p.numero_expediente, p.contacto_emergencia, p.telefono_emergencia,
+                       s.nombre as seguro_nombre,
+                       CASE 
+                           WHEN u.fecha_nacimiento IS NOT NULL 
+                           THEN CAST((julianday('now') - julianday(u.fecha_nacimiento)) / 365.25 AS INTEGER)
+                           ELSE 0 
+                       END as edad
+                FROM usuarios u
+                LEFT JOIN pacientes p ON u.id = p.id
+                LEFT JOIN seguros_medicos s ON p.seguro_medico_id = s.id
+                WHERE u.id = ?
+            """, (patient_id,))
+            
+            result = cursor.fetchone()
+            cursor.close()
+            conn.close()
+            
+            if result:
+                columns = [description[0] for description in cursor.description]
+                return dict(zip(columns, result))
+            
+            return None
+            
+        except Exception as e:
+            print(f"Error obteniendo información del paciente: {e}")
+            return None
+    
+    def search_patients_for_doctor(self, doctor_id, search_term):
+        """Buscar pacientes específicos del doctor"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute(*self.doctor_patients_query(doctor_id, IncrementalSearch.normalize(search_term)))
+            
+            results = cursor.fetchall()
+            cursor.close()
+            conn.close()
+            
+            return results
+            
+        except Exception as e:
+            print(f"Error buscando pacientes: {e}")
+            return []
+    
+    def format_datetime_for_display(self, datetime_str):
+        """Formatear fecha/hora para mostrar"""
+        try:
+            if not datetime_str:
+                return 'N/A'
+            
+            dt = datetime.fromisoformat(datetime_str)
+            return dt.strftime('%d/%m/%Y %H:%M')
+        except:
+            return datetime_str
+    
+    def format_date_for_display(self, date_str):
+        """Formatear fecha para mostrar"""
+        try:
+            if not date_str:
+                return 'N/A'
+            
+            if 'T' in date_str:
+                dt = datetime.fromisoformat(date_str)
+                return dt.strftime('%d/%m/%Y')
+            else:
+                # Asumir formato YYYY-MM-DD
+                dt = datetime.strptime(date_str, '%Y-%m-%d')
+                return dt.strftime('%d/%m/%Y')
+        except:
+            return date_str
+    
+    def calculate_age(self, birth_date):
+        """Calcular edad desde fecha de nacimiento"""
+        try:
+            if not birth_date:
+                return 0
+            
+            if isinstance(birth_date, str):
+                birth_dt = datetime.strptime(birth_date, '%Y-%m-%d')
+            else:
+                birth_dt = birth_date
+            
+            today = datetime.now()
+            age = today.year - birth_dt.year
+            
+            if today.month < birth_dt.month or (today.month == birth_dt.month and today.day < birth_dt.day):
+                age -= 1
+            
+            return age
+        except:
+            return 0
+    
+    def validate_email(self, email):
+        """Validar formato de email"""
+        import re
+        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+        return re.match(pattern, email) is not None
+    
+    def validate_phone(self, phone):
+        """Validar formato de teléfono"""
+        # Eliminar espacios y guiones
+        phone_clean = phone.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+        
+        # Verificar que solo contiene números y tiene longitud adecuada
+        return phone_clean.isdigit() and 10 <= len(phone_clean) <= 15
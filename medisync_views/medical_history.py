@@ -0,0 +1,1378 @@
+"""
+Historial médico de MEDISYNC
+Búsqueda de pacientes y registros médicos: alta, edición e impresión
+Métodos de MedisyncApp que se importan la primera vez que se usan
+(ver medisync_views)
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+import os
+
+from document_cache import document_key as cache_document_key, safe_filename
+
+HISTORY_TEMPLATE_VERSION = 1
+
+
+class MedicalHistoryViews:
+    """Métodos de MedisyncApp: búsqueda de pacientes y registros médicos: alta, edición e impresión"""
+    
+    def load_patients_for_medical_history(self):
+        """Cargar lista de pacientes para historial médico"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Obtener filtro de búsqueda
+            search_term = getattr(self, 'patient_search_var', tk.StringVar()).get().lower()
+            
+            # Query base
+            query = """
+                SELECT u.id, u.nombre, u.apellido, u.email, u.telefono, u.fecha_nacimiento,
+                       CASE 
+                           WHEN u.fecha_nacimiento IS NOT NULL 
+                           THEN CAST((julianday('now') - julianday(u.fecha_nacimiento)) / 365.25 AS INTEGER)
+                           ELSE 0 
+                       END as edad
+                FROM usuarios u 
+                WHERE u.tipo_usuario = 'paciente' AND u.activo = 1
+            """
+            
+            params = []
+            if search_term:
+                query += " AND (LOWER(u.nombre) LIKE ? OR LOWER(u.apellido) LIKE ? OR LOWER(u.email) LIKE ?)"
+                search_pattern = f"%{search_term}%"
+                params.extend([search_pattern, search_pattern, search_pattern])
+            
+            query += " ORDER BY u.apellido, u.nombre"
+            
+            cursor.execute(query, params)
+            patients = cursor.fetchall()
+            
+            # Limpiar tree
+            for item in self.patients_medical_tree.get_children():
+                self.patients_medical_tree.delete(item)
+            
+            # Agregar pacientes
+            for patient in patients:
+                # Convertir Row object a valores individuales
+                patient_values = (
+                    patient[0],  # id
+                    patient[1],  # nombre
+                    patient[2],  # apellido
+                    patient[6],  # edad
+                    patient[4] or "No especificado"  # telefono
+                )
+                self.patients_medical_tree.insert('', 'end', values=patient_values)
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al cargar pacientes: {str(e)}")
+    
+    def search_patients_medical(self, event=None):
+        """Buscar pacientes en historial médico"""
+        self.load_patients_for_medical_history()
+    
+    def on_patient_select_medical(self, event):
+        """Manejar selección de paciente en historial médico"""
+        selection = self.patients_medical_tree.selection()
+        if selection:
+            item = self.patients_medical_tree.item(selection[0])
+            values = item['values']
+            
+            if len(values) >= 3:
+                self.selected_patient_id = values[0]
+                patient_name = f"{values[1]} {values[2]}"
+                
+                # Actualizar header
+                self.patient_name_label.config(text=f"📋 Historial de {patient_name}")
+                
+                # Mostrar información del paciente
+                self.show_patient_info_medical(values)
+                
+                # Cargar registros médicos del paciente
+                self.load_medical_records_for_patient(self.selected_patient_id)
+            else:
+                messagebox.showerror("Error", "Datos de paciente inválidos")
+        else:
+            self.selected_patient_id = None
+            self.show_default_medical_info()
+    
+    def show_patient_info_medical(self, patient_data):
+        """Mostrar información del paciente seleccionado"""
+        # Limpiar frame
+        for widget in self.patient_info_frame.winfo_children():
+            widget.destroy()
+        
+        # Crear tarjeta de información
+        info_card = tk.Frame(self.patient_info_frame, bg='#FFFFFF', relief='solid', bd=1)
+        info_card.pack(fill='x', pady=5)
+        
+        # Header de la tarjeta
+        card_header = tk.Frame(info_card, bg='#0B5394', height=30)
+        card_header.pack(fill='x')
+        card_header.pack_propagate(False)
+        
+        tk.Label(card_header, text="👤 Información del Paciente", font=('Arial', 10, 'bold'), 
+                bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Contenido de la tarjeta
+        card_content = tk.Frame(info_card, bg='#FFFFFF')
+        card_content.pack(fill='x', padx=10, pady=8)
+        
+        # Información básica
+        info_items = [
+            ("ID:", str(patient_data[0])),
+            ("Nombre:", f"{patient_data[1]} {patient_data[2]}"),
+            ("Edad:", f"{patient_data[3]} años" if patient_data[3] else "No especificada"),
+            ("Teléfono:", patient_data[4] or "No especificado")
+        ]
+        
+        for label, value in info_items:
+            row = tk.Frame(card_content, bg='#FFFFFF')
+            row.pack(fill='x', pady=1)
+            
+            tk.Label(row, text=label, font=('Arial', 9, 'bold'), bg='#FFFFFF', width=12, anchor='w').pack(side='left')
+            tk.Label(row, text=value, font=('Arial', 9), bg='#FFFFFF', anchor='w').pack(side='left', padx=(5, 0))
+    
+    def show_default_medical_info(self):
+        """Mostrar información por defecto cuando no hay paciente seleccionado"""
+        # Limpiar frames
+        for widget in self.patient_info_frame.winfo_children():
+            widget.destroy()
+        
+        # Limpiar registros médicos
+        for item in self.medical_records_tree.get_children():
+            self.medical_records_tree.delete(item)
+        
+        # Mensaje por defecto
+        default_label = tk.Label(self.patient_info_frame, 
+                               text="👆 Seleccione un paciente de la lista\npara ver su historial médico", 
+                               font=('Arial', 11), bg='#FFFFFF', fg='#64748B', 
+                               justify='center', pady=20)
+        default_label.pack(fill='x')
+        
+        # Actualizar header
+        self.patient_name_label.config(text="📋 Historial Médico")
+    
+    def load_medical_records_for_patient(self, patient_id):
+        """Cargar registros médicos del paciente seleccionado"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT hm.id, hm.fecha_consulta, hm.tipo_consulta, 
+                       (d.nombre || ' ' || d.apellido) as doctor,
+                       hm.diagnostico, hm.estado
+                FROM historial_medico hm
+                JOIN usuarios d ON hm.doctor_id = d.id
+                WHERE hm.paciente_id = ?
+                ORDER BY hm.fecha_consulta DESC
+            """
+            
+            cursor.execute(query, (patient_id,))
+            records = cursor.fetchall()
+            
+            # Limpiar tree
+            for item in self.medical_records_tree.get_children():
+                self.medical_records_tree.delete(item)
+            
+            # Agregar registros
+            for record in records:
+                # Formatear fecha
+                fecha = record[1][:10] if record[1] else "N/A"
+                self.medical_records_tree.insert('', 'end', values=(
+                    record[0], fecha, record[2] or "Consulta", 
+                    record[3], record[4] or "Sin diagnóstico", 
+                    record[5] or "Pendiente"
+                ))
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al cargar registros médicos: {str(e)}")
+    
+    def on_medical_record_select(self, event):
+        """Manejar selección de registro médico"""
+        selection = self.medical_records_tree.selection()
+        if selection:
+            item = self.medical_records_tree.item(selection[0])
+            self.selected_medical_record_id = item['values'][0]
+        else:
+            self.selected_medical_record_id = None
+    
+    def add_medical_record(self):
+        """Agregar nuevo registro médico"""
+        if not self.selected_patient_id:
+            messagebox.showwarning("Advertencia", "Por favor seleccione un paciente")
+            return
+        
+        self.open_medical_record_form()
+    
+    def open_medical_record_form(self, edit_mode=False):
+        """Abrir formulario para crear/editar registro médico - Diseño Premium"""
+        form_window = tk.Toplevel()
+        title = "Editar Consulta" if edit_mode else "Nueva Consulta Médica"
+        form_window.title(f"{title} - MEDISYNC")
+        form_window.geometry("900x750")
+        form_window.configure(bg='#f0f4f7')
+        form_window.resizable(False, False)
+        
+        # Centrar ventana
+        form_window.transient(self.root)
+        form_window.grab_set()
+        self.center_window(form_window, 900, 750)
+        
+        # Header Premium con gradiente visual
+        header_frame = tk.Frame(form_window, bg='#2c5aa0', height=80)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Container del header
+        header_container = tk.Frame(header_frame, bg='#2c5aa0')
+        header_container.pack(expand=True, fill='both', padx=30, pady=15)
+        
+        # Icono y título del header
+        icon = "✏️" if edit_mode else "🩺"
+        icon_label = tk.Label(header_container, text=icon, font=('Arial', 24), 
+                             bg='#2c5aa0', fg='white')
+        icon_label.pack(side='left')
+        
+        title_label = tk.Label(header_container, text=title, font=('Arial', 20, 'bold'), 
+                              bg='#2c5aa0', fg='white')
+        title_label.pack(side='left', padx=(15, 0))
+        
+        # Subtítulo
+        subtitle = "Edición de registro médico" if edit_mode else "Registro de nueva consulta médica"
+        subtitle_label = tk.Label(header_container, text=subtitle, font=('Arial', 11), 
+                                 bg='#2c5aa0', fg='#a8c5e8')
+        subtitle_label.pack(side='right')
+        
+        # Variables del formulario
+        form_vars = {
+            'fecha_consulta': tk.StringVar(value=datetime.now().strftime('%Y-%m-%d')),
+            'tipo_consulta': tk.StringVar(value='Consulta General'),
+            'motivo_consulta': tk.StringVar(),
+            'sintomas': tk.StringVar(),
+            'diagnostico': tk.StringVar(),
+            'tratamiento': tk.StringVar(),
+            'medicamentos': tk.StringVar(),
+            'observaciones': tk.StringVar(),
+            'proxima_cita': tk.StringVar(),
+            'estado': tk.StringVar(value='Completada')
+        }
+        
+        # Scrollable content
+        main_canvas = tk.Canvas(form_window, bg='#f0f4f7', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(form_window, orient="vertical", command=main_canvas.yview)
+        scrollable_frame = tk.Frame(main_canvas, bg='#f0f4f7')
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
+        )
+        
+        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        main_canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Contenido principal con padding elegante
+        content_frame = tk.Frame(scrollable_frame, bg='#f0f4f7')
+        content_frame.pack(fill='both', expand=True, padx=40, pady=30)
+        
+        # ========== SECCIÓN 1: INFORMACIÓN DEL PACIENTE ==========
+        patient_container = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        patient_container.pack(fill='x', pady=(0, 20))
+        
+        # Header de la sección paciente
+        patient_header = tk.Frame(patient_container, bg='#F8FAFC', height=50)
+        patient_header.pack(fill='x')
+        patient_header.pack_propagate(False)
+        
+        tk.Label(patient_header, text="👤", font=('Arial', 20), bg='#F8FAFC', fg='#2c5aa0').pack(side='left', padx=(20, 10), pady=12)
+        tk.Label(patient_header, text="Paciente", font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#2c5aa0').pack(side='left', pady=12)
+        
+        # Contenido del paciente
+        patient_content = tk.Frame(patient_container, bg='white')
+        patient_content.pack(fill='x', padx=25, pady=20)
+        
+        selection = self.patients_medical_tree.selection()
+        if selection:
+            item = self.patients_medical_tree.item(selection[0])
+            patient_name = f"{item['values'][1]} {item['values'][2]}"
+            
+            # Información del paciente con estilo
+            patient_info_frame = tk.Frame(patient_content, bg='#f8fffe', relief='solid', bd=1, padx=15, pady=12)
+            patient_info_frame.pack(fill='x')
+            
+            tk.Label(patient_info_frame, text=f"Paciente: {patient_name}", 
+                    font=('Arial', 12, 'bold'), bg='#f8fffe', fg='#2c5aa0').pack(anchor='w')
+            
+            # Información adicional del paciente
+            edad_info = f"Edad: {item['values'][3]} años" if len(item['values']) > 3 else ""
+            if edad_info:
+                tk.Label(patient_info_frame, text=edad_info, 
+                        font=('Arial', 10), bg='#f8fffe', fg='#5a7a92').pack(anchor='w')
+        
+        # ========== SECCIÓN 2: DATOS BÁSICOS DE LA CONSULTA ==========
+        basic_container = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        basic_container.pack(fill='x', pady=(0, 20))
+        
+        # Header de datos básicos
+        basic_header = tk.Frame(basic_container, bg='#F8FAFC', height=50)
+        basic_header.pack(fill='x')
+        basic_header.pack_propagate(False)
+        
+        tk.Label(basic_header, text="📅", font=('Arial', 20), bg='#F8FAFC', fg='#2c5aa0').pack(side='left', padx=(20, 10), pady=12)
+        tk.Label(basic_header, text="Datos de la Consulta", font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#2c5aa0').pack(side='left', pady=12)
+        
+        # Grid para datos básicos
+        basic_content = tk.Frame(basic_container, bg='white')
+        basic_content.pack(fill='x', padx=25, pady=20)
+        
+        basic_grid = tk.Frame(basic_content, bg='white')
+        basic_grid.pack(fill='x')
+        
+        # Fecha y Tipo en la misma fila con mejor espaciado
+        tk.Label(basic_grid, text="Fecha:", font=('Arial', 11, 'bold'), bg='white', fg='#2c5aa0').grid(row=0, column=0, sticky='w', pady=8, padx=(0, 10))
+        
+        fecha_frame = tk.Frame(basic_grid, bg='white')
+        fecha_frame.grid(row=0, column=1, sticky='ew', padx=(0, 30), pady=8)
+        
+        fecha_entry = tk.Entry(fecha_frame, textvariable=form_vars['fecha_consulta'], 
+                              font=('Arial', 11), width=12, relief='solid', bd=1, bg='#fafafa')
+        fecha_entry.pack(side='left')
+        
+        tk.Label(basic_grid, text="Tipo:", font=('Arial', 11, 'bold'), bg='white', fg='#2c5aa0').grid(row=0, column=2, sticky='w', pady=8, padx=(0, 10))
+        
+        tipo_combo = ttk.Combobox(basic_grid, textvariable=form_vars['tipo_consulta'], 
+                                values=['Consulta General', 'Consulta Especializada', 'Emergencia', 'Control', 'Revisión'], 
+                                state='readonly', width=22, font=('Arial', 11))
+        tipo_combo.grid(row=0, column=3, sticky='ew', pady=8)
+        
+        basic_grid.columnconfigure(1, weight=1)
+        basic_grid.columnconfigure(3, weight=2)
+        
+        # ========== SECCIÓN 3: INFORMACIÓN MÉDICA DETALLADA ==========
+        medical_container = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        medical_container.pack(fill='x', pady=(0, 20))
+        
+        # Header de información médica
+        medical_header = tk.Frame(medical_container, bg='#F8FAFC', height=50)
+        medical_header.pack(fill='x')
+        medical_header.pack_propagate(False)
+        
+        tk.Label(medical_header, text="🔍", font=('Arial', 20), bg='#F8FAFC', fg='#2c5aa0').pack(side='left', padx=(20, 10), pady=12)
+        tk.Label(medical_header, text="Información Médica", font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#2c5aa0').pack(side='left', pady=12)
+        
+        # Contenido médico
+        medical_content = tk.Frame(medical_container, bg='white')
+        medical_content.pack(fill='x', padx=25, pady=20)
+        
+        # Motivo de consulta con estilo mejorado
+        motivo_section = tk.Frame(medical_content, bg='white')
+        motivo_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(motivo_section, text="Motivo de la Consulta", font=('Arial', 11, 'bold'), 
+                bg='white', fg='#2c5aa0').pack(anchor='w', pady=(0, 5))
+        
+        motivo_text = tk.Text(motivo_section, height=3, font=('Arial', 11), wrap='word',
+                             relief='solid', bd=1, bg='#fafafa', padx=10, pady=8)
+        motivo_text.pack(fill='x')
+        
+        # Síntomas
+        sintomas_section = tk.Frame(medical_content, bg='white')
+        sintomas_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(sintomas_section, text="Síntomas Observados", font=('Arial', 11, 'bold'), 
+                bg='white', fg='#2c5aa0').pack(anchor='w', pady=(0, 5))
+        
+        sintomas_text = tk.Text(sintomas_section, height=3, font=('Arial', 11), wrap='word',
+                               relief='solid', bd=1, bg='#fafafa', padx=10, pady=8)
+        sintomas_text.pack(fill='x')
+        
+        # Diagnóstico
+        diagnostico_section = tk.Frame(medical_content, bg='white')
+        diagnostico_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(diagnostico_section, text="Diagnóstico", font=('Arial', 11, 'bold'), 
+                bg='white', fg='#2c5aa0').pack(anchor='w', pady=(0, 5))
+        
+        diagnostico_text = tk.Text(diagnostico_section, height=3, font=('Arial', 11), wrap='word',
+                                  relief='solid', bd=1, bg='#fafafa', padx=10, pady=8)
+        diagnostico_text.pack(fill='x')
+        
+        # Tratamiento
+        tratamiento_section = tk.Frame(medical_content, bg='white')
+        tratamiento_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(tratamiento_section, text="Tratamiento Recomendado", font=('Arial', 11, 'bold'), 
+                bg='white', fg='#2c5aa0').pack(anchor='w', pady=(0, 5))
+        
+        tratamiento_text = tk.Text(tratamiento_section, height=3, font=('Arial', 11), wrap='word',
+                                  relief='solid', bd=1, bg='#fafafa', padx=10, pady=8)
+        tratamiento_text.pack(fill='x')
+        
+        # Medicamentos
+        medicamentos_section = tk.Frame(medical_content, bg='white')
+        medicamentos_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(medicamentos_section, text="Medicamentos Recetados", font=('Arial', 11, 'bold'), 
+                bg='white', fg='#2c5aa0').pack(anchor='w', pady=(0, 5))
+        
+        medicamentos_text = tk.Text(medicamentos_section, height=3, font=('Arial', 11), wrap='word',
+                                   relief='solid', bd=1, bg='#fafafa', padx=10, pady=8)
+        medicamentos_text.pack(fill='x')
+        
+        # ========== BOTONES DE ACCIÓN PREMIUM ==========
+        buttons_container = tk.Frame(content_frame, bg='#f0f4f7')
+        buttons_container.pack(fill='x', pady=(30, 0))
+        
+        buttons_frame = tk.Frame(buttons_container, bg='white', relief='solid', bd=1)
+        buttons_frame.pack(fill='x', padx=0, pady=0)
+        
+        button_content = tk.Frame(buttons_frame, bg='white')
+        button_content.pack(fill='x', padx=25, pady=20)
+        
+        # Botón Cancelar con estilo
+        cancel_btn = tk.Button(button_content, text="❌ Cancelar", 
+                              bg='#0B5394', fg='white', font=('Arial', 12, 'bold'), 
+                              width=15, height=2, relief='flat', cursor='hand2',
+                              command=form_window.destroy)
+        cancel_btn.pack(side='right', padx=(15, 0))
+        
+        # Efecto hover para cancelar
+        def on_cancel_enter(e):
+            cancel_btn.config(bg='#0B5394')
+        def on_cancel_leave(e):
+            cancel_btn.config(bg='#0B5394')
+        
+        cancel_btn.bind("<Enter>", on_cancel_enter)
+        cancel_btn.bind("<Leave>", on_cancel_leave)
+        
+        # Botón Guardar con estilo premium
+        save_text = "💾 Actualizar Consulta" if edit_mode else "💾 Guardar Consulta"
+        save_btn = tk.Button(button_content, text=save_text, 
+                            bg='#0B5394', fg='white', font=('Arial', 12, 'bold'), 
+                            width=18, height=2, relief='flat', cursor='hand2',
+                            command=lambda: self.save_medical_record(form_vars, form_window, edit_mode, 
+                                                                   motivo_text, sintomas_text, diagnostico_text, 
+                                                                   tratamiento_text, medicamentos_text))
+        save_btn.pack(side='right')
+        
+        # Efecto hover para guardar
+        def on_save_enter(e):
+            save_btn.config(bg='#0B5394')
+        def on_save_leave(e):
+            save_btn.config(bg='#0B5394')
+        
+        save_btn.bind("<Enter>", on_save_enter)
+        save_btn.bind("<Leave>", on_save_leave)
+        
+        # Configurar canvas y scrollbar
+        main_canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Bind mousewheel para scroll
+        def _on_mousewheel(event):
+            main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        
+        main_canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        
+        # Focus en el primer campo
+        motivo_text.focus()
+    
+    def save_medical_record(self, form_vars, form_window, edit_mode, motivo_text, sintomas_text, 
+                          diagnostico_text, tratamiento_text, medicamentos_text):
+        """Guardar registro médico"""
+        try:
+            # Validar campos obligatorios
+            if not form_vars['fecha_consulta'].get():
+                messagebox.showerror("Error", "La fecha de consulta es obligatoria")
+                return
+            
+            # Obtener datos de los Text widgets
+            motivo = motivo_text.get("1.0", tk.END).strip()
+            sintomas = sintomas_text.get("1.0", tk.END).strip()
+            diagnostico = diagnostico_text.get("1.0", tk.END).strip()
+            tratamiento = tratamiento_text.get("1.0", tk.END).strip()
+            medicamentos = medicamentos_text.get("1.0", tk.END).strip()
+            
+            record_data = {
+                'fecha_consulta': form_vars['fecha_consulta'].get(),
+                'tipo_consulta': form_vars['tipo_consulta'].get(),
+                'motivo_consulta': motivo,
+                'sintomas': sintomas,
+                'diagnostico': diagnostico,
+                'tratamiento': tratamiento,
+                'medicamentos': medicamentos,
+                'estado': form_vars['estado'].get()
+            }
+            
+            if edit_mode:
+                # Actualizar registro existente
+                record_id = self.db_manager.save_medical_record(record_data, self.selected_medical_record_id)
+            else:
+                # Crear nuevo registro
+                record_data['paciente_id'] = self.selected_patient_id
+                record_data['doctor_id'] = self.current_user.id  # Doctor actual
+                record_id = self.db_manager.save_medical_record(record_data)
+            
+            if record_id is None:
+                messagebox.showerror("Error", "No se pudo guardar el registro médico")
+                return
+            
+            messagebox.showinfo("Éxito", "Registro médico guardado correctamente")
+            form_window.destroy()
+            
+            # Recargar registros médicos
+            self.load_medical_records_for_patient(self.selected_patient_id)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al guardar registro médico: {str(e)}")
+    
+    def create_medical_record(self): 
+        """Crear nuevo registro médico - acceso desde otros módulos"""
+        if hasattr(self, 'selected_patient_id') and self.selected_patient_id:
+            self.add_medical_record()
+        else:
+            messagebox.showwarning("Advertencia", "Por favor seleccione un paciente primero")
+    
+    def view_medical_record_detail(self): 
+        """Ver detalles completos del registro médico"""
+        if not self.selected_medical_record_id:
+            messagebox.showwarning("Advertencia", "Por favor seleccione un registro médico")
+            return
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT hm.*, 
+                       ud.nombre as doctor_nombre, ud.apellido as doctor_apellido,
+                       up.nombre as paciente_nombre, up.apellido as paciente_apellido
+                FROM historiales_medicos hm
+                LEFT JOIN usuarios ud ON hm.doctor_id = ud.id
+                LEFT JOIN usuarios up ON hm.paciente_id = up.id
+                WHERE hm.id = ?
+            """
+            
+            cursor.execute(query, (self.selected_medical_record_id,))
+            record = cursor.fetchone()
+            
+            if record:
+                self.show_medical_record_details(record)
+            else:
+                messagebox.showerror("Error", "Registro médico no encontrado")
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al obtener detalles: {str(e)}")
+    
+    def show_medical_record_details(self, record):
+        """Mostrar ventana con detalles completos del registro médico"""
+        details_window = tk.Toplevel()
+        details_window.title("Detalle de Consulta Médica - MEDISYNC")
+        details_window.geometry("600x700")
+        details_window.configure(bg='#F8FAFC')
+        
+        # Centrar ventana
+        details_window.transient(self.root)
+        details_window.grab_set()
+        
+        # Header
+        header_frame = tk.Frame(details_window, bg='#0B5394', height=60)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        tk.Label(header_frame, text="🩺 Detalle de Consulta Médica", font=('Arial', 16, 'bold'), 
+                bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Contenido scrollable
+        content_frame = tk.Frame(details_window, bg='white')
+        content_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        canvas = tk.Canvas(content_frame, bg='white')
+        scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg='white')
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Extraer datos del record (basado en la estructura de historiales_medicos)
+        # record = (id, paciente_id, doctor_id, cita_id, fecha_consulta, diagnostico, 
+        #          tratamiento, medicamentos, observaciones, adjuntos, estado, 
+        #          fecha_creacion, doctor_nombre, doctor_apellido, paciente_nombre, paciente_apellido)
+        
+        paciente_nombre = f"{record[14]} {record[15]}" if len(record) > 15 and record[14] and record[15] else "N/A"
+        doctor_nombre = f"Dr. {record[12]} {record[13]}" if len(record) > 13 and record[12] and record[13] else "N/A"
+        
+        # Información del paciente y doctor
+        info_frame = tk.LabelFrame(scrollable_frame, text="👥 Información General", 
+                                 font=('Arial', 12, 'bold'), padx=15, pady=10)
+        info_frame.pack(fill='x', pady=(0, 10))
+        
+        general_info = [
+            ("Paciente:", paciente_nombre),
+            ("Doctor:", doctor_nombre),
+            ("Fecha de Consulta:", record[4] if len(record) > 4 and record[4] else "N/A"),
+            ("Estado:", record[10] if len(record) > 10 and record[10] else "Pendiente")
+        ]
+        
+        for label, value in general_info:
+            row = tk.Frame(info_frame, bg='white')
+            row.pack(fill='x', pady=2)
+            
+            tk.Label(row, text=label, font=('Arial', 10, 'bold'), 
+                    bg='white', width=20, anchor='w').pack(side='left')
+            tk.Label(row, text=value, font=('Arial', 10), 
+                    bg='white', anchor='w').pack(side='left', padx=(10, 0))
+        
+        # Detalles médicos
+        medical_sections = [
+            ("🔍 Diagnóstico", record[5] if len(record) > 5 else ""),
+            ("💊 Tratamiento", record[6] if len(record) > 6 else ""),
+            ("� Medicamentos", record[7] if len(record) > 7 else ""),
+            ("� Observaciones", record[8] if len(record) > 8 else "")
+        ]
+        
+        for title, content in medical_sections:
+            section_frame = tk.LabelFrame(scrollable_frame, text=title, 
+                                        font=('Arial', 11, 'bold'), padx=15, pady=10)
+            section_frame.pack(fill='x', pady=(0, 10))
+            
+            text_widget = tk.Text(section_frame, height=4, font=('Arial', 10), 
+                                wrap=tk.WORD, state='disabled', bg='#F8FAFC')
+            text_widget.pack(fill='x')
+            
+            if content:
+                text_widget.config(state='normal')
+                text_widget.insert('1.0', content)
+                text_widget.config(state='disabled')
+            else:
+                text_widget.config(state='normal')
+                text_widget.insert('1.0', "No especificado")
+                text_widget.config(state='disabled')
+        
+        # Botón cerrar
+        btn_frame = tk.Frame(scrollable_frame, bg='white')
+        btn_frame.pack(fill='x', pady=20)
+        
+        tk.Button(btn_frame, text="Cerrar", bg='#0B5394', fg='white',
+                 font=('Arial', 11, 'bold'), width=15,
+                 command=details_window.destroy).pack()
+        
+        # Pack scrollable components
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+    
+    def edit_medical_record(self): 
+        """Editar registro médico seleccionado"""
+        if not self.selected_medical_record_id:
+            messagebox.showwarning("Advertencia", "Por favor seleccione un registro médico para editar")
+            return
+        
+        self.open_medical_record_form(edit_mode=True)
+    
+    def print_medical_record(self): 
+        """Sistema completo de impresión del historial médico"""
+        # Obtener el registro seleccionado directamente del TreeView
+        selection = self.medical_records_tree.selection()
+        if not selection:
+            messagebox.showwarning("Advertencia", "Por favor seleccione un registro médico para imprimir")
+            return
+        
+        # Obtener el ID del registro seleccionado
+        item = self.medical_records_tree.item(selection[0])
+        print(f"🔍 DEBUG: TreeView selection = {selection}")
+        print(f"🔍 DEBUG: TreeView item completo = {item}")
+        print(f"🔍 DEBUG: TreeView item['values'] = {item['values']}")
+        
+        # Verificar todos los items en el TreeView
+        print("🔍 DEBUG: Todos los items en el TreeView:")
+        for child in self.medical_records_tree.get_children():
+            child_item = self.medical_records_tree.item(child)
+            print(f"  - ID: {child}, values: {child_item['values']}")
+        
+        selected_record_id = item['values'][0]
+        
+        print(f"🔍 DEBUG: selected_record_id desde TreeView = {selected_record_id}")
+        print(f"🔍 DEBUG: selected_medical_record_id global = {self.selected_medical_record_id}")
+        
+        # Obtener información del paciente asociado al registro
+        patient_info = self.get_patient_from_medical_record(selected_record_id)
+        print(f"🔍 DEBUG: patient_info = {patient_info}")
+        
+        if not patient_info:
+            messagebox.showerror("Error", "No se pudo obtener información del paciente")
+            return
+        
+        self.open_medical_history_print_window(patient_info)
+    
+    def get_patient_from_medical_record(self, medical_record_id):
+        """Obtener información del paciente desde un registro médico"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT p.id, p.nombre, p.apellido, p.email, p.telefono, p.fecha_nacimiento
+                FROM historiales_medicos hm
+                JOIN usuarios p ON hm.paciente_id = p.id
+                WHERE hm.id = ?
+            """
+            print(f"🔍 DEBUG: Buscando paciente para record_id = {medical_record_id}")
+            cursor.execute(query, (medical_record_id,))
+            result = cursor.fetchone()
+            print(f"🔍 DEBUG: Resultado query = {result}")
+            
+            if result:
+                patient_info = {
+                    'id': result[0],
+                    'nombre': result[1],
+                    'apellido': result[2],
+                    'email': result[3],
+                    'telefono': result[4],
+                    'fecha_nacimiento': result[5]
+                }
+                print(f"🔍 DEBUG: patient_info creado = {patient_info}")
+                return patient_info
+            return None
+            
+        except Exception as e:
+            print(f"Error obteniendo paciente: {e}")
+            return None
+    
+    def open_medical_history_print_window(self, patient_info):
+        """Ventana para seleccionar e imprimir historial médico"""
+        window = tk.Toplevel(self.root)
+        window.title("🖨️ Imprimir Historial Médico")
+        window.geometry("900x700")
+        window.configure(bg='#F8FAFC')
+        window.transient(self.root)
+        window.grab_set()
+        window.resizable(True, True)
+        
+        # Centrar ventana
+        window.update_idletasks()
+        x = (window.winfo_screenwidth() // 2) - (900 // 2)
+        y = (window.winfo_screenheight() // 2) - (700 // 2)
+        window.geometry(f"900x700+{x}+{y}")
+        
+        # Header
+        header_frame = tk.Frame(window, bg='#0B5394', height=100)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        header_content = tk.Frame(header_frame, bg='#0B5394')
+        header_content.pack(expand=True, fill='both')
+        
+        tk.Label(header_content, text="🖨️ IMPRIMIR HISTORIAL MÉDICO", 
+                font=('Arial', 18, 'bold'), bg='#0B5394', fg='white').pack(pady=(15, 5))
+        
+        tk.Label(header_content, text=f"Paciente: {patient_info['nombre']} {patient_info['apellido']}", 
+                font=('Arial', 12), bg='#0B5394', fg='#CBD5E1').pack(pady=(0, 15))
+        
+        # Contenido principal
+        main_container = tk.Frame(window, bg='#F8FAFC')
+        main_container.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Panel izquierdo - Selección de registros
+        left_panel = tk.LabelFrame(main_container, text="📋 Seleccionar Registros a Imprimir", 
+                                  font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                  padx=15, pady=10)
+        left_panel.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        
+        # Filtros
+        filters_frame = tk.Frame(left_panel, bg='#F8FAFC')
+        filters_frame.pack(fill='x', pady=(0, 10))
+        
+        tk.Label(filters_frame, text="Filtrar por:", font=('Arial', 10, 'bold'), 
+                bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+        
+        filter_options_frame = tk.Frame(filters_frame, bg='#F8FAFC')
+        filter_options_frame.pack(fill='x', pady=(5, 0))
+        
+        # Variables para filtros
+        self.print_filter_date_from = tk.StringVar()
+        self.print_filter_date_to = tk.StringVar()
+        self.print_filter_type = tk.StringVar(value="Todos")
+        
+        # Filtros de fecha
+        date_filter_frame = tk.Frame(filter_options_frame, bg='#F8FAFC')
+        date_filter_frame.pack(fill='x', pady=2)
+        
+        tk.Label(date_filter_frame, text="Desde:", font=('Arial', 9), 
+                bg='#F8FAFC', fg='#64748B').pack(side='left')
+        tk.Entry(date_filter_frame, textvariable=self.print_filter_date_from, 
+                font=('Arial', 9), width=12).pack(side='left', padx=(5, 10))
+        
+        tk.Label(date_filter_frame, text="Hasta:", font=('Arial', 9), 
+                bg='#F8FAFC', fg='#64748B').pack(side='left')
+        tk.Entry(date_filter_frame, textvariable=self.print_filter_date_to, 
+                font=('Arial', 9), width=12).pack(side='left', padx=(5, 10))
+        
+        # Filtro por tipo
+        type_filter_frame = tk.Frame(filter_options_frame, bg='#F8FAFC')
+        type_filter_frame.pack(fill='x', pady=2)
+        
+        tk.Label(type_filter_frame, text="Tipo:", font=('Arial', 9), 
+                bg='#F8FAFC', fg='#64748B').pack(side='left')
+        ttk.Combobox(type_filter_frame, textvariable=self.print_filter_type,
+                    values=["Todos", "Consulta", "Examen", "Tratamiento", "Seguimiento"],
+                    state="readonly", font=('Arial', 9), width=15).pack(side='left', padx=(5, 0))
+        
+        # Lista de registros con checkboxes
+        records_frame = tk.Frame(left_panel, bg='#F8FAFC')
+        records_frame.pack(fill='both', expand=True, pady=(10, 0))
+        
+        # Scrollbar para la lista
+        records_canvas = tk.Canvas(records_frame, bg='#F8FAFC', highlightthickness=0)
+        records_scrollbar = ttk.Scrollbar(records_frame, orient="vertical", command=records_canvas.yview)
+        self.records_scrollable_frame = tk.Frame(records_canvas, bg='#F8FAFC')
+        
+        self.records_scrollable_frame.bind(
+            "<Configure>",
+            lambda e: records_canvas.configure(scrollregion=records_canvas.bbox("all"))
+        )
+        
+        records_canvas.create_window((0, 0), window=self.records_scrollable_frame, anchor="nw")
+        records_canvas.configure(yscrollcommand=records_scrollbar.set)
+        
+        records_canvas.pack(side="left", fill="both", expand=True)
+        records_scrollbar.pack(side="right", fill="y")
+        
+        # Panel derecho - Vista previa y acciones
+        right_panel = tk.LabelFrame(main_container, text="👁️ Vista Previa", 
+                                   font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                   padx=15, pady=10)
+        right_panel.pack(side='right', fill='both', expand=True, padx=(10, 0))
+        
+        # Vista previa
+        preview_frame = tk.Frame(right_panel, bg='white', relief='sunken', bd=2)
+        preview_frame.pack(fill='both', expand=True, pady=(0, 10))
+        
+        self.preview_text = tk.Text(preview_frame, font=('Arial', 10), bg='white', 
+                                   state='disabled', wrap='word')
+        preview_scrollbar = ttk.Scrollbar(preview_frame, orient="vertical", command=self.preview_text.yview)
+        self.preview_text.configure(yscrollcommand=preview_scrollbar.set)
+        
+        self.preview_text.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        preview_scrollbar.pack(side="right", fill="y")
+        
+        # Botones de acción
+        actions_frame = tk.Frame(right_panel, bg='#F8FAFC')
+        actions_frame.pack(fill='x')
+        
+        tk.Button(actions_frame, text="🔄 Actualizar Vista Previa", 
+                 bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                 command=lambda: self.update_medical_history_preview(patient_info),
+                 padx=15, pady=8).pack(fill='x', pady=2)
+        
+        tk.Button(actions_frame, text="📄 Generar PDF", 
+                 bg='#16A085', fg='white', font=('Arial', 10, 'bold'),
+                 command=lambda: self.generate_medical_history_pdf(patient_info),
+                 padx=15, pady=8).pack(fill='x', pady=2)
+        
+        tk.Button(actions_frame, text="❌ Cerrar", 
+                 bg='#E74C3C', fg='white', font=('Arial', 10, 'bold'),
+                 command=window.destroy, padx=15, pady=8).pack(fill='x', pady=2)
+        
+        # Cargar registros médicos del paciente
+        self.load_patient_records_for_print(patient_info['id'])
+        
+        # Actualizar vista previa inicial
+        self.update_medical_history_preview(patient_info)
+    
+    def load_patient_records_for_print(self, patient_id):
+        """Cargar registros médicos del paciente con checkboxes"""
+        # Limpiar registros anteriores
+        for widget in self.records_scrollable_frame.winfo_children():
+            widget.destroy()
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT id, fecha_consulta, diagnostico, tratamiento, medicamentos, observaciones
+                FROM historiales_medicos 
+                WHERE paciente_id = ? 
+                ORDER BY fecha_consulta DESC
+            """
+            cursor.execute(query, (patient_id,))
+            records = cursor.fetchall()
+            
+            # Variables para checkbox selection
+            self.selected_records = {}
+            
+            if not records:
+                tk.Label(self.records_scrollable_frame, 
+                        text="No se encontraron registros médicos para este paciente",
+                        font=('Arial', 10), bg='#F8FAFC', fg='#64748B').pack(pady=20)
+                return
+            
+            # Header con seleccionar todo
+            header_frame = tk.Frame(self.records_scrollable_frame, bg='#E3F2FD', relief='raised', bd=1)
+            header_frame.pack(fill='x', padx=2, pady=(0, 5))
+            
+            select_all_var = tk.BooleanVar()
+            select_all_cb = tk.Checkbutton(header_frame, text="Seleccionar Todos",
+                                          variable=select_all_var, bg='#E3F2FD',
+                                          font=('Arial', 10, 'bold'),
+                                          command=lambda: self.toggle_all_records(select_all_var.get()))
+            select_all_cb.pack(side='left', padx=10, pady=5)
+            
+            # Crear checkbox para cada registro
+            for i, record in enumerate(records):
+                record_id, fecha_consulta, diagnostico, tratamiento, medicamentos, observaciones = record
+                
+                # Frame para cada registro
+                record_frame = tk.Frame(self.records_scrollable_frame, bg='white', relief='raised', bd=1)
+                record_frame.pack(fill='x', padx=2, pady=2)
+                
+                # Variable para checkbox
+                var = tk.BooleanVar(value=True)  # Seleccionar todos por defecto
+                self.selected_records[record_id] = var
+                
+                # Checkbox y contenido
+                cb_frame = tk.Frame(record_frame, bg='white')
+                cb_frame.pack(fill='x', padx=10, pady=5)
+                
+                tk.Checkbutton(cb_frame, variable=var, bg='white',
+                              command=lambda: self.update_medical_history_preview(None)).pack(side='left')
+                
+                # Información del registro
+                info_frame = tk.Frame(cb_frame, bg='white')
+                info_frame.pack(side='left', fill='x', expand=True, padx=(10, 0))
+                
+                # Primera línea: fecha
+                first_line = tk.Frame(info_frame, bg='white')
+                first_line.pack(fill='x')
+                
+                tk.Label(first_line, text=f"📅 {fecha_consulta}", font=('Arial', 10, 'bold'),
+                        bg='white', fg='#0B5394').pack(side='left')
+                
+                # Diagnóstico
+                if diagnostico:
+                    diag_text = diagnostico[:100] + "..." if len(diagnostico) > 100 else diagnostico
+                    tk.Label(info_frame, text=f"� {diag_text}", font=('Arial', 9),
+                            bg='white', fg='#E67E22', wraplength=300, justify='left').pack(anchor='w', pady=(2, 0))
+                
+                # Tratamiento
+                if tratamiento:
+                    treat_text = tratamiento[:80] + "..." if len(tratamiento) > 80 else tratamiento
+                    tk.Label(info_frame, text=f"� {treat_text}", font=('Arial', 9),
+                            bg='white', fg='#16A085', wraplength=300, justify='left').pack(anchor='w', pady=(1, 0))
+            
+            print(f"Cargados {len(records)} registros médicos")
+            
+        except Exception as e:
+            print(f"Error cargando registros médicos: {e}")
+            tk.Label(self.records_scrollable_frame, 
+                    text="Error al cargar registros médicos",
+                    font=('Arial', 10), bg='#F8FAFC', fg='#E74C3C').pack(pady=20)
+    
+    def toggle_all_records(self, select_all):
+        """Seleccionar/deseleccionar todos los registros"""
+        if hasattr(self, 'selected_records') and self.selected_records:
+            for var in self.selected_records.values():
+                var.set(select_all)
+            self.update_medical_history_preview(None)
+    
+    def update_medical_history_preview(self, patient_info):
+        """Actualizar vista previa del historial médico"""
+        if patient_info is None:
+            # Obtener info del paciente desde el registro seleccionado
+            patient_info = self.get_patient_from_medical_record(self.selected_medical_record_id)
+        
+        if not patient_info:
+            return
+        
+        # Verificar que selected_records exista
+        if not hasattr(self, 'selected_records') or not self.selected_records:
+            self.preview_text.config(state='normal')
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, "Cargando registros médicos...")
+            self.preview_text.config(state='disabled')
+            return
+        
+        # Obtener registros seleccionados
+        selected_record_ids = [record_id for record_id, var in self.selected_records.items() if var.get()]
+        
+        if not selected_record_ids:
+            self.preview_text.config(state='normal')
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.insert(tk.END, "Seleccione al menos un registro para mostrar la vista previa")
+            self.preview_text.config(state='disabled')
+            return
+        
+        # Generar contenido de vista previa
+        preview_content = self.generate_medical_history_content(patient_info, selected_record_ids)
+        
+        # Actualizar vista previa
+        self.preview_text.config(state='normal')
+        self.preview_text.delete(1.0, tk.END)
+        self.preview_text.insert(tk.END, preview_content)
+        self.preview_text.config(state='disabled')
+    
+    def generate_medical_history_content(self, patient_info, selected_record_ids):
+        """Generar contenido del historial médico para vista previa/PDF"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Obtener registros seleccionados
+            placeholders = ','.join('?' * len(selected_record_ids))
+            query = f"""
+                SELECT fecha_consulta, diagnostico, tratamiento, medicamentos, 
+                       observaciones, estado
+                FROM historiales_medicos 
+                WHERE id IN ({placeholders})
+                ORDER BY fecha_consulta DESC
+            """
+            cursor.execute(query, selected_record_ids)
+            records = cursor.fetchall()
+            
+            # Generar contenido
+            content = []
+            content.append("=" * 80)
+            content.append("HISTORIAL MÉDICO COMPLETO")
+            content.append("=" * 80)
+            content.append("")
+            
+            # Información del paciente
+            content.append("INFORMACIÓN DEL PACIENTE")
+            content.append("-" * 40)
+            content.append(f"Nombre: {patient_info['nombre']} {patient_info['apellido']}")
+            content.append(f"Email: {patient_info['email']}")
+            content.append(f"Teléfono: {patient_info['telefono']}")
+            content.append(f"Fecha de Nacimiento: {patient_info['fecha_nacimiento']}")
+            content.append("")
+            
+            # Resumen
+            content.append(f"RESUMEN DEL HISTORIAL")
+            content.append("-" * 40)
+            content.append(f"Total de registros: {len(records)}")
+            content.append(f"Fecha de generación: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+            content.append("")
+            
+            # Registros médicos
+            content.append("REGISTROS MÉDICOS DETALLADOS")
+            content.append("=" * 50)
+            
+            for i, record in enumerate(records, 1):
+                fecha_consulta, diagnostico, tratamiento, medicamentos, observaciones, estado = record
+                
+                content.append("")
+                content.append(f"REGISTRO #{i}")
+                content.append("-" * 30)
+                content.append(f"📅 Fecha de Consulta: {fecha_consulta}")
+                
+                if diagnostico:
+                    content.append(f"🔍 Diagnóstico:")
+                    content.append(f"   {diagnostico}")
+                
+                if tratamiento:
+                    content.append(f"💊 Tratamiento:")
+                    content.append(f"   {tratamiento}")
+                
+                if medicamentos:
+                    content.append(f"💉 Medicamentos:")
+                    content.append(f"   {medicamentos}")
+                
+                if observaciones:
+                    content.append(f"📋 Observaciones:")
+                    content.append(f"   {observaciones}")
+                
+                if estado:
+                    content.append(f"📊 Estado:")
+                    content.append(f"   {estado}")
+                
+                content.append("")
+            
+            content.append("=" * 80)
+            content.append("FIN DEL HISTORIAL MÉDICO")
+            content.append("=" * 80)
+            
+            return "\n".join(content)
+            
+        except Exception as e:
+            print(f"Error generando contenido del historial: {e}")
+            return f"Error al generar el historial médico: {str(e)}"
+    
+    def generate_medical_history_pdf(self, patient_info):
+        """Generar PDF del historial médico"""
+        try:
+            # Verificar que selected_records exista
+            if not hasattr(self, 'selected_records') or not self.selected_records:
+                messagebox.showwarning("Advertencia", "No hay registros cargados para generar el PDF")
+                return
+            
+            # Obtener registros seleccionados
+            selected_record_ids = [record_id for record_id, var in self.selected_records.items() if var.get()]
+            
+            if not selected_record_ids:
+                messagebox.showwarning("Advertencia", "Seleccione al menos un registro para generar el PDF")
+                return
+            
+            # Obtener datos de los registros
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            placeholders = ','.join('?' * len(selected_record_ids))
+            query = f"""
+                SELECT fecha_consulta, diagnostico, tratamiento, medicamentos, 
+                       observaciones, estado
+                FROM historiales_medicos 
+                WHERE id IN ({placeholders})
+                ORDER BY fecha_consulta DESC
+            """
+            cursor.execute(query, selected_record_ids)
+            records = cursor.fetchall()
+            cursor.close()
+            conn.close()
+            
+            # Mismos datos y misma plantilla: el PDF ya generado sigue valiendo
+            cache = self.get_document_cache()
+            document_key = cache_document_key('historial', HISTORY_TEMPLATE_VERSION,
+                                              {'paciente': patient_info, 'registros': [list(r) for r in records]})
+            cached_filename = cache.lookup(document_key)
+            if cached_filename is not None:
+                self.show_medical_history_pdf(cached_filename)
+                return
+            
+            # Importar reportlab
+            try:
+                from reportlab.lib import colors
+                from reportlab.lib.pagesizes import A4
+                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                from reportlab.lib.units import inch
+                from reportlab.pdfgen import canvas
+            except ImportError:
+                self.show_missing_capability('pdf')
+                return
+            
+            # Crear directorio si no existe
+            os.makedirs("historiales_pdf", exist_ok=True)
+            
+            # Nombre del archivo: el hash de los datos reemplaza a la marca de tiempo
+            nombre_limpio = safe_filename(patient_info['nombre'])
+            apellido_limpio = safe_filename(patient_info['apellido'])
+            filename = f"historiales_pdf/Historial_Medico_{nombre_limpio}_{apellido_limpio}_{document_key[:12]}.pdf"
+            print(f"🔍 DEBUG: Generando PDF en: {filename}")
+            
+            # Crear PDF
+            styles = getSampleStyleSheet()
+            story = []
+            
+            # Estilo personalizado para título
+            title_style = ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=18,
+                spaceAfter=30,
+                alignment=1,  # Centrado
+                textColor=colors.HexColor('#0B5394')
+            )
+            
+            # Estilo personalizado para subtítulos
+            subtitle_style = ParagraphStyle(
+                'CustomSubtitle',
+                parent=styles['Heading2'],
+                fontSize=14,
+                spaceAfter=12,
+                textColor=colors.HexColor('#16A085')
+            )
+            
+            # Estilo para texto normal
+            normal_style = ParagraphStyle(
+                'CustomNormal',
+                parent=styles['Normal'],
+                fontSize=10,
+                spaceAfter=6
+            )
+            
+            # Título principal
+            story.append(Paragraph("HISTORIAL MÉDICO COMPLETO", title_style))
+            story.append(Spacer(1, 20))
+            
+            # Información del paciente
+            story.append(Paragraph("INFORMACIÓN DEL PACIENTE", subtitle_style))
+            
+            patient_data = [
+                ['Nombre:', f"{patient_info['nombre']} {patient_info['apellido']}"],
+                ['Email:', patient_info['email']],
+                ['Teléfono:', patient_info['telefono']],
+                ['Fecha de Nacimiento:', patient_info['fecha_nacimiento']]
+            ]
+            
+            patient_table = Table(patient_data, colWidths=[2*inch, 4*inch])
+            patient_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E3F2FD')),
+                ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#0B5394')),
+                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+            ]))
+            
+            story.append(patient_table)
+            story.append(Spacer(1, 20))
+            
+            # Resumen
+            story.append(Paragraph("RESUMEN DEL HISTORIAL", subtitle_style))
+            summary_text = f"""
+            <b>Total de registros:</b> {len(records)}<br/>
+            <b>Fecha de generación:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}<br/>
+            <b>Generado por:</b> MEDISYNC - Sistema de Gestión Médica
+            """
+            story.append(Paragraph(summary_text, normal_style))
+            story.append(Spacer(1, 20))
+            
+            # Registros médicos
+            story.append(Paragraph("REGISTROS MÉDICOS DETALLADOS", subtitle_style))
+            
+            for i, record in enumerate(records, 1):
+                fecha_consulta, diagnostico, tratamiento, medicamentos, observaciones, estado = record
+                
+                # Título del registro
+                record_title = f"REGISTRO #{i} - {fecha_consulta}"
+                story.append(Paragraph(record_title, ParagraphStyle(
+                    'RecordTitle',
+                    parent=styles['Heading3'],
+                    fontSize=12,
+                    spaceAfter=10,
+                    textColor=colors.HexColor('#E67E22'),
+                    backColor=colors.HexColor('#FDF2E9'),
+                    borderPadding=5
+                )))
+                
+                # Crear tabla para los datos del registro
+                record_data = []
+                
+                if diagnostico:
+                    record_data.append(['Diagnóstico:', diagnostico])
+                if tratamiento:
+                    record_data.append(['Tratamiento:', tratamiento])
+                if medicamentos:
+                    record_data.append(['Medicamentos:', medicamentos])
+                if observaciones:
+                    record_data.append(['Observaciones:', observaciones])
+                if estado:
+                    record_data.append(['Estado:', estado])
+                
+                if record_data:
+                    record_table = Table(record_data, colWidths=[1.5*inch, 4.5*inch])
+                    record_table.setStyle(TableStyle([
+                        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#F8F9FA')),
+                        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#0B5394')),
+                        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+                        ('FONTSIZE', (0, 0), (-1, -1), 9),
+                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                        ('TOPPADDING', (0, 0), (-1, -1), 8),
+                        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                    ]))
+                    
+                    story.append(record_table)
+                
+                story.append(Spacer(1, 15))
+            
+            # Pie de página
+            story.append(Spacer(1, 30))
+            footer_text = f"""
+            <i>Este historial médico fue generado automáticamente por MEDISYNC el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}.<br/>
+            Para cualquier consulta, póngase en contacto con el centro médico.</i>
+            """
+            story.append(Paragraph(footer_text, ParagraphStyle(
+                'Footer',
+                parent=styles['Normal'],
+                fontSize=8,
+                alignment=1,
+                textColor=colors.grey
+            )))
+            
+            # Generar PDF (en un temporal que se publica y registra al terminar)
+            sources = [('usuarios', patient_info.get('id'))]
+            sources.extend(('historiales_medicos', record_id) for record_id in selected_record_ids)
+            with cache.writing('historial', document_key, filename, sources) as tmp_path:
+                doc = SimpleDocTemplate(tmp_path, pagesize=A4)
+                doc.build(story)
+            
+            self.show_medical_history_pdf(filename)
+            
+        except Exception as e:
+            print(f"Error generando PDF: {e}")
+            messagebox.showerror("Error", f"Error al generar el PDF del historial médico:\n{str(e)}")
+    
+    def show_medical_history_pdf(self, filename):
+        """Avisar que el PDF del historial está listo y ofrecer abrirlo"""
+        # Verificar que el archivo se creó correctamente
+        if not os.path.exists(filename):
+            messagebox.showerror("Error", "El archivo PDF no se pudo crear correctamente")
+            return
+        
+        print(f"✅ PDF generado exitosamente: {filename}")
+        # Mostrar mensaje de éxito y abrir PDF
+        result = messagebox.askyesno("PDF Generado", 
+                                   f"El historial médico se ha generado exitosamente.\n\n"
+                                   f"Archivo: {filename}\n\n"
+                                   f"¿Desea abrir el archivo PDF ahora?")
+        if result:
+            self.open_document(filename)
+    
+    def create_medical_note_from_appointment(self, appointment_id):
+        """Crear nota médica automáticamente al completar una cita"""
+        try:
+            # Obtener datos de la cita
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT c.paciente_id, c.doctor_id, c.fecha_hora, c.motivo,
+                       p.nombre as paciente_nombre, p.apellido as paciente_apellido
+                FROM citas c
+                JOIN usuarios p ON c.paciente_id = p.id
+                WHERE c.id = ?
+            """
+            
+            cursor.execute(query, (appointment_id,))
+            appointment_data = cursor.fetchone()
+            cursor.close()
+            conn.close()
+            
+            if appointment_data:
+                # Crear registro médico básico
+                medical_record_id = self.db_manager.save_medical_record({
+                    'paciente_id': appointment_data[0],
+                    'doctor_id': appointment_data[1],
+                    'fecha_consulta': appointment_data[2][:10],  # Solo fecha
+                    'tipo_consulta': 'Consulta',
+                    'motivo_consulta': appointment_data[3] or 'Consulta médica',
+                    'estado': 'Pendiente'  # Estado inicial
+                })
+                
+                if medical_record_id is not None:
+                    messagebox.showinfo("Registro Creado", 
+                                      f"Se ha creado un registro médico automático para {appointment_data[4]} {appointment_data[5]}.\n\n"
+                                      "Puede completar los detalles médicos en la pestaña de Historial Médico.")
+            
+        except Exception as e:
+            print(f"Error al crear registro médico automático: {str(e)}")
@@ -0,0 +1,4806 @@
+"""
+Portal del paciente de MEDISYNC
+Dashboard, citas, historial, facturas y configuración del paciente
+Métodos de MedisyncApp que se importan la primera vez que se usan
+(ver medisync_views)
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+from datetime import datetime
+
+from optional_deps import CALENDAR_AVAILABLE
+from virtual_tree import QuerySource, VirtualTreeview
+
+
+class PacienteViews:
+    """Métodos de MedisyncApp: dashboard, citas, historial, facturas y configuración del paciente"""
+    
+    def create_patient_dashboard(self, parent):
+        """Dashboard específico para pacientes con diseño moderno similar al admin"""
+        # Frame principal con mejor diseño
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True)
+        
+        # Header principal con gradiente visual
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=80)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=30, pady=15)
+        
+        # Título principal
+        title_frame = tk.Frame(header_content, bg='#1E3A8A')
+        title_frame.pack(side='left', fill='y')
+        
+        tk.Label(title_frame, text="🏠 Mi Dashboard Personal", 
+                font=('Arial', 20, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='w')
+        tk.Label(title_frame, text=f"Bienvenido/a {self.current_user.nombre} - Resumen de tu salud", 
+                font=('Arial', 11), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='w')
+        
+        # Información del paciente actual
+        user_info_frame = tk.Frame(header_content, bg='#1E3A8A')
+        user_info_frame.pack(side='right', fill='y')
+        
+        tk.Label(user_info_frame, text=f"🤒 {self.current_user.nombre} {self.current_user.apellido}", 
+                font=('Arial', 12, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='e')
+        tk.Label(user_info_frame, text="Paciente del Sistema", 
+                font=('Arial', 10), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='e')
+        
+        # Contenido principal directo sin scrollbar
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        # Tarjetas de estadísticas personales del paciente optimizadas
+        stats_frame = tk.Frame(content_frame, bg='#F8FAFC')
+        stats_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            patient_stats = self.get_patient_stats()
+            
+            # Crear frame para las 4 tarjetas con mejor distribución
+            stats_container = tk.Frame(stats_frame, bg='#F8FAFC')
+            stats_container.pack(fill='x', expand=True)
+            
+            # Crear tarjetas de estadísticas mejoradas
+            stats_data = [
+                ("📅", "Próximas Citas", patient_stats.get('upcoming_appointments', 0), "#16A085"),
+                ("📋", "Consultas Totales", patient_stats.get('total_consultations', 0), "#0B5394"), 
+                ("💰", "Facturas Pendientes", patient_stats.get('pending_bills', 0), "#E67E22"),
+                ("👨‍⚕️", "Doctores Visitados", patient_stats.get('doctors_visited', 0), "#059669")
+            ]
+            
+            for i, (icon, title, value, color) in enumerate(stats_data):
+                # Crear tarjeta individual con mejor diseño
+                card_frame = tk.Frame(stats_container, bg='white', relief='solid', bd=1)
+                card_frame.grid(row=0, column=i, padx=6, pady=6, sticky='ew')
+                
+                # Header colorido de la tarjeta
+                header = tk.Frame(card_frame, bg=color, height=8)
+                header.pack(fill='x')
+                header.pack_propagate(False)
+                
+                # Contenido de la tarjeta con mejor espaciado
+                content = tk.Frame(card_frame, bg='white')
+                content.pack(fill='both', expand=True, padx=15, pady=15)
+                
+                # Icono y valor más grandes
+                tk.Label(content, text=icon, font=('Arial', 28), bg='white', fg=color).pack(pady=(0, 8))
+                tk.Label(content, text=str(value), font=('Arial', 24, 'bold'), bg='white', fg=color).pack()
+                tk.Label(content, text=title, font=('Arial', 10), bg='white', fg='#64748B', 
+                        wraplength=120, justify='center').pack(pady=(5, 0))
+                
+                # Configurar expansión igual para todas las columnas
+                stats_container.columnconfigure(i, weight=1)
+                
+        except Exception as e:
+            error_label = tk.Label(stats_frame, text=f"Error cargando estadísticas: {str(e)}", 
+                                 font=('Arial', 10), fg='red', bg='#F8FAFC')
+            error_label.pack(pady=20)
+        
+        # Frame horizontal para información personal y citas próximas
+        top_horizontal_frame = tk.Frame(content_frame, bg='#F8FAFC')
+        top_horizontal_frame.pack(fill='x', pady=(0, 20))
+        
+        # Panel de información personal más pequeño (lado izquierdo)
+        info_panel = tk.LabelFrame(top_horizontal_frame, text="📋 Mi Información Personal", 
+                                  font=('Arial', 13, 'bold'), padx=15, pady=15, 
+                                  bg='white', relief='solid', bd=1)
+        info_panel.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        
+        # Grid de información personal compacto
+        info_grid = tk.Frame(info_panel, bg='white')
+        info_grid.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        try:
+            patient_info = self.get_patient_info(self.current_user.id)
+            
+            info_items = [
+                ("👤 Nombre:", f"{patient_info.get('nombre', '')} {patient_info.get('apellido', '')}"),
+                ("📧 Email:", patient_info.get('email', 'No especificado')),
+                ("📞 Teléfono:", patient_info.get('telefono', 'No especificado')),
+                ("🏥 Expediente:", patient_info.get('numero_expediente', 'No asignado')),
+                ("🩸 Tipo Sangre:", patient_info.get('tipo_sangre', 'No especificado')),
+                ("🎂 F. Nacimiento:", patient_info.get('fecha_nacimiento', 'No especificada'))
+            ]
+            
+            # Distribuir en 2 columnas para mostrar todos los datos
+            for i, (label, value) in enumerate(info_items):
+                row = i // 2
+                col = (i % 2) * 2
+                
+                tk.Label(info_grid, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#1E3A8A').grid(row=row, column=col, sticky='w', padx=(0, 8), pady=8)
+                tk.Label(info_grid, text=value, font=('Arial', 10), 
+                        bg='white', fg='#64748B').grid(row=row, column=col+1, sticky='w', padx=(0, 15), pady=8)
+            
+            # Configurar grid weights para mejor distribución
+            info_grid.columnconfigure(1, weight=1)
+            info_grid.columnconfigure(3, weight=1)
+                        
+        except Exception as e:
+            tk.Label(info_panel, text=f"Error cargando información: {str(e)}", 
+                    font=('Arial', 9), fg='red', bg='white').pack(pady=8)
+        
+        # Panel de próximas citas (lado derecho)
+        appointments_panel = tk.LabelFrame(top_horizontal_frame, text="📅 Mis Próximas Citas", 
+                                         font=('Arial', 13, 'bold'), padx=15, pady=12, 
+                                         bg='white', relief='solid', bd=1)
+        appointments_panel.pack(side='right', fill='both', expand=True, padx=(10, 0))
+        
+        try:
+            upcoming_appointments = self.get_patient_upcoming_appointments()
+            
+            if upcoming_appointments:
+                appointments_content = tk.Frame(appointments_panel, bg='white')
+                appointments_content.pack(fill='both', expand=True, padx=8, pady=8)
+                
+                for i, appointment in enumerate(upcoming_appointments[:4]):  # Mostrar máximo 4
+                    appt_frame = tk.Frame(appointments_content, bg='#F0F9FF', relief='solid', bd=1)
+                    appt_frame.pack(fill='x', pady=3, padx=3)
+                    
+                    appt_inner = tk.Frame(appt_frame, bg='#F0F9FF')
+                    appt_inner.pack(fill='x', padx=10, pady=6)
+                    
+                    # Fecha y hora más prominente
+                    tk.Label(appt_inner, text=f"📅 {appointment.get('fecha', 'N/A')} - {appointment.get('hora', 'N/A')}", 
+                            font=('Arial', 10, 'bold'), bg='#F0F9FF', fg='#0B5394').pack(anchor='w')
+                    
+                    # Doctor y motivo
+                    tk.Label(appt_inner, text=f"👨‍⚕️ Dr. {appointment.get('doctor', 'N/A')}", 
+                            font=('Arial', 9), bg='#F0F9FF', fg='#64748B').pack(anchor='w', pady=(1, 0))
+                    
+                    tk.Label(appt_inner, text=f"🩺 {appointment.get('motivo', 'Consulta general')}", 
+                            font=('Arial', 9), bg='#F0F9FF', fg='#64748B').pack(anchor='w')
+            else:
+                tk.Label(appointments_panel, text="📅 No tienes citas programadas próximamente", 
+                        font=('Arial', 10), bg='white', fg='#64748B').pack(pady=15)
+                        
+        except Exception as e:
+            tk.Label(appointments_panel, text=f"Error cargando citas: {str(e)}", 
+                    font=('Arial', 9), fg='red', bg='white').pack(pady=8)
+        
+        # Frame horizontal para recordatorios (ahora ocupa todo el ancho)
+        bottom_frame = tk.Frame(content_frame, bg='#F8FAFC')
+        bottom_frame.pack(fill='both', expand=True, pady=(0, 10))
+        
+        # Panel de recordatorios de salud optimizado (ahora usa todo el ancho)
+        reminders_panel = tk.LabelFrame(bottom_frame, text="🔔 Recordatorios de Salud", 
+                                      font=('Arial', 14, 'bold'), padx=20, pady=15, 
+                                      bg='white', relief='solid', bd=1)
+        reminders_panel.pack(fill='both', expand=True)
+        
+        try:
+            reminders = self.get_patient_reminders()
+            
+            if reminders:
+                reminders_content = tk.Frame(reminders_panel, bg='white')
+                reminders_content.pack(fill='both', expand=True, padx=10, pady=10)
+                
+                for reminder in reminders:
+                    reminder_frame = tk.Frame(reminders_content, bg='#FEF3C7', relief='solid', bd=1)
+                    reminder_frame.pack(fill='x', pady=4, padx=5)
+                    
+                    tk.Label(reminder_frame, text=f"⚠️ {reminder}", 
+                            font=('Arial', 10), bg='#FEF3C7', fg='#92400E').pack(padx=15, pady=8)
+            else:
+                # Panel de estado positivo más atractivo
+                positive_frame = tk.Frame(reminders_panel, bg='#DCFCE7', relief='solid', bd=1)
+                positive_frame.pack(fill='both', expand=True, padx=10, pady=10)
+                
+                tk.Label(positive_frame, text="✅ ¡Excelente! Tienes tu salud al día", 
+                        font=('Arial', 12, 'bold'), bg='#DCFCE7', fg='#059669').pack(pady=15)
+                tk.Label(positive_frame, text="No hay recordatorios pendientes en este momento", 
+                        font=('Arial', 10), bg='#DCFCE7', fg='#16A34A').pack(pady=(0, 15))
+                        
+        except Exception as e:
+            tk.Label(reminders_panel, text=f"Error cargando recordatorios: {str(e)}", 
+                    font=('Arial', 10), fg='red', bg='white').pack(pady=10)
+    
+    def create_patient_appointments(self, parent):
+        """Citas del paciente con diseño moderno similar al admin"""
+        # Frame principal con mejor diseño
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True)
+
+        # Header principal con gradiente visual
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=80)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=30, pady=15)
+        
+        # Título principal
+        title_frame = tk.Frame(header_content, bg='#1E3A8A')
+        title_frame.pack(side='left', fill='y')
+        
+        tk.Label(title_frame, text="📅 Gestión de Mis Citas", 
+                font=('Arial', 20, 'bold'), bg='#1E3A8A', fg='white').pack(anchor='w')
+        tk.Label(title_frame, text="Administra y agenda tus citas médicas", 
+                font=('Arial', 11), bg='#1E3A8A', fg='#CBD5E1').pack(anchor='w')
+        
+        # Botones de acción en el header
+        actions_frame = tk.Frame(header_content, bg='#1E3A8A')
+        actions_frame.pack(side='right', fill='y')
+        
+        tk.Button(actions_frame, text="➕ Agendar Nueva Cita", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), relief='flat', padx=15, pady=8,
+                 command=self.open_patient_schedule_dialog).pack(side='right', padx=(10, 0))
+        tk.Button(actions_frame, text="🔄 Actualizar Lista", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), relief='flat', padx=15, pady=8,
+                 command=self.update_patient_appointments_list).pack(side='right', padx=(10, 0))
+
+        # Contenido principal
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True, padx=30, pady=30)
+
+        # Panel dividido moderno: Calendario + Lista
+        main_content = tk.Frame(content_frame, bg='#F8FAFC')
+        main_content.pack(fill='both', expand=True)
+
+        # Panel izquierdo - Calendario y filtros
+        left_panel = tk.Frame(main_content, bg='white', relief='solid', bd=1, width=380)
+        left_panel.pack(side='left', fill='y', padx=(0, 15))
+        left_panel.pack_propagate(False)
+
+        # Header del calendario
+        cal_header = tk.Frame(left_panel, bg='#0B5394', height=45)
+        cal_header.pack(fill='x')
+        cal_header.pack_propagate(False)
+        tk.Label(cal_header, text="📅 Calendario de Citas", font=('Arial', 12, 'bold'), 
+                fg='white', bg='#0B5394').pack(pady=10)
+
+        # Contenedor del calendario
+        cal_container = tk.Frame(left_panel, bg='white')
+        cal_container.pack(fill='both', expand=True, padx=15, pady=15)
+
+        self.patient_cal_date = tk.StringVar()
+        if CALENDAR_AVAILABLE:
+            from tkcalendar import Calendar
+            self.patient_calendar = Calendar(cal_container, selectmode='day', 
+                                           date_pattern='dd/mm/yyyy',
+                                           background='#0B5394',
+                                           foreground='white',
+                                           bordercolor='#1E3A8A',
+                                           headersbackground='#1E3A8A',
+                                           normalbackground='white',
+                                           normalforeground='black',
+                                           weekendbackground='#F8FAFC',
+                                           weekendforeground='#64748B')
+            self.patient_calendar.pack(fill='both', expand=True)
+            
+            def on_cal_select(event=None):
+                self.patient_cal_date.set(self.patient_calendar.get_date())
+                self.load_patient_appointments()
+            self.patient_calendar.bind("<<CalendarSelected>>", on_cal_select)
+        else:
+            # Fallback sin calendario
+            no_cal_frame = tk.Frame(cal_container, bg='#F8FAFC', relief='solid', bd=1)
+            no_cal_frame.pack(fill='both', expand=True, padx=10, pady=10)
+            
+            tk.Label(no_cal_frame, text="📅 Filtro por Fecha", 
+                    font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(10, 5))
+            tk.Label(no_cal_frame, text="(Calendario no disponible)", 
+                    font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack()
+            
+            date_entry = tk.Entry(no_cal_frame, textvariable=self.patient_cal_date, 
+                                 font=('Arial', 10), justify='center')
+            date_entry.pack(pady=10, padx=10, fill='x')
+            
+            tk.Button(no_cal_frame, text='🔍 Filtrar por Fecha', 
+                     command=self.load_patient_appointments,
+                     bg='#0B5394', fg='white', font=('Arial', 9, 'bold'),
+                     relief='flat', pady=5).pack(pady=(5, 10), padx=10, fill='x')
+
+        # Filtros rápidos mejorados
+        filters_frame = tk.LabelFrame(left_panel, text="🔍 Filtros Rápidos", 
+                                    font=('Arial', 10, 'bold'), padx=15, pady=10, bg='white')
+        filters_frame.pack(fill='x', padx=15, pady=(0, 15))
+        
+        tk.Label(filters_frame, text="Mostrar:", font=('Arial', 9, 'bold'), bg='white').pack(anchor='w')
+        self.patient_appointment_filter = ttk.Combobox(filters_frame, 
+                                                     values=['Todas', 'Próximas', 'Pasadas', 'Este Mes'], 
+                                                     state='readonly', width=15, font=('Arial', 9))
+        self.patient_appointment_filter.set('Próximas')
+        self.patient_appointment_filter.pack(fill='x', pady=5)
+        self.patient_appointment_filter.bind('<<ComboboxSelected>>', lambda e: self.load_patient_appointments())
+
+        # Panel derecho - Lista de citas
+        right_panel = tk.Frame(main_content, bg='white', relief='solid', bd=1)
+        right_panel.pack(side='left', fill='both', expand=True)
+
+        # Header de la lista
+        list_header = tk.Frame(right_panel, bg='#0B5394', height=45)
+        list_header.pack(fill='x')
+        list_header.pack_propagate(False)
+        
+        # Frame interno para título y contador
+        header_content = tk.Frame(list_header, bg='#0B5394')
+        header_content.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        tk.Label(header_content, text="📋 Lista de Mis Citas", font=('Arial', 12, 'bold'), 
+                fg='white', bg='#0B5394').pack(side='left')
+        
+        # Contador de citas
+        self.patient_appointments_count_label = tk.Label(header_content, text="📋 Total: 0 citas", 
+                                                       font=('Arial', 10), fg='white', bg='#0B5394')
+        self.patient_appointments_count_label.pack(side='right')
+
+        # Tabla de citas con scrollbars mejorados
+        table_container = tk.Frame(right_panel, bg='white')
+        table_container.pack(fill='both', expand=True, padx=15, pady=15)
+
+        columns = ('ID','Fecha','Hora','Doctor','Motivo','Estado')
+        self.patient_appointments_tree = ttk.Treeview(table_container, columns=columns, show='headings', height=12)
+        
+        # Configurar columnas
+        column_widths = {'ID': 50, 'Fecha': 100, 'Hora': 80, 'Doctor': 130, 'Motivo': 150, 'Estado': 100}
+        for col in columns:
+            self.patient_appointments_tree.heading(col, text=col, anchor='center')
+            self.patient_appointments_tree.column(col, width=column_widths.get(col, 100), anchor='center')
+
+        # Scrollbars con mejor diseño
+        v_scrollbar = ttk.Scrollbar(table_container, orient='vertical', command=self.patient_appointments_tree.yview)
+        h_scrollbar = ttk.Scrollbar(table_container, orient='horizontal', command=self.patient_appointments_tree.xview)
+        self.patient_appointments_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        
+        # Layout con grid para mejor control
+        self.patient_appointments_tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        
+        # Configurar expansión
+        table_container.grid_rowconfigure(0, weight=1)
+        table_container.grid_columnconfigure(0, weight=1)
+        
+        # Agregar eventos para mejor interacción
+        self.patient_appointments_tree.bind('<Double-1>', lambda e: self.view_my_appointment_details())
+        self.patient_appointments_tree.bind('<ButtonRelease-1>', self.on_patient_appointment_select)
+        self.patient_appointments_tree.bind('<Button-3>', self.show_appointment_context_menu)  # Clic derecho
+        
+        # Agregar tooltip o información de ayuda
+        help_frame = tk.Frame(table_container, bg='white')
+        help_frame.grid(row=2, column=0, columnspan=2, sticky='ew', pady=(5, 0))
+        
+        tk.Label(help_frame, text="💡 Consejo: Haga doble clic en una cita para ver sus detalles", 
+                font=('Arial', 9, 'italic'), bg='white', fg='#64748B').pack(side='left')
+        
+        # Panel de información de cita seleccionada - más prominente
+        self.selected_appointment_info = tk.Frame(right_panel, bg='#F0F9FF', relief='solid', bd=2, height=60)
+        self.selected_appointment_info.pack(fill='x', padx=15, pady=(0, 15))
+        self.selected_appointment_info.pack_propagate(False)
+        
+        # Inicialmente oculto
+        self.selected_appointment_info.pack_forget()
+        
+        # Label para mostrar información de la cita seleccionada
+        self.selected_info_label = tk.Label(self.selected_appointment_info, 
+                                          text="Seleccione una cita para ver información rápida", 
+                                          font=('Arial', 11, 'bold'), bg='#F0F9FF', fg='#1E40AF',
+                                          wraplength=600, justify='center')
+        self.selected_info_label.pack(expand=True, pady=10, padx=15)
+        
+        # Agregar icono de estado
+        self.status_icon_label = tk.Label(self.selected_appointment_info,
+                                        text="ℹ️", font=('Arial', 16), bg='#F0F9FF')
+        self.status_icon_label.pack(side='left', padx=(15, 5))
+
+        # Panel de acciones mejorado - más visible y organizado
+        actions_panel = tk.Frame(main_frame, bg='#F8FAFC')
+        actions_panel.pack(fill='x', padx=30, pady=(0, 30))
+        
+        # Frame interno con mejor visibilidad
+        actions_inner = tk.Frame(actions_panel, bg='white', relief='solid', bd=2)
+        actions_inner.pack(fill='x', pady=10)
+        
+        # Header del panel de acciones
+        actions_header = tk.Frame(actions_inner, bg='#0B5394', height=40)
+        actions_header.pack(fill='x')
+        actions_header.pack_propagate(False)
+        
+        tk.Label(actions_header, text="⚡ ACCIONES DISPONIBLES", 
+                font=('Arial', 12, 'bold'), bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Contenido de botones
+        actions_content = tk.Frame(actions_inner, bg='white')
+        actions_content.pack(fill='x', padx=20, pady=20)
+        
+        # Primera fila de botones (principales)
+        first_row = tk.Frame(actions_content, bg='white')
+        first_row.pack(fill='x', pady=(0, 10))
+        
+        # Segunda fila de botones (secundarios)
+        second_row = tk.Frame(actions_content, bg='white')
+        second_row.pack(fill='x')
+        
+        # Botones principales (primera fila)
+        main_buttons = [
+            ("👁️ Ver Detalles", self.view_my_appointment_details, "#0B5394"),
+            ("✏️ Editar Cita", self.edit_my_appointment, "#F39C12")
+        ]
+        
+        # Botones secundarios (segunda fila)
+        secondary_buttons = [
+            ("❌ Cancelar Cita", self.cancel_my_appointment, "#DC2626"),
+            ("📧 Contactar Doctor", lambda: messagebox.showinfo("Contactar", "Función en desarrollo"), "#16A085")
+        ]
+        
+        # Crear botones principales (más grandes)
+        for text, command, color in main_buttons:
+            btn = tk.Button(first_row, text=text, command=command,
+                           bg=color, fg='white', font=('Arial', 12, 'bold'),
+                           relief='flat', bd=0, padx=25, pady=12, cursor='hand2')
+            btn.pack(side='left', padx=10, expand=True, fill='x')
+            
+            # Agregar efectos hover
+            def on_enter(e, button=btn, original_color=color):
+                button.config(bg=self.darken_color(original_color))
+            
+            def on_leave(e, button=btn, original_color=color):
+                button.config(bg=original_color)
+            
+            btn.bind("<Enter>", on_enter)
+            btn.bind("<Leave>", on_leave)
+        
+        # Crear botones secundarios
+        for text, command, color in secondary_buttons:
+            btn = tk.Button(second_row, text=text, command=command,
+                           bg=color, fg='white', font=('Arial', 11, 'bold'),
+                           relief='flat', bd=0, padx=20, pady=10, cursor='hand2')
+            btn.pack(side='left', padx=10, expand=True, fill='x')
+            
+            # Agregar efectos hover
+            def on_enter(e, button=btn, original_color=color):
+                button.config(bg=self.darken_color(original_color))
+            
+            def on_leave(e, button=btn, original_color=color):
+                button.config(bg=original_color)
+            
+            btn.bind("<Enter>", on_enter)
+            btn.bind("<Leave>", on_leave)
+
+        # Agregar información de ayuda
+        help_info = tk.Frame(actions_inner, bg='#F0F9FF')
+        help_info.pack(fill='x', padx=20, pady=(0, 15))
+        
+        tk.Label(help_info, text="💡 Consejo: Seleccione una cita de la lista para activar las acciones", 
+                font=('Arial', 9, 'italic'), bg='#F0F9FF', fg='#1E40AF').pack()
+        
+        # Cargar datos iniciales
+        self.load_patient_appointments()
+    
+    def create_tooltip(self, widget, text):
+        """Crear tooltip para un widget"""
+        def show_tooltip(event):
+            tooltip = tk.Toplevel()
+            tooltip.wm_overrideredirect(True)
+            tooltip.wm_geometry(f"+{event.x_root+10}+{event.y_root+10}")
+            
+            label = tk.Label(tooltip, text=text, background='#FFFFCC', 
+                           relief='solid', borderwidth=1, font=('Arial', 9))
+            label.pack()
+            
+            def hide_tooltip():
+                tooltip.destroy()
+            
+            widget.tooltip = tooltip
+            tooltip.after(3000, hide_tooltip)  # Auto-hide after 3 seconds
+        
+        def hide_tooltip(event):
+            if hasattr(widget, 'tooltip'):
+                widget.tooltip.destroy()
+        
+        widget.bind('<Enter>', show_tooltip)
+        widget.bind('<Leave>', hide_tooltip)
+    
+    def on_patient_appointment_select(self, event):
+        """Maneja la selección de una cita para mostrar información rápida"""
+        try:
+            sel = self.patient_appointments_tree.selection()
+            if not sel:
+                self.selected_appointment_info.pack_forget()
+                return
+            
+            vals = self.patient_appointments_tree.item(sel[0])['values']
+            if not vals:
+                return
+            
+            # Extraer información
+            appt_id = vals[0]
+            fecha = vals[1]
+            hora = vals[2]
+            doctor = vals[3]
+            motivo = vals[4]
+            estado = vals[5]
+            
+            # Construir texto informativo más detallado
+            info_text = f"�️ {fecha} a las {hora} con {doctor}\n💭 {motivo}\n📊 Estado: {estado}"
+            
+            # Mostrar información
+            self.selected_info_label.config(text=info_text)
+            self.selected_appointment_info.pack(fill='x', padx=15, pady=(0, 15))
+            
+            # Cambiar color e icono según el estado
+            status_colors = {
+                'PENDIENTE': {'bg': '#FEF3C7', 'icon': '⏳'},
+                'CONFIRMADA': {'bg': '#D1FAE5', 'icon': '✅'}, 
+                'COMPLETADA': {'bg': '#E0E7FF', 'icon': '✔️'},
+                'CANCELADA': {'bg': '#FEE2E2', 'icon': '❌'}
+            }
+            
+            estado_upper = estado.upper()
+            if estado_upper in status_colors:
+                color_info = status_colors[estado_upper]
+                self.selected_appointment_info.config(bg=color_info['bg'])
+                self.selected_info_label.config(bg=color_info['bg'])
+                if hasattr(self, 'status_icon_label'):
+                    self.status_icon_label.config(text=color_info['icon'], bg=color_info['bg'])
+            else:
+                # Color por defecto
+                self.selected_appointment_info.config(bg='#F0F9FF')
+                self.selected_info_label.config(bg='#F0F9FF')
+                if hasattr(self, 'status_icon_label'):
+                    self.status_icon_label.config(text='ℹ️', bg='#F0F9FF')
+            
+        except Exception as e:
+            print(f"Error en selección de cita: {e}")
+            self.selected_appointment_info.pack_forget()
+    
+    def show_appointment_context_menu(self, event):
+        """Muestra menú contextual para acciones rápidas en citas"""
+        try:
+            # Seleccionar el item bajo el cursor
+            item = self.patient_appointments_tree.identify_row(event.y)
+            if item:
+                self.patient_appointments_tree.selection_set(item)
+                
+                # Obtener datos de la cita
+                vals = self.patient_appointments_tree.item(item)['values']
+                if not vals:
+                    return
+                
+                estado = vals[5] if len(vals) > 5 else ""
+                
+                # Crear menú contextual
+                context_menu = tk.Menu(self.root, tearoff=0)
+                
+                # Opciones siempre disponibles
+                context_menu.add_command(label="👁️ Ver Detalles", 
+                                       command=self.view_my_appointment_details)
+                
+                context_menu.add_separator()
+                
+                # Opciones condicionales según el estado
+                if estado.lower() not in ['completada', 'cancelada']:
+                    context_menu.add_command(label="✏️ Editar Cita", 
+                                           command=self.edit_my_appointment)
+                    context_menu.add_command(label="❌ Cancelar Cita", 
+                                           command=self.cancel_my_appointment)
+                else:
+                    context_menu.add_command(label="✏️ Editar Cita", 
+                                           command=self.edit_my_appointment,
+                                           state='disabled')
+                    context_menu.add_command(label="❌ Cancelar Cita", 
+                                           command=self.cancel_my_appointment,
+                                           state='disabled')
+                
+                context_menu.add_separator()
+                context_menu.add_command(label="📧 Contactar Doctor", 
+                                       command=lambda: messagebox.showinfo("Contactar", "Función en desarrollo"))
+                
+                # Mostrar menú
+                context_menu.post(event.x_root, event.y_root)
+                
+        except Exception as e:
+            print(f"Error mostrando menú contextual: {e}")
+    
+    def create_patient_medical_history(self, parent):
+        """Mi historial médico para pacientes - Vista simplificada con tabla"""
+        # Frame principal
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True)
+        
+        # Header simple
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=70)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=30, pady=15)
+        
+        tk.Label(header_content, text="📋 Mi Historial Médico", 
+                font=('Arial', 18, 'bold'), bg='#1E3A8A', fg='white').pack(side='left')
+        
+        user_info = f"Paciente: {self.current_user.nombre} {self.current_user.apellido}"
+        tk.Label(header_content, text=user_info, 
+                font=('Arial', 11), bg='#1E3A8A', fg='#CBD5E1').pack(side='right')
+        
+        # Contenido principal
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True, padx=30, pady=20)
+        
+        # Panel de filtros simple
+        filters_frame = tk.LabelFrame(content_frame, text="🔍 Filtros", 
+                                    font=('Arial', 12, 'bold'), bg='white', padx=15, pady=10)
+        filters_frame.pack(fill='x', pady=(0, 20))
+        
+        filters_row = tk.Frame(filters_frame, bg='white')
+        filters_row.pack(fill='x')
+        
+        # Búsqueda
+        tk.Label(filters_row, text="Buscar:", font=('Arial', 10, 'bold'), 
+                bg='white', fg='#374151').grid(row=0, column=0, sticky='w', padx=(0, 10))
+        
+        self.history_search_var = tk.StringVar()
+        search_entry = tk.Entry(filters_row, textvariable=self.history_search_var, 
+                               font=('Arial', 10), width=30)
+        search_entry.grid(row=0, column=1, sticky='w', padx=(0, 20))
+        search_entry.bind('<KeyRelease>', lambda e: self.load_patient_medical_history())
+        
+        # Botón actualizar
+        tk.Button(filters_row, text="🔄 Actualizar", 
+                 command=self.load_patient_medical_history,
+                 bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                 relief='flat', padx=15, pady=5).grid(row=0, column=2, sticky='w')
+        
+        # Tabla de historial
+        table_frame = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        table_frame.pack(fill='both', expand=True)
+        
+        # Header de la tabla
+        table_header = tk.Frame(table_frame, bg='#1E3A8A', height=40)
+        table_header.pack(fill='x')
+        table_header.pack_propagate(False)
+        
+        tk.Label(table_header, text="📋 Registros Médicos - Doble clic para ver detalles", 
+                font=('Arial', 12, 'bold'), bg='#1E3A8A', fg='white').pack(expand=True)
+        
+        # Contenedor de la tabla con scrollbars
+        table_container = tk.Frame(table_frame, bg='white')
+        table_container.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        # Crear Treeview
+        columns = ('Fecha', 'Doctor', 'Especialidad', 'Diagnóstico', 'Tratamiento')
+        self.medical_history_tree = VirtualTreeview(table_container, columns=columns, show='headings', height=15,
+                                                    formatter=self.format_medical_history_row,
+                                                    tasks=self.get_background_tasks())
+        
+        # Configurar columnas
+        column_widths = {
+            'Fecha': 100,
+            'Doctor': 180,
+            'Especialidad': 150,
+            'Diagnóstico': 250,
+            'Tratamiento': 200
+        }
+        
+        for col in columns:
+            self.medical_history_tree.heading(col, text=col)
+            self.medical_history_tree.column(col, width=column_widths[col], anchor='w')
+        
+        # Scrollbars
+        v_scrollbar = ttk.Scrollbar(table_container, orient='vertical', command=self.medical_history_tree.yview)
+        h_scrollbar = ttk.Scrollbar(table_container, orient='horizontal', command=self.medical_history_tree.xview)
+        self.medical_history_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        
+        # Layout
+        self.medical_history_tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        
+        table_container.grid_rowconfigure(0, weight=1)
+        table_container.grid_columnconfigure(0, weight=1)
+        
+        # Eventos
+        self.medical_history_tree.bind('<Double-1>', self.view_history_detail_simple)
+        
+        # Panel de información
+        info_frame = tk.Frame(content_frame, bg='white', relief='solid', bd=1, height=60)
+        info_frame.pack(fill='x', pady=(10, 0))
+        info_frame.pack_propagate(False)
+        
+        self.history_info_label = tk.Label(info_frame, 
+                                         text="💡 Consejo: Haga doble clic en un registro para ver los detalles completos", 
+                                         font=('Arial', 10, 'italic'), bg='white', fg='#64748B')
+        self.history_info_label.pack(expand=True)
+        
+        # Cargar datos
+        self.load_patient_medical_history()
+    
+    def load_patient_doctors(self):
+        """Cargar doctores que han atendido al paciente"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT DISTINCT u.id, u.nombre, u.apellido, d.especialidad
+                FROM historial_medico hm
+                JOIN usuarios u ON u.id = hm.doctor_id
+                LEFT JOIN doctores d ON d.id = hm.doctor_id
+                WHERE hm.paciente_id = ?
+                ORDER BY u.nombre, u.apellido
+            """, (self.current_user.id,))
+            
+            doctors = cursor.fetchall()
+            doctor_values = ['Todos']
+            
+            for doctor in doctors:
+                especialidad = doctor[3] if doctor[3] else 'Medicina General'
+                doctor_text = f"{doctor[0]} - Dr. {doctor[1]} {doctor[2]} ({especialidad})"
+                doctor_values.append(doctor_text)
+            
+            self.history_doctor_filter['values'] = doctor_values
+            self.history_doctor_filter.set('Todos')
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            print(f"Error cargando doctores del paciente: {e}")
+            try:
+                self.history_doctor_filter['values'] = ['Todos']
+                self.history_doctor_filter.set('Todos')
+            except:
+                pass
+            conn.close()
+            
+        except Exception as e:
+            print(f"Error cargando doctores: {e}")
+            self.history_doctor_filter['values'] = ['Todos']
+            self.history_doctor_filter.set('Todos')
+    
+    def clear_history_filters(self):
+        """Limpiar todos los filtros y recargar historial completo"""
+        try:
+            self.history_period_filter.set('Todos')
+            self.history_doctor_filter.set('Todos')
+            
+            if hasattr(self, 'history_type_filter'):
+                self.history_type_filter.set('Todos')
+            
+            if hasattr(self, 'history_search_var'):
+                self.history_search_var.set('')
+            
+            self.load_patient_medical_history()
+            messagebox.showinfo("Filtros", "Filtros limpiados. Mostrando historial completo")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error limpiando filtros: {str(e)}")
+    
+    def on_history_select(self, event):
+        """Manejar selección de registro en el historial"""
+        try:
+            selection = self.patient_history_tree.selection()
+            if selection:
+                # Guardar referencia del registro seleccionado
+                self.selected_history_record = selection[0]
+            
+        except Exception as e:
+            print(f"Error en selección de historial: {e}")
+    
+    def check_empty_history(self):
+        """Verificar si el historial está vacío y mostrar mensaje apropiado"""
+        try:
+            if not self.patient_history_tree.get_children():
+                # Crear frame de mensaje de historial vacío
+                empty_frame = tk.Frame(self.patient_content_area, bg='#F8FAFC')
+                empty_frame.pack(fill='both', expand=True, padx=40, pady=40)
+                
+                # Contenedor del mensaje
+                message_container = tk.Frame(empty_frame, bg='white', relief='solid', bd=1)
+                message_container.pack(fill='both', expand=True)
+                
+                content = tk.Frame(message_container, bg='white')
+                content.pack(expand=True, fill='both', padx=50, pady=50)
+                
+                # Icono grande
+                tk.Label(content, text="📋", font=('Arial', 48), bg='white', fg='#CBD5E1').pack(pady=(0, 20))
+                
+                # Mensaje principal
+                tk.Label(content, text="Tu Historial Médico está Vacío", 
+                        font=('Arial', 18, 'bold'), bg='white', fg='#1E3A8A').pack(pady=(0, 10))
+                
+                # Submensaje
+                tk.Label(content, text="Aún no tienes consultas médicas registradas en el sistema.\nTus futuras citas y consultas aparecerán aquí.", 
+                        font=('Arial', 12), bg='white', fg='#64748B', justify='center').pack(pady=(0, 30))
+                
+                # Botón de acción
+                tk.Button(content, text="📅 Ver Mis Citas", 
+                         command=lambda: self.switch_patient_tab("Mis Citas"),
+                         bg='#0B5394', fg='white', font=('Arial', 12, 'bold'),
+                         relief='flat', padx=25, pady=12, cursor='hand2').pack()
+                
+        except Exception as e:
+            print(f"Error verificando historial vacío: {e}")
+    
+    def show_tooltip(self, event, text):
+        """Mostrar tooltip con información adicional"""
+        try:
+            self.hide_tooltip()  # Ocultar tooltip anterior si existe
+            
+            self.tooltip_window = tk.Toplevel()
+            self.tooltip_window.wm_overrideredirect(True)
+            self.tooltip_window.configure(bg='#1E3A8A')
+            
+            label = tk.Label(self.tooltip_window, text=text, 
+                           font=('Arial', 9), bg='#1E3A8A', fg='white',
+                           padx=8, pady=4)
+            label.pack()
+            
+            # Posicionar tooltip
+            x = event.widget.winfo_rootx() + 25
+            y = event.widget.winfo_rooty() + 25
+            self.tooltip_window.geometry(f"+{x}+{y}")
+            
+        except Exception as e:
+            print(f"Error mostrando tooltip: {e}")
+    
+    def hide_tooltip(self, event=None):
+        """Ocultar tooltip"""
+        try:
+            if hasattr(self, 'tooltip_window') and self.tooltip_window:
+                self.tooltip_window.destroy()
+                self.tooltip_window = None
+        except:
+            pass
+    
+    def show_detailed_stats(self):
+        """Mostrar estadísticas detalladas de salud"""
+        try:
+            stats_window = tk.Toplevel(self.root)
+            stats_window.title("📊 Estadísticas Detalladas de Salud")
+            stats_window.geometry("800x600")
+            stats_window.configure(bg='#F8FAFC')
+            stats_window.transient(self.root)
+            
+            # Centrar ventana
+            x = (stats_window.winfo_screenwidth() // 2) - (800 // 2)
+            y = (stats_window.winfo_screenheight() // 2) - (600 // 2)
+            stats_window.geometry(f"800x600+{x}+{y}")
+            
+            # Header
+            header = tk.Frame(stats_window, bg='#1E3A8A', height=80)
+            header.pack(fill='x')
+            header.pack_propagate(False)
+            
+            tk.Label(header, text="📊 Análisis Completo de Mi Salud", 
+                    font=('Arial', 18, 'bold'), bg='#1E3A8A', fg='white').pack(expand=True)
+            
+            # Contenido
+            content = tk.Frame(stats_window, bg='#F8FAFC')
+            content.pack(fill='both', expand=True, padx=30, pady=30)
+            
+            # Obtener y mostrar estadísticas avanzadas
+            detailed_stats = self.get_detailed_health_stats()
+            
+            # Mostrar estadísticas en formato organizado
+            stats_text = f"""
+📈 ANÁLISIS TEMPORAL:
+• Consultas este año: {detailed_stats.get('year_consultations', 0)}
+• Consultas último trimestre: {detailed_stats.get('quarter_consultations', 0)}
+• Promedio mensual: {detailed_stats.get('monthly_average', 0):.1f}
+
+👨‍⚕️ ESPECIALISTAS CONSULTADOS:
+• Total de doctores diferentes: {detailed_stats.get('unique_doctors', 0)}
+• Especialidades visitadas: {detailed_stats.get('specialties_visited', 'Ninguna')}
+
+🏥 TIPOS DE CONSULTA:
+• Consultas generales: {detailed_stats.get('general_consultations', 0)}
+• Consultas de especialidad: {detailed_stats.get('specialty_consultations', 0)}
+• Controles: {detailed_stats.get('control_consultations', 0)}
+
+💊 TRATAMIENTOS:
+• Total de tratamientos prescritos: {detailed_stats.get('total_treatments', 0)}
+• Medicamentos únicos recetados: {detailed_stats.get('unique_medications', 0)}
+
+📅 EVOLUCIÓN:
+• Primera consulta: {detailed_stats.get('first_consultation', 'N/A')}
+• Última consulta: {detailed_stats.get('last_consultation', 'N/A')}
+• Tiempo como paciente: {detailed_stats.get('patient_duration', 'N/A')}
+            """
+            
+            tk.Label(content, text=stats_text, font=('Arial', 11), 
+                    bg='white', fg='#1E3A8A', justify='left',
+                    relief='solid', bd=1, padx=20, pady=20).pack(fill='both', expand=True)
+            
+            # Botón cerrar
+            tk.Button(content, text="✅ Cerrar", command=stats_window.destroy,
+                     bg='#0B5394', fg='white', font=('Arial', 12, 'bold'),
+                     relief='flat', padx=25, pady=10).pack(pady=(20, 0))
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando estadísticas: {str(e)}")
+    
+    def get_detailed_health_stats(self):
+        """Obtener estadísticas detalladas de salud del paciente"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            stats = {}
+            
+            # Consultas por período
+            cursor.execute("""
+                SELECT COUNT(*) FROM historial_medico 
+                WHERE paciente_id = ? AND strftime('%Y', fecha_consulta) = strftime('%Y', 'now')
+            """, (self.current_user.id,))
+            stats['year_consultations'] = cursor.fetchone()[0]
+            
+            # Promedio mensual (últimos 12 meses)
+            if stats['year_consultations'] > 0:
+                stats['monthly_average'] = stats['year_consultations'] / 12
+            else:
+                stats['monthly_average'] = 0
+            
+            # Especialidades visitadas
+            cursor.execute("""
+                SELECT DISTINCT u.especialidad FROM historial_medico hm
+                JOIN usuarios u ON u.id = hm.doctor_id
+                WHERE hm.paciente_id = ? AND u.especialidad IS NOT NULL
+            """, (self.current_user.id,))
+            specialties = [row[0] for row in cursor.fetchall()]
+            stats['specialties_visited'] = ', '.join(specialties) if specialties else 'Medicina General'
+            
+            # Doctores únicos
+            cursor.execute("""
+                SELECT COUNT(DISTINCT doctor_id) FROM historial_medico 
+                WHERE paciente_id = ?
+            """, (self.current_user.id,))
+            stats['unique_doctors'] = cursor.fetchone()[0]
+            
+            # Fechas importantes
+            cursor.execute("""
+                SELECT MIN(fecha_consulta), MAX(fecha_consulta) FROM historial_medico 
+                WHERE paciente_id = ?
+            """, (self.current_user.id,))
+            result = cursor.fetchone()
+            if result[0]:
+                first_date = datetime.fromisoformat(result[0])
+                last_date = datetime.fromisoformat(result[1])
+                stats['first_consultation'] = first_date.strftime('%d/%m/%Y')
+                stats['last_consultation'] = last_date.strftime('%d/%m/%Y')
+                
+                # Duración como paciente
+                duration = last_date - first_date
+                stats['patient_duration'] = f"{duration.days} días"
+            else:
+                stats['first_consultation'] = 'N/A'
+                stats['last_consultation'] = 'N/A'
+                stats['patient_duration'] = 'N/A'
+            
+            # Valores por defecto para campos restantes
+            stats['quarter_consultations'] = 0
+            stats['general_consultations'] = 0
+            stats['specialty_consultations'] = 0
+            stats['control_consultations'] = 0
+            stats['total_treatments'] = 0
+            stats['unique_medications'] = 0
+            
+            cursor.close()
+            conn.close()
+            
+            return stats
+            
+        except Exception as e:
+            print(f"Error obteniendo estadísticas detalladas: {e}")
+            return {}
+    
+    def analyze_health_trends(self):
+        """Analizar tendencias de salud del paciente"""
+        messagebox.showinfo("Análisis de Tendencias", 
+                           "📈 Función de análisis de tendencias en desarrollo.\n\n" +
+                           "Próximamente podrás ver:\n" +
+                           "• Evolución de tus diagnósticos\n" +
+                           "• Frecuencia de consultas\n" +
+                           "• Patrones en tratamientos\n" +
+                           "• Recomendaciones personalizadas")
+    
+    def refresh_history(self):
+        """Refrescar datos del historial"""
+        try:
+            self.load_patient_medical_history()
+            messagebox.showinfo("Actualización", "✅ Historial médico actualizado correctamente")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error actualizando historial: {str(e)}")
+    
+    def generate_summary_report(self):
+        """Generar resumen ejecutivo del historial"""
+        messagebox.showinfo("Resumen Ejecutivo", 
+                           "📄 Función de resumen ejecutivo en desarrollo.\n\n" +
+                           "El resumen incluirá:\n" +
+                           "• Diagnósticos principales\n" +
+                           "• Tratamientos activos\n" +
+                           "• Recomendaciones médicas\n" +
+                           "• Próximas citas")
+    
+    def show_health_charts(self):
+        """Mostrar gráficos de evolución médica"""
+        messagebox.showinfo("Gráficos de Salud", 
+                           "📈 Función de gráficos interactivos en desarrollo.\n\n" +
+                           "Visualizarás:\n" +
+                           "• Línea de tiempo de consultas\n" +
+                           "• Gráficos de evolución\n" +
+                           "• Comparativas por período\n" +
+                           "• Indicadores de salud")
+    
+    def configure_health_alerts(self):
+        """Configurar alertas y recordatorios médicos"""
+        messagebox.showinfo("Alertas Médicas", 
+                           "⚙️ Función de alertas personalizadas en desarrollo.\n\n" +
+                           "Podrás configurar:\n" +
+                           "• Recordatorios de medicamentos\n" +
+                           "• Alertas de citas\n" +
+                           "• Notificaciones de controles\n" +
+                           "• Avisos de renovación de recetas")
+    
+    def export_single_record_pdf(self, record_data):
+        """Exportar un registro específico a PDF"""
+        try:
+            fecha = record_data.get('fecha', 'N/A')
+            doctor = f"Dr. {record_data.get('doctor_nombre', '')} {record_data.get('doctor_apellido', '')}"
+            
+            messagebox.showinfo("Exportar Registro", 
+                               f"📥 Exportando registro médico a PDF\n\n" +
+                               f"📅 Fecha: {fecha}\n" +
+                               f"👨‍⚕️ Doctor: {doctor}\n" +
+                               f"🩺 Diagnóstico: {record_data.get('diagnostico', 'N/A')}\n\n" +
+                               "El archivo PDF se guardará en la carpeta 'historiales_pdf'")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al exportar: {str(e)}")
+    
+    def print_single_record(self, record_data):
+        """Imprimir un registro específico"""
+        try:
+            fecha = record_data.get('fecha', 'N/A')
+            doctor = f"Dr. {record_data.get('doctor_nombre', '')} {record_data.get('doctor_apellido', '')}"
+            
+            messagebox.showinfo("Imprimir Registro", 
+                               f"🖨️ Preparando impresión del registro médico\n\n" +
+                               f"📅 Fecha: {fecha}\n" +
+                               f"👨‍⚕️ Doctor: {doctor}\n" +
+                               f"🩺 Diagnóstico: {record_data.get('diagnostico', 'N/A')}\n\n" +
+                               "Enviando a la impresora predeterminada...")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al imprimir: {str(e)}")
+    
+    def email_single_record(self, record_data):
+        """Enviar un registro específico por email"""
+        try:
+            fecha = record_data.get('fecha', 'N/A')
+            doctor = f"Dr. {record_data.get('doctor_nombre', '')} {record_data.get('doctor_apellido', '')}"
+            
+            email = simpledialog.askstring("Enviar por Email", 
+                                         f"📧 Enviar registro médico por correo\n\n" +
+                                         f"📅 Fecha: {fecha}\n" +
+                                         f"👨‍⚕️ Doctor: {doctor}\n\n" +
+                                         "Ingrese la dirección de email:")
+            
+            if email:
+                messagebox.showinfo("Email Enviado", 
+                                   f"✅ Registro médico enviado exitosamente a:\n{email}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al enviar email: {str(e)}")
+    
+    def copy_record_to_clipboard(self, record_data):
+        """Copiar información del registro al portapapeles"""
+        try:
+            if not record_data:
+                messagebox.showwarning("Advertencia", "No hay datos para copiar")
+                return
+            
+            # Formatear información completa para copiar
+            doctor = f"Dr. {record_data.get('doctor_nombre', '')} {record_data.get('doctor_apellido', '')}"
+            
+            info_text = f"""=== REGISTRO MÉDICO ===
+📅 Fecha: {record_data.get('fecha', 'N/A')}
+👨‍⚕️ Doctor: {doctor}
+🏥 Especialidad: {record_data.get('especialidad', 'N/A')}
+🆔 ID Registro: {record_data.get('id', 'N/A')}
+
+🎯 MOTIVO DE CONSULTA:
+{record_data.get('motivo_consulta', 'No especificado')}
+
+🤒 SÍNTOMAS:
+{record_data.get('sintomas', 'No registrados')}
+
+🩺 DIAGNÓSTICO:
+{record_data.get('diagnostico', 'No especificado')}
+
+💊 TRATAMIENTO:
+{record_data.get('tratamiento', 'No especificado')}
+
+💉 MEDICAMENTOS:
+{record_data.get('medicamentos', 'No prescritos')}
+
+💓 SIGNOS VITALES:
+🩸 Presión Arterial: {record_data.get('presion_arterial', 'No medida')}
+⚖️ Peso: {record_data.get('peso', 'No registrado')}
+📏 Altura: {record_data.get('altura', 'No registrada')}
+🌡️ Temperatura: {record_data.get('temperatura', 'No medida')}
+💓 Frecuencia Cardíaca: {record_data.get('frecuencia_cardiaca', 'No medida')}
+
+🔬 EXÁMENES SOLICITADOS:
+{record_data.get('examenes_solicitados', 'Ninguno')}
+
+💡 RECOMENDACIONES:
+{record_data.get('recomendaciones', 'Ninguna')}
+
+📝 OBSERVACIONES DEL DOCTOR:
+{record_data.get('observaciones', 'Sin observaciones')}
+
+📅 PRÓXIMA CITA:
+{record_data.get('proxima_cita', 'No programada')}
+
+=== FIN DEL REGISTRO ==="""
+            
+            # Copiar al portapapeles
+            self.root.clipboard_clear()
+            self.root.clipboard_append(info_text)
+            self.root.update()
+            
+            messagebox.showinfo("Copiado", 
+                               "📋 Información del registro médico copiada al portapapeles.\n\n" +
+                               "Puede pegarla en cualquier aplicación usando Ctrl+V")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al copiar: {str(e)}")
+    
+    def create_patient_settings(self, parent):
+        """Configuración del paciente - Diseño simplificado y limpio"""
+        # Frame principal
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True)
+        
+        # Header simplificado
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=70)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header centrado
+        tk.Label(header_frame, text="⚙️ Configuración de Mi Perfil", 
+                font=('Arial', 18, 'bold'), bg='#1E3A8A', fg='white').pack(expand=True)
+        
+        # Contenido principal - SIN SCROLL - Ajustado para mostrar todo
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True, padx=30, pady=20)
+        
+        # Obtener datos del paciente
+        data = self.get_patient_profile_data()
+        
+        # Layout en dos columnas para aprovechar el espacio
+        columns_frame = tk.Frame(content_frame, bg='#F8FAFC')
+        columns_frame.pack(fill='both', expand=True)
+        
+        # Columna izquierda - Información personal
+        left_column = tk.Frame(columns_frame, bg='white', relief='solid', bd=1)
+        left_column.pack(side='left', fill='both', expand=True, padx=(0, 20))
+        
+        # Título de la columna izquierda
+        left_title = tk.Frame(left_column, bg='#3B82F6', height=50)
+        left_title.pack(fill='x')
+        left_title.pack_propagate(False)
+        
+        tk.Label(left_title, text="📝 Información Personal", 
+                font=('Arial', 14, 'bold'), bg='#3B82F6', fg='white').pack(expand=True)
+        
+        # Formulario de datos personales - más compacto
+        personal_form = tk.Frame(left_column, bg='white')
+        personal_form.pack(fill='both', expand=True, padx=20, pady=15)
+        
+        # Configurar campos del formulario en dos columnas
+        personal_fields = [
+            [('Nombre *', 'nombre'), ('Apellido *', 'apellido')],  # Primera fila
+            [('Email *', 'email'), ('Teléfono', 'telefono')],     # Segunda fila
+            [('Dirección', 'direccion'), None]                     # Tercera fila (dirección ocupa toda la fila)
+        ]
+        
+        self.patient_settings_vars = {}
+        
+        for row_fields in personal_fields:
+            # Frame para cada fila
+            row_frame = tk.Frame(personal_form, bg='white')
+            row_frame.pack(fill='x', pady=6)
+            
+            for i, field_data in enumerate(row_fields):
+                if field_data is None:
+                    continue
+                    
+                label, key = field_data
+                
+                # Frame para cada campo (columna)
+                if key == 'direccion':
+                    # Dirección ocupa toda la fila
+                    field_frame = tk.Frame(row_frame, bg='white')
+                    field_frame.pack(fill='x')
+                else:
+                    # Campos normales en columnas
+                    field_frame = tk.Frame(row_frame, bg='white')
+                    field_frame.pack(side='left', fill='both', expand=True, padx=(0, 10) if i == 0 else (0, 0))
+                
+                # Label del campo
+                tk.Label(field_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w', pady=(0, 3))
+                
+                # Entry del campo
+                var = tk.StringVar(value=str(data.get(key, '') or ''))
+                self.patient_settings_vars[key] = var
+                
+                entry = tk.Entry(field_frame, textvariable=var, font=('Arial', 10), 
+                               relief='solid', bd=1, bg='#F9FAFB')
+                entry.pack(fill='x', ipady=5)
+                
+                # Estilo para campos requeridos
+                if '*' in label:
+                    entry.configure(highlightbackground='#EF4444', highlightcolor='#3B82F6', highlightthickness=1)
+        
+        # Columna derecha - Preferencias y acciones
+        right_column = tk.Frame(columns_frame, bg='white', relief='solid', bd=1)
+        right_column.pack(side='right', fill='both', expand=True)
+        
+        # Título de la columna derecha
+        right_title = tk.Frame(right_column, bg='#8B5CF6', height=50)
+        right_title.pack(fill='x')
+        right_title.pack_propagate(False)
+        
+        tk.Label(right_title, text="⚙️ Preferencias y Configuración", 
+                font=('Arial', 14, 'bold'), bg='#8B5CF6', fg='white').pack(expand=True)
+        
+        # Contenido de la columna derecha - más compacto
+        right_content = tk.Frame(right_column, bg='white')
+        right_content.pack(fill='both', expand=True, padx=20, pady=15)
+        
+        # Sección de preferencias - más compacta
+        pref_section = tk.Frame(right_content, bg='white')
+        pref_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(pref_section, text="📧 Notificaciones", 
+                font=('Arial', 11, 'bold'), bg='white', fg='#374151').pack(anchor='w', pady=(0, 8))
+        
+        # Checkbox para notificaciones
+        self.email_notifications_var = tk.BooleanVar(value=True)
+        notification_frame = tk.Frame(pref_section, bg='white')
+        notification_frame.pack(fill='x', pady=4)
+        
+        tk.Checkbutton(notification_frame, text="Recibir recordatorios por email", 
+                      variable=self.email_notifications_var, font=('Arial', 10),
+                      bg='white', fg='#6B7280').pack(anchor='w')
+        
+        # Combobox para tiempo de recordatorio
+        reminder_section = tk.Frame(pref_section, bg='white')
+        reminder_section.pack(fill='x', pady=8)
+        
+        tk.Label(reminder_section, text="⏰ Tiempo de recordatorio:", 
+                font=('Arial', 10, 'bold'), bg='white', fg='#374151').pack(anchor='w', pady=(0, 4))
+        
+        self.reminder_time_var = tk.StringVar(value="24 horas antes")
+        reminder_combo = ttk.Combobox(reminder_section, textvariable=self.reminder_time_var,
+                                    values=["1 hora antes", "2 horas antes", "24 horas antes", "48 horas antes"],
+                                    state='readonly', width=25, font=('Arial', 10))
+        reminder_combo.pack(anchor='w', pady=5)
+        
+        # Separador más pequeño
+        separator = tk.Frame(right_content, bg='#E5E7EB', height=1)
+        separator.pack(fill='x', pady=10)
+        
+        # Sección de seguridad - más compacta
+        security_section = tk.Frame(right_content, bg='white')
+        security_section.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(security_section, text="🔐 Seguridad de la Cuenta", 
+                font=('Arial', 11, 'bold'), bg='white', fg='#374151').pack(anchor='w', pady=(0, 8))
+        
+        # Botón cambiar contraseña - más compacto
+        password_btn = tk.Button(security_section, text="🔑 Cambiar Contraseña", 
+                               command=self.change_patient_password,
+                               bg='#6366F1', fg='white', font=('Arial', 10, 'bold'),
+                               relief='flat', bd=0, padx=15, pady=6, cursor='hand2')
+        password_btn.pack(anchor='w', pady=3)
+        
+        # Panel de acciones principales - más compacto
+        actions_panel = tk.Frame(content_frame, bg='white', relief='solid', bd=2)
+        actions_panel.pack(fill='x', pady=(15, 0))
+        
+        actions_content = tk.Frame(actions_panel, bg='white')
+        actions_content.pack(fill='x', padx=20, pady=15)
+        
+        # Botón principal de guardar - prominente pero compacto
+        save_frame = tk.Frame(actions_content, bg='white')
+        save_frame.pack()
+        
+        save_btn = tk.Button(save_frame, text="💾 GUARDAR CAMBIOS", 
+                           command=self.save_patient_settings,
+                           bg='#10B981', fg='white', font=('Arial', 12, 'bold'),
+                           relief='flat', bd=0, padx=30, pady=12, cursor='hand2')
+        save_btn.pack()
+        
+        # Nota informativa - más compacta
+        note_frame = tk.Frame(content_frame, bg='#FEF3C7', relief='solid', bd=1)
+        note_frame.pack(fill='x', pady=(5, 0))
+        
+        tk.Label(note_frame, text="ℹ️ Los campos marcados con (*) son obligatorios", 
+                font=('Arial', 9), bg='#FEF3C7', fg='#92400E').pack(pady=5)
+        
+        # Panel de botones de acción prominente
+        buttons_panel = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        buttons_panel.pack(fill='x', pady=10)
+        
+        buttons_frame = tk.Frame(buttons_panel, bg='white')
+        buttons_frame.pack(pady=20)
+        
+        # Botón principal de guardar - más prominente
+        save_btn = tk.Button(buttons_frame, text="� Guardar Cambios", 
+                           command=self.save_patient_settings,
+                           bg='#10B981', fg='white', font=('Arial', 12, 'bold'),
+                           relief='flat', bd=0, padx=30, pady=12, cursor='hand2')
+        save_btn.pack(side='left', padx=10)
+        
+        # Botones secundarios
+        password_btn = tk.Button(buttons_frame, text="🔑 Cambiar Contraseña", 
+                               command=self.change_patient_password,
+                               bg='#6B7280', fg='white', font=('Arial', 10),
+                               relief='flat', bd=0, padx=20, pady=8, cursor='hand2')
+        password_btn.pack(side='left', padx=10)
+        
+        # Nota de campos requeridos
+        note_frame = tk.Frame(content_frame, bg='#FEF3C7')
+        note_frame.pack(fill='x', pady=(10, 0))
+        
+        tk.Label(note_frame, text="ℹ️ Los campos marcados con (*) son obligatorios", 
+                font=('Arial', 9), bg='#FEF3C7', fg='#92400E').pack(pady=10)
+    
+    def save_patient_settings(self):
+        """Guardar configuración del paciente con validaciones mejoradas"""
+        try:
+            if not self.current_user:
+                messagebox.showerror('Error', 'No hay usuario activo')
+                return
+                
+            # Validar campos obligatorios
+            required_fields = ['nombre', 'apellido', 'email']
+            for field in required_fields:
+                if not self.patient_settings_vars[field].get().strip():
+                    messagebox.showerror('Error', f'El campo {field} es obligatorio')
+                    return
+            
+            # Validar email
+            email = self.patient_settings_vars['email'].get().strip()
+            if '@' not in email or '.' not in email:
+                messagebox.showerror('Error', 'Por favor ingrese un email válido')
+                return
+            
+            saved = self.db_manager.save_user(self.current_user.id, {
+                'nombre': self.patient_settings_vars['nombre'].get().strip(),
+                'apellido': self.patient_settings_vars['apellido'].get().strip(),
+                'email': email,
+                'telefono': self.patient_settings_vars['telefono'].get().strip(),
+                'direccion': self.patient_settings_vars['direccion'].get().strip(),
+            })
+            if saved is None:
+                messagebox.showerror('Perfil', 'No se pudieron guardar los cambios')
+                return
+            messagebox.showinfo('Perfil', '✅ Cambios guardados exitosamente')
+        except Exception as e:
+            messagebox.showerror('Perfil', f'Error guardando cambios: {e}')
+    
+    def change_patient_password(self):
+        """Diálogo moderno para cambiar contraseña del paciente"""
+        print("🔧 DEBUG: Iniciando función change_patient_password")
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title('🔐 Cambiar Mi Contraseña - NUEVA VERSION')
+        dialog.geometry('520x750')  # Alargado significativamente más para mostrar botones
+        dialog.configure(bg='#F8FAFC')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        dialog.resizable(False, False)
+        
+        # Centrar diálogo
+        x = self.root.winfo_rootx() + (self.root.winfo_width() - 520) // 2
+        y = self.root.winfo_rooty() + (self.root.winfo_height() - 750) // 2
+        dialog.geometry(f"520x750+{x}+{y}")
+        
+        # Header moderno
+        header_frame = tk.Frame(dialog, bg='#3B82F6', height=70)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Icono y título del header
+        header_content = tk.Frame(header_frame, bg='#3B82F6')
+        header_content.pack(expand=True, fill='both', padx=20, pady=15)
+        
+        tk.Label(header_content, text='� Cambiar Contraseña', 
+                font=('Arial', 16, 'bold'), bg='#3B82F6', fg='white').pack(side='left')
+        
+        # Botón cerrar
+        close_btn = tk.Button(header_content, text='✕', command=dialog.destroy,
+                             bg='#3B82F6', fg='white', font=('Arial', 12, 'bold'),
+                             relief='flat', bd=0, padx=8, pady=4, cursor='hand2')
+        close_btn.pack(side='right')
+        
+        # Contenido principal
+        content_frame = tk.Frame(dialog, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True, padx=30, pady=30)  # Aumentado el padding vertical
+        
+        # Panel de campos
+        fields_panel = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        fields_panel.pack(fill='x', pady=(0, 25))
+        
+        # Título del panel
+        title_frame = tk.Frame(fields_panel, bg='#F1F5F9', height=40)
+        title_frame.pack(fill='x')
+        title_frame.pack_propagate(False)
+        
+        tk.Label(title_frame, text='📝 Información de Seguridad', 
+                font=('Arial', 12, 'bold'), bg='#F1F5F9', fg='#374151').pack(expand=True)
+        
+        # Contenido de campos
+        fields_content = tk.Frame(fields_panel, bg='white')
+        fields_content.pack(fill='both', expand=True, padx=25, pady=20)
+        
+        # Variables para los campos
+        current_pwd_var = tk.StringVar()
+        new_pwd_var = tk.StringVar()
+        confirm_pwd_var = tk.StringVar()
+        
+        # Función para crear campos con estilo
+        def create_password_field(parent, label_text, variable, row_num):
+            # Frame del campo
+            field_frame = tk.Frame(parent, bg='white')
+            field_frame.pack(fill='x', pady=12)
+            
+            # Label
+            tk.Label(field_frame, text=label_text, 
+                    font=('Arial', 11, 'bold'), bg='white', fg='#374151').pack(anchor='w', pady=(0, 6))
+            
+            # Entry con estilo
+            entry = tk.Entry(field_frame, textvariable=variable, show='●', 
+                           font=('Arial', 11), relief='solid', bd=1, bg='#F9FAFB',
+                           highlightthickness=2, highlightcolor='#3B82F6')
+            entry.pack(fill='x', ipady=10)
+            
+            return entry
+        
+        # Crear campos
+        current_entry = create_password_field(fields_content, "🔒 Contraseña Actual:", current_pwd_var, 0)
+        new_entry = create_password_field(fields_content, "🔑 Nueva Contraseña:", new_pwd_var, 1)
+        confirm_entry = create_password_field(fields_content, "✅ Confirmar Nueva Contraseña:", confirm_pwd_var, 2)
+        
+        # Requisitos de contraseña
+        req_frame = tk.Frame(fields_content, bg='#FEF3C7', relief='solid', bd=1)
+        req_frame.pack(fill='x', pady=(15, 0))
+        
+        tk.Label(req_frame, text="📋 Requisitos de la nueva contraseña:", 
+                font=('Arial', 10, 'bold'), bg='#FEF3C7', fg='#92400E').pack(anchor='w', padx=10, pady=(8, 4))
+        tk.Label(req_frame, text="• Mínimo 6 caracteres", 
+                font=('Arial', 9), bg='#FEF3C7', fg='#92400E').pack(anchor='w', padx=20, pady=1)
+        tk.Label(req_frame, text="• Debe ser diferente a la actual", 
+                font=('Arial', 9), bg='#FEF3C7', fg='#92400E').pack(anchor='w', padx=20, pady=(1, 8))
+        
+        # Panel de botones modernos - SÚPER PROMINENTE
+        buttons_panel = tk.Frame(content_frame, bg='#D1D5DB', relief='solid', bd=3)
+        buttons_panel.pack(fill='x', pady=(40, 20))  # Muchísimo más espacio superior e inferior
+        
+        def save_password():
+            try:
+                current = current_pwd_var.get().strip()
+                new = new_pwd_var.get().strip()
+                confirm = confirm_pwd_var.get().strip()
+                
+                # Validaciones mejoradas
+                if not current:
+                    messagebox.showerror('Error', '🔒 Debe ingresar su contraseña actual')
+                    current_entry.focus()
+                    return
+                
+                if not new:
+                    messagebox.showerror('Error', '🔑 Debe ingresar la nueva contraseña')
+                    new_entry.focus()
+                    return
+                
+                if not confirm:
+                    messagebox.showerror('Error', '✅ Debe confirmar la nueva contraseña')
+                    confirm_entry.focus()
+                    return
+                
+                if new != confirm:
+                    messagebox.showerror('Error', '❌ Las contraseñas nuevas no coinciden')
+                    confirm_entry.focus()
+                    return
+                
+                if len(new) < 6:
+                    messagebox.showerror('Error', '⚠️ La nueva contraseña debe tener al menos 6 caracteres')
+                    new_entry.focus()
+                    return
+                
+                if current == new:
+                    messagebox.showerror('Error', '🔄 La nueva contraseña debe ser diferente a la actual')
+                    new_entry.focus()
+                    return
+                
+                # Verificar contraseña actual y actualizarla (se guarda su hash)
+                if not self.db_manager.change_password(self.current_user.id, new, current):
+                    messagebox.showerror('Error', '🚫 La contraseña actual es incorrecta')
+                    current_entry.focus()
+                    return
+                
+                messagebox.showinfo('Éxito', '✅ Contraseña cambiada exitosamente\n\nSu contraseña ha sido actualizada correctamente.')
+                dialog.destroy()
+                
+            except Exception as e:
+                messagebox.showerror('Error', f'❌ Error cambiando contraseña:\n{str(e)}')
+        
+        # Botones con estilo moderno DIRECTOS EN EL PANEL
+        print("🔧 DEBUG: Creando botones DIRECTAMENTE")
+        
+        save_btn = tk.Button(buttons_panel, text='💾 GUARDAR NUEVA CONTRASEÑA', command=save_password,
+                           bg='#059669', fg='white', font=('Arial', 14, 'bold'),
+                           relief='raised', bd=5, padx=40, pady=20, cursor='hand2')
+        save_btn.pack(pady=(20, 10))  # Botón de guardar
+        
+        cancel_btn = tk.Button(buttons_panel, text='❌ CANCELAR OPERACIÓN', command=dialog.destroy,
+                             bg='#DC2626', fg='white', font=('Arial', 14, 'bold'),
+                             relief='raised', bd=5, padx=40, pady=20, cursor='hand2')
+        cancel_btn.pack(pady=(0, 20))  # Botón de cancelar
+        
+        print(f"🔧 DEBUG: Botones creados DIRECTAMENTE - Save: {save_btn}, Cancel: {cancel_btn}")
+        
+        # Forzar que se muestren
+        buttons_panel.update()
+        dialog.update()
+        
+        # Focus inicial en el primer campo
+        current_entry.focus()
+    
+    def open_patient_schedule_dialog(self):
+        """Formulario completo y rediseñado para agendar nueva cita"""
+        schedule_window = tk.Toplevel(self.root)
+        schedule_window.title("🗓️ Agendar Nueva Cita Médica")
+        schedule_window.geometry("700x800")
+        schedule_window.configure(bg='#F8FAFC')
+        schedule_window.transient(self.root)
+        schedule_window.grab_set()
+        schedule_window.resizable(False, False)
+        
+        # Centrar ventana
+        schedule_window.update_idletasks()
+        x = (schedule_window.winfo_screenwidth() // 2) - (700 // 2)
+        y = (schedule_window.winfo_screenheight() // 2) - (800 // 2)
+        schedule_window.geometry(f"700x800+{x}+{y}")
+        
+        # Header principal con gradiente visual
+        header_frame = tk.Frame(schedule_window, bg='#16A085', height=90)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#16A085')
+        header_content.pack(expand=True, fill='both', padx=30, pady=20)
+        
+        tk.Label(header_content, text="🗓️ AGENDAR NUEVA CITA", 
+                font=('Arial', 18, 'bold'), bg='#16A085', fg='white').pack()
+        tk.Label(header_content, text="Complete todos los campos para programar su cita médica", 
+                font=('Arial', 11), bg='#16A085', fg='#E8F6F3').pack(pady=(5, 0))
+        
+        # Scroll container principal
+        main_container = tk.Frame(schedule_window, bg='#F8FAFC')
+        main_container.pack(fill='both', expand=True, padx=25, pady=20)
+        
+        # Canvas para scroll
+        canvas = tk.Canvas(main_container, bg='#F8FAFC', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(main_container, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        # Variables del formulario
+        doctor_var = tk.StringVar()
+        fecha_var = tk.StringVar()
+        hora_var = tk.StringVar()
+        motivo_var = tk.StringVar()
+        urgencia_var = tk.StringVar(value='normal')
+        observaciones_var = tk.StringVar()
+        
+        # SECCIÓN 1: SELECCIÓN DE DOCTOR
+        doctor_section = tk.LabelFrame(scrollable_frame, text="👨‍⚕️ Seleccionar Doctor", 
+                                     font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                     padx=20, pady=15)
+        doctor_section.pack(fill='x', pady=(0, 20))
+        
+        tk.Label(doctor_section, text="Doctor disponible *", font=('Arial', 11, 'bold'),
+                bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(5, 2))
+        
+        # Obtener doctores
+        try:
+            doctors = self.db_manager.get_all_doctors()
+            if doctors:
+                doctor_values = [f"{d['id']} - Dr. {d['nombre']} {d['apellido']} ({d.get('especialidad', 'General')})" for d in doctors]
+            else:
+                doctor_values = ["No hay doctores disponibles"]
+        except Exception as e:
+            doctor_values = ["Error cargando doctores"]
+        
+        doctor_combo = ttk.Combobox(doctor_section, textvariable=doctor_var,
+                                   values=doctor_values, state='readonly',
+                                   font=('Arial', 11), width=50)
+        doctor_combo.pack(fill='x', pady=(0, 10))
+        doctor_combo.set("Seleccione un doctor...")
+        
+        # Info del doctor seleccionado
+        doctor_info_frame = tk.Frame(doctor_section, bg='#E8F6F3', relief='solid', bd=1)
+        doctor_info_frame.pack(fill='x', pady=(5, 0))
+        doctor_info_label = tk.Label(doctor_info_frame, text="ℹ️ Seleccione un doctor para ver información", 
+                                   font=('Arial', 10), bg='#E8F6F3', fg='#0D7377', wraplength=500)
+        doctor_info_label.pack(pady=8, padx=15)
+        
+        # SECCIÓN 2: FECHA Y HORA
+        datetime_section = tk.LabelFrame(scrollable_frame, text="📅 Fecha y Hora de la Cita", 
+                                       font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                       padx=20, pady=15)
+        datetime_section.pack(fill='x', pady=(0, 20))
+        
+        # Grid para fecha y hora
+        datetime_grid = tk.Frame(datetime_section, bg='#F8FAFC')
+        datetime_grid.pack(fill='x')
+        datetime_grid.columnconfigure(0, weight=1)
+        datetime_grid.columnconfigure(1, weight=1)
+        
+        # Fecha
+        fecha_frame = tk.Frame(datetime_grid, bg='#F8FAFC')
+        fecha_frame.grid(row=0, column=0, sticky='ew', padx=(0, 15))
+        
+        tk.Label(fecha_frame, text="📅 Fecha de la Cita *", 
+                font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+        
+        # Calendar widget
+        if CALENDAR_AVAILABLE:
+            cal_frame = tk.Frame(fecha_frame, bg='#F8FAFC')
+            cal_frame.pack(fill='x', pady=(8, 0))
+            
+            from tkcalendar import Calendar
+            calendar_widget = Calendar(cal_frame, selectmode='day', date_pattern='dd/mm/yyyy',
+                                     background='#16A085', foreground='white',
+                                     bordercolor='#0D7377', headersbackground='#0D7377',
+                                     normalbackground='white', normalforeground='black',
+                                     weekendbackground='#E8F6F3', weekendforeground='#0D7377')
+            calendar_widget.pack()
+            
+            # Función para obtener fecha del calendario
+            def get_selected_date():
+                return calendar_widget.get_date()
+        else:
+            fecha_entry = tk.Entry(fecha_frame, textvariable=fecha_var, font=('Arial', 11),
+                                 relief='solid', bd=1)
+            fecha_entry.pack(fill='x', pady=(8, 0))
+            tk.Label(fecha_frame, text="Formato: DD/MM/YYYY", 
+                    font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w', pady=(5, 0))
+        
+        # Hora
+        hora_frame = tk.Frame(datetime_grid, bg='#F8FAFC')
+        hora_frame.grid(row=0, column=1, sticky='ew', padx=(15, 0))
+        
+        tk.Label(hora_frame, text="🕐 Hora de la Cita *", 
+                font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+        
+        hora_entry = tk.Entry(hora_frame, textvariable=hora_var, font=('Arial', 11),
+                             relief='solid', bd=1)
+        hora_entry.pack(fill='x', pady=(8, 0))
+        
+        # Botones de horarios sugeridos
+        horarios_frame = tk.Frame(hora_frame, bg='#F8FAFC')
+        horarios_frame.pack(fill='x', pady=(8, 0))
+        
+        tk.Label(horarios_frame, text="Horarios sugeridos:", font=('Arial', 9),
+                bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+        
+        horarios_buttons = tk.Frame(horarios_frame, bg='#F8FAFC')
+        horarios_buttons.pack(fill='x', pady=5)
+        
+        horarios_sugeridos = ['08:00', '09:00', '10:00', '11:00', '14:00', '15:00', '16:00', '17:00']
+        for i, hora in enumerate(horarios_sugeridos):
+            if i % 4 == 0:
+                row_frame = tk.Frame(horarios_buttons, bg='#F8FAFC')
+                row_frame.pack(fill='x', pady=2)
+            
+            tk.Button(row_frame, text=hora, 
+                     command=lambda h=hora: hora_var.set(h),
+                     bg='#FFFFFF', fg='#1E3A8A', font=('Arial', 9),
+                     relief='solid', bd=1, padx=8, pady=2,
+                     cursor='hand2').pack(side='left', padx=2)
+        
+        # SECCIÓN 3: DETALLES DE LA CITA
+        detalles_section = tk.LabelFrame(scrollable_frame, text="💭 Detalles de la Consulta", 
+                                       font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                       padx=20, pady=15)
+        detalles_section.pack(fill='x', pady=(0, 20))
+        
+        # Motivo
+        tk.Label(detalles_section, text="Motivo de la Consulta *", font=('Arial', 11, 'bold'),
+                bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(5, 2))
+        
+        motivo_entry = tk.Entry(detalles_section, textvariable=motivo_var, font=('Arial', 11),
+                              relief='solid', bd=1)
+        motivo_entry.pack(fill='x', pady=(0, 10))
+        
+        # Ejemplos de motivos
+        ejemplos_frame = tk.Frame(detalles_section, bg='#F8FAFC')
+        ejemplos_frame.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(ejemplos_frame, text="Ejemplos:", font=('Arial', 9),
+                bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+        
+        ejemplos_buttons = tk.Frame(ejemplos_frame, bg='#F8FAFC')
+        ejemplos_buttons.pack(fill='x', pady=5)
+        
+        ejemplos_motivos = ['Consulta general', 'Control médico', 'Revisión', 'Chequeo preventivo']
+        for ejemplo in ejemplos_motivos:
+            tk.Button(ejemplos_buttons, text=ejemplo, 
+                     command=lambda e=ejemplo: motivo_var.set(e),
+                     bg='#E8F6F3', fg='#0D7377', font=('Arial', 9),
+                     relief='flat', padx=8, pady=2,
+                     cursor='hand2').pack(side='left', padx=3)
+        
+        # Urgencia
+        tk.Label(detalles_section, text="Nivel de Urgencia", font=('Arial', 11, 'bold'),
+                bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(10, 2))
+        
+        urgencia_frame = tk.Frame(detalles_section, bg='#F8FAFC')
+        urgencia_frame.pack(fill='x', pady=(0, 10))
+        
+        urgencias = [('Normal', 'normal'), ('Urgente', 'urgente'), ('Muy Urgente', 'muy_urgente')]
+        for texto, valor in urgencias:
+            tk.Radiobutton(urgencia_frame, text=texto, variable=urgencia_var, value=valor,
+                          bg='#F8FAFC', font=('Arial', 10)).pack(side='left', padx=10)
+        
+        # Observaciones
+        tk.Label(detalles_section, text="Observaciones Adicionales", font=('Arial', 11, 'bold'),
+                bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(10, 2))
+        
+        obs_entry = tk.Entry(detalles_section, textvariable=observaciones_var, font=('Arial', 11),
+                           relief='solid', bd=1)
+        obs_entry.pack(fill='x', pady=(0, 5))
+        
+        tk.Label(detalles_section, text="Información adicional que desee compartir con el doctor", 
+                font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+        
+        # Función para actualizar info del doctor
+        def on_doctor_change(event=None):
+            selected = doctor_combo.get()
+            if selected and " - " in selected:
+                try:
+                    doctor_id = selected.split(" - ")[0]
+                    # Buscar info del doctor
+                    for doctor in doctors:
+                        if str(doctor['id']) == doctor_id:
+                            info_text = f"👨‍⚕️ Dr. {doctor['nombre']} {doctor['apellido']}\n"
+                            info_text += f"🏥 Especialidad: {doctor.get('especialidad', 'Medicina General')}\n"
+                            info_text += f"📞 Disponible para consultas"
+                            doctor_info_label.config(text=info_text)
+                            break
+                except:
+                    doctor_info_label.config(text="ℹ️ Información del doctor no disponible")
+            else:
+                doctor_info_label.config(text="ℹ️ Seleccione un doctor para ver información")
+        
+        doctor_combo.bind('<<ComboboxSelected>>', on_doctor_change)
+        
+        # Función para guardar la cita
+        def save_appointment():
+            try:
+                # Validaciones
+                if not doctor_combo.get() or doctor_combo.get() == "Seleccione un doctor...":
+                    messagebox.showerror("Error", "Debe seleccionar un doctor")
+                    return
+                
+                if CALENDAR_AVAILABLE:
+                    fecha = get_selected_date()
+                else:
+                    fecha = fecha_var.get().strip()
+                
+                if not fecha:
+                    messagebox.showerror("Error", "Debe seleccionar una fecha")
+                    return
+                
+                if not hora_var.get().strip():
+                    messagebox.showerror("Error", "Debe ingresar una hora")
+                    return
+                
+                if not motivo_var.get().strip():
+                    messagebox.showerror("Error", "Debe ingresar el motivo de la consulta")
+                    return
+                
+                # Extraer ID del doctor
+                doctor_selected = doctor_combo.get()
+                doctor_id = int(doctor_selected.split(" - ")[0])
+                
+                # Verificar conflictos de horario
+                if hasattr(self, 'check_appointment_conflict'):
+                    if self.check_appointment_conflict(fecha, hora_var.get().strip(), doctor_id):
+                        if not messagebox.askyesno("Conflicto de Horario", 
+                                                 "Ya existe una cita en ese horario. ¿Desea continuar de todas formas?"):
+                            return
+                
+                # Preparar datos
+                appointment_data = {
+                    'paciente_id': self.current_user.id,
+                    'doctor_id': doctor_id,
+                    'motivo': motivo_var.get().strip(),
+                    'estado': 'pendiente',
+                    'fecha_cita': fecha,
+                    'hora_cita': hora_var.get().strip(),
+                    'observaciones': observaciones_var.get().strip(),
+                    'urgencia': urgencia_var.get()
+                }
+                
+                # Guardar en la base de datos
+                result = self.db_manager.create_appointment(appointment_data)
+                
+                if result:
+                    messagebox.showinfo("Éxito", "✅ Cita agendada correctamente")
+                    schedule_window.destroy()
+                    self.load_patient_appointments()  # Recargar lista
+                else:
+                    messagebox.showerror("Error", "No se pudo agendar la cita")
+                    
+            except Exception as e:
+                messagebox.showerror("Error", f"Error al agendar la cita: {str(e)}")
+        
+        # Panel de botones
+        buttons_frame = tk.Frame(schedule_window, bg='#F8FAFC')
+        buttons_frame.pack(fill='x', padx=25, pady=(0, 25))
+        
+        # Botones con mejor diseño
+        tk.Button(buttons_frame, text="❌ Cancelar", 
+                 command=schedule_window.destroy,
+                 bg='#95A5A6', fg='white', font=('Arial', 12, 'bold'),
+                 relief='flat', padx=25, pady=10, cursor='hand2').pack(side='right', padx=(10, 0))
+        
+        tk.Button(buttons_frame, text="💾 Agendar Cita", 
+                 command=save_appointment,
+                 bg='#16A085', fg='white', font=('Arial', 12, 'bold'),
+                 relief='flat', padx=25, pady=10, cursor='hand2').pack(side='right')
+        
+        # Pack del canvas y scrollbar
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+    
+    def update_patient_appointments_list(self):
+        """Función para el botón 'Actualizar Lista' - Recarga todas las citas del paciente"""
+        try:
+            self.load_patient_appointments()
+            # Mostrar mensaje de confirmación
+            total_citas = len(self.patient_appointments_tree.get_children()) if hasattr(self, 'patient_appointments_tree') else 0
+            messagebox.showinfo("Lista Actualizada", 
+                               f"✅ La lista de citas se ha actualizado correctamente.\n\n"
+                               f"📋 Total de citas: {total_citas}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al actualizar la lista de citas: {str(e)}")
+            print(f"Error en update_patient_appointments_list: {e}")
+    
+    def refresh_patient_appointments(self):
+        """Función auxiliar para refrescar la lista sin mostrar mensaje"""
+        try:
+            self.load_patient_appointments()
+        except Exception as e:
+            print(f"Error refrescando citas: {e}")
+    
+    def load_patient_appointments(self):
+        """Carga las citas del paciente aplicando filtros simples y fecha seleccionada del calendario"""
+        try:
+            if not hasattr(self, 'patient_appointments_tree'):
+                return
+            # Limpiar tabla
+            for i in self.patient_appointments_tree.get_children():
+                self.patient_appointments_tree.delete(i)
+
+            # Verificar que el usuario está logueado
+            if not self.current_user or not hasattr(self.current_user, 'id'):
+                messagebox.showerror("Error", "No hay usuario logueado")
+                return
+
+            conn = self.db_manager.get_connection()
+            cur = conn.cursor()
+            where = "WHERE c.paciente_id = ?"
+            params = [self.current_user.id]
+
+            # Filtro por fecha del calendario
+            sel_date = getattr(self, 'patient_cal_date', tk.StringVar()).get()
+            if sel_date:
+                try:
+                    d, m, y = sel_date.split('/')
+                    iso = f"{y}-{m.zfill(2)}-{d.zfill(2)}"
+                    where += " AND c.fecha = ?"
+                    params.append(iso)
+                except:
+                    pass
+
+            # Ejecutar consulta con JOIN para obtener nombre del doctor
+            cur.execute(f"""
+                SELECT c.id, 
+                       DATE(c.fecha_hora) as fecha, 
+                       TIME(c.fecha_hora) as hora, 
+                       COALESCE(u.nombre || ' ' || u.apellido, 'Sin asignar') as doctor_nombre,
+                       COALESCE(c.motivo, 'Sin motivo') as motivo, 
+                       COALESCE(c.estado, 'pendiente') as estado
+                FROM citas c
+                LEFT JOIN usuarios u ON u.id = c.doctor_id
+                {where}
+                ORDER BY c.fecha_hora DESC
+            """, params)
+
+            rows = cur.fetchall()
+            
+            # Aplicar filtros adicionales
+            mode = getattr(self, 'patient_appointment_filter', None)
+            now = datetime.now()
+            
+            for row in rows:
+                # Convertir row a valores legibles (no objetos)
+                appt_id = str(row[0]) if row[0] else ""
+                fecha_str = str(row[1]) if row[1] else ""
+                hora_str = str(row[2]) if row[2] else ""
+                doctor_str = str(row[3]) if row[3] else "Sin asignar"
+                motivo_str = str(row[4]) if row[4] else "Sin motivo"
+                estado_str = str(row[5]) if row[5] else "pendiente"
+                
+                # Formatear fecha para mostrar
+                if fecha_str:
+                    try:
+                        fecha_obj = datetime.strptime(fecha_str, '%Y-%m-%d')
+                        fecha_display = fecha_obj.strftime('%d/%m/%Y')
+                    except:
+                        fecha_display = fecha_str
+                else:
+                    fecha_display = ""
+                
+                # Formatear hora
+                if hora_str:
+                    try:
+                        hora_obj = datetime.strptime(hora_str, '%H:%M:%S')
+                        hora_display = hora_obj.strftime('%H:%M')
+                    except:
+                        hora_display = hora_str
+                else:
+                    hora_display = ""
+                
+                # Aplicar filtros de tiempo
+                keep = True
+                if mode:
+                    val = mode.get()
+                    dt_iso = f"{fecha_str} {hora_str}".strip()
+                    try:
+                        appt_datetime = datetime.fromisoformat(dt_iso)
+                        if val == 'Próximas' and appt_datetime < now:
+                            keep = False
+                        elif val == 'Pasadas' and appt_datetime >= now:
+                            keep = False
+                        elif val == 'Este Mes':
+                            month = now.strftime('%Y-%m')
+                            keep = fecha_str.startswith(month)
+                    except:
+                        pass
+                
+                if keep:
+                    # Obtener información del estado
+                    status_info = self.get_appointment_status_info(estado_str)
+                    
+                    # Formatear tiempo con información adicional
+                    fecha_display, hora_display, tiempo_info = self.format_appointment_time(fecha_str, hora_str)
+                    
+                    # Truncar motivo si es muy largo
+                    motivo_truncado = motivo_str[:25] + "..." if len(motivo_str) > 25 else motivo_str
+                    
+                    # Agregar icono al estado
+                    estado_con_icono = f"{status_info['icon']} {estado_str.upper()}"
+                    
+                    # Insertar valores como strings legibles
+                    self.patient_appointments_tree.insert('', 'end', values=(
+                        appt_id,
+                        fecha_display,
+                        hora_display,
+                        doctor_str,
+                        motivo_truncado,
+                        estado_con_icono
+                    ), tags=(estado_str.lower(),))
+
+            # Configurar colores para los diferentes estados
+            if hasattr(self, 'patient_appointments_tree'):
+                self.patient_appointments_tree.tag_configure('pendiente', background='#FEF3C7')
+                self.patient_appointments_tree.tag_configure('confirmada', background='#D1FAE5')
+                self.patient_appointments_tree.tag_configure('cancelada', background='#FEE2E2')
+                self.patient_appointments_tree.tag_configure('completada', background='#E0E7FF')
+                self.patient_appointments_tree.tag_configure('en_proceso', background='#F3E8FF')
+
+            cur.close()
+            conn.close()
+            
+            # Actualizar contador con información adicional
+            total_citas = len(self.patient_appointments_tree.get_children())
+            if hasattr(self, 'patient_appointments_count_label'):
+                # Obtener resumen de citas
+                summary = self.get_patient_appointment_summary()
+                if summary:
+                    count_text = f"📋 Total: {total_citas} | ⏳ Pendientes: {summary['pendientes']} | ✅ Confirmadas: {summary['confirmadas']}"
+                else:
+                    count_text = f"📋 Total: {total_citas} citas"
+                self.patient_appointments_count_label.config(text=count_text)
+                
+        except Exception as e:
+            messagebox.showerror('Error', f'Error cargando citas: {str(e)}')
+            print(f"Error en load_patient_appointments: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def get_appointment_status_info(self, estado):
+        """Obtiene información visual del estado de la cita"""
+        status_map = {
+            'pendiente': {'icon': '⏳', 'color': '#F39C12', 'description': 'Esperando confirmación'},
+            'confirmada': {'icon': '✅', 'color': '#27AE60', 'description': 'Confirmada por el doctor'},
+            'cancelada': {'icon': '❌', 'color': '#E74C3C', 'description': 'Cita cancelada'},
+            'completada': {'icon': '✔️', 'color': '#2980B9', 'description': 'Consulta realizada'},
+            'en_proceso': {'icon': '🔄', 'color': '#9B59B6', 'description': 'En curso'}
+        }
+        
+        return status_map.get(estado.lower(), {
+            'icon': '❓', 
+            'color': '#95A5A6', 
+            'description': 'Estado desconocido'
+        })
+    
+    def format_appointment_time(self, fecha_str, hora_str):
+        """Formatea la fecha y hora con información adicional"""
+        try:
+            if not fecha_str or not hora_str:
+                return "Sin fecha", "Sin hora", ""
+            
+            # Convertir a datetime
+            dt_str = f"{fecha_str} {hora_str}"
+            dt = datetime.fromisoformat(dt_str)
+            now = datetime.now()
+            
+            # Formatear fecha
+            fecha_display = dt.strftime('%d/%m/%Y')
+            
+            # Formatear hora
+            hora_display = dt.strftime('%H:%M')
+            
+            # Calcular tiempo relativo
+            diff = dt - now
+            
+            if diff.total_seconds() > 0:
+                # Cita futura
+                if diff.days > 0:
+                    tiempo_info = f"En {diff.days} días"
+                elif diff.seconds > 3600:
+                    horas = diff.seconds // 3600
+                    tiempo_info = f"En {horas}h"
+                else:
+                    minutos = diff.seconds // 60
+                    tiempo_info = f"En {minutos}min"
+            else:
+                # Cita pasada
+                diff_abs = abs(diff)
+                if diff_abs.days > 0:
+                    tiempo_info = f"Hace {diff_abs.days} días"
+                elif diff_abs.seconds > 3600:
+                    horas = diff_abs.seconds // 3600
+                    tiempo_info = f"Hace {horas}h"
+                else:
+                    minutos = diff_abs.seconds // 60
+                    tiempo_info = f"Hace {minutos}min"
+            
+            return fecha_display, hora_display, tiempo_info
+            
+        except Exception as e:
+            print(f"Error formateando tiempo: {e}")
+            return str(fecha_str), str(hora_str), ""
+    
+    def get_patient_appointment_summary(self):
+        """Obtiene un resumen de las citas del paciente"""
+        try:
+            if not hasattr(self, 'patient_appointments_tree'):
+                return None
+            
+            summary = {
+                'total': 0,
+                'pendientes': 0,
+                'confirmadas': 0,
+                'canceladas': 0,
+                'completadas': 0
+            }
+            
+            for item in self.patient_appointments_tree.get_children():
+                summary['total'] += 1
+                values = self.patient_appointments_tree.item(item)['values']
+                if len(values) > 5:
+                    estado = values[5].lower()
+                    if 'pendiente' in estado:
+                        summary['pendientes'] += 1
+                    elif 'confirmada' in estado:
+                        summary['confirmadas'] += 1
+                    elif 'cancelada' in estado:
+                        summary['canceladas'] += 1
+                    elif 'completada' in estado:
+                        summary['completadas'] += 1
+            
+            return summary
+        except Exception as e:
+            print(f"Error obteniendo resumen: {e}")
+            return None
+    
+    def view_my_appointment_details(self):
+        """Muestra los detalles completos de la cita seleccionada"""
+        try:
+            sel = self.patient_appointments_tree.selection()
+            if not sel:
+                messagebox.showwarning("Selección", "Por favor seleccione una cita para ver los detalles")
+                return
+            
+            # Obtener datos de la fila seleccionada
+            vals = self.patient_appointments_tree.item(sel[0])['values']
+            if not vals:
+                messagebox.showerror("Error", "No se pudieron obtener los datos de la cita")
+                return
+            
+            appt_id = vals[0]
+            
+            # Obtener detalles completos de la base de datos
+            try:
+                conn = self.db_manager.get_connection()
+                cur = conn.cursor()
+                
+                cur.execute("""
+                    SELECT c.id, c.fecha_hora, c.motivo, c.estado, c.notas,
+                           u.nombre || ' ' || u.apellido as doctor_nombre,
+                           d.especialidad, u.telefono as doctor_telefono,
+                           p.nombre || ' ' || p.apellido as paciente_nombre
+                    FROM citas c
+                    LEFT JOIN usuarios u ON u.id = c.doctor_id
+                    LEFT JOIN doctores d ON d.id = c.doctor_id  
+                    LEFT JOIN usuarios p ON p.id = c.paciente_id
+                    WHERE c.id = ?
+                """, (appt_id,))
+                
+                row = cur.fetchone()
+                cur.close()
+                conn.close()
+                
+                if not row:
+                    messagebox.showerror("Error", "No se encontraron detalles para esta cita")
+                    return
+                
+                # Crear ventana de detalles
+                details_window = tk.Toplevel(self.root)
+                details_window.title("🏥 Detalles de la Cita")
+                details_window.geometry("500x600")
+                details_window.configure(bg='#F8FAFC')
+                details_window.transient(self.root)
+                details_window.grab_set()
+                
+                # Centrar ventana
+                details_window.update_idletasks()
+                x = (details_window.winfo_screenwidth() // 2) - (500 // 2)
+                y = (details_window.winfo_screenheight() // 2) - (600 // 2)
+                details_window.geometry(f"500x600+{x}+{y}")
+                
+                # Header
+                header_frame = tk.Frame(details_window, bg='#1E3A8A', height=80)
+                header_frame.pack(fill='x')
+                header_frame.pack_propagate(False)
+                
+                tk.Label(header_frame, text="📋 DETALLES DE LA CITA", 
+                        font=('Arial', 16, 'bold'), bg='#1E3A8A', fg='white').pack(expand=True)
+                
+                # Contenido principal
+                main_frame = tk.Frame(details_window, bg='#F8FAFC')
+                main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+                
+                # Procesar datos
+                fecha_hora_str = str(row[1]) if row[1] else "No definida"
+                motivo_str = str(row[2]) if row[2] else "Sin motivo especificado"
+                estado_str = str(row[3]) if row[3] else "pendiente"
+                notas_str = str(row[4]) if row[4] else "Sin observaciones"
+                doctor_str = str(row[5]) if row[5] else "Sin asignar"
+                especialidad_str = str(row[6]) if row[6] else "General"
+                doctor_tel_str = str(row[7]) if row[7] else "No disponible"
+                
+                # Formatear fecha y hora
+                try:
+                    if fecha_hora_str != "No definida":
+                        dt = datetime.fromisoformat(fecha_hora_str)
+                        fecha_formateada = dt.strftime('%A, %d de %B de %Y')
+                        hora_formateada = dt.strftime('%H:%M')
+                    else:
+                        fecha_formateada = "No definida"
+                        hora_formateada = ""
+                except:
+                    fecha_formateada = fecha_hora_str
+                    hora_formateada = ""
+                
+                # Información de la cita
+                info_sections = [
+                    ("📅 INFORMACIÓN GENERAL", [
+                        ("ID de la Cita:", appt_id),
+                        ("Fecha:", fecha_formateada),
+                        ("Hora:", hora_formateada),
+                        ("Estado:", estado_str.upper())
+                    ]),
+                    ("👨‍⚕️ INFORMACIÓN DEL DOCTOR", [
+                        ("Doctor:", doctor_str),
+                        ("Especialidad:", especialidad_str),
+                        ("Teléfono:", doctor_tel_str)
+                    ]),
+                    ("💭 DETALLES DE LA CONSULTA", [
+                        ("Motivo:", motivo_str),
+                        ("Observaciones:", notas_str)
+                    ])
+                ]
+                
+                for section_title, section_data in info_sections:
+                    # Título de sección
+                    section_frame = tk.LabelFrame(main_frame, text=section_title,
+                                                 font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                                 padx=15, pady=10)
+                    section_frame.pack(fill='x', pady=(0, 15))
+                    
+                    # Datos de la sección
+                    for label, value in section_data:
+                        row_frame = tk.Frame(section_frame, bg='#F8FAFC')
+                        row_frame.pack(fill='x', pady=3)
+                        
+                        tk.Label(row_frame, text=label, font=('Arial', 10, 'bold'),
+                                bg='#F8FAFC', fg='#1E3A8A', anchor='w').pack(side='left')
+                        
+                        # Para textos largos, usar Text widget
+                        if len(str(value)) > 50:
+                            text_widget = tk.Text(row_frame, height=3, wrap='word',
+                                                 font=('Arial', 10), bg='#FFFFFF',
+                                                 relief='flat', bd=1)
+                            text_widget.insert(1.0, str(value))
+                            text_widget.configure(state='disabled')
+                            text_widget.pack(fill='x', pady=(2, 0))
+                        else:
+                            tk.Label(row_frame, text=str(value), font=('Arial', 10),
+                                    bg='#F8FAFC', fg='#64748B', anchor='w',
+                                    wraplength=300).pack(fill='x', padx=(10, 0))
+                
+                # Botones de acción
+                buttons_frame = tk.Frame(details_window, bg='#F8FAFC')
+                buttons_frame.pack(fill='x', padx=20, pady=(0, 20))
+                
+                # Botón cerrar
+                tk.Button(buttons_frame, text="✅ Cerrar", 
+                         command=details_window.destroy,
+                         bg='#16A085', fg='white', font=('Arial', 11, 'bold'),
+                         relief='flat', padx=20, pady=8, cursor='hand2').pack(side='right')
+                
+                # Botón para cancelar cita (solo si está pendiente)
+                if estado_str.lower() in ['pendiente', 'confirmada']:
+                    tk.Button(buttons_frame, text="❌ Cancelar Cita", 
+                             command=lambda: self.cancel_appointment_from_details(appt_id, details_window),
+                             bg='#DC2626', fg='white', font=('Arial', 11, 'bold'),
+                             relief='flat', padx=20, pady=8, cursor='hand2').pack(side='left')
+                
+            except Exception as db_error:
+                messagebox.showerror("Error de Base de Datos", f"Error al obtener detalles: {str(db_error)}")
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando detalles: {str(e)}")
+            print(f"Error en view_my_appointment_details: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def edit_my_appointment(self):
+        """Permite al paciente editar su cita (solo fecha, hora y motivo)"""
+        try:
+            sel = self.patient_appointments_tree.selection()
+            if not sel:
+                messagebox.showwarning("Selección", "Por favor seleccione una cita para editar")
+                return
+            
+            # Obtener datos de la fila seleccionada
+            vals = self.patient_appointments_tree.item(sel[0])['values']
+            if not vals:
+                messagebox.showerror("Error", "No se pudieron obtener los datos de la cita")
+                return
+            
+            appt_id = vals[0]
+            current_estado = vals[5] if len(vals) > 5 else ""
+            
+            # Verificar que la cita se puede editar
+            if current_estado.lower() in ['completada', 'cancelada']:
+                messagebox.showwarning("Cita No Editable", 
+                                     f"No se puede editar una cita con estado: {current_estado}")
+                return
+            
+            # Obtener detalles actuales de la cita
+            try:
+                conn = self.db_manager.get_connection()
+                cur = conn.cursor()
+                
+                cur.execute("""
+                    SELECT c.id, c.fecha_hora, c.motivo, c.notas, c.doctor_id,
+                           u.nombre || ' ' || u.apellido as doctor_nombre
+                    FROM citas c
+                    LEFT JOIN usuarios u ON u.id = c.doctor_id
+                    WHERE c.id = ?
+                """, (appt_id,))
+                
+                row = cur.fetchone()
+                cur.close()
+                conn.close()
+                
+                if not row:
+                    messagebox.showerror("Error", "No se encontraron datos para esta cita")
+                    return
+                
+                # Extraer datos actuales
+                fecha_hora_actual = row[1] if row[1] else ""
+                motivo_actual = row[2] if row[2] else ""
+                notas_actual = row[4] if row[4] else ""  # Cambié observaciones por notas
+                doctor_id = row[5] if len(row) > 5 else None
+                doctor_nombre = row[6] if len(row) > 6 else ""
+                
+                # Separar fecha y hora
+                fecha_actual = ""
+                hora_actual = ""
+                if fecha_hora_actual:
+                    try:
+                        dt = datetime.fromisoformat(fecha_hora_actual)
+                        fecha_actual = dt.strftime('%d/%m/%Y')
+                        hora_actual = dt.strftime('%H:%M')
+                    except:
+                        fecha_actual = fecha_hora_actual.split(' ')[0] if ' ' in fecha_hora_actual else fecha_hora_actual
+                        hora_actual = fecha_hora_actual.split(' ')[1] if ' ' in fecha_hora_actual else ""
+                
+                # Crear ventana de edición rediseñada
+                edit_window = tk.Toplevel(self.root)
+                edit_window.title("✏️ Editar Mi Cita Médica")
+                edit_window.geometry("650x750")
+                edit_window.configure(bg='#F8FAFC')
+                edit_window.transient(self.root)
+                edit_window.grab_set()
+                edit_window.resizable(False, False)
+                
+                # Centrar ventana
+                edit_window.update_idletasks()
+                x = (edit_window.winfo_screenwidth() // 2) - (650 // 2)
+                y = (edit_window.winfo_screenheight() // 2) - (750 // 2)
+                edit_window.geometry(f"650x750+{x}+{y}")
+                
+                # Header rediseñado con gradiente visual
+                header_frame = tk.Frame(edit_window, bg='#E67E22', height=90)
+                header_frame.pack(fill='x')
+                header_frame.pack_propagate(False)
+                
+                # Contenido del header
+                header_content = tk.Frame(header_frame, bg='#E67E22')
+                header_content.pack(expand=True, fill='both', padx=30, pady=20)
+                
+                tk.Label(header_content, text="✏️ EDITAR CITA MÉDICA", 
+                        font=('Arial', 18, 'bold'), bg='#E67E22', fg='white').pack()
+                tk.Label(header_content, text="Modifique los detalles de su cita médica según sus necesidades", 
+                        font=('Arial', 11), bg='#E67E22', fg='#FDF2E9').pack(pady=(5, 0))
+                
+                # Container principal con scroll
+                main_container = tk.Frame(edit_window, bg='#F8FAFC')
+                main_container.pack(fill='both', expand=True, padx=25, pady=20)
+                
+                # Canvas para scroll
+                canvas = tk.Canvas(main_container, bg='#F8FAFC', highlightthickness=0)
+                scrollbar = ttk.Scrollbar(main_container, orient="vertical", command=canvas.yview)
+                scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+                
+                scrollable_frame.bind(
+                    "<Configure>",
+                    lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+                )
+                
+                canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+                canvas.configure(yscrollcommand=scrollbar.set)
+                
+                # Variables para el formulario
+                fecha_var = tk.StringVar(value=fecha_actual)
+                hora_var = tk.StringVar(value=hora_actual)
+                motivo_var = tk.StringVar(value=motivo_actual)
+                observaciones_var = tk.StringVar(value=notas_actual)
+                
+                # SECCIÓN: Información actual de la cita
+                current_section = tk.LabelFrame(scrollable_frame, text="� Información Actual de la Cita", 
+                                              font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                              padx=20, pady=15)
+                current_section.pack(fill='x', pady=(0, 20))
+                
+                # Grid para información actual
+                current_grid = tk.Frame(current_section, bg='#F8FAFC')
+                current_grid.pack(fill='x')
+                current_grid.columnconfigure(0, weight=1)
+                current_grid.columnconfigure(1, weight=1)
+                
+                # Información del doctor
+                doctor_info_frame = tk.Frame(current_grid, bg='#E8F6F3', relief='solid', bd=1)
+                doctor_info_frame.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 10))
+                
+                tk.Label(doctor_info_frame, text="👨‍⚕️ Doctor Asignado (No se puede cambiar)", 
+                        font=('Arial', 10, 'bold'), bg='#E8F6F3', fg='#0D7377').pack(anchor='w', padx=15, pady=(8, 2))
+                tk.Label(doctor_info_frame, text=doctor_nombre, 
+                        font=('Arial', 12, 'bold'), bg='#E8F6F3', fg='#16A085').pack(anchor='w', padx=15, pady=(0, 8))
+                
+                # Fecha actual
+                current_fecha_frame = tk.Frame(current_grid, bg='#F8FAFC')
+                current_fecha_frame.grid(row=1, column=0, sticky='ew', padx=(0, 10))
+                
+                tk.Label(current_fecha_frame, text="📅 Fecha Actual:", 
+                        font=('Arial', 10, 'bold'), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+                tk.Label(current_fecha_frame, text=fecha_actual, 
+                        font=('Arial', 11), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+                
+                # Hora actual
+                current_hora_frame = tk.Frame(current_grid, bg='#F8FAFC')
+                current_hora_frame.grid(row=1, column=1, sticky='ew', padx=(10, 0))
+                
+                tk.Label(current_hora_frame, text="🕐 Hora Actual:", 
+                        font=('Arial', 10, 'bold'), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+                tk.Label(current_hora_frame, text=hora_actual, 
+                        font=('Arial', 11), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+                
+                # SECCIÓN: Nueva fecha y hora
+                datetime_section = tk.LabelFrame(scrollable_frame, text="📅 Modificar Fecha y Hora", 
+                                               font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                               padx=20, pady=15)
+                datetime_section.pack(fill='x', pady=(0, 20))
+                
+                # Grid para fecha y hora
+                datetime_grid = tk.Frame(datetime_section, bg='#F8FAFC')
+                datetime_grid.pack(fill='x')
+                datetime_grid.columnconfigure(0, weight=1)
+                datetime_grid.columnconfigure(1, weight=1)
+                
+                # Nueva fecha
+                fecha_frame = tk.Frame(datetime_grid, bg='#F8FAFC')
+                fecha_frame.grid(row=0, column=0, sticky='ew', padx=(0, 15))
+                
+                tk.Label(fecha_frame, text="📅 Nueva Fecha *", 
+                        font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+                
+                fecha_entry = tk.Entry(fecha_frame, textvariable=fecha_var, font=('Arial', 12),
+                                     relief='solid', bd=2, bg='white')
+                fecha_entry.pack(fill='x', pady=(8, 5))
+                
+                tk.Label(fecha_frame, text="Formato: DD/MM/YYYY", 
+                        font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+                
+                # Nueva hora
+                hora_frame = tk.Frame(datetime_grid, bg='#F8FAFC')
+                hora_frame.grid(row=0, column=1, sticky='ew', padx=(15, 0))
+                
+                tk.Label(hora_frame, text="🕐 Nueva Hora *", 
+                        font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+                
+                hora_entry = tk.Entry(hora_frame, textvariable=hora_var, font=('Arial', 12),
+                                    relief='solid', bd=2, bg='white')
+                hora_entry.pack(fill='x', pady=(8, 5))
+                
+                tk.Label(hora_frame, text="Formato: HH:MM", 
+                        font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+                
+                # Horarios sugeridos mejorados
+                horarios_section = tk.Frame(datetime_section, bg='#F8FAFC')
+                horarios_section.pack(fill='x', pady=(15, 0))
+                
+                tk.Label(horarios_section, text="⏰ Horarios Disponibles:", 
+                        font=('Arial', 10, 'bold'), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+                
+                horarios_container = tk.Frame(horarios_section, bg='#F8FAFC')
+                horarios_container.pack(fill='x', pady=8)
+                
+                # Horarios matutinos
+                morning_frame = tk.Frame(horarios_container, bg='#F8FAFC')
+                morning_frame.pack(fill='x', pady=2)
+                
+                tk.Label(morning_frame, text="🌅 Mañana:", font=('Arial', 9, 'bold'),
+                        bg='#F8FAFC', fg='#64748B').pack(side='left', padx=(0, 10))
+                
+                morning_times = ['08:00', '09:00', '10:00', '11:00', '12:00']
+                for time in morning_times:
+                    tk.Button(morning_frame, text=time, 
+                             command=lambda t=time: hora_var.set(t),
+                             bg='#E8F6F3', fg='#0D7377', font=('Arial', 9, 'bold'),
+                             relief='solid', bd=1, padx=12, pady=4,
+                             cursor='hand2').pack(side='left', padx=2)
+                
+                # Horarios vespertinos
+                afternoon_frame = tk.Frame(horarios_container, bg='#F8FAFC')
+                afternoon_frame.pack(fill='x', pady=2)
+                
+                tk.Label(afternoon_frame, text="🌇 Tarde:", font=('Arial', 9, 'bold'),
+                        bg='#F8FAFC', fg='#64748B').pack(side='left', padx=(0, 10))
+                
+                afternoon_times = ['14:00', '15:00', '16:00', '17:00', '18:00']
+                for time in afternoon_times:
+                    tk.Button(afternoon_frame, text=time, 
+                             command=lambda t=time: hora_var.set(t),
+                             bg='#FDF2E9', fg='#E67E22', font=('Arial', 9, 'bold'),
+                             relief='solid', bd=1, padx=12, pady=4,
+                             cursor='hand2').pack(side='left', padx=2)
+                
+                # SECCIÓN: Motivo y observaciones
+                details_section = tk.LabelFrame(scrollable_frame, text="💭 Detalles de la Consulta", 
+                                              font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                              padx=20, pady=15)
+                details_section.pack(fill='x', pady=(0, 20))
+                
+                # Motivo
+                tk.Label(details_section, text="Motivo de la Consulta *", 
+                        font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(5, 2))
+                
+                motivo_entry = tk.Entry(details_section, textvariable=motivo_var, font=('Arial', 12),
+                                      relief='solid', bd=2, bg='white')
+                motivo_entry.pack(fill='x', pady=(0, 10))
+                
+                # Observaciones
+                tk.Label(details_section, text="Observaciones Adicionales", 
+                        font=('Arial', 11, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(10, 2))
+                
+                obs_text = tk.Text(details_section, height=3, font=('Arial', 11),
+                                 relief='solid', bd=2, bg='white', wrap='word')
+                obs_text.pack(fill='x', pady=(0, 5))
+                obs_text.insert('1.0', observaciones_var.get())
+                
+                tk.Label(details_section, text="Información adicional que desee compartir con el doctor", 
+                        font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+                
+                # SECCIÓN: Advertencias y consejos
+                warning_section = tk.Frame(scrollable_frame, bg='#FEF3C7', relief='solid', bd=1)
+                warning_section.pack(fill='x', pady=(0, 20))
+                
+                warning_content = tk.Frame(warning_section, bg='#FEF3C7')
+                warning_content.pack(fill='x', padx=15, pady=12)
+                
+                tk.Label(warning_content, text="⚠️ IMPORTANTE:", 
+                        font=('Arial', 10, 'bold'), bg='#FEF3C7', fg='#92400E').pack(anchor='w')
+                
+                warning_text = ("• Los cambios deben realizarse con al menos 24 horas de anticipación\n"
+                              "• Solo puede cambiar fecha, hora, motivo y observaciones\n"
+                              "• El doctor asignado no se puede modificar\n"
+                              "• Si requiere cambiar doctor, debe cancelar y crear una nueva cita")
+                
+                tk.Label(warning_content, text=warning_text, 
+                        font=('Arial', 9), bg='#FEF3C7', fg='#92400E',
+                        justify='left').pack(anchor='w', pady=(5, 0))
+                
+                # Función para guardar cambios (mejorada)
+                def save_changes():
+                    try:
+                        # Validar campos
+                        if not fecha_var.get().strip():
+                            messagebox.showerror("Error", "La fecha es obligatoria")
+                            fecha_entry.focus()
+                            return
+                        
+                        if not hora_var.get().strip():
+                            messagebox.showerror("Error", "La hora es obligatoria")
+                            hora_entry.focus()
+                            return
+                        
+                        if not motivo_var.get().strip():
+                            messagebox.showerror("Error", "El motivo es obligatorio")
+                            motivo_entry.focus()
+                            return
+                        
+                        # Obtener observaciones del Text widget
+                        observaciones_text = obs_text.get('1.0', 'end-1c')
+                        
+                        # Construir fecha_hora
+                        try:
+                            # Convertir fecha de DD/MM/YYYY a YYYY-MM-DD
+                            fecha_parts = fecha_var.get().strip().split('/')
+                            if len(fecha_parts) != 3:
+                                raise ValueError("Use el formato DD/MM/YYYY para la fecha")
+                            
+                            dia, mes, año = fecha_parts
+                            
+                            # Validar que sean números
+                            dia = int(dia)
+                            mes = int(mes)
+                            año = int(año)
+                            
+                            if dia < 1 or dia > 31:
+                                raise ValueError("El día debe estar entre 1 y 31")
+                            if mes < 1 or mes > 12:
+                                raise ValueError("El mes debe estar entre 1 y 12")
+                            if año < 2024:
+                                raise ValueError("El año debe ser 2024 o posterior")
+                            
+                            fecha_iso = f"{año}-{mes:02d}-{dia:02d}"
+                            
+                            # Validar hora
+                            hora = hora_var.get().strip()
+                            if ':' not in hora:
+                                raise ValueError("Use el formato HH:MM para la hora")
+                            
+                            hora_parts = hora.split(':')
+                            if len(hora_parts) != 2:
+                                raise ValueError("Use el formato HH:MM para la hora")
+                            
+                            horas = int(hora_parts[0])
+                            minutos = int(hora_parts[1])
+                            
+                            if horas < 0 or horas > 23:
+                                raise ValueError("Las horas deben estar entre 00 y 23")
+                            if minutos < 0 or minutos > 59:
+                                raise ValueError("Los minutos deben estar entre 00 y 59")
+                            
+                            fecha_hora = f"{fecha_iso} {horas:02d}:{minutos:02d}:00"
+                            
+                            # Validar que sea una fecha válida
+                            dt = datetime.fromisoformat(fecha_hora)
+                            
+                            # Verificar que no sea en el pasado
+                            if dt < datetime.now():
+                                if not messagebox.askyesno("Fecha Pasada", 
+                                                         "La fecha/hora seleccionada ya pasó. ¿Desea continuar de todas formas?"):
+                                    return
+                            
+                        except ValueError as ve:
+                            messagebox.showerror("Error de Formato", str(ve))
+                            return
+                        
+                        # Verificar que el doctor siga libre en el nuevo horario (consulta a la tabla)
+                        if doctor_id and self.db_manager.find_appointment_conflicts(
+                                doctor_id, fecha_hora, exclude_id=appt_id):
+                            messagebox.showerror("Horario Ocupado",
+                                               "El doctor ya tiene una cita en ese horario. Elija otra hora.")
+                            return
+                        
+                        # Confirmar cambios
+                        if messagebox.askyesno("Confirmar Cambios", 
+                                             "¿Está seguro que desea guardar los cambios en la cita?"):
+                            
+                            # Actualizar en la base de datos
+                            if not self.db_manager.reschedule_appointment(
+                                    appt_id, fecha_hora, motivo_var.get().strip(), observaciones_text):
+                                messagebox.showerror("Error", "No se pudo guardar la cita. Intente nuevamente.")
+                                return
+                            
+                            messagebox.showinfo("Éxito", "✅ La cita ha sido actualizada correctamente")
+                            edit_window.destroy()
+                            self.load_patient_appointments()  # Recargar lista
+                        
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Error guardando cambios: {str(e)}")
+                
+                # Pack del canvas y scrollbar
+                canvas.pack(side="left", fill="both", expand=True)
+                scrollbar.pack(side="right", fill="y")
+                
+                # Panel de botones rediseñado
+                buttons_frame = tk.Frame(edit_window, bg='#F8FAFC')
+                buttons_frame.pack(fill='x', padx=25, pady=(0, 25))
+                
+                # Botones con mejor diseño
+                tk.Button(buttons_frame, text="❌ Cancelar", 
+                         command=edit_window.destroy,
+                         bg='#95A5A6', fg='white', font=('Arial', 12, 'bold'),
+                         relief='flat', padx=25, pady=12, cursor='hand2').pack(side='right', padx=(10, 0))
+                
+                tk.Button(buttons_frame, text="💾 Guardar Cambios", 
+                         command=save_changes,
+                         bg='#E67E22', fg='white', font=('Arial', 12, 'bold'),
+                         relief='flat', padx=25, pady=12, cursor='hand2').pack(side='right')
+                
+            except Exception as db_error:
+                messagebox.showerror("Error de Base de Datos", f"Error al obtener datos: {str(db_error)}")
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"Error editando cita: {str(e)}")
+            print(f"Error en edit_my_appointment: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def cancel_my_appointment(self):
+        """Formulario completo y rediseñado para cancelar cita médica"""
+        try:
+            sel = self.patient_appointments_tree.selection()
+            if not sel:
+                messagebox.showwarning("Selección", "Por favor seleccione una cita para cancelar")
+                return
+            
+            # Obtener ID de la cita
+            vals = self.patient_appointments_tree.item(sel[0])['values']
+            if not vals:
+                messagebox.showerror("Error", "No se pudieron obtener los datos de la cita")
+                return
+            
+            appt_id = vals[0]
+            fecha = vals[1] if len(vals) > 1 else "N/A"
+            hora = vals[2] if len(vals) > 2 else "N/A"
+            doctor = vals[3] if len(vals) > 3 else "N/A"
+            motivo = vals[4] if len(vals) > 4 else "N/A"
+            estado = vals[5] if len(vals) > 5 else "pendiente"
+            
+            # Verificar si la cita se puede cancelar
+            if estado.lower() in ['cancelada', 'completada']:
+                messagebox.showwarning("Cancelación No Permitida", 
+                                      f"No se puede cancelar una cita que ya está {estado.lower()}.")
+                return
+            
+            # Ventana de cancelación rediseñada
+            cancel_window = tk.Toplevel(self.root)
+            cancel_window.title("❌ Cancelar Cita Médica")
+            cancel_window.geometry("600x650")
+            cancel_window.configure(bg='#F8FAFC')
+            cancel_window.transient(self.root)
+            cancel_window.grab_set()
+            cancel_window.resizable(False, False)
+            
+            # Centrar ventana
+            cancel_window.update_idletasks()
+            x = (cancel_window.winfo_screenwidth() // 2) - (600 // 2)
+            y = (cancel_window.winfo_screenheight() // 2) - (800 // 2)
+            cancel_window.geometry(f"600x800+{x}+{y}")
+            
+            # Header rediseñado
+            header_frame = tk.Frame(cancel_window, bg='#E74C3C', height=90)
+            header_frame.pack(fill='x')
+            header_frame.pack_propagate(False)
+            
+            # Contenido del header
+            header_content = tk.Frame(header_frame, bg='#E74C3C')
+            header_content.pack(expand=True, fill='both', padx=30, pady=20)
+            
+            tk.Label(header_content, text="❌ CANCELAR CITA MÉDICA", 
+                    font=('Arial', 18, 'bold'), bg='#E74C3C', fg='white').pack()
+            tk.Label(header_content, text="Por favor confirme la cancelación y proporcione un motivo", 
+                    font=('Arial', 11), bg='#E74C3C', fg='#FADBD8').pack(pady=(5, 0))
+            
+            # Container principal con scroll
+            main_container = tk.Frame(cancel_window, bg='#F8FAFC')
+            main_container.pack(fill='both', expand=True, padx=25, pady=20)
+            
+            # Canvas para scroll
+            canvas = tk.Canvas(main_container, bg='#F8FAFC', highlightthickness=0)
+            scrollbar = ttk.Scrollbar(main_container, orient="vertical", command=canvas.yview)
+            scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+            
+            scrollable_frame.bind(
+                "<Configure>",
+                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            )
+            
+            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+            canvas.configure(yscrollcommand=scrollbar.set)
+            
+            # SECCIÓN: Información de la cita a cancelar
+            info_section = tk.LabelFrame(scrollable_frame, text="📋 Detalles de la Cita a Cancelar", 
+                                       font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                       padx=20, pady=15)
+            info_section.pack(fill='x', pady=(0, 20))
+            
+            # Grid para información
+            info_grid = tk.Frame(info_section, bg='#F8FAFC')
+            info_grid.pack(fill='x')
+            info_grid.columnconfigure(0, weight=1)
+            info_grid.columnconfigure(1, weight=1)
+            
+            # Fecha y hora
+            fecha_frame = tk.Frame(info_grid, bg='#FEF3C7', relief='solid', bd=1)
+            fecha_frame.grid(row=0, column=0, sticky='ew', padx=(0, 10), pady=5)
+            
+            tk.Label(fecha_frame, text="📅 Fecha:", font=('Arial', 10, 'bold'),
+                    bg='#FEF3C7', fg='#92400E').pack(anchor='w', padx=10, pady=(8, 2))
+            tk.Label(fecha_frame, text=fecha, font=('Arial', 12, 'bold'),
+                    bg='#FEF3C7', fg='#1E3A8A').pack(anchor='w', padx=10, pady=(0, 8))
+            
+            hora_frame = tk.Frame(info_grid, bg='#FEF3C7', relief='solid', bd=1)
+            hora_frame.grid(row=0, column=1, sticky='ew', padx=(10, 0), pady=5)
+            
+            tk.Label(hora_frame, text="🕐 Hora:", font=('Arial', 10, 'bold'),
+                    bg='#FEF3C7', fg='#92400E').pack(anchor='w', padx=10, pady=(8, 2))
+            tk.Label(hora_frame, text=hora, font=('Arial', 12, 'bold'),
+                    bg='#FEF3C7', fg='#1E3A8A').pack(anchor='w', padx=10, pady=(0, 8))
+            
+            # Doctor
+            doctor_frame = tk.Frame(info_section, bg='#E8F6F3', relief='solid', bd=1)
+            doctor_frame.pack(fill='x', pady=(10, 5))
+            
+            tk.Label(doctor_frame, text="👨‍⚕️ Doctor:", font=('Arial', 10, 'bold'),
+                    bg='#E8F6F3', fg='#0D7377').pack(anchor='w', padx=15, pady=(8, 2))
+            tk.Label(doctor_frame, text=doctor, font=('Arial', 12, 'bold'),
+                    bg='#E8F6F3', fg='#16A085').pack(anchor='w', padx=15, pady=(0, 8))
+            
+            # Motivo actual
+            motivo_frame = tk.Frame(info_section, bg='#F0F9FF', relief='solid', bd=1)
+            motivo_frame.pack(fill='x', pady=(5, 0))
+            
+            tk.Label(motivo_frame, text="� Motivo de la Consulta:", font=('Arial', 10, 'bold'),
+                    bg='#F0F9FF', fg='#1E40AF').pack(anchor='w', padx=15, pady=(8, 2))
+            tk.Label(motivo_frame, text=motivo, font=('Arial', 11),
+                    bg='#F0F9FF', fg='#1E3A8A', wraplength=500).pack(anchor='w', padx=15, pady=(0, 8))
+            
+            # SECCIÓN: Motivo de cancelación
+            cancel_section = tk.LabelFrame(scrollable_frame, text="❓ Motivo de Cancelación", 
+                                         font=('Arial', 12, 'bold'), bg='#F8FAFC', fg='#1E3A8A',
+                                         padx=20, pady=15)
+            cancel_section.pack(fill='x', pady=(0, 20))
+            
+            tk.Label(cancel_section, text="Por favor seleccione el motivo de la cancelación:", 
+                    font=('Arial', 11), bg='#F8FAFC', fg='#64748B').pack(anchor='w', pady=(5, 10))
+            
+            # Variable para motivo
+            motivo_cancel_var = tk.StringVar()
+            
+            # Opciones de motivo predefinidas
+            motivos_frame = tk.Frame(cancel_section, bg='#F8FAFC')
+            motivos_frame.pack(fill='x', pady=(0, 15))
+            
+            motivos_opciones = [
+                "Problema de salud que impide asistir",
+                "Cambio en horario de trabajo",
+                "Emergencia familiar",
+                "Viaje imprevisto",
+                "Problemas de transporte",
+                "Conflicto con otra cita médica",
+                "Recuperación completa (ya no necesito la consulta)",
+                "Otro motivo"
+            ]
+            
+            for motivo_op in motivos_opciones:
+                tk.Radiobutton(motivos_frame, text=motivo_op, variable=motivo_cancel_var, value=motivo_op,
+                              bg='#F8FAFC', font=('Arial', 10), anchor='w').pack(anchor='w', pady=2)
+            
+            # Campo de texto para "Otro motivo"
+            tk.Label(cancel_section, text="Si seleccionó 'Otro motivo', especifique:", 
+                    font=('Arial', 10, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w', pady=(15, 2))
+            
+            otro_motivo_text = tk.Text(cancel_section, height=3, font=('Arial', 11),
+                                     relief='solid', bd=2, bg='white', wrap='word')
+            otro_motivo_text.pack(fill='x', pady=(0, 5))
+            
+            tk.Label(cancel_section, text="Detalle adicional sobre la cancelación (opcional)", 
+                    font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+            
+            # SECCIÓN: Advertencias importantes
+            warning_section = tk.Frame(scrollable_frame, bg='#FEF2F2', relief='solid', bd=2)
+            warning_section.pack(fill='x', pady=(0, 20))
+            
+            warning_content = tk.Frame(warning_section, bg='#FEF2F2')
+            warning_content.pack(fill='x', padx=15, pady=12)
+            
+            tk.Label(warning_content, text="⚠️ IMPORTANTE - POLÍTICA DE CANCELACIÓN:", 
+                    font=('Arial', 11, 'bold'), bg='#FEF2F2', fg='#DC2626').pack(anchor='w')
+            
+            warning_text = ("• Las cancelaciones deben realizarse con al menos 24 horas de anticipación\n"
+                          "• Cancelaciones tardías pueden incurrir en cargos\n"
+                          "• Esta acción no se puede deshacer una vez confirmada\n"
+                          "• Para reprogramar, deberá agendar una nueva cita\n"
+                          "• Se enviará notificación de cancelación al doctor")
+            
+            tk.Label(warning_content, text=warning_text, 
+                    font=('Arial', 9), bg='#FEF2F2', fg='#DC2626',
+                    justify='left').pack(anchor='w', pady=(5, 0))
+            
+            # Función para confirmar cancelación
+            def confirm_cancellation():
+                try:
+                    # Validar que se haya seleccionado un motivo
+                    if not motivo_cancel_var.get():
+                        messagebox.showerror("Error", "Debe seleccionar un motivo de cancelación")
+                        return
+                    
+                    # Obtener motivo final
+                    motivo_final = motivo_cancel_var.get()
+                    if motivo_final == "Otro motivo":
+                        otro_texto = otro_motivo_text.get('1.0', 'end-1c').strip()
+                        if not otro_texto:
+                            messagebox.showerror("Error", "Debe especificar el motivo en el campo de texto")
+                            return
+                        motivo_final = f"Otro motivo: {otro_texto}"
+                    else:
+                        # Agregar detalles adicionales si los hay
+                        otro_texto = otro_motivo_text.get('1.0', 'end-1c').strip()
+                        if otro_texto:
+                            motivo_final += f" - Detalles: {otro_texto}"
+                    
+                    # Confirmación final
+                    if messagebox.askyesno("Confirmar Cancelación", 
+                                         f"¿Está seguro que desea cancelar la cita?\n\n"
+                                         f"Fecha: {fecha}\n"
+                                         f"Hora: {hora}\n"
+                                         f"Doctor: {doctor}\n\n"
+                                         f"Motivo: {motivo_final}\n\n"
+                                         f"Esta acción no se puede deshacer."):
+                        
+                        # Actualizar estado en la base de datos
+                        if not self.db_manager.cancel_appointment_with_reason(appt_id, motivo_final):
+                            messagebox.showerror("Error", "No se pudo cancelar la cita. Intente nuevamente.")
+                            return
+                        
+                        messagebox.showinfo("Cancelación Exitosa", 
+                                          "✅ La cita ha sido cancelada correctamente.\n\n"
+                                          "Se ha enviado notificación al doctor.")
+                        cancel_window.destroy()
+                        self.load_patient_appointments()  # Recargar lista
+                        
+                except Exception as e:
+                    messagebox.showerror("Error", f"Error cancelando la cita: {str(e)}")
+            
+            # Pack del canvas y scrollbar
+            canvas.pack(side="left", fill="both", expand=True)
+            scrollbar.pack(side="right", fill="y")
+            
+            # Configurar scroll con rueda del mouse
+            canvas.bind("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+            
+            # Panel de botones
+            buttons_frame = tk.Frame(cancel_window, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', padx=25, pady=(0, 25))
+            
+            # Botones con mejor diseño
+            tk.Button(buttons_frame, text="↩️ Volver", 
+                     command=cancel_window.destroy,
+                     bg='#95A5A6', fg='white', font=('Arial', 12, 'bold'),
+                     relief='flat', padx=25, pady=12, cursor='hand2').pack(side='right', padx=(10, 0))
+            
+            tk.Button(buttons_frame, text="❌ Confirmar Cancelación", 
+                     command=confirm_cancellation,
+                     bg='#E74C3C', fg='white', font=('Arial', 12, 'bold'),
+                     relief='flat', padx=25, pady=12, cursor='hand2').pack(side='right')
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al abrir formulario de cancelación: {str(e)}")
+            print(f"Error en cancel_my_appointment: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def create_no_data_placeholder(self):
+        """Crear placeholder cuando no hay datos - más compacto"""
+        try:
+            # Limpiar frame
+            for widget in self.scrollable_history_frame.winfo_children():
+                widget.destroy()
+            
+            # Contenedor principal más compacto
+            placeholder_container = tk.Frame(self.scrollable_history_frame, bg='white', relief='solid', bd=1)
+            placeholder_container.pack(fill='x', padx=20, pady=20)
+            
+            # Contenido del placeholder
+            content_frame = tk.Frame(placeholder_container, bg='white')
+            content_frame.pack(fill='x', padx=30, pady=20)
+            
+            # Icono y mensaje más compacto
+            tk.Label(content_frame, text="📋", font=('Arial', 32), 
+                    bg='white', fg='#CBD5E1').pack(pady=(10, 5))
+            tk.Label(content_frame, text="No hay registros en tu historial médico", 
+                    font=('Arial', 14, 'bold'), bg='white', fg='#64748B').pack()
+            tk.Label(content_frame, text="Cuando tengas consultas médicas, aparecerán aquí", 
+                    font=('Arial', 11), bg='white', fg='#9CA3AF').pack(pady=(5, 10))
+            
+            # Botón para agendar cita
+            tk.Button(content_frame, text="📅 Agendar Nueva Cita", 
+                     command=self.open_patient_schedule_dialog,
+                     bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=20, pady=8, cursor='hand2').pack(pady=(10, 5))
+            
+        except Exception as e:
+            print(f"Error creando placeholder: {e}")
+    
+    def create_history_card(self, parent, record_data, row_num):
+        """Crear una carta moderna para cada registro del historial"""
+        try:
+            # Frame principal de la carta con sombra visual
+            card_frame = tk.Frame(parent, bg='white', relief='solid', bd=1)
+            card_frame.pack(fill='x', padx=20, pady=10)
+            
+            # Determinar color del borde según estado
+            status = record_data.get('estado', 'Completado')
+            border_colors = {
+                'Completado': '#059669',
+                'En proceso': '#D97706', 
+                'Pendiente': '#DC2626',
+                'Cancelado': '#6B7280'
+            }
+            border_color = border_colors.get(status, '#059669')
+            
+            # Borde superior coloreado
+            top_border = tk.Frame(card_frame, bg=border_color, height=4)
+            top_border.pack(fill='x')
+            
+            # Header de la carta
+            header_frame = tk.Frame(card_frame, bg='#F8FAFC')
+            header_frame.pack(fill='x', padx=15, pady=(10, 0))
+            
+            # Lado izquierdo del header - Fecha y hora
+            header_left = tk.Frame(header_frame, bg='#F8FAFC')
+            header_left.pack(side='left', fill='y')
+            
+            # Fecha grande y prominente
+            fecha_str = record_data.get('fecha', 'Fecha no disponible')
+            tk.Label(header_left, text=fecha_str, 
+                    font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(anchor='w')
+            
+            # Información del doctor
+            doctor_info = f"Dr. {record_data.get('doctor_nombre', '')} {record_data.get('doctor_apellido', '')}"
+            especialidad = record_data.get('especialidad', 'Medicina General')
+            tk.Label(header_left, text=f"{doctor_info} • {especialidad}", 
+                    font=('Arial', 10), bg='#F8FAFC', fg='#64748B').pack(anchor='w')
+            
+            # Lado derecho del header - Estado
+            header_right = tk.Frame(header_frame, bg='#F8FAFC')
+            header_right.pack(side='right', fill='y')
+            
+            # Badge de estado
+            status_colors = {
+                'Completado': ('#059669', '#ECFDF5'),
+                'En proceso': ('#D97706', '#FFFBEB'),
+                'Pendiente': ('#DC2626', '#FEF2F2'),
+                'Cancelado': ('#6B7280', '#F9FAFB')
+            }
+            bg_color, text_color = status_colors.get(status, ('#059669', '#ECFDF5'))
+            
+            status_badge = tk.Frame(header_right, bg=text_color, relief='solid', bd=1)
+            status_badge.pack(pady=5)
+            
+            tk.Label(status_badge, text=f"● {status}", 
+                    font=('Arial', 9, 'bold'), bg=text_color, fg=bg_color, 
+                    padx=12, pady=4).pack()
+            
+            # Contenido principal de la carta - Tabla de información
+            content_frame = tk.Frame(card_frame, bg='white')
+            content_frame.pack(fill='x', padx=15, pady=10)
+            
+            # Crear tabla de información en dos columnas
+            info_table = tk.Frame(content_frame, bg='white')
+            info_table.pack(fill='x')
+            
+            # Datos para mostrar en tabla con más información relevante
+            table_data = [
+                ('🎯 Motivo', record_data.get('motivo_consulta', 'No especificado')[:60] + '...' if len(record_data.get('motivo_consulta', '')) > 60 else record_data.get('motivo_consulta', 'No especificado'), '#7C3AED'),
+                ('🩺 Diagnóstico', record_data.get('diagnostico', 'No especificado')[:60] + '...' if len(record_data.get('diagnostico', '')) > 60 else record_data.get('diagnostico', 'No especificado'), '#1E3A8A'),
+                ('� Tratamiento', record_data.get('tratamiento', 'No especificado')[:60] + '...' if len(record_data.get('tratamiento', '')) > 60 else record_data.get('tratamiento', 'No especificado'), '#059669'),
+                ('📝 Observaciones', record_data.get('observaciones', 'Sin observaciones')[:80] + '...' if len(record_data.get('observaciones', '')) > 80 else record_data.get('observaciones', 'Sin observaciones'), '#DC2626')
+            ]
+            
+            # Crear filas de la tabla
+            for i, (label, value, color) in enumerate(table_data):
+                row_frame = tk.Frame(info_table, bg='white')
+                row_frame.pack(fill='x', pady=3)
+                
+                # Label
+                label_frame = tk.Frame(row_frame, bg='white', width=120)
+                label_frame.pack(side='left', fill='y')
+                label_frame.pack_propagate(False)
+                
+                tk.Label(label_frame, text=label, 
+                        font=('Arial', 10, 'bold'), bg='white', fg='#374151', 
+                        anchor='w').pack(fill='both', padx=(0, 10))
+                
+                # Valor
+                value_frame = tk.Frame(row_frame, bg='white')
+                value_frame.pack(side='left', fill='both', expand=True)
+                
+                tk.Label(value_frame, text=value, 
+                        font=('Arial', 10), bg='white', fg=color, 
+                        anchor='w', wraplength=400, justify='left').pack(fill='both')
+            
+            # Sección de signos vitales (si están disponibles y no son valores por defecto)
+            has_vitals = any([
+                record_data.get('presion_arterial') and record_data.get('presion_arterial') not in ['No medida', 'No registrada'],
+                record_data.get('peso') and record_data.get('peso') != 'No registrado',
+                record_data.get('temperatura') and record_data.get('temperatura') not in ['No medida', 'No registrada'],
+                record_data.get('frecuencia_cardiaca') and record_data.get('frecuencia_cardiaca') not in ['No medida', 'No registrada']
+            ])
+            
+            if has_vitals:
+                # Separador
+                separator = tk.Frame(content_frame, bg='#E5E7EB', height=1)
+                separator.pack(fill='x', pady=(10, 5))
+                
+                # Título de signos vitales
+                vitals_title = tk.Frame(content_frame, bg='white')
+                vitals_title.pack(fill='x', pady=(5, 5))
+                tk.Label(vitals_title, text="💓 Signos Vitales:", 
+                        font=('Arial', 10, 'bold'), bg='white', fg='#374151').pack(side='left')
+                
+                # Grid de signos vitales
+                vitals_grid = tk.Frame(content_frame, bg='white')
+                vitals_grid.pack(fill='x')
+                
+                vitals_data = []
+                if record_data.get('presion_arterial') and record_data.get('presion_arterial') != 'No medida':
+                    vitals_data.append(('🩸 PA:', record_data.get('presion_arterial')))
+                if record_data.get('peso') and record_data.get('peso') != 'No registrado':
+                    vitals_data.append(('⚖️ Peso:', record_data.get('peso')))
+                if record_data.get('temperatura') and record_data.get('temperatura') != 'No medida':
+                    vitals_data.append(('🌡️ Temp:', record_data.get('temperatura')))
+                if record_data.get('frecuencia_cardiaca') and record_data.get('frecuencia_cardiaca') != 'No medida':
+                    vitals_data.append(('💓 FC:', record_data.get('frecuencia_cardiaca')))
+                
+                # Mostrar signos vitales en una fila compacta
+                vitals_row = tk.Frame(vitals_grid, bg='white')
+                vitals_row.pack(fill='x', pady=2)
+                
+                for i, (label, value) in enumerate(vitals_data):
+                    if i > 0:
+                        tk.Label(vitals_row, text="•", font=('Arial', 8), 
+                                bg='white', fg='#9CA3AF').pack(side='left', padx=(5, 5))
+                    
+                    vital_item = tk.Frame(vitals_row, bg='white')
+                    vital_item.pack(side='left')
+                    
+                    tk.Label(vital_item, text=label, font=('Arial', 8, 'bold'), 
+                            bg='white', fg='#6B7280').pack(side='left')
+                    tk.Label(vital_item, text=value, font=('Arial', 8), 
+                            bg='white', fg='#059669').pack(side='left', padx=(2, 0))
+            
+            # Footer de la carta con acciones
+            footer_frame = tk.Frame(card_frame, bg='#F8FAFC')
+            footer_frame.pack(fill='x', padx=15, pady=(5, 10))
+            
+            # Botones de acción
+            actions_frame = tk.Frame(footer_frame, bg='#F8FAFC')
+            actions_frame.pack(side='right')
+            
+            # Botón Ver Detalles
+            detail_btn = tk.Button(actions_frame, text="👁️ Ver Detalles", 
+                                  command=lambda: self.view_history_detail_card(record_data),
+                                  bg='#0B5394', fg='white', font=('Arial', 9, 'bold'),
+                                  relief='flat', padx=12, pady=6, cursor='hand2')
+            detail_btn.pack(side='right', padx=(5, 0))
+            
+            # Botón Exportar PDF (si hay observaciones)
+            if record_data.get('observaciones') and len(record_data.get('observaciones', '')) > 0:
+                pdf_btn = tk.Button(actions_frame, text="📄 PDF", 
+                                   command=lambda: self.export_single_record_pdf(record_data),
+                                   bg='#DC2626', fg='white', font=('Arial', 9, 'bold'),
+                                   relief='flat', padx=12, pady=6, cursor='hand2')
+                pdf_btn.pack(side='right', padx=(5, 0))
+            
+            # Información adicional en el footer
+            footer_info = tk.Frame(footer_frame, bg='#F8FAFC')
+            footer_info.pack(side='left', fill='y')
+            
+            # ID del registro (pequeño)
+            if 'id' in record_data:
+                tk.Label(footer_info, text=f"ID: {record_data['id']}", 
+                        font=('Arial', 8), bg='#F8FAFC', fg='#9CA3AF').pack(anchor='w')
+            
+            # Hacer la carta clickeable
+            def on_card_click(event):
+                self.view_history_detail_card(record_data)
+            
+            # Bind click a todos los elementos de la carta
+            for widget in [card_frame, header_frame, content_frame]:
+                widget.bind("<Button-1>", on_card_click)
+                widget.configure(cursor='hand2')
+            
+            return card_frame
+            
+        except Exception as e:
+            print(f"Error creando carta de historial: {e}")
+            return None
+    
+    def view_history_detail_card(self, record_data):
+        """Ver detalles completos de un registro desde una carta"""
+        try:
+            # Crear ventana de detalles
+            detail_window = tk.Toplevel(self.root)
+            detail_window.title(f"Detalle Médico - {record_data.get('fecha', 'Sin fecha')}")
+            detail_window.geometry("800x700")
+            detail_window.configure(bg='#F8FAFC')
+            detail_window.transient(self.root)
+            detail_window.grab_set()
+            
+            # Header de la ventana
+            header = tk.Frame(detail_window, bg='#1E3A8A', height=80)
+            header.pack(fill='x')
+            header.pack_propagate(False)
+            
+            header_content = tk.Frame(header, bg='#1E3A8A')
+            header_content.pack(expand=True, fill='both', padx=20, pady=15)
+            
+            tk.Label(header_content, text="📋 Detalle Completo del Registro Médico", 
+                    font=('Arial', 16, 'bold'), bg='#1E3A8A', fg='white').pack(side='left')
+            
+            # Botón cerrar
+            tk.Button(header_content, text="✕ Cerrar", 
+                     command=detail_window.destroy,
+                     bg='#DC2626', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=15, pady=5).pack(side='right')
+            
+            # Contenido principal con scroll
+            main_frame = tk.Frame(detail_window, bg='#F8FAFC')
+            main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+            
+            # Canvas para scroll
+            canvas = tk.Canvas(main_frame, bg='#F8FAFC', highlightthickness=0)
+            scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+            scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+            
+            scrollable_frame.bind(
+                "<Configure>",
+                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            )
+            
+            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+            canvas.configure(yscrollcommand=scrollbar.set)
+            
+            # Información básica
+            basic_info = tk.LabelFrame(scrollable_frame, text="📊 Información Básica", 
+                                      font=('Arial', 12, 'bold'), bg='white', padx=20, pady=15)
+            basic_info.pack(fill='x', pady=(0, 15))
+            
+            basic_data = [
+                ("📅 Fecha de Consulta:", record_data.get('fecha', 'No disponible')),
+                ("👨‍⚕️ Doctor:", f"Dr. {record_data.get('doctor_nombre', '')} {record_data.get('doctor_apellido', '')}"),
+                ("🏥 Especialidad:", record_data.get('especialidad', 'Medicina General')),
+                ("📊 Estado:", record_data.get('estado', 'Completado')),
+                ("🆔 ID Registro:", str(record_data.get('id', 'N/A')))
+            ]
+            
+            for label, value in basic_data:
+                row = tk.Frame(basic_info, bg='white')
+                row.pack(fill='x', pady=5)
+                tk.Label(row, text=label, font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151', width=20, anchor='w').pack(side='left')
+                tk.Label(row, text=value, font=('Arial', 11), 
+                        bg='white', fg='#1E3A8A', anchor='w').pack(side='left', padx=(10, 0))
+            
+            # Diagnóstico y Tratamiento
+            medical_info = tk.LabelFrame(scrollable_frame, text="🩺 Información Médica", 
+                                        font=('Arial', 12, 'bold'), bg='white', padx=20, pady=15)
+            medical_info.pack(fill='x', pady=(0, 15))
+            
+            # Diagnóstico
+            diag_frame = tk.Frame(medical_info, bg='white')
+            diag_frame.pack(fill='x', pady=5)
+            tk.Label(diag_frame, text="🔍 Diagnóstico:", font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            tk.Text(diag_frame, height=3, wrap='word', font=('Arial', 10), 
+                   bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+            diag_text = diag_frame.winfo_children()[-1]
+            diag_text.insert('1.0', record_data.get('diagnostico', 'No especificado'))
+            diag_text.configure(state='disabled')
+            
+            # Tratamiento
+            treat_frame = tk.Frame(medical_info, bg='white')
+            treat_frame.pack(fill='x', pady=10)
+            tk.Label(treat_frame, text="💊 Tratamiento:", font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            tk.Text(treat_frame, height=3, wrap='word', font=('Arial', 10), 
+                   bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+            treat_text = treat_frame.winfo_children()[-1]
+            treat_text.insert('1.0', record_data.get('tratamiento', 'No especificado'))
+            treat_text.configure(state='disabled')
+            
+            # Medicamentos
+            med_frame = tk.Frame(medical_info, bg='white')
+            med_frame.pack(fill='x', pady=5)
+            tk.Label(med_frame, text="💉 Medicamentos:", font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            tk.Text(med_frame, height=2, wrap='word', font=('Arial', 10), 
+                   bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+            med_text = med_frame.winfo_children()[-1]
+            med_text.insert('1.0', record_data.get('medicamentos', 'No prescritos'))
+            med_text.configure(state='disabled')
+            
+            # Observaciones del Doctor - Sección expandida
+            if record_data.get('observaciones'):
+                obs_info = tk.LabelFrame(scrollable_frame, text="📝 Observaciones del Doctor", 
+                                        font=('Arial', 12, 'bold'), bg='white', padx=20, pady=15)
+                obs_info.pack(fill='x', pady=(0, 15))
+                
+                obs_text = tk.Text(obs_info, height=6, wrap='word', font=('Arial', 10), 
+                                  bg='#F8FAFC', relief='solid', bd=1)
+                obs_text.pack(fill='both', expand=True)
+                obs_text.insert('1.0', record_data.get('observaciones', ''))
+                obs_text.configure(state='disabled')
+            
+            # Signos Vitales (solo mostrar si hay datos reales)
+            vitals_data = [
+                ("🩸 Presión Arterial:", record_data.get('presion_arterial', 'No registrada')),
+                ("⚖️ Peso:", record_data.get('peso', 'No registrado')),
+                ("📏 Altura:", record_data.get('altura', 'No registrada')),
+                ("🌡️ Temperatura:", record_data.get('temperatura', 'No registrada')),
+                ("💓 Frecuencia Cardíaca:", record_data.get('frecuencia_cardiaca', 'No registrada'))
+            ]
+            
+            # Solo mostrar sección de signos vitales si hay datos útiles
+            has_useful_vitals = any([value not in ['No registrada', 'No registrado', 'No medida'] for _, value in vitals_data])
+            
+            if has_useful_vitals:
+                vitals_info = tk.LabelFrame(scrollable_frame, text="💓 Signos Vitales", 
+                                           font=('Arial', 12, 'bold'), bg='white', padx=20, pady=15)
+                vitals_info.pack(fill='x', pady=(0, 15))
+                
+                vitals_grid = tk.Frame(vitals_info, bg='white')
+                vitals_grid.pack(fill='x')
+                
+                for i, (label, value) in enumerate(vitals_data):
+                    if value not in ['No registrada', 'No registrado', 'No medida']:
+                        row = i // 2
+                        col = i % 2
+                        
+                        vital_frame = tk.Frame(vitals_grid, bg='white')
+                        vital_frame.grid(row=row, column=col, sticky='ew', padx=(0, 20), pady=5)
+                        
+                        tk.Label(vital_frame, text=label, font=('Arial', 10, 'bold'), 
+                                bg='white', fg='#374151', width=18, anchor='w').pack(side='left')
+                        tk.Label(vital_frame, text=value, font=('Arial', 10), 
+                                bg='white', fg='#1E3A8A', anchor='w').pack(side='left', padx=(10, 0))
+                
+                vitals_grid.columnconfigure(0, weight=1)
+                vitals_grid.columnconfigure(1, weight=1)
+            
+            # Información Adicional
+            additional_info = tk.LabelFrame(scrollable_frame, text="📋 Información Adicional", 
+                                          font=('Arial', 12, 'bold'), bg='white', padx=20, pady=15)
+            additional_info.pack(fill='x', pady=(0, 15))
+            
+            # Motivo de consulta
+            if record_data.get('motivo_consulta') and record_data.get('motivo_consulta') != 'No especificado':
+                motivo_frame = tk.Frame(additional_info, bg='white')
+                motivo_frame.pack(fill='x', pady=5)
+                tk.Label(motivo_frame, text="🎯 Motivo de Consulta:", font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(motivo_frame, height=2, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+                motivo_text = motivo_frame.winfo_children()[-1]
+                motivo_text.insert('1.0', record_data.get('motivo_consulta', ''))
+                motivo_text.configure(state='disabled')
+            
+            # Síntomas
+            if record_data.get('sintomas') and record_data.get('sintomas') != 'No registrados':
+                sintomas_frame = tk.Frame(additional_info, bg='white')
+                sintomas_frame.pack(fill='x', pady=5)
+                tk.Label(sintomas_frame, text="🤒 Síntomas Reportados:", font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(sintomas_frame, height=3, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+                sintomas_text = sintomas_frame.winfo_children()[-1]
+                sintomas_text.insert('1.0', record_data.get('sintomas', ''))
+                sintomas_text.configure(state='disabled')
+            
+            # Exámenes solicitados
+            if record_data.get('examenes_solicitados') and record_data.get('examenes_solicitados') not in ['Ninguno', 'No especificado']:
+                examenes_frame = tk.Frame(additional_info, bg='white')
+                examenes_frame.pack(fill='x', pady=5)
+                tk.Label(examenes_frame, text="🔬 Exámenes Solicitados:", font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(examenes_frame, height=2, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+                examenes_text = examenes_frame.winfo_children()[-1]
+                examenes_text.insert('1.0', record_data.get('examenes_solicitados', ''))
+                examenes_text.configure(state='disabled')
+            
+            # Recomendaciones
+            if record_data.get('recomendaciones') and record_data.get('recomendaciones') not in ['Ninguna', 'No especificado']:
+                recom_frame = tk.Frame(additional_info, bg='white')
+                recom_frame.pack(fill='x', pady=5)
+                tk.Label(recom_frame, text="💡 Recomendaciones Médicas:", font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(recom_frame, height=3, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(5, 0))
+                recom_text = recom_frame.winfo_children()[-1]
+                recom_text.insert('1.0', record_data.get('recomendaciones', ''))
+                recom_text.configure(state='disabled')
+            
+            # Próxima cita
+            if record_data.get('proxima_cita') and record_data.get('proxima_cita') not in ['No programada', 'No especificado']:
+                cita_frame = tk.Frame(additional_info, bg='white')
+                cita_frame.pack(fill='x', pady=5)
+                tk.Label(cita_frame, text="📅 Próxima Cita:", font=('Arial', 11, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Label(cita_frame, text=record_data.get('proxima_cita', ''), font=('Arial', 10), 
+                        bg='white', fg='#059669').pack(anchor='w', pady=(5, 0))
+            
+            # Panel de acciones
+            actions_panel = tk.Frame(scrollable_frame, bg='white', relief='solid', bd=1)
+            actions_panel.pack(fill='x', pady=(15, 0))
+            
+            actions_header = tk.Frame(actions_panel, bg='#F1F5F9')
+            actions_header.pack(fill='x')
+            tk.Label(actions_header, text="⚡ Acciones Disponibles", 
+                    font=('Arial', 11, 'bold'), bg='#F1F5F9', fg='#1E3A8A', pady=8).pack()
+            
+            actions_content = tk.Frame(actions_panel, bg='white')
+            actions_content.pack(fill='x', padx=15, pady=10)
+            
+            # Botones de acción
+            action_buttons = [
+                ("📄 Exportar PDF", lambda: self.export_single_record_pdf(record_data), "#DC2626"),
+                ("🖨️ Imprimir", lambda: self.print_single_record(record_data), "#059669"),
+                ("📧 Enviar por Email", lambda: self.email_single_record(record_data), "#7C3AED"),
+                ("📋 Copiar Info", lambda: self.copy_record_to_clipboard(record_data), "#0B5394")
+            ]
+            
+            for text, command, color in action_buttons:
+                btn = tk.Button(actions_content, text=text, command=command,
+                               bg=color, fg='white', font=('Arial', 10, 'bold'),
+                               relief='flat', padx=15, pady=8, cursor='hand2')
+                btn.pack(side='left', padx=(0, 10))
+            
+            # Pack canvas y scrollbar
+            canvas.pack(side="left", fill="both", expand=True)
+            scrollbar.pack(side="right", fill="y")
+            
+            # Bind scroll del mouse
+            def _on_mousewheel(event):
+                canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            canvas.bind_all("<MouseWheel>", _on_mousewheel)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al mostrar detalles: {str(e)}")
+            print(f"Error en view_history_detail_card: {e}")
+    
+    def load_patient_medical_history(self):
+        """Cargar historial médico en la tabla simple"""
+        try:
+            # Query simplificada
+            query = """
+                SELECT 
+                    hm.id,
+                    hm.fecha_consulta,
+                    u.nombre || ' ' || u.apellido as doctor_nombre,
+                    COALESCE(d.especialidad, 'Medicina General') as especialidad,
+                    COALESCE(hm.diagnostico, 'No especificado') as diagnostico,
+                    COALESCE(hm.tratamiento, 'No especificado') as tratamiento,
+                    COALESCE(hm.observaciones, '') as observaciones,
+                    COALESCE(hm.medicamentos, '') as medicamentos
+                FROM historial_medico hm
+                {search_join}
+                JOIN usuarios u ON u.id = hm.doctor_id
+                LEFT JOIN doctores d ON d.id = hm.doctor_id
+                WHERE hm.paciente_id = ?
+            """
+            
+            params = [self.current_user.id]
+            order_by = "hm.fecha_consulta DESC"
+            
+            # Aplicar filtro de búsqueda (FTS5: sin acentos, por relevancia)
+            search = None
+            if hasattr(self, 'history_search_var') and self.history_search_var.get():
+                search = self.db_manager.medical_search_clause(self.history_search_var.get(), by_patient=True)
+            if search is not None:
+                query = query.format(search_join=search.join) + f" AND {search.where}"
+                params.extend(search.params)
+                order_by = search.order_by
+            else:
+                query = query.format(search_join="")
+            
+            query += f" ORDER BY {order_by}, hm.id DESC"
+            
+            # Actualizar información
+            def show_total(total_records):
+                self.history_info_label.config(
+                    text=f"📋 Total: {total_records} registros encontrados - Doble clic para ver detalles completos"
+                )
+            
+            self.medical_history_tree.set_source(QuerySource(self.db_manager, query, params),
+                                                 on_loaded=show_total)
+            
+        except Exception as e:
+            print(f"Error cargando historial: {e}")
+            messagebox.showerror("Error", f"Error al cargar el historial médico: {str(e)}")
+    
+    def format_medical_history_row(self, record, index):
+        """Valores de una fila del historial médico (fecha formateada y textos truncados)"""
+        # Formatear fecha
+        fecha_str = record[1]
+        try:
+            if isinstance(fecha_str, str) and len(fecha_str) >= 10:
+                fecha_formatted = datetime.strptime(fecha_str[:10], '%Y-%m-%d').strftime('%d/%m/%Y')
+            else:
+                fecha_formatted = str(fecha_str)
+        except ValueError:
+            fecha_formatted = str(fecha_str)
+        
+        # Truncar textos largos
+        diagnostico = record[4][:40] + '...' if len(record[4]) > 40 else record[4]
+        tratamiento = record[5][:35] + '...' if len(record[5]) > 35 else record[5]
+        
+        return (
+            fecha_formatted,
+            record[2],  # doctor_nombre
+            record[3],  # especialidad
+            diagnostico,
+            tratamiento
+        ), ()
+    
+    def filter_medical_history(self, event=None):
+        """Aplicar filtros a la tabla de historial médico del paciente"""
+        self.load_patient_medical_history()
+    
+    def create_patient_billing(self, parent):
+        """Mis facturas y pagos - Vista simplificada con tabla y tarjetas laterales"""
+        # Frame principal
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True)
+        
+        # Header simple
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=70)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=30, pady=15)
+        
+        tk.Label(header_content, text="💰 Mis Facturas", 
+                font=('Arial', 18, 'bold'), bg='#1E3A8A', fg='white').pack(side='left')
+        
+        user_info = f"Paciente: {self.current_user.nombre} {self.current_user.apellido}"
+        tk.Label(header_content, text=user_info, 
+                font=('Arial', 11), bg='#1E3A8A', fg='#CBD5E1').pack(side='right')
+        
+        # Contenido principal
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True, padx=30, pady=20)
+        
+        # Contenedor principal horizontal (tarjetas laterales + tabla)
+        main_container = tk.Frame(content_frame, bg='#F8FAFC')
+        main_container.pack(fill='both', expand=True)
+        
+        # Panel lateral con tarjetas de estado
+        sidebar_frame = tk.Frame(main_container, bg='#F8FAFC', width=250)
+        sidebar_frame.pack(side='left', fill='y', padx=(0, 20))
+        sidebar_frame.pack_propagate(False)
+        
+        # Título del sidebar
+        tk.Label(sidebar_frame, text="📊 Estado de Facturas", 
+                font=('Arial', 14, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(0, 15))
+        
+        # Crear las tarjetas de estado
+        self.create_billing_status_cards(sidebar_frame)
+        
+        # Panel principal con tabla
+        table_frame = tk.Frame(main_container, bg='white', relief='solid', bd=1)
+        table_frame.pack(side='right', fill='both', expand=True)
+        
+        # Header de la tabla
+        table_header = tk.Frame(table_frame, bg='#1E3A8A', height=40)
+        table_header.pack(fill='x')
+        table_header.pack_propagate(False)
+        
+        tk.Label(table_header, text="💰 Mis Facturas - Doble clic para ver detalles", 
+                font=('Arial', 12, 'bold'), bg='#1E3A8A', fg='white').pack(expand=True)
+        
+        # Panel de filtros simple
+        filters_frame = tk.Frame(table_frame, bg='white')
+        filters_frame.pack(fill='x', padx=15, pady=10)
+        
+        # Búsqueda simple
+        search_row = tk.Frame(filters_frame, bg='white')
+        search_row.pack(fill='x')
+        
+        tk.Label(search_row, text="� Buscar:", font=('Arial', 10, 'bold'), 
+                bg='white', fg='#374151').grid(row=0, column=0, sticky='w', padx=(0, 10))
+        
+        self.billing_search_var = tk.StringVar()
+        search_entry = tk.Entry(search_row, textvariable=self.billing_search_var, 
+                               font=('Arial', 10), width=25)
+        search_entry.grid(row=0, column=1, sticky='w', padx=(0, 20))
+        search_entry.bind('<KeyRelease>', lambda e: self.load_patient_billing_data())
+        
+        # Filtro por estado
+        tk.Label(search_row, text="Estado:", font=('Arial', 10, 'bold'), 
+                bg='white', fg='#374151').grid(row=0, column=2, sticky='w', padx=(0, 10))
+        
+        self.billing_status_filter = ttk.Combobox(search_row, 
+                                                values=['Todos', 'pendiente', 'pagado', 'vencido'], 
+                                                state='readonly', width=15, font=('Arial', 9))
+        self.billing_status_filter.set('Todos')
+        self.billing_status_filter.grid(row=0, column=3, sticky='w', padx=(0, 20))
+        self.billing_status_filter.bind('<<ComboboxSelected>>', lambda e: self.load_patient_billing_data())
+        
+        # Botón actualizar
+        tk.Button(search_row, text="� Actualizar", 
+                 command=self.load_patient_billing_data,
+                 bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                 relief='flat', padx=15, pady=5).grid(row=0, column=4, sticky='w')
+        
+        # Contenedor de la tabla con scrollbars
+        table_container = tk.Frame(table_frame, bg='white')
+        table_container.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        # Crear Treeview para facturas
+        columns = ('Número', 'Fecha', 'Servicio', 'Monto', 'Estado')
+        self.patient_billing_tree = ttk.Treeview(table_container, columns=columns, show='headings', height=12)
+        
+        # Configurar columnas
+        column_widths = {
+            'Número': 120,
+            'Fecha': 100,
+            'Servicio': 200,
+            'Monto': 120,
+            'Estado': 100
+        }
+        
+        for col in columns:
+            self.patient_billing_tree.heading(col, text=col)
+            self.patient_billing_tree.column(col, width=column_widths[col], anchor='center')
+        
+        # Scrollbars
+        v_scrollbar = ttk.Scrollbar(table_container, orient='vertical', command=self.patient_billing_tree.yview)
+        h_scrollbar = ttk.Scrollbar(table_container, orient='horizontal', command=self.patient_billing_tree.xview)
+        self.patient_billing_tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        
+        # Layout
+        self.patient_billing_tree.grid(row=0, column=0, sticky='nsew')
+        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        
+        table_container.grid_rowconfigure(0, weight=1)
+        table_container.grid_columnconfigure(0, weight=1)
+        
+        # Eventos de la tabla
+        self.patient_billing_tree.bind('<Double-1>', self.view_billing_detail_simple)
+        
+        # Panel de información
+        info_frame = tk.Frame(table_frame, bg='white', height=50)
+        info_frame.pack(fill='x', padx=15, pady=(0, 15))
+        info_frame.pack_propagate(False)
+        
+        self.billing_info_label = tk.Label(info_frame, 
+                                         text="� Consejo: Haga doble clic en una factura para ver los detalles completos", 
+                                         font=('Arial', 10, 'italic'), bg='white', fg='#64748B')
+        self.billing_info_label.pack(expand=True)
+        
+        # Diccionario para almacenar IDs de facturas
+        self.billing_record_ids = {}
+        
+        # Cargar datos
+        self.load_patient_billing_data()
+    
+    def create_billing_status_cards(self, parent):
+        """Crear tarjetas de estado en el panel lateral"""
+        try:
+            # Obtener estadísticas de facturas
+            billing_stats = self.get_billing_statistics()
+            
+            # Configuración de las tarjetas
+            cards_config = [
+                {
+                    'title': 'Pendientes',
+                    'value': str(billing_stats.get('pendientes', 0)),
+                    'icon': '⏳',
+                    'color': '#E74C3C',
+                    'bg_color': '#FADBD8'
+                },
+                {
+                    'title': 'Pagadas',
+                    'value': str(billing_stats.get('pagadas', 0)),
+                    'icon': '✅',
+                    'color': '#27AE60',
+                    'bg_color': '#D5F5E3'
+                },
+                {
+                    'title': 'Vencidas',
+                    'value': str(billing_stats.get('vencidas', 0)),
+                    'icon': '🚨',
+                    'color': '#8E44AD',
+                    'bg_color': '#E8DAEF'
+                },
+                {
+                    'title': 'Total',
+                    'value': f"RD${billing_stats.get('total_monto', 0):,.0f}",
+                    'icon': '💰',
+                    'color': '#3498DB',
+                    'bg_color': '#D6EAF8'
+                }
+            ]
+            
+            # Crear cada tarjeta
+            for card in cards_config:
+                self.create_status_card(parent, card)
+                
+        except Exception as e:
+            # Tarjeta de error
+            error_card = tk.Frame(parent, bg='#FADBD8', relief='solid', bd=1, height=80)
+            error_card.pack(fill='x', pady=5)
+            error_card.pack_propagate(False)
+            
+            tk.Label(error_card, text="❌ Error cargando estadísticas", 
+                    font=('Arial', 10), bg='#FADBD8', fg='#E74C3C').pack(expand=True)
+    
+    def create_status_card(self, parent, config):
+        """Crear una tarjeta individual de estado"""
+        # Frame de la tarjeta
+        card_frame = tk.Frame(parent, bg=config['bg_color'], relief='solid', bd=1, height=80)
+        card_frame.pack(fill='x', pady=5)
+        card_frame.pack_propagate(False)
+        
+        # Contenido de la tarjeta
+        content_frame = tk.Frame(card_frame, bg=config['bg_color'])
+        content_frame.pack(expand=True, fill='both', padx=15, pady=10)
+        
+        # Fila superior con ícono y valor
+        top_row = tk.Frame(content_frame, bg=config['bg_color'])
+        top_row.pack(fill='x')
+        
+        # Ícono
+        tk.Label(top_row, text=config['icon'], font=('Arial', 18), 
+                bg=config['bg_color'], fg=config['color']).pack(side='left')
+        
+        # Valor
+        tk.Label(top_row, text=config['value'], font=('Arial', 16, 'bold'), 
+                bg=config['bg_color'], fg=config['color']).pack(side='right')
+        
+        # Título
+        tk.Label(content_frame, text=config['title'], font=('Arial', 11), 
+                bg=config['bg_color'], fg='#2C3E50').pack(anchor='w', pady=(5, 0))
+    
+    def get_billing_statistics(self):
+        """Obtener estadísticas de facturación del paciente actual"""
+        try:
+            if not self.current_user:
+                return {'pendientes': 0, 'pagadas': 0, 'vencidas': 0, 'total_monto': 0}
+            
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Obtener estadísticas
+            cursor.execute("""
+                SELECT 
+                    COUNT(CASE WHEN estado = 'pendiente' THEN 1 END) as pendientes,
+                    COUNT(CASE WHEN estado = 'pagado' THEN 1 END) as pagadas,
+                    COUNT(CASE WHEN estado = 'vencido' THEN 1 END) as vencidas,
+                    COALESCE(SUM(monto), 0) as total_monto
+                FROM facturas 
+                WHERE paciente_id = ?
+            """, (self.current_user.id,))
+            
+            result = cursor.fetchone()
+            
+            stats = {
+                'pendientes': result[0] if result[0] else 0,
+                'pagadas': result[1] if result[1] else 0,
+                'vencidas': result[2] if result[2] else 0,
+                'total_monto': result[3] if result[3] else 0
+            }
+            
+            cursor.close()
+            conn.close()
+            
+            return stats
+            
+        except Exception as e:
+            print(f"Error obteniendo estadísticas de facturación: {e}")
+            return {'pendientes': 0, 'pagadas': 0, 'vencidas': 0, 'total_monto': 0}
+    
+    def load_patient_billing_data(self, period_filter='Todos', status_filter='Todos'):
+        """Cargar facturas del paciente actual en la tabla simplificada"""
+        try:
+            if not self.current_user or not hasattr(self, 'patient_billing_tree'):
+                return
+            
+            # Limpiar tabla
+            for item in self.patient_billing_tree.get_children():
+                self.patient_billing_tree.delete(item)
+            
+            # Limpiar diccionario de IDs
+            self.billing_record_ids = {}
+            
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Query simplificada
+            query = """
+                SELECT 
+                    f.id,
+                    f.numero_factura,
+                    f.fecha_creacion,
+                    COALESCE(f.concepto, 'Consulta médica') as concepto,
+                    f.monto,
+                    f.estado,
+                    f.fecha_vencimiento
+                FROM facturas f
+                WHERE f.paciente_id = ?
+            """
+            
+            params = [self.current_user.id]
+            
+            # Aplicar filtro de búsqueda
+            if hasattr(self, 'billing_search_var') and self.billing_search_var.get():
+                search_text = f"%{self.billing_search_var.get()}%"
+                query += " AND (f.numero_factura LIKE ? OR f.concepto LIKE ?)"
+                params.extend([search_text, search_text])
+            
+            # Aplicar filtro de estado
+            if hasattr(self, 'billing_status_filter') and self.billing_status_filter.get() != 'Todos':
+                query += " AND f.estado = ?"
+                params.append(self.billing_status_filter.get())
+            
+            query += " ORDER BY f.fecha_creacion DESC"
+            
+            cursor.execute(query, params)
+            records = cursor.fetchall()
+            
+            # Insertar datos en la tabla
+            for record in records:
+                try:
+                    # Formatear fecha
+                    fecha_str = record[2]
+                    if isinstance(fecha_str, str) and len(fecha_str) >= 10:
+                        from datetime import datetime
+                        fecha_obj = datetime.strptime(fecha_str[:10], '%Y-%m-%d')
+                        fecha_formatted = fecha_obj.strftime('%d/%m/%Y')
+                    else:
+                        fecha_formatted = str(fecha_str)
+                    
+                    # Formatear monto
+                    monto = f"RD${record[4]:,.0f}" if record[4] else "RD$0"
+                    
+                    # Truncar concepto si es muy largo
+                    concepto = record[3][:30] + '...' if len(record[3]) > 30 else record[3]
+                    
+                    # Insertar en la tabla
+                    item_id = self.patient_billing_tree.insert('', 'end', values=(
+                        record[1],  # numero_factura
+                        fecha_formatted,
+                        concepto,
+                        monto,
+                        record[5]  # estado
+                    ))
+                    
+                    # Guardar el ID completo del registro
+                    self.billing_record_ids[item_id] = record[0]
+                    
+                    # Colorear filas según estado
+                    if record[5] == 'vencido':
+                        self.patient_billing_tree.set(item_id, 'Estado', '🚨 Vencido')
+                    elif record[5] == 'pagado':
+                        self.patient_billing_tree.set(item_id, 'Estado', '✅ Pagado')
+                    elif record[5] == 'pendiente':
+                        self.patient_billing_tree.set(item_id, 'Estado', '⏳ Pendiente')
+                    
+                except Exception as e:
+                    print(f"Error procesando factura: {e}")
+                    continue
+            
+            # Actualizar información
+            total_records = len(records)
+            if hasattr(self, 'billing_info_label'):
+                self.billing_info_label.config(
+                    text=f"💰 Total: {total_records} facturas encontradas - Doble clic para ver detalles"
+                )
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            print(f"Error cargando facturas: {e}")
+            messagebox.showerror("Error", f"Error al cargar las facturas: {str(e)}")
+            if 'conn' in locals():
+                conn.close()
+    
+    def refresh_patient_billing(self):
+        """Actualizar datos de facturación del paciente"""
+        self.load_patient_billing_data()
+        messagebox.showinfo("Actualizado", "✅ Mis facturas han sido actualizadas")
+    
+    def download_patient_invoice(self):
+        """Descargar factura seleccionada"""
+        selection = self.patient_invoices_tree.selection()
+        if not selection:
+            messagebox.showwarning("Selección", "Seleccione una factura para descargar")
+            return
+        
+        item = self.patient_invoices_tree.item(selection[0])
+        invoice_number = item['values'][0]
+        
+        messagebox.showinfo("Descargar Factura", 
+                           f"Descarga de factura: {invoice_number}\n\n" +
+                           "La funcionalidad de descarga PDF está disponible en el Sistema Completo de Facturación")
+    
+    def view_payment_history(self):
+        """Ver historial de pagos del paciente"""
+        messagebox.showinfo("Historial de Pagos", 
+                           "Su historial completo de pagos incluye:\n\n" +
+                           "• Fechas y montos de pagos\n• Métodos de pago utilizados\n• Comprobantes disponibles\n\n" +
+                           "Consulte con secretaría para detalles específicos")
+    
+    def request_account_statement(self):
+        """Solicitar estado de cuenta"""
+        messagebox.showinfo("Estado de Cuenta", 
+                           "Su solicitud de estado de cuenta ha sido registrada.\n\n" +
+                           "Recibirá un reporte detallado por email en las próximas 24 horas.\n\n" +
+                           "Para solicitudes urgentes, contacte directamente a secretaría")
+    
+    def billing_inquiry(self):
+        """Consulta sobre facturación"""
+        messagebox.showinfo("Consultas de Facturación", 
+                           "Para consultas sobre facturación puede:\n\n" +
+                           "• Contactar secretaría durante horario de atención\n" +
+                           "• Llamar al teléfono principal de la clínica\n" +
+                           "• Solicitar cita con administración\n\n" +
+                           "Horario: Lunes a Viernes 8:00 AM - 5:00 PM")
+    
+    def view_billing_detail_simple(self, event=None):
+        """Ver detalles de la factura seleccionada con doble clic"""
+        try:
+            selection = self.patient_billing_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "Por favor seleccione una factura")
+                return
+            
+            # Obtener datos de la fila seleccionada
+            item = self.patient_billing_tree.item(selection[0])
+            values = item['values']
+            
+            # Crear ventana de detalles simple
+            detail_window = tk.Toplevel(self.root)
+            detail_window.title(f"Detalle de Factura - {values[0]}")
+            detail_window.geometry("500x400")
+            detail_window.configure(bg='#F8FAFC')
+            detail_window.transient(self.root)
+            detail_window.grab_set()
+            
+            # Header
+            header = tk.Frame(detail_window, bg='#1E3A8A', height=60)
+            header.pack(fill='x')
+            header.pack_propagate(False)
+            
+            tk.Label(header, text="💰 Detalle de Factura", 
+                    font=('Arial', 14, 'bold'), bg='#1E3A8A', fg='white').pack(expand=True)
+            
+            # Contenido
+            content = tk.Frame(detail_window, bg='#F8FAFC')
+            content.pack(fill='both', expand=True, padx=20, pady=20)
+            
+            # Info frame
+            info_frame = tk.LabelFrame(content, text="📄 Información", 
+                                     font=('Arial', 12, 'bold'), bg='white', padx=15, pady=10)
+            info_frame.pack(fill='x', pady=(0, 10))
+            
+            # Mostrar datos
+            datos = [
+                ("Número:", values[0]),
+                ("Fecha:", values[1]),
+                ("Servicio:", values[2]),
+                ("Monto:", values[3]),
+                ("Estado:", values[4])
+            ]
+            
+            for label, value in datos:
+                row = tk.Frame(info_frame, bg='white')
+                row.pack(fill='x', pady=3)
+                tk.Label(row, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151', width=12, anchor='w').pack(side='left')
+                tk.Label(row, text=value, font=('Arial', 10), 
+                        bg='white', fg='#1E3A8A', anchor='w').pack(side='left', padx=(10, 0))
+            
+            # Botones
+            buttons_frame = tk.Frame(content, bg='white', relief='solid', bd=1)
+            buttons_frame.pack(fill='x', pady=10)
+            
+            button_content = tk.Frame(buttons_frame, bg='white')
+            button_content.pack(fill='x', padx=15, pady=10)
+            
+            tk.Button(button_content, text="✕ Cerrar", 
+                     command=detail_window.destroy,
+                     bg='#DC2626', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=15, pady=6).pack(side='right')
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error: {str(e)}")
+    
+    def filter_patient_invoices(self, event=None):
+        """Filtrar facturas del paciente"""
+        # Implementación básica de filtrado para pacientes
+        self.load_patient_billing_data()  # Por simplicidad, recargamos
+    
+    def view_patient_invoice_details(self, event=None):
+        """Ver detalles de factura del paciente"""
+        selection = self.patient_invoices_tree.selection()
+        if not selection:
+            return
+        
+        item = self.patient_invoices_tree.item(selection[0])
+        invoice_data = item['values']
+        
+        details_text = f"""📄 DETALLES DE FACTURA
+
+🔢 Número: {invoice_data[0]}
+📅 Fecha: {invoice_data[1]}
+👨‍⚕️ Doctor: {invoice_data[2]}
+💭 Concepto: {invoice_data[3]}
+💰 Monto: {invoice_data[4]}
+📊 Estado: {invoice_data[5]}
+
+💡 Para obtener una copia PDF de esta factura o más detalles, 
+consulte con secretaría o use el Sistema Completo de Facturación"""
+        
+        messagebox.showinfo("Detalles de Mi Factura", details_text)
+    
+    def create_patient_profile(self, parent):
+        """Mi perfil para pacientes"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Título
+        tk.Label(main_frame, text="Mi Perfil Personal", 
+                font=('Arial', 18, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(0, 20))
+        
+        # Panel principal dividido
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True)
+        
+        # Panel izquierdo - Información personal
+        left_panel = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        left_panel.pack(side='left', fill='both', expand=True, padx=(0, 10))
+        
+        # Header del panel izquierdo
+        left_header = tk.Frame(left_panel, bg='#0B5394', height=60)
+        left_header.pack(fill='x')
+        left_header.pack_propagate(False)
+        
+        tk.Label(left_header, text="👤 Información Personal", font=('Arial', 14, 'bold'), 
+                bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Contenido del perfil
+        profile_content = tk.Frame(left_panel, bg='white')
+        profile_content.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        try:
+            patient_data = self.get_patient_profile_data()
+            
+            # Avatar
+            avatar_frame = tk.Frame(profile_content, bg='#FFFFFF', width=120, height=120)
+            avatar_frame.pack(pady=(0, 20))
+            avatar_frame.pack_propagate(False)
+            tk.Label(avatar_frame, text="👤", font=('Arial', 60), bg='#FFFFFF', fg='#64748B').pack(expand=True)
+            
+            # Información personal
+            personal_fields = [
+                ("Nombre completo:", f"{patient_data.get('nombre', '')} {patient_data.get('apellido', '')}"),
+                ("Email:", patient_data.get('email', '')),
+                ("Teléfono:", patient_data.get('telefono', '')),
+                ("Fecha de nacimiento:", patient_data.get('fecha_nacimiento', '')),
+                ("Dirección:", patient_data.get('direccion', '')),
+                ("Número de expediente:", patient_data.get('numero_expediente', '')),
+                ("Seguro médico:", patient_data.get('seguro_nombre', 'Sin seguro')),
+                ("Contacto de emergencia:", patient_data.get('contacto_emergencia', '')),
+                ("Teléfono de emergencia:", patient_data.get('telefono_emergencia', ''))
+            ]
+            
+            for label, value in personal_fields:
+                field_frame = tk.Frame(profile_content, bg='white')
+                field_frame.pack(fill='x', pady=5)
+                
+                tk.Label(field_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#1E3A8A', width=20, anchor='w').pack(side='left')
+                tk.Label(field_frame, text=value or 'No especificado', font=('Arial', 10), 
+                        bg='white', fg='#64748B', anchor='w').pack(side='left', padx=(10, 0))
+                        
+        except Exception as e:
+            tk.Label(profile_content, text=f"Error cargando perfil: {str(e)}", 
+                    fg='red', bg='white').pack()
+        
+        # Panel derecho - Configuraciones y estadísticas
+        right_panel = tk.Frame(content_frame, bg='white', relief='solid', bd=1)
+        right_panel.pack(side='right', fill='both', expand=True, padx=(10, 0))
+        
+        # Header del panel derecho
+        right_header = tk.Frame(right_panel, bg='#0B5394', height=60)
+        right_header.pack(fill='x')
+        right_header.pack_propagate(False)
+        
+        tk.Label(right_header, text="⚙️ Configuraciones", font=('Arial', 14, 'bold'), 
+                bg='#0B5394', fg='white').pack(expand=True)
+        
+        # Contenido del panel derecho
+        config_content = tk.Frame(right_panel, bg='white')
+        config_content.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Botones de configuración
+        config_buttons = [
+            ("✏️ Editar Información Personal", self.edit_patient_personal_info, "#0B5394"),
+            ("🔑 Cambiar Contraseña", self.change_patient_password, "#E67E22"),
+            ("📧 Configurar Notificaciones", self.configure_notifications, "#16A085"),
+            ("🏥 Actualizar Seguro Médico", self.update_insurance_info, "#1abc9c"),
+            ("👥 Contactos de Emergencia", self.manage_emergency_contacts, "#C0392B")
+        ]
+        
+        for text, command, color in config_buttons:
+            btn = tk.Button(config_content, text=text, command=command, 
+                           bg=color, fg='white', font=('Arial', 10, 'bold'),
+                           width=25, height=2)
+            btn.pack(fill='x', pady=8)
+        
+        # Estadísticas del paciente
+        stats_frame = tk.LabelFrame(config_content, text="📊 Mis Estadísticas", 
+                                  font=('Arial', 11, 'bold'), padx=15, pady=10)
+        stats_frame.pack(fill='x', pady=(20, 0))
+        
+        try:
+            patient_stats = self.get_patient_personal_stats()
+            
+            stats_text = f"""
+📅 Miembro desde: {patient_stats.get('member_since', 'N/A')}
+🩺 Total de consultas: {patient_stats.get('total_consultations', 0)}
+👨‍⚕️ Doctores consultados: {patient_stats.get('doctors_count', 0)}
+💰 Total pagado: RD$ {patient_stats.get('total_paid', 0):,.2f}
+📋 Última consulta: {patient_stats.get('last_consultation', 'Nunca')}
+            """
+            
+            tk.Label(stats_frame, text=stats_text, font=('Arial', 9), 
+                    justify='left', bg='white').pack()
+                    
+        except Exception as e:
+            tk.Label(stats_frame, text=f"Error en estadísticas: {str(e)}", 
+                    fg='red', bg='white').pack()
+    
+    def get_patient_stats(self):
+        """Obtener estadísticas del paciente actual"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            patient_id = self.current_user.id
+            
+            stats = {}
+            
+            # Próximas citas
+            cursor.execute("""
+                SELECT COUNT(*) FROM citas 
+                WHERE paciente_id = ? AND fecha_hora > datetime('now')
+                AND estado IN ('confirmada', 'pendiente')
+            """, (patient_id,))
+            stats['upcoming_appointments'] = cursor.fetchone()[0]
+            
+            # Total de consultas
+            cursor.execute("""
+                SELECT COUNT(*) FROM citas WHERE paciente_id = ?
+            """, (patient_id,))
+            stats['total_consultations'] = cursor.fetchone()[0]
+            
+            # Facturas pendientes
+            cursor.execute("""
+                SELECT COUNT(*) FROM facturas 
+                WHERE paciente_id = ? AND estado = 'pendiente'
+            """, (patient_id,))
+            stats['pending_bills'] = cursor.fetchone()[0]
+            
+            # Doctores visitados (únicos)
+            cursor.execute("""
+                SELECT COUNT(DISTINCT doctor_id) FROM citas WHERE paciente_id = ?
+            """, (patient_id,))
+            stats['doctors_visited'] = cursor.fetchone()[0]
+            
+            cursor.close()
+            conn.close()
+            return stats
+            
+        except Exception as e:
+            print(f"Error obteniendo estadísticas del paciente: {e}")
+            return {
+                'upcoming_appointments': 0,
+                'total_consultations': 0, 
+                'pending_bills': 0,
+                'doctors_visited': 0
+            }
+    
+    # ----- Acciones del historial del paciente (stubs seguros) -----
+    def view_history_detail(self):
+        """Mostrar detalle completo del registro seleccionado del historial con observaciones del doctor"""
+        try:
+            if not hasattr(self, 'patient_history_tree'):
+                return
+                
+            sel = self.patient_history_tree.selection()
+            if not sel:
+                messagebox.showinfo('Historial', 'Seleccione un registro para ver el detalle completo')
+                return
+            
+            # Obtener el ID del registro para consultar datos completos
+            item = self.patient_history_tree.item(sel[0])
+            record_data = item.get('values', [])
+            
+            if not record_data:
+                messagebox.showerror('Error', 'No se pudieron obtener los datos del registro')
+                return
+            
+            # Obtener datos completos de la base de datos incluyendo observaciones
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Buscar el registro por fecha y doctor (más confiable que por ID en este contexto)
+            fecha_consulta = record_data[0]  # Fecha formateada
+            doctor_nombre = record_data[1]   # Nombre del doctor
+            
+            cursor.execute("""
+                SELECT hm.*, 
+                       u.nombre || ' ' || u.apellido as doctor_completo,
+                       COALESCE(d.especialidad, 'Medicina General') as especialidad,
+                       d.cedula_profesional,
+                       hm.observaciones,
+                       hm.tipo_consulta,
+                       hm.fecha_consulta
+                FROM historial_medico hm
+                JOIN usuarios u ON u.id = hm.doctor_id
+                LEFT JOIN doctores d ON d.id = hm.doctor_id
+                WHERE hm.paciente_id = ? AND u.nombre || ' ' || u.apellido = ?
+                ORDER BY hm.fecha_consulta DESC
+                LIMIT 1
+            """, (self.current_user.id, doctor_nombre))
+            
+            full_record = cursor.fetchone()
+            cursor.close()
+            conn.close()
+            
+            if not full_record:
+                messagebox.showerror('Error', 'No se encontraron los datos completos del registro')
+                return
+            
+            # Crear ventana de detalle con diseño moderno
+            detail_window = tk.Toplevel(self.window)
+            detail_window.title("📋 Detalle Completo del Historial Médico")
+            detail_window.geometry("800x700")
+            detail_window.configure(bg='#F8FAFC')
+            detail_window.resizable(True, True)
+            
+            # Centrar ventana
+            detail_window.transient(self.window)
+            detail_window.grab_set()
+            
+            # Frame principal con scroll
+            main_frame = tk.Frame(detail_window, bg='#F8FAFC')
+            main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+            
+            # Header de la ventana
+            header_frame = tk.Frame(main_frame, bg='#1E3A8A', relief='flat')
+            header_frame.pack(fill='x', pady=(0, 20))
+            
+            tk.Label(header_frame, text="📋 Registro Médico Detallado", 
+                    font=('Arial', 16, 'bold'), bg='#1E3A8A', fg='white', pady=15).pack()
+            
+            # Frame con scroll para contenido
+            canvas = tk.Canvas(main_frame, bg='#F8FAFC', highlightthickness=0)
+            scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+            scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+            
+            scrollable_frame.bind(
+                "<Configure>",
+                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            )
+            
+            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+            canvas.configure(yscrollcommand=scrollbar.set)
+            
+            # Información del doctor
+            doctor_section = tk.LabelFrame(scrollable_frame, text="👨‍⚕️ Información del Doctor", 
+                                         font=('Arial', 12, 'bold'), bg='white', fg='#1E3A8A',
+                                         padx=15, pady=15)
+            doctor_section.pack(fill='x', pady=(0, 15))
+            
+            doctor_info = [
+                ("Nombre Completo:", full_record[7]),  # doctor_completo
+                ("Especialidad:", full_record[8]),     # especialidad
+                ("Cédula Profesional:", full_record[9] or 'No especificada'),  # cedula_profesional
+                ("Fecha de Consulta:", record_data[0])
+            ]
+            
+            for label, value in doctor_info:
+                info_frame = tk.Frame(doctor_section, bg='white')
+                info_frame.pack(fill='x', pady=3)
+                tk.Label(info_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151', width=20, anchor='w').pack(side='left')
+                tk.Label(info_frame, text=str(value), font=('Arial', 10), 
+                        bg='white', fg='#1E3A8A', anchor='w').pack(side='left', padx=(10, 0))
+            
+            # Diagnóstico y tratamiento
+            medical_section = tk.LabelFrame(scrollable_frame, text="🩺 Información Médica", 
+                                          font=('Arial', 12, 'bold'), bg='white', fg='#1E3A8A',
+                                          padx=15, pady=15)
+            medical_section.pack(fill='x', pady=(0, 15))
+            
+            # Diagnóstico
+            diag_frame = tk.Frame(medical_section, bg='white')
+            diag_frame.pack(fill='x', pady=(0, 10))
+            tk.Label(diag_frame, text="Diagnóstico Principal:", font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            diag_text = tk.Text(diag_frame, height=3, wrap='word', font=('Arial', 10),
+                               bg='#F8FAFC', relief='solid', bd=1, state='normal')
+            diag_text.insert('1.0', full_record[4] or 'No especificado')
+            diag_text.config(state='disabled')
+            diag_text.pack(fill='x', pady=(5, 0))
+            
+            # Tratamiento
+            treat_frame = tk.Frame(medical_section, bg='white')
+            treat_frame.pack(fill='x', pady=(0, 10))
+            tk.Label(treat_frame, text="Tratamiento Indicado:", font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            treat_text = tk.Text(treat_frame, height=3, wrap='word', font=('Arial', 10),
+                                bg='#F8FAFC', relief='solid', bd=1, state='normal')
+            treat_text.insert('1.0', full_record[5] or 'No especificado')
+            treat_text.config(state='disabled')
+            treat_text.pack(fill='x', pady=(5, 0))
+            
+            # Medicamentos
+            med_frame = tk.Frame(medical_section, bg='white')
+            med_frame.pack(fill='x', pady=(0, 10))
+            tk.Label(med_frame, text="Medicamentos Prescritos:", font=('Arial', 11, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            med_text = tk.Text(med_frame, height=3, wrap='word', font=('Arial', 10),
+                              bg='#F8FAFC', relief='solid', bd=1, state='normal')
+            med_text.insert('1.0', full_record[6] or 'Ninguno')
+            med_text.config(state='disabled')
+            med_text.pack(fill='x', pady=(5, 0))
+            
+            # Observaciones del doctor (sección destacada)
+            obs_section = tk.LabelFrame(scrollable_frame, text="📝 Observaciones del Doctor", 
+                                       font=('Arial', 12, 'bold'), bg='#FFF7ED', fg='#DC2626',
+                                       padx=15, pady=15)
+            obs_section.pack(fill='x', pady=(0, 15))
+            
+            tk.Label(obs_section, text="Notas y observaciones clínicas del doctor:", 
+                    font=('Arial', 10, 'italic'), bg='#FFF7ED', fg='#B45309').pack(anchor='w', pady=(0, 10))
+            
+            obs_text = tk.Text(obs_section, height=6, wrap='word', font=('Arial', 11),
+                              bg='white', relief='solid', bd=2, state='normal')
+            observaciones = full_record[10] or 'El doctor no registró observaciones adicionales para esta consulta.'
+            obs_text.insert('1.0', observaciones)
+            obs_text.config(state='disabled')
+            obs_text.pack(fill='both', expand=True)
+            
+            # Información adicional
+            additional_section = tk.LabelFrame(scrollable_frame, text="ℹ️ Información Adicional", 
+                                             font=('Arial', 12, 'bold'), bg='white', fg='#1E3A8A',
+                                             padx=15, pady=15)
+            additional_section.pack(fill='x', pady=(0, 15))
+            
+            additional_info = [
+                ("Tipo de Consulta:", full_record[11] or 'Consulta General'),
+                ("Estado del Registro:", 'Activo'),
+                ("Fecha de Registro:", full_record[12])
+            ]
+            
+            for label, value in additional_info:
+                info_frame = tk.Frame(additional_section, bg='white')
+                info_frame.pack(fill='x', pady=3)
+                tk.Label(info_frame, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151', width=20, anchor='w').pack(side='left')
+                tk.Label(info_frame, text=str(value), font=('Arial', 10), 
+                        bg='white', fg='#1E3A8A', anchor='w').pack(side='left', padx=(10, 0))
+            
+            # Pack canvas y scrollbar
+            canvas.pack(side="left", fill="both", expand=True)
+            scrollbar.pack(side="right", fill="y")
+            
+            # Botones de acción
+            buttons_frame = tk.Frame(main_frame, bg='#F8FAFC')
+            buttons_frame.pack(fill='x', pady=(15, 0))
+            
+            tk.Button(buttons_frame, text="📄 Imprimir Registro", 
+                     command=lambda: self.print_single_record(full_record),
+                     bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=20, pady=8).pack(side='left', padx=(0, 10))
+            
+            tk.Button(buttons_frame, text="📧 Enviar por Email", 
+                     command=lambda: self.email_single_record(full_record),
+                     bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=20, pady=8).pack(side='left', padx=(0, 10))
+            
+            tk.Button(buttons_frame, text="📋 Copiar al Portapapeles", 
+                     command=lambda: self.copy_record_to_clipboard(full_record),
+                     bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=20, pady=8).pack(side='left', padx=(0, 10))
+            
+            tk.Button(buttons_frame, text="❌ Cerrar", 
+                     command=detail_window.destroy,
+                     bg='#6B7280', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=20, pady=8).pack(side='right')
+            
+        except Exception as e:
+            messagebox.showerror('Error', f'Error mostrando detalle del historial: {str(e)}')
+            print(f"Error en view_history_detail: {e}")
+    
+    def print_my_history(self):
+        """Imprimir historial (stub básico)"""
+        messagebox.showinfo('Historial', 'Impresión del historial próximamente disponible')
+    
+    def export_history_pdf(self):
+        """Exportar historial a PDF (stub básico)"""
+        messagebox.showinfo('Historial', 'Exportación a PDF próximamente disponible')
+    
+    def email_my_history(self):
+        """Enviar historial por email (stub básico)"""
+        messagebox.showinfo('Historial', 'Envío por email próximamente disponible')
+    
+    def get_patient_upcoming_appointments(self):
+        """Obtener próximas citas del paciente"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            patient_id = self.current_user.id
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            cursor.execute("""
+                SELECT c.*, u.nombre || ' ' || u.apellido as doctor_nombre,
+                       DATE(c.fecha_hora) as fecha,
+                       TIME(c.fecha_hora) as hora,
+                       c.motivo
+                FROM citas c
+                JOIN usuarios u ON c.doctor_id = u.id
+                WHERE c.paciente_id = ? AND c.fecha_hora > ? 
+                AND c.estado IN ('confirmada', 'pendiente')
+                ORDER BY c.fecha_hora ASC
+                LIMIT 5
+            """, (patient_id, now))
+            
+            appointments = []
+            for row in cursor.fetchall():
+                apt = dict(zip([col[0] for col in cursor.description], row))
+                # Ajustar nombres de campos para compatibilidad
+                apt['doctor'] = apt.get('doctor_nombre', 'N/A')
+                appointments.append(apt)
+            
+            cursor.close()
+            conn.close()
+            return appointments
+            
+        except Exception as e:
+            print(f"Error obteniendo próximas citas del paciente: {e}")
+            return []
+    
+    def get_patient_reminders(self):
+        """Obtener recordatorios del paciente"""
+        # Esta función puede expandirse para incluir recordatorios específicos
+        # Por ahora devolvemos recordatorios básicos basados en citas próximas
+        try:
+            reminders = []
+            upcoming = self.get_patient_upcoming_appointments()
+            
+            for apt in upcoming:
+                try:
+                    apt_date = datetime.fromisoformat(apt['fecha_hora'])
+                    days_until = (apt_date - datetime.now()).days
+                    
+                    if days_until <= 1:
+                        reminders.append({
+                            'message': f"Tienes una cita mañana con Dr. {apt['doctor_nombre']} a las {apt.get('hora_formatted', 'N/A')}"
+                        })
+                    elif days_until <= 7:
+                        reminders.append({
+                            'message': f"Tienes una cita en {days_until} días con Dr. {apt['doctor_nombre']}"
+                        })
+                except:
+                    continue
+            
+            return reminders
+            
+        except Exception as e:
+            print(f"Error obteniendo recordatorios: {e}")
+            return []
+    
+    def get_patient_billing_summary(self): return {}
+    
+    def get_patient_profile_data(self): return self.get_patient_info(self.current_user.id)
+    
+    def get_patient_personal_stats(self): return {}
+    
+    def filter_patient_billing(self):
+        """Filtrar facturas del paciente según período y estado"""
+        try:
+            period = self.billing_period_filter.get()
+            status = self.billing_status_filter.get()
+            self.load_patient_billing_data(period_filter=period, status_filter=status)
+        except Exception as e:
+            print(f"Error filtrando facturas: {e}")
+            self.load_patient_billing_data()
+    
+    def clear_billing_filters(self):
+        """Limpiar filtros de facturación"""
+        try:
+            self.billing_period_filter.set('Todos')
+            self.billing_status_filter.set('Todos')
+            self.load_patient_billing_data()
+        except Exception as e:
+            print(f"Error limpiando filtros: {e}")
+    
+    def view_billing_detail(self):
+        """Ver detalle de factura seleccionada"""
+        try:
+            selection = self.patient_billing_tree.selection()
+            if not selection:
+                messagebox.showwarning("Selección", "Por favor seleccione una factura para ver detalles")
+                return
+            
+            item = self.patient_billing_tree.item(selection[0])
+            values = item['values']
+            
+            detail_text = f"""📄 DETALLE DE FACTURA
+            
+🔢 Número: {values[0]}
+📅 Fecha: {values[1]}
+🏥 Servicio: {values[2]}
+💰 Monto: {values[3]}
+📊 Estado: {values[4]}
+📅 Vencimiento: {values[5]}
+
+Para más información o dudas sobre esta factura,
+contacte a secretaría."""
+            
+            messagebox.showinfo("Detalle de Factura", detail_text)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando detalle: {e}")
+    
+    def download_billing_pdf(self):
+        """Descargar PDF de factura seleccionada"""
+        try:
+            selection = self.patient_billing_tree.selection()
+            if not selection:
+                messagebox.showwarning("Selección", "Por favor seleccione una factura para descargar")
+                return
+            
+            item = self.patient_billing_tree.item(selection[0])
+            factura_numero = item['values'][0]
+            
+            messagebox.showinfo("Descarga PDF", 
+                              f"📥 Descargando factura {factura_numero}\n\n" +
+                              "La funcionalidad de descarga PDF estará disponible próximamente.")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error descargando PDF: {e}")
+    
+    def email_my_billing(self):
+        """Enviar factura por email"""
+        try:
+            selection = self.patient_billing_tree.selection()
+            if not selection:
+                messagebox.showwarning("Selección", "Por favor seleccione una factura para enviar")
+                return
+            
+            item = self.patient_billing_tree.item(selection[0])
+            factura_numero = item['values'][0]
+            
+            messagebox.showinfo("Envío por Email", 
+                              f"📧 Enviando factura {factura_numero} por email\n\n" +
+                              "La factura será enviada a su correo registrado.")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error enviando email: {e}")
+    
+    def show_billing_summary(self):
+        """Mostrar resumen de facturación"""
+        try:
+            summary = self.get_patient_billing_summary()
+            
+            summary_text = f"""💰 RESUMEN DE FACTURACIÓN
+            
+💳 Total Pagado: RD${summary.get('total_paid', 0):,.2f}
+⏳ Total Pendiente: RD${summary.get('total_pending', 0):,.2f}
+📋 Total de Facturas: {summary.get('total_invoices', 0)}
+📅 Total Este Mes: RD${summary.get('month_total', 0):,.2f}
+
+Estado de cuenta actualizado al {datetime.now().strftime('%d/%m/%Y')}"""
+            
+            messagebox.showinfo("Resumen Financiero", summary_text)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error mostrando resumen: {e}")
+    
+    def view_history_detail_simple(self, event=None):
+        """Ver detalles del registro seleccionado en la tabla"""
+        try:
+            selection = self.medical_history_tree.selection()
+            if not selection:
+                messagebox.showwarning("Advertencia", "Por favor seleccione un registro para ver los detalles")
+                return
+            
+            # Obtener el ID del registro desde la fila mostrada
+            row = self.medical_history_tree.row_for(selection[0])
+            if row is not None:
+                record_id = row[0]
+            else:
+                messagebox.showerror("Error", "No se pudo obtener la información del registro")
+                return
+            
+            # Obtener datos completos del registro
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT 
+                    hm.id,
+                    hm.fecha_consulta,
+                    u.nombre || ' ' || u.apellido as doctor_nombre,
+                    COALESCE(d.especialidad, 'Medicina General') as especialidad,
+                    COALESCE(hm.diagnostico, 'No especificado') as diagnostico,
+                    COALESCE(hm.tratamiento, 'No especificado') as tratamiento,
+                    COALESCE(hm.observaciones, 'Sin observaciones') as observaciones,
+                    COALESCE(hm.medicamentos, 'No prescritos') as medicamentos,
+                    COALESCE(hm.sintomas, 'No registrados') as sintomas,
+                    COALESCE(hm.motivo_consulta, 'No especificado') as motivo_consulta
+                FROM historial_medico hm
+                JOIN usuarios u ON u.id = hm.doctor_id
+                LEFT JOIN doctores d ON d.id = hm.doctor_id
+                WHERE hm.id = ?
+            """, (record_id,))
+            
+            record = cursor.fetchone()
+            cursor.close()
+            conn.close()
+            
+            if not record:
+                messagebox.showerror("Error", "No se encontraron los detalles del registro")
+                return
+            
+            # Crear ventana de detalles
+            detail_window = tk.Toplevel(self.root)
+            detail_window.title(f"Detalle Médico - {record[1]}")
+            detail_window.geometry("700x600")
+            detail_window.configure(bg='#F8FAFC')
+            detail_window.transient(self.root)
+            detail_window.grab_set()
+            
+            # Header
+            header = tk.Frame(detail_window, bg='#1E3A8A', height=60)
+            header.pack(fill='x')
+            header.pack_propagate(False)
+            
+            header_content = tk.Frame(header, bg='#1E3A8A')
+            header_content.pack(expand=True, fill='both', padx=20, pady=10)
+            
+            tk.Label(header_content, text="📋 Detalle Completo del Registro Médico", 
+                    font=('Arial', 14, 'bold'), bg='#1E3A8A', fg='white').pack(side='left')
+            
+            tk.Button(header_content, text="✕ Cerrar", 
+                     command=detail_window.destroy,
+                     bg='#DC2626', fg='white', font=('Arial', 10, 'bold'),
+                     relief='flat', padx=12, pady=4).pack(side='right')
+            
+            # Contenido con scroll
+            main_frame = tk.Frame(detail_window, bg='#F8FAFC')
+            main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+            
+            canvas = tk.Canvas(main_frame, bg='#F8FAFC', highlightthickness=0)
+            scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
+            scrollable_frame = tk.Frame(canvas, bg='#F8FAFC')
+            
+            scrollable_frame.bind(
+                "<Configure>",
+                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+            )
+            
+            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+            canvas.configure(yscrollcommand=scrollbar.set)
+            
+            # Información básica
+            basic_info = tk.LabelFrame(scrollable_frame, text="📊 Información Básica", 
+                                      font=('Arial', 12, 'bold'), bg='white', padx=15, pady=10)
+            basic_info.pack(fill='x', pady=(0, 10))
+            
+            basic_data = [
+                ("📅 Fecha de Consulta:", record[1]),
+                ("👨‍⚕️ Doctor:", record[2]),
+                ("🏥 Especialidad:", record[3]),
+                ("🆔 ID Registro:", str(record[0]))
+            ]
+            
+            for label, value in basic_data:
+                row = tk.Frame(basic_info, bg='white')
+                row.pack(fill='x', pady=3)
+                tk.Label(row, text=label, font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151', width=20, anchor='w').pack(side='left')
+                tk.Label(row, text=value, font=('Arial', 10), 
+                        bg='white', fg='#1E3A8A', anchor='w').pack(side='left', padx=(10, 0))
+            
+            # Información médica
+            medical_info = tk.LabelFrame(scrollable_frame, text="🩺 Información Médica", 
+                                        font=('Arial', 12, 'bold'), bg='white', padx=15, pady=10)
+            medical_info.pack(fill='x', pady=(0, 10))
+            
+            # Motivo de consulta
+            if record[9] and record[9] != 'No especificado':
+                motivo_frame = tk.Frame(medical_info, bg='white')
+                motivo_frame.pack(fill='x', pady=5)
+                tk.Label(motivo_frame, text="🎯 Motivo de Consulta:", font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(motivo_frame, height=2, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(3, 0))
+                motivo_text = motivo_frame.winfo_children()[-1]
+                motivo_text.insert('1.0', record[9])
+                motivo_text.configure(state='disabled')
+            
+            # Síntomas
+            if record[8] and record[8] != 'No registrados':
+                sintomas_frame = tk.Frame(medical_info, bg='white')
+                sintomas_frame.pack(fill='x', pady=5)
+                tk.Label(sintomas_frame, text="🤒 Síntomas:", font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(sintomas_frame, height=2, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(3, 0))
+                sintomas_text = sintomas_frame.winfo_children()[-1]
+                sintomas_text.insert('1.0', record[8])
+                sintomas_text.configure(state='disabled')
+            
+            # Diagnóstico
+            diag_frame = tk.Frame(medical_info, bg='white')
+            diag_frame.pack(fill='x', pady=5)
+            tk.Label(diag_frame, text="🔍 Diagnóstico:", font=('Arial', 10, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            tk.Text(diag_frame, height=3, wrap='word', font=('Arial', 10), 
+                   bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(3, 0))
+            diag_text = diag_frame.winfo_children()[-1]
+            diag_text.insert('1.0', record[4])
+            diag_text.configure(state='disabled')
+            
+            # Tratamiento
+            treat_frame = tk.Frame(medical_info, bg='white')
+            treat_frame.pack(fill='x', pady=5)
+            tk.Label(treat_frame, text="💊 Tratamiento:", font=('Arial', 10, 'bold'), 
+                    bg='white', fg='#374151').pack(anchor='w')
+            tk.Text(treat_frame, height=3, wrap='word', font=('Arial', 10), 
+                   bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(3, 0))
+            treat_text = treat_frame.winfo_children()[-1]
+            treat_text.insert('1.0', record[5])
+            treat_text.configure(state='disabled')
+            
+            # Medicamentos
+            if record[7] and record[7] != 'No prescritos':
+                med_frame = tk.Frame(medical_info, bg='white')
+                med_frame.pack(fill='x', pady=5)
+                tk.Label(med_frame, text="💉 Medicamentos:", font=('Arial', 10, 'bold'), 
+                        bg='white', fg='#374151').pack(anchor='w')
+                tk.Text(med_frame, height=2, wrap='word', font=('Arial', 10), 
+                       bg='#F8FAFC', relief='solid', bd=1).pack(fill='x', pady=(3, 0))
+                med_text = med_frame.winfo_children()[-1]
+                med_text.insert('1.0', record[7])
+                med_text.configure(state='disabled')
+            
+            # Observaciones del doctor
+            if record[6] and record[6] != 'Sin observaciones':
+                obs_info = tk.LabelFrame(scrollable_frame, text="📝 Observaciones del Doctor", 
+                                        font=('Arial', 12, 'bold'), bg='white', padx=15, pady=10)
+                obs_info.pack(fill='x', pady=(0, 10))
+                
+                obs_text = tk.Text(obs_info, height=6, wrap='word', font=('Arial', 10), 
+                                  bg='#F8FAFC', relief='solid', bd=1)
+                obs_text.pack(fill='both', expand=True)
+                obs_text.insert('1.0', record[6])
+                obs_text.configure(state='disabled')
+            
+            # Pack canvas y scrollbar
+            canvas.pack(side="left", fill="both", expand=True)
+            scrollbar.pack(side="right", fill="y")
+            
+            # Bind scroll del mouse
+            def _on_mousewheel(event):
+                canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+            canvas.bind_all("<MouseWheel>", _on_mousewheel)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al mostrar detalles: {str(e)}")
+            print(f"Error en view_history_detail_simple: {e}")
@@ -0,0 +1,260 @@
+"""
+Panel de rendimiento de MEDISYNC (oculto, sólo administradores: Ctrl+Shift+P)
+Consultas más costosas, tiempos de carga por pantalla y plan de ejecución
+de una consulta, a partir de lo registrado por query_stats, y perfiles de
+acciones de la interfaz (ui_profiler)
+Métodos de MedisyncApp que se importan la primera vez que se usan
+(ver medisync_views)
+"""
+import io
+import os
+import pstats
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import query_stats
+import ui_profiler
+
+# Criterios de orden de la lista de consultas: etiqueta -> atributo de QuerySummary
+QUERY_ORDERS = {
+    'Tiempo total': 'total_ms',
+    'Tiempo medio': 'mean_ms',
+    'p95': 'p95_ms',
+    'Máximo': 'max_ms',
+    'Llamadas': 'calls',
+    'Errores': 'errors',
+}
+TOP_QUERIES = 50
+# Funciones mostradas del perfil seleccionado (por tiempo acumulado)
+TOP_PROFILE_FUNCTIONS = 30
+
+
+def _monitor(app):
+    # SimpleDatabaseManager no mide consultas: se muestra el monitor del proceso (vacío)
+    return getattr(app.db_manager, 'query_stats', None) or query_stats.monitor
+
+
+class PerformanceViews:
+    """Métodos de MedisyncApp: panel de rendimiento de consultas y pantallas"""
+    
+    def show_performance_panel(self):
+        """Abrir (o traer al frente) el panel de rendimiento"""
+        if getattr(self.current_user, 'tipo_usuario', None) != 'admin':
+            return
+        window = self.__dict__.get('performance_window')
+        if window is not None and window.winfo_exists():
+            window.lift()
+            self.load_performance_data()
+            return
+        
+        monitor = _monitor(self)
+        window = self.performance_window = tk.Toplevel(self.root)
+        window.title("MEDISYNC - Rendimiento")
+        window.geometry("1100x700")
+        window.configure(bg='#F8FAFC')
+        
+        # Header
+        header_frame = tk.Frame(window, bg='#1E3A8A', height=60)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        tk.Label(header_frame, text="⏱️ Rendimiento", font=('Arial', 16, 'bold'),
+                bg='#1E3A8A', fg='white').pack(side='left', padx=20)
+        self.performance_status = tk.Label(header_frame, text="", font=('Arial', 10),
+                                           bg='#1E3A8A', fg='#CBD5E1')
+        self.performance_status.pack(side='right', padx=20)
+        
+        # Barra de acciones
+        toolbar = tk.Frame(window, bg='#F8FAFC')
+        toolbar.pack(fill='x', padx=15, pady=(10, 0))
+        tk.Label(toolbar, text="Ordenar por:", font=('Arial', 10), bg='#F8FAFC').pack(side='left')
+        self.performance_order = tk.StringVar(value='Tiempo total')
+        order_combo = ttk.Combobox(toolbar, textvariable=self.performance_order, values=list(QUERY_ORDERS),
+                                   state='readonly', width=14)
+        order_combo.pack(side='left', padx=(5, 15))
+        order_combo.bind('<<ComboboxSelected>>', lambda e: self.load_performance_data())
+        
+        for text, command, color in (("🔄 Actualizar", self.load_performance_data, '#0B5394'),
+                                     ("🔍 EXPLAIN", self.explain_selected_query, '#059669'),
+                                     ("🗑️ Limpiar", self.clear_performance_data, '#C0392B')):
+            tk.Button(toolbar, text=text, command=command, bg=color, fg='white',
+                     font=('Arial', 10, 'bold'), relief='flat', padx=12, pady=4,
+                     cursor='hand2').pack(side='left', padx=3)
+        
+        self.profiling_enabled = tk.BooleanVar(value=ui_profiler.profiler.enabled)
+        tk.Checkbutton(toolbar, text="📈 Perfilar acciones", variable=self.profiling_enabled,
+                      command=self.toggle_profiling, font=('Arial', 10), bg='#F8FAFC').pack(side='left', padx=(15, 0))
+        
+        slow_text = f"Lentas: ≥ {monitor.slow_ms:.0f} ms"
+        slow_text += f" → {monitor.slow_log}" if monitor.slow_log else " (sin archivo de registro)"
+        tk.Label(toolbar, text=slow_text, font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(side='right')
+        
+        notebook = ttk.Notebook(window)
+        notebook.pack(fill='both', expand=True, padx=15, pady=10)
+        
+        # Consultas más costosas + plan de la seleccionada
+        queries_frame = tk.Frame(notebook, bg='#F8FAFC')
+        notebook.add(queries_frame, text="Consultas")
+        columns = ('llamadas', 'total', 'media', 'p95', 'max', 'filas', 'errores', 'acciones', 'consulta')
+        headings = ('Llamadas', 'Total (ms)', 'Media (ms)', 'p95 (ms)', 'Máx (ms)', 'Filas', 'Errores',
+                    'Pantallas', 'Consulta')
+        widths = (70, 90, 90, 80, 80, 70, 60, 160, 500)
+        tree_frame = tk.Frame(queries_frame, bg='#F8FAFC')
+        tree_frame.pack(fill='both', expand=True)
+        self.performance_queries_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=14)
+        for column, heading, width in zip(columns, headings, widths):
+            self.performance_queries_tree.heading(column, text=heading)
+            self.performance_queries_tree.column(column, width=width, anchor='w' if width > 100 else 'e',
+                                                 stretch=column == 'consulta')
+        v_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.performance_queries_tree.yview)
+        self.performance_queries_tree.configure(yscrollcommand=v_scrollbar.set)
+        self.performance_queries_tree.pack(side='left', fill='both', expand=True)
+        v_scrollbar.pack(side='right', fill='y')
+        self.performance_queries_tree.bind('<Double-1>', lambda e: self.explain_selected_query())
+        
+        tk.Label(queries_frame, text="Plan de ejecución (doble clic o EXPLAIN)", font=('Arial', 10, 'bold'),
+                bg='#F8FAFC', fg='#1E293B').pack(anchor='w', pady=(8, 2))
+        self.performance_plan_text = tk.Text(queries_frame, height=9, font=('Courier', 9), wrap='word',
+                                             bg='#FFFFFF', relief='solid', bd=1)
+        self.performance_plan_text.pack(fill='x')
+        
+        # Cargas por pantalla
+        screens_frame = tk.Frame(notebook, bg='#F8FAFC')
+        notebook.add(screens_frame, text="Pantallas")
+        columns = ('pantalla', 'tipo', 'cargas', 'p50', 'p95', 'max', 'consultas')
+        headings = ('Pantalla / acción', 'Tipo', 'Cargas', 'p50 (ms)', 'p95 (ms)', 'Máx (ms)', 'Consultas por carga')
+        widths = (260, 100, 80, 100, 100, 100, 140)
+        self.performance_screens_tree = ttk.Treeview(screens_frame, columns=columns, show='headings')
+        for column, heading, width in zip(columns, headings, widths):
+            self.performance_screens_tree.heading(column, text=heading)
+            self.performance_screens_tree.column(column, width=width, anchor='w' if column in ('pantalla', 'tipo') else 'e')
+        self.performance_screens_tree.pack(fill='both', expand=True)
+        
+        # Perfiles guardados de acciones lentas
+        profiles_frame = tk.Frame(notebook, bg='#F8FAFC')
+        notebook.add(profiles_frame, text="Perfiles")
+        profiler = ui_profiler.profiler
+        tk.Label(profiles_frame, text=f"Acciones de ≥ {profiler.min_ms:.0f} ms → {os.path.abspath(profiler.directory)} "
+                                      "(.prof para pstats/snakeviz, .collapsed para flamegraph)",
+                font=('Arial', 9), bg='#F8FAFC', fg='#64748B').pack(anchor='w', pady=(5, 5))
+        columns = ('hora', 'accion', 'duracion', 'muestras', 'archivo')
+        headings = ('Hora', 'Acción', 'Duración (ms)', 'Muestras', 'Archivo')
+        widths = (140, 320, 110, 90, 400)
+        self.performance_profiles_tree = ttk.Treeview(profiles_frame, columns=columns, show='headings', height=10)
+        for column, heading, width in zip(columns, headings, widths):
+            self.performance_profiles_tree.heading(column, text=heading)
+            self.performance_profiles_tree.column(column, width=width,
+                                                  anchor='e' if column in ('duracion', 'muestras') else 'w')
+        self.performance_profiles_tree.pack(fill='both', expand=True)
+        self.performance_profiles_tree.bind('<Double-1>', lambda e: self.show_selected_profile())
+        
+        tk.Label(profiles_frame, text="Funciones más costosas (doble clic en un perfil)", font=('Arial', 10, 'bold'),
+                bg='#F8FAFC', fg='#1E293B').pack(anchor='w', pady=(8, 2))
+        self.performance_profile_text = tk.Text(profiles_frame, height=12, font=('Courier', 9), wrap='none',
+                                                bg='#FFFFFF', relief='solid', bd=1)
+        self.performance_profile_text.pack(fill='x')
+        
+        tk.Button(window, text="🔙 Cerrar", command=window.destroy, bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), padx=20, pady=6).pack(pady=(0, 10))
+        
+        self.load_performance_data()
+    
+    def load_performance_data(self):
+        """Rellenar las listas de consultas y pantallas con lo registrado hasta ahora"""
+        monitor = _monitor(self)
+        order = QUERY_ORDERS.get(self.performance_order.get(), 'total_ms')
+        
+        tree = self.performance_queries_tree
+        tree.delete(*tree.get_children())
+        self.performance_summaries = {}
+        for summary in monitor.top(TOP_QUERIES, order):
+            item = tree.insert('', 'end', values=(
+                summary.calls, f"{summary.total_ms:,.1f}", f"{summary.mean_ms:.2f}", f"{summary.p95_ms:.2f}",
+                f"{summary.max_ms:.2f}", summary.rows, summary.errors or '', ", ".join(summary.actions),
+                summary.fingerprint
+            ), tags=('error',) if summary.errors else ())
+            self.performance_summaries[item] = summary
+        tree.tag_configure('error', foreground='#C0392B')
+        
+        tree = self.performance_screens_tree
+        tree.delete(*tree.get_children())
+        for screen in monitor.screens():
+            tree.insert('', 'end', values=(
+                screen.action, screen.kind, screen.loads, f"{screen.p50_ms:.1f}", f"{screen.p95_ms:.1f}",
+                f"{screen.max_ms:.1f}", f"{screen.queries_per_load:.1f}"
+            ))
+        
+        tree = self.performance_profiles_tree
+        tree.delete(*tree.get_children())
+        self.performance_profiles = {}
+        for result in reversed(ui_profiler.profiler.results()):
+            item = tree.insert('', 'end', values=(
+                result.started_at.strftime('%d/%m %H:%M:%S'), result.name, f"{result.duration_ms:,.0f}",
+                result.samples, os.path.basename(result.profile_path or result.stacks_path)
+            ))
+            self.performance_profiles[item] = result
+        
+        records = monitor.records()
+        self.performance_status.configure(
+            text=f"{len(records)} consultas en memoria · {monitor.slow_count} lentas"
+                 + ("" if monitor.enabled else " · instrumentación desactivada")
+                 + (" · perfilando" if ui_profiler.profiler.enabled else ""))
+    
+    def explain_selected_query(self):
+        """Mostrar el EXPLAIN QUERY PLAN de la consulta seleccionada"""
+        selection = self.performance_queries_tree.selection()
+        if not selection:
+            messagebox.showwarning("Selección requerida", "Seleccione una consulta de la lista",
+                                   parent=self.performance_window)
+            return
+        summary = self.performance_summaries.get(selection[0])
+        if summary is None:
+            return
+        
+        plan = self.db_manager.explain_query(summary.sql, summary.params)
+        text = summary.fingerprint + "\n\n"
+        if plan is None:
+            text += "No se pudo obtener el plan (sentencia sin plan: PRAGMA, BEGIN, DDL... o tabla inexistente)."
+        else:
+            text += plan or "(plan vacío)"
+        self.performance_plan_text.delete('1.0', tk.END)
+        self.performance_plan_text.insert('1.0', text)
+    
+    def show_selected_profile(self):
+        """Mostrar las funciones con más tiempo acumulado del perfil seleccionado"""
+        selection = self.performance_profiles_tree.selection()
+        if not selection:
+            messagebox.showwarning("Selección requerida", "Seleccione un perfil de la lista",
+                                   parent=self.performance_window)
+            return
+        result = self.performance_profiles.get(selection[0])
+        if result is None:
+            return
+        
+        text = f"{result.name} · {result.duration_ms:,.0f} ms · {result.samples} muestras\n"
+        text += f"Pilas: {result.stacks_path}\n"
+        if result.profile_path is None:
+            text += "\n(sin cProfile: había otro perfilador activo; sólo pilas muestreadas)"
+        else:
+            try:
+                output = io.StringIO()
+                stats = pstats.Stats(result.profile_path, stream=output)
+                stats.strip_dirs().sort_stats('cumulative').print_stats(TOP_PROFILE_FUNCTIONS)
+                text += f"Perfil: {result.profile_path}\n" + output.getvalue()
+            except (OSError, EOFError, TypeError, ValueError) as e:
+                text += f"\nError leyendo perfil: {e}"
+        self.performance_profile_text.delete('1.0', tk.END)
+        self.performance_profile_text.insert('1.0', text)
+    
+    def toggle_profiling(self):
+        """Activar o desactivar el perfilado de acciones desde el panel"""
+        ui_profiler.profiler.configure(enabled=self.profiling_enabled.get())
+        self.load_performance_data()
+    
+    def clear_performance_data(self):
+        """Vaciar el buffer de consultas, los tiempos de pantalla y la lista de perfiles (los archivos se conservan)"""
+        monitor = _monitor(self)
+        monitor.clear()
+        ui_profiler.profiler.saved.clear()
+        self.performance_plan_text.delete('1.0', tk.END)
+        self.performance_profile_text.delete('1.0', tk.END)
+        self.load_performance_data()
@@ -0,0 +1,1618 @@
+"""
+Reportes de MEDISYNC
+Diálogo de configuración, vista previa y exportación de reportes
+Métodos de MedisyncApp que se importan la primera vez que se usan
+(ver medisync_views)
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime, timedelta
+import os
+
+from optional_deps import CALENDAR_AVAILABLE
+import report_rollups
+from document_cache import document_key as cache_document_key, safe_filename
+
+REPORT_TEMPLATE_VERSION = 1
+
+
+class ReportViews:
+    """Métodos de MedisyncApp: diálogo de configuración, vista previa y exportación de reportes"""
+    
+    def create_reports_tab(self, parent):
+        """Crear pestaña de reportes con diseño moderno"""
+        # Frame principal
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=15, pady=15)
+        
+        # Header moderno
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=70)
+        header_frame.pack(fill='x', pady=(0, 20))
+        header_frame.pack_propagate(False)
+        
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=20, pady=10)
+        
+        tk.Label(header_content, text="📊", font=('Arial', 18), bg='#1E3A8A', fg='white').pack(side='left', pady=8)
+        tk.Label(header_content, text="REPORTES Y ESTADÍSTICAS", 
+                font=('Arial', 14, 'bold'), bg='#1E3A8A', fg='white').pack(side='left', padx=(10, 0), pady=8)
+        tk.Label(header_content, text="Informes detallados del sistema", 
+                font=('Arial', 10), bg='#1E3A8A', fg='#CBD5E1').pack(side='left', padx=(15, 0), pady=8)
+        
+        # Contenido dividido en paneles
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True)
+        
+        # Panel izquierdo: Reportes principales
+        left_panel = tk.Frame(content_frame, bg='#F8FAFC', width=400)
+        left_panel.pack(side='left', fill='y', padx=(0, 15))
+        left_panel.pack_propagate(False)
+        
+        # Panel derecho: Estadísticas y reportes rápidos
+        right_panel = tk.Frame(content_frame, bg='#F8FAFC')
+        right_panel.pack(side='right', fill='both', expand=True)
+        
+        # Reportes principales
+        reports_frame = tk.LabelFrame(
+            left_panel, 
+            text="📋 REPORTES PRINCIPALES", 
+            font=('Arial', 12, 'bold'),
+            bg='#e3f2fd',
+            fg='#1565c0',
+            padx=20, 
+            pady=15
+        )
+        reports_frame.pack(fill='x', pady=(0, 15))
+        
+        reports_buttons = [
+            ("� Reporte de Ingresos", self.generate_income_report, "#0B5394"),
+            ("📋 Facturas Pendientes", self.generate_pending_invoices_report, "#0B5394"),
+            ("👥 Estadísticas de Usuarios", self.generate_users_report, "#0B5394"),
+            ("📅 Reporte de Citas", self.generate_appointments_report, "#0B5394"),
+            ("💰 Estado Financiero", self.generate_financial_report, "#0B5394"),
+            ("🏥 Reporte de Servicios", self.generate_services_report, "#0B5394")
+        ]
+        
+        for text, command, color in reports_buttons:
+            btn = tk.Button(
+                reports_frame, 
+                text=text, 
+                command=command,
+                bg=color, 
+                fg='white', 
+                font=('Arial', 10, 'bold'),
+                relief='flat',
+                padx=15,
+                pady=8,
+                cursor='hand2'
+            )
+            btn.pack(fill='x', pady=5)
+            
+            # Efectos hover
+            def on_enter(e, button=btn, original_color=color):
+                button.configure(bg=self.darken_color(original_color))
+            def on_leave(e, button=btn, original_color=color):
+                button.configure(bg=original_color)
+            
+            btn.bind("<Enter>", on_enter)
+            btn.bind("<Leave>", on_leave)
+        
+        # Panel de exportación
+        export_frame = tk.LabelFrame(
+            left_panel,
+            text="💾 EXPORTAR DATOS",
+            font=('Arial', 12, 'bold'),
+            bg='#fff3e0',
+            fg='#e65100',
+            padx=20,
+            pady=15
+        )
+        export_frame.pack(fill='x', pady=(0, 15))
+        
+        export_buttons = [
+            ("📄 Exportar a PDF", self.export_all_reports_pdf, "#0B5394"),
+            ("📊 Exportar a Excel", self.export_to_excel, "#0B5394"),
+            ("📧 Enviar por Email", self.email_reports, "#0B5394")
+        ]
+        
+        for text, command, color in export_buttons:
+            btn = tk.Button(
+                export_frame,
+                text=text,
+                command=command,
+                bg=color,
+                fg='white',
+                font=('Arial', 10, 'bold'),
+                relief='flat',
+                padx=15,
+                pady=6
+            )
+            btn.pack(fill='x', pady=3)
+        
+        # Estadísticas en tiempo real
+        stats_frame = tk.LabelFrame(
+            right_panel,
+            text="📊 ESTADÍSTICAS EN TIEMPO REAL",
+            font=('Arial', 12, 'bold'),
+            bg='#e8f5e8',
+            fg='#2e7d32',
+            padx=20,
+            pady=15
+        )
+        stats_frame.pack(fill='x', pady=(0, 15))
+        
+        # Crear área de estadísticas
+        self.create_stats_display(stats_frame)
+        
+        # Panel de filtros avanzados
+        filters_frame = tk.LabelFrame(
+            right_panel,
+            text="🔍 FILTROS AVANZADOS",
+            font=('Arial', 12, 'bold'),
+            bg='#fce4ec',
+            fg='#c2185b',
+            padx=20,
+            pady=15
+        )
+        filters_frame.pack(fill='x', pady=(0, 15))
+        
+        # Crear controles de filtros
+        self.create_report_filters(filters_frame)
+        
+        # Panel de acceso rápido
+        quick_frame = tk.LabelFrame(
+            right_panel,
+            text="⚡ ACCESO RÁPIDO",
+            font=('Arial', 12, 'bold'),
+            bg='#f3e5f5',
+            fg='#7b1fa2',
+            padx=20,
+            pady=15
+        )
+        quick_frame.pack(fill='both', expand=True)
+        
+        quick_actions = [
+            ("📈 Dashboard Ejecutivo", self.show_executive_dashboard),
+            ("🔄 Actualizar Datos", self.refresh_all_data),
+            ("⚙️ Configurar Reportes", self.configure_reports),
+            ("📋 Plantillas", self.manage_report_templates)
+        ]
+        
+        for text, command in quick_actions:
+            btn = tk.Button(
+                quick_frame,
+                text=text,
+                command=command,
+                bg='#64748B',
+                fg='white',
+                font=('Arial', 9, 'bold'),
+                relief='flat',
+                padx=10,
+                pady=5
+            )
+            btn.pack(fill='x', pady=3)
+    
+    def create_stats_display(self, parent):
+        """Crear área de estadísticas en tiempo real"""
+        # Grid de estadísticas; los valores llegan en segundo plano
+        stats_grid = tk.Frame(parent, bg='#e8f5e8')
+        stats_grid.pack(fill='x', pady=10)
+        
+        stats_data = [
+            ("👥 Total Usuarios", lambda stats: stats.get('total_users', 0), "#0B5394"),
+            ("🤒 Total Pacientes", lambda stats: stats.get('total_patients', 0), "#16A085"),
+            ("📅 Citas Hoy", lambda stats: stats.get('appointments_today', 0), "#E67E22"),
+            ("💰 Ingresos Mes", lambda stats: f"RD${stats.get('monthly_income', 0):,.2f}", "#059669"),
+            ("📋 Fact. Pendientes", lambda stats: stats.get('pending_invoices', 0), "#C0392B"),
+            ("👨‍⚕️ Doctores Activos", lambda stats: stats.get('active_doctors', 0), "#8e44ad")
+        ]
+        
+        value_labels = []
+        for i, (label, _, color) in enumerate(stats_data):
+            card = tk.Frame(stats_grid, bg='white', relief='solid', bd=1)
+            card.grid(row=i//2, column=i%2, padx=8, pady=5, sticky='ew')
+            
+            value_label = tk.Label(card, text="…", font=('Arial', 16, 'bold'), 
+                                  fg=color, bg='white')
+            value_label.pack(pady=(8, 2))
+            value_labels.append(value_label)
+            tk.Label(card, text=label, font=('Arial', 9), 
+                    fg='#64748B', bg='white').pack(pady=(0, 8))
+        
+        # Configurar grid
+        stats_grid.grid_columnconfigure(0, weight=1)
+        stats_grid.grid_columnconfigure(1, weight=1)
+        
+        def show_stats(stats):
+            for value_label, (_, format_value, _) in zip(value_labels, stats_data):
+                value_label.config(text=str(format_value(stats)))
+        
+        self.get_background_tasks().submit(
+            self.get_system_stats, on_done=show_stats,
+            on_error=lambda e: tk.Label(parent, text=f"Error cargando estadísticas: {str(e)}", 
+                                        fg='red', bg='#e8f5e8').pack(),
+            key='report_stats', busy=stats_grid
+        )
+    
+    def create_report_filters(self, parent):
+        """Crear controles de filtros para reportes"""
+        # Filtro de fechas
+        date_frame = tk.Frame(parent, bg='#fce4ec')
+        date_frame.pack(fill='x', pady=5)
+        
+        tk.Label(date_frame, text="📅 Período:", font=('Arial', 10, 'bold'),
+                bg='#fce4ec', fg='#c2185b').pack(side='left')
+        
+        self.report_period_filter = ttk.Combobox(
+            date_frame, 
+            values=['Hoy', 'Esta Semana', 'Este Mes', 'Últimos 3 Meses', 'Este Año', 'Personalizado'],
+            state='readonly',
+            width=15
+        )
+        self.report_period_filter.set('Este Mes')
+        self.report_period_filter.pack(side='left', padx=(10, 0))
+        
+        # Filtro de tipo
+        type_frame = tk.Frame(parent, bg='#fce4ec')
+        type_frame.pack(fill='x', pady=5)
+        
+        tk.Label(type_frame, text="📊 Tipo:", font=('Arial', 10, 'bold'),
+                bg='#fce4ec', fg='#c2185b').pack(side='left')
+        
+        self.report_type_filter = ttk.Combobox(
+            type_frame,
+            values=['Todos', 'Financieros', 'Operativos', 'Médicos', 'Administrativos'],
+            state='readonly',
+            width=15
+        )
+        self.report_type_filter.set('Todos')
+        self.report_type_filter.pack(side='left', padx=(10, 0))
+        
+        # Botón aplicar filtros
+        tk.Button(
+            parent,
+            text="🔍 Aplicar Filtros",
+            command=self.apply_report_filters,
+            bg='#c2185b',
+            fg='white',
+            font=('Arial', 10, 'bold'),
+            relief='flat',
+            padx=15,
+            pady=8
+        ).pack(fill='x', pady=(10, 0))
+    
+    def generate_income_report(self):
+        """Generar reporte de ingresos con selección de fechas"""
+        self.show_report_dialog("Reporte de Ingresos", "income")
+    
+    def generate_pending_invoices_report(self):
+        """Generar reporte de facturas pendientes"""
+        self.show_report_dialog("Facturas Pendientes", "pending_invoices")
+    
+    def generate_users_report(self):
+        """Generar reporte de usuarios"""
+        self.show_report_dialog("Estadísticas de Usuarios", "users")
+    
+    def generate_appointments_report(self):
+        """Generar reporte de citas"""
+        self.show_report_dialog("Reporte de Citas", "appointments")
+    
+    def generate_financial_report(self):
+        """Generar reporte financiero completo"""
+        self.show_report_dialog("Estado Financiero", "financial")
+    
+    def generate_services_report(self):
+        """Generar reporte de servicios médicos"""
+        self.show_report_dialog("Reporte de Servicios", "services")
+    
+    def show_report_dialog(self, report_title, report_type):
+        """Mostrar diálogo de configuración de reportes con selección de fechas"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title(f"Configurar {report_title}")
+        dialog.geometry("500x600")
+        dialog.configure(bg='#F8FAFC')
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        # Centrar ventana
+        dialog.update_idletasks()
+        x = (dialog.winfo_screenwidth() // 2) - (500 // 2)
+        y = (dialog.winfo_screenheight() // 2) - (600 // 2)
+        dialog.geometry(f"500x600+{x}+{y}")
+        
+        # Header
+        header = tk.Frame(dialog, bg='#0B5394', height=70)
+        header.pack(fill='x')
+        header.pack_propagate(False)
+        
+        header_content = tk.Frame(header, bg='#0B5394')
+        header_content.pack(expand=True, fill='both', padx=20, pady=15)
+        
+        tk.Label(header_content, text="📊", font=('Arial', 18), bg='#0B5394', fg='white').pack(side='left')
+        tk.Label(header_content, text=report_title.upper(), 
+                font=('Arial', 14, 'bold'), bg='#0B5394', fg='white').pack(side='left', padx=(10, 0))
+        
+        # Contenido principal
+        content = tk.Frame(dialog, bg='#F8FAFC')
+        content.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Configuración de fechas
+        date_frame = tk.LabelFrame(content, text="📅 Configuración de Fechas", 
+                                  font=('Arial', 12, 'bold'), padx=15, pady=15, bg='#F8FAFC')
+        date_frame.pack(fill='x', pady=(0, 15))
+        
+        # Tipo de período
+        period_frame = tk.Frame(date_frame, bg='#F8FAFC')
+        period_frame.pack(fill='x', pady=5)
+        
+        tk.Label(period_frame, text="Período:", font=('Arial', 10, 'bold'), 
+                bg='#F8FAFC').pack(side='left')
+        
+        period_var = tk.StringVar(value="Este Mes")
+        period_combo = ttk.Combobox(period_frame, textvariable=period_var,
+                                   values=['Hoy', 'Ayer', 'Esta Semana', 'Semana Pasada', 
+                                          'Este Mes', 'Mes Pasado', 'Este Año', 'Año Pasado', 'Personalizado'],
+                                   state='readonly', width=20)
+        period_combo.pack(side='left', padx=(10, 0))
+        
+        # Fechas personalizadas (inicialmente ocultas)
+        custom_frame = tk.Frame(date_frame, bg='#F8FAFC')
+        custom_frame.pack(fill='x', pady=10)
+        custom_frame.pack_forget()  # Ocultar inicialmente
+        
+        # Fecha inicio
+        start_frame = tk.Frame(custom_frame, bg='#F8FAFC')
+        start_frame.pack(fill='x', pady=5)
+        
+        tk.Label(start_frame, text="Fecha Inicio:", font=('Arial', 10), bg='#F8FAFC').pack(side='left')
+        start_date_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+        start_date_entry = tk.Entry(start_frame, textvariable=start_date_var, width=15)
+        start_date_entry.pack(side='left', padx=(10, 0))
+        
+        if CALENDAR_AVAILABLE:
+            tk.Button(start_frame, text="📅", command=lambda: self.select_date_calendar(start_date_var),
+                     bg='#0B5394', fg='white', font=('Arial', 8)).pack(side='left', padx=5)
+        
+        # Fecha fin
+        end_frame = tk.Frame(custom_frame, bg='#F8FAFC')
+        end_frame.pack(fill='x', pady=5)
+        
+        tk.Label(end_frame, text="Fecha Fin:", font=('Arial', 10), bg='#F8FAFC').pack(side='left')
+        end_date_var = tk.StringVar(value=datetime.now().strftime('%Y-%m-%d'))
+        end_date_entry = tk.Entry(end_frame, textvariable=end_date_var, width=15)
+        end_date_entry.pack(side='left', padx=(10, 0))
+        
+        if CALENDAR_AVAILABLE:
+            tk.Button(end_frame, text="📅", command=lambda: self.select_date_calendar(end_date_var),
+                     bg='#0B5394', fg='white', font=('Arial', 8)).pack(side='left', padx=5)
+        
+        # Función para mostrar/ocultar fechas personalizadas
+        def on_period_change(*args):
+            if period_var.get() == 'Personalizado':
+                custom_frame.pack(fill='x', pady=10)
+            else:
+                custom_frame.pack_forget()
+        
+        period_var.trace('w', on_period_change)
+        
+        # Opciones de formato
+        format_frame = tk.LabelFrame(content, text="📋 Opciones de Formato", 
+                                    font=('Arial', 12, 'bold'), padx=15, pady=15, bg='#F8FAFC')
+        format_frame.pack(fill='x', pady=(0, 15))
+        
+        # Tipo de salida
+        output_frame = tk.Frame(format_frame, bg='#F8FAFC')
+        output_frame.pack(fill='x', pady=5)
+        
+        tk.Label(output_frame, text="Formato de Salida:", font=('Arial', 10, 'bold'), 
+                bg='#F8FAFC').pack(side='left')
+        
+        output_var = tk.StringVar(value="PDF")
+        output_combo = ttk.Combobox(output_frame, textvariable=output_var,
+                                   values=['PDF', 'Excel', 'Vista Previa'], state='readonly', width=15)
+        output_combo.pack(side='left', padx=(10, 0))
+        
+        # Opciones adicionales según el tipo de reporte
+        options_frame = tk.LabelFrame(content, text="⚙️ Opciones Específicas", 
+                                     font=('Arial', 12, 'bold'), padx=15, pady=15, bg='#F8FAFC')
+        options_frame.pack(fill='x', pady=(0, 15))
+        
+        # Variables para opciones específicas
+        include_charts = tk.BooleanVar(value=True)
+        include_details = tk.BooleanVar(value=True)
+        include_summary = tk.BooleanVar(value=True)
+        
+        tk.Checkbutton(options_frame, text="Incluir Gráficos", variable=include_charts,
+                      font=('Arial', 10), bg='#F8FAFC').pack(anchor='w', pady=2)
+        tk.Checkbutton(options_frame, text="Incluir Detalles", variable=include_details,
+                      font=('Arial', 10), bg='#F8FAFC').pack(anchor='w', pady=2)
+        tk.Checkbutton(options_frame, text="Incluir Resumen", variable=include_summary,
+                      font=('Arial', 10), bg='#F8FAFC').pack(anchor='w', pady=2)
+        
+        # Opciones específicas por tipo de reporte
+        by_payment_method = tk.BooleanVar(value=False)
+        if report_type == "income":
+            tk.Checkbutton(options_frame, text="Desglosar por Método de Pago", 
+                          variable=by_payment_method,
+                          font=('Arial', 10), bg='#F8FAFC').pack(anchor='w', pady=2)
+        elif report_type == "appointments":
+            tk.Checkbutton(options_frame, text="Agrupar por Doctor", 
+                          variable=tk.BooleanVar(value=True),
+                          font=('Arial', 10), bg='#F8FAFC').pack(anchor='w', pady=2)
+        
+        # Botones de acción
+        buttons_frame = tk.Frame(content, bg='#F8FAFC')
+        buttons_frame.pack(fill='x', pady=(15, 0))
+        
+        def generate_report():
+            """Generar el reporte con las configuraciones seleccionadas"""
+            # Calcular fechas según el período seleccionado
+            start_date, end_date = self.calculate_date_range(period_var.get(), 
+                                                           start_date_var.get(), 
+                                                           end_date_var.get())
+            
+            config = {
+                'report_type': report_type,
+                'title': report_title,
+                'start_date': start_date,
+                'end_date': end_date,
+                'output_format': output_var.get(),
+                'include_charts': include_charts.get(),
+                'include_details': include_details.get(),
+                'include_summary': include_summary.get(),
+                'by_payment_method': by_payment_method.get()
+            }
+            
+            dialog.destroy()
+            
+            # Generar reporte según el formato seleccionado
+            if config['output_format'] == 'Vista Previa':
+                self.show_report_preview(config)
+            else:
+                self.generate_report_file(config)
+        
+        def preview_report():
+            """Mostrar vista previa del reporte"""
+            start_date, end_date = self.calculate_date_range(period_var.get(), 
+                                                           start_date_var.get(), 
+                                                           end_date_var.get())
+            
+            config = {
+                'report_type': report_type,
+                'title': report_title,
+                'start_date': start_date,
+                'end_date': end_date,
+                'output_format': 'Vista Previa',
+                'include_charts': include_charts.get(),
+                'include_details': include_details.get(),
+                'include_summary': include_summary.get(),
+                'by_payment_method': by_payment_method.get()
+            }
+            
+            self.show_report_preview(config)
+        
+        # Botones
+        tk.Button(buttons_frame, text="👁️ Vista Previa", command=preview_report,
+                 bg='#64748B', fg='white', font=('Arial', 10, 'bold'),
+                 padx=20, pady=8).pack(side='left', padx=(0, 10))
+        
+        tk.Button(buttons_frame, text="📊 Generar Reporte", command=generate_report,
+                 bg='#0B5394', fg='white', font=('Arial', 10, 'bold'),
+                 padx=20, pady=8).pack(side='left', padx=(0, 10))
+        
+        tk.Button(buttons_frame, text="❌ Cancelar", command=dialog.destroy,
+                 bg='#C0392B', fg='white', font=('Arial', 10, 'bold'),
+                 padx=20, pady=8).pack(side='right')
+    
+    def calculate_date_range(self, period, custom_start, custom_end):
+        """Calcular rango de fechas según el período seleccionado"""
+        today = datetime.now()
+        
+        if period == 'Hoy':
+            start_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_date = today.replace(hour=23, minute=59, second=59, microsecond=999999)
+        elif period == 'Ayer':
+            yesterday = today - timedelta(days=1)
+            start_date = yesterday.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_date = yesterday.replace(hour=23, minute=59, second=59, microsecond=999999)
+        elif period == 'Esta Semana':
+            start_date = today - timedelta(days=today.weekday())
+            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_date = today.replace(hour=23, minute=59, second=59, microsecond=999999)
+        elif period == 'Semana Pasada':
+            start_date = today - timedelta(days=today.weekday() + 7)
+            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            end_date = start_date + timedelta(days=6, hours=23, minutes=59, seconds=59, microseconds=999999)
+        elif period == 'Este Mes':
+            start_date = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            end_date = today.replace(hour=23, minute=59, second=59, microsecond=999999)
+        elif period == 'Mes Pasado':
+            first_day_this_month = today.replace(day=1)
+            last_day_last_month = first_day_this_month - timedelta(days=1)
+            start_date = last_day_last_month.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            end_date = last_day_last_month.replace(hour=23, minute=59, second=59, microsecond=999999)
+        elif period == 'Este Año':
+            start_date = today.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+            end_date = today.replace(hour=23, minute=59, second=59, microsecond=999999)
+        elif period == 'Año Pasado':
+            start_date = today.replace(year=today.year-1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+            end_date = today.replace(year=today.year-1, month=12, day=31, hour=23, minute=59, second=59, microsecond=999999)
+        else:  # Personalizado
+            try:
+                start_date = datetime.strptime(custom_start, '%Y-%m-%d')
+                end_date = datetime.strptime(custom_end, '%Y-%m-%d')
+                end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+            except ValueError:
+                start_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
+                end_date = today.replace(hour=23, minute=59, second=59, microsecond=999999)
+        
+        return start_date, end_date
+    
+    def select_date_calendar(self, date_var):
+        """Abrir selector de fecha con calendario"""
+        if not CALENDAR_AVAILABLE:
+            return
+        
+        try:
+            from tkinter import simpledialog
+            date_str = simpledialog.askstring("Fecha", "Ingrese fecha (YYYY-MM-DD):", 
+                                            initialvalue=date_var.get())
+            if date_str:
+                # Validar formato de fecha
+                try:
+                    datetime.strptime(date_str, '%Y-%m-%d')
+                    date_var.set(date_str)
+                except ValueError:
+                    messagebox.showerror("Error", "Formato de fecha inválido. Use YYYY-MM-DD")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error seleccionando fecha: {str(e)}")
+    
+    def show_report_preview(self, config):
+        """Mostrar vista previa del reporte en una ventana"""
+        preview_window = tk.Toplevel(self.root)
+        preview_window.title(f"Vista Previa - {config['title']}")
+        preview_window.geometry("900x700")
+        preview_window.configure(bg='#F8FAFC')
+        
+        # Centrar ventana
+        preview_window.update_idletasks()
+        x = (preview_window.winfo_screenwidth() // 2) - (900 // 2)
+        y = (preview_window.winfo_screenheight() // 2) - (700 // 2)
+        preview_window.geometry(f"900x700+{x}+{y}")
+        
+        # Header de la vista previa
+        header = tk.Frame(preview_window, bg='#1E3A8A', height=60)
+        header.pack(fill='x')
+        header.pack_propagate(False)
+        
+        header_content = tk.Frame(header, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=20, pady=15)
+        
+        tk.Label(header_content, text="👁️", font=('Arial', 16), bg='#1E3A8A', fg='white').pack(side='left')
+        tk.Label(header_content, text=f"VISTA PREVIA - {config['title'].upper()}", 
+                font=('Arial', 12, 'bold'), bg='#1E3A8A', fg='white').pack(side='left', padx=(10, 0))
+        
+        # Botones en el header
+        buttons_header = tk.Frame(header_content, bg='#1E3A8A')
+        buttons_header.pack(side='right')
+        
+        tk.Button(buttons_header, text="📄 Generar PDF", 
+                 command=lambda: self.generate_pdf_from_preview(config),
+                 bg='#0B5394', fg='white', font=('Arial', 9, 'bold')).pack(side='left', padx=5)
+        
+        tk.Button(buttons_header, text="📊 Generar Excel", 
+                 command=lambda: self.generate_excel_from_preview(config),
+                 bg='#16A085', fg='white', font=('Arial', 9, 'bold')).pack(side='left', padx=5)
+        
+        tk.Button(buttons_header, text="❌ Cerrar", 
+                 command=preview_window.destroy,
+                 bg='#C0392B', fg='white', font=('Arial', 9, 'bold')).pack(side='left', padx=5)
+        
+        # Área de contenido con scroll
+        content_frame = tk.Frame(preview_window, bg='white')
+        content_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        # Canvas para scroll
+        canvas = tk.Canvas(content_frame, bg='white')
+        scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg='white')
+        
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+        
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+        
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Generar contenido del reporte
+        self.generate_report_content(scrollable_frame, config)
+        
+        # Habilitar scroll con mouse
+        def _on_mousewheel(event):
+            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        canvas.bind("<MouseWheel>", _on_mousewheel)
+    
+    def generate_report_content(self, parent, config):
+        """Generar contenido visual del reporte"""
+        try:
+            # Header del reporte
+            self.create_report_header(parent, config)
+            
+            # Separador
+            tk.Frame(parent, bg='#E5E7EB', height=2).pack(fill='x', pady=10)
+            
+            # Resumen ejecutivo
+            if config['include_summary']:
+                self.create_report_summary(parent, config)
+            
+            # Contenido principal según el tipo de reporte
+            if config['report_type'] == 'income':
+                self.create_income_report_content(parent, config)
+            elif config['report_type'] == 'pending_invoices':
+                self.create_pending_invoices_content(parent, config)
+            elif config['report_type'] == 'users':
+                self.create_users_report_content(parent, config)
+            elif config['report_type'] == 'appointments':
+                self.create_appointments_report_content(parent, config)
+            elif config['report_type'] == 'financial':
+                self.create_financial_report_content(parent, config)
+            elif config['report_type'] == 'services':
+                self.create_services_report_content(parent, config)
+            
+            # Footer del reporte
+            self.create_report_footer(parent, config)
+            
+        except Exception as e:
+            tk.Label(parent, text=f"Error generando reporte: {str(e)}", 
+                    fg='red', font=('Arial', 12)).pack(pady=20)
+    
+    def create_report_header(self, parent, config):
+        """Crear header del reporte"""
+        header_frame = tk.Frame(parent, bg='white')
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        # Logo y título principal
+        title_frame = tk.Frame(header_frame, bg='white')
+        title_frame.pack(fill='x')
+        
+        tk.Label(title_frame, text="🏥 MEDISYNC", font=('Arial', 20, 'bold'), 
+                fg='#1E3A8A', bg='white').pack(side='left')
+        tk.Label(title_frame, text="Sistema de Gestión Médica", font=('Arial', 12), 
+                fg='#64748B', bg='white').pack(side='left', padx=(10, 0))
+        
+        # Fecha y hora de generación
+        generation_time = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+        tk.Label(title_frame, text=f"Generado: {generation_time}", font=('Arial', 10), 
+                fg='#64748B', bg='white').pack(side='right')
+        
+        # Título del reporte
+        tk.Label(header_frame, text=config['title'], font=('Arial', 18, 'bold'), 
+                fg='#1E3A8A', bg='white').pack(pady=10)
+        
+        # Período del reporte
+        period_text = f"Período: {config['start_date'].strftime('%d/%m/%Y')} - {config['end_date'].strftime('%d/%m/%Y')}"
+        tk.Label(header_frame, text=period_text, font=('Arial', 12), 
+                fg='#059669', bg='white').pack()
+    
+    def create_report_summary(self, parent, config):
+        """Crear resumen ejecutivo del reporte"""
+        summary_frame = tk.LabelFrame(parent, text="📊 Resumen Ejecutivo", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        summary_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            # Obtener datos para el resumen según el tipo de reporte
+            summary_data = self.get_report_summary_data(config)
+            
+            # Grid de métricas principales
+            metrics_frame = tk.Frame(summary_frame, bg='white')
+            metrics_frame.pack(fill='x')
+            
+            for i, (label, value, color) in enumerate(summary_data):
+                metric_card = tk.Frame(metrics_frame, bg='#F8FAFC', relief='solid', bd=1)
+                metric_card.grid(row=i//3, column=i%3, padx=10, pady=10, sticky='ew')
+                
+                tk.Label(metric_card, text=str(value), font=('Arial', 16, 'bold'), 
+                        fg=color, bg='#F8FAFC').pack(pady=(10, 5))
+                tk.Label(metric_card, text=label, font=('Arial', 10), 
+                        fg='#64748B', bg='#F8FAFC').pack(pady=(0, 10))
+            
+            # Configurar expansión del grid
+            for i in range(3):
+                metrics_frame.grid_columnconfigure(i, weight=1)
+                
+        except Exception as e:
+            tk.Label(summary_frame, text=f"Error en resumen: {str(e)}", 
+                    fg='red', bg='white').pack()
+    
+    def create_income_report_content(self, parent, config):
+        """Crear contenido específico del reporte de ingresos"""
+        content_frame = tk.LabelFrame(parent, text="💰 Análisis de Ingresos", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        content_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Ingresos por día (tabla de hechos rollup_facturas_dia)
+            income_data = report_rollups.income_by_day(
+                cursor, config['start_date'], config['end_date'], self.INCOME_REPORT_STATES
+            )
+            
+            if income_data:
+                # Tabla de ingresos diarios
+                table_frame = tk.Frame(content_frame, bg='white')
+                table_frame.pack(fill='x', pady=10)
+                
+                # Headers
+                headers = ['Fecha', 'Ingresos', 'Facturas', 'Promedio']
+                header_frame = tk.Frame(table_frame, bg='#1E3A8A')
+                header_frame.pack(fill='x')
+                
+                for header in headers:
+                    tk.Label(header_frame, text=header, font=('Arial', 12, 'bold'), 
+                            fg='white', bg='#1E3A8A', width=15).pack(side='left', padx=1, pady=8)
+                
+                # Datos
+                total_income = 0
+                total_invoices = 0
+                
+                for fecha, total_dia, num_facturas in income_data:
+                    row_frame = tk.Frame(table_frame, bg='#F8FAFC')
+                    row_frame.pack(fill='x')
+                    
+                    promedio = total_dia / num_facturas if num_facturas > 0 else 0
+                    total_income += total_dia
+                    total_invoices += num_facturas
+                    
+                    values = [
+                        datetime.fromisoformat(fecha).strftime('%d/%m/%Y'),
+                        f"RD${total_dia:,.2f}",
+                        str(num_facturas),
+                        f"RD${promedio:,.2f}"
+                    ]
+                    
+                    for value in values:
+                        tk.Label(row_frame, text=value, font=('Arial', 10), 
+                                fg='#1E293B', bg='#F8FAFC', width=15).pack(side='left', padx=1, pady=5)
+                
+                # Totales
+                total_frame = tk.Frame(table_frame, bg='#059669')
+                total_frame.pack(fill='x')
+                
+                total_avg = total_income / total_invoices if total_invoices > 0 else 0
+                total_values = [
+                    'TOTAL',
+                    f"RD${total_income:,.2f}",
+                    str(total_invoices),
+                    f"RD${total_avg:,.2f}"
+                ]
+                
+                for value in total_values:
+                    tk.Label(total_frame, text=value, font=('Arial', 12, 'bold'), 
+                            fg='white', bg='#0B5394', width=15).pack(side='left', padx=1, pady=8)
+                
+                # Desglose por método de pago
+                if config.get('by_payment_method'):
+                    method_frame = tk.Frame(content_frame, bg='white')
+                    method_frame.pack(fill='x', pady=(20, 0))
+                    
+                    tk.Label(method_frame, text="Ingresos por Método de Pago", font=('Arial', 12, 'bold'),
+                            fg='#1E3A8A', bg='white').pack(pady=(0, 10))
+                    
+                    for metodo, monto, facturas in report_rollups.income_breakdown(
+                            cursor, config['start_date'], config['end_date'], self.INCOME_REPORT_STATES):
+                        row_frame = tk.Frame(method_frame, bg='#F8FAFC')
+                        row_frame.pack(fill='x', pady=2)
+                        
+                        tk.Label(row_frame, text=f"{metodo or 'Sin especificar'}:", font=('Arial', 10, 'bold'),
+                                fg='#1E293B', bg='#F8FAFC', width=25, anchor='w').pack(side='left')
+                        tk.Label(row_frame, text=f"RD${monto:,.2f} ({facturas} facturas)", font=('Arial', 10),
+                                fg='#059669', bg='#F8FAFC', anchor='e').pack(side='right')
+            else:
+                tk.Label(content_frame, text="No hay datos de ingresos para el período seleccionado", 
+                        font=('Arial', 12), fg='#64748B', bg='white').pack(pady=20)
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error cargando datos: {str(e)}", 
+                    fg='red', bg='white').pack()
+    
+    def create_appointments_report_content(self, parent, config):
+        """Crear contenido del reporte de citas"""
+        content_frame = tk.LabelFrame(parent, text="📅 Análisis de Citas", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        content_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Citas por estado (tablas de hechos de citas)
+            status_data = report_rollups.appointments_by_state(cursor, config['start_date'], config['end_date'])
+            
+            if status_data:
+                # Tabla de estados
+                table_frame = tk.Frame(content_frame, bg='white')
+                table_frame.pack(fill='x', pady=10)
+                
+                tk.Label(table_frame, text="Distribución por Estado", font=('Arial', 12, 'bold'), 
+                        fg='#1E3A8A', bg='white').pack(pady=(0, 10))
+                
+                for estado, cantidad in status_data:
+                    row_frame = tk.Frame(table_frame, bg='#F8FAFC')
+                    row_frame.pack(fill='x', pady=2)
+                    
+                    tk.Label(row_frame, text=f"{estado.title()}:", font=('Arial', 10, 'bold'), 
+                            fg='#1E293B', bg='#F8FAFC', width=15, anchor='w').pack(side='left')
+                    tk.Label(row_frame, text=str(cantidad), font=('Arial', 10), 
+                            fg='#059669', bg='#F8FAFC', width=10, anchor='e').pack(side='right')
+            
+            # Citas por doctor
+            doctor_data = [
+                (doctor, cantidad) for _, doctor, cantidad, _, _ in
+                report_rollups.appointments_by_doctor(cursor, config['start_date'], config['end_date'], limit=10)
+            ]
+            
+            if doctor_data:
+                doctor_frame = tk.Frame(content_frame, bg='white')
+                doctor_frame.pack(fill='x', pady=(20, 0))
+                
+                tk.Label(doctor_frame, text="Top 10 Doctores por Citas", font=('Arial', 12, 'bold'), 
+                        fg='#1E3A8A', bg='white').pack(pady=(0, 10))
+                
+                for doctor, cantidad in doctor_data:
+                    row_frame = tk.Frame(doctor_frame, bg='#F8FAFC')
+                    row_frame.pack(fill='x', pady=2)
+                    
+                    tk.Label(row_frame, text=f"Dr. {doctor}:", font=('Arial', 10), 
+                            fg='#1E293B', bg='#F8FAFC', width=25, anchor='w').pack(side='left')
+                    tk.Label(row_frame, text=str(cantidad), font=('Arial', 10, 'bold'), 
+                            fg='#059669', bg='#F8FAFC', width=10, anchor='e').pack(side='right')
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error cargando datos: {str(e)}", 
+                    fg='red', bg='white').pack()
+    
+    def create_users_report_content(self, parent, config):
+        """Crear contenido del reporte de usuarios"""
+        content_frame = tk.LabelFrame(parent, text="👥 Análisis de Usuarios", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        content_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Usuarios por rol
+            cursor.execute("""
+                SELECT rol, COUNT(*) as cantidad
+                FROM usuarios 
+                GROUP BY rol
+                ORDER BY cantidad DESC
+            """)
+            
+            role_data = cursor.fetchall()
+            
+            if role_data:
+                table_frame = tk.Frame(content_frame, bg='white')
+                table_frame.pack(fill='x', pady=10)
+                
+                tk.Label(table_frame, text="Distribución por Rol", font=('Arial', 12, 'bold'), 
+                        fg='#1E3A8A', bg='white').pack(pady=(0, 10))
+                
+                total_users = sum(cantidad for _, cantidad in role_data)
+                
+                for rol, cantidad in role_data:
+                    percentage = (cantidad / total_users) * 100 if total_users > 0 else 0
+                    
+                    row_frame = tk.Frame(table_frame, bg='#F8FAFC')
+                    row_frame.pack(fill='x', pady=2)
+                    
+                    tk.Label(row_frame, text=f"{rol.title()}:", font=('Arial', 10, 'bold'), 
+                            fg='#1E293B', bg='#F8FAFC', width=15, anchor='w').pack(side='left')
+                    tk.Label(row_frame, text=f"{cantidad} ({percentage:.1f}%)", font=('Arial', 10), 
+                            fg='#059669', bg='#F8FAFC', width=15, anchor='e').pack(side='right')
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error cargando datos: {str(e)}", 
+                    fg='red', bg='white').pack()
+    
+    def create_pending_invoices_content(self, parent, config):
+        """Crear contenido del reporte de facturas pendientes"""
+        content_frame = tk.LabelFrame(parent, text="📋 Facturas Pendientes", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        content_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT f.numero_factura, f.fecha_creacion, 
+                       u.nombre || ' ' || u.apellido as paciente,
+                       f.monto, f.estado
+                FROM facturas f
+                JOIN usuarios u ON f.paciente_id = u.id
+                WHERE f.estado = 'pendiente' 
+                AND f.fecha_creacion BETWEEN ? AND ?
+                ORDER BY f.fecha_creacion DESC
+            """, (config['start_date'].isoformat(), config['end_date'].isoformat()))
+            
+            pending_data = cursor.fetchall()
+            
+            if pending_data:
+                # Crear tabla de facturas pendientes
+                table_frame = tk.Frame(content_frame, bg='white')
+                table_frame.pack(fill='x', pady=10)
+                
+                # Headers
+                headers = ['Número', 'Fecha', 'Paciente', 'Monto', 'Días Pendiente']
+                header_frame = tk.Frame(table_frame, bg='#0B5394')
+                header_frame.pack(fill='x')
+                
+                for header in headers:
+                    tk.Label(header_frame, text=header, font=('Arial', 11, 'bold'), 
+                            fg='white', bg='#0B5394', width=15).pack(side='left', padx=1, pady=8)
+                
+                total_pending = 0
+                
+                for numero, fecha_str, paciente, monto, estado in pending_data:
+                    row_frame = tk.Frame(table_frame, bg='#FFEBEE')
+                    row_frame.pack(fill='x')
+                    
+                    fecha_creacion = datetime.fromisoformat(fecha_str)
+                    dias_pendiente = (datetime.now() - fecha_creacion).days
+                    total_pending += monto
+                    
+                    values = [
+                        numero,
+                        fecha_creacion.strftime('%d/%m/%Y'),
+                        paciente[:20] + '...' if len(paciente) > 20 else paciente,
+                        f"RD${monto:,.2f}",
+                        f"{dias_pendiente} días"
+                    ]
+                    
+                    for value in values:
+                        tk.Label(row_frame, text=str(value), font=('Arial', 9), 
+                                fg='#1E293B', bg='#FFEBEE', width=15).pack(side='left', padx=1, pady=3)
+                
+                # Total
+                total_frame = tk.Frame(table_frame, bg='#0B5394')
+                total_frame.pack(fill='x')
+                
+                tk.Label(total_frame, text=f"TOTAL PENDIENTE: RD${total_pending:,.2f}", 
+                        font=('Arial', 12, 'bold'), fg='white', bg='#0B5394').pack(pady=8)
+            else:
+                tk.Label(content_frame, text="¡Excelente! No hay facturas pendientes en este período", 
+                        font=('Arial', 12), fg='#0B5394', bg='white').pack(pady=20)
+            
+            cursor.close()
+            conn.close()
+            
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error cargando datos: {str(e)}", 
+                    fg='red', bg='white').pack()
+    
+    def create_financial_report_content(self, parent, config):
+        """Crear contenido del reporte financiero"""
+        content_frame = tk.LabelFrame(parent, text="💰 Estado Financiero", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        content_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Cobrado (por fecha de pago) y pendiente (por fecha de emisión) desde las tablas de hechos
+            try:
+                summary = report_rollups.financial_summary(cursor, config['start_date'], config['end_date'])
+            finally:
+                cursor.close()
+                conn.close()
+            total_ingresos = summary['cobrado']
+            total_pendiente = summary['pendiente']
+            num_pagadas = summary['facturas_pagadas']
+            num_pendientes = summary['facturas_pendientes']
+            
+            # Frame de métricas principales
+            metrics_frame = tk.Frame(content_frame, bg='white')
+            metrics_frame.pack(fill='x', pady=(0, 20))
+            
+            # Ingresos
+            income_card = tk.Frame(metrics_frame, bg='#0B5394', relief='raised', bd=2)
+            income_card.pack(side='left', fill='both', expand=True, padx=(0, 10))
+            tk.Label(income_card, text="💰 INGRESOS TOTALES", font=('Arial', 10, 'bold'), 
+                    fg='white', bg='#0B5394').pack(pady=(10, 5))
+            tk.Label(income_card, text=f"RD${total_ingresos:,.2f}", font=('Arial', 14, 'bold'), 
+                    fg='white', bg='#0B5394').pack(pady=(0, 5))
+            tk.Label(income_card, text=f"{num_pagadas} facturas pagadas", font=('Arial', 9), 
+                    fg='white', bg='#0B5394').pack(pady=(0, 10))
+            
+            # Pendientes
+            pending_card = tk.Frame(metrics_frame, bg='#0B5394', relief='raised', bd=2)
+            pending_card.pack(side='left', fill='both', expand=True, padx=(5, 5))
+            tk.Label(pending_card, text="⏳ CUENTAS POR COBRAR", font=('Arial', 10, 'bold'), 
+                    fg='white', bg='#0B5394').pack(pady=(10, 5))
+            tk.Label(pending_card, text=f"RD${total_pendiente:,.2f}", font=('Arial', 14, 'bold'), 
+                    fg='white', bg='#0B5394').pack(pady=(0, 5))
+            tk.Label(pending_card, text=f"{num_pendientes} facturas pendientes", font=('Arial', 9), 
+                    fg='white', bg='#0B5394').pack(pady=(0, 10))
+            
+            # Total neto
+            total_neto = total_ingresos + total_pendiente
+            total_card = tk.Frame(metrics_frame, bg='#0B5394', relief='raised', bd=2)
+            total_card.pack(side='left', fill='both', expand=True, padx=(10, 0))
+            tk.Label(total_card, text="📊 FACTURACIÓN TOTAL", font=('Arial', 10, 'bold'), 
+                    fg='white', bg='#0B5394').pack(pady=(10, 5))
+            tk.Label(total_card, text=f"RD${total_neto:,.2f}", font=('Arial', 14, 'bold'), 
+                    fg='white', bg='#0B5394').pack(pady=(0, 5))
+            tk.Label(total_card, text=f"{num_pagadas + num_pendientes} facturas totales", font=('Arial', 9), 
+                    fg='white', bg='#0B5394').pack(pady=(0, 10))
+            
+            # Análisis de eficiencia de cobro
+            if total_neto > 0:
+                efficiency_frame = tk.Frame(content_frame, bg='white')
+                efficiency_frame.pack(fill='x', pady=(10, 0))
+                
+                tk.Label(efficiency_frame, text="📈 Análisis de Eficiencia de Cobro", 
+                        font=('Arial', 12, 'bold'), fg='#1E293B', bg='white').pack(anchor='w')
+                
+                cobro_percentage = (total_ingresos / total_neto) * 100
+                pendiente_percentage = (total_pendiente / total_neto) * 100
+                
+                # Barra de progreso visual
+                progress_frame = tk.Frame(efficiency_frame, bg='white')
+                progress_frame.pack(fill='x', pady=10)
+                
+                # Barra de cobrado
+                cobrado_width = int((cobro_percentage / 100) * 300)
+                if cobrado_width > 0:
+                    cobrado_bar = tk.Frame(progress_frame, bg='#0B5394', height=25)
+                    cobrado_bar.pack(side='left', fill='y')
+                    cobrado_bar.config(width=cobrado_width)
+                    tk.Label(cobrado_bar, text=f"Cobrado: {cobro_percentage:.1f}%", 
+                            font=('Arial', 9, 'bold'), fg='white', bg='#0B5394').pack(pady=3)
+                
+                # Barra de pendiente
+                pendiente_width = int((pendiente_percentage / 100) * 300)
+                if pendiente_width > 0:
+                    pendiente_bar = tk.Frame(progress_frame, bg='#0B5394', height=25)
+                    pendiente_bar.pack(side='left', fill='y')
+                    pendiente_bar.config(width=pendiente_width)
+                    tk.Label(pendiente_bar, text=f"Pendiente: {pendiente_percentage:.1f}%", 
+                            font=('Arial', 9, 'bold'), fg='white', bg='#0B5394').pack(pady=3)
+                
+                # Recomendaciones
+                recommendations_frame = tk.Frame(content_frame, bg='#F8F9FA', relief='sunken', bd=1)
+                recommendations_frame.pack(fill='x', pady=(15, 0))
+                
+                tk.Label(recommendations_frame, text="💡 Recomendaciones", 
+                        font=('Arial', 11, 'bold'), fg='#1E293B', bg='#F8F9FA').pack(anchor='w', padx=10, pady=(10, 5))
+                
+                if pendiente_percentage > 30:
+                    tk.Label(recommendations_frame, text="• Alto porcentaje de cuentas por cobrar - revisar procesos de cobro", 
+                            font=('Arial', 10), fg='#0B5394', bg='#F8F9FA').pack(anchor='w', padx=20)
+                elif pendiente_percentage > 15:
+                    tk.Label(recommendations_frame, text="• Porcentaje moderado de cuentas por cobrar - seguimiento regular", 
+                            font=('Arial', 10), fg='#0B5394', bg='#F8F9FA').pack(anchor='w', padx=20)
+                else:
+                    tk.Label(recommendations_frame, text="• Excelente eficiencia de cobro - mantener procesos actuales", 
+                            font=('Arial', 10), fg='#0B5394', bg='#F8F9FA').pack(anchor='w', padx=20)
+                
+                if num_pendientes > 0:
+                    tk.Label(recommendations_frame, text=f"• Revisar {num_pendientes} facturas pendientes para acelerar cobro", 
+                            font=('Arial', 10), fg='#0B5394', bg='#F8F9FA').pack(anchor='w', padx=20, pady=(0, 10))
+            
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error cargando datos financieros: {str(e)}", 
+                    font=('Arial', 12), fg='red', bg='white').pack(pady=20)
+    
+    def create_services_report_content(self, parent, config):
+        """Crear contenido del reporte de servicios"""
+        content_frame = tk.LabelFrame(parent, text="🏥 Análisis de Servicios", 
+                                     font=('Arial', 14, 'bold'), padx=20, pady=15, bg='white')
+        content_frame.pack(fill='x', pady=(0, 20))
+        
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            start_date, end_date = config['start_date'], config['end_date']
+            try:
+                # Citas por estado y motivos más frecuentes (tablas de hechos)
+                citas_estado = report_rollups.appointments_by_state(cursor, start_date, end_date)
+                servicios_populares = report_rollups.top_reasons(cursor, start_date, end_date, limit=10)
+                
+                # Citas por doctor y promedio de lo facturado por cada uno
+                doctor_stats = [
+                    (doctor, num_citas, monto / facturas if facturas else None)
+                    for _, doctor, num_citas, monto, facturas in
+                    report_rollups.appointments_by_doctor(cursor, start_date, end_date, limit=None)
+                ]
+            finally:
+                cursor.close()
+                conn.close()
+            
+            # Frame principal con dos columnas
+            main_frame = tk.Frame(content_frame, bg='white')
+            main_frame.pack(fill='x', pady=(0, 20))
+            
+            # Columna izquierda - Estados de citas
+            left_frame = tk.Frame(main_frame, bg='white')
+            left_frame.pack(side='left', fill='both', expand=True, padx=(0, 10))
+            
+            tk.Label(left_frame, text="📊 Estados de Citas", font=('Arial', 12, 'bold'), 
+                    fg='#1E293B', bg='white').pack(anchor='w', pady=(0, 10))
+            
+            if citas_estado:
+                total_citas = sum(cantidad for _, cantidad in citas_estado)
+                
+                for estado, cantidad in citas_estado:
+                    porcentaje = (cantidad / total_citas) * 100
+                    
+                    # Determinar color según estado
+                    color = '#0B5394' if estado == 'confirmada' else \
+                           '#0B5394' if estado == 'cancelada' else \
+                           '#0B5394' if estado == 'pendiente' else '#6B7280'
+                    
+                    estado_frame = tk.Frame(left_frame, bg=color, relief='raised', bd=1)
+                    estado_frame.pack(fill='x', pady=2)
+                    
+                    info_frame = tk.Frame(estado_frame, bg=color)
+                    info_frame.pack(fill='x', padx=10, pady=5)
+                    
+                    tk.Label(info_frame, text=estado.capitalize(), font=('Arial', 10, 'bold'), 
+                            fg='white', bg=color).pack(side='left')
+                    tk.Label(info_frame, text=f"{cantidad} ({porcentaje:.1f}%)", font=('Arial', 10), 
+                            fg='white', bg=color).pack(side='right')
+            
+            # Columna derecha - Servicios populares
+            right_frame = tk.Frame(main_frame, bg='white')
+            right_frame.pack(side='right', fill='both', expand=True, padx=(10, 0))
+            
+            tk.Label(right_frame, text="🎯 Servicios Más Solicitados", font=('Arial', 12, 'bold'), 
+                    fg='#1E293B', bg='white').pack(anchor='w', pady=(0, 10))
+            
+            if servicios_populares:
+                for i, (motivo, cantidad) in enumerate(servicios_populares[:5]):
+                    # Gradiente de colores - solo azul estándar
+                    colors = ['#0B5394', '#0B5394', '#0B5394', '#0B5394', '#0B5394']
+                    color = colors[i % len(colors)]
+                    
+                    servicio_frame = tk.Frame(right_frame, bg=color, relief='raised', bd=1)
+                    servicio_frame.pack(fill='x', pady=2)
+                    
+                    info_frame = tk.Frame(servicio_frame, bg=color)
+                    info_frame.pack(fill='x', padx=10, pady=5)
+                    
+                    # Truncar texto si es muy largo
+                    motivo_display = motivo[:25] + '...' if len(motivo) > 25 else motivo
+                    
+                    tk.Label(info_frame, text=motivo_display, font=('Arial', 9, 'bold'), 
+                            fg='white', bg=color).pack(side='left')
+                    tk.Label(info_frame, text=f"{cantidad}", font=('Arial', 9), 
+                            fg='white', bg=color).pack(side='right')
+            
+            # Análisis por doctor
+            if doctor_stats:
+                doctor_frame = tk.Frame(content_frame, bg='white')
+                doctor_frame.pack(fill='x', pady=(15, 0))
+                
+                tk.Label(doctor_frame, text="👨‍⚕️ Rendimiento por Doctor", font=('Arial', 12, 'bold'), 
+                        fg='#1E293B', bg='white').pack(anchor='w', pady=(0, 10))
+                
+                # Headers de tabla
+                header_frame = tk.Frame(doctor_frame, bg='#0B5394')
+                header_frame.pack(fill='x')
+                
+                headers = ['Doctor', 'Citas Atendidas', 'Promedio Facturación']
+                header_widths = [30, 15, 20]
+                
+                for header, width in zip(headers, header_widths):
+                    tk.Label(header_frame, text=header, font=('Arial', 10, 'bold'), 
+                            fg='white', bg='#0B5394', width=width).pack(side='left', padx=1, pady=8)
+                
+                # Datos de doctores
+                for doctor, num_citas, promedio in doctor_stats[:5]:  # Top 5 doctores
+                    row_frame = tk.Frame(doctor_frame, bg='#F8F9FA')
+                    row_frame.pack(fill='x')
+                    
+                    promedio_display = f"RD${promedio:,.2f}" if promedio else "N/A"
+                    
+                    values = [
+                        doctor[:28] + '...' if len(doctor) > 28 else doctor,
+                        str(num_citas),
+                        promedio_display
+                    ]
+                    
+                    for value, width in zip(values, header_widths):
+                        tk.Label(row_frame, text=value, font=('Arial', 9), 
+                                fg='#1E293B', bg='#F8F9FA', width=width).pack(side='left', padx=1, pady=4)
+            
+            # Resumen de actividad
+            summary_frame = tk.Frame(content_frame, bg='#EEF2FF', relief='sunken', bd=1)
+            summary_frame.pack(fill='x', pady=(15, 0))
+            
+            tk.Label(summary_frame, text="📋 Resumen de Actividad", font=('Arial', 11, 'bold'), 
+                    fg='#1E293B', bg='#EEF2FF').pack(anchor='w', padx=10, pady=(10, 5))
+            
+            if citas_estado:
+                total_citas = sum(cantidad for _, cantidad in citas_estado)
+                confirmadas = next((cantidad for estado, cantidad in citas_estado if estado == 'confirmada'), 0)
+                
+                tk.Label(summary_frame, text=f"• Total de citas programadas: {total_citas}", 
+                        font=('Arial', 10), fg='#374151', bg='#EEF2FF').pack(anchor='w', padx=20)
+                tk.Label(summary_frame, text=f"• Citas confirmadas: {confirmadas} ({(confirmadas/total_citas)*100:.1f}%)", 
+                        font=('Arial', 10), fg='#374151', bg='#EEF2FF').pack(anchor='w', padx=20)
+                
+                if servicios_populares:
+                    servicio_top = servicios_populares[0][0] if servicios_populares else "N/A"
+                    tk.Label(summary_frame, text=f"• Servicio más solicitado: {servicio_top}", 
+                            font=('Arial', 10), fg='#374151', bg='#EEF2FF').pack(anchor='w', padx=20)
+                
+                if doctor_stats:
+                    doctor_top = doctor_stats[0][0] if doctor_stats else "N/A"
+                    tk.Label(summary_frame, text=f"• Doctor con más citas: {doctor_top}", 
+                            font=('Arial', 10), fg='#374151', bg='#EEF2FF').pack(anchor='w', padx=20, pady=(0, 10))
+            
+        except Exception as e:
+            tk.Label(content_frame, text=f"Error cargando datos de servicios: {str(e)}", 
+                    font=('Arial', 12), fg='red', bg='white').pack(pady=20)
+    
+    def create_report_footer(self, parent, config):
+        """Crear footer del reporte"""
+        footer_frame = tk.Frame(parent, bg='white')
+        footer_frame.pack(fill='x', pady=(20, 0))
+        
+        # Separador
+        tk.Frame(footer_frame, bg='#E5E7EB', height=2).pack(fill='x', pady=(0, 15))
+        
+        # Información del footer
+        footer_text = f"""
+Este reporte fue generado automáticamente por MEDISYNC
+Fecha de generación: {datetime.now().strftime('%d/%m/%Y a las %H:%M:%S')}
+Período analizado: {config['start_date'].strftime('%d/%m/%Y')} - {config['end_date'].strftime('%d/%m/%Y')}
+        
+Para consultas sobre este reporte, contacte al departamento de administración.
+© 2025 MEDISYNC - Sistema de Gestión Médica Integral
+        """
+        
+        tk.Label(footer_frame, text=footer_text.strip(), font=('Arial', 9), 
+                fg='#64748B', bg='white', justify='center').pack()
+    
+    def get_report_summary_data(self, config):
+        """Obtener datos de resumen según el tipo de reporte"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            summary_data = []
+            
+            if config['report_type'] == 'income':
+                # Total de ingresos (meses completos desde rollup_facturas_mes)
+                total_income, total_invoices = report_rollups.income_totals(
+                    cursor, config['start_date'], config['end_date'], self.INCOME_REPORT_STATES
+                )
+                avg_invoice = total_income / total_invoices if total_invoices > 0 else 0
+                
+                summary_data = [
+                    ("Total de Ingresos", f"RD${total_income:,.2f}", "#059669"),
+                    ("Facturas Pagadas", total_invoices, "#0B5394"),
+                    ("Promedio por Factura", f"RD${avg_invoice:,.2f}", "#E67E22")
+                ]
+                
+            elif config['report_type'] == 'appointments':
+                total_appointments, completed, cancelled = report_rollups.appointments_totals(
+                    cursor, config['start_date'], config['end_date']
+                )
+                completion_rate = (completed / total_appointments * 100) if total_appointments > 0 else 0
+                
+                summary_data = [
+                    ("Total de Citas", total_appointments, "#0B5394"),
+                    ("Citas Completadas", completed, "#059669"),
+                    ("Tasa de Completación", f"{completion_rate:.1f}%", "#E67E22")
+                ]
+            
+            # Agregar más tipos según sea necesario
+            
+            cursor.close()
+            conn.close()
+            
+            return summary_data
+            
+        except Exception as e:
+            return [("Error", str(e), "#C0392B")]
+    
+    def generate_pdf_from_preview(self, config):
+        """Generar PDF del reporte desde la vista previa"""
+        try:
+            # Verificar si reportlab está disponible
+            try:
+                from reportlab.lib.pagesizes import A4
+                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                from reportlab.lib.units import inch
+                from reportlab.lib import colors
+                from reportlab.pdfgen import canvas
+            except ImportError:
+                self.show_missing_capability('pdf')
+                return
+            
+            # Datos del reporte: con los mismos datos y plantilla se reutiliza el PDF anterior
+            report_data = self.get_report_data_for_pdf(config)
+            summary_data = self.get_report_summary_data(config) if config['include_summary'] else []
+            cache = self.get_document_cache()
+            document_key = cache_document_key('reporte', REPORT_TEMPLATE_VERSION, {
+                'config': {key: value for key, value in config.items() if key != 'output_format'},
+                'datos': [list(row) for row in report_data or []],
+                'resumen': [list(row) for row in summary_data],
+            })
+            
+            # Crear directorio para reportes
+            reports_dir = "reportes_pdf"
+            if not os.path.exists(reports_dir):
+                os.makedirs(reports_dir)
+            
+            # Nombre de archivo: periodo y hash de los datos (no la hora de generación)
+            report_type_name = safe_filename(config['title'])
+            period = f"{config['start_date'].strftime('%Y%m%d')}_{config['end_date'].strftime('%Y%m%d')}"
+            filename = f"Reporte_{report_type_name}_{period}_{document_key[:12]}.pdf"
+            filepath = os.path.join(reports_dir, filename)
+            
+            if cache.lookup(document_key) is None:
+                with cache.writing('reporte', document_key, filepath) as tmp_path:
+                    self.build_report_pdf(tmp_path, config, report_data, summary_data)
+            
+            # Mostrar mensaje de éxito y abrir PDF
+            result = messagebox.askquestion(
+                "PDF Generado Exitosamente", 
+                f"Reporte guardado como: {filename}\n\n¿Desea abrir el PDF ahora?",
+                icon='question'
+            )
+            
+            if result == 'yes':
+                self.open_document(filepath)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error generando PDF: {str(e)}")
+    
+    def build_report_pdf(self, filepath, config, report_data, summary_data):
+        """Escribir el PDF de un reporte con los datos ya consultados"""
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.lib import colors
+        
+        # Crear el PDF
+        doc = SimpleDocTemplate(filepath, pagesize=A4, rightMargin=72, leftMargin=72, 
+                               topMargin=72, bottomMargin=18)
+        styles = getSampleStyleSheet()
+        story = []
+        
+        # Estilo personalizado para el título
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            textColor=colors.darkblue,
+            alignment=1,  # Centrado
+            fontName='Helvetica-Bold'
+        )
+        
+        # Header de la clínica
+        story.append(Paragraph("🏥 MEDISYNC - Sistema de Gestión Médica", title_style))
+        story.append(Spacer(1, 20))
+        
+        # Título del reporte
+        story.append(Paragraph(config['title'], styles['Heading1']))
+        story.append(Spacer(1, 12))
+        
+        # Información del período
+        period_text = f"Período: {config['start_date'].strftime('%d/%m/%Y')} - {config['end_date'].strftime('%d/%m/%Y')}"
+        story.append(Paragraph(period_text, styles['Normal']))
+        story.append(Paragraph(f"Generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", styles['Normal']))
+        story.append(Spacer(1, 30))
+        
+        # Resumen ejecutivo
+        if config['include_summary']:
+            story.append(Paragraph("📊 Resumen Ejecutivo", styles['Heading2']))
+            
+            summary_table_data = [['Métrica', 'Valor']]
+            for label, value, _ in summary_data:
+                summary_table_data.append([label, str(value)])
+            
+            summary_table = Table(summary_table_data, colWidths=[3*inch, 2*inch])
+            summary_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            
+            story.append(summary_table)
+            story.append(Spacer(1, 30))
+        
+        # Contenido detallado
+        if config['include_details'] and report_data:
+            story.append(Paragraph("📋 Información Detallada", styles['Heading2']))
+            
+            # Crear tabla con los datos
+            if config['report_type'] == 'income':
+                headers = ['Fecha', 'Ingresos', 'Facturas', 'Promedio']
+            elif config['report_type'] == 'appointments':
+                headers = ['Fecha', 'Total Citas', 'Completadas', 'Canceladas']
+            elif config['report_type'] == 'pending_invoices':
+                headers = ['Número Factura', 'Paciente', 'Monto', 'Días Pendiente']
+            else:
+                headers = ['Descripción', 'Valor']
+            
+            table_data = [headers]
+            for row in report_data[:20]:  # Limitar a 20 filas para el PDF
+                table_data.append([str(cell) for cell in row])
+            
+            data_table = Table(table_data)
+            data_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 1), (-1, -1), 9),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            
+            story.append(data_table)
+            story.append(Spacer(1, 30))
+        
+        # Footer
+        footer_text = f"""
+        Este reporte fue generado automáticamente por MEDISYNC
+        Fecha de generación: {datetime.now().strftime('%d/%m/%Y a las %H:%M:%S')}
+        © 2025 MEDISYNC - Sistema de Gestión Médica Integral
+        """
+        story.append(Paragraph(footer_text, styles['Normal']))
+        
+        # Construir el PDF
+        doc.build(story)
+    
+    def generate_excel_from_preview(self, config):
+        """Generar archivo Excel del reporte"""
+        try:
+            messagebox.showinfo("Excel", "Función de exportación a Excel en desarrollo.\nPor ahora use la función PDF.")
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error generando Excel: {str(e)}")
+    
+    def get_report_data_for_pdf(self, config):
+        """Obtener datos del reporte para PDF"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            if config['report_type'] == 'income':
+                data = report_rollups.income_by_day(
+                    cursor, config['start_date'], config['end_date'], self.INCOME_REPORT_STATES
+                )
+                formatted_data = []
+                for fecha, total, count in data:
+                    promedio = total / count if count > 0 else 0
+                    formatted_data.append([
+                        datetime.fromisoformat(fecha).strftime('%d/%m/%Y'),
+                        f"RD${total:,.2f}",
+                        str(count),
+                        f"RD${promedio:,.2f}"
+                    ])
+                return formatted_data
+                
+            elif config['report_type'] == 'appointments':
+                data = report_rollups.appointments_by_day(cursor, config['start_date'], config['end_date'])
+                formatted_data = []
+                for fecha, total, completadas, canceladas in data:
+                    formatted_data.append([
+                        datetime.fromisoformat(fecha).strftime('%d/%m/%Y'),
+                        str(total),
+                        str(completadas),
+                        str(canceladas)
+                    ])
+                return formatted_data
+                
+            elif config['report_type'] == 'pending_invoices':
+                cursor.execute("""
+                    SELECT f.numero_factura, u.nombre || ' ' || u.apellido as paciente, 
+                           f.monto, f.fecha_creacion
+                    FROM facturas f
+                    JOIN usuarios u ON f.paciente_id = u.id
+                    WHERE f.estado = 'pendiente' 
+                    AND f.fecha_creacion BETWEEN ? AND ?
+                    ORDER BY f.fecha_creacion DESC
+                """, (config['start_date'].isoformat(), config['end_date'].isoformat()))
+                
+                data = cursor.fetchall()
+                formatted_data = []
+                for numero, paciente, monto, fecha_str in data:
+                    fecha_creacion = datetime.fromisoformat(fecha_str)
+                    dias_pendiente = (datetime.now() - fecha_creacion).days
+                    formatted_data.append([
+                        numero,
+                        paciente,
+                        f"RD${monto:,.2f}",
+                        f"{dias_pendiente} días"
+                    ])
+                return formatted_data
+            
+            cursor.close()
+            conn.close()
+            return []
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error obteniendo datos: {str(e)}")
+            return []
+    
+    def generate_report_file(self, config):
+        """Generar archivo de reporte según el formato especificado"""
+        if config['output_format'] == 'PDF':
+            self.generate_pdf_from_preview(config)
+        elif config['output_format'] == 'Excel':
+            self.generate_excel_from_preview(config)
+        else:
+            messagebox.showinfo("Formato no soportado", "Formato de salida no implementado")
+    
+    # Funciones auxiliares para el sistema de reportes
+    def apply_report_filters(self):
+        """Aplicar filtros a los reportes"""
+        period = self.report_period_filter.get()
+        report_type = self.report_type_filter.get()
+        
+        messagebox.showinfo("Filtros", f"Filtros aplicados:\nPeríodo: {period}\nTipo: {report_type}")
+    
+    def export_all_reports_pdf(self):
+        """Exportar todos los reportes a PDF"""
+        messagebox.showinfo("Exportar", "Exportando todos los reportes disponibles...")
+    
+    def export_to_excel(self):
+        """Exportar datos a Excel"""
+        messagebox.showinfo("Excel", "Función de exportación a Excel en desarrollo")
+    
+    def email_reports(self):
+        """Enviar reportes por email"""
+        messagebox.showinfo("Email", "Función de envío por email en desarrollo")
+    
+    def show_executive_dashboard(self):
+        """Mostrar dashboard ejecutivo"""
+        messagebox.showinfo("Dashboard", "Dashboard ejecutivo en desarrollo")
+    
+    def refresh_all_data(self):
+        """Actualizar todos los datos"""
+        self.create_stats_display(self.stats_frame if hasattr(self, 'stats_frame') else None)
+        messagebox.showinfo("Actualizado", "✅ Datos actualizados correctamente")
+    
+    def configure_reports(self):
+        """Configurar opciones de reportes"""
+        messagebox.showinfo("Configuración", "Configuración de reportes en desarrollo")
+    
+    def manage_report_templates(self):
+        """Gestionar plantillas de reportes"""
+        messagebox.showinfo("Plantillas", "Gestión de plantillas en desarrollo")
@@ -0,0 +1,1038 @@
+"""
+Vistas de secretaría de MEDISYNC
+Dashboard, agenda, pacientes, facturación y reportes de secretaría
+Métodos de MedisyncApp que se importan la primera vez que se usan
+(ver medisync_views)
+"""
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+from datetime import datetime
+
+
+class SecretariaViews:
+    """Métodos de MedisyncApp: dashboard, agenda, pacientes, facturación y reportes de secretaría"""
+    
+    def create_secretaria_dashboard(self, parent):
+        """Dashboard específico para secretarias"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Título personalizado
+        title_label = tk.Label(main_frame, text=f"Panel de Control - {self.current_user.nombre}", 
+                              font=('Arial', 18, 'bold'), bg='#F8FAFC', fg='#1E3A8A')
+        title_label.pack(pady=(0, 20))
+        
+        # Estadísticas del día
+        stats_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        stats_frame.pack(fill='x', pady=20)
+        
+        try:
+            daily_stats = self.get_secretaria_stats()
+            
+            self.create_stats_card(stats_frame, "📅 Citas Hoy", 
+                                 str(daily_stats.get('appointments_today', 0)), "#0B5394", 0, 0)
+            
+            self.create_stats_card(stats_frame, "⏳ Citas Pendientes", 
+                                 str(daily_stats.get('pending_appointments', 0)), "#C0392B", 0, 1)
+            
+            self.create_stats_card(stats_frame, "💰 Facturas Pendientes", 
+                                 str(daily_stats.get('pending_invoices', 0)), "#E67E22", 0, 2)
+            
+            self.create_stats_card(stats_frame, "👥 Nuevos Pacientes", 
+                                 str(daily_stats.get('new_patients_today', 0)), "#059669", 0, 3)
+                                 
+        except Exception as e:
+            tk.Label(stats_frame, text=f"Error cargando estadísticas: {str(e)}", 
+                    fg='red', bg='#F8FAFC').pack()
+        
+        # Panel de acciones rápidas
+        quick_actions_frame = tk.LabelFrame(main_frame, text="🚀 Acciones Rápidas", 
+                                          font=('Arial', 14, 'bold'), padx=20, pady=15)
+        quick_actions_frame.pack(fill='x', pady=20)
+        
+        # Botones de acciones rápidas
+        actions_grid = tk.Frame(quick_actions_frame)
+        actions_grid.pack()
+        
+        quick_buttons = [
+            ("📅 Nueva Cita", self.new_appointment_quick, "#0B5394"),
+            ("👤 Nuevo Paciente", self.new_patient_quick, "#16A085"),
+            ("💰 Procesar Pago", self.process_payment_quick, "#E67E22"),
+            ("📋 Generar Factura", self.generate_invoice_quick, "#16A085"),
+            ("📞 Lista de Espera", self.manage_waiting_list, "#E67E22"),
+            ("📊 Reporte Diario", self.daily_report, "#1abc9c")
+        ]
+        
+        for i, (text, command, color) in enumerate(quick_buttons):
+            btn = tk.Button(actions_grid, text=text, command=command, 
+                           bg=color, fg='white', font=('Arial', 10, 'bold'),
+                           width=18, height=2)
+            btn.grid(row=i//3, column=i%3, padx=10, pady=10)
+        
+        # Agenda del día
+        agenda_frame = tk.LabelFrame(main_frame, text="📋 Agenda de Hoy", 
+                                   font=('Arial', 14, 'bold'), padx=20, pady=15)
+        agenda_frame.pack(fill='both', expand=True, pady=20)
+        
+        # Lista de citas del día
+        agenda_list = tk.Frame(agenda_frame, bg='white')
+        agenda_list.pack(fill='both', expand=True)
+        
+        try:
+            today_appointments = self.get_today_appointments()
+            
+            if today_appointments:
+                for i, apt in enumerate(today_appointments):
+                    apt_frame = tk.Frame(agenda_list, bg='#FFFFFF' if i % 2 == 0 else '#ffffff', 
+                                       relief='solid', bd=1)
+                    apt_frame.pack(fill='x', pady=2, padx=5)
+                    
+                    # Hora
+                    time_label = tk.Label(apt_frame, text=f"🕒 {apt.get('hora', 'N/A')}", 
+                                        font=('Arial', 11, 'bold'), 
+                                        bg=apt_frame['bg'], fg='#1E3A8A')
+                    time_label.pack(side='left', padx=10, pady=5)
+                    
+                    # Paciente y Doctor
+                    info_text = f"{apt.get('paciente_nombre', 'N/A')} → Dr. {apt.get('doctor_nombre', 'N/A')}"
+                    info_label = tk.Label(apt_frame, text=info_text, font=('Arial', 10), 
+                                        bg=apt_frame['bg'], fg='#64748B')
+                    info_label.pack(side='left', padx=(20, 10), pady=5)
+                    
+                    # Estado
+                    estado = apt.get('estado', 'programada')
+                    estado_color = {'programada': '#0B5394', 'completada': '#16A085', 'cancelada': '#C0392B'}
+                    estado_label = tk.Label(apt_frame, text=estado.upper(), 
+                                          font=('Arial', 9, 'bold'), 
+                                          bg=estado_color.get(estado, '#64748B'), fg='white')
+                    estado_label.pack(side='right', padx=10, pady=5)
+            else:
+                tk.Label(agenda_list, text="No hay citas programadas para hoy", 
+                        font=('Arial', 12), fg='#64748B').pack(pady=20)
+                
+        except Exception as e:
+            tk.Label(agenda_list, text=f"Error cargando agenda: {str(e)}", 
+                    fg='red').pack(pady=20)
+    
+    def create_secretaria_appointments(self, parent):
+        """Gestión completa de citas para secretarias"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header con botones y filtros
+        header_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        tk.Label(header_frame, text="Gestión de Citas Médicas", 
+                font=('Arial', 16, 'bold'), bg='#F8FAFC').pack(side='left')
+        
+        # Botones de acción
+        buttons_frame = tk.Frame(header_frame, bg='#F8FAFC')
+        buttons_frame.pack(side='right')
+        
+        tk.Button(buttons_frame, text="➕ Nueva Cita", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), command=self.create_new_appointment).pack(side='left', padx=5)
+        tk.Button(buttons_frame, text="📅 Calendario", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), command=self.show_appointment_calendar).pack(side='left', padx=5)
+        
+        # Panel de filtros
+        filters_frame = tk.LabelFrame(main_frame, text="Filtros", font=('Arial', 11, 'bold'), 
+                                    padx=10, pady=10)
+        filters_frame.pack(fill='x', pady=(0, 20))
+        
+        filters_row = tk.Frame(filters_frame)
+        filters_row.pack()
+        
+        # Filtro por fecha
+        tk.Label(filters_row, text="Fecha:", font=('Arial', 10)).grid(row=0, column=0, padx=5, sticky='w')
+        self.appointment_date_filter = ttk.Combobox(filters_row, values=['Hoy', 'Mañana', 'Esta Semana', 'Este Mes', 'Todas'], 
+                                                  state='readonly', width=12)
+        self.appointment_date_filter.set('Hoy')
+        self.appointment_date_filter.grid(row=0, column=1, padx=5)
+        
+        # Filtro por doctor
+        tk.Label(filters_row, text="Doctor:", font=('Arial', 10)).grid(row=0, column=2, padx=5, sticky='w')
+        self.appointment_doctor_filter = ttk.Combobox(filters_row, state='readonly', width=15)
+        self.appointment_doctor_filter.grid(row=0, column=3, padx=5)
+        
+        # Filtro por estado
+        tk.Label(filters_row, text="Estado:", font=('Arial', 10)).grid(row=0, column=4, padx=5, sticky='w')
+        self.appointment_status_filter = ttk.Combobox(filters_row, 
+                                                    values=['Todas', 'Programada', 'Completada', 'Cancelada'], 
+                                                    state='readonly', width=12)
+        self.appointment_status_filter.set('Todas')
+        self.appointment_status_filter.grid(row=0, column=5, padx=5)
+        
+        # Botón aplicar filtros
+        tk.Button(filters_row, text="🔍 Filtrar", bg='#0B5394', fg='white',
+                 command=self.apply_appointment_filters).grid(row=0, column=6, padx=10)
+        
+        # Tabla de citas
+        columns = ('ID', 'Fecha/Hora', 'Paciente', 'Doctor', 'Motivo', 'Estado', 'Teléfono')
+        self.secretaria_appointments_tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        
+        # Configurar headers
+        column_widths = {'ID': 50, 'Fecha/Hora': 130, 'Paciente': 150, 'Doctor': 120, 
+                        'Motivo': 200, 'Estado': 100, 'Teléfono': 100}
+        
+        for col in columns:
+            self.secretaria_appointments_tree.heading(col, text=col)
+            self.secretaria_appointments_tree.column(col, width=column_widths.get(col, 100))
+        
+        # Scrollbar
+        scrollbar_y = ttk.Scrollbar(main_frame, orient="vertical", command=self.secretaria_appointments_tree.yview)
+        self.secretaria_appointments_tree.configure(yscrollcommand=scrollbar_y.set)
+        
+        # Pack
+        self.secretaria_appointments_tree.pack(side='left', fill='both', expand=True)
+        scrollbar_y.pack(side='right', fill='y')
+        
+        # Botones de acción para citas
+        actions_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        actions_frame.pack(fill='x', pady=(10, 0))
+        
+        action_buttons = [
+            ("✏️ Editar", self.edit_appointment, "#E67E22"),
+            ("✅ Confirmar", self.confirm_appointment, "#16A085"),
+            ("❌ Cancelar", self.cancel_appointment, "#C0392B"),
+            ("📞 Llamar Paciente", self.call_patient, "#0B5394"),
+            ("💰 Generar Factura", self.generate_appointment_invoice, "#16A085"),
+            ("📋 Ver Detalles", self.view_appointment_details, "#64748B")
+        ]
+        
+        for text, command, color in action_buttons:
+            btn = tk.Button(actions_frame, text=text, command=command, 
+                           bg=color, fg='white', font=('Arial', 9, 'bold'))
+            btn.pack(side='left', padx=5, pady=5)
+        
+        # Cargar datos y filtros
+        self.load_appointment_doctors()
+        self.load_secretaria_appointments()
+    
+    def create_secretaria_patients(self, parent):
+        """Gestión de pacientes para secretarias"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header
+        header_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        tk.Label(header_frame, text="Gestión de Pacientes", 
+                font=('Arial', 16, 'bold'), bg='#F8FAFC').pack(side='left')
+        
+        # Botones de acción
+        buttons_frame = tk.Frame(header_frame, bg='#F8FAFC')
+        buttons_frame.pack(side='right')
+        
+        tk.Button(buttons_frame, text="➕ Nuevo Paciente", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), command=self.register_new_patient).pack(side='left', padx=5)
+        tk.Button(buttons_frame, text="📤 Importar", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), command=self.import_patients).pack(side='left', padx=5)
+        tk.Button(buttons_frame, text="📥 Exportar", bg='#0B5394', fg='white',
+                 font=('Arial', 10, 'bold'), command=self.export_patients).pack(side='left', padx=5)
+        
+        # Panel de búsqueda
+        search_frame = tk.LabelFrame(main_frame, text="Búsqueda de Pacientes", 
+                                   font=('Arial', 11, 'bold'), padx=10, pady=10)
+        search_frame.pack(fill='x', pady=(0, 20))
+        
+        search_row = tk.Frame(search_frame)
+        search_row.pack()
+        
+        tk.Label(search_row, text="Buscar por:", font=('Arial', 10)).grid(row=0, column=0, padx=5)
+        
+        search_options = ['Nombre', 'Apellido', 'Email', 'Teléfono', 'Expediente']
+        self.patient_search_type = ttk.Combobox(search_row, values=search_options, state='readonly', width=12)
+        self.patient_search_type.set('Nombre')
+        self.patient_search_type.grid(row=0, column=1, padx=5)
+        
+        self.patient_search_entry = tk.Entry(search_row, font=('Arial', 10), width=25)
+        self.patient_search_entry.grid(row=0, column=2, padx=5)
+        self.patient_search_entry.bind('<KeyRelease>', self.search_patients_secretaria)
+        
+        tk.Button(search_row, text="🔍 Buscar", bg='#0B5394', fg='white',
+                 command=self.search_patients_secretaria).grid(row=0, column=3, padx=10)
+        
+        tk.Button(search_row, text="🔄 Limpiar", bg='#0B5394', fg='white',
+                 command=self.clear_patient_search).grid(row=0, column=4, padx=5)
+        
+        # Tabla de pacientes
+        columns = ('ID', 'Expediente', 'Nombre', 'Apellido', 'Email', 'Teléfono', 'Seguro', 'Estado')
+        self.secretaria_patients_tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        
+        # Configurar headers
+        column_widths = {'ID': 50, 'Expediente': 100, 'Nombre': 120, 'Apellido': 120, 
+                        'Email': 180, 'Teléfono': 100, 'Seguro': 120, 'Estado': 80}
+        
+        for col in columns:
+            self.secretaria_patients_tree.heading(col, text=col)
+            self.secretaria_patients_tree.column(col, width=column_widths.get(col, 100))
+        
+        # Scrollbar
+        scrollbar_y = ttk.Scrollbar(main_frame, orient="vertical", command=self.secretaria_patients_tree.yview)
+        self.secretaria_patients_tree.configure(yscrollcommand=scrollbar_y.set)
+        
+        # Pack
+        self.secretaria_patients_tree.pack(side='left', fill='both', expand=True)
+        scrollbar_y.pack(side='right', fill='y')
+        
+        # Botones de acción para pacientes
+        actions_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        actions_frame.pack(fill='x', pady=(10, 0))
+        
+        patient_actions = [
+            ("👁️ Ver Perfil", self.view_patient_profile_secretaria, "#0B5394"),
+            ("✏️ Editar Datos", self.edit_patient_data, "#E67E22"),
+            ("📅 Nueva Cita", self.schedule_patient_appointment, "#16A085"),
+            ("📋 Ver Historial", self.view_patient_history, "#16A085"),
+            ("💰 Ver Facturas", self.view_patient_invoices, "#E67E22"),
+            ("📞 Contactar", self.contact_patient, "#1abc9c")
+        ]
+        
+        for text, command, color in patient_actions:
+            btn = tk.Button(actions_frame, text=text, command=command, 
+                           bg=color, fg='white', font=('Arial', 9, 'bold'))
+            btn.pack(side='left', padx=5, pady=5)
+        
+        # Cargar datos
+        self.load_secretaria_patients()
+    
+    def create_secretaria_billing(self, parent):
+        """Sistema de facturación avanzado para secretarias"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=15, pady=15)
+        
+        # Header moderno
+        header_frame = tk.Frame(main_frame, bg='#1E3A8A', height=70)
+        header_frame.pack(fill='x', pady=(0, 15))
+        header_frame.pack_propagate(False)
+        
+        # Contenido del header
+        header_content = tk.Frame(header_frame, bg='#1E3A8A')
+        header_content.pack(expand=True, fill='both', padx=20, pady=10)
+        
+        # Título
+        title_frame = tk.Frame(header_content, bg='#1E3A8A')
+        title_frame.pack(side='left', expand=True, fill='both')
+        
+        tk.Label(title_frame, text="💰", font=('Arial', 18), bg='#1E3A8A', fg='white').pack(side='left', pady=8)
+        tk.Label(title_frame, text="FACTURACIÓN SECRETARÍA", 
+                font=('Arial', 14, 'bold'), bg='#1E3A8A', fg='white').pack(side='left', padx=(10, 0), pady=8)
+        tk.Label(title_frame, text="Gestión completa de facturas y pagos", 
+                font=('Arial', 10), bg='#1E3A8A', fg='#CBD5E1').pack(side='left', padx=(15, 0), pady=8)
+        
+        # Botones principales en header
+        buttons_frame = tk.Frame(header_content, bg='#1E3A8A')
+        buttons_frame.pack(side='right', pady=8)
+        
+        # Botón Sistema Completo (más prominente)
+        complete_btn = tk.Button(
+            buttons_frame,
+            text="💰 FACTURACIÓN AVANZADA",
+            command=lambda: self.switch_tab("Facturación Avanzada"),
+            bg='#0B5394',
+            fg='white',
+            font=('Arial', 11, 'bold'),
+            padx=20,
+            pady=8,
+            relief='raised',
+            bd=3
+        )
+        complete_btn.pack(side='left', padx=10)
+        
+        # Botones secundarios
+        tk.Button(buttons_frame, text="�📋 Nueva Factura", bg='#0B5394', fg='white',
+                 font=('Arial', 9, 'bold'), padx=12, pady=6,
+                 command=self.create_new_invoice_secretaria).pack(side='left', padx=3)
+        tk.Button(buttons_frame, text="💳 Procesar Pago", bg='#0B5394', fg='white',
+                 font=('Arial', 9, 'bold'), padx=12, pady=6,
+                 command=self.process_payment_secretaria).pack(side='left', padx=3)
+        
+        # Contenido principal dividido en 2 columnas
+        content_frame = tk.Frame(main_frame, bg='#F8FAFC')
+        content_frame.pack(fill='both', expand=True)
+        
+        # Columna izquierda: Resumen y estadísticas
+        left_column = tk.Frame(content_frame, bg='#F8FAFC', width=350)
+        left_column.pack(side='left', fill='y', padx=(0, 15))
+        left_column.pack_propagate(False)
+        
+        # Columna derecha: Lista de facturas
+        right_column = tk.Frame(content_frame, bg='#F8FAFC')
+        right_column.pack(side='right', fill='both', expand=True)
+        
+        # Panel de resumen financiero
+        summary_frame = tk.LabelFrame(
+            left_column, 
+            text="📊 RESUMEN FINANCIERO HOY", 
+            font=('Arial', 11, 'bold'),
+            bg='#e8f5e8',
+            fg='#2e7d32',
+            padx=15, 
+            pady=15
+        )
+        summary_frame.pack(fill='x', pady=(0, 15))
+        
+        try:
+            billing_summary = self.get_billing_summary_secretaria()
+            
+            # Indicadores financieros
+            indicators = [
+                ("💰 Ingresos Hoy", f"RD${billing_summary.get('today_income', 0):,.2f}", "#16A085"),
+                ("📋 Pendientes", str(billing_summary.get('pending_count', 0)), "#C0392B"),
+                ("✅ Pagadas Hoy", str(billing_summary.get('paid_today', 0)), "#0B5394"),
+                ("📊 Meta Mensual", f"RD${billing_summary.get('month_income', 0):,.2f}", "#16A085")
+            ]
+            
+            for title, value, color in indicators:
+                indicator_frame = tk.Frame(summary_frame, bg='#e8f5e8')
+                indicator_frame.pack(fill='x', pady=5)
+                
+                tk.Label(indicator_frame, text=title, font=('Arial', 10, 'bold'),
+                        bg='#e8f5e8', fg='#2e7d32').pack(side='left')
+                tk.Label(indicator_frame, text=value, font=('Arial', 11, 'bold'),
+                        bg='#e8f5e8', fg=color).pack(side='right')
+                
+        except Exception as e:
+            tk.Label(summary_frame, text=f"Error cargando resumen: {str(e)}", 
+                    font=('Arial', 9), bg='#e8f5e8', fg='#C0392B').pack()
+        
+        # Panel de acciones rápidas
+        actions_frame = tk.LabelFrame(
+            left_column,
+            text="⚡ ACCIONES RÁPIDAS",
+            font=('Arial', 11, 'bold'),
+            bg='#fff3e0',
+            fg='#e65100',
+            padx=15,
+            pady=15
+        )
+        actions_frame.pack(fill='x', pady=(0, 15))
+        
+        quick_actions = [
+            ("💵 Factura Express", self.express_invoice, '#16A085'),
+            ("🔍 Buscar Paciente", self.search_patient_billing, '#0B5394'),
+            ("📄 Generar Reporte", self.generate_daily_report, '#16A085'),
+            ("🔄 Actualizar Datos", self.refresh_billing_secretaria, '#64748B')
+        ]
+        
+        for text, command, color in quick_actions:
+            btn = tk.Button(
+                actions_frame,
+                text=text,
+                command=command,
+                bg=color,
+                fg='white',
+                font=('Arial', 9, 'bold'),
+                padx=10,
+                pady=6,
+                relief='raised'
+            )
+            btn.pack(fill='x', pady=3)
+        
+        # Panel de citas sin facturar
+        pending_frame = tk.LabelFrame(
+            left_column,
+            text="📋 CITAS SIN FACTURAR",
+            font=('Arial', 11, 'bold'),
+            bg='#ffebee',
+            fg='#c62828',
+            padx=15,
+            pady=15
+        )
+        pending_frame.pack(fill='both', expand=True)
+        
+        # Lista de citas pendientes
+        self.secretaria_pending_list = tk.Listbox(
+            pending_frame,
+            height=8,
+            font=('Arial', 9),
+            bg='white',
+            selectmode='single'
+        )
+        self.secretaria_pending_list.pack(fill='both', expand=True, pady=(10, 10))
+        
+        # Botón para facturar
+        bill_btn = tk.Button(
+            pending_frame,
+            text="💰 Facturar Seleccionada",
+            command=self.bill_appointment_secretaria,
+            bg='#0B5394',
+            fg='white',
+            font=('Arial', 10, 'bold'),
+            padx=15,
+            pady=8
+        )
+        bill_btn.pack(fill='x')
+        
+        # Panel de facturas recientes (columna derecha)
+        invoices_frame = tk.LabelFrame(
+            right_column,
+            text="📄 FACTURAS RECIENTES",
+            font=('Arial', 12, 'bold'),
+            bg='#e3f2fd',
+            fg='#1565c0',
+            padx=15,
+            pady=15
+        )
+        invoices_frame.pack(fill='both', expand=True)
+        
+        # Controles de filtro
+        filter_frame = tk.Frame(invoices_frame, bg='#e3f2fd')
+        filter_frame.pack(fill='x', pady=(0, 15))
+        
+        tk.Label(filter_frame, text="🔍 Filtrar:", font=('Arial', 10, 'bold'),
+                bg='#e3f2fd', fg='#1565c0').pack(side='left')
+        
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var, 
+                               font=('Arial', 10), width=20)
+        filter_entry.pack(side='left', padx=(10, 0))
+        filter_entry.bind('<KeyRelease>', self.filter_invoices_secretaria)
+        
+        # Estado filter
+        tk.Label(filter_frame, text="Estado:", font=('Arial', 10, 'bold'),
+                bg='#e3f2fd', fg='#1565c0').pack(side='left', padx=(20, 5))
+        
+        self.status_filter = tk.StringVar(value="todos")
+        status_combo = ttk.Combobox(filter_frame, textvariable=self.status_filter,
+                                   values=["todos", "pendiente", "pagada", "pago_parcial"],
+                                   state="readonly", width=12)
+        status_combo.pack(side='left', padx=(0, 10))
+        status_combo.bind('<<ComboboxSelected>>', self.filter_invoices_secretaria)
+        
+        # Tabla de facturas
+        columns = ('Número', 'Fecha', 'Paciente', 'Monto', 'Estado', 'Acciones')
+        self.secretaria_invoices_tree = ttk.Treeview(invoices_frame, columns=columns, 
+                                                    show='headings', height=15)
+        
+        # Configurar columnas
+        column_widths = {'Número': 100, 'Fecha': 90, 'Paciente': 120, 'Monto': 90, 'Estado': 80, 'Acciones': 80}
+        for col in columns:
+            self.secretaria_invoices_tree.heading(col, text=col)
+            self.secretaria_invoices_tree.column(col, width=column_widths.get(col, 80), anchor='center')
+        
+        # Scrollbar
+        invoices_scroll = ttk.Scrollbar(invoices_frame, orient="vertical", 
+                                       command=self.secretaria_invoices_tree.yview)
+        self.secretaria_invoices_tree.configure(yscrollcommand=invoices_scroll.set)
+        
+        # Pack tabla
+        table_frame = tk.Frame(invoices_frame, bg='#e3f2fd')
+        table_frame.pack(fill='both', expand=True)
+        
+        self.secretaria_invoices_tree.pack(side='left', fill='both', expand=True)
+        invoices_scroll.pack(side='right', fill='y')
+        
+        # Eventos
+        self.secretaria_invoices_tree.bind('<Double-1>', self.view_invoice_details)
+        
+        # Cargar datos iniciales
+        self.load_secretaria_billing_data()
+    
+    def get_billing_summary_secretaria(self):
+        """Obtener resumen de facturación para secretarias"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            today = datetime.now().strftime('%Y-%m-%d')
+            current_month = datetime.now().strftime('%Y-%m')
+            
+            # Ingresos de hoy
+            cursor.execute('''
+                SELECT COALESCE(SUM(monto), 0) 
+                FROM facturas 
+                WHERE DATE(fecha_creacion) = ? AND estado IN ('pagada', 'pago_parcial')
+            ''', (today,))
+            today_income = cursor.fetchone()[0]
+            
+            # Facturas pendientes
+            cursor.execute('SELECT COUNT(*) FROM facturas WHERE estado = "pendiente"')
+            pending_count = cursor.fetchone()[0]
+            
+            # Facturas pagadas hoy
+            cursor.execute('''
+                SELECT COUNT(*) 
+                FROM facturas 
+                WHERE DATE(fecha_creacion) = ? AND estado = 'pagado'
+            ''', (today,))
+            paid_today = cursor.fetchone()[0]
+            
+            # Ingresos del mes
+            cursor.execute('''
+                SELECT COALESCE(SUM(monto), 0) 
+                FROM facturas 
+                WHERE strftime('%Y-%m', fecha_creacion) = ? AND estado IN ('pagada', 'pago_parcial')
+            ''', (current_month,))
+            month_income = cursor.fetchone()[0]
+            
+            conn.close()
+            
+            return {
+                'today_income': float(today_income),
+                'pending_count': pending_count,
+                'paid_today': paid_today,
+                'month_income': float(month_income)
+            }
+            
+        except Exception as e:
+            print(f"Error obteniendo resumen: {e}")
+            return {'today_income': 0, 'pending_count': 0, 'paid_today': 0, 'month_income': 0}
+    
+    def load_secretaria_billing_data(self):
+        """Cargar datos de facturación para secretarias"""
+        try:
+            # Limpiar listas
+            self.secretaria_pending_list.delete(0, tk.END)
+            for item in self.secretaria_invoices_tree.get_children():
+                self.secretaria_invoices_tree.delete(item)
+            
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            # Cargar citas sin facturar
+            cursor.execute('''
+                SELECT c.id, c.fecha_hora, 
+                       (SELECT nombre || ' ' || apellido FROM usuarios WHERE id = c.paciente_id) as paciente_nombre,
+                       c.motivo
+                FROM citas c
+                LEFT JOIN facturas f ON c.id = f.cita_id
+                WHERE c.estado = 'completada' AND f.cita_id IS NULL
+                ORDER BY c.fecha_hora DESC
+                LIMIT 15
+            ''')
+            
+            pending_appointments = cursor.fetchall()
+            for apt in pending_appointments:
+                fecha = apt[1]
+                if fecha:
+                    try:
+                        dt = datetime.fromisoformat(fecha)
+                        fecha = dt.strftime('%d/%m %H:%M')
+                    except:
+                        pass
+                
+                text = f"{fecha} - {apt[2]} - {apt[3][:25]}..."
+                self.secretaria_pending_list.insert(tk.END, text)
+            
+            # Cargar facturas recientes
+            cursor.execute('''
+                SELECT numero_factura, fecha_creacion, 
+                       (SELECT nombre || ' ' || apellido FROM usuarios WHERE id = f.paciente_id) as paciente_nombre,
+                       monto, estado
+                FROM facturas f
+                ORDER BY fecha_creacion DESC
+                LIMIT 50
+            ''')
+            
+            invoices = cursor.fetchall()
+            for invoice in invoices:
+                fecha = invoice[1]
+                if fecha:
+                    try:
+                        dt = datetime.fromisoformat(fecha)
+                        fecha = dt.strftime('%d/%m/%Y')
+                    except:
+                        pass
+                
+                estado = invoice[4].title() if invoice[4] else 'Desconocido'
+                
+                self.secretaria_invoices_tree.insert('', 'end', values=(
+                    invoice[0] or 'N/A',
+                    fecha,
+                    invoice[2] or 'N/A',
+                    f"RD${float(invoice[3] or 0):,.2f}",
+                    estado,
+                    "Ver"
+                ))
+            
+            conn.close()
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Error cargando datos: {str(e)}")
+    
+    def create_new_invoice_secretaria(self):
+        """Crear nueva factura desde secretaría (en el sistema completo)"""
+        self.open_integrated_billing_system()
+    
+    def process_payment_secretaria(self):
+        """Procesar pago desde secretaría"""
+        messagebox.showinfo("Procesar Pago", 
+                           "Use el 'Sistema Completo' para procesar pagos con:\n\n" +
+                           "• Múltiples métodos de pago\n• Cálculo automático de cambio\n• Generación de recibos PDF")
+    
+    def express_invoice(self):
+        """Factura express"""
+        messagebox.showinfo("Factura Express", "Funcionalidad disponible en Sistema Completo")
+    
+    def search_patient_billing(self):
+        """Buscar paciente para facturación"""
+        search_term = simpledialog.askstring("Buscar Paciente", "Ingrese nombre del paciente:")
+        if search_term:
+            messagebox.showinfo("Búsqueda", f"Búsqueda avanzada disponible en Sistema Completo")
+    
+    def generate_daily_report(self):
+        """Generar reporte diario"""
+        messagebox.showinfo("Reporte Diario", "Generación de reportes PDF disponible en Sistema Completo")
+    
+    def refresh_billing_secretaria(self):
+        """Actualizar datos de facturación"""
+        self.load_secretaria_billing_data()
+        messagebox.showinfo("Actualizado", "✅ Datos actualizados correctamente")
+    
+    def bill_appointment_secretaria(self):
+        """Facturar cita seleccionada desde secretaría"""
+        selection = self.secretaria_pending_list.curselection()
+        if not selection:
+            messagebox.showwarning("Selección", "Seleccione una cita para facturar")
+            return
+        
+        self.open_integrated_billing_system()
+    
+    def filter_invoices_secretaria(self, event=None):
+        """Filtrar facturas en la vista de secretaría"""
+        # Implementación básica de filtrado
+        filter_text = self.filter_var.get().lower()
+        status_filter = self.status_filter.get()
+        
+        # Recargar datos con filtros aplicados
+        self.load_secretaria_billing_data()  # Por simplicidad, recargamos todo
+    
+    def view_invoice_details(self, event=None):
+        """Ver detalles de factura seleccionada"""
+        selection = self.secretaria_invoices_tree.selection()
+        if not selection:
+            return
+        
+        item = self.secretaria_invoices_tree.item(selection[0])
+        invoice_number = item['values'][0]
+        
+        messagebox.showinfo("Detalles de Factura", 
+                           f"Factura: {invoice_number}\n\n" +
+                           "Vista detallada y edición disponible en Sistema Completo")
+    
+    def create_secretaria_reports(self, parent):
+        """Reportes para secretarias"""
+        main_frame = tk.Frame(parent, bg='#F8FAFC')
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Título
+        tk.Label(main_frame, text="Reportes y Estadísticas", 
+                font=('Arial', 16, 'bold'), bg='#F8FAFC', fg='#1E3A8A').pack(pady=(0, 20))
+        
+        # Panel de reportes financieros
+        financial_frame = tk.LabelFrame(main_frame, text="💰 Reportes Financieros", 
+                                      font=('Arial', 12, 'bold'), padx=20, pady=15)
+        financial_frame.pack(fill='x', pady=10)
+        
+        financial_buttons = [
+            ("📊 Ingresos Diarios", self.daily_income_report, "#0B5394"),
+            ("📈 Ingresos Mensuales", self.monthly_income_report, "#16A085"),
+            ("📋 Facturas Pendientes", self.pending_invoices_report, "#C0392B"),
+            ("💳 Métodos de Pago", self.payment_methods_report, "#16A085")
+        ]
+        
+        financial_grid = tk.Frame(financial_frame)
+        financial_grid.pack()
+        
+        for i, (text, command, color) in enumerate(financial_buttons):
+            btn = tk.Button(financial_grid, text=text, command=command, 
+                           bg=color, fg='white', font=('Arial', 10, 'bold'),
+                           width=20, height=2)
+            btn.grid(row=i//2, column=i%2, padx=10, pady=10)
+        
+        # Panel de reportes operativos
+        operational_frame = tk.LabelFrame(main_frame, text="📋 Reportes Operativos", 
+                                        font=('Arial', 12, 'bold'), padx=20, pady=15)
+        operational_frame.pack(fill='x', pady=10)
+        
+        operational_buttons = [
+            ("📅 Citas por Período", self.appointments_period_report, "#64748B"),
+            ("👨‍⚕️ Productividad Doctores", self.doctors_productivity_report, "#059669"),
+            ("🤒 Registro de Pacientes", self.patients_registry_report, "#E67E22"),
+            ("📞 Lista de Contactos", self.contacts_list_report, "#8e44ad")
+        ]
+        
+        operational_grid = tk.Frame(operational_frame)
+        operational_grid.pack()
+        
+        for i, (text, command, color) in enumerate(operational_buttons):
+            btn = tk.Button(operational_grid, text=text, command=command, 
+                           bg=color, fg='white', font=('Arial', 10, 'bold'),
+                           width=20, height=2)
+            btn.grid(row=i//2, column=i%2, padx=10, pady=10)
+        
+        # Panel de estadísticas rápidas
+        stats_frame = tk.LabelFrame(main_frame, text="📊 Estadísticas Rápidas", 
+                                  font=('Arial', 12, 'bold'), padx=20, pady=15)
+        stats_frame.pack(fill='both', expand=True, pady=10)
+        
+        # Crear área de estadísticas
+        stats_display = tk.Frame(stats_frame, bg='white', relief='sunken', bd=2)
+        stats_display.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        try:
+            quick_stats = self.get_secretaria_quick_stats()
+            
+            stats_text = f"""
+📊 RESUMEN GENERAL
+════════════════════════════════════════
+
+📅 Citas Programadas Hoy: {quick_stats.get('appointments_today', 0)}
+⏳ Citas Pendientes: {quick_stats.get('pending_appointments', 0)}
+✅ Citas Completadas Hoy: {quick_stats.get('completed_today', 0)}
+
+👥 PACIENTES
+════════════════════════════════════════
+
+👤 Total de Pacientes: {quick_stats.get('total_patients', 0)}
+🆕 Nuevos este Mes: {quick_stats.get('new_patients_month', 0)}
+📞 Contactos Pendientes: {quick_stats.get('pending_contacts', 0)}
+
+💰 FACTURACIÓN
+════════════════════════════════════════
+
+💵 Ingresos Hoy: RD$ {quick_stats.get('today_income', 0):,.2f}
+📋 Facturas Pendientes: {quick_stats.get('pending_invoices', 0)}
+✅ Facturas Pagadas Hoy: {quick_stats.get('paid_today', 0)}
+📊 Total del Mes: RD$ {quick_stats.get('month_total', 0):,.2f}
+
+👨‍⚕️ DOCTORES
+════════════════════════════════════════
+
+🏥 Doctores Activos: {quick_stats.get('active_doctors', 0)}
+📅 Consultas Programadas: {quick_stats.get('scheduled_consultations', 0)}
+            """
+            
+            stats_label = tk.Label(stats_display, text=stats_text, font=('Courier', 10), 
+                                 justify='left', bg='white', fg='#1E3A8A')
+            stats_label.pack(pady=10, padx=10)
+            
+        except Exception as e:
+            tk.Label(stats_display, text=f"Error cargando estadísticas: {str(e)}", 
+                    fg='red', bg='white').pack(pady=20)
+    
+    def get_secretaria_stats(self):
+        """Obtener estadísticas para secretarias"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            # Citas de hoy, citas programadas y facturas pendientes (contadores materializados)
+            stats = dict(self.db_manager.get_secretaria_counters())
+            
+            # Nuevos pacientes hoy
+            cursor.execute("""
+                SELECT COUNT(*) FROM usuarios 
+                WHERE tipo_usuario = 'paciente' AND DATE(fecha_creacion) = ?
+            """, (today,))
+            stats['new_patients_today'] = cursor.fetchone()[0]
+            
+            cursor.close()
+            conn.close()
+            return stats
+            
+        except Exception as e:
+            print(f"Error obteniendo estadísticas de secretaria: {e}")
+            return {}
+    
+    def get_today_appointments(self):
+        """Obtener citas de hoy para la agenda"""
+        try:
+            conn = self.db_manager.get_connection()
+            cursor = conn.cursor()
+            
+            today = datetime.now().strftime('%Y-%m-%d')
+            
+            cursor.execute("""
+                SELECT c.*, 
+                       up.nombre || ' ' || up.apellido as paciente_nombre,
+                       ud.nombre || ' ' || ud.apellido as doctor_nombre,
+                       TIME(c.fecha_hora) as hora
+                FROM citas c
+                JOIN usuarios up ON c.paciente_id = up.id
+                JOIN usuarios ud ON c.doctor_id = ud.id
+                WHERE c.fecha = ?
+                ORDER BY c.fecha_hora ASC
+            """, (today,))
+            
+            appointments = []
+            for row in cursor.fetchall():
+                apt = dict(zip([col[0] for col in cursor.description], row))
+                appointments.append(apt)
+            
+            cursor.close()
+            conn.close()
+            return appointments
+            
+        except Exception as e:
+            print(f"Error obteniendo citas de hoy: {e}")
+            return []
+    
+    def generate_invoice_quick(self):
+        """Acceso rápido al sistema de facturación para generar facturas"""
+        self.switch_tab("Facturación Avanzada")
+        messagebox.showinfo("Sistema de Facturación", 
+                           "🚀 Accediendo al sistema de facturación integrado\n\n" +
+                           "Desde aquí podrá:\n" +
+                           "• Crear facturas completas\n" +
+                           "• Seleccionar servicios médicos\n" +
+                           "• Generar PDFs profesionales\n" +
+                           "• Procesar pagos en tiempo real")
+    
+    def manage_waiting_list(self):
+        messagebox.showinfo("Acción", "Gestión de lista de espera - En desarrollo")
+    
+    # Funciones para secretarias
+    def create_new_appointment(self): 
+        messagebox.showinfo("Acción", "Crear nueva cita - En desarrollo")
+    
+    def show_appointment_calendar(self): 
+        messagebox.showinfo("Acción", "Mostrar calendario - En desarrollo")
+    
+    def load_appointment_doctors(self): 
+        """Cargar doctores para filtro"""
+        try:
+            doctors = self.db_manager.get_all_doctors()
+            doctor_names = ['Todos'] + [f"Dr. {doc['nombre']} {doc['apellido']}" for doc in doctors]
+            self.appointment_doctor_filter['values'] = doctor_names
+            self.appointment_doctor_filter.set('Todos')
+        except Exception as e:
+            print(f"Error cargando doctores para filtro: {e}")
+    
+    def load_secretaria_appointments(self): 
+        """Cargar citas para secretaria"""
+        try:
+            # Placeholder - implementar carga real
+            appointments = self.db_manager.get_all_appointments()
+            
+            # Limpiar tabla
+            for item in self.secretaria_appointments_tree.get_children():
+                self.secretaria_appointments_tree.delete(item)
+            
+            for apt in appointments:
+                fecha_hora = apt.get('fecha_hora', '')
+                if fecha_hora:
+                    try:
+                        dt = datetime.fromisoformat(fecha_hora)
+                        fecha_hora = dt.strftime('%d/%m/%Y %H:%M')
+                    except:
+                        pass
+                
+                self.secretaria_appointments_tree.insert('', 'end', values=(
+                    apt.get('id', ''), fecha_hora,
+                    apt.get('paciente_nombre', 'N/A'),
+                    apt.get('doctor_nombre', 'N/A'),
+                    apt.get('motivo', 'N/A'),
+                    apt.get('estado', 'N/A'),
+                    apt.get('telefono', 'N/A')
+                ))
+        except Exception as e:
+            messagebox.showerror("Error", f"Error cargando citas: {str(e)}")
+    
+    def call_patient(self): messagebox.showinfo("Acción", "Llamar paciente - En desarrollo")
+    
+    def generate_appointment_invoice(self): messagebox.showinfo("Acción", "Generar factura - En desarrollo")
+    
+    def register_new_patient(self): messagebox.showinfo("Acción", "Registrar nuevo paciente - En desarrollo")
+    
+    def import_patients(self): messagebox.showinfo("Acción", "Importar pacientes - En desarrollo")
+    
+    def export_patients(self): messagebox.showinfo("Acción", "Exportar pacientes - En desarrollo")
+    
+    def search_patients_secretaria(self, event=None): messagebox.showinfo("Acción", "Buscar pacientes - En desarrollo")
+    
+    def clear_patient_search(self): messagebox.showinfo("Acción", "Limpiar búsqueda - En desarrollo")
+    
+    def load_secretaria_patients(self): messagebox.showinfo("Acción", "Cargar pacientes - En desarrollo")
+    
+    def get_secretaria_quick_stats(self):
+        """Obtener estadísticas rápidas para el panel de secretaría"""
+        try:
+            conn = self.db_manager.get_connection()
+            cur = conn.cursor()
+            
+            stats = {}
+            
+            # Citas de hoy
+            today = datetime.now().strftime('%Y-%m-%d')
+            cur.execute("SELECT COUNT(*) FROM citas WHERE DATE(fecha) = ?", (today,))
+            stats['appointments_today'] = cur.fetchone()[0]
+            
+            # Citas pendientes
+            cur.execute("SELECT COUNT(*) FROM citas WHERE estado = 'pendiente'")
+            stats['pending_appointments'] = cur.fetchone()[0]
+            
+            # Citas completadas hoy
+            cur.execute("SELECT COUNT(*) FROM citas WHERE DATE(fecha) = ? AND estado = 'completada'", (today,))
+            stats['completed_today'] = cur.fetchone()[0]
+            
+            # Total de pacientes
+            cur.execute("SELECT COUNT(*) FROM usuarios WHERE tipo = 'paciente'")
+            stats['total_patients'] = cur.fetchone()[0]
+            
+            # Nuevos pacientes este mes
+            first_day_month = datetime.now().replace(day=1).strftime('%Y-%m-%d')
+            cur.execute("SELECT COUNT(*) FROM usuarios WHERE tipo_usuario = 'paciente' AND DATE(fecha_creacion) >= ?", (first_day_month,))
+            stats['new_patients_month'] = cur.fetchone()[0]
+            
+            # Contactos pendientes (aproximación)
+            stats['pending_contacts'] = 0
+            
+            # Ingresos hoy
+            cur.execute("""
+                SELECT COALESCE(SUM(total), 0) 
+                FROM facturas 
+                WHERE DATE(fecha) = ? AND estado = 'pagada'
+            """, (today,))
+            stats['today_income'] = cur.fetchone()[0]
+            
+            # Facturas pendientes
+            cur.execute("SELECT COUNT(*) FROM facturas WHERE estado = 'pendiente'")
+            stats['pending_invoices'] = cur.fetchone()[0]
+            
+            # Facturas pagadas hoy
+            cur.execute("SELECT COUNT(*) FROM facturas WHERE DATE(fecha) = ? AND estado = 'pagada'", (today,))
+            stats['paid_today'] = cur.fetchone()[0]
+            
+            # Total del mes
+            cur.execute("""
+                SELECT COALESCE(SUM(total), 0) 
+                FROM facturas 
+                WHERE DATE(fecha) >= ? AND estado = 'pagada'
+            """, (first_day_month,))
+            stats['month_total'] = cur.fetchone()[0]
+            
+            # Doctores activos
+            cur.execute("SELECT COUNT(*) FROM usuarios WHERE tipo = 'doctor' AND estado = 'activo'")
+            stats['active_doctors'] = cur.fetchone()[0]
+            
+            # Consultas programadas
+            cur.execute("SELECT COUNT(*) FROM citas WHERE estado IN ('pendiente', 'confirmada')")
+            stats['scheduled_consultations'] = cur.fetchone()[0]
+            
+            cur.close()
+            conn.close()
+            
+            return stats
+            
+        except Exception as e:
+            print(f"Error obteniendo estadísticas: {e}")
+            return {
+                'appointments_today': 0,
+                'pending_appointments': 0,
+                'completed_today': 0,
+                'total_patients': 0,
+                'new_patients_month': 0,
+                'pending_contacts': 0,
+                'today_income': 0,
+                'pending_invoices': 0,
+                'paid_today': 0,
+                'month_total': 0,
+                'active_doctors': 0,
+                'scheduled_consultations': 0
+            }
@@ -0,0 +1,182 @@
+"""
+Dependencias opcionales de MEDISYNC
+Registro de capacidades (PDF, QR, calendario, imágenes) que se comprueban
+una sola vez y sin importar los módulos. El resultado se guarda en disco,
+asociado al intérprete y a la fecha de modificación de sus site-packages:
+al instalar o quitar paquetes cambia la clave y se vuelve a comprobar.
+Nunca se instala nada desde la aplicación; si falta una capacidad, la
+función correspondiente se desactiva y se indica cómo instalarla.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import site
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Capability:
+    """Una función opcional y los módulos que necesita"""
+    name: str
+    description: str
+    modules: Tuple[str, ...]
+    packages: Tuple[str, ...]
+    # False: sólo la necesita el servidor, no se ofrece en las estaciones
+    workstation: bool = True
+
+    @property
+    def install_hint(self):
+        return f"pip install {' '.join(self.packages)}"
+
+
+CAPABILITIES = (
+    Capability('pdf', 'Generación de PDFs', ('reportlab',), ('reportlab',)),
+    Capability('qr', 'Códigos QR en facturas', ('qrcode', 'PIL'), ('qrcode[pil]',)),
+    Capability('calendar', 'Selector de fechas', ('tkcalendar',), ('tkcalendar',)),
+    Capability('imaging', 'Procesamiento de imágenes', ('PIL',), ('pillow',)),
+    Capability('api', 'Servicio HTTP para varias estaciones', ('fastapi', 'uvicorn'),
+               ('fastapi', 'uvicorn'), workstation=False),
+)
+
+
+def is_available(module_name):
+    """¿Se puede importar ``module_name``? (busca el módulo sin ejecutarlo)"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def default_cache_path():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'medisync', 'capabilities.json')
+
+
+def site_directories():
+    """Directorios donde se instalan paquetes para este intérprete"""
+    candidates = list(site.getsitepackages()) if hasattr(site, 'getsitepackages') else []
+    if site.ENABLE_USER_SITE:
+        candidates.append(site.getusersitepackages())
+    candidates.extend(path for path in sys.path
+                      if os.path.basename(path) in ('site-packages', 'dist-packages'))
+    return sorted({os.path.abspath(path) for path in candidates if os.path.isdir(path)})
+
+
+def environment_key():
+    """Clave del entorno: intérprete, versión y mtime de cada site-packages"""
+    parts = [sys.executable, sys.version]
+    for path in site_directories():
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+
+class CapabilityRegistry:
+    """Capacidades opcionales comprobadas una vez por entorno
+
+    ``available('pdf')`` responde desde memoria; la primera consulta lee la
+    caché en disco o, si la clave del entorno cambió, busca los módulos con
+    ``find_spec`` (sin importarlos ni lanzar procesos) y reescribe la caché.
+    """
+
+    def __init__(self, capabilities=CAPABILITIES, cache_path: Optional[str] = None):
+        self.capabilities: Dict[str, Capability] = {cap.name: cap for cap in capabilities}
+        self.cache_path = cache_path or default_cache_path()
+        self._lock = threading.Lock()
+        self._modules: Optional[Dict[str, bool]] = None
+        self.from_cache = False
+
+    def _load(self):
+        with self._lock:
+            if self._modules is not None:
+                return self._modules
+            key = environment_key()
+            modules = self._read_cache(key)
+            self.from_cache = modules is not None
+            if modules is None:
+                modules = self._probe()
+                self._write_cache(key, modules)
+            self._modules = modules
+            return modules
+
+    def _probe(self):
+        names = {module for cap in self.capabilities.values() for module in cap.modules}
+        return {module: is_available(module) for module in sorted(names)}
+
+    def _read_cache(self, key):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION or data.get('key') != key:
+            return None
+        modules = data.get('modules')
+        needed = {module for cap in self.capabilities.values() for module in cap.modules}
+        if not isinstance(modules, dict) or not needed <= modules.keys():
+            return None
+        return modules
+
+    def _write_cache(self, key, modules):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'key': key, 'modules': modules}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            # Sin caché sólo se repite la comprobación en el próximo arranque
+            print(f"Error guardando caché de capacidades: {e}")
+
+    def available(self, name):
+        """¿Está disponible la capacidad ``name``?"""
+        capability = self.capabilities[name]
+        modules = self._load()
+        return all(modules.get(module, False) for module in capability.modules)
+
+    def missing(self) -> List[Capability]:
+        """Capacidades que no se pueden usar en este entorno"""
+        return [cap for cap in self.capabilities.values() if not self.available(cap.name)]
+
+    def status(self) -> Dict[str, bool]:
+        return {name: self.available(name) for name in self.capabilities}
+
+    def message(self, name):
+        """Texto para el usuario cuando falta una capacidad"""
+        capability = self.capabilities[name]
+        return (f"{capability.description} no está disponible en este equipo.\n\n"
+                f"Para habilitarla, instale las dependencias y reinicie MEDISYNC:\n"
+                f"    {capability.install_hint}")
+
+    def refresh(self):
+        """Volver a comprobar todo ignorando la caché (p. ej. tras instalar paquetes)"""
+        importlib.invalidate_caches()
+        with self._lock:
+            modules = self._probe()
+            self._write_cache(environment_key(), modules)
+            self._modules = modules
+            self.from_cache = False
+        if self is registry:
+            _publish_flags()
+        return self.status()
+
+
+def _publish_flags():
+    # Quien importe las banderas después de refresh() recibe los valores nuevos
+    global CALENDAR_AVAILABLE, PDF_AVAILABLE, QR_AVAILABLE, IMAGING_AVAILABLE
+    CALENDAR_AVAILABLE = registry.available('calendar')
+    PDF_AVAILABLE = registry.available('pdf')
+    QR_AVAILABLE = registry.available('qr')
+    IMAGING_AVAILABLE = registry.available('imaging')
+
+
+registry = CapabilityRegistry()
+_publish_flags()
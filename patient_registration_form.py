@@ -8,7 +8,6 @@ from tkinter import ttk, messagebox
 from datetime import datetime, date
 import re
 import hashlib
-from PIL import Image, ImageTk
 import os
 
 def create_patient_registration_form(parent, db_manager):
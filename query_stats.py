@@ -0,0 +1,378 @@
+"""
+Instrumentación de consultas SQL de MEDISYNC
+Las conexiones del pool se crean con InstrumentedConnection: cada sentencia
+se mide (ejecución más lectura de filas) y se guarda en un buffer circular
+en memoria con su huella (SQL sin literales), duración, filas, error y la
+acción de la interfaz que la originó. Las que superan el umbral se pueden
+escribir además en un archivo de consultas lentas.
+
+Configuración por variables de entorno:
+    MEDISYNC_QUERY_STATS=0          desactivar la instrumentación
+    MEDISYNC_SLOW_QUERY_MS=100      umbral de consulta lenta (ms)
+    MEDISYNC_SLOW_QUERY_LOG=ruta    archivo de consultas lentas (sin él, no se escribe)
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CAPACITY = 5000
+DEFAULT_SCREEN_CAPACITY = 1000
+DEFAULT_SLOW_MS = 100.0
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_SPACES = re.compile(r"\s+")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES = re.compile(r"(\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """SQL normalizado: sin comentarios ni literales, espacios simples y listas ``(?, ?, ...)`` colapsadas
+
+    Dos ejecuciones de la misma consulta con valores distintos comparten huella.
+    """
+    text = _COMMENTS.sub(' ', sql)
+    text = _STRINGS.sub('?', text)
+    text = _NUMBERS.sub('?', text)
+    text = _SPACES.sub(' ', text).strip().rstrip(';').strip()
+    text = _LISTS.sub('(?...)', text)
+    return _VALUES.sub(r'\1', text)
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+@dataclass
+class QueryRecord:
+    """Una sentencia ejecutada; la duración y las filas crecen mientras se leen resultados"""
+    fingerprint: str
+    sql: str
+    params: Any
+    action: Optional[str]
+    thread: str
+    started: float
+    duration_ms: float = 0.0
+    rows: int = 0
+    error: Optional[str] = None
+    finished: bool = False
+
+
+@dataclass
+class ScreenTiming:
+    """Carga de una pantalla o acción de la interfaz"""
+    action: str
+    kind: str
+    duration_ms: float
+    queries: int
+    started: float
+
+
+@dataclass
+class QuerySummary:
+    """Estadísticas de una huella en el buffer"""
+    fingerprint: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+    rows: int
+    errors: int
+    actions: List[str] = field(default_factory=list)
+    sql: str = ''
+    params: Any = None
+
+
+@dataclass
+class ScreenSummary:
+    """Tiempos de carga de una pantalla (o acción) por tipo de carga"""
+    action: str
+    kind: str
+    loads: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    queries_per_load: float
+
+
+class QueryMonitor:
+    """Buffer circular de consultas y cargas de pantalla del proceso
+
+    - ``action(nombre)`` etiqueta las consultas del hilo actual y mide la
+      duración total del bloque (carga de una pestaña, inicio de sesión...).
+    - ``labelled(nombre)`` sólo etiqueta (tareas en segundo plano lanzadas
+      desde una acción).
+    - ``top(n)`` y ``screens()`` resumen lo registrado para el panel de
+      rendimiento.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, screen_capacity=DEFAULT_SCREEN_CAPACITY,
+                 slow_ms=DEFAULT_SLOW_MS, slow_log: Optional[str] = None, enabled=True):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self._records = deque(maxlen=capacity)
+        self._screens = deque(maxlen=screen_capacity)
+        self._local = threading.local()
+        self._log_lock = threading.Lock()
+        self._log_failed = False
+        self.slow_count = 0
+
+    @classmethod
+    def from_environment(cls):
+        try:
+            slow_ms = float(os.environ.get('MEDISYNC_SLOW_QUERY_MS', DEFAULT_SLOW_MS))
+        except ValueError:
+            slow_ms = DEFAULT_SLOW_MS
+        return cls(slow_ms=slow_ms, slow_log=os.environ.get('MEDISYNC_SLOW_QUERY_LOG') or None,
+                   enabled=os.environ.get('MEDISYNC_QUERY_STATS', '1') != '0')
+
+    def configure(self, slow_ms=None, slow_log=None, enabled=None):
+        """Cambiar umbral, archivo de consultas lentas o activación en caliente"""
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+        if slow_log is not None:
+            self.slow_log = slow_log or None
+            self._log_failed = False
+        if enabled is not None:
+            self.enabled = enabled
+
+    # ------------------------------------------------------------------
+    # Acciones de la interfaz
+    # ------------------------------------------------------------------
+    def current_action(self):
+        return getattr(self._local, 'action', None)
+
+    @contextmanager
+    def labelled(self, action):
+        """Etiquetar las consultas de este hilo sin medir el bloque"""
+        previous = getattr(self._local, 'action', None)
+        self._local.action = action or previous
+        try:
+            yield
+        finally:
+            self._local.action = previous
+
+    @contextmanager
+    def action(self, name, kind='acción'):
+        """Etiquetar las consultas de este hilo con ``name`` y registrar la duración del bloque"""
+        local = self._local
+        previous = getattr(local, 'action', None)
+        queries_before = getattr(local, 'queries', 0)
+        local.action = name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            local.action = previous
+            if self.enabled:
+                self._screens.append(ScreenTiming(name, kind, elapsed,
+                                                  getattr(local, 'queries', 0) - queries_before, time.time()))
+
+    # ------------------------------------------------------------------
+    # Registro (llamado por InstrumentedCursor)
+    # ------------------------------------------------------------------
+    def start(self, sql, params):
+        if not self.enabled:
+            return None
+        local = self._local
+        local.queries = getattr(local, 'queries', 0) + 1
+        record = QueryRecord(fingerprint(sql), sql, params, getattr(local, 'action', None),
+                             threading.current_thread().name, time.time())
+        self._records.append(record)
+        return record
+
+    def finish(self, record):
+        """Sentencia terminada (sin más filas que leer): comprobar si fue lenta"""
+        if record.finished:
+            return
+        record.finished = True
+        if record.duration_ms >= self.slow_ms:
+            self.slow_count += 1
+            if self.slow_log:
+                self._write_slow(record)
+
+    def _write_slow(self, record):
+        # Sólo la huella: los valores de los parámetros (datos de pacientes) no salen de memoria
+        line = (f"{datetime.fromtimestamp(record.started).isoformat(timespec='seconds')}\t"
+                f"{record.duration_ms:.1f} ms\t{record.rows} filas\t{record.action or '-'}\t"
+                f"{record.fingerprint}" + (f"\tERROR: {record.error}" if record.error else "") + "\n")
+        with self._log_lock:
+            try:
+                directory = os.path.dirname(self.slow_log)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.slow_log, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                if not self._log_failed:
+                    print(f"Error escribiendo registro de consultas lentas: {e}")
+                    self._log_failed = True
+
+    # ------------------------------------------------------------------
+    # Consultas del panel
+    # ------------------------------------------------------------------
+    def records(self) -> List[QueryRecord]:
+        return list(self._records)
+
+    def top(self, n=20, order_by='total_ms') -> List[QuerySummary]:
+        """Las ``n`` huellas con mayor ``order_by`` (total_ms, mean_ms, p95_ms, max_ms, calls, errors)"""
+        groups: Dict[str, List[QueryRecord]] = {}
+        for record in self.records():
+            groups.setdefault(record.fingerprint, []).append(record)
+        summaries = []
+        for key, records in groups.items():
+            durations = sorted(record.duration_ms for record in records)
+            total = sum(durations)
+            actions = Counter(record.action for record in records if record.action)
+            # Para EXPLAIN: la última ejecución con parámetros conocidos
+            sample = next((record for record in reversed(records) if record.params is not None), records[-1])
+            summaries.append(QuerySummary(
+                fingerprint=key, calls=len(records), total_ms=total, mean_ms=total / len(records),
+                p95_ms=percentile(durations, 0.95), max_ms=durations[-1],
+                rows=sum(record.rows for record in records),
+                errors=sum(1 for record in records if record.error),
+                actions=[name for name, _ in actions.most_common(3)],
+                sql=sample.sql, params=sample.params,
+            ))
+        summaries.sort(key=lambda summary: getattr(summary, order_by), reverse=True)
+        return summaries[:n]
+
+    def screens(self) -> List[ScreenSummary]:
+        """p50/p95 de cada pantalla o acción, de la más lenta (p95) a la más rápida"""
+        groups: Dict[tuple, List[ScreenTiming]] = {}
+        for timing in list(self._screens):
+            groups.setdefault((timing.action, timing.kind), []).append(timing)
+        summaries = []
+        for (action, kind), timings in groups.items():
+            durations = sorted(timing.duration_ms for timing in timings)
+            summaries.append(ScreenSummary(
+                action=action, kind=kind, loads=len(timings),
+                p50_ms=percentile(durations, 0.5), p95_ms=percentile(durations, 0.95), max_ms=durations[-1],
+                queries_per_load=sum(timing.queries for timing in timings) / len(timings),
+            ))
+        summaries.sort(key=lambda summary: summary.p95_ms, reverse=True)
+        return summaries
+
+    def clear(self):
+        self._records.clear()
+        self._screens.clear()
+        self.slow_count = 0
+
+
+monitor = QueryMonitor.from_environment()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor que mide cada sentencia y las filas que se leen de ella"""
+
+    _record = None
+
+    def _run(self, method, sql, args, stored_params):
+        record = self._record = monitor.start(sql, stored_params)
+        if record is None:
+            return method(*args)
+        started = time.perf_counter()
+        try:
+            method(*args)
+        except Exception as e:
+            record.duration_ms = (time.perf_counter() - started) * 1000
+            record.error = str(e)
+            monitor.finish(record)
+            raise
+        record.duration_ms = (time.perf_counter() - started) * 1000
+        if self.description is None:
+            # Sin resultados que leer (INSERT, UPDATE, DDL...): filas afectadas
+            record.rows = max(self.rowcount, 0)
+            monitor.finish(record)
+        return self
+
+    def _fetched(self, started, rows, done):
+        record = self._record
+        if record is not None:
+            record.duration_ms += (time.perf_counter() - started) * 1000
+            record.rows += rows
+            if done:
+                monitor.finish(record)
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, (sql, parameters), parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # Los parámetros de un lote no se guardan (pueden ser un generador)
+        return self._run(super().executemany, sql, (sql, seq_of_parameters), None)
+
+    def executescript(self, sql_script):
+        return self._run(super().executescript, sql_script, (sql_script,), None)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, int(row is not None), row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """sqlite3.Connection cuyos cursores (también los de ``execute``) se miden
+
+    Se usa como ``factory`` de ``sqlite3.connect``. ``Connection.execute``
+    crea internamente un cursor normal, por eso se redefine aquí.
+    """
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or InstrumentedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def explain_parameters(sql, params):
+    """Parámetros para EXPLAIN: los registrados o NULL por cada ``?`` (lotes, scripts)"""
+    if params is not None:
+        return params
+    return (None,) * sql.count('?')
@@ -0,0 +1,306 @@
+"""
+Tablas de hechos diarias y mensuales para los reportes de MEDISYNC
+Ingresos por método de pago y seguro, citas por estado y doctor, servicios
+facturados y motivos de consulta, mantenidos por triggers (igual que los
+contadores de dashboard_stats). Una modificación tardía de una cita o
+factura resta su aporte anterior y suma el nuevo, sin recalcular periodos.
+
+Los reportes de un rango leen los meses completos de la tabla mensual y
+sólo los días sueltos de los extremos de la diaria, así un reporte de
+varios años recorre unas decenas de filas.
+
+Uso:
+    python report_rollups.py [ruta_db]              # verificar tablas de hechos
+    python report_rollups.py --rebuild [ruta_db]    # recalcular desde cero
+"""
+import sqlite3
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import dashboard_stats
+from dashboard_stats import Counter
+
+TRIGGER_PREFIX = 'rollup'
+
+
+@dataclass
+class Fact:
+    """Hechos de un reporte: contadores por día y por mes con las mismas claves"""
+    day: Counter
+    month: Counter
+
+    @property
+    def columns(self):
+        """Columnas comunes a ambas tablas (todo salvo la fecha o el mes)"""
+        return [col for col, _ in self.month.keys[1:] + self.month.sums]
+
+
+def _fact(name, source, date_expr, keys, sums, condition="1", day=None):
+    """Fact ``{name}_dia``/``{name}_mes`` agrupado por la fecha ``date_expr``
+
+    ``day`` reutiliza una tabla diaria ya existente con las mismas claves.
+    """
+    month = Counter(f"{name}_mes", source,
+                    keys=(('mes', f"COALESCE(strftime('%Y-%m', {date_expr}), '')"),) + keys,
+                    sums=sums, condition=condition)
+    if day is None:
+        day = Counter(f"{name}_dia", source,
+                      keys=(('fecha', f"COALESCE(DATE({date_expr}), '')"),) + keys,
+                      sums=sums, condition=condition)
+    return Fact(day, month)
+
+
+def _dashboard_counter(table):
+    return next(counter for counter in dashboard_stats.COUNTERS if counter.table == table)
+
+
+_FACTURA_SUMS = (('facturas', "1"), ('monto', "COALESCE({row}.monto, 0)"))
+_FACTURA_COBRO = (
+    ('estado', "COALESCE({row}.estado, '')"),
+    ('metodo_pago', "COALESCE({row}.metodo_pago, '')"),
+    ('seguro', "COALESCE({row}.seguro_aplicado, '')"),
+)
+
+FACTS: Dict[str, Fact] = {
+    # Citas por estado y doctor (la tabla diaria es la de los paneles)
+    'citas': _fact('rollup_citas', 'citas', "{row}.fecha_hora",
+                   keys=(('doctor_id', "COALESCE({row}.doctor_id, 0)"), ('estado', "COALESCE({row}.estado, '')")),
+                   sums=(('citas', "1"), ('importe', "COALESCE({row}.tarifa_consulta, 0)")),
+                   day=_dashboard_counter('estadisticas_citas_dia')),
+    # Motivos de consulta
+    'motivos': _fact('rollup_motivos', 'citas', "{row}.fecha_hora",
+                     keys=(('motivo', "COALESCE({row}.motivo, '')"),),
+                     sums=(('citas', "1"),)),
+    # Facturación por fecha de emisión, método de pago y seguro
+    'facturas': _fact('rollup_facturas', 'facturas', "{row}.fecha_creacion",
+                      keys=_FACTURA_COBRO, sums=_FACTURA_SUMS),
+    # Cobros por fecha de pago, método de pago y seguro
+    'cobros': _fact('rollup_cobros', 'facturas', "{row}.fecha_pago",
+                    keys=_FACTURA_COBRO, sums=_FACTURA_SUMS,
+                    condition="{row}.fecha_pago IS NOT NULL"),
+    # Servicios facturados por tipo de consulta y doctor
+    'servicios': _fact('rollup_servicios', 'facturas', "{row}.fecha_creacion",
+                       keys=(('servicio', "COALESCE(NULLIF({row}.tipo_consulta, ''), {row}.concepto, '')"),
+                             ('doctor_id', "COALESCE({row}.doctor_id, 0)"),
+                             ('estado', "COALESCE({row}.estado, '')")),
+                       sums=_FACTURA_SUMS),
+}
+
+# Contadores propios de este módulo (la tabla diaria de citas pertenece a dashboard_stats)
+ROLLUPS: List[Counter] = [
+    counter
+    for fact in FACTS.values()
+    for counter in (fact.day, fact.month)
+    if counter not in dashboard_stats.COUNTERS
+]
+
+
+def ensure_rollups(cursor):
+    """Crear tablas de hechos y sus triggers (idempotente, no recalcula)"""
+    return dashboard_stats.ensure_stats(cursor, ROLLUPS, prefix=TRIGGER_PREFIX)
+
+
+def rebuild(cursor):
+    dashboard_stats.rebuild(cursor, ROLLUPS)
+
+
+def verify(cursor) -> Dict[str, int]:
+    return dashboard_stats.verify(cursor, ROLLUPS)
+
+
+# ----------------------------------------------------------------------
+# Rangos de fechas
+# ----------------------------------------------------------------------
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def split_range(start, end) -> Tuple[List[Tuple[str, str]], Optional[Tuple[str, str]]]:
+    """Dividir [start, end] en días sueltos y meses completos
+
+    Devuelve ([(desde, hasta), ...] en días ISO, (primer_mes, último_mes) o None).
+    """
+    start, end = _as_date(start), _as_date(end)
+    if start > end:
+        return [], None
+    # Primer día de un mes completo y último día del último mes completo
+    first_full = start if start.day == 1 else (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    next_month = (end.replace(day=28) + timedelta(days=4)).replace(day=1)
+    last_full = end if end == next_month - timedelta(days=1) else end.replace(day=1) - timedelta(days=1)
+
+    if first_full > last_full:
+        return [(start.isoformat(), end.isoformat())], None
+    days = []
+    if start < first_full:
+        days.append((start.isoformat(), (first_full - timedelta(days=1)).isoformat()))
+    if last_full < end:
+        days.append(((last_full + timedelta(days=1)).isoformat(), end.isoformat()))
+    return days, (first_full.strftime('%Y-%m'), last_full.strftime('%Y-%m'))
+
+
+def _range_source(fact, start, end, where, params):
+    """Subconsulta con las filas de ``fact`` que cubren [start, end] y sus parámetros"""
+    columns = ", ".join(fact.columns)
+    days, months = split_range(start, end)
+    parts, values = [], []
+    for first, last in days:
+        parts.append(f"SELECT {columns} FROM {fact.day.table} WHERE fecha BETWEEN ? AND ? AND ({where})")
+        values.extend([first, last, *params])
+    if months:
+        parts.append(f"SELECT {columns} FROM {fact.month.table} WHERE mes BETWEEN ? AND ? AND ({where})")
+        values.extend([*months, *params])
+    if not parts:
+        parts.append(f"SELECT {columns} FROM {fact.month.table} WHERE 0")
+    return " UNION ALL ".join(parts), values
+
+
+def totals(cursor, fact, start, end, select, where="1", params=(), group_by=None, order_by=None, limit=None):
+    """Agregar ``select`` sobre los hechos de [start, end]
+
+    ``select``, ``where``, ``group_by`` y ``order_by`` usan las columnas de
+    la tabla de hechos (claves y sumas, sin la fecha).
+    """
+    source, values = _range_source(FACTS[fact], start, end, where, params)
+    sql = f"SELECT {select} FROM ({source})"
+    if group_by:
+        sql += f" GROUP BY {group_by}"
+    if order_by:
+        sql += f" ORDER BY {order_by}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        values.append(limit)
+    cursor.execute(sql, values)
+    return cursor.fetchall()
+
+
+def daily(cursor, fact, start, end, select, where="1", params=()):
+    """Agregar ``select`` por día (columna ``fecha``) sobre la tabla diaria"""
+    cursor.execute(f'''
+    SELECT fecha, {select} FROM {FACTS[fact].day.table}
+    WHERE fecha BETWEEN ? AND ? AND ({where})
+    GROUP BY fecha ORDER BY fecha
+    ''', (_as_date(start).isoformat(), _as_date(end).isoformat(), *params))
+    return cursor.fetchall()
+
+
+def _in_list(values):
+    return ", ".join("?" for _ in values)
+
+
+# ----------------------------------------------------------------------
+# Consultas de los reportes
+# ----------------------------------------------------------------------
+def income_by_day(cursor, start, end, estados: Sequence[str]):
+    """[(fecha, monto, facturas)] facturado por día de emisión"""
+    return daily(cursor, 'facturas', start, end, "SUM(monto), SUM(facturas)",
+                 f"estado IN ({_in_list(estados)})", tuple(estados))
+
+
+def income_totals(cursor, start, end, estados: Sequence[str]):
+    """(monto, facturas) facturado en el rango"""
+    row = totals(cursor, 'facturas', start, end, "COALESCE(SUM(monto), 0), COALESCE(SUM(facturas), 0)",
+                 f"estado IN ({_in_list(estados)})", tuple(estados))[0]
+    return row[0], row[1]
+
+
+def income_breakdown(cursor, start, end, estados: Sequence[str], dimension='metodo_pago'):
+    """[(valor, monto, facturas)] por 'metodo_pago' o 'seguro', de mayor a menor"""
+    if dimension not in ('metodo_pago', 'seguro'):
+        raise ValueError(f"Dimensión de ingresos desconocida: {dimension!r}")
+    return totals(cursor, 'facturas', start, end, f"{dimension}, SUM(monto), SUM(facturas)",
+                  f"estado IN ({_in_list(estados)})", tuple(estados),
+                  group_by=dimension, order_by="SUM(monto) DESC")
+
+
+def appointments_by_day(cursor, start, end):
+    """[(fecha, total, completadas, canceladas)]"""
+    return daily(cursor, 'citas', start, end,
+                 "SUM(citas), SUM(CASE WHEN estado = 'completada' THEN citas ELSE 0 END), "
+                 "SUM(CASE WHEN estado = 'cancelada' THEN citas ELSE 0 END)")
+
+
+def appointments_totals(cursor, start, end):
+    """(total, completadas, canceladas)"""
+    row = totals(cursor, 'citas', start, end,
+                 "COALESCE(SUM(citas), 0), "
+                 "COALESCE(SUM(CASE WHEN estado = 'completada' THEN citas ELSE 0 END), 0), "
+                 "COALESCE(SUM(CASE WHEN estado = 'cancelada' THEN citas ELSE 0 END), 0)")[0]
+    return tuple(row)
+
+
+def appointments_by_state(cursor, start, end):
+    """[(estado, citas)] de mayor a menor"""
+    return totals(cursor, 'citas', start, end, "estado, SUM(citas)",
+                  group_by="estado", order_by="SUM(citas) DESC")
+
+
+def appointments_by_doctor(cursor, start, end, limit=10):
+    """[(doctor_id, nombre, citas, importe facturado, facturas)] de mayor a menor número de citas"""
+    rows = totals(cursor, 'citas', start, end, "doctor_id, SUM(citas)",
+                  "doctor_id != 0", group_by="doctor_id", order_by="SUM(citas) DESC", limit=limit)
+    if not rows:
+        return []
+    billed = {
+        doctor_id: (monto, facturas)
+        for doctor_id, monto, facturas in totals(cursor, 'servicios', start, end,
+                                                 "doctor_id, SUM(monto), SUM(facturas)",
+                                                 group_by="doctor_id")
+    }
+    ids = [doctor_id for doctor_id, _ in rows]
+    cursor.execute(f"SELECT id, nombre || ' ' || apellido FROM usuarios WHERE id IN ({_in_list(ids)})", ids)
+    names = dict(cursor.fetchall())
+    return [(doctor_id, names.get(doctor_id, f"#{doctor_id}"), citas) + billed.get(doctor_id, (0, 0))
+            for doctor_id, citas in rows]
+
+
+def top_reasons(cursor, start, end, limit=10):
+    """[(motivo, citas)] más frecuentes"""
+    return totals(cursor, 'motivos', start, end, "motivo, SUM(citas)", "motivo != ''",
+                  group_by="motivo", order_by="SUM(citas) DESC", limit=limit)
+
+
+def financial_summary(cursor, start, end, paid=('pagada',), pending=('pendiente',)):
+    """Cobrado (por fecha de pago) y pendiente (por fecha de emisión) en el rango"""
+    cobrado, pagadas = totals(cursor, 'cobros', start, end,
+                              "COALESCE(SUM(monto), 0), COALESCE(SUM(facturas), 0)",
+                              f"estado IN ({_in_list(paid)})", tuple(paid))[0]
+    pendiente, pendientes = income_totals(cursor, start, end, pending)
+    return {
+        'cobrado': cobrado,
+        'facturas_pagadas': pagadas,
+        'pendiente': pendiente,
+        'facturas_pendientes': pendientes,
+    }
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    repair = '--rebuild' in argv
+    if repair:
+        argv.remove('--rebuild')
+    db_path = argv[0] if argv else 'database/medisync.db'
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        if repair:
+            cursor.execute("BEGIN IMMEDIATE")
+            ensure_rollups(cursor)
+            rebuild(cursor)
+            conn.commit()
+            print("✅ Tablas de hechos recalculadas")
+        failures = {table: count for table, count in verify(cursor).items() if count}
+        for table, count in failures.items():
+            print(f"❌ {table}: {count} filas no coinciden (usar --rebuild)")
+        if failures:
+            return 1
+        print("✅ Tablas de hechos de reportes coherentes con citas y facturas")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
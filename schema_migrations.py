@@ -0,0 +1,361 @@
+"""
+Migraciones versionadas del esquema de MEDISYNC
+Tabla schema_version + pasos ordenados, y verificación de planes de consulta
+
+Uso:
+    python schema_migrations.py [ruta_db]            # aplicar migraciones pendientes
+    python schema_migrations.py --check [ruta_db]    # verificar EXPLAIN QUERY PLAN
+"""
+import sqlite3
+import sys
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+import dashboard_stats
+import report_rollups
+from change_events import TRIGGER_PREFIX, ensure_change_log
+from document_cache import ensure_document_cache
+from invoice_sequence import ensure_sequence_table
+from medical_search import ensure_fts
+
+
+@dataclass
+class Migration:
+    version: int
+    descripcion: str
+    apply: Callable[[sqlite3.Cursor], None]
+
+
+def _table_exists(cursor, table):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+
+def _table_columns(cursor, table):
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _create_index(cursor, name, table, columns):
+    """Crear índice sólo si la tabla y todas sus columnas existen"""
+    if not _table_exists(cursor, table):
+        return
+    existing = _table_columns(cursor, table)
+    # Admite "columna COLLATE NOCASE"
+    if not all(col.split()[0] in existing for col in columns):
+        return
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(columns)})")
+
+
+DOCTOR_SCHEDULES_SQL = '''
+CREATE TABLE IF NOT EXISTS doctor_schedules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doctor_id INTEGER,
+    dia_semana TEXT,
+    hora_inicio TEXT,
+    hora_fin TEXT,
+    activo BOOLEAN DEFAULT 1,
+    FOREIGN KEY (doctor_id) REFERENCES usuarios (id)
+)
+'''
+
+
+# ----------------------------------------------------------------------
+# Pasos de migración
+# ----------------------------------------------------------------------
+def _m001_indices_acceso(cursor):
+    """Índices compuestos para los accesos más frecuentes"""
+    _create_index(cursor, 'idx_citas_doctor_fecha_hora', 'citas', ('doctor_id', 'fecha_hora'))
+    _create_index(cursor, 'idx_citas_paciente_fecha_hora', 'citas', ('paciente_id', 'fecha_hora'))
+    _create_index(cursor, 'idx_citas_estado_fecha_hora', 'citas', ('estado', 'fecha_hora'))
+    _create_index(cursor, 'idx_facturas_estado_vencimiento', 'facturas', ('estado', 'fecha_vencimiento'))
+    _create_index(cursor, 'idx_facturas_paciente_creacion', 'facturas', ('paciente_id', 'fecha_creacion'))
+    _create_index(cursor, 'idx_facturas_cita', 'facturas', ('cita_id',))
+    _create_index(cursor, 'idx_historial_medico_paciente_fecha', 'historial_medico',
+                  ('paciente_id', 'fecha_consulta'))
+    _create_index(cursor, 'idx_historiales_medicos_paciente_fecha', 'historiales_medicos',
+                  ('paciente_id', 'fecha_consulta'))
+    # Cubre los listados "WHERE tipo_usuario = ? AND activo = 1 ORDER BY nombre, apellido"
+    _create_index(cursor, 'idx_usuarios_tipo_activo_nombre', 'usuarios',
+                  ('tipo_usuario', 'activo', 'nombre', 'apellido'))
+
+
+def _m002_citas_fecha_normalizada(cursor):
+    """Columna citas.fecha = DATE(fecha_hora), mantenida por triggers"""
+    if not _table_exists(cursor, 'citas'):
+        return
+    if 'fecha' not in _table_columns(cursor, 'citas'):
+        cursor.execute("ALTER TABLE citas ADD COLUMN fecha DATE")
+    cursor.execute("UPDATE citas SET fecha = DATE(fecha_hora) WHERE fecha IS NOT DATE(fecha_hora)")
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_citas_fecha_insert
+    AFTER INSERT ON citas
+    BEGIN
+        UPDATE citas SET fecha = DATE(NEW.fecha_hora) WHERE id = NEW.id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_citas_fecha_update
+    AFTER UPDATE OF fecha_hora ON citas
+    BEGIN
+        UPDATE citas SET fecha = DATE(NEW.fecha_hora) WHERE id = NEW.id;
+    END
+    ''')
+    _create_index(cursor, 'idx_citas_fecha_doctor_estado', 'citas', ('fecha', 'doctor_id', 'estado'))
+    _create_index(cursor, 'idx_citas_doctor_fecha', 'citas', ('doctor_id', 'fecha', 'estado'))
+
+
+def _m003_citas_orden_fecha_hora(cursor):
+    """Índice para recorrer citas por (fecha_hora, id) en la paginación por clave"""
+    _create_index(cursor, 'idx_citas_fecha_hora', 'citas', ('fecha_hora',))
+
+
+def _m004_secuencias_factura(cursor):
+    """Tabla de contadores para la numeración atómica de facturas"""
+    ensure_sequence_table(cursor)
+
+
+def _m005_usuarios_busqueda_nocase(cursor):
+    """Índices NOCASE para buscar usuarios por prefijo de nombre, apellido o email con LIKE"""
+    _create_index(cursor, 'idx_usuarios_nombre_nocase', 'usuarios', ('nombre COLLATE NOCASE',))
+    _create_index(cursor, 'idx_usuarios_apellido_nocase', 'usuarios', ('apellido COLLATE NOCASE',))
+    _create_index(cursor, 'idx_usuarios_email_nocase', 'usuarios', ('email COLLATE NOCASE',))
+
+
+def _m006_historial_fts(cursor):
+    """Índices FTS5 sin acentos sobre historial_medico e historiales_medicos"""
+    ensure_fts(cursor)
+
+
+def _m007_contadores_paneles(cursor):
+    """Contadores materializados de citas y facturas para los paneles"""
+    dashboard_stats.ensure_stats(cursor)
+    dashboard_stats.rebuild(cursor)
+
+
+def _m008_hechos_reportes(cursor):
+    """Tablas de hechos diarias y mensuales para los reportes"""
+    if _table_exists(cursor, 'facturas'):
+        # Columnas que la facturación ya escribe pero que el esquema base no crea
+        existing = _table_columns(cursor, 'facturas')
+        for column in ('seguro_aplicado', 'tipo_consulta'):
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE facturas ADD COLUMN {column} TEXT")
+    report_rollups.ensure_rollups(cursor)
+    report_rollups.rebuild(cursor)
+
+
+def _m009_cache_documentos(cursor):
+    """Índice de PDFs generados y triggers que los invalidan"""
+    ensure_document_cache(cursor)
+
+
+def _m010_registro_cambios(cursor):
+    """Registro de altas, cambios y bajas de citas, facturas y pacientes para avisar a las ventanas"""
+    ensure_change_log(cursor)
+
+
+def _m011_facturas_cita(cursor):
+    """facturas.cita_id en bases creadas desde SCHEMA_TABLES (m001 omitía su índice)"""
+    if not _table_exists(cursor, 'facturas'):
+        return
+    if 'cita_id' not in _table_columns(cursor, 'facturas'):
+        cursor.execute("ALTER TABLE facturas ADD COLUMN cita_id INTEGER REFERENCES citas(id)")
+        # Los triggers del registro de cambios se crearon sin la columna: rehacerlos
+        for kind in ('insert', 'update', 'delete'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{TRIGGER_PREFIX}_facturas_{kind}")
+        ensure_change_log(cursor)
+    _create_index(cursor, 'idx_facturas_cita', 'facturas', ('cita_id',))
+
+
+def _m012_horarios_doctores(cursor):
+    """doctor_schedules desde el arranque, no al guardar el primer horario"""
+    # Creada a mitad de sesión, las conexiones ya abiertas del pool no tenían
+    # los triggers TEMP de table_versions para ella
+    cursor.execute(DOCTOR_SCHEDULES_SQL)
+    _create_index(cursor, 'idx_doctor_schedules_doctor', 'doctor_schedules', ('doctor_id', 'activo'))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Índices de acceso para citas, facturas, historial_medico y usuarios",
+              _m001_indices_acceso),
+    Migration(2, "Columna normalizada citas.fecha con triggers e índices",
+              _m002_citas_fecha_normalizada),
+    Migration(3, "Índice de orden citas(fecha_hora) para paginación por clave",
+              _m003_citas_orden_fecha_hora),
+    Migration(4, "Tabla secuencias_factura para numeración de facturas",
+              _m004_secuencias_factura),
+    Migration(5, "Índices NOCASE de usuarios para búsqueda por prefijo",
+              _m005_usuarios_busqueda_nocase),
+    Migration(6, "Búsqueda de texto FTS5 en historiales médicos",
+              _m006_historial_fts),
+    Migration(7, "Contadores de paneles mantenidos por triggers (estadisticas_*)",
+              _m007_contadores_paneles),
+    Migration(8, "Tablas de hechos diarias y mensuales para reportes (rollup_*)",
+              _m008_hechos_reportes),
+    Migration(9, "Caché de documentos PDF con invalidación por triggers (documentos_cache)",
+              _m009_cache_documentos),
+    Migration(10, "Registro de cambios de citas, facturas y pacientes (registro_cambios)",
+              _m010_registro_cambios),
+    Migration(11, "Columna facturas.cita_id e índice idx_facturas_cita en bases nuevas",
+              _m011_facturas_cita),
+    Migration(12, "Tabla doctor_schedules e índice idx_doctor_schedules_doctor",
+              _m012_horarios_doctores),
+]
+
+
+# ----------------------------------------------------------------------
+# Motor de migraciones
+# ----------------------------------------------------------------------
+def ensure_version_table(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        descripcion TEXT NOT NULL,
+        aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+
+def current_version(conn):
+    """Versión de esquema aplicada (0 si no hay ninguna)"""
+    cursor = conn.cursor()
+    try:
+        ensure_version_table(cursor)
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def migrate(conn, migrations=None):
+    """Aplicar en orden las migraciones pendientes; cada una en su transacción
+
+    Devuelve la lista de versiones aplicadas.
+    """
+    migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+    applied = []
+    cursor = conn.cursor()
+    try:
+        ensure_version_table(cursor)
+        conn.commit()
+        for migration in migrations:
+            # BEGIN IMMEDIATE: otro proceso no puede aplicar la misma versión a la vez
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute("SELECT 1 FROM schema_version WHERE version = ?", (migration.version,))
+                if cursor.fetchone():
+                    conn.rollback()
+                    continue
+                migration.apply(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, descripcion) VALUES (?, ?)",
+                    (migration.version, migration.descripcion)
+                )
+                conn.commit()
+                applied.append(migration.version)
+            except Exception:
+                conn.rollback()
+                raise
+    finally:
+        cursor.close()
+    return applied
+
+
+# ----------------------------------------------------------------------
+# Verificación de planes de consulta
+# ----------------------------------------------------------------------
+# (descripción, SQL, parámetros, índice que debe aparecer en el plan)
+QUERY_PLAN_CHECKS: List[Tuple[str, str, tuple, str]] = [
+    ("Citas de un doctor en un día",
+     "SELECT COUNT(*) FROM citas WHERE doctor_id = ? AND fecha = ?",
+     (1, '2025-01-01'), 'idx_citas_doctor_fecha'),
+    ("Citas del día",
+     "SELECT COUNT(*) FROM citas WHERE fecha = ?",
+     ('2025-01-01',), 'idx_citas_fecha_doctor_estado'),
+    ("Citas de un paciente por fecha",
+     "SELECT id FROM citas WHERE paciente_id = ? ORDER BY fecha_hora DESC",
+     (1,), 'idx_citas_paciente_fecha_hora'),
+    ("Página de citas tras un cursor (fecha_hora, id)",
+     "SELECT id FROM citas WHERE (fecha_hora, id) < (?, ?) ORDER BY fecha_hora DESC, id DESC LIMIT 100",
+     ('2025-01-01 08:00', 10), 'idx_citas_fecha_hora'),
+    ("Facturas pendientes por vencimiento",
+     "SELECT id FROM facturas WHERE estado = 'pendiente' ORDER BY fecha_vencimiento",
+     (), 'idx_facturas_estado_vencimiento'),
+    ("Facturas de un paciente",
+     "SELECT id FROM facturas WHERE paciente_id = ? ORDER BY fecha_creacion DESC",
+     (1,), 'idx_facturas_paciente_creacion'),
+    ("Factura de una cita",
+     "SELECT id FROM facturas WHERE cita_id = ?",
+     (1,), 'idx_facturas_cita'),
+    ("Historial de un paciente",
+     "SELECT id FROM historial_medico WHERE paciente_id = ? ORDER BY fecha_consulta DESC",
+     (1,), 'idx_historial_medico_paciente_fecha'),
+    ("Usuarios activos por tipo",
+     "SELECT id, nombre, apellido FROM usuarios WHERE tipo_usuario = ? AND activo = 1 "
+     "ORDER BY nombre, apellido",
+     ('doctor',), 'idx_usuarios_tipo_activo_nombre'),
+    ("Ingresos del mes de un doctor (contadores)",
+     "SELECT SUM(importe) FROM estadisticas_citas_dia WHERE doctor_id = ? AND estado = 'completada' "
+     "AND fecha BETWEEN ? AND ?",
+     (1, '2025-01-01', '2025-01-31'), 'idx_estadisticas_citas_dia_doctor_id_estado_fecha'),
+    ("Facturación de varios meses (hechos mensuales)",
+     "SELECT SUM(monto) FROM rollup_facturas_mes WHERE mes BETWEEN ? AND ?",
+     ('2024-01', '2025-12'), 'PRIMARY KEY'),
+    ("Búsqueda de usuarios por prefijo de apellido",
+     "SELECT id FROM usuarios WHERE apellido LIKE ? ESCAPE '\\'",
+     ('gar%',), 'idx_usuarios_apellido_nocase'),
+]
+
+
+def explain(conn, sql, params=()):
+    """Texto del EXPLAIN QUERY PLAN de una consulta"""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def verify_query_plans(conn, checks=None):
+    """Comprobar que cada consulta crítica usa su índice
+
+    Devuelve la lista de fallos [(descripción, índice esperado, plan)].
+    Una consulta que no se puede preparar (tabla o columna inexistente)
+    también es un fallo: su plan es el mensaje de error.
+    """
+    failures = []
+    for descripcion, sql, params, index in (checks or QUERY_PLAN_CHECKS):
+        try:
+            plan = explain(conn, sql, params)
+        except sqlite3.OperationalError as e:
+            failures.append((descripcion, index, f"no se pudo comprobar: {e}"))
+            continue
+        if index not in plan:
+            failures.append((descripcion, index, plan))
+    return failures
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    check = '--check' in argv
+    if check:
+        argv.remove('--check')
+    db_path = argv[0] if argv else 'database/medisync.db'
+
+    conn = sqlite3.connect(db_path)
+    try:
+        applied = migrate(conn)
+        print(f"✅ Esquema en versión {current_version(conn)}"
+              + (f" (aplicadas: {applied})" if applied else ""))
+        if check:
+            failures = verify_query_plans(conn)
+            for descripcion, index, plan in failures:
+                print(f"❌ {descripcion}: no usa {index}\n   {plan}")
+            if failures:
+                return 1
+            print(f"✅ {len(QUERY_PLAN_CHECKS)} planes de consulta usan sus índices")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
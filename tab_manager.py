@@ -0,0 +1,294 @@
+"""
+Ciclo de vida de las pestañas de MEDISYNC
+Cada pestaña se construye una vez en su propio Frame y después sólo se
+oculta o se muestra. Al volver a ella se refresca únicamente si alguna de
+sus tablas cambió (TableVersions) o si superó su edad máxima; las pestañas
+ocultas menos usadas se liberan cuando el total de widgets supera el
+presupuesto
+"""
+import time
+import tkinter as tk
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_WIDGET_BUDGET = 6000
+
+_MISSING = object()
+
+
+def count_widgets(widget):
+    """Número de widgets descendientes (aproximación del coste en memoria)"""
+    count = 0
+    pending = [widget]
+    while pending:
+        children = pending.pop().winfo_children()
+        count += len(children)
+        pending.extend(children)
+    return count
+
+
+@dataclass
+class Tab:
+    """Una pestaña registrada y su estado en caché
+
+    ``build(parent)`` crea el contenido; si devuelve una función, ésta se usa
+    para refrescar los datos sin reconstruir los widgets. Sin ella, una
+    pestaña obsoleta se reconstruye entera.
+    """
+    name: str
+    build: Callable
+    tables: Tuple[str, ...] = ()
+    max_age: Optional[float] = None
+    frame: Optional[tk.Frame] = None
+    refresh: Optional[Callable] = None
+    versions: Dict[str, int] = field(default_factory=dict)
+    loaded_at: float = 0.0
+    last_shown: float = 0.0
+    widgets: int = 0
+    dirty: bool = False
+    owned: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def built(self):
+        return self.frame is not None
+
+
+class TabManager:
+    """Muestra pestañas en ``container`` reutilizando las ya construidas
+
+    - ``add(nombre, build, tables=(...))`` registra una pestaña y las tablas
+      de las que depende.
+    - ``show(nombre)`` oculta la actual y muestra la pedida; la construye la
+      primera vez y la refresca sólo si está obsoleta.
+    - ``mark_dirty(...)`` fuerza el refresco en la próxima visita.
+
+    Con ``monitor`` (query_stats.QueryMonitor) cada construcción o refresco
+    se registra como carga de pantalla con el nombre de la pestaña, y sus
+    consultas quedan etiquetadas con él.
+    Con ``profiler`` (ui_profiler.UIProfiler) cada cambio de pestaña, con
+    su construcción, refresco y liberación de pestañas ocultas, se perfila
+    como una acción.
+
+    Con ``changes`` (change_events.ChangeBus) una pestaña cuyas vistas ya
+    se actualizaron solas con un aviso (una suscripción viva dentro de su
+    Frame atiende ese tema) no queda obsoleta por ese cambio: al volver a
+    ella no se recarga entera.
+
+    Los métodos de MedisyncApp guardan widgets en atributos de la app
+    (``self.appointments_tree``...). Con varias pestañas vivas a la vez, esos
+    atributos se guardan al ocultar cada pestaña y se restauran al mostrarla,
+    para que apunten siempre a los widgets de la pestaña visible.
+    """
+
+    def __init__(self, container, owner=None, versions=None,
+                 widget_budget=DEFAULT_WIDGET_BUDGET, bg=None, monitor=None, profiler=None, changes=None):
+        self.container = container
+        self.owner = owner
+        self.versions = versions
+        self.monitor = monitor
+        self.profiler = profiler
+        self.changes = changes
+        self.widget_budget = widget_budget
+        self.bg = bg or container.cget('bg')
+        self.tabs: Dict[str, Tab] = {}
+        self.current: Optional[Tab] = None
+        self._shown_attrs: Dict[str, Any] = {}
+        self.stats = {'builds': 0, 'rebuilds': 0, 'refreshes': 0, 'reuses': 0, 'evictions': 0, 'patched': 0}
+        if changes is not None and versions is not None:
+            changes.subscribe('*', self._on_change, widget=container)
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def add(self, name, build, tables=(), max_age=None):
+        """Registrar una pestaña (no se construye hasta que se muestre)"""
+        self.tabs[name] = Tab(name, build, tuple(tables), max_age)
+
+    def frame(self, name):
+        """Frame de una pestaña construida (o None)"""
+        tab = self.tabs.get(name)
+        return tab.frame if tab is not None else None
+
+    # ------------------------------------------------------------------
+    # Mostrar / ocultar
+    # ------------------------------------------------------------------
+    def show(self, name):
+        """Mostrar una pestaña; devuelve False si el nombre no está registrado"""
+        if self.profiler is None:
+            return self._show(name)
+        with self.profiler.action(f"Pestaña {name}"):
+            return self._show(name)
+
+    def _show(self, name):
+        tab = self.tabs.get(name)
+        if self.current is not None and self.current is not tab:
+            self._hide(self.current)
+            self.current = None
+
+        if tab is None:
+            return False
+
+        if not tab.built:
+            self._build(tab)
+            self.stats['builds'] += 1
+        else:
+            if self.current is not tab:
+                self._restore(tab)
+            if self.is_stale(tab):
+                self._refresh(tab)
+            else:
+                self.stats['reuses'] += 1
+
+        if self.current is not tab:
+            tab.frame.pack(fill='both', expand=True)
+            self.current = tab
+        tab.last_shown = time.monotonic()
+        self._enforce_budget()
+        return True
+
+    def is_stale(self, tab):
+        """¿Cambió alguna de sus tablas, superó su edad o se marcó a mano?"""
+        if tab.dirty:
+            return True
+        if tab.max_age is not None and time.monotonic() - tab.loaded_at > tab.max_age:
+            return True
+        if self.versions is None:
+            # Sin versiones de tabla no se sabe qué cambió: refrescar siempre, como antes
+            return True
+        return bool(self.versions.changed(tab.versions))
+
+    def refresh_current(self):
+        """Refrescar la pestaña visible si quedó obsoleta (p. ej. por una escritura desde otra ventana)"""
+        tab = self.current
+        if tab is None or not self.is_stale(tab):
+            return False
+        self._refresh(tab)
+        if self.current is not tab:
+            # Se reconstruyó: volver a mostrarla
+            tab.frame.pack(fill='both', expand=True)
+            self.current = tab
+        return True
+    
+    def mark_dirty(self, *names):
+        """Forzar el refresco de las pestañas indicadas (o de todas) en su próxima visita"""
+        for name in names or self.tabs:
+            tab = self.tabs.get(name)
+            if tab is not None:
+                tab.dirty = True
+
+    def evict(self, name):
+        """Liberar los widgets de una pestaña oculta"""
+        tab = self.tabs.get(name)
+        if tab is None or not tab.built or tab is self.current:
+            return False
+        tab.frame.destroy()
+        tab.frame = None
+        tab.refresh = None
+        tab.owned = {}
+        tab.widgets = 0
+        self.stats['evictions'] += 1
+        return True
+
+    def clear(self):
+        """Destruir todas las pestañas (p. ej. al cerrar sesión)"""
+        if self.current is not None:
+            self._hide(self.current)
+            self.current = None
+        for name in self.tabs:
+            self.evict(name)
+
+    def cached_widgets(self):
+        """Widgets retenidos por las pestañas construidas"""
+        return sum(tab.widgets for tab in self.tabs.values() if tab.built)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _timed(self, tab, kind):
+        if self.monitor is None:
+            return nullcontext()
+        return self.monitor.action(tab.name, kind)
+
+    def _mark_loaded(self, tab):
+        tab.versions = self.versions.snapshot(tab.tables) if self.versions is not None else {}
+        tab.loaded_at = time.monotonic()
+        tab.dirty = False
+
+    def _on_change(self, event):
+        # Las vistas de la pestaña ya aplicaron el cambio: su versión de esa tabla sigue al día
+        for tab in self.tabs.values():
+            if (tab.built and event.table in tab.tables
+                    and self.changes.handled_within(event.topic, tab.frame)):
+                tab.versions.update(self.versions.snapshot([event.table]))
+                self.stats['patched'] += 1
+
+    def _build(self, tab):
+        # Versiones tomadas antes de consultar: una escritura durante la carga deja la pestaña obsoleta
+        self._mark_loaded(tab)
+        self._watch_attrs()
+        tab.frame = tk.Frame(self.container, bg=self.bg)
+        try:
+            with self._timed(tab, 'construir'):
+                result = tab.build(tab.frame)
+            tab.refresh = result if callable(result) else None
+        except Exception as e:
+            print(f"Error construyendo pestaña {tab.name}: {e}")
+            tab.dirty = True
+        tab.widgets = count_widgets(tab.frame)
+
+    def _refresh(self, tab):
+        if tab.refresh is None:
+            # Sin refresco propio: reconstruir en el mismo lugar
+            was_current = self.current is tab
+            tab.frame.destroy()
+            tab.frame = None
+            tab.owned = {}
+            if was_current:
+                self.current = None
+            self._build(tab)
+            self.stats['rebuilds'] += 1
+            return
+        self._mark_loaded(tab)
+        try:
+            with self._timed(tab, 'refrescar'):
+                tab.refresh()
+        except Exception as e:
+            print(f"Error refrescando pestaña {tab.name}: {e}")
+            tab.dirty = True
+        self.stats['refreshes'] += 1
+
+    def _watch_attrs(self):
+        if self.owner is not None:
+            self._shown_attrs = dict(vars(self.owner))
+
+    def _restore(self, tab):
+        if self.owner is not None:
+            for attr, value in tab.owned.items():
+                setattr(self.owner, attr, value)
+        self._watch_attrs()
+
+    def _hide(self, tab):
+        if self.owner is not None:
+            for attr, value in vars(self.owner).items():
+                if self._shown_attrs.get(attr, _MISSING) is not value:
+                    tab.owned[attr] = value
+        try:
+            tab.frame.pack_forget()
+            tab.widgets = count_widgets(tab.frame)
+        except tk.TclError:
+            # El Frame se destruyó desde fuera
+            tab.frame = None
+            tab.owned = {}
+
+    def _enforce_budget(self):
+        total = self.cached_widgets()
+        if total <= self.widget_budget:
+            return
+        hidden = sorted((tab for tab in self.tabs.values() if tab.built and tab is not self.current),
+                        key=lambda tab: tab.last_shown)
+        for tab in hidden:
+            if total <= self.widget_budget:
+                break
+            total -= tab.widgets
+            self.evict(tab.name)
@@ -0,0 +1,75 @@
+"""
+Versiones por tabla de los datos de MEDISYNC dentro del proceso
+Triggers TEMP en cada conexión del pool avisan de cada INSERT, UPDATE o
+DELETE; quien muestra datos guarda una instantánea de versiones y, al
+volver, sabe qué tablas cambiaron sin volver a consultarlas
+"""
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+TRACKED_TABLES = (
+    'usuarios', 'pacientes', 'doctores', 'citas', 'facturas', 'seguros_medicos',
+    'historial_medico', 'historiales_medicos', 'doctor_schedules',
+)
+
+FUNCTION_NAME = 'medisync_tabla_modificada'
+OPERATIONS = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class TableVersions:
+    """Contador de escrituras por tabla, alimentado por triggers TEMP
+
+    ``install(conn)`` registra la función y los triggers en una conexión
+    (se llama desde ``on_connect`` del pool). ``snapshot()`` copia las
+    versiones actuales y ``changed(snapshot)`` devuelve las tablas escritas
+    desde entonces. Un rollback también cuenta como escritura: a lo sumo
+    provoca un refresco de más, nunca uno de menos.
+    """
+
+    def __init__(self, tables: Iterable[str] = TRACKED_TABLES):
+        self.tables = tuple(tables)
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = dict.fromkeys(self.tables, 0)
+
+    def install(self, conn):
+        """Registrar la función y los triggers TEMP de las tablas que ya existen"""
+        conn.create_function(FUNCTION_NAME, 1, self._on_write)
+        placeholders = ", ".join("?" for _ in self.tables)
+        existing = [row[0] for row in conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+            self.tables
+        ).fetchall()]
+        for table in existing:
+            for operation in OPERATIONS:
+                conn.execute(f"""
+                    CREATE TEMP TRIGGER IF NOT EXISTS trg_version_{table}_{operation.lower()}
+                    AFTER {operation} ON main.{table}
+                    BEGIN
+                        SELECT {FUNCTION_NAME}('{table}');
+                    END
+                """)
+        return existing
+
+    def _on_write(self, table):
+        # Llamada desde SQLite por cada fila: nunca debe lanzar
+        with self._lock:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def touch(self, *tables):
+        """Marcar tablas como modificadas (escrituras fuera del pool)"""
+        for table in tables:
+            self._on_write(table)
+
+    def snapshot(self, tables: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Versiones actuales (de todas las tablas o sólo de ``tables``)"""
+        with self._lock:
+            if tables is None:
+                return dict(self._versions)
+            return {table: self._versions.get(table, 0) for table in tables}
+
+    def changed(self, snapshot: Dict[str, int]) -> Set[str]:
+        """Tablas de ``snapshot`` que se escribieron desde que se tomó"""
+        with self._lock:
+            return {table for table, version in snapshot.items()
+                    if self._versions.get(table, 0) != version}
+
@@ -0,0 +1,49 @@
+"""
+Configuración común de las pruebas de MEDISYNC
+Los módulos viven en la raíz del repositorio; cada prueba trabaja sobre
+una base de datos nueva en un directorio temporal, nunca sobre database/.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def pytest_configure(config):
+    # optional_deps guarda su caché en $XDG_CACHE_HOME; el registro global
+    # fija la ruta al importarse, así que se redirige antes de recolectar
+    config._medisync_cache = tempfile.mkdtemp(prefix='medisync_cache_')
+    os.environ['XDG_CACHE_HOME'] = config._medisync_cache
+
+
+def pytest_unconfigure(config):
+    cache = getattr(config, '_medisync_cache', None)
+    if cache:
+        shutil.rmtree(cache, ignore_errors=True)
+
+
+@pytest.fixture
+def fresh_db(tmp_path):
+    """Ruta de una base nueva creada e inicializada por DatabaseManager (tablas y migraciones)"""
+    from database_manager import DatabaseManager
+
+    db_path = str(tmp_path / 'medisync.db')
+    manager = DatabaseManager(db_path)
+    yield db_path
+    manager.pool.close()
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """DatabaseManager sobre una base nueva en el directorio temporal"""
+    from database_manager import DatabaseManager
+
+    manager = DatabaseManager(str(tmp_path / 'medisync.db'))
+    yield manager
+    manager.pool.close()
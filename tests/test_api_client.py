@@ -0,0 +1,251 @@
+"""RemoteDatabaseManager contra ClinicService
+
+Dos transportes con la interfaz de ApiClient.request: uno sin red que
+resuelve las rutas de medisync_api directamente sobre ClinicService (sólo
+biblioteca estándar) y, si FastAPI está instalado, la aplicación real con
+su TestClient.
+"""
+import json
+import re
+import sqlite3
+import time
+
+import pytest
+
+from api_client import ApiError, RemoteDatabaseManager, RemoteTableVersions, _json_default
+from clinic_service import ClinicService, ServiceError
+
+ADMIN = ('admin@medisync.com', 'admin123')
+DOCTOR = ('carlos@medisync.com', 'doctor123')
+
+ROUTES = []
+
+
+def route(method, pattern):
+    def register(handler):
+        ROUTES.append((method, re.compile(pattern + '$'), handler))
+        return handler
+    return register
+
+
+@route('POST', '/sesiones')
+def _login(service, token, body, query):
+    return service.login(body['email'], body['password'])
+
+
+@route('DELETE', '/sesiones')
+def _logout(service, token, body, query):
+    return service.logout(token)
+
+
+@route('GET', '/versiones')
+def _versions(service, token, body, query):
+    return service.versions(service.session(token))
+
+
+@route('GET', r'/usuarios/(\d+)')
+def _user(service, token, body, query, user_id):
+    return service.user(service.session(token), user_id)
+
+
+@route('POST', '/usuarios')
+def _create_user(service, token, body, query):
+    return service.create_user(service.session(token), body)
+
+
+@route('PUT', r'/usuarios/(\d+)/password')
+def _change_password(service, token, body, query, user_id):
+    return service.change_password(service.session(token), user_id, body['nueva'], body.get('actual'))
+
+
+@route('POST', '/citas')
+def _create_appointment(service, token, body, query):
+    return service.create_appointment(service.session(token), body)
+
+
+@route('GET', '/citas/conflictos')
+def _conflicts(service, token, body, query):
+    return service.appointment_conflicts(service.session(token), int(query['doctor_id']), query['fecha_hora'],
+                                         query.get('duracion'), query.get('excluir'))
+
+
+@route('GET', r'/doctores/(\d+)/horas-libres')
+def _free_slots(service, token, body, query, doctor_id):
+    return service.free_slots(service.session(token), doctor_id, query['fecha'])
+
+
+@route('GET', '/facturas')
+def _invoices(service, token, body, query):
+    return service.invoices(service.session(token), query.get('estado'))
+
+
+@route('POST', '/facturas')
+def _create_invoice(service, token, body, query):
+    return service.create_invoice(service.session(token), body)
+
+
+@route('POST', r'/facturas/(\d+)/pago')
+def _pay_invoice(service, token, body, query, invoice_id):
+    return service.pay_invoice(service.session(token), invoice_id, body)
+
+
+@route('POST', r'/historial/(\w+)')
+def _create_medical_record(service, token, body, query, source):
+    return service.save_medical_record(service.session(token), body, None, source)
+
+
+@route('POST', '/sql')
+def _sql(service, token, body, query):
+    return service.execute_sql(service.session(token), body['sql'], body.get('params'))
+
+
+class ServiceTransport:
+    """Rutas de medisync_api sobre ClinicService, con el mismo JSON de ida y vuelta que HTTP"""
+
+    def __init__(self, service):
+        self.service = service
+        self.token = None
+
+    def request(self, method, path, body=None, query=None):
+        body = json.loads(json.dumps(body, default=_json_default)) if body is not None else None
+        query = {key: value for key, value in (query or {}).items() if value is not None}
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if route_method == method and match:
+                args = [int(group) if group.isdigit() else group for group in match.groups()]
+                try:
+                    result = handler(self.service, self.token or '', body, query, *args)
+                except ServiceError as e:
+                    raise ApiError(e.status, e.message)
+                return json.loads(json.dumps(result, default=str))
+        raise ApiError(404, "Not Found")
+
+
+class FastApiTransport:
+    """La aplicación FastAPI de medisync_api con su TestClient"""
+
+    def __init__(self, service):
+        from fastapi.testclient import TestClient
+        from medisync_api import create_app
+
+        self.client = TestClient(create_app(service))
+        self.token = None
+
+    def request(self, method, path, body=None, query=None):
+        query = {key: value for key, value in (query or {}).items() if value is not None}
+        headers = {'Authorization': f"Bearer {self.token}"} if self.token else {}
+        content = json.dumps(body, default=_json_default) if body is not None else None
+        if content is not None:
+            headers['Content-Type'] = 'application/json'
+        response = self.client.request(method, path, content=content, params=query, headers=headers)
+        result = response.json() if response.content else None
+        if response.status_code >= 400:
+            raise ApiError(response.status_code, result.get('detail') if isinstance(result, dict) else '')
+        return result
+
+
+def _stdlib(service):
+    return ServiceTransport(service)
+
+
+def _fastapi(service):
+    pytest.importorskip('fastapi')
+    pytest.importorskip('httpx')
+    return FastApiTransport(service)
+
+
+@pytest.fixture(params=[_stdlib, _fastapi], ids=['stdlib', 'fastapi'])
+def remote(request, db_manager):
+    """(RemoteDatabaseManager, ClinicService) sobre una base nueva"""
+    service = ClinicService(db_manager)
+    manager = RemoteDatabaseManager('http://servicio.invalid:8765')
+    manager.api = request.param(service)
+    manager.table_versions = RemoteTableVersions(manager.api)
+    return manager, service
+
+
+def test_login_logout(remote):
+    manager, service = remote
+    assert manager.authenticate_user(ADMIN[0], 'incorrecta') is None
+    assert manager.api.token is None
+
+    user = manager.authenticate_user(*ADMIN)
+    assert user.tipo_usuario == 'admin'
+    token = manager.api.token
+    assert manager.get_user_by_id(user.id).email == ADMIN[0]
+
+    manager.logout()
+    assert manager.api.token is None
+    with pytest.raises(ServiceError):
+        service.session(token)
+    # Sin sesión se informa y se devuelve el valor por defecto
+    assert manager.get_user_by_id(user.id) is None
+
+
+def test_expired_session(db_manager):
+    service = ClinicService(db_manager, session_ttl=0.05)
+    manager = RemoteDatabaseManager('http://servicio.invalid:8765')
+    manager.api = ServiceTransport(service)
+    manager.authenticate_user(*ADMIN)
+    time.sleep(0.1)
+
+    assert manager.get_all_invoices() == []
+    with pytest.raises(ApiError) as error:
+        manager.find_appointment_conflicts(1, '2030-01-07 09:00')
+    assert error.value.status == 401
+
+
+def test_remote_connection_is_read_only(remote):
+    manager, service = remote
+    manager.authenticate_user(*ADMIN)
+
+    conn = manager.get_connection()
+    row = conn.execute("SELECT email, password_hash FROM usuarios WHERE email = ?", (ADMIN[0],)).fetchone()
+    assert (row['email'], row['password_hash']) == (ADMIN[0], None)
+    with pytest.raises(sqlite3.DatabaseError):
+        conn.execute("UPDATE usuarios SET activo = 0")
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("SELECT * FROM tabla_inexistente")
+    with pytest.raises(sqlite3.NotSupportedError):
+        conn.executemany("INSERT INTO citas (id) VALUES (?)", [(1,)])
+    conn.close()
+
+
+def test_typed_writes(remote):
+    manager, service = remote
+    manager.authenticate_user(*ADMIN)
+    patient_id = manager.save_user(None, {'nombre': 'Ana', 'apellido': 'López', 'email': 'ana@prueba.com',
+                                          'tipo_usuario': 'paciente', 'password': 'ana123'}, {})
+    doctor_id = manager.authenticate_user(*DOCTOR).id
+    manager.authenticate_user(*ADMIN)
+
+    cita_id = manager.create_appointment({'paciente_id': patient_id, 'doctor_id': doctor_id,
+                                          'fecha_hora': '2030-01-07 09:00'})
+    assert manager.find_appointment_conflicts(doctor_id, '2030-01-07 09:15') == [cita_id]
+    assert '09:00' not in manager.get_available_slots(doctor_id, '2030-01-07')
+
+    invoice = manager.create_invoice_record({'paciente_id': patient_id, 'cita_id': cita_id, 'concepto': 'Consulta',
+                                             'monto': 1500, 'fecha_creacion': '2030-01-07',
+                                             'fecha_vencimiento': '2030-02-06'})
+    assert invoice['numero_factura'].startswith('FAC-')
+    assert manager.pay_invoice(invoice['id'], {'fecha_pago': '2030-01-07', 'metodo_pago': 'efectivo'})
+    assert [row['estado'] for row in manager.get_all_invoices()] == ['pagada']
+
+    record_id = manager.save_medical_record({'paciente_id': patient_id, 'doctor_id': doctor_id,
+                                             'fecha_consulta': '2030-01-07', 'diagnostico': 'Sano'})
+    assert record_id is not None
+
+    assert not manager.change_password(patient_id, 'nueva123', 'incorrecta')
+    assert manager.change_password(patient_id, 'nueva123')
+    assert manager.authenticate_user('ana@prueba.com', 'nueva123').id == patient_id
+
+
+def test_role_denials_reach_the_client(remote):
+    manager, service = remote
+    manager.authenticate_user(*DOCTOR)
+
+    assert manager.get_all_invoices() == []
+    assert manager.create_invoice_record({'concepto': 'x', 'monto': 1}) is None
+    with pytest.raises(sqlite3.DatabaseError, match="permitidas"):
+        manager.get_connection().execute("SELECT COUNT(*) FROM facturas")
+    assert manager.get_connection().execute("SELECT COUNT(*) FROM historial_medico").fetchone()[0] == 0
@@ -0,0 +1,69 @@
+"""Paginación por clave de citas: límites de página con fecha_hora repetida y filtros"""
+import sqlite3
+
+import pytest
+
+from database_manager import AppointmentQuery
+
+DOCTOR, PACIENTE, OTRO_PACIENTE = 2, 4, 3
+
+
+@pytest.fixture
+def citas(db_manager):
+    """Ids de 7 citas: 5 a la misma hora (más que una página) y 2 más tempranas"""
+    rows = [(PACIENTE, '2030-01-07 09:00', 'Control')] * 5 + [
+        (OTRO_PACIENTE, '2030-01-06 09:00', 'Dolor 50%'),
+        (PACIENTE, '2030-01-05 09:00', 'Revisión'),
+    ]
+    conn = sqlite3.connect(db_manager.db_path)
+    try:
+        for paciente_id, fecha_hora, motivo in rows:
+            conn.execute("INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo) VALUES (?, ?, ?, ?)",
+                         (paciente_id, DOCTOR, fecha_hora, motivo))
+        conn.commit()
+        return [row[0] for row in conn.execute("SELECT id FROM citas ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def _all_pages(db_manager, query, limit):
+    pages, after = [], None
+    while True:
+        rows, after = db_manager.get_appointments_page(query, after=after, limit=limit)
+        pages.append([row['id'] for row in rows])
+        if after is None:
+            return pages
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 5, 7, 10])
+def test_pages_with_duplicate_fecha_hora_neither_skip_nor_repeat(db_manager, citas, limit):
+    pages = _all_pages(db_manager, AppointmentQuery(), limit)
+    ids = [cita_id for page in pages for cita_id in page]
+
+    # Orden (fecha_hora, id) descendente: la hora repetida se desempata por id
+    assert ids == list(reversed(citas[:5])) + [citas[5], citas[6]]
+    assert all(len(page) == limit for page in pages[:-1])
+    # Si la última página está llena hace falta una más (vacía) para saber que terminó
+    assert pages[-1] or len(citas) % limit == 0
+
+
+def test_cursor_inside_a_run_of_equal_times(db_manager, citas):
+    rows, after = db_manager.get_appointments_page(after=('2030-01-07 09:00', citas[2]), limit=10)
+    assert [row['id'] for row in rows] == [citas[1], citas[0], citas[5], citas[6]]
+    assert after is None
+
+
+def test_filters_apply_to_pages_counts_and_rows(db_manager, citas):
+    by_patient = AppointmentQuery(paciente_id=PACIENTE, fecha_desde='2030-01-06')
+    assert _all_pages(db_manager, by_patient, 3) == [list(reversed(citas[2:5])), list(reversed(citas[:2]))]
+    assert db_manager.count_appointments(by_patient) == 5
+    assert db_manager.count_appointments(by_patient, limit=3) == 3
+
+    # El texto es literal: '%' no actúa como comodín
+    literal = AppointmentQuery(texto='50%')
+    assert db_manager.count_appointments(literal) == 1
+    assert db_manager.get_appointment_row(citas[5], literal)['motivo'] == 'Dolor 50%'
+    assert db_manager.get_appointment_row(citas[0], literal) is None
+
+    last_day = AppointmentQuery(fecha_desde='2030-01-05', fecha_hasta='2030-01-06')
+    assert db_manager.count_appointments(last_day) == 2
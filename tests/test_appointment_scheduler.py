@@ -0,0 +1,88 @@
+"""Conflictos de horario y huecos libres con citas escritas fuera de DatabaseManager"""
+import sqlite3
+
+import pytest
+
+DAY = '2030-01-07'
+
+
+def _add_user(conn, email, tipo):
+    cursor = conn.execute('''
+    INSERT INTO usuarios (nombre, apellido, email, tipo_usuario, password_hash)
+    VALUES ('Prueba', 'Prueba', ?, ?, 'x')
+    ''', (email, tipo))
+    return cursor.lastrowid
+
+
+@pytest.fixture
+def clinic(db_manager):
+    """(gestor, doctor_id, paciente_id, conexión propia sobre la misma base)"""
+    conn = sqlite3.connect(db_manager.db_path)
+    doctor_id = _add_user(conn, 'doctor@prueba.com', 'doctor')
+    conn.execute("INSERT INTO doctores (id, horario_inicio, horario_fin) VALUES (?, '08:00', '17:00')",
+                 (doctor_id,))
+    patient_id = _add_user(conn, 'paciente@prueba.com', 'paciente')
+    conn.commit()
+    yield db_manager, doctor_id, patient_id, conn
+    conn.close()
+
+
+def _raw_insert(conn, doctor_id, patient_id, fecha_hora, duracion=30):
+    cursor = conn.execute('''
+    INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo, duracion_minutos)
+    VALUES (?, ?, ?, 'Consulta', ?)
+    ''', (patient_id, doctor_id, fecha_hora, duracion))
+    conn.commit()
+    return cursor.lastrowid
+
+
+def test_other_connection_insert_is_seen(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    # Día cargado en el índice y huecos en caché antes de la escritura
+    assert manager.find_appointment_conflicts(doctor_id, f'{DAY} 10:00') == []
+    assert manager.scheduler.find_conflicts(doctor_id, f'{DAY} 10:00') == []
+    assert '10:00' in manager.get_available_slots(doctor_id, DAY)
+
+    cita_id = _raw_insert(conn, doctor_id, patient_id, f'{DAY}T10:00:00')
+
+    assert manager.find_appointment_conflicts(doctor_id, f'{DAY} 10:15') == [cita_id]
+    assert manager.scheduler.find_conflicts(doctor_id, f'{DAY} 10:15') == [cita_id]
+    assert '10:00' not in manager.get_available_slots(doctor_id, DAY)
+
+
+def test_other_connection_cancel_and_move_are_seen(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    cita_id = manager.create_appointment({'paciente_id': patient_id, 'doctor_id': doctor_id,
+                                          'fecha_hora': f'{DAY} 09:00'})
+    assert '09:00' not in manager.get_available_slots(doctor_id, DAY)
+
+    conn.execute("UPDATE citas SET fecha_hora = ? WHERE id = ?", (f'{DAY} 11:00', cita_id))
+    conn.commit()
+    slots = manager.get_available_slots(doctor_id, DAY)
+    assert '09:00' in slots and '11:00' not in slots
+
+    conn.execute("UPDATE citas SET estado = 'cancelada' WHERE id = ?", (cita_id,))
+    conn.commit()
+    assert '11:00' in manager.get_available_slots(doctor_id, DAY)
+    assert manager.scheduler.find_conflicts(doctor_id, f'{DAY} 11:00') == []
+
+
+def test_previous_day_appointment_past_midnight(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    cita_id = manager.create_appointment({'paciente_id': patient_id, 'doctor_id': doctor_id,
+                                          'fecha_hora': '2030-01-06 23:30', 'duracion_minutos': 60})
+
+    assert manager.find_appointment_conflicts(doctor_id, f'{DAY} 00:00') == [cita_id]
+    assert manager.scheduler.find_conflicts(doctor_id, f'{DAY} 00:15') == [cita_id]
+    assert manager.find_appointment_conflicts(doctor_id, f'{DAY} 00:30') == []
+    assert manager.scheduler.busy_intervals(doctor_id, DAY) == [(0, 30)]
+
+
+def test_inactive_and_excluded_appointments_do_not_conflict(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    cita_id = manager.create_appointment({'paciente_id': patient_id, 'doctor_id': doctor_id,
+                                          'fecha_hora': f'{DAY} 12:00'})
+    assert manager.find_appointment_conflicts(doctor_id, f'{DAY} 12:00', exclude_id=cita_id) == []
+    assert manager.update_appointment_status(cita_id, 'completada', 'Atendida')
+    assert manager.find_appointment_conflicts(doctor_id, f'{DAY} 12:00') == []
+    assert conn.execute("SELECT notas FROM citas WHERE id = ?", (cita_id,)).fetchone()[0] == 'Atendida'
@@ -0,0 +1,89 @@
+"""Huecos libres con horarios y citas escritos desde otra conexión"""
+import sqlite3
+import time
+
+import pytest
+
+# Lunes
+DAY = '2030-01-07'
+
+SCHEDULES_SQL = '''
+CREATE TABLE IF NOT EXISTS doctor_schedules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    doctor_id INTEGER,
+    dia_semana TEXT,
+    hora_inicio TEXT,
+    hora_fin TEXT,
+    activo BOOLEAN DEFAULT 1
+)
+'''
+
+
+@pytest.fixture
+def clinic(db_manager):
+    """(gestor, doctor_id, paciente_id, conexión propia sobre la misma base)"""
+    conn = sqlite3.connect(db_manager.db_path)
+    ids = []
+    for email, tipo in (('doctor@prueba.com', 'doctor'), ('paciente@prueba.com', 'paciente')):
+        ids.append(conn.execute('''
+        INSERT INTO usuarios (nombre, apellido, email, tipo_usuario, password_hash)
+        VALUES ('Prueba', 'Prueba', ?, ?, 'x')
+        ''', (email, tipo)).lastrowid)
+    conn.execute("INSERT INTO doctores (id, horario_inicio, horario_fin) VALUES (?, '08:00', '12:00')",
+                 (ids[0],))
+    conn.commit()
+    yield db_manager, ids[0], ids[1], conn
+    conn.close()
+
+
+def test_booking_from_other_connection_is_seen(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    assert '09:00' in manager.get_available_slots(doctor_id, DAY)
+
+    conn.execute('''
+    INSERT INTO citas (paciente_id, doctor_id, fecha_hora, motivo) VALUES (?, ?, ?, 'Consulta')
+    ''', (patient_id, doctor_id, f'{DAY} 09:00'))
+    conn.commit()
+
+    assert '09:00' not in manager.get_available_slots(doctor_id, DAY)
+
+
+def test_schedule_edit_from_other_connection_is_seen_after_ttl(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    manager.availability.ttl = 0.05
+    assert manager.get_available_slots(doctor_id, DAY)[-1] == '11:30'
+
+    conn.execute(SCHEDULES_SQL)
+    conn.execute('''
+    INSERT INTO doctor_schedules (doctor_id, dia_semana, hora_inicio, hora_fin) VALUES (?, 'Lunes', '14:00', '15:00')
+    ''', (doctor_id,))
+    conn.commit()
+    time.sleep(0.1)
+
+    assert manager.get_available_slots(doctor_id, DAY) == ['14:00', '14:30']
+    assert manager.get_available_slots(doctor_id, '2030-01-08') == []
+
+
+def test_weekly_schedule_change_discards_cached_slots(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    availability = manager.availability
+    assert '08:00' in availability.free_slots(doctor_id, DAY)
+
+    conn.execute("UPDATE doctores SET horario_inicio = '10:00' WHERE id = ?", (doctor_id,))
+    conn.commit()
+    # El proceso que cambia el horario lo avisa (vista del perfil del doctor)
+    availability.invalidate_doctor(doctor_id)
+
+    assert availability.free_slots(doctor_id, DAY) == ['10:00', '10:30', '11:00', '11:30']
+
+
+def test_schedule_table_version_reloads_weekly_schedule(clinic):
+    manager, doctor_id, patient_id, conn = clinic
+    assert '08:00' in manager.get_available_slots(doctor_id, DAY)
+
+    conn.execute("UPDATE doctores SET horario_fin = '09:00' WHERE id = ?", (doctor_id,))
+    conn.commit()
+    # Lo que harían los triggers TEMP de una conexión del pool
+    manager.table_versions.touch('doctores')
+
+    assert manager.get_available_slots(doctor_id, DAY) == ['08:00', '08:30']
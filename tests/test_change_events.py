@@ -0,0 +1,167 @@
+"""Avisos de cambios: registro por triggers, ChangeFeed y entrega ordenada en ChangeBus"""
+import sqlite3
+
+import pytest
+
+from change_events import ChangeBus, ChangeEvent, ChangeFeed, ENTITY_TABLES
+
+DOCTOR, PACIENTE = 2, 4
+
+
+class _Root:
+    """Sólo lo que ChangeFeed usa de la ventana de Tk: programar y cancelar"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, callback):
+        self.jobs.append(callback)
+        return len(self.jobs)
+
+    def after_cancel(self, job):
+        pass
+
+
+class _Widget:
+    def __init__(self, name, alive=True):
+        self.name = name
+        self.alive = alive
+
+    def winfo_exists(self):
+        return self.alive
+
+    def __str__(self):
+        return self.name
+
+
+def _event(topic, event_id=1):
+    entity, action = topic.split('.')
+    return ChangeEvent(event_id, entity, action)
+
+
+def test_bus_delivers_in_publish_and_subscription_order():
+    bus = ChangeBus()
+    received = []
+    bus.subscribe('cita.creada', lambda e: received.append(('exacta', e.id)))
+    bus.subscribe('cita.*', lambda e: received.append(('cita', e.id)))
+    bus.subscribe('*', lambda e: received.append(('todo', e.id)))
+    bus.subscribe('factura.*', lambda e: received.append(('factura', e.id)))
+
+    for event_id, topic in enumerate(('cita.creada', 'cita.eliminada', 'paciente.actualizado'), 1):
+        bus.publish(_event(topic, event_id))
+
+    assert received == [('exacta', 1), ('cita', 1), ('todo', 1), ('cita', 2), ('todo', 2), ('todo', 3)]
+    assert bus.published == 3
+
+
+def test_failing_and_dead_subscribers_do_not_block_the_rest():
+    bus = ChangeBus()
+    received = []
+    dead = _Widget('.ventana.tabla')
+
+    def failing(event):
+        raise RuntimeError("fallo de la vista")
+
+    bus.subscribe('*', failing)
+    subscription = bus.subscribe('*', received.append, widget=dead)
+    bus.subscribe('*', lambda e: received.append(e.id))
+
+    bus.publish(_event('cita.creada', 1))
+    dead.alive = False
+    bus.publish(_event('cita.creada', 2))
+    assert received[1:] == [1, 2]
+    assert not subscription.active
+    assert len(bus) == 2
+
+    alive = _Widget('.pestana.citas.tabla')
+    bus.subscribe('cita.*', received.append, widget=alive)
+    assert bus.handled_within('cita.creada', _Widget('.pestana'))
+    assert not bus.handled_within('factura.creada', _Widget('.pestana'))
+
+
+@pytest.fixture
+def feed(db_manager):
+    bus = ChangeBus()
+    feed = ChangeFeed(db_manager, _Root(), bus=bus, poll_interval_ms=60000).start()
+    feed.poll_now()  # fija el punto de partida: lo anterior no se publica
+    yield feed
+    feed.stop()
+
+
+def _received(feed):
+    events = []
+    subscription = feed.bus.subscribe('*', events.append)
+    feed.poll_now()
+    feed.bus.unsubscribe(subscription)
+    return events
+
+
+def _execute(db_manager, *statements):
+    # Otra conexión (otro proceso u otra estación)
+    conn = sqlite3.connect(db_manager.db_path)
+    try:
+        for sql, params in statements:
+            conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_feed_publishes_changes_in_log_order(db_manager, feed):
+    assert _received(feed) == []
+
+    cita_id = db_manager.create_appointment({'paciente_id': PACIENTE, 'doctor_id': DOCTOR,
+                                             'fecha_hora': '2030-01-07 09:00'})
+    _execute(db_manager,
+             ("UPDATE citas SET estado = 'confirmada' WHERE id = ?", (cita_id,)),
+             ("UPDATE citas SET fecha_hora = '2030-01-08 10:00' WHERE id = ?", (cita_id,)),
+             ("INSERT INTO facturas (numero_factura, paciente_id, cita_id, concepto, monto, fecha_creacion, "
+              "fecha_vencimiento) VALUES ('FAC-2030-0001', ?, ?, 'Consulta', 1500, '2030-01-07', '2030-02-06')",
+              (PACIENTE, cita_id)),
+             ("UPDATE facturas SET estado = 'pagada', fecha_pago = '2030-01-07' WHERE cita_id = ?", (cita_id,)),
+             ("DELETE FROM citas WHERE id = ?", (cita_id,)))
+    events = _received(feed)
+
+    assert [event.topic for event in events] == ['cita.creada', 'cita.actualizada', 'cita.actualizada',
+                                                 'factura.creada', 'factura.pagada', 'cita.eliminada']
+    assert [event.id for event in events] == sorted(event.id for event in events)
+    assert all(event.patient_id == PACIENTE for event in events)
+    assert (events[1].previous_status, events[1].status, events[1].moved) == ('pendiente', 'confirmada', False)
+    assert events[2].moved
+    assert events[4].related_id == cita_id
+    # Ya entregados: no se repiten
+    assert _received(feed) == []
+
+
+def test_only_visible_patient_changes_are_logged(db_manager, feed):
+    patient_id = db_manager.save_user(None, {'nombre': 'Ana', 'apellido': 'López', 'email': 'ana@prueba.com',
+                                             'tipo_usuario': 'paciente', 'password': 'ana123'})
+    db_manager.save_user(None, {'nombre': 'Luis', 'apellido': 'Pérez', 'email': 'luis@prueba.com',
+                                'tipo_usuario': 'doctor', 'password': 'luis123'})
+    db_manager.change_password(patient_id, 'nueva123')
+    _execute(db_manager, ("UPDATE usuarios SET telefono = '809-000-0000' WHERE id = ?", (patient_id,)))
+
+    assert [(event.topic, event.record_id) for event in _received(feed)] == [
+        ('paciente.registrado', patient_id), ('paciente.actualizado', patient_id)]
+
+
+def test_feed_marks_table_versions_and_reloads_on_overflow(db_manager):
+    bus = ChangeBus()
+    feed = ChangeFeed(db_manager, _Root(), bus=bus, poll_interval_ms=60000, batch_size=2).start()
+    feed.poll_now()
+    before = db_manager.table_versions.snapshot()
+
+    _execute(db_manager, ("INSERT INTO facturas (numero_factura, paciente_id, concepto, monto, fecha_creacion, "
+                          "fecha_vencimiento) VALUES ('FAC-2030-0001', ?, 'Consulta', 1, '2030-01-07', "
+                          "'2030-02-06')", (PACIENTE,)))
+    assert [event.topic for event in _received(feed)] == ['factura.creada']
+    # Escrita por otra conexión: la versión local se marca al recibir el aviso
+    assert db_manager.table_versions.changed(before) == {'facturas'}
+
+    _execute(db_manager, *[("UPDATE facturas SET monto = ? WHERE numero_factura = 'FAC-2030-0001'", (monto,))
+                           for monto in (2, 3, 4)])
+    events = _received(feed)
+    assert [event.topic for event in events] == [f"{entity}.recarga" for entity in ENTITY_TABLES]
+    assert feed.stats['recargas'] == 1
+    assert _received(feed) == []
+    feed.stop()
@@ -0,0 +1,146 @@
+"""Servicio de la clínica: sesiones, permisos por rol y SQL de sólo lectura de las vistas"""
+import pytest
+
+from clinic_service import ClinicService, ServiceError
+
+USERS = {
+    'admin': ('admin@medisync.com', 'admin123'),
+    'doctor': ('carlos@medisync.com', 'doctor123'),
+    'secretaria': ('maria@medisync.com', 'secretaria123'),
+    'paciente': ('pedro@medisync.com', 'paciente123'),
+}
+
+
+@pytest.fixture
+def service(db_manager):
+    return ClinicService(db_manager)
+
+
+def _session(service, role):
+    return service.session(service.login(*USERS[role])['token'])
+
+
+def _sql(service, role, sql, params=None):
+    return service.execute_sql(_session(service, role), sql, params)
+
+
+def _status(call, *args):
+    with pytest.raises(ServiceError) as error:
+        call(*args)
+    return error.value.status
+
+
+@pytest.mark.parametrize('sql', [
+    "INSERT INTO citas (paciente_id, doctor_id, fecha_hora) VALUES (1, 2, '2030-01-07 09:00')",
+    "UPDATE usuarios SET activo = 0",
+    "DELETE FROM citas",
+    "CREATE TABLE x (id INTEGER)",
+    "ATTACH DATABASE ':memory:' AS otra",
+    "BEGIN",
+    "PRAGMA journal_mode = DELETE",
+    "PRAGMA user_version = 7",
+])
+def test_sql_rejects_writes(service, sql):
+    assert _status(_sql, service, 'admin', sql) == 403
+
+
+def test_sql_reads_hide_passwords(service):
+    result = _sql(service, 'admin', "SELECT email, password_hash FROM usuarios WHERE email = ?",
+                  ['admin@medisync.com'])
+    assert result == {'columnas': ['email', 'password_hash'], 'filas': [['admin@medisync.com', None]]}
+    assert _sql(service, 'admin', "PRAGMA table_info(citas)")['filas']
+
+
+@pytest.mark.parametrize('role, sql', [
+    ('doctor', "SELECT COUNT(*) FROM facturas"),
+    ('doctor', "SELECT monto FROM facturas"),
+    ('doctor', "SELECT c.id FROM citas c WHERE EXISTS (SELECT 1 FROM facturas f WHERE f.cita_id = c.id)"),
+    ('doctor', "SELECT * FROM estadisticas_facturas_estado"),
+    ('secretaria', "SELECT diagnostico FROM historial_medico"),
+    ('secretaria', "SELECT COUNT(*) FROM historiales_medicos"),
+    ('secretaria', "SELECT * FROM historial_medico_fts_data"),
+])
+def test_sql_role_denied_tables(service, role, sql):
+    assert _status(_sql, service, role, sql) == 403
+
+
+def test_sql_role_allowed_tables(service):
+    assert _sql(service, 'doctor', "SELECT COUNT(*) FROM historial_medico")['filas'] == [[0]]
+    assert _sql(service, 'secretaria', "SELECT COUNT(*) FROM facturas")['filas'] == [[0]]
+    assert _sql(service, 'admin', "SELECT (SELECT COUNT(*) FROM facturas), "
+                                  "(SELECT COUNT(*) FROM historiales_medicos)")['filas'] == [[0, 0]]
+    # Los pacientes no usan el SQL de las vistas
+    assert _status(_sql, service, 'paciente', "SELECT 1") == 403
+
+
+def test_login_logout_and_bad_credentials(service):
+    token = service.login(*USERS['secretaria'])['token']
+    assert service.session(token).role == 'secretaria'
+
+    assert service.logout(token) == {'ok': True}
+    assert _status(service.session, token) == 401
+    assert _status(service.session, '') == 401
+    assert _status(service.login, 'maria@medisync.com', 'incorrecta') == 401
+
+
+def test_session_expires_after_inactivity(db_manager):
+    import time
+
+    service = ClinicService(db_manager, session_ttl=0.05)
+    token = service.login(*USERS['admin'])['token']
+    assert service.versions(service.session(token)) is not None
+    time.sleep(0.1)
+    assert _status(service.session, token) == 401
+
+
+def test_typed_endpoints_role_denials(service):
+    doctor, secretaria, paciente = (_session(service, role) for role in ('doctor', 'secretaria', 'paciente'))
+    admin = _session(service, 'admin')
+
+    assert _status(service.invoices, doctor) == 403
+    assert _status(service.create_invoice, doctor, {'concepto': 'x', 'monto': 1}) == 403
+    assert _status(service.search_history, secretaria, 'dolor') == 403
+    assert _status(service.save_medical_record, secretaria, {'diagnostico': 'x'}) == 403
+    assert _status(service.create_user, secretaria, {'usuario': {'email': 'x@x.com'}}) == 403
+    assert _status(service.delete_user, doctor, paciente.user.id) == 403
+    assert _status(service.patients, paciente) == 403
+    assert _status(service.user, paciente, admin.user.id) == 403
+    assert _status(service.update_user, paciente, admin.user.id, {'usuario': {'nombre': 'x'}}) == 403
+    assert _status(service.save_doctor_schedule, doctor, admin.user.id, []) == 403
+    assert _status(service.counters, secretaria, 'sistema') == 403
+    assert _status(service.counters, doctor, 'doctor', admin.user.id) == 403
+
+
+def test_users_edit_only_their_own_profile(service):
+    paciente = _session(service, 'paciente')
+    own = paciente.user.id
+
+    service.update_user(paciente, own, {'usuario': {'telefono': '809-000-0000', 'tipo_usuario': 'admin',
+                                                    'activo': 0}})
+    user = service.user(paciente, own)
+    assert (user['telefono'], user['tipo_usuario'], user['activo']) == ('809-000-0000', 'paciente', 1)
+
+    # Sin la contraseña actual (o con una incorrecta) no se cambia
+    assert _status(service.change_password, paciente, own, 'nueva123') == 400
+    assert _status(service.change_password, paciente, own, 'nueva123', 'incorrecta') == 400
+    assert service.change_password(paciente, own, 'nueva123', 'paciente123') == {'ok': True}
+    assert service.login('pedro@medisync.com', 'nueva123')['usuario']['id'] == own
+
+
+def test_patient_sees_only_own_appointments_and_invoices(service, db_manager):
+    admin, paciente = _session(service, 'admin'), _session(service, 'paciente')
+    doctor_id = _session(service, 'doctor').user.id
+    other_id = db_manager.save_user(None, {'nombre': 'Otra', 'apellido': 'Paciente', 'email': 'otra@prueba.com',
+                                           'tipo_usuario': 'paciente', 'password': 'otra123'})
+    citas = [service.create_appointment(admin, {'paciente_id': patient_id, 'doctor_id': doctor_id,
+                                                'fecha_hora': f'2030-01-07 {hour}'})['id']
+             for patient_id, hour in ((paciente.user.id, '09:00'), (other_id, '10:00'))]
+    for patient_id in (paciente.user.id, other_id):
+        service.create_invoice(admin, {'paciente_id': patient_id, 'concepto': 'Consulta', 'monto': 100,
+                                       'fecha_creacion': '2030-01-07', 'fecha_vencimiento': '2030-02-06'})
+
+    assert [row['id'] for row in service.appointments(paciente, {'paciente_id': other_id})['citas']] == [citas[0]]
+    assert _status(service.appointment, paciente, citas[1]) == 404
+    assert _status(service.cancel_appointment, paciente, citas[1], 'No puedo') == 404
+    assert service.cancel_appointment(paciente, citas[0], 'No puedo') == {'ok': True}
+    assert [invoice['paciente_id'] for invoice in service.invoices(paciente)] == [paciente.user.id]
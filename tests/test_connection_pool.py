@@ -0,0 +1,125 @@
+"""Pool de conexiones: reutilización por hilo, devolución con close() y cierre"""
+import sqlite3
+import threading
+
+import pytest
+
+from connection_pool import ConnectionPool, PoolTimeoutError
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), max_connections=4, max_idle_per_thread=2, timeout=0.2)
+    yield pool
+    pool.close()
+
+
+def _in_thread(target):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(target()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_close_returns_connection_and_same_thread_reuses_it(pool):
+    conn = pool.checkout()
+    raw = conn.raw_connection
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.close()
+
+    assert conn.raw_connection is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    conn.close()  # cerrar dos veces no devuelve la conexión dos veces
+
+    again = pool.checkout()
+    assert again.raw_connection is raw
+    again.close()
+    assert pool.stats()['created'] == 1
+    assert pool.stats()['reused'] == 1
+    assert pool.stats()['in_use'] == 0
+
+
+def test_each_thread_has_its_own_connections(pool):
+    with pool.connection() as conn:
+        main_raw = conn.raw_connection
+
+    def other_thread():
+        with pool.connection() as conn:
+            return conn.raw_connection
+
+    assert _in_thread(other_thread) is not main_raw
+    with pool.connection() as conn:
+        assert conn.raw_connection is main_raw
+
+
+def test_open_transaction_is_rolled_back_on_return(pool):
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_limit_waits_and_times_out(pool):
+    held = [pool.checkout() for _ in range(pool.max_connections)]
+    with pytest.raises(PoolTimeoutError):
+        pool.checkout()
+    held.pop().close()
+    pool.checkout().close()
+    for conn in held:
+        conn.close()
+    assert pool.stats()['waits'] == 1
+
+
+def test_close_idle_covers_every_thread(pool):
+    ready, done = threading.Event(), threading.Event()
+    worker_raw = []
+
+    def worker():
+        # Hilo vivo con una conexión libre guardada en su ranura
+        with pool.connection() as conn:
+            worker_raw.append(conn.raw_connection)
+        ready.set()
+        done.wait(5)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    ready.wait(5)
+    with pool.connection():
+        pass
+
+    pool.close_idle()
+    done.set()
+    thread.join()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        worker_raw[0].execute("SELECT 1")
+    # Todos los cupos quedaron libres
+    held = [pool.checkout() for _ in range(pool.max_connections)]
+    for conn in held:
+        conn.close()
+
+
+def test_shutdown_closes_borrowed_connections_on_return(pool):
+    idle, borrowed = pool.checkout(), pool.checkout()
+    idle_raw, borrowed_raw = idle.raw_connection, borrowed.raw_connection
+    idle.close()
+
+    pool.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        idle_raw.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.checkout()
+
+    # La prestada sigue usable hasta devolverla; entonces se cierra
+    assert borrowed.execute("SELECT 1").fetchone()[0] == 1
+    borrowed.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        borrowed_raw.execute("SELECT 1")
+    assert pool.stats()['in_use'] == 0
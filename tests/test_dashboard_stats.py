@@ -0,0 +1,104 @@
+"""Contadores de los paneles: los triggers siguen a citas y facturas"""
+import sqlite3
+from datetime import date
+
+import pytest
+
+import dashboard_stats
+
+DOCTOR, PACIENTE, OTRO_DOCTOR = 2, 4, 1
+
+
+@pytest.fixture
+def cursor(db_manager):
+    conn = sqlite3.connect(db_manager.db_path, isolation_level=None)
+    yield conn.cursor()
+    conn.close()
+
+
+def _assert_verified(cursor):
+    mismatches = dashboard_stats.verify(cursor)
+    assert set(mismatches) == {counter.table for counter in dashboard_stats.COUNTERS}
+    assert not any(mismatches.values()), mismatches
+
+
+def _insert_citas(cursor):
+    rows = [
+        (PACIENTE, DOCTOR, '2030-01-07 09:00', 'programada', 1500),
+        (PACIENTE, DOCTOR, '2030-01-07 10:00', 'completada', 1500.5),
+        (PACIENTE, OTRO_DOCTOR, '2030-01-08 09:00', 'programada', None),
+        (3, DOCTOR, '2030-02-01 11:00', 'cancelada', 800),
+    ]
+    cursor.executemany("INSERT INTO citas (paciente_id, doctor_id, fecha_hora, estado, tarifa_consulta) "
+                       "VALUES (?, ?, ?, ?, ?)", rows)
+
+
+def _insert_facturas(cursor):
+    rows = [
+        ('FAC-2030-0001', PACIENTE, DOCTOR, 'Consulta', 1500, 'pendiente', None),
+        ('FAC-2030-0002', PACIENTE, DOCTOR, 'Control', 800.25, 'pagada', '2030-01-07'),
+        ('FAC-2030-0003', 3, None, 'Radiografía', 2500, 'pagada', '2030-02-03'),
+    ]
+    cursor.executemany("INSERT INTO facturas (numero_factura, paciente_id, doctor_id, concepto, monto, estado, "
+                       "fecha_pago, fecha_creacion, fecha_vencimiento) "
+                       "VALUES (?, ?, ?, ?, ?, ?, ?, '2030-01-07', '2030-02-06')", rows)
+
+
+def test_counters_follow_inserts_updates_and_deletes(cursor):
+    _assert_verified(cursor)
+
+    _insert_citas(cursor)
+    _insert_facturas(cursor)
+    _assert_verified(cursor)
+    assert dashboard_stats.monthly_income(cursor, 2030, 1) == (800.25, 1)
+
+    # Cambios de estado, doctor, fecha e importe mueven el aporte de una fila a otra
+    cursor.execute("UPDATE citas SET estado = 'completada' WHERE fecha_hora = '2030-01-07 09:00'")
+    cursor.execute("UPDATE citas SET doctor_id = ?, fecha_hora = '2030-01-09 12:00', tarifa_consulta = 900 "
+                   "WHERE doctor_id = ?", (DOCTOR, OTRO_DOCTOR))
+    cursor.execute("UPDATE facturas SET estado = 'pagada', fecha_pago = '2030-01-20' "
+                   "WHERE numero_factura = 'FAC-2030-0001'")
+    cursor.execute("UPDATE facturas SET monto = 3000, fecha_pago = '2030-01-31' "
+                   "WHERE numero_factura = 'FAC-2030-0003'")
+    _assert_verified(cursor)
+    assert dashboard_stats.monthly_income(cursor, 2030, 1) == (5300.25, 3)
+
+    # Un cambio en columnas que no cuentan no altera nada
+    cursor.execute("UPDATE citas SET notas = 'Llamar antes'")
+    _assert_verified(cursor)
+
+    cursor.execute("DELETE FROM citas WHERE estado = 'cancelada'")
+    cursor.execute("DELETE FROM facturas WHERE numero_factura = 'FAC-2030-0002'")
+    _assert_verified(cursor)
+
+    cursor.execute("DELETE FROM citas")
+    cursor.execute("DELETE FROM facturas")
+    _assert_verified(cursor)
+    for counter in dashboard_stats.COUNTERS:
+        # Las filas que llegan a cero se borran
+        assert cursor.execute(f"SELECT COUNT(*) FROM {counter.table}").fetchone()[0] == 0
+
+
+def test_verify_detects_drift_and_rebuild_repairs_it(cursor):
+    _insert_citas(cursor)
+    _insert_facturas(cursor)
+
+    cursor.execute("UPDATE estadisticas_citas_doctor SET citas = citas + 1 WHERE doctor_id = ?", (DOCTOR,))
+    cursor.execute("DELETE FROM estadisticas_facturas_mes")
+    mismatches = dashboard_stats.verify(cursor)
+    assert mismatches['estadisticas_citas_doctor'] > 0
+    assert mismatches['estadisticas_facturas_mes'] > 0
+    assert mismatches['estadisticas_citas_dia'] == 0
+
+    dashboard_stats.rebuild(cursor)
+    _assert_verified(cursor)
+
+
+def test_panel_reads_match_the_data(cursor):
+    _insert_citas(cursor)
+    today = date(2030, 1, 7)
+
+    stats = dashboard_stats.doctor_stats(cursor, DOCTOR, today)
+    assert (stats['appointments_today'], stats['total_patients']) == (2, 2)
+    assert (stats['consultations_month'], stats['monthly_income']) == (1, 1500.5)
+    assert dashboard_stats.secretaria_stats(cursor, today)['pending_appointments'] == 2
@@ -0,0 +1,121 @@
+"""Escrituras de las vistas con métodos de DatabaseManager (también en modo cliente)"""
+import sqlite3
+
+import pytest
+
+DETAIL_SQL = '''
+CREATE TABLE facturas_detalle (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    factura_id INTEGER,
+    servicio TEXT,
+    precio REAL,
+    cantidad INTEGER
+)
+'''
+
+
+def _row(manager, sql, params=()):
+    conn = sqlite3.connect(manager.db_path)
+    try:
+        return conn.execute(sql, params).fetchone()
+    finally:
+        conn.close()
+
+
+def _new_user(manager, email, tipo, profile=None):
+    return manager.save_user(None, {'nombre': 'Prueba', 'apellido': 'Prueba', 'email': email,
+                                    'tipo_usuario': tipo, 'password': 'secreta'}, profile)
+
+
+def test_save_user_creates_and_updates_profile(db_manager):
+    patient_id = _new_user(db_manager, 'paciente@prueba.com', 'paciente',
+                           {'numero_expediente': 'EXP-1', 'tipo_sangre': 'O+'})
+    assert patient_id is not None
+    assert db_manager.authenticate_user('paciente@prueba.com', 'secreta').id == patient_id
+
+    # El perfil se actualiza sin perder las columnas que no vienen
+    assert db_manager.save_user(patient_id, {'telefono': '809-555-0000'}, {'alergias': 'Ninguna'}) == patient_id
+    assert _row(db_manager, "SELECT numero_expediente, tipo_sangre, alergias FROM pacientes WHERE id = ?",
+                (patient_id,)) == ('EXP-1', 'O+', 'Ninguna')
+    assert _row(db_manager, "SELECT telefono FROM usuarios WHERE id = ?", (patient_id,)) == ('809-555-0000',)
+
+    # Columnas fuera de la lista blanca se ignoran; usuario inexistente devuelve None
+    assert db_manager.save_user(patient_id, {'password_hash': 'x', 'nombre': 'Otro'}) == patient_id
+    assert db_manager.authenticate_user('paciente@prueba.com', 'secreta') is not None
+    assert db_manager.save_user(999999, {'nombre': 'Nadie'}) is None
+    assert _new_user(db_manager, 'paciente@prueba.com', 'paciente') is None
+
+
+def test_password_activation_and_delete(db_manager):
+    doctor_id = _new_user(db_manager, 'doctor@prueba.com', 'doctor', {'especialidad': 'General'})
+
+    assert not db_manager.change_password(doctor_id, 'nueva', current_password='incorrecta')
+    assert db_manager.change_password(doctor_id, 'nueva', current_password='secreta')
+    assert db_manager.authenticate_user('doctor@prueba.com', 'nueva') is not None
+
+    assert db_manager.set_user_active(doctor_id, False)
+    assert db_manager.authenticate_user('doctor@prueba.com', 'nueva') is None
+    assert db_manager.set_user_active(doctor_id, True)
+
+    assert db_manager.delete_user(doctor_id)
+    assert _row(db_manager, "SELECT COUNT(*) FROM doctores WHERE id = ?", (doctor_id,)) == (0,)
+    assert not db_manager.delete_user(doctor_id)
+
+
+def test_invoice_record_with_details_and_services(db_manager):
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.execute(DETAIL_SQL)
+    conn.commit()
+    conn.close()
+    patient_id = _new_user(db_manager, 'paciente@prueba.com', 'paciente')
+
+    record = db_manager.create_invoice_record({
+        'paciente_id': patient_id, 'concepto': 'Consulta', 'monto': 1500,
+        'fecha_creacion': '2030-01-07', 'fecha_vencimiento': '2030-02-06',
+        'detalles': [{'servicio': 'Consulta General', 'precio': 1500}],
+    })
+    assert record['numero_factura'].startswith('FAC-')
+    assert _row(db_manager, "SELECT servicio, precio, cantidad FROM facturas_detalle WHERE factura_id = ?",
+                (record['id'],)) == ('Consulta General', 1500, 1)
+    assert _row(db_manager, "SELECT estado FROM facturas WHERE id = ?", (record['id'],)) == ('pendiente',)
+
+    second = db_manager.create_invoice({'paciente_id': patient_id, 'concepto': 'Control', 'monto': 800,
+                                        'fecha_creacion': '2030-01-07', 'fecha_vencimiento': '2030-02-06'})
+    assert second == record['id'] + 1
+
+    assert db_manager.add_invoice_service(record['id'], 'Radiografía', 2, 250)
+    assert _row(db_manager, "SELECT monto FROM facturas WHERE id = ?", (record['id'],)) == (2000,)
+
+    assert db_manager.pay_invoice(record['id'], {'fecha_pago': '2030-01-07', 'metodo_pago': 'efectivo'})
+    assert _row(db_manager, "SELECT estado, metodo_pago FROM facturas WHERE id = ?",
+                (record['id'],)) == ('pagada', 'efectivo')
+
+
+@pytest.mark.parametrize('source, extra', [
+    ('historial_medico', {'motivo_consulta': 'Control'}),
+    ('historiales_medicos', {'observaciones': 'Sin novedad'}),
+])
+def test_save_medical_record(db_manager, source, extra):
+    patient_id = _new_user(db_manager, 'paciente@prueba.com', 'paciente')
+    doctor_id = _new_user(db_manager, 'doctor@prueba.com', 'doctor')
+    record = dict({'paciente_id': patient_id, 'doctor_id': doctor_id, 'fecha_consulta': '2030-01-07',
+                   'diagnostico': 'Sano', 'columna_inexistente': 'x'}, **extra)
+
+    record_id = db_manager.save_medical_record(record, source=source)
+    assert record_id is not None
+    assert db_manager.save_medical_record({'diagnostico': 'Gripe'}, record_id, source=source) == record_id
+    assert _row(db_manager, f"SELECT diagnostico FROM {source} WHERE id = ?", (record_id,)) == ('Gripe',)
+
+    assert db_manager.save_medical_record({'diagnostico': 'x'}, 999999, source=source) is None
+    assert db_manager.save_medical_record(record, source='usuarios') is None
+
+
+def test_save_doctor_schedule_replaces_week(db_manager):
+    doctor_id = _new_user(db_manager, 'doctor@prueba.com', 'doctor', {'horario_inicio': '08:00'})
+
+    assert db_manager.save_doctor_schedule(doctor_id, [('Lunes', '08:00', '10:00'), ('Martes', '14:00', '15:00')])
+    assert db_manager.get_available_slots(doctor_id, '2030-01-07') == ['08:00', '08:30', '09:00', '09:30']
+
+    assert db_manager.save_doctor_schedule(doctor_id, [('Lunes', '09:00', '10:00')])
+    assert db_manager.get_available_slots(doctor_id, '2030-01-07') == ['09:00', '09:30']
+    assert db_manager.get_available_slots(doctor_id, '2030-01-08') == []
@@ -0,0 +1,133 @@
+"""Candado lector/escritor y selección del modo de concurrencia (WAL)"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from db_concurrency import BUSY_TIMEOUT_MS, DatabaseLock, ReadWriteLock, configure_connection
+
+
+def _started(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    lock.acquire_read()
+    entered = threading.Event()
+
+    def reader():
+        lock.acquire_read()
+        entered.set()
+        lock.release_read()
+
+    _started(reader).join(2)
+    assert entered.is_set()
+    lock.release_read()
+
+
+def test_writer_excludes_readers_and_waits_for_them():
+    lock = ReadWriteLock()
+    lock.acquire_read()
+    written = threading.Event()
+
+    def writer():
+        lock.acquire_write()
+        written.set()
+        lock.release_write()
+
+    thread = _started(writer)
+    time.sleep(0.05)
+    assert not written.is_set()
+    lock.release_read()
+    thread.join(2)
+    assert written.is_set()
+
+
+def test_waiting_writer_blocks_new_readers():
+    lock = ReadWriteLock()
+    lock.acquire_read()
+    order = []
+
+    def writer():
+        lock.acquire_write()
+        order.append('escritor')
+        lock.release_write()
+
+    def reader():
+        lock.acquire_read()
+        order.append('lector')
+        lock.release_read()
+
+    writer_thread = _started(writer)
+    time.sleep(0.05)
+    reader_thread = _started(reader)
+    time.sleep(0.05)
+    # El lector nuevo no adelanta al escritor que espera
+    assert order == []
+    lock.release_read()
+    writer_thread.join(2)
+    reader_thread.join(2)
+    assert order == ['escritor', 'lector']
+
+
+@pytest.mark.parametrize('mode, readers_block', [('serialized', True), ('shared', False), ('wal', False)])
+def test_database_lock_modes(mode, readers_block):
+    lock = DatabaseLock(mode)
+    read_entered, write_entered = threading.Event(), threading.Event()
+
+    def reader():
+        with lock.read():
+            read_entered.set()
+
+    def writer():
+        with lock.write():
+            write_entered.set()
+
+    with lock.read():
+        _started(reader).join(0.2)
+        assert read_entered.is_set() is not readers_block
+        # En WAL un escritor no espera a los lectores del proceso
+        _started(writer).join(0.2)
+        assert write_entered.is_set() is (mode == 'wal')
+
+    # ``with lock:`` equivale a una escritura
+    with lock:
+        pass
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        DatabaseLock('optimista')
+
+
+@pytest.mark.parametrize('mode, journal', [('wal', 'wal'), ('shared', 'delete'), ('serialized', 'delete')])
+def test_configure_connection_pragmas(tmp_path, mode, journal):
+    conn = sqlite3.connect(str(tmp_path / f'{mode}.db'))
+    try:
+        configure_connection(conn, mode)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == journal
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == BUSY_TIMEOUT_MS
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        assert synchronous == (1 if mode == 'wal' else 2)  # NORMAL / FULL
+    finally:
+        conn.close()
+
+
+def test_database_manager_uses_the_selected_mode(tmp_path):
+    from database_manager import DatabaseManager
+
+    for mode, journal in (('wal', 'wal'), ('shared', 'delete')):
+        manager = DatabaseManager(str(tmp_path / mode / 'medisync.db'), concurrency=mode)
+        try:
+            assert manager.lock.mode == mode
+            conn = manager.get_connection()
+            try:
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == journal
+            finally:
+                conn.close()
+        finally:
+            manager.pool.close()
@@ -0,0 +1,125 @@
+"""Caché de documentos PDF: registro, consulta e invalidación"""
+import os
+import sqlite3
+
+import pytest
+
+from document_cache import DocumentCache, LocalIndex, ensure_document_cache
+
+
+def test_local_index_without_data_tables(tmp_path):
+    # Modo cliente: índice en un SQLite de la estación, sin tablas de datos ni triggers
+    cache = DocumentCache(LocalIndex(str(tmp_path / 'indice' / 'documentos.db')))
+    path = str(tmp_path / 'pdf' / 'factura.pdf')
+
+    assert cache.lookup('clave') is None
+    with cache.writing('factura', 'clave', path, [('facturas', 1)]) as tmp_file:
+        with open(tmp_file, 'wb') as f:
+            f.write(b'%PDF-1.4')
+
+    assert cache.lookup('clave') == path
+    assert cache.summary()['factura']['documentos'] == 1
+
+    os.remove(path)
+    assert cache.lookup('clave') is None
+
+
+DETAIL_SQL = '''
+CREATE TABLE facturas_detalle (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    factura_id INTEGER,
+    servicio TEXT,
+    precio REAL,
+    cantidad INTEGER
+)
+'''
+
+
+def _write(cache, key, path, sources, content=b'%PDF-1.4', kind='factura'):
+    with cache.writing(kind, key, path, sources) as tmp_file:
+        with open(tmp_file, 'wb') as f:
+            f.write(content)
+    return path
+
+
+def _execute(db_manager, *statements):
+    # Otra conexión (como otro proceso): la invalidan los triggers, no el código de MEDISYNC
+    conn = sqlite3.connect(db_manager.db_path)
+    try:
+        for sql, params in statements:
+            conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def invoices(db_manager):
+    """Ids de dos facturas del paciente 4"""
+    _execute(db_manager, *[(
+        "INSERT INTO facturas (numero_factura, paciente_id, concepto, monto, fecha_creacion, fecha_vencimiento) "
+        "VALUES (?, 4, 'Consulta', 1500, '2030-01-07', '2030-02-06')", (numero,)
+    ) for numero in ('FAC-2030-0001', 'FAC-2030-0002')])
+    conn = sqlite3.connect(db_manager.db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT id FROM facturas ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_writes_to_source_rows_invalidate_documents(db_manager, invoices, tmp_path):
+    cache = DocumentCache(db_manager)
+    first = _write(cache, 'f1', str(tmp_path / 'f1.pdf'), [('facturas', invoices[0]), ('usuarios', 4)])
+    second = _write(cache, 'f2', str(tmp_path / 'f2.pdf'), [('facturas', invoices[1])])
+
+    # La contraseña y las fechas internas no salen impresas: no invalidan
+    _execute(db_manager, ("UPDATE usuarios SET password_hash = 'x', fecha_actualizacion = '2030-01-07' WHERE id = 4", ()))
+    assert cache.lookup_many(['f1', 'f2']) == {'f1': first, 'f2': second}
+
+    _execute(db_manager, ("UPDATE facturas SET monto = 1800 WHERE id = ?", (invoices[0],)))
+    assert cache.lookup('f1') is None
+    assert not os.path.exists(first)
+    assert cache.lookup('f2') == second
+
+    first = _write(cache, 'f1b', first, [('facturas', invoices[0]), ('usuarios', 4)])
+    _execute(db_manager, ("UPDATE usuarios SET telefono = '809-000-0000' WHERE id = 4", ()))
+    assert cache.lookup('f1b') is None
+
+    _execute(db_manager, ("DELETE FROM facturas WHERE id = ?", (invoices[1],)))
+    assert cache.lookup('f2') is None
+    assert cache.summary() == {}
+
+
+def test_invoice_detail_rows_invalidate_their_invoice(db_manager, invoices, tmp_path):
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.execute(DETAIL_SQL)
+    # Tabla creada después de la migración: los triggers se añaden al volver a asegurar el índice
+    ensure_document_cache(conn.cursor())
+    conn.commit()
+    conn.close()
+
+    cache = DocumentCache(db_manager)
+    _write(cache, 'f1', str(tmp_path / 'f1.pdf'), [('facturas', invoices[0])])
+    _write(cache, 'f2', str(tmp_path / 'f2.pdf'), [('facturas', invoices[1])])
+    _execute(db_manager, ("INSERT INTO facturas_detalle (factura_id, servicio, precio, cantidad) "
+                          "VALUES (?, 'Radiografía', 250, 1)", (invoices[1],)))
+    assert cache.lookup('f1') is not None
+    assert cache.lookup('f2') is None
+
+
+def test_changed_files_and_size_limits(db_manager, tmp_path):
+    cache = DocumentCache(db_manager, max_entries=2)
+    paths = [_write(cache, f'r{n}', str(tmp_path / f'r{n}.pdf'), [], kind='reporte') for n in range(2)]
+
+    # Un archivo modificado fuera de MEDISYNC no se entrega
+    with open(paths[0], 'ab') as f:
+        f.write(b'x')
+    assert cache.lookup('r0') is None
+    assert cache.lookup('r1') == paths[1]
+
+    # Al superar el tope se desalojan los menos usados y se borran sus archivos
+    newer = [_write(cache, f'n{n}', str(tmp_path / f'n{n}.pdf'), [], kind='reporte') for n in range(2)]
+    assert cache.summary()['reporte']['documentos'] == 2
+    assert cache.lookup('r1') is None
+    assert not os.path.exists(paths[1])
+    assert cache.lookup_many(['n0', 'n1']) == {'n0': newer[0], 'n1': newer[1]}
@@ -0,0 +1,84 @@
+"""Numeración de facturas con varios procesos sobre la misma base"""
+import multiprocessing
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from db_concurrency import BUSY_TIMEOUT_MS, configure_connection
+from invoice_sequence import (InvoiceNumberAllocator, InvoiceNumberError, allocate_invoice_number,
+                              ensure_sequence_table, yearly_invoice_numbers)
+
+PROCESSES = 4
+ROUNDS = 25
+# Fecha fija: todos los números caen en la misma clave aunque la prueba cruce la medianoche
+WHEN = datetime(2025, 7, 25)
+ALLOCATOR = InvoiceNumberAllocator('FAC', 'year')
+
+
+def _allocate(db_path, worker_id):
+    """Números confirmados por un proceso (allocate_now, bloques y bloques deshechos)"""
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+    configure_connection(conn, 'wal')
+    numbers = []
+    try:
+        for round_number in range(ROUNDS):
+            if round_number % 3 == 0:
+                numbers += ALLOCATOR.allocate_now(conn, 1 + worker_id % 2, WHEN)
+                continue
+            cursor = conn.cursor()
+            try:
+                block = ALLOCATOR.reserve_block(cursor, 3, WHEN)
+                if round_number % 3 == 1:
+                    conn.commit()
+                    numbers += block
+                else:
+                    # El ROLLBACK devuelve los números al contador
+                    conn.rollback()
+            finally:
+                cursor.close()
+    finally:
+        conn.close()
+    return numbers
+
+
+def test_concurrent_allocation_is_contiguous_and_unique(tmp_path):
+    db_path = str(tmp_path / 'facturas.db')
+    conn = sqlite3.connect(db_path)
+    configure_connection(conn, 'wal')
+    ensure_sequence_table(conn.cursor())
+    conn.commit()
+    conn.close()
+
+    with multiprocessing.Pool(PROCESSES) as pool:
+        results = pool.starmap(_allocate, [(db_path, worker_id) for worker_id in range(PROCESSES)])
+
+    numbers = [number for result in results for number in result]
+    assert len(numbers) == len(set(numbers))
+
+    key = ALLOCATOR.key_for(WHEN)
+    assert all(number.startswith(f"{key}-") for number in numbers)
+    sequences = sorted(int(number.rsplit('-', 1)[1]) for number in numbers)
+    assert sequences == list(range(1, len(numbers) + 1))
+
+    conn = sqlite3.connect(db_path)
+    try:
+        counter = conn.execute("SELECT ultimo FROM secuencias_factura WHERE clave = ?", (key,)).fetchone()[0]
+    finally:
+        conn.close()
+    assert counter == len(numbers)
+
+
+class _FailingManager:
+    def allocate_invoice_numbers(self, count=1):
+        # Como DatabaseManager y RemoteDatabaseManager cuando falla la reserva
+        return []
+
+
+def test_allocate_invoice_number_never_improvises(db_manager):
+    key = yearly_invoice_numbers.key_for()
+    assert allocate_invoice_number(db_manager) == f"{key}-0001"
+    assert allocate_invoice_number(db_manager) == f"{key}-0002"
+
+    with pytest.raises(InvoiceNumberError):
+        allocate_invoice_number(_FailingManager())
@@ -0,0 +1,87 @@
+"""Búsqueda en historiales: triggers de sincronización FTS5 y recurso a LIKE"""
+import sqlite3
+
+import pytest
+
+import medical_search
+
+DOCTOR, PACIENTE, OTRO_PACIENTE = 2, 4, 3
+
+
+@pytest.fixture
+def cursor(db_manager):
+    conn = sqlite3.connect(db_manager.db_path, isolation_level=None)
+    cursor = conn.cursor()
+    if not medical_search.fts5_available(cursor):
+        conn.close()
+        pytest.skip("SQLite sin FTS5")
+    yield cursor
+    conn.close()
+
+
+def _insert(cursor, paciente_id, fecha, diagnostico, tratamiento='', table='historial_medico'):
+    cursor.execute(f"INSERT INTO {table} (paciente_id, doctor_id, fecha_consulta, diagnostico, tratamiento) "
+                   "VALUES (?, ?, ?, ?, ?)", (paciente_id, DOCTOR, fecha, diagnostico, tratamiento))
+    return cursor.lastrowid
+
+
+def _ids(cursor, text, **kwargs):
+    return [row['id'] for row in medical_search.search(cursor, text, **kwargs)]
+
+
+def _assert_index_consistent(cursor, table='historial_medico'):
+    fts = medical_search.SOURCES[table].fts_table
+    # Con contenido externo, 'integrity-check' compara el índice con la tabla origen
+    cursor.execute(f"INSERT INTO {fts}({fts}, rank) VALUES ('integrity-check', 1)")
+
+
+@pytest.mark.parametrize('table', sorted(medical_search.SOURCES))
+def test_triggers_keep_the_index_in_sync(cursor, table):
+    assert medical_search.fts_exists(cursor, medical_search.SOURCES[table])
+    first = _insert(cursor, PACIENTE, '2030-01-07', 'Diabetes tipo 2', 'Metformina', table)
+    second = _insert(cursor, OTRO_PACIENTE, '2030-01-08', 'Gripe', 'Reposo', table)
+    _assert_index_consistent(cursor, table)
+    assert _ids(cursor, 'diabétes', source=table) == [first]
+    assert _ids(cursor, 'metfor', source=table) == [first]
+
+    # Cambiar texto indexado reemplaza los términos; cambiar otras columnas no toca el índice
+    cursor.execute(f"UPDATE {table} SET diagnostico = 'Hipertensión' WHERE id = ?", (first,))
+    cursor.execute(f"UPDATE {table} SET fecha_consulta = '2030-02-01' WHERE id = ?", (second,))
+    _assert_index_consistent(cursor, table)
+    assert _ids(cursor, 'diabetes', source=table) == []
+    assert _ids(cursor, 'hipertension', source=table) == [first]
+    assert _ids(cursor, 'gripe', source=table) == [second]
+
+    cursor.execute(f"DELETE FROM {table} WHERE id = ?", (second,))
+    _assert_index_consistent(cursor, table)
+    assert _ids(cursor, 'gripe', source=table) == []
+
+
+def test_ranking_prefers_diagnosis_over_treatment(cursor):
+    in_treatment = _insert(cursor, PACIENTE, '2030-01-09', 'Control', 'Vigilar asma')
+    in_diagnosis = _insert(cursor, PACIENTE, '2030-01-01', 'Asma leve', 'Inhalador')
+    assert _ids(cursor, 'asma') == [in_diagnosis, in_treatment]
+    assert '[Asma]' in medical_search.search(cursor, 'asma')[0]['fragmento']
+
+
+def test_like_fallback_matches_the_same_records(cursor):
+    first = _insert(cursor, PACIENTE, '2030-01-07', 'Diabetes tipo 2')
+    gestational = _insert(cursor, OTRO_PACIENTE, '2030-01-08', 'Diabetes gestacional dosis_b')
+    latest = _insert(cursor, PACIENTE, '2030-01-09', 'Control de diabétes')
+
+    # Con paciente se filtra con LIKE sin acentos, ordenado por fecha
+    clause = medical_search.search_clause(cursor, 'diabetes', by_patient=True)
+    assert clause.join == ''
+    assert _ids(cursor, 'DIABETES', paciente_id=PACIENTE) == [latest, first]
+
+    # Sin índice (SQLite sin FTS5 o tabla borrada) la búsqueda sigue funcionando
+    cursor.execute("DROP TABLE historial_medico_fts")
+    for trigger in ('insert', 'update', 'delete'):
+        cursor.execute(f"DROP TRIGGER historial_medico_fts_{trigger}")
+    assert _ids(cursor, 'diabetes') == [latest, gestational, first]
+    # El '_' de LIKE se busca literalmente
+    assert _ids(cursor, 'dosis_b') == [gestational]
+    assert _ids(cursor, 'dosis_') == [gestational]
+    assert _ids(cursor, 'sis_b') == [gestational]
+    assert _ids(cursor, 'tipo_2') == []
+    assert _ids(cursor, 'diab tipo') == [first]
@@ -0,0 +1,96 @@
+"""Tablas de hechos de los reportes: triggers, verificación y lecturas por rango"""
+import sqlite3
+from datetime import date
+
+import pytest
+
+import report_rollups
+
+DOCTOR, PACIENTE, OTRO_DOCTOR = 2, 4, 1
+
+
+@pytest.fixture
+def cursor(db_manager):
+    conn = sqlite3.connect(db_manager.db_path, isolation_level=None)
+    yield conn.cursor()
+    conn.close()
+
+
+def _assert_verified(cursor):
+    mismatches = report_rollups.verify(cursor)
+    assert set(mismatches) == {counter.table for counter in report_rollups.ROLLUPS}
+    assert not any(mismatches.values()), mismatches
+
+
+def _insert_rows(cursor):
+    cursor.executemany("INSERT INTO citas (paciente_id, doctor_id, fecha_hora, estado, motivo, tarifa_consulta) "
+                       "VALUES (?, ?, ?, ?, ?, ?)", [
+                           (PACIENTE, DOCTOR, '2030-01-07 09:00', 'completada', 'Control', 1500),
+                           (PACIENTE, DOCTOR, '2030-01-31 10:00', 'programada', 'Dolor', 1500),
+                           (3, OTRO_DOCTOR, '2030-02-01 11:00', 'cancelada', 'Control', None),
+                       ])
+    cursor.executemany("INSERT INTO facturas (numero_factura, paciente_id, doctor_id, concepto, tipo_consulta, "
+                       "monto, estado, fecha_creacion, fecha_pago, metodo_pago, seguro_aplicado, "
+                       "fecha_vencimiento) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '2030-03-01')", [
+                           ('FAC-2030-0001', PACIENTE, DOCTOR, 'Consulta', 'General', 1500, 'pagada',
+                            '2030-01-07', '2030-01-08', 'efectivo', None),
+                           ('FAC-2030-0002', PACIENTE, DOCTOR, 'Control', '', 800, 'pendiente',
+                            '2030-01-31', None, None, 'ARS Humano'),
+                           ('FAC-2030-0003', 3, None, 'Radiografía', None, 2500.75, 'pagada',
+                            '2030-02-01', '2030-02-15', 'tarjeta', None),
+                       ])
+
+
+def test_rollups_follow_inserts_updates_and_deletes(cursor):
+    _assert_verified(cursor)
+
+    _insert_rows(cursor)
+    _assert_verified(cursor)
+
+    # Modificaciones tardías: cambian fecha, estado, método de pago y claves de servicio
+    cursor.execute("UPDATE citas SET fecha_hora = '2030-02-02 10:00', motivo = 'Revisión' "
+                   "WHERE fecha_hora = '2030-01-31 10:00'")
+    cursor.execute("UPDATE facturas SET estado = 'pagada', fecha_pago = '2030-02-03', metodo_pago = 'transferencia' "
+                   "WHERE numero_factura = 'FAC-2030-0002'")
+    cursor.execute("UPDATE facturas SET fecha_pago = NULL, estado = 'pendiente' "
+                   "WHERE numero_factura = 'FAC-2030-0003'")
+    cursor.execute("UPDATE facturas SET tipo_consulta = 'Especialista', doctor_id = ? "
+                   "WHERE numero_factura = 'FAC-2030-0001'", (OTRO_DOCTOR,))
+    _assert_verified(cursor)
+
+    cursor.execute("DELETE FROM citas WHERE estado = 'cancelada'")
+    cursor.execute("DELETE FROM facturas WHERE numero_factura = 'FAC-2030-0002'")
+    _assert_verified(cursor)
+
+    cursor.execute("DELETE FROM citas")
+    cursor.execute("DELETE FROM facturas")
+    _assert_verified(cursor)
+    for counter in report_rollups.ROLLUPS:
+        assert cursor.execute(f"SELECT COUNT(*) FROM {counter.table}").fetchone()[0] == 0
+
+
+def test_verify_detects_drift_and_rebuild_repairs_it(cursor):
+    _insert_rows(cursor)
+    cursor.execute("UPDATE rollup_cobros_mes SET monto = monto + 1")
+    cursor.execute("DELETE FROM rollup_motivos_dia")
+    mismatches = report_rollups.verify(cursor)
+    assert mismatches['rollup_cobros_mes'] > 0
+    assert mismatches['rollup_motivos_dia'] > 0
+    assert mismatches['rollup_facturas_dia'] == 0
+
+    report_rollups.rebuild(cursor)
+    _assert_verified(cursor)
+
+
+def test_range_reads_combine_days_and_months(cursor):
+    _insert_rows(cursor)
+
+    # Enero completo (tabla mensual) más el 1 de febrero (tabla diaria)
+    start, end = date(2030, 1, 1), date(2030, 2, 1)
+    assert report_rollups.split_range(start, end) == ([('2030-02-01', '2030-02-01')], ('2030-01', '2030-01'))
+    assert report_rollups.appointments_totals(cursor, start, end) == (3, 1, 1)
+    assert report_rollups.income_totals(cursor, start, end, ('pagada',)) == (4000.75, 2)
+    assert report_rollups.financial_summary(cursor, start, end) == {
+        'cobrado': 1500, 'facturas_pagadas': 1, 'pendiente': 800, 'facturas_pendientes': 1,
+    }
+    assert report_rollups.top_reasons(cursor, start, end) == [('Control', 2), ('Dolor', 1)]
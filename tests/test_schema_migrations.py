@@ -0,0 +1,32 @@
+"""Migraciones y planes de consulta sobre una base recién creada"""
+import sqlite3
+
+import schema_migrations
+
+
+def test_fresh_database_reaches_latest_version(fresh_db):
+    conn = sqlite3.connect(fresh_db)
+    try:
+        assert schema_migrations.current_version(conn) == schema_migrations.MIGRATIONS[-1].version
+        assert schema_migrations.migrate(conn) == []
+    finally:
+        conn.close()
+
+
+def test_fresh_database_query_plans_use_their_indexes(fresh_db):
+    conn = sqlite3.connect(fresh_db)
+    try:
+        # Las comprobaciones que no se pueden preparar también cuentan como fallo
+        assert schema_migrations.verify_query_plans(conn) == []
+    finally:
+        conn.close()
+
+
+def test_unpreparable_check_is_reported(fresh_db):
+    conn = sqlite3.connect(fresh_db)
+    try:
+        check = ("Columna inexistente", "SELECT id FROM facturas WHERE no_existe = ?", (1,), 'idx_x')
+        failures = schema_migrations.verify_query_plans(conn, [check])
+        assert [failure[0] for failure in failures] == ["Columna inexistente"]
+    finally:
+        conn.close()
@@ -0,0 +1,31 @@
+"""Arranque hasta el login sin cargar módulos perezosos (y, opcionalmente, dentro del presupuesto)
+
+El tiempo depende de la máquina: la comprobación del presupuesto sólo se
+hace con MEDISYNC_BENCH_STARTUP=1. La de módulos perezosos se hace siempre.
+"""
+import os
+
+import pytest
+
+from benchmarks import bench_startup
+
+TIMING = os.environ.get('MEDISYNC_BENCH_STARTUP') == '1'
+
+
+@pytest.fixture(scope='module')
+def startup_results(tmp_path_factory):
+    from database_manager import DatabaseManager
+
+    db_path = str(tmp_path_factory.mktemp('arranque') / 'medisync.db')
+    DatabaseManager(db_path).pool.close()
+    return bench_startup.measure(runs=3 if TIMING else 1, db_source=db_path)
+
+
+def test_startup_does_not_load_lazy_modules(startup_results):
+    # Presupuesto infinito: sólo cuentan los módulos cargados antes de tiempo
+    assert bench_startup.check(startup_results, float('inf')) == []
+
+
+@pytest.mark.skipif(not TIMING, reason="medición de tiempo: MEDISYNC_BENCH_STARTUP=1")
+def test_startup_within_budget(startup_results):
+    assert bench_startup.check(startup_results, bench_startup.DEFAULT_BUDGET_MS) == []
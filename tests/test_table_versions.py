@@ -0,0 +1,101 @@
+"""Versiones por tabla (triggers TEMP del pool) y refresco de pestañas con TabManager"""
+import sqlite3
+import tkinter as tk
+
+import pytest
+
+from table_versions import TableVersions
+
+DOCTOR, PACIENTE = 2, 4
+
+
+def test_pool_writes_bump_versions(db_manager):
+    versions = db_manager.table_versions
+    before = versions.snapshot()
+
+    db_manager.create_appointment({'paciente_id': PACIENTE, 'doctor_id': DOCTOR, 'fecha_hora': '2030-01-07 09:00'})
+    assert versions.changed(before) == {'citas'}
+
+    # Lecturas y escrituras en tablas no seguidas no cuentan
+    mid = versions.snapshot()
+    db_manager.get_appointments_page()
+    db_manager.allocate_invoice_numbers(1)
+    assert versions.changed(mid) == set()
+
+    # Un rollback cuenta como escritura (refresco de más, nunca de menos)
+    conn = db_manager.get_connection()
+    conn.execute("UPDATE usuarios SET telefono = 'x' WHERE id = ?", (PACIENTE,))
+    conn.rollback()
+    conn.close()
+    assert versions.changed(mid) == {'usuarios'}
+
+
+def test_doctor_schedules_is_tracked_on_already_open_connections(db_manager):
+    # Conexión del pool abierta antes del primer horario guardado
+    conn = db_manager.get_connection()
+    conn.execute("SELECT 1")
+    conn.close()
+    before = db_manager.table_versions.snapshot(['doctor_schedules', 'doctores'])
+
+    assert db_manager.save_doctor_schedule(DOCTOR, [('Lunes', '08:00', '10:00')])
+    assert db_manager.table_versions.changed(before) == {'doctor_schedules'}
+
+
+def test_writes_outside_the_pool_are_not_seen_until_touched(db_manager):
+    versions = db_manager.table_versions
+    before = versions.snapshot(['facturas'])
+    raw = sqlite3.connect(db_manager.db_path)
+    raw.execute("DELETE FROM facturas")
+    raw.commit()
+    raw.close()
+    assert versions.changed(before) == set()
+
+    versions.touch('facturas')
+    assert versions.changed(before) == {'facturas'}
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("sin pantalla para Tk")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_tab_manager_refreshes_only_when_its_tables_change(root):
+    from tab_manager import TabManager
+
+    versions = TableVersions()
+    calls = []
+
+    def build(parent):
+        calls.append('construir')
+        tk.Label(parent, text='citas').pack()
+        return lambda: calls.append('refrescar')
+
+    tabs = TabManager(root, versions=versions)
+    tabs.add('citas', build, tables=('citas',))
+    tabs.add('facturas', lambda parent: None, tables=('facturas',))
+
+    tabs.show('citas')
+    tabs.show('facturas')
+    versions.touch('facturas')
+    tabs.show('citas')
+    assert calls == ['construir']
+    assert tabs.stats['reuses'] == 1
+
+    # Sin función de refresco, la pestaña obsoleta se reconstruye
+    tabs.show('facturas')
+    assert tabs.stats['rebuilds'] == 1
+
+    versions.touch('citas')
+    tabs.show('citas')
+    assert calls == ['construir', 'refrescar']
+
+    tabs.mark_dirty('citas')
+    assert tabs.refresh_current()
+    assert calls == ['construir', 'refrescar', 'refrescar']
+    assert not tabs.refresh_current()
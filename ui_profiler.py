@@ -0,0 +1,304 @@
+"""
+Perfilado de acciones de la interfaz de MEDISYNC (opcional)
+Con el perfilador activo, cada acción (cambio de pestaña, callback de un
+botón o evento, carga programada con after, tarea en segundo plano) se
+ejecuta bajo cProfile y un muestreador de pilas. Las que duran más del
+mínimo se guardan en el directorio de perfiles:
+    <fecha>_<acción>.prof        estadísticas de cProfile (pstats, snakeviz...)
+    <fecha>_<acción>.collapsed   pilas colapsadas para flamegraph.pl, speedscope...
+Desactivado, cada acción sólo comprueba ``profiler.enabled``.
+
+Configuración por variables de entorno (también se activa desde el panel
+de rendimiento, Ctrl+Shift+P):
+    MEDISYNC_PROFILE=1                activar al iniciar
+    MEDISYNC_PROFILE_DIR=profiles     directorio de salida
+    MEDISYNC_PROFILE_MIN_MS=50        las acciones más cortas no se guardan
+    MEDISYNC_PROFILE_INTERVAL_MS=1    intervalo de muestreo de pilas (ms)
+"""
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+import tkinter
+from collections import Counter, deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+DEFAULT_DIRECTORY = 'profiles'
+DEFAULT_MIN_MS = 50.0
+DEFAULT_INTERVAL_MS = 1.0
+DEFAULT_HISTORY = 200
+
+_DISABLED = nullcontext()
+_UNSAFE_NAME = re.compile(r'[^\w-]+')
+_FRAME_LABELS = {}
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def callable_name(func):
+    """Nombre legible de una función, método o callable"""
+    name = getattr(func, '__qualname__', None) or getattr(func, '__name__', None) or type(func).__name__
+    # after() envuelve la función en Misc.after.<locals>.callit pero copia su __name__
+    if name.endswith('.callit'):
+        name = getattr(func, '__name__', name)
+    return name
+
+
+def _frame_label(code):
+    label = _FRAME_LABELS.get(code)
+    if label is None:
+        name = getattr(code, 'co_qualname', code.co_name)
+        label = _FRAME_LABELS[code] = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ',')
+    return label
+
+
+@dataclass
+class ProfileSession:
+    """Una acción en curso: su cProfile y las pilas muestreadas (sin la raíz)"""
+    name: str
+    generic: bool
+    thread_id: int
+    entry_frame: object
+    started: float
+    started_at: datetime
+    profile: Optional[cProfile.Profile] = None
+    stacks: Counter = field(default_factory=Counter)
+    samples: int = 0
+
+    def add_sample(self, frame):
+        labels = []
+        while frame is not None and frame is not self.entry_frame:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        if frame is None:
+            # La acción ya terminó en este hilo (la muestra llegó tarde)
+            return
+        self.stacks[';'.join(reversed(labels))] += 1
+        self.samples += 1
+
+
+@dataclass
+class ProfileResult:
+    """Perfil guardado de una acción"""
+    name: str
+    started_at: datetime
+    duration_ms: float
+    samples: int
+    profile_path: Optional[str]
+    stacks_path: str
+
+
+class StackSampler:
+    """Hilo que toma la pila de los hilos con una acción perfilándose
+
+    Sólo existe mientras haya sesiones activas. Mientras tanto se reduce el
+    intervalo de cambio de hilo de Python para que el muestreo no dependa
+    de que el hilo principal suelte el GIL cada 5 ms.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._switch_interval = None
+
+    def add(self, session):
+        with self._lock:
+            self._sessions[session.thread_id] = session
+            if self._thread is None:
+                self._switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(self._switch_interval, self.interval))
+                self._thread = threading.Thread(target=self._loop, name='medisync-profiler', daemon=True)
+                self._thread.start()
+
+    def remove(self, session):
+        # Al volver, el hilo de muestreo ya no toca esta sesión
+        with self._lock:
+            if self._sessions.get(session.thread_id) is session:
+                del self._sessions[session.thread_id]
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                if not self._sessions:
+                    self._thread = None
+                    sys.setswitchinterval(self._switch_interval)
+                    return
+                frames = sys._current_frames()
+                for thread_id, session in self._sessions.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        session.add_sample(frame)
+                del frames
+            time.sleep(self.interval)
+
+
+class _ProfiledAction:
+    """Contexto de una acción perfilada; sólo la más externa de cada hilo guarda perfil"""
+
+    __slots__ = ('profiler', 'name', 'generic', 'session')
+
+    def __init__(self, profiler, name, generic):
+        self.profiler = profiler
+        self.name = name
+        self.generic = generic
+        self.session = None
+
+    def __enter__(self):
+        self.session = self.profiler._begin(self.name, self.generic, sys._getframe(1))
+        return self.session
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.session is not None:
+            self.profiler._end(self.session)
+        return False
+
+
+class UIProfiler:
+    """Perfilador de acciones de la interfaz
+
+    - ``action(nombre)`` perfila un bloque; anidado dentro de otra acción del
+      mismo hilo sólo le da nombre (si la exterior era un callback genérico)
+      y queda incluido en su perfil.
+    - ``action_for(func)`` igual, con el nombre de la función calculado sólo
+      si el perfilador está activo.
+    - ``saved`` guarda los últimos perfiles escritos para el panel de
+      rendimiento.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, min_ms=DEFAULT_MIN_MS,
+                 interval_ms=DEFAULT_INTERVAL_MS, enabled=False, history=DEFAULT_HISTORY):
+        self.enabled = enabled
+        self.directory = directory
+        self.min_ms = min_ms
+        self.sampler = StackSampler(interval_ms / 1000)
+        self.saved = deque(maxlen=history)
+        self.discarded = 0
+        self._local = threading.local()
+
+    @classmethod
+    def from_environment(cls):
+        return cls(directory=os.environ.get('MEDISYNC_PROFILE_DIR') or DEFAULT_DIRECTORY,
+                   min_ms=_env_float('MEDISYNC_PROFILE_MIN_MS', DEFAULT_MIN_MS),
+                   interval_ms=_env_float('MEDISYNC_PROFILE_INTERVAL_MS', DEFAULT_INTERVAL_MS),
+                   enabled=os.environ.get('MEDISYNC_PROFILE', '0') not in ('', '0'))
+
+    def configure(self, enabled=None, directory=None, min_ms=None):
+        """Activar/desactivar o cambiar el directorio y el mínimo en caliente"""
+        if enabled is not None:
+            self.enabled = enabled
+        if directory is not None:
+            self.directory = directory
+        if min_ms is not None:
+            self.min_ms = min_ms
+
+    def action(self, name, generic=False):
+        if not self.enabled:
+            return _DISABLED
+        return _ProfiledAction(self, name, generic)
+
+    def action_for(self, func, suffix=''):
+        if not self.enabled or func is None:
+            return _DISABLED
+        return _ProfiledAction(self, callable_name(func) + suffix, False)
+
+    def results(self) -> List[ProfileResult]:
+        return list(self.saved)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _begin(self, name, generic, entry_frame):
+        current = getattr(self._local, 'session', None)
+        if current is not None:
+            if current.generic and not generic:
+                current.name = name
+                current.generic = False
+            return None
+        session = ProfileSession(name, generic, threading.get_ident(), entry_frame,
+                                 time.perf_counter(), datetime.now())
+        self._local.session = session
+        self.sampler.add(session)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            session.profile = profile
+        except ValueError:
+            # Otro perfilador activo (desde Python 3.12 hay uno por proceso): sólo muestreo
+            pass
+        return session
+
+    def _end(self, session):
+        if session.profile is not None:
+            session.profile.disable()
+        self.sampler.remove(session)
+        self._local.session = None
+        duration_ms = (time.perf_counter() - session.started) * 1000
+        if duration_ms < self.min_ms:
+            self.discarded += 1
+            return None
+        try:
+            result = self._save(session, duration_ms)
+        except OSError as e:
+            print(f"Error guardando perfil de {session.name}: {e}")
+            return None
+        self.saved.append(result)
+        print(f"📈 Perfil guardado: {session.name} ({duration_ms:.0f} ms) → {result.stacks_path}")
+        return result
+
+    def _save(self, session, duration_ms):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = session.started_at.strftime('%Y%m%d-%H%M%S-') + f"{session.started_at.microsecond // 1000:03d}"
+        slug = _UNSAFE_NAME.sub('_', session.name).strip('_')[:60] or 'accion'
+        base = os.path.join(self.directory, f"{stamp}_{slug}")
+        profile_path = None
+        if session.profile is not None:
+            profile_path = base + '.prof'
+            session.profile.dump_stats(profile_path)
+        stacks_path = base + '.collapsed'
+        root = session.name.replace(';', ',')
+        with open(stacks_path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(session.stacks.items()):
+                f.write(f"{root};{stack} {count}\n" if stack else f"{root} {count}\n")
+        return ProfileResult(session.name, session.started_at, duration_ms, session.samples,
+                             profile_path, stacks_path)
+
+
+profiler = UIProfiler.from_environment()
+
+
+def _callback_label(func, widget):
+    name = callable_name(func)
+    try:
+        text = ' '.join(str(widget.cget('text')).split())
+    except (tkinter.TclError, AttributeError, TypeError):
+        text = ''
+    if '<lambda>' in name:
+        return text or f"{type(widget).__name__} · {name}"
+    return f"{text} · {name}" if text else name
+
+
+class ProfiledCallWrapper(tkinter.CallWrapper):
+    """CallWrapper de Tkinter que perfila el callback si el perfilador está activo"""
+
+    def __call__(self, *args):
+        if not profiler.enabled:
+            return super().__call__(*args)
+        with profiler.action(_callback_label(self.func, self.widget), generic=True):
+            return super().__call__(*args)
+
+
+def install_tk_hook():
+    """Pasar por el perfilador todos los callbacks de Tk (botones, eventos, after) registrados desde ahora"""
+    tkinter.CallWrapper = ProfiledCallWrapper
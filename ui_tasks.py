@@ -0,0 +1,217 @@
+"""
+Tareas en segundo plano para la interfaz Tkinter de MEDISYNC
+Pool de hilos para las consultas y bomba de resultados con root.after, para
+que las ventanas no se congelen mientras SQLite trabaja
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+import tkinter as tk
+
+from query_stats import monitor
+from ui_profiler import profiler
+
+POLL_INTERVAL_MS = 30
+MAX_WORKERS = 4
+
+
+class Task:
+    """Una carga en curso; ``cancel()`` descarta su resultado"""
+
+    __slots__ = ('key', 'on_done', 'on_error', 'busy', 'future', 'action', '_cancelled')
+
+    def __init__(self, key, on_done, on_error, busy):
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.busy = busy
+        self.future = None
+        # Acción de la interfaz que lanzó la tarea: sus consultas se registran con ella
+        self.action = monitor.current_action()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Cancelar: si aún no empezó no se ejecuta; si ya terminó, no se entrega"""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+
+class BusyIndicator:
+    """Cursor de espera (y texto opcional) mientras haya tareas activas sobre un widget"""
+
+    def __init__(self, widget, label=None, text="⏳ Cargando..."):
+        self.widget = widget
+        self.label = label
+        self.text = text
+        self._count = 0
+        self._saved_cursor = None
+        self._saved_text = None
+
+    def start(self):
+        self._count += 1
+        if self._count > 1:
+            return
+        try:
+            self._saved_cursor = self.widget.cget('cursor')
+            self.widget.configure(cursor='watch')
+            if self.label is not None:
+                self._saved_text = self.label.cget('text')
+                self.label.configure(text=self.text)
+        except tk.TclError:
+            pass  # Widget destruido mientras tanto
+
+    def stop(self):
+        self._count = max(0, self._count - 1)
+        if self._count:
+            return
+        try:
+            self.widget.configure(cursor=self._saved_cursor or '')
+            if self.label is not None:
+                self.label.configure(text=self._saved_text or '')
+        except tk.TclError:
+            pass
+
+    @property
+    def active(self):
+        return self._count > 0
+
+
+class BackgroundTasks:
+    """Ejecuta funciones en un pool de hilos y entrega los resultados en el hilo de Tk
+
+    ``submit(func, *args, on_done=..., key=..., busy=...)`` corre ``func``
+    fuera del hilo principal. ``on_done(resultado)`` / ``on_error(excepción)``
+    se llaman desde ``root.after``, así que pueden tocar widgets. Una tarea
+    nueva con la misma ``key`` cancela la anterior (búsquedas superadas,
+    recargas repetidas). ``busy`` puede ser un widget o un BusyIndicator.
+    """
+
+    def __init__(self, root, max_workers=MAX_WORKERS, poll_interval=POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='medisync-ui')
+        self._results = queue.Queue()
+        self._latest: Dict[str, Task] = {}
+        self._pending = 0
+        self._indicators: Dict[str, BusyIndicator] = {}
+        self._pump_scheduled = False
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # API (llamar sólo desde el hilo de Tk)
+    # ------------------------------------------------------------------
+    def submit(self, func: Callable, *args, on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, key: Optional[str] = None,
+               busy=None) -> Task:
+        if key is not None:
+            self.cancel(key)
+        task = Task(key, on_done, on_error, self._indicator_for(busy))
+        if key is not None:
+            self._latest[key] = task
+        if task.busy is not None:
+            task.busy.start()
+
+        if self._closed:
+            # Sin pool (ventana cerrada): ejecutar en línea
+            self._deliver(task, *self._run(task, func, args))
+            return task
+
+        self._pending += 1
+        task.future = self._executor.submit(self._run, task, func, args)
+        # También se llama si la tarea se cancela antes de empezar: cada tarea llega una vez a la cola
+        task.future.add_done_callback(lambda future, task=task: self._results.put(task))
+        self._schedule_pump()
+        return task
+
+    def cancel(self, key):
+        """Cancelar la tarea vigente con esa clave (si la hay)"""
+        task = self._latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def is_busy(self, key=None):
+        if key is None:
+            return self._pending > 0
+        task = self._latest.get(key)
+        return task is not None and not task.cancelled
+
+    def shutdown(self):
+        self._closed = True
+        for task in list(self._latest.values()):
+            task.cancel()
+        self._latest.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _indicator_for(self, busy):
+        if busy is None or isinstance(busy, BusyIndicator):
+            return busy
+        name = str(busy)
+        indicator = self._indicators.get(name)
+        if indicator is None or indicator.widget is not busy:
+            indicator = self._indicators[name] = BusyIndicator(busy)
+        return indicator
+
+    @staticmethod
+    def _run(task, func, args):
+        if task.cancelled:
+            return False, None
+        try:
+            with monitor.labelled(task.action), profiler.action_for(func, " (segundo plano)"):
+                return True, func(*args)
+        except Exception as e:
+            return False, e
+
+    def _schedule_pump(self):
+        if self._pump_scheduled:
+            return
+        try:
+            self.root.after(self.poll_interval, self._pump)
+            self._pump_scheduled = True
+        except tk.TclError:
+            # La ventana ya no existe
+            self.shutdown()
+
+    def _pump(self):
+        self._pump_scheduled = False
+        while True:
+            try:
+                task = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            ok, value = (False, None) if task.future.cancelled() else task.future.result()
+            self._deliver(task, ok, value)
+
+        if self._pending > 0 and not self._closed:
+            self._schedule_pump()
+
+    def _deliver(self, task, ok, value):
+        if task.busy is not None:
+            task.busy.stop()
+        if task.key is not None and self._latest.get(task.key) is task:
+            del self._latest[task.key]
+        if task.cancelled:
+            return
+        try:
+            with monitor.labelled(task.action), profiler.action_for(task.on_done if ok else task.on_error):
+                if ok:
+                    if task.on_done is not None:
+                        task.on_done(value)
+                elif value is not None:
+                    if task.on_error is not None:
+                        task.on_error(value)
+                    else:
+                        print(f"Error en tarea en segundo plano: {value}")
+        except tk.TclError as e:
+            # El widget de destino se cerró antes de recibir los datos
+            print(f"Resultado descartado: {e}")
@@ -0,0 +1,543 @@
+"""
+Tabla virtual para MEDISYNC
+ttk.Treeview que sólo dibuja las filas visibles (más un margen) y las pide
+por páginas a una fuente de datos, reutilizando los mismos items al desplazarse
+"""
+import threading
+from collections import OrderedDict
+from tkinter import ttk
+
+PAGE_SIZE = 100
+MAX_CACHED_PAGES = 50
+BUFFER_ROWS = 50
+DEFAULT_ROW_HEIGHT = 20
+
+
+# ----------------------------------------------------------------------
+# Fuentes de datos
+# ----------------------------------------------------------------------
+class PagedSource:
+    """Filas por páginas con caché LRU
+
+    ``fetch_page(offset, limit)`` devuelve una lista de filas y ``count()``
+    el total. ``prepare`` y ``fetch_range`` pueden correr en un hilo de
+    fondo; ``get`` y ``len`` sólo leen la caché (hilo de Tk).
+    """
+
+    in_memory = False
+
+    def __init__(self, fetch_page, count, page_size=PAGE_SIZE, max_pages=MAX_CACHED_PAGES):
+        self.fetch_page = fetch_page
+        self.count = count
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.total = 0
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.total
+
+    def get(self, index):
+        """Fila en ``index`` o None si su página aún no está cargada"""
+        page, offset = divmod(index, self.page_size)
+        with self._lock:
+            rows = self._pages.get(page)
+            if rows is None:
+                return None
+            self._pages.move_to_end(page)
+        return rows[offset] if offset < len(rows) else None
+
+    def missing_pages(self, start, stop):
+        if stop <= start:
+            return []
+        pages = range(start // self.page_size, (stop - 1) // self.page_size + 1)
+        with self._lock:
+            return [page for page in pages if page not in self._pages]
+
+    def _store(self, page, rows):
+        with self._lock:
+            self._pages[page] = rows
+            self._pages.move_to_end(page)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def _load_page(self, page):
+        return self.fetch_page(page * self.page_size, self.page_size)
+
+    def fetch_range(self, start, stop):
+        """Cargar las páginas que faltan para las filas [start, stop)"""
+        for page in self.missing_pages(start, min(stop, self.total)):
+            self._store(page, list(self._load_page(page)))
+
+    def prepare(self, start=0, stop=PAGE_SIZE):
+        """Contar filas y cargar la ventana inicial"""
+        self.total = int(self.count() or 0)
+        self.fetch_range(start, stop)
+        return self.total
+
+    def invalidate(self):
+        with self._lock:
+            self._pages.clear()
+
+    def find(self, match):
+        """Índice de la primera fila en caché con ``match(fila)`` verdadero (o None)"""
+        with self._lock:
+            for page, rows in self._pages.items():
+                for offset, row in enumerate(rows):
+                    if match(row):
+                        return page * self.page_size + offset
+        return None
+
+    def replace(self, index, row):
+        """Sustituir la fila ``index`` en la caché (False si su página no está cargada)"""
+        page, offset = divmod(index, self.page_size)
+        with self._lock:
+            rows = self._pages.get(page)
+            if rows is None or offset >= len(rows):
+                return False
+            rows[offset] = row
+        return True
+
+
+class ListSource(PagedSource):
+    """Filas ya en memoria (p. ej. resultados de una búsqueda refinada)"""
+
+    in_memory = True
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        super().__init__(lambda offset, limit: self.rows[offset:offset + limit], lambda: len(self.rows))
+        self.total = len(self.rows)
+
+    def get(self, index):
+        return self.rows[index] if 0 <= index < len(self.rows) else None
+
+    def missing_pages(self, start, stop):
+        return []
+
+    def find(self, match):
+        return next((index for index, row in enumerate(self.rows) if match(row)), None)
+
+    def replace(self, index, row):
+        if not 0 <= index < len(self.rows):
+            return False
+        self.rows[index] = row
+        return True
+
+    def remove(self, index):
+        del self.rows[index]
+        self.total = len(self.rows)
+
+
+class KeysetSource(PagedSource):
+    """Fuente paginada por clave: ``fetch_after(cursor, limit) -> (filas, cursor_siguiente)``
+
+    Guarda el cursor de inicio de cada página vista; un salto a una página
+    lejana avanza página a página desde la más cercana conocida.
+
+    Con ``count_limit``, ``count(limit)`` sólo cuenta hasta ese tope: si se
+    alcanza, el total crece a medida que se cargan páginas y pasa a ser
+    exacto al llegar a la última.
+    """
+
+    def __init__(self, fetch_after, count, page_size=PAGE_SIZE, max_pages=MAX_CACHED_PAGES,
+                 count_limit=None):
+        super().__init__(None, count, page_size, max_pages)
+        self.fetch_after = fetch_after
+        self.count_limit = count_limit
+        self.exact = True
+        self._cursors = {0: None}
+
+    def prepare(self, start=0, stop=PAGE_SIZE):
+        if self.count_limit is None:
+            return super().prepare(start, stop)
+        self.total = int(self.count(self.count_limit) or 0)
+        self.exact = self.total < self.count_limit
+        self.fetch_range(start, stop)
+        return self.total
+
+    def _grow(self, page, rows, next_cursor):
+        """Ajustar un total acotado tras cargar la página ``page``"""
+        if self.exact:
+            return
+        if next_cursor is None:
+            self.total = page * self.page_size + len(rows)
+            self.exact = True
+        else:
+            # Dejar siempre una página más por delante para poder seguir desplazándose
+            self.total = max(self.total, (page + 2) * self.page_size)
+
+    def _load_page(self, page):
+        known = max(p for p in self._cursors if p <= page)
+        for current in range(known, page + 1):
+            rows, next_cursor = self.fetch_after(self._cursors[current], self.page_size)
+            if next_cursor is not None:
+                self._cursors[current + 1] = next_cursor
+            self._grow(current, rows, next_cursor)
+            if current == page:
+                return rows
+            self._store(current, list(rows))
+            if next_cursor is None:
+                return []
+        return []
+
+    def invalidate(self):
+        super().invalidate()
+        self._cursors = {0: None}
+
+
+class QuerySource(PagedSource):
+    """Fuente paginada sobre una consulta SQL (LIMIT/OFFSET y COUNT(*) envolvente)"""
+
+    def __init__(self, db_manager, sql, params=(), page_size=PAGE_SIZE, max_pages=MAX_CACHED_PAGES):
+        super().__init__(self._fetch, self._count, page_size, max_pages)
+        self.db_manager = db_manager
+        self.sql = sql
+        self.params = list(params)
+
+    def _execute(self, sql, params):
+        conn = self.db_manager.get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _count(self):
+        return self._execute(f"SELECT COUNT(*) FROM ({self.sql})", self.params)[0][0]
+
+    def _fetch(self, offset, limit):
+        return self._execute(f"{self.sql} LIMIT ? OFFSET ?", self.params + [limit, offset])
+
+    def fetch_row(self, column, value):
+        """La fila de la consulta con ``column = value`` (None si ya no está en el resultado)"""
+        rows = self._execute(f"SELECT * FROM ({self.sql}) WHERE {column} = ?", self.params + [value])
+        return rows[0] if rows else None
+
+
+# ----------------------------------------------------------------------
+# Widget
+# ----------------------------------------------------------------------
+class VirtualTreeview(ttk.Treeview):
+    """Treeview con un número fijo de items reutilizados para cualquier cantidad de filas
+
+    ``formatter(fila, índice) -> (valores, tags)`` convierte cada fila sólo
+    cuando se va a mostrar. La barra de desplazamiento conectada con
+    ``yscrollcommand`` / ``yview`` representa todas las filas de la fuente.
+    ``selection()`` e ``item(iid)`` siguen funcionando sobre las filas
+    visibles; ``row_for(iid)`` devuelve la fila original.
+    """
+
+    def __init__(self, master=None, formatter=None, tasks=None, buffer_rows=BUFFER_ROWS, **kw):
+        self._yscrollcommand = kw.pop('yscrollcommand', None)
+        super().__init__(master, **kw)
+        self.formatter = formatter or (lambda row, index: (tuple(row), ()))
+        self.tasks = tasks
+        self.buffer_rows = buffer_rows
+        self.source = None
+        self._first = 0
+        self._rows = int(kw.get('height', 10))
+        self._pool = []
+        self._detached = set()
+        self._index_of = {}
+        self._selected = set()
+        self._syncing_selection = 0
+        self._requested = None
+        self._task_key = f"virtual-tree-{id(self)}"
+
+        # Etiqueta propia delante de la del widget: puede cortar eventos con "break"
+        tag = f"VirtualTreeview{id(self)}"
+        self.bindtags((tag,) + self.bindtags())
+        self.bind_class(tag, '<<TreeviewSelect>>', self._on_select)
+        self.bind_class(tag, '<Configure>', self._on_resize)
+        self.bind_class(tag, '<MouseWheel>', lambda e: self._scroll_units(-1 if e.delta > 0 else 1))
+        self.bind_class(tag, '<Button-4>', lambda e: self._scroll_units(-1))
+        self.bind_class(tag, '<Button-5>', lambda e: self._scroll_units(1))
+        self.bind_class(tag, '<Up>', lambda e: self._on_arrow(-1))
+        self.bind_class(tag, '<Down>', lambda e: self._on_arrow(1))
+        self.bind_class(tag, '<Prior>', lambda e: self._scroll_units(-self._rows))
+        self.bind_class(tag, '<Next>', lambda e: self._scroll_units(self._rows))
+        self.bind_class(tag, '<Home>', lambda e: self._scroll_units(-len(self)))
+        self.bind_class(tag, '<End>', lambda e: self._scroll_units(len(self)))
+
+    def __len__(self):
+        return len(self.source) if self.source is not None else 0
+
+    # ------------------------------------------------------------------
+    # Fuente de datos
+    # ------------------------------------------------------------------
+    def set_source(self, source, keep_position=False, on_loaded=None):
+        """Mostrar ``source``; se cuenta y carga en segundo plano si hay ``tasks``
+
+        ``on_loaded(total)`` se llama en el hilo de Tk cuando ya se puede mostrar.
+        """
+        first = self._first if keep_position else 0
+        stop = first + self._rows + self.buffer_rows
+
+        def loaded(total):
+            self.source = source
+            self._first = first
+            self._requested = None
+            if not keep_position:
+                self._selected = set()
+            self._render()
+            if on_loaded is not None:
+                on_loaded(total)
+
+        if self.tasks is not None and not source.in_memory:
+            self.tasks.submit(source.prepare, max(0, first - self.buffer_rows), stop,
+                              on_done=loaded, key=self._task_key, busy=self)
+        else:
+            loaded(source.prepare(max(0, first - self.buffer_rows), stop))
+
+    def refresh(self):
+        """Volver a leer la fuente actual conservando la posición"""
+        if self.source is not None:
+            self.source.invalidate()
+            self.set_source(self.source, keep_position=True)
+
+    def patch_row(self, match, load, filtered=True):
+        """Actualizar una fila sin recargar la fuente
+
+        ``match(fila)`` reconoce la fila en la caché y ``load()`` la vuelve a
+        leer (en segundo plano si hay ``tasks``); si devuelve None la fila ya
+        no pertenece a la lista y se recarga. Una fila fuera de la caché se
+        leerá al pedir su página, salvo que ``filtered`` indique que el cambio
+        pudo hacerla entrar en la lista: entonces también se recarga.
+        """
+        source = self.source
+        if source is None:
+            return
+        if source.find(match) is None:
+            if filtered and not source.in_memory:
+                self.refresh()
+            return
+
+        def loaded(row):
+            index = source.find(match) if source is self.source else None
+            if index is None:
+                return
+            if row is not None:
+                if source.replace(index, row):
+                    self._render()
+            elif source.in_memory:
+                source.remove(index)
+                self._selected = {i - (i > index) for i in self._selected if i != index}
+                self._render()
+            else:
+                self.refresh()
+
+        if self.tasks is not None:
+            self.tasks.submit(load, on_done=loaded)
+        else:
+            loaded(load())
+
+    def clear(self):
+        self.source = None
+        self._selected = set()
+        self._render()
+
+    def row_for(self, iid):
+        """Fila original mostrada en el item ``iid`` (o None)"""
+        index = self._index_of.get(iid)
+        if index is None or self.source is None:
+            return None
+        return self.source.get(index)
+
+    def selected_rows(self):
+        return [row for row in (self.row_for(iid) for iid in self.selection()) if row is not None]
+
+    # ------------------------------------------------------------------
+    # Desplazamiento
+    # ------------------------------------------------------------------
+    def configure(self, cnf=None, **kw):
+        if isinstance(cnf, dict):
+            kw.update(cnf)
+            cnf = None
+        if 'yscrollcommand' in kw:
+            # La barra refleja la posición virtual, no la de los items reutilizados
+            self._yscrollcommand = kw.pop('yscrollcommand')
+            self._update_scrollbar()
+            if not kw:
+                return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def yview(self, *args):
+        if not args:
+            return self._fractions()
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self)))
+        elif args[0] == 'scroll':
+            amount, what = int(args[1]), args[2]
+            self._scroll_units(amount * (self._rows if what.startswith('page') else 1))
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def scroll_to(self, index):
+        first = max(0, min(int(index), len(self) - self._rows))
+        if first != self._first:
+            self._first = first
+            self._render()
+
+    def see_index(self, index):
+        """Desplazar lo mínimo para que la fila ``index`` quede visible"""
+        if index < self._first:
+            self.scroll_to(index)
+        elif index >= self._first + self._rows:
+            self.scroll_to(index - self._rows + 1)
+
+    def _scroll_units(self, amount):
+        self.scroll_to(self._first + amount)
+        return 'break'
+
+    def _on_arrow(self, delta):
+        index = self._index_of.get(self.focus())
+        if index is None:
+            return None
+        target = index + delta
+        if self._first <= target < self._first + min(self._rows, len(self) - self._first):
+            return None  # Dentro de la ventana: lo resuelve el Treeview
+        if not 0 <= target < len(self):
+            return 'break'
+        self.see_index(target)
+        self._selected = {target}
+        iid = self._iid_for(target)
+        if iid is not None:
+            self.focus(iid)
+            self.selection_set(iid)
+        return 'break'
+
+    def _fractions(self):
+        total = len(self)
+        if total <= 0:
+            return 0.0, 1.0
+        return self._first / total, min(1.0, (self._first + self._rows) / total)
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self._fractions())
+
+    def _on_resize(self, event):
+        rows = self._fit_rows(event.height)
+        if rows != self._rows:
+            self._rows = rows
+            self._render()
+
+    def _fit_rows(self, height):
+        header, row_height = 0, DEFAULT_ROW_HEIGHT
+        for iid in self._pool:
+            if iid not in self._detached:
+                bbox = self.bbox(iid)
+                if bbox:
+                    header, row_height = bbox[1] - (self._pool.index(iid) * bbox[3]), bbox[3]
+                    break
+        else:
+            style_height = ttk.Style().lookup(self.cget('style') or 'Treeview', 'rowheight')
+            if style_height:
+                row_height = int(style_height)
+            header = row_height + 4 if 'headings' in str(self.cget('show')) else 0
+        return max(1, (height - header) // max(1, row_height))
+
+    # ------------------------------------------------------------------
+    # Dibujo
+    # ------------------------------------------------------------------
+    def _iid_for(self, index):
+        for iid, shown in self._index_of.items():
+            if shown == index:
+                return iid
+        return None
+
+    def _ensure_pool(self, count):
+        self._pool = [iid for iid in self._pool if self.exists(iid)]
+        self._detached &= set(self._pool)
+        while len(self._pool) < count:
+            self._pool.append(super().insert('', 'end', values=()))
+        while len(self._pool) > count:
+            iid = self._pool.pop()
+            self._detached.discard(iid)
+            self.delete(iid)
+
+    def _render(self):
+        total = len(self)
+        self._first = max(0, min(self._first, total - self._rows))
+        self._ensure_pool(self._rows)
+        self._index_of = {}
+        missing = False
+
+        for position, iid in enumerate(self._pool):
+            index = self._first + position
+            if index >= total:
+                if iid not in self._detached:
+                    self.detach(iid)
+                    self._detached.add(iid)
+                continue
+            if iid in self._detached:
+                self.move(iid, '', position)
+                self._detached.discard(iid)
+            row = self.source.get(index)
+            if row is None:
+                values, tags = ('…',), ('loading',)
+                missing = True
+            else:
+                values, tags = self.formatter(row, index)
+            self.item(iid, values=values, tags=tags)
+            self._index_of[iid] = index
+
+        self._sync_selection()
+        self._update_scrollbar()
+        self._request_pages(force=missing)
+
+    def _request_pages(self, force=False):
+        if self.source is None:
+            return
+        start = max(0, self._first - self.buffer_rows)
+        stop = min(len(self), self._first + self._rows + self.buffer_rows)
+        if not self.source.missing_pages(start, stop):
+            return
+        if self._requested == (start, stop) and not force:
+            return
+        self._requested = (start, stop)
+        source = self.source
+
+        def loaded(_):
+            self._requested = None
+            if source is self.source:
+                self._render()
+
+        if self.tasks is not None:
+            # Misma clave: al desplazarse rápido se descarta la petición anterior
+            self.tasks.submit(source.fetch_range, start, stop, on_done=loaded, key=self._task_key)
+        else:
+            source.fetch_range(start, stop)
+            self._requested = None
+            self._render()
+
+    # ------------------------------------------------------------------
+    # Selección (por índice de fila, no por item)
+    # ------------------------------------------------------------------
+    def _on_select(self, event):
+        if self._syncing_selection:
+            # Cambio hecho por _sync_selection: no llega a los manejadores de la aplicación
+            self._syncing_selection -= 1
+            return 'break'
+        self._selected = {self._index_of[iid] for iid in self.selection() if iid in self._index_of}
+        return None
+
+    def _sync_selection(self):
+        wanted = [iid for iid in self._pool if self._index_of.get(iid) in self._selected]
+        if set(wanted) != set(self.selection()):
+            self._syncing_selection += 1
+            self.selection_set(wanted)
+            self.after_idle(self._end_selection_sync)
+
+    def _end_selection_sync(self):
+        self._syncing_selection = 0